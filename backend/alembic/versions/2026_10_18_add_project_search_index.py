@@ -0,0 +1,54 @@
+"""Add project search and keyset pagination indexes
+
+Revision ID: add_project_search_index
+Revises: add_usage_rollups
+Create Date: 2026-10-18
+
+This migration adds:
+- ix_projects_user_created: (user_id, created_at, id) for keyset-paginated
+  project listings
+- ix_projects_search_trgm (PostgreSQL): pg_trgm GIN index on the search
+  document expression used by app/services/project_search_service.py
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_project_search_index'
+down_revision = 'add_usage_rollups'
+branch_labels = None
+depends_on = None
+
+# Must stay identical to PG_SEARCH_DOCUMENT in project_search_service.py
+SEARCH_DOCUMENT = (
+    "lower(coalesce(projects.title, '') || ' ' || coalesce(projects.description, '') "
+    "|| ' ' || coalesce(projects.tech_stack::text, ''))"
+)
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Check if index already exists on the table"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in {ix['name'] for ix in inspector.get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    if not index_exists('projects', 'ix_projects_user_created'):
+        op.create_index('ix_projects_user_created', 'projects', ['user_id', 'created_at', 'id'])
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_projects_search_trgm ON projects "
+        f"USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_projects_search_trgm")
+    op.drop_index('ix_projects_user_created', table_name='projects')
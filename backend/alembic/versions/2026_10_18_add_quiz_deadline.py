@@ -0,0 +1,54 @@
+"""Add campus drive quiz deadline and result counts
+
+Revision ID: add_quiz_deadline
+Revises: add_project_search_index
+Create Date: 2026-10-18
+
+This migration adds to campus_drive_registrations:
+- quiz_deadline (indexed): set while a quiz is in progress, scanned by the
+  expired quiz sweep (app/modules/campus_drive/tasks.py)
+- total_questions, attempted_questions, correct_answers: result counts, so
+  the result page does not read response rows
+
+Quizzes already in progress get their deadline backfilled from the start
+time and the drive's duration (PostgreSQL).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_quiz_deadline'
+down_revision = 'add_project_search_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('campus_drive_registrations', sa.Column('quiz_deadline', sa.DateTime(), nullable=True))
+    op.add_column('campus_drive_registrations', sa.Column('total_questions', sa.Integer(), nullable=True))
+    op.add_column('campus_drive_registrations', sa.Column('attempted_questions', sa.Integer(), nullable=True))
+    op.add_column('campus_drive_registrations', sa.Column('correct_answers', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_campus_drive_registrations_quiz_deadline', 'campus_drive_registrations', ['quiz_deadline']
+    )
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("""
+        UPDATE campus_drive_registrations AS r
+        SET quiz_deadline = r.quiz_start_time + make_interval(mins => d.quiz_duration_minutes)
+        FROM campus_drives AS d
+        WHERE r.campus_drive_id = d.id
+          AND r.quiz_start_time IS NOT NULL
+          AND r.quiz_end_time IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campus_drive_registrations_quiz_deadline', table_name='campus_drive_registrations')
+    op.drop_column('campus_drive_registrations', 'correct_answers')
+    op.drop_column('campus_drive_registrations', 'attempted_questions')
+    op.drop_column('campus_drive_registrations', 'total_questions')
+    op.drop_column('campus_drive_registrations', 'quiz_deadline')
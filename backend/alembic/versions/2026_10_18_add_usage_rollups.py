@@ -0,0 +1,82 @@
+"""Add usage_rollups table for admin analytics
+
+Revision ID: add_usage_rollups
+Revises: add_subscription_reminder
+Create Date: 2026-10-18
+
+This migration adds:
+- usage_rollups table: hourly/daily TokenUsageLog aggregates per user,
+  project, model and agent (matches UsageRollup in app/models/usage.py)
+- Backfills the rollups from existing token_usage_logs (PostgreSQL)
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_usage_rollups'
+down_revision = 'add_subscription_reminder'
+branch_labels = None
+depends_on = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if table already exists in the database"""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    # Skip if table already exists (created by SQLAlchemy create_all or previous run)
+    if table_exists('usage_rollups'):
+        return
+
+    op.create_table(
+        'usage_rollups',
+        sa.Column('granularity', sa.String(8), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.String(36), nullable=False),
+        sa.Column('project_id', sa.String(36), nullable=False, server_default=''),
+        sa.Column('model', sa.String(50), nullable=False),
+        sa.Column('agent_type', sa.String(20), nullable=False),
+
+        # Aggregated metrics
+        sa.Column('calls', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('input_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('output_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total_tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('cost_paise', sa.BigInteger(), nullable=False, server_default='0'),
+
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'user_id', 'project_id', 'model', 'agent_type'),
+    )
+    op.create_index('ix_usage_rollup_user_bucket', 'usage_rollups', ['granularity', 'user_id', 'bucket_start'])
+
+    if op.get_bind().dialect.name != 'postgresql' or not table_exists('token_usage_logs'):
+        return
+
+    # Backfill: hour buckets from the raw log, day buckets from the hours
+    op.execute("""
+        INSERT INTO usage_rollups (granularity, bucket_start, user_id, project_id, model, agent_type,
+                                   calls, input_tokens, output_tokens, total_tokens, cost_paise, updated_at)
+        SELECT 'hour', date_trunc('hour', created_at), user_id, COALESCE(project_id, ''), model, agent_type::text,
+               COUNT(*), SUM(input_tokens), SUM(output_tokens), SUM(total_tokens), SUM(cost_paise), now()
+        FROM token_usage_logs
+        GROUP BY 2, 3, 4, 5, 6
+    """)
+    op.execute("""
+        INSERT INTO usage_rollups (granularity, bucket_start, user_id, project_id, model, agent_type,
+                                   calls, input_tokens, output_tokens, total_tokens, cost_paise, updated_at)
+        SELECT 'day', date_trunc('day', bucket_start), user_id, project_id, model, agent_type,
+               SUM(calls), SUM(input_tokens), SUM(output_tokens), SUM(total_tokens), SUM(cost_paise), now()
+        FROM usage_rollups
+        WHERE granularity = 'hour'
+        GROUP BY 2, 3, 4, 5, 6
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_usage_rollup_user_bucket', table_name='usage_rollups')
+    op.drop_table('usage_rollups')
@@ -0,0 +1,32 @@
+"""Make projects.updated_at NOT NULL and index it for keyset pagination
+
+Revision ID: project_updated_at_keyset
+Revises: add_quiz_deadline
+Create Date: 2026-10-19
+
+This migration:
+- backfills projects.updated_at from created_at where it is NULL
+- makes projects.updated_at NOT NULL
+- adds ix_projects_user_updated: (user_id, updated_at, id), which serves
+  the (updated_at, id) cursor of the project search endpoint
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_updated_at_keyset'
+down_revision = 'add_quiz_deadline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE projects SET updated_at = created_at WHERE updated_at IS NULL")
+    op.alter_column('projects', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_projects_user_updated', 'projects', ['user_id', 'updated_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_user_updated', table_name='projects')
+    op.alter_column('projects', 'updated_at', existing_type=sa.DateTime(), nullable=True)
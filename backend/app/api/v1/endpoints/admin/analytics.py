@@ -1,15 +1,23 @@
 """
 Admin Analytics endpoints.
+
+Usage dashboards (token usage, API calls, model usage, overview, cost
+trends) read the hourly/daily usage_rollups maintained by
+usage_rollup_service instead of scanning token_usage_logs; daily windows
+are whole UTC days.
 """
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc, asc
+from sqlalchemy import select, func, and_, desc, asc, case
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from app.core.database import get_db
 from app.models import User, Project, Transaction
-from app.models.usage import TokenUsageLog
+from app.models.usage import TokenUsageLog, UsageRollup, RollupGranularity
+from app.services.usage_rollup_service import usage_rollup_service, bucket_value, agent_label
+from app.services.usage_ingestion_service import usage_ingestion_service
+from app.utils.sse import sse_metrics
 from app.modules.auth.dependencies import get_current_admin
 from app.schemas.admin import (
     UserGrowthResponse, TokenUsageResponse, ApiCallsResponse, TimeSeriesDataPoint
@@ -17,6 +25,37 @@ from app.schemas.admin import (
 
 router = APIRouter()
 
+MODEL_FAMILIES = ["haiku", "sonnet", "opus"]
+
+
+def _day_window(days: int):
+    """(today_start, first_day) for a window of `days` whole days ending today"""
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today_start, today_start - timedelta(days=days - 1)
+
+
+def _daily_points(first_day: datetime, days: int, values: Dict[datetime, float], labels: Dict[datetime, str] = None):
+    """Zero-filled TimeSeriesDataPoint per day, oldest first"""
+    points = []
+    for i in range(days):
+        day = first_day + timedelta(days=i)
+        points.append(TimeSeriesDataPoint(
+            date=day.strftime("%Y-%m-%d"),
+            value=float(values.get(day, 0)),
+            label=labels.get(day) if labels else None
+        ))
+    return points
+
+
+def _model_family(model: str) -> Optional[str]:
+    """Model family from a model name that contains it (e.g. claude-3-haiku-20240307)"""
+    model = (model or "").lower()
+    return next((family for family in MODEL_FAMILIES if family in model), None)
+
+
+def _daily_rollups(*columns):
+    return select(*columns).where(UsageRollup.granularity == RollupGranularity.DAY.value)
+
 
 @router.get("/user-growth", response_model=UserGrowthResponse)
 async def get_user_growth(
@@ -27,14 +66,17 @@ async def get_user_growth(
     """Get user growth analytics over time"""
     now = datetime.utcnow()
     start_date = now - timedelta(days=days)
+    today_start, first_day = _day_window(days)
 
-    # Get total users
-    total_users = await db.scalar(select(func.count(User.id)))
-
-    # Get users at start of period
-    users_at_start = await db.scalar(
-        select(func.count(User.id)).where(User.created_at < start_date)
-    )
+    # Totals in one pass: all users, users at start of period, users before the first plotted day
+    totals = (await db.execute(
+        select(
+            func.count(User.id),
+            func.coalesce(func.sum(case((User.created_at < start_date, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((User.created_at < first_day, 1), else_=0)), 0)
+        )
+    )).one()
+    total_users, users_at_start, users_before_window = totals
 
     # Calculate growth rate
     new_users = (total_users or 0) - (users_at_start or 0)
@@ -43,37 +85,26 @@ async def get_user_growth(
     else:
         growth_rate = 100.0 if new_users > 0 else 0.0
 
-    # Daily data
-    data = []
-    for i in range(days):
-        day = now - timedelta(days=i)
-        day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-
-        new_users_day = await db.scalar(
-            select(func.count(User.id)).where(
-                and_(
-                    User.created_at >= day_start,
-                    User.created_at < day_end
-                )
-            )
-        )
-
-        # Cumulative users up to this day
-        cumulative = await db.scalar(
-            select(func.count(User.id)).where(User.created_at < day_end)
-        )
-
-        data.append(TimeSeriesDataPoint(
-            date=day_start.strftime("%Y-%m-%d"),
-            value=float(cumulative or 0),
-            label=f"+{new_users_day or 0}"
-        ))
+    # New users per day, one grouped query
+    day = usage_rollup_service.day_bucket(db, User.created_at)
+    result = await db.execute(
+        select(day.label("day"), func.count(User.id).label("count"))
+        .where(User.created_at >= first_day)
+        .group_by(day)
+    )
+    new_by_day = {bucket_value(row.day): row.count for row in result}
 
-    data.reverse()
+    # Cumulative users up to each day
+    cumulative = {}
+    running = users_before_window or 0
+    for i in range(days):
+        bucket = first_day + timedelta(days=i)
+        running += new_by_day.get(bucket, 0)
+        cumulative[bucket] = running
+    labels = {bucket: f"+{new_by_day.get(bucket, 0)}" for bucket in cumulative}
 
     return UserGrowthResponse(
-        data=data,
+        data=_daily_points(first_day, days, cumulative, labels),
         total_users=total_users or 0,
         growth_rate=round(growth_rate, 2)
     )
@@ -85,56 +116,40 @@ async def get_token_usage(
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
-    """Get token usage analytics from TokenUsageLog (actual Claude API usage)"""
-    now = datetime.utcnow()
-    start_date = now - timedelta(days=days)
+    """Get token usage analytics from the usage rollups (actual Claude API usage)"""
+    today_start, first_day = _day_window(days)
 
-    # Total tokens used (from TokenUsageLog - actual project generation)
-    total_tokens = await db.scalar(
-        select(func.coalesce(func.sum(TokenUsageLog.total_tokens), 0))
+    # Total and per-model tokens (all time)
+    result = await db.execute(
+        _daily_rollups(UsageRollup.model, func.sum(UsageRollup.total_tokens).label("tokens"))
+        .group_by(UsageRollup.model)
     )
+    total_tokens = 0
+    tokens_by_model = {model: 0 for model in MODEL_FAMILIES}
+    for row in result:
+        total_tokens += row.tokens or 0
+        family = _model_family(row.model)
+        if family:
+            tokens_by_model[family] += row.tokens or 0
+
+    # Daily usage
+    result = await db.execute(
+        _daily_rollups(UsageRollup.bucket_start, func.sum(UsageRollup.total_tokens).label("tokens"))
+        .where(UsageRollup.bucket_start >= first_day)
+        .group_by(UsageRollup.bucket_start)
+    )
+    daily_usage = _daily_points(first_day, days, {bucket_value(row.bucket_start): row.tokens or 0 for row in result})
 
-    # Tokens by model (from TokenUsageLog)
-    tokens_by_model = {}
-    for model in ["haiku", "sonnet", "opus"]:
-        # Match model names that contain the model type
-        model_tokens = await db.scalar(
-            select(func.coalesce(func.sum(TokenUsageLog.total_tokens), 0)).where(
-                TokenUsageLog.model.ilike(f"%{model}%")
-            )
-        )
-        tokens_by_model[model] = model_tokens or 0
-
-    # Daily usage (from TokenUsageLog)
-    daily_usage = []
-    for i in range(days):
-        day = now - timedelta(days=i)
-        day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-
-        day_tokens = await db.scalar(
-            select(func.coalesce(func.sum(TokenUsageLog.total_tokens), 0)).where(
-                and_(
-                    TokenUsageLog.created_at >= day_start,
-                    TokenUsageLog.created_at < day_end
-                )
-            )
-        )
-
-        daily_usage.append(TimeSeriesDataPoint(
-            date=day_start.strftime("%Y-%m-%d"),
-            value=float(day_tokens or 0)
-        ))
-
-    daily_usage.reverse()
-
-    # Top users by token usage (from TokenUsageLog)
+    # Top users by token usage
     top_users_query = (
-        select(User.email, User.full_name, func.sum(TokenUsageLog.total_tokens).label("total_tokens"))
-        .join(TokenUsageLog, User.id == TokenUsageLog.user_id)
-        .where(TokenUsageLog.created_at >= start_date)
-        .group_by(User.id)
-        .order_by(func.sum(TokenUsageLog.total_tokens).desc())
+        select(User.email, User.full_name, func.sum(UsageRollup.total_tokens).label("total_tokens"))
+        .join(UsageRollup, User.id == UsageRollup.user_id)
+        .where(
+            UsageRollup.granularity == RollupGranularity.DAY.value,
+            UsageRollup.bucket_start >= first_day
+        )
+        .group_by(User.id, User.email, User.full_name)
+        .order_by(func.sum(UsageRollup.total_tokens).desc())
         .limit(10)
     )
     result = await db.execute(top_users_query)
@@ -144,7 +159,7 @@ async def get_token_usage(
     ]
 
     return TokenUsageResponse(
-        total_tokens=total_tokens or 0,
+        total_tokens=total_tokens,
         tokens_by_model=tokens_by_model,
         daily_usage=daily_usage,
         top_users=top_users
@@ -157,60 +172,42 @@ async def get_api_calls(
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
-    """Get API call analytics from TokenUsageLog (actual Claude API calls)"""
-    now = datetime.utcnow()
-    start_date = now - timedelta(days=days)
-
-    # Total API calls (from TokenUsageLog)
-    total_calls = await db.scalar(select(func.count(TokenUsageLog.id)))
-
-    # Average tokens per call (no response time in TokenUsageLog, use tokens instead)
-    avg_tokens_per_call = await db.scalar(
-        select(func.avg(TokenUsageLog.total_tokens))
-    )
+    """Get API call analytics from the usage rollups (actual Claude API calls)"""
+    today_start, first_day = _day_window(days)
+
+    # Total API calls and average tokens per call (no response time in TokenUsageLog, use tokens instead)
+    total_calls, total_tokens = (await db.execute(
+        _daily_rollups(
+            func.coalesce(func.sum(UsageRollup.calls), 0),
+            func.coalesce(func.sum(UsageRollup.total_tokens), 0)
+        )
+    )).one()
+    avg_tokens_per_call = (total_tokens / total_calls) if total_calls else 0
 
     # Calls by agent type (equivalent to endpoint for AI calls)
     agent_query = (
-        select(TokenUsageLog.agent_type, func.count(TokenUsageLog.id).label("count"))
-        .where(TokenUsageLog.created_at >= start_date)
-        .group_by(TokenUsageLog.agent_type)
-        .order_by(func.count(TokenUsageLog.id).desc())
+        _daily_rollups(UsageRollup.agent_type, func.sum(UsageRollup.calls).label("count"))
+        .where(UsageRollup.bucket_start >= first_day)
+        .group_by(UsageRollup.agent_type)
+        .order_by(func.sum(UsageRollup.calls).desc())
         .limit(10)
     )
     result = await db.execute(agent_query)
-    calls_by_endpoint = {
-        (row.agent_type.value if row.agent_type else "unknown"): row.count
-        for row in result
-    }
+    calls_by_endpoint = {agent_label(row.agent_type): row.count for row in result}
 
     # Daily calls
-    daily_calls = []
-    for i in range(days):
-        day = now - timedelta(days=i)
-        day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-
-        day_count = await db.scalar(
-            select(func.count(TokenUsageLog.id)).where(
-                and_(
-                    TokenUsageLog.created_at >= day_start,
-                    TokenUsageLog.created_at < day_end
-                )
-            )
-        )
-
-        daily_calls.append(TimeSeriesDataPoint(
-            date=day_start.strftime("%Y-%m-%d"),
-            value=float(day_count or 0)
-        ))
-
-    daily_calls.reverse()
+    result = await db.execute(
+        _daily_rollups(UsageRollup.bucket_start, func.sum(UsageRollup.calls).label("calls"))
+        .where(UsageRollup.bucket_start >= first_day)
+        .group_by(UsageRollup.bucket_start)
+    )
+    daily_calls = _daily_points(first_day, days, {bucket_value(row.bucket_start): row.calls or 0 for row in result})
 
     return ApiCallsResponse(
         total_calls=total_calls or 0,
         calls_by_endpoint=calls_by_endpoint,
         daily_calls=daily_calls,
-        average_response_time=float(avg_tokens_per_call or 0)  # Use avg tokens as proxy
+        average_response_time=float(avg_tokens_per_call)  # Use avg tokens as proxy
     )
 
 
@@ -220,54 +217,41 @@ async def get_model_usage(
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
-    """Get Claude model usage breakdown from TokenUsageLog (actual API calls)"""
+    """Get Claude model usage breakdown from the usage rollups (actual API calls)"""
     now = datetime.utcnow()
-    start_date = now - timedelta(days=days)
-
-    models = ["haiku", "sonnet", "opus"]
-    usage = {}
-
-    for model in models:
-        # Call count (model name contains the model type, e.g. "claude-3-haiku-20240307")
-        call_count = await db.scalar(
-            select(func.count(TokenUsageLog.id)).where(
-                and_(
-                    TokenUsageLog.model.ilike(f"%{model}%"),
-                    TokenUsageLog.created_at >= start_date
-                )
-            )
+    today_start, first_day = _day_window(days)
+
+    totals = {model: {"calls": 0, "tokens": 0, "cost_paise": 0} for model in MODEL_FAMILIES}
+    result = await db.execute(
+        _daily_rollups(
+            UsageRollup.model,
+            func.sum(UsageRollup.calls).label("calls"),
+            func.sum(UsageRollup.total_tokens).label("tokens"),
+            func.sum(UsageRollup.cost_paise).label("cost_paise")
         )
-
-        # Token count
-        token_count = await db.scalar(
-            select(func.coalesce(func.sum(TokenUsageLog.total_tokens), 0)).where(
-                and_(
-                    TokenUsageLog.model.ilike(f"%{model}%"),
-                    TokenUsageLog.created_at >= start_date
-                )
-            )
-        )
-
-        # Cost in paise
-        cost_paise = await db.scalar(
-            select(func.coalesce(func.sum(TokenUsageLog.cost_paise), 0)).where(
-                and_(
-                    TokenUsageLog.model.ilike(f"%{model}%"),
-                    TokenUsageLog.created_at >= start_date
-                )
-            )
-        )
-
-        usage[model] = {
-            "calls": call_count or 0,
-            "tokens": token_count or 0,
-            "cost_inr": round((cost_paise or 0) / 100, 2),
-            "cost_usd": round((cost_paise or 0) / 100 / 83, 4)
+        .where(UsageRollup.bucket_start >= first_day)
+        .group_by(UsageRollup.model)
+    )
+    for row in result:
+        family = _model_family(row.model)
+        if family:
+            totals[family]["calls"] += row.calls or 0
+            totals[family]["tokens"] += row.tokens or 0
+            totals[family]["cost_paise"] += row.cost_paise or 0
+
+    usage = {
+        model: {
+            "calls": t["calls"],
+            "tokens": t["tokens"],
+            "cost_inr": round(t["cost_paise"] / 100, 2),
+            "cost_usd": round(t["cost_paise"] / 100 / 83, 4)
         }
+        for model, t in totals.items()
+    }
 
     return {
         "period_days": days,
-        "start_date": start_date.isoformat(),
+        "start_date": first_day.isoformat(),
         "end_date": now.isoformat(),
         "models": usage
     }
@@ -278,61 +262,50 @@ async def get_analytics_overview(
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
-    """Get a quick analytics overview using TokenUsageLog for AI metrics"""
+    """Get a quick analytics overview using the usage rollups for AI metrics"""
     now = datetime.utcnow()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=7)
     month_start = today_start.replace(day=1)
 
     # User metrics
-    total_users = await db.scalar(select(func.count(User.id)))
-    new_users_today = await db.scalar(
-        select(func.count(User.id)).where(User.created_at >= today_start)
-    )
-    new_users_this_week = await db.scalar(
-        select(func.count(User.id)).where(User.created_at >= week_start)
-    )
+    total_users, new_users_today, new_users_this_week = (await db.execute(
+        select(
+            func.count(User.id),
+            func.coalesce(func.sum(case((User.created_at >= today_start, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((User.created_at >= week_start, 1), else_=0)), 0)
+        )
+    )).one()
 
     # Project metrics
-    total_projects = await db.scalar(select(func.count(Project.id)))
-    active_projects = await db.scalar(
-        select(func.count(Project.id)).where(
-            Project.last_activity >= now - timedelta(days=7)
+    total_projects, active_projects = (await db.execute(
+        select(
+            func.count(Project.id),
+            func.coalesce(func.sum(case((Project.last_activity >= now - timedelta(days=7), 1), else_=0)), 0)
         )
-    )
+    )).one()
 
-    # API metrics (from TokenUsageLog - actual Claude API calls)
-    api_calls_today = await db.scalar(
-        select(func.count(TokenUsageLog.id)).where(TokenUsageLog.created_at >= today_start)
-    )
-    tokens_today = await db.scalar(
-        select(func.coalesce(func.sum(TokenUsageLog.total_tokens), 0)).where(
-            TokenUsageLog.created_at >= today_start
-        )
-    )
-    cost_today_paise = await db.scalar(
-        select(func.coalesce(func.sum(TokenUsageLog.cost_paise), 0)).where(
-            TokenUsageLog.created_at >= today_start
-        )
-    )
+    # API metrics (today's daily rollup bucket)
+    api_calls_today, tokens_today, cost_today_paise = (await db.execute(
+        _daily_rollups(
+            func.coalesce(func.sum(UsageRollup.calls), 0),
+            func.coalesce(func.sum(UsageRollup.total_tokens), 0),
+            func.coalesce(func.sum(UsageRollup.cost_paise), 0)
+        ).where(UsageRollup.bucket_start == today_start)
+    )).one()
 
     # Revenue metrics
-    revenue_today = await db.scalar(
-        select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-            and_(
-                Transaction.status == "success",
-                Transaction.created_at >= today_start
-            )
-        )
-    )
-    revenue_this_month = await db.scalar(
-        select(func.coalesce(func.sum(Transaction.amount), 0)).where(
+    revenue_today, revenue_this_month = (await db.execute(
+        select(
+            func.coalesce(func.sum(case((Transaction.created_at >= today_start, Transaction.amount), else_=0)), 0),
+            func.coalesce(func.sum(Transaction.amount), 0)
+        ).where(
             and_(
                 Transaction.status == "success",
                 Transaction.created_at >= month_start
             )
         )
-    )
+    )).one()
 
     return {
         "users": {
@@ -721,18 +694,20 @@ async def get_cost_trends(
     now = datetime.utcnow()
     start_date = now - timedelta(days=days)
 
+    today_start, first_day = _day_window(days)
+
     # Get daily cost aggregations
     daily_query = (
-        select(
-            func.date(TokenUsageLog.created_at).label("date"),
-            func.sum(TokenUsageLog.cost_paise).label("cost_paise"),
-            func.sum(TokenUsageLog.total_tokens).label("tokens"),
-            func.count(TokenUsageLog.id).label("api_calls"),
-            func.count(func.distinct(TokenUsageLog.project_id)).label("projects")
+        _daily_rollups(
+            UsageRollup.bucket_start.label("date"),
+            func.sum(UsageRollup.cost_paise).label("cost_paise"),
+            func.sum(UsageRollup.total_tokens).label("tokens"),
+            func.sum(UsageRollup.calls).label("api_calls"),
+            func.count(func.distinct(func.nullif(UsageRollup.project_id, ""))).label("projects")
         )
-        .where(TokenUsageLog.created_at >= start_date)
-        .group_by(func.date(TokenUsageLog.created_at))
-        .order_by(func.date(TokenUsageLog.created_at))
+        .where(UsageRollup.bucket_start >= first_day)
+        .group_by(UsageRollup.bucket_start)
+        .order_by(UsageRollup.bucket_start)
     )
 
     result = await db.execute(daily_query)
@@ -740,8 +715,9 @@ async def get_cost_trends(
 
     for row in result:
         cost_paise = row.cost_paise or 0
+        day = bucket_value(row.date)
         daily_data.append({
-            "date": row.date.isoformat() if row.date else None,
+            "date": day.date().isoformat() if day else None,
             "cost_usd": round(cost_paise / 100 / 83, 4),
             "cost_inr": round(cost_paise / 100, 2),
             "tokens": row.tokens or 0,
@@ -1379,3 +1355,19 @@ async def debug_token_logs(
             )
         }
     }
+
+
+@router.get("/usage-ingestion")
+async def get_usage_ingestion_stats(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Batched token usage writer metrics (queue depth, flush latency, drops)"""
+    return usage_ingestion_service.get_stats()
+
+
+@router.get("/sse-streams")
+async def get_sse_stream_stats(
+    current_admin: User = Depends(get_current_admin)
+):
+    """SSE transport metrics (active streams, frames/sec, bytes/sec, coalescing)"""
+    return sse_metrics.get_stats()
@@ -18,6 +18,8 @@ from app.models import User, Project, ProjectStatus, ProjectFile, AuditLog
 from app.modules.auth.dependencies import get_current_admin
 from app.schemas.admin import AdminProjectResponse, AdminProjectsResponse, StorageStats
 from app.services.storage_service import storage_service
+from app.services.project_search_service import project_search_service
+from app.utils.pagination import keyset_paginate, estimate_count
 from app.core.types import generate_uuid
 
 router = APIRouter()
@@ -55,10 +57,18 @@ async def list_projects(
     user_id: Optional[str] = None,
     sort_by: str = Query("created_at", regex="^(created_at|title|status|last_activity)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count matches (default: only without a cursor)"),
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
-    """List all projects with filtering, sorting, and pagination"""
+    """
+    List all projects with filtering, sorting, and pagination.
+
+    Date sorts (created_at, last_activity) are keyset-paginated: follow
+    next_cursor. The unfiltered total is the planner estimate on PostgreSQL
+    (total_estimated=true).
+    """
 
     # Build base query with user join
     query = select(Project, User).join(User, Project.user_id == User.id)
@@ -66,11 +76,10 @@ async def list_projects(
     # Apply filters
     conditions = []
     if search:
-        search_term = f"%{search}%"
+        # Index-backed text match; emails via the (small) users table
         conditions.append(or_(
-            Project.title.ilike(search_term),
-            Project.description.ilike(search_term),
-            User.email.ilike(search_term)
+            await project_search_service.match(db, search),
+            Project.user_id.in_(select(User.id).where(User.email.ilike(f"%{search}%")))
         ))
 
     if status:
@@ -86,37 +95,62 @@ async def list_projects(
     if conditions:
         query = query.where(and_(*conditions))
 
-    # Get total count
-    count_query = select(func.count()).select_from(
-        select(Project).join(User, Project.user_id == User.id)
-        .where(and_(*conditions) if conditions else True)
-        .subquery()
-    )
-    total = await db.scalar(count_query)
-
-    # Apply sorting
-    sort_column = getattr(Project, sort_by)
-    if sort_order == "desc":
-        query = query.order_by(sort_column.desc())
+    # Totals are optional on cursor pages; estimated when nothing is filtered
+    total = None
+    total_estimated = False
+    if include_total or (include_total is None and not cursor):
+        if not conditions:
+            total = await estimate_count(db, Project.__tablename__)
+            total_estimated = total is not None
+        if total is None:
+            total = await db.scalar(select(func.count(Project.id)).where(*conditions))
+
+    next_cursor = None
+    if sort_by in ("created_at", "last_activity") and (cursor or page <= 1):
+        sort_column = Project.created_at if sort_by == "created_at" else func.coalesce(Project.last_activity, Project.created_at)
+        try:
+            result = await keyset_paginate(
+                db, query, sort_column, Project.id,
+                cursor_key=lambda row: (
+                    row[0].created_at if sort_by == "created_at" else (row[0].last_activity or row[0].created_at),
+                    str(row[0].id)
+                ),
+                page_size=page_size, cursor=cursor,
+                descending=sort_order == "desc", scalars=False
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        rows = result["items"]
+        next_cursor = result["next_cursor"]
     else:
-        query = query.order_by(sort_column.asc())
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-
-    # Execute query
-    result = await db.execute(query)
-    rows = result.all()
+        # Apply sorting
+        sort_column = getattr(Project, sort_by)
+        if sort_order == "desc":
+            query = query.order_by(sort_column.desc(), Project.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Project.id.asc())
+
+        # Apply pagination
+        offset = (page - 1) * page_size
+        query = query.offset(offset).limit(page_size)
+
+        # Execute query
+        result = await db.execute(query)
+        rows = result.all()
+
+    # Files count for the whole page in one query
+    files_counts = {}
+    if rows:
+        counts = await db.execute(
+            select(ProjectFile.project_id, func.count(ProjectFile.id))
+            .where(ProjectFile.project_id.in_([project.id for project, _ in rows]))
+            .group_by(ProjectFile.project_id)
+        )
+        files_counts = {str(project_id): count for project_id, count in counts.all()}
 
     # Build response
     items = []
     for project, user in rows:
-        # Get files count
-        files_count = await db.scalar(
-            select(func.count(ProjectFile.id)).where(ProjectFile.project_id == project.id)
-        )
-
         items.append(AdminProjectResponse(
             id=str(project.id),
             title=project.title,
@@ -126,7 +160,7 @@ async def list_projects(
             user_id=str(project.user_id),
             user_email=user.email,
             user_name=user.full_name,
-            files_count=files_count or 0,
+            files_count=files_counts.get(str(project.id), 0),
             storage_size_mb=0.0,  # TODO: Calculate from file sizes
             created_at=project.created_at,
             updated_at=project.updated_at,
@@ -135,10 +169,12 @@ async def list_projects(
 
     return AdminProjectsResponse(
         items=items,
-        total=total or 0,
+        total=total,
         page=page,
         page_size=page_size,
-        total_pages=math.ceil((total or 0) / page_size) if total and total > 0 else 1
+        total_pages=max(1, math.ceil(total / page_size)) if total is not None else None,
+        next_cursor=next_cursor,
+        total_estimated=total_estimated
     )
 
 
@@ -546,7 +546,7 @@ async def get_sandbox_stats(
                 total_memory += stats.get("memory_usage_mb", 0)
 
         # Get port stats
-        port_stats = port_manager.get_stats()
+        port_stats = port_manager.get_stats(host=manager.port_host)
 
         # Get unhealthy containers list
         unhealthy_list = []
@@ -13,7 +13,6 @@ Flow:
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import asyncio
@@ -26,6 +25,7 @@ from app.core.logging_config import logger
 from app.core.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.auth.feature_flags import require_agentic_mode
+from app.utils.sse import sse_response
 
 router = APIRouter(prefix="/agentic", tags=["agentic"])
 
@@ -442,9 +442,8 @@ async def agentic_chat_stream(
                 logger.error(f"[Agentic Stream] Error: {e}", exc_info=True)
                 yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
 
-        return StreamingResponse(
+        return sse_response(
             event_generator(),
-            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
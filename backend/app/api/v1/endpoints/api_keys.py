@@ -12,10 +12,11 @@ from datetime import datetime
 from uuid import UUID
 
 from app.core.database import get_db
-from app.core.security import generate_api_key, generate_secret_key, get_password_hash
+from app.core.security import generate_api_key, generate_secret_key
 from app.models.user import User
 from app.models.api_key import APIKey, APIKeyStatus
 from app.modules.auth.dependencies import get_current_user
+from app.services.password_hasher import password_hasher
 from app.utils.pagination import create_paginated_response
 
 router = APIRouter()
@@ -99,7 +100,7 @@ async def create_api_key(
         name=key_data.name,
         description=key_data.description,
         key_prefix=key_prefix,
-        hashed_key=get_password_hash(api_key + secret_key),
+        hashed_key=await password_hasher.hash(api_key + secret_key),
         status=APIKeyStatus.ACTIVE,
         rate_limit=key_data.rate_limit,
         permissions=key_data.permissions
@@ -10,8 +10,6 @@ import uuid
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.security import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     create_refresh_token,
     decode_token
@@ -33,6 +31,7 @@ from app.modules.auth.dependencies import get_current_user
 from app.modules.oauth.google_provider import google_oauth
 from app.modules.oauth.github_provider import github_oauth
 from app.services.email_service import email_service
+from app.services.password_hasher import password_hasher
 from app.core.rate_limiter import limiter, auth_rate_limit, strict_rate_limit
 
 
@@ -108,7 +107,7 @@ async def register(
 
     user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password, ip=client_ip, account=user_data.email.lower()),
         full_name=user_data.full_name,
         phone=user_data.phone,
         role=user_role,
@@ -360,7 +359,8 @@ async def login(
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    # bcrypt runs in the hasher pool; outdated cost factors are upgraded in place
+    if not user or not await password_hasher.verify_and_update(user, credentials.password, ip=client_ip):
         logger.log_auth_event(
             event="login",
             success=False,
@@ -1121,7 +1121,7 @@ async def forgot_password(
     )
 
     # Store token hash in user record (optional - for single-use tokens)
-    user.reset_token_hash = get_password_hash(reset_token[:20])
+    user.reset_token_hash = await password_hasher.hash(reset_token[:20], account=user.email.lower())
     user.reset_token_expires = datetime.utcnow() + timedelta(hours=1)
     await db.commit()
 
@@ -1199,7 +1199,7 @@ async def reset_password(
         # Password validation is handled by Pydantic schema (validate_password_strength)
 
         # Update password
-        user.hashed_password = get_password_hash(request.new_password)
+        user.hashed_password = await password_hasher.hash(request.new_password, account=user.email.lower())
         user.reset_token_hash = None
         user.reset_token_expires = None
         await db.commit()
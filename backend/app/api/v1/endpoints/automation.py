@@ -4,7 +4,6 @@ Complete Bolt.new-style automation with Claude AI
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from pydantic import BaseModel
 import json
@@ -15,6 +14,7 @@ from app.modules.auth.dependencies import get_current_user
 from app.models.user import User
 from app.modules.automation import automation_engine
 from app.modules.agents import orchestrator, WorkflowMode
+from app.utils.sse import sse_response
 
 
 router = APIRouter(prefix="/automation", tags=["Automation"])
@@ -97,9 +97,8 @@ async def execute_automation_stream(
             }
             yield f"data: {json.dumps(error_event)}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -255,9 +254,8 @@ async def build_project_stream(
             }
             yield f"data: {json.dumps(error_event)}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         build_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive"
@@ -433,9 +431,8 @@ async def execute_multi_agent_stream(
             }
             yield f"data: {json.dumps(error_event)}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
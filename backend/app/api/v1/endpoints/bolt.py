@@ -4,7 +4,6 @@ Streaming chat, file operations, and code execution
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import AsyncGenerator
 import json
@@ -47,6 +46,7 @@ from app.modules.bolt.context_builder import context_builder
 from app.services.unified_storage import UnifiedStorageService
 from app.services.enterprise_tracker import EnterpriseTracker
 from app.services.storage_service import storage_service
+from app.utils.sse import sse_response
 
 
 router = APIRouter(prefix="/bolt", tags=["Bolt AI Editor"])
@@ -78,13 +78,16 @@ async def stream_bolt_chat(
             # Build context from project files
             files_dict = [f.model_dump() for f in request.files]
 
-            context = context_builder.build_context(
+            # Runs in a worker thread: a project's first request builds its index
+            context = await asyncio.to_thread(
+                context_builder.build_context,
                 user_prompt=request.message,
                 files=files_dict,
                 project_name=request.project_name,
                 selected_file_path=request.selected_file,
                 max_files=10,
-                max_tokens=50000
+                max_tokens=50000,
+                index_key=f"{current_user.id}:{request.project_name}"
             )
 
             # Format context for Claude
@@ -116,7 +119,7 @@ async def stream_bolt_chat(
                 total_tokens += len(chunk) // 4  # Rough token estimate
 
                 # Send content event
-                yield f"data: {json.dumps({'type': 'content', 'data': {'chunk': chunk}, 'timestamp': datetime.utcnow().isoformat()})}\n\n"
+                yield {'type': 'content', 'data': {'chunk': chunk}, 'timestamp': datetime.utcnow().isoformat()}
 
             # Track AI response if project exists
             if project_uuid:
@@ -140,9 +143,8 @@ async def stream_bolt_chat(
             logger.error(f"Bolt streaming error: {e}", exc_info=True)
             yield f"data: {json.dumps({'type': 'error', 'data': {'error': str(e)}, 'timestamp': datetime.utcnow().isoformat()})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -164,13 +166,16 @@ async def bolt_chat(
         # Build context
         files_dict = [f.model_dump() for f in request.files]
 
-        context = context_builder.build_context(
+        # Runs in a worker thread: a project's first request builds its index
+        context = await asyncio.to_thread(
+            context_builder.build_context,
             user_prompt=request.message,
             files=files_dict,
             project_name=request.project_name,
             selected_file_path=request.selected_file,
             max_files=10,
-            max_tokens=50000
+            max_tokens=50000,
+            index_key=f"{current_user.id}:{request.project_name}"
         )
 
         formatted_context = context_builder.format_for_claude(context)
@@ -605,9 +610,8 @@ async def execute_code_stream(
             logger.error(f"Stream execution error: {e}", exc_info=True)
             yield f"data: {json.dumps({'type': 'error', 'data': {'message': str(e)}})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -7,8 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from datetime import datetime
-import random
+from datetime import datetime, timedelta
 
 from app.core.database import get_db
 from app.core.logging_config import logger
@@ -33,6 +32,12 @@ from app.schemas.campus_drive import (
     QuizResumeResponse,
     SavedAnswer,
 )
+from app.services.quiz_session_service import (
+    COMPLETED_STATUSES,
+    QuestionBank,
+    QuizSession,
+    quiz_sessions,
+)
 
 router = APIRouter(prefix="/campus-drive", tags=["Campus Drive"])
 
@@ -216,6 +221,52 @@ async def check_registration(
 # Quiz Endpoints
 # ============================================
 
+def _quiz_questions(bank: QuestionBank, session: QuizSession) -> List[QuestionForQuiz]:
+    """A session's questions as served, options in the taker's order"""
+    questions = []
+    for item in session.items:
+        q = bank.by_id.get(item.question_id)
+        if q is None:
+            # Deleted from the bank mid-quiz
+            continue
+        questions.append(
+            QuestionForQuiz(
+                id=q.id,
+                question_text=q.question_text,
+                category=q.category,
+                options=[q.options[i] for i in item.order],
+                marks=q.marks
+            )
+        )
+    return questions
+
+
+async def _raise_quiz_not_open(db: AsyncSession, drive_id: str, email: str, completed_detail: str):
+    """Explain why there is no quiz in progress"""
+    result = await db.execute(
+        select(CampusDriveRegistration.status).where(
+            CampusDriveRegistration.campus_drive_id == drive_id,
+            CampusDriveRegistration.email == email
+        )
+    )
+    registration_status = result.scalar_one_or_none()
+
+    if registration_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Registration not found"
+        )
+    if registration_status in COMPLETED_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=completed_detail
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Quiz not started yet"
+    )
+
+
 @router.post("/drives/{drive_id}/quiz/start")
 async def start_quiz(
     drive_id: str,
@@ -227,124 +278,61 @@ async def start_quiz(
     Returns questions without correct answers.
     """
     try:
-        # Get registration
-        result = await db.execute(
-            select(CampusDriveRegistration).where(
-                CampusDriveRegistration.campus_drive_id == drive_id,
-                CampusDriveRegistration.email == email
-            )
-        )
-        registration = result.scalar_one_or_none()
-
-        if not registration:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="You are not registered for this drive"
+        # Refresh or second tab: serve the stored session, timer unchanged
+        session = await quiz_sessions.get_session(drive_id, email)
+
+        if session is None:
+            # Get registration
+            result = await db.execute(
+                select(CampusDriveRegistration).where(
+                    CampusDriveRegistration.campus_drive_id == drive_id,
+                    CampusDriveRegistration.email == email
+                )
             )
+            registration = result.scalar_one_or_none()
 
-        # Check if quiz already completed
-        if registration.status == RegistrationStatus.QUIZ_COMPLETED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You have already completed the quiz"
-            )
+            if not registration:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="You are not registered for this drive"
+                )
 
-        # Get drive
-        drive_result = await db.execute(
-            select(CampusDrive).where(CampusDrive.id == drive_id)
-        )
-        drive = drive_result.scalar_one_or_none()
+            # Check if quiz already completed
+            if registration.status in COMPLETED_STATUSES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="You have already completed the quiz"
+                )
 
-        if not drive:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Campus drive not found"
-            )
+            bank = await quiz_sessions.get_bank(db, drive_id)
 
-        # Get all questions in one query (optimized for performance)
-        q_result = await db.execute(
-            select(CampusDriveQuestion).where(
-                (CampusDriveQuestion.campus_drive_id == drive_id) |
-                (CampusDriveQuestion.is_global == True)
-            )
-        )
-        all_questions = list(q_result.scalars().all())
-
-        # Group by category
-        questions_by_category = {
-            QuestionCategory.LOGICAL: [],
-            QuestionCategory.TECHNICAL: [],
-            QuestionCategory.AI_ML: [],
-            QuestionCategory.ENGLISH: [],
-            QuestionCategory.CODING: [],
-        }
-        for q in all_questions:
-            if q.category in questions_by_category:
-                questions_by_category[q.category].append(q)
-
-        # Select required number from each category
-        questions = []
-        category_counts = [
-            (QuestionCategory.LOGICAL, drive.logical_questions),
-            (QuestionCategory.TECHNICAL, drive.technical_questions),
-            (QuestionCategory.AI_ML, drive.ai_ml_questions),
-            (QuestionCategory.ENGLISH, drive.english_questions),
-            (QuestionCategory.CODING, getattr(drive, 'coding_questions', 0) or 0),
-        ]
+            if not bank:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Campus drive not found"
+                )
 
-        for category, count in category_counts:
-            if count <= 0:
-                continue
-            category_questions = questions_by_category.get(category, [])
-            if len(category_questions) >= count:
-                selected = random.sample(category_questions, count)
+            if registration.status == RegistrationStatus.QUIZ_IN_PROGRESS and registration.quiz_start_time:
+                # Started, but the session is gone: rebuild it (same questions and order)
+                session = await quiz_sessions.open_session(db, drive_id, email)
             else:
-                selected = category_questions
-            questions.extend(selected)
-
-        # Shuffle all questions using registration-specific seed
-        # This ensures same user gets same order if they refresh, but different users get different orders
-        user_seed = hash(str(registration.id) + str(drive_id))
-        rng = random.Random(user_seed)
-        rng.shuffle(questions)
-
-        # Update registration status
-        registration.status = RegistrationStatus.QUIZ_IN_PROGRESS
-        registration.quiz_start_time = datetime.utcnow()
-        await db.commit()
+                registration.status = RegistrationStatus.QUIZ_IN_PROGRESS
+                registration.quiz_start_time = datetime.utcnow()
+                registration.quiz_deadline = registration.quiz_start_time + timedelta(minutes=bank.duration_minutes)
+                await db.commit()
+                session = await quiz_sessions.start_session(bank, registration)
+        else:
+            bank = await quiz_sessions.get_bank(db, drive_id)
 
-        # Convert to response format with shuffled options per question
-        # Each user gets different option order based on their registration + question ID
-        quiz_questions = []
-        for q in questions:
-            # Create a seed unique to this user + question combination
-            option_seed = hash(str(registration.id) + str(q.id))
-            option_rng = random.Random(option_seed)
-
-            # Create shuffled indices and shuffle options
-            original_options = list(q.options)
-            indices = list(range(len(original_options)))
-            option_rng.shuffle(indices)
-
-            shuffled_options = [original_options[i] for i in indices]
-
-            quiz_questions.append(
-                QuestionForQuiz(
-                    id=q.id,
-                    question_text=q.question_text,
-                    category=q.category,
-                    options=shuffled_options,
-                    marks=q.marks
-                )
-            )
+        quiz_questions = _quiz_questions(bank, session)
 
         return QuizStartResponse(
-            registration_id=registration.id,
-            drive_name=drive.name,
-            duration_minutes=drive.quiz_duration_minutes,
+            registration_id=session.registration_id,
+            drive_name=bank.drive_name,
+            duration_minutes=session.duration_minutes,
             total_questions=len(quiz_questions),
             questions=quiz_questions,
-            start_time=registration.quiz_start_time
+            start_time=session.started_at
         )
 
     except HTTPException:
@@ -367,160 +355,50 @@ async def submit_quiz(
 ):
     """
     Submit quiz answers and get results.
+    Answers are graded against the option order served at start; saved
+    progress fills in questions missing from the submission. Past the
+    deadline (plus QUIZ_SUBMIT_GRACE_SECONDS) only saved progress counts.
     """
     try:
-        # Get registration
-        result = await db.execute(
-            select(CampusDriveRegistration).where(
-                CampusDriveRegistration.campus_drive_id == drive_id,
-                CampusDriveRegistration.email == email
-            )
-        )
-        registration = result.scalar_one_or_none()
+        session = await quiz_sessions.open_session(db, drive_id, email)
 
-        if not registration:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Registration not found"
-            )
+        if session is None:
+            await _raise_quiz_not_open(db, drive_id, email, "Quiz already submitted")
+
+        grade = await quiz_sessions.grade(
+            db, session, {str(answer.question_id): answer.selected_option for answer in submission.answers}
+        )
 
-        if registration.status == RegistrationStatus.QUIZ_COMPLETED:
+        if grade is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Quiz already submitted"
             )
 
-        # Get drive for passing percentage
-        drive_result = await db.execute(
-            select(CampusDrive).where(CampusDrive.id == drive_id)
-        )
-        drive = drive_result.scalar_one_or_none()
-
-        # Batch fetch all questions at once (fixes N+1 query problem)
-        question_ids = [str(answer.question_id) for answer in submission.answers]
-        q_result = await db.execute(
-            select(CampusDriveQuestion).where(CampusDriveQuestion.id.in_(question_ids))
-        )
-        questions_list = q_result.scalars().all()
-        questions_map = {str(q.id): q for q in questions_list}
-
-        # Process answers
-        total_marks = 0
-        marks_obtained = 0
-        correct_count = 0
-        wrong_count = 0
-        attempted = 0
-
-        # Section-wise tracking
-        section_scores = {
-            QuestionCategory.LOGICAL: {"obtained": 0, "total": 0},
-            QuestionCategory.TECHNICAL: {"obtained": 0, "total": 0},
-            QuestionCategory.AI_ML: {"obtained": 0, "total": 0},
-            QuestionCategory.ENGLISH: {"obtained": 0, "total": 0},
-            QuestionCategory.CODING: {"obtained": 0, "total": 0},
-        }
-
-        # Prepare bulk responses list
-        responses_to_add = []
-
-        for answer in submission.answers:
-            question = questions_map.get(str(answer.question_id))
-
-            if not question:
-                continue
-
-            total_marks += question.marks
-            section_scores[question.category]["total"] += question.marks
-
-            is_correct = False
-            marks = 0
-
-            if answer.selected_option is not None:
-                attempted += 1
-
-                # Recreate the same option shuffle to map user's selection back to original index
-                # This uses the same seed as when the quiz was started
-                option_seed = hash(str(registration.id) + str(question.id))
-                option_rng = random.Random(option_seed)
-
-                # Get the shuffle mapping: indices[shuffled_pos] = original_pos
-                indices = list(range(len(question.options)))
-                option_rng.shuffle(indices)
-
-                # Map user's selected shuffled index back to original index
-                # User selected shuffled position -> we need original position
-                # indices[i] gives original index that is now at shuffled position i
-                original_selected = indices[answer.selected_option] if answer.selected_option < len(indices) else -1
-
-                if original_selected == question.correct_option:
-                    is_correct = True
-                    marks = question.marks
-                    correct_count += 1
-                else:
-                    wrong_count += 1
-
-            marks_obtained += marks
-            section_scores[question.category]["obtained"] += marks
-
-            # Prepare response for bulk insert
-            responses_to_add.append(CampusDriveResponse(
-                registration_id=registration.id,
-                question_id=question.id,
-                selected_option=answer.selected_option,
-                is_correct=is_correct,
-                marks_obtained=marks
-            ))
-
-        # Bulk add all responses
-        db.add_all(responses_to_add)
-
-        # Calculate percentage
-        percentage = (marks_obtained / total_marks * 100) if total_marks > 0 else 0
-        is_qualified = percentage >= drive.passing_percentage
-
-        # Update registration
-        registration.status = RegistrationStatus.QUIZ_COMPLETED
-        registration.quiz_end_time = datetime.utcnow()
-        registration.quiz_score = marks_obtained
-        registration.total_marks = total_marks
-        registration.percentage = percentage
-        registration.is_qualified = is_qualified
-        registration.logical_score = section_scores[QuestionCategory.LOGICAL]["obtained"]
-        registration.technical_score = section_scores[QuestionCategory.TECHNICAL]["obtained"]
-        registration.ai_ml_score = section_scores[QuestionCategory.AI_ML]["obtained"]
-        registration.english_score = section_scores[QuestionCategory.ENGLISH]["obtained"]
-        registration.coding_score = section_scores[QuestionCategory.CODING]["obtained"]
-
-        if is_qualified:
-            registration.status = RegistrationStatus.QUALIFIED
-        else:
-            registration.status = RegistrationStatus.NOT_QUALIFIED
-
-        await db.commit()
-
-        logger.info(f"Quiz submitted: {email} scored {percentage}% - {'QUALIFIED' if is_qualified else 'NOT QUALIFIED'}")
+        logger.info(f"Quiz submitted: {email} scored {grade.percentage}% - {'QUALIFIED' if grade.is_qualified else 'NOT QUALIFIED'}")
 
+        sections = grade.section_scores
         return QuizResultResponse(
-            registration_id=registration.id,
-            total_questions=len(submission.answers),
-            attempted=attempted,
-            correct=correct_count,
-            wrong=wrong_count,
-            total_marks=total_marks,
-            marks_obtained=marks_obtained,
-            percentage=round(percentage, 2),
-            is_qualified=is_qualified,
-            passing_percentage=drive.passing_percentage,
-            logical_score=section_scores[QuestionCategory.LOGICAL]["obtained"],
-            logical_total=section_scores[QuestionCategory.LOGICAL]["total"],
-            technical_score=section_scores[QuestionCategory.TECHNICAL]["obtained"],
-            technical_total=section_scores[QuestionCategory.TECHNICAL]["total"],
-            ai_ml_score=section_scores[QuestionCategory.AI_ML]["obtained"],
-            ai_ml_total=section_scores[QuestionCategory.AI_ML]["total"],
-            english_score=section_scores[QuestionCategory.ENGLISH]["obtained"],
-            english_total=section_scores[QuestionCategory.ENGLISH]["total"],
-            coding_score=section_scores[QuestionCategory.CODING]["obtained"],
-            coding_total=section_scores[QuestionCategory.CODING]["total"],
+            registration_id=session.registration_id,
+            total_questions=grade.total_questions,
+            attempted=grade.attempted,
+            correct=grade.correct,
+            wrong=grade.wrong,
+            total_marks=grade.total_marks,
+            marks_obtained=grade.marks_obtained,
+            percentage=round(grade.percentage, 2),
+            is_qualified=grade.is_qualified,
+            passing_percentage=session.passing_percentage,
+            logical_score=sections[QuestionCategory.LOGICAL.value]["obtained"],
+            logical_total=sections[QuestionCategory.LOGICAL.value]["total"],
+            technical_score=sections[QuestionCategory.TECHNICAL.value]["obtained"],
+            technical_total=sections[QuestionCategory.TECHNICAL.value]["total"],
+            ai_ml_score=sections[QuestionCategory.AI_ML.value]["obtained"],
+            ai_ml_total=sections[QuestionCategory.AI_ML.value]["total"],
+            english_score=sections[QuestionCategory.ENGLISH.value]["obtained"],
+            english_total=sections[QuestionCategory.ENGLISH.value]["total"],
+            coding_score=sections[QuestionCategory.CODING.value]["obtained"],
+            coding_total=sections[QuestionCategory.CODING.value]["total"],
         )
 
     except HTTPException:
@@ -540,7 +418,11 @@ async def get_result(
     email: str,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get quiz result for a student"""
+    """
+    Get quiz result for a student.
+    Read from the graded registration's columns; section totals and the
+    passing percentage come from the cached question bank.
+    """
     try:
         # Get registration
         result = await db.execute(
@@ -557,49 +439,57 @@ async def get_result(
                 detail="Registration not found"
             )
 
-        if registration.status not in [RegistrationStatus.QUIZ_COMPLETED, RegistrationStatus.QUALIFIED, RegistrationStatus.NOT_QUALIFIED]:
+        if registration.status not in COMPLETED_STATUSES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Quiz not yet completed"
             )
 
-        # Get drive
-        drive_result = await db.execute(
-            select(CampusDrive).where(CampusDrive.id == drive_id)
-        )
-        drive = drive_result.scalar_one_or_none()
+        bank = await quiz_sessions.get_bank(db, drive_id)
 
-        # Count responses
-        responses_result = await db.execute(
-            select(CampusDriveResponse).where(
-                CampusDriveResponse.registration_id == registration.id
+        if not bank:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campus drive not found"
             )
-        )
-        responses = responses_result.scalars().all()
 
-        attempted = sum(1 for r in responses if r.selected_option is not None)
-        correct = sum(1 for r in responses if r.is_correct)
-        wrong = attempted - correct
+        if registration.total_questions is not None:
+            total_questions = registration.total_questions
+            attempted = registration.attempted_questions or 0
+            correct = registration.correct_answers or 0
+        else:
+            # Graded before counts were stored on the registration
+            counts = await db.execute(
+                select(
+                    func.count(CampusDriveResponse.id),
+                    func.count(CampusDriveResponse.selected_option),
+                    func.count(CampusDriveResponse.id).filter(CampusDriveResponse.is_correct == True),
+                ).where(CampusDriveResponse.registration_id == registration.id)
+            )
+            total_questions, attempted, correct = counts.one()
 
+        counts_by_category = bank.category_counts
         return QuizResultResponse(
             registration_id=registration.id,
-            total_questions=len(responses),
+            total_questions=total_questions,
             attempted=attempted,
             correct=correct,
-            wrong=wrong,
+            wrong=attempted - correct,
             total_marks=registration.total_marks or 0,
             marks_obtained=registration.quiz_score or 0,
             percentage=registration.percentage or 0,
             is_qualified=registration.is_qualified,
-            passing_percentage=drive.passing_percentage,
+            passing_percentage=bank.passing_percentage,
             logical_score=registration.logical_score,
-            logical_total=drive.logical_questions,
+            logical_total=counts_by_category[QuestionCategory.LOGICAL.value],
             technical_score=registration.technical_score,
-            technical_total=drive.technical_questions,
+            technical_total=counts_by_category[QuestionCategory.TECHNICAL.value],
             ai_ml_score=registration.ai_ml_score,
-            ai_ml_total=drive.ai_ml_questions,
+            ai_ml_total=counts_by_category[QuestionCategory.AI_ML.value],
             english_score=registration.english_score,
-            english_total=drive.english_questions,
+            english_total=counts_by_category[QuestionCategory.ENGLISH.value],
+            coding_score=registration.coding_score or 0,
+            coding_total=counts_by_category[QuestionCategory.CODING.value],
         )
 
     except HTTPException:
@@ -626,68 +516,28 @@ async def save_quiz_progress(
     """
     Save quiz progress without submitting.
     Allows students to resume if browser crashes.
+    Answers are upserted into the quiz session; the database is written
+    once, when the quiz is graded.
     """
     try:
-        # Get registration
-        result = await db.execute(
-            select(CampusDriveRegistration).where(
-                CampusDriveRegistration.campus_drive_id == drive_id,
-                CampusDriveRegistration.email == email
-            )
-        )
-        registration = result.scalar_one_or_none()
-
-        if not registration:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Registration not found"
-            )
+        session = await quiz_sessions.open_session(db, drive_id, email)
 
         # Only allow saving if quiz is in progress
-        if registration.status != RegistrationStatus.QUIZ_IN_PROGRESS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Quiz is not in progress"
-            )
+        if session is None:
+            await _raise_quiz_not_open(db, drive_id, email, "Quiz is not in progress")
 
         # Check if quiz time has expired
-        if registration.quiz_start_time:
-            drive_result = await db.execute(
-                select(CampusDrive).where(CampusDrive.id == drive_id)
+        if session.seconds_remaining() <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Quiz time has expired"
             )
-            drive = drive_result.scalar_one_or_none()
 
-            elapsed = (datetime.utcnow() - registration.quiz_start_time).total_seconds()
-            if elapsed > (drive.quiz_duration_minutes * 60):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Quiz time has expired"
-                )
-
-        # Delete existing saved responses for this registration
-        await db.execute(
-            CampusDriveResponse.__table__.delete().where(
-                CampusDriveResponse.registration_id == registration.id
-            )
+        saved_count = await quiz_sessions.save_answers(
+            session, {str(answer.question_id): answer.selected_option for answer in progress.answers}
         )
 
-        # Save new responses
-        saved_count = 0
-        for answer in progress.answers:
-            if answer.selected_option is not None:
-                response = CampusDriveResponse(
-                    registration_id=registration.id,
-                    question_id=str(answer.question_id),
-                    selected_option=answer.selected_option,
-                    is_correct=False,  # Will be calculated on final submit
-                    marks_obtained=0
-                )
-                db.add(response)
-                saved_count += 1
-
-        await db.commit()
-
-        logger.info(f"Quiz progress saved: {email} - {saved_count} answers")
+        logger.debug(f"Quiz progress saved: {email} - {saved_count} answers")
         return QuizProgressResponse(
             saved_count=saved_count,
             message="Progress saved successfully"
@@ -697,7 +547,6 @@ async def save_quiz_progress(
         raise
     except Exception as e:
         logger.error(f"Error saving quiz progress: {e}")
-        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save progress"
@@ -715,164 +564,52 @@ async def resume_quiz(
     Returns questions with any previously saved answers.
     """
     try:
-        # Get registration
-        result = await db.execute(
-            select(CampusDriveRegistration).where(
-                CampusDriveRegistration.campus_drive_id == drive_id,
-                CampusDriveRegistration.email == email
-            )
-        )
-        registration = result.scalar_one_or_none()
+        session = await quiz_sessions.open_session(db, drive_id, email)
 
-        if not registration:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Registration not found"
-            )
+        if session is None:
+            await _raise_quiz_not_open(db, drive_id, email, "Quiz already completed")
 
-        # Check if quiz is completed
-        if registration.status in [RegistrationStatus.QUIZ_COMPLETED, RegistrationStatus.QUALIFIED, RegistrationStatus.NOT_QUALIFIED]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Quiz already completed"
-            )
+        bank = await quiz_sessions.get_bank(db, drive_id)
 
-        # Check if quiz was started
-        if registration.status != RegistrationStatus.QUIZ_IN_PROGRESS or not registration.quiz_start_time:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Quiz not started yet"
-            )
-
-        # Get drive
-        drive_result = await db.execute(
-            select(CampusDrive).where(CampusDrive.id == drive_id)
-        )
-        drive = drive_result.scalar_one_or_none()
-
-        if not drive:
+        if not bank:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Campus drive not found"
             )
 
-        # Calculate remaining time
-        elapsed = (datetime.utcnow() - registration.quiz_start_time).total_seconds()
-        total_seconds = drive.quiz_duration_minutes * 60
-        remaining_seconds = max(0, int(total_seconds - elapsed))
+        remaining_seconds = session.seconds_remaining()
 
         # Check if time expired
         if remaining_seconds <= 0:
             return QuizResumeResponse(
-                registration_id=registration.id,
-                drive_name=drive.name,
-                duration_minutes=drive.quiz_duration_minutes,
+                registration_id=session.registration_id,
+                drive_name=bank.drive_name,
+                duration_minutes=session.duration_minutes,
                 total_questions=0,
                 questions=[],
-                start_time=registration.quiz_start_time,
+                start_time=session.started_at,
                 time_remaining_seconds=0,
                 saved_answers=[],
                 can_resume=False,
                 message="Quiz time has expired. Please submit your quiz."
             )
 
-        # Get all questions (same logic as start_quiz)
-        q_result = await db.execute(
-            select(CampusDriveQuestion).where(
-                (CampusDriveQuestion.campus_drive_id == drive_id) |
-                (CampusDriveQuestion.is_global == True)
-            )
-        )
-        all_questions = list(q_result.scalars().all())
-
-        # Group by category
-        questions_by_category = {
-            QuestionCategory.LOGICAL: [],
-            QuestionCategory.TECHNICAL: [],
-            QuestionCategory.AI_ML: [],
-            QuestionCategory.ENGLISH: [],
-            QuestionCategory.CODING: [],
-        }
-        for q in all_questions:
-            if q.category in questions_by_category:
-                questions_by_category[q.category].append(q)
-
-        # Select required number from each category using same seed
-        questions = []
-        category_counts = [
-            (QuestionCategory.LOGICAL, drive.logical_questions),
-            (QuestionCategory.TECHNICAL, drive.technical_questions),
-            (QuestionCategory.AI_ML, drive.ai_ml_questions),
-            (QuestionCategory.ENGLISH, drive.english_questions),
-            (QuestionCategory.CODING, getattr(drive, 'coding_questions', 0) or 0),
-        ]
-
-        # Use same seed as original quiz start for consistent question selection
-        user_seed = hash(str(registration.id) + str(drive_id))
-        rng = random.Random(user_seed)
-
-        for category, count in category_counts:
-            category_questions = questions_by_category[category]
-            if len(category_questions) >= count:
-                # Use deterministic selection
-                rng_cat = random.Random(user_seed + hash(category.value))
-                indices = list(range(len(category_questions)))
-                rng_cat.shuffle(indices)
-                selected = [category_questions[i] for i in indices[:count]]
-            else:
-                selected = category_questions
-            questions.extend(selected)
-
-        # Shuffle questions with same seed
-        rng.shuffle(questions)
-
-        # Convert to response format with shuffled options
-        quiz_questions = []
-        for q in questions:
-            option_seed = hash(str(registration.id) + str(q.id))
-            option_rng = random.Random(option_seed)
-
-            original_options = list(q.options)
-            indices = list(range(len(original_options)))
-            option_rng.shuffle(indices)
-
-            shuffled_options = [original_options[i] for i in indices]
-
-            quiz_questions.append(
-                QuestionForQuiz(
-                    id=q.id,
-                    question_text=q.question_text,
-                    category=q.category,
-                    options=shuffled_options,
-                    marks=q.marks
-                )
-            )
-
-        # Get saved answers
-        saved_result = await db.execute(
-            select(CampusDriveResponse).where(
-                CampusDriveResponse.registration_id == registration.id
-            )
-        )
-        saved_responses = saved_result.scalars().all()
+        quiz_questions = _quiz_questions(bank, session)
 
         saved_answers = [
-            SavedAnswer(
-                question_id=str(r.question_id),
-                selected_option=r.selected_option
-            )
-            for r in saved_responses
+            SavedAnswer(question_id=question_id, selected_option=selected_option)
+            for question_id, selected_option in (await quiz_sessions.get_answers(session)).items()
         ]
 
         logger.info(f"Quiz resume: {email} - {len(saved_answers)} saved answers, {remaining_seconds}s remaining")
 
         return QuizResumeResponse(
-            registration_id=registration.id,
-            drive_name=drive.name,
-            duration_minutes=drive.quiz_duration_minutes,
+            registration_id=session.registration_id,
+            drive_name=bank.drive_name,
+            duration_minutes=session.duration_minutes,
             total_questions=len(quiz_questions),
             questions=quiz_questions,
-            start_time=registration.quiz_start_time,
+            start_time=session.started_at,
             time_remaining_seconds=remaining_seconds,
             saved_answers=saved_answers,
             can_resume=True,
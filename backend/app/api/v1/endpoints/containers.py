@@ -19,7 +19,6 @@ import json
 import os
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Query, Request, Depends
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -52,6 +51,7 @@ from app.core.database import get_db
 from app.core.logging_config import logger
 from app.services.workspace_restore import workspace_restore
 from app.modules.auth.feature_flags import require_code_execution
+from app.utils.sse import sse_response
 
 router = APIRouter(prefix="/containers", tags=["Container Execution"])
 
@@ -469,9 +469,8 @@ async def execute_command(
         }
         yield f"data: {json.dumps(done_event)}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_stream(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -946,9 +945,8 @@ async def batch_execute_commands(
         }
         yield f"data: {json.dumps(done_event)}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_stream(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
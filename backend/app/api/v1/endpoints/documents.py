@@ -34,6 +34,7 @@ from app.modules.agents.chunked_document_agent import (
 from app.core.logging_config import logger
 from app.utils.pagination import create_paginated_response
 from app.modules.auth.feature_flags import require_document_generation, require_feature
+from app.utils.sse import sse_response
 
 
 router = APIRouter()
@@ -277,9 +278,8 @@ async def generate_document_stream(
             logger.error(f"[DocumentAPI] Error: {e}", exc_info=True)
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -957,9 +957,8 @@ async def regenerate_all_documents(
             logger.error(f"[DocRegen] Error: {e}", exc_info=True)
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
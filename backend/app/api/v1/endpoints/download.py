@@ -4,7 +4,7 @@ Download Endpoint - ZIP download with immediate cleanup
 Flow:
 1. User generates project → files stored in temp session
 2. User clicks "Download ZIP"
-3. Server creates ZIP → streams to user
+3. Server streams the ZIP while building it (no archive on disk)
 4. Server DELETES session immediately after download
 
 Zero permanent storage!
@@ -49,24 +49,31 @@ async def download_project_zip(
     safe_name = safe_name or "project"
     filename = f"{safe_name}.zip"
 
-    # Create ZIP if not exists
+    # Schedule cleanup after response is sent
+    if cleanup:
+        background_tasks.add_task(cleanup_session_delayed, session_id, delay_seconds=5)
+
+    # Serve a previously built ZIP as-is
     zip_path = temp_storage.get_zip_path(session_id)
-    if not zip_path:
-        zip_path = temp_storage.create_zip(session_id, project_name)
+    if zip_path:
+        return FileResponse(
+            path=str(zip_path),
+            filename=filename,
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"'
+            }
+        )
 
-    if not zip_path or not zip_path.exists():
+    zip_stream = temp_storage.stream_zip(session_id, project_name)
+    if zip_stream is None:
         raise HTTPException(
             status_code=500,
             detail="Failed to create ZIP file"
         )
 
-    # Schedule cleanup after response is sent
-    if cleanup:
-        background_tasks.add_task(cleanup_session_delayed, session_id, delay_seconds=5)
-
-    return FileResponse(
-        path=str(zip_path),
-        filename=filename,
+    return StreamingResponse(
+        zip_stream,
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
@@ -94,21 +101,16 @@ async def stream_project_zip(
     safe_name = "".join(c for c in (project_name or "project") if c.isalnum() or c in (' ', '-', '_')).strip()
     filename = f"{safe_name or 'project'}.zip"
 
-    # Create ZIP
-    zip_path = temp_storage.create_zip(session_id, project_name)
-    if not zip_path:
+    # ZIP is built while streaming; first bytes go out immediately
+    zip_stream = temp_storage.stream_zip(session_id, project_name)
+    if zip_stream is None:
         raise HTTPException(status_code=500, detail="Failed to create ZIP")
 
-    async def generate():
-        with open(zip_path, "rb") as f:
-            while chunk := f.read(8192):  # 8KB chunks
-                yield chunk
-
     # Cleanup after streaming
     background_tasks.add_task(cleanup_session_delayed, session_id, delay_seconds=10)
 
     return StreamingResponse(
-        generate(),
+        zip_stream,
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
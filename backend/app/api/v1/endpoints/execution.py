@@ -8,7 +8,7 @@ This module provides Docker-based project execution with:
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import Response
 from sse_starlette.sse import EventSourceResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
@@ -38,6 +38,7 @@ from app.services.sandbox_cleanup import touch_project
 from app.services.log_bus import get_log_bus
 from app.services.container_executor import container_executor
 from app.services.simple_fixer import classify_error, ErrorCategory
+from app.utils.sse import sse_response
 
 # Store running processes by project_id for stop functionality
 _running_processes: dict[str, asyncio.subprocess.Process] = {}
@@ -302,7 +303,7 @@ async def run_project(
             logger.warning(f"[Execution] touch_project failed in endpoint: {touch_err}")
 
         # Stream Docker execution with progress
-        # Use StreamingResponse with manual SSE formatting
+        # Use sse_response with manual SSE formatting
         async def sse_generator():
             """Wrapper that formats events as SSE and adds keepalive"""
             event_count = 0
@@ -326,9 +327,8 @@ async def run_project(
                 logger.error(f"[SSE] Generator error: {e}", exc_info=True)
                 yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
 
-        return StreamingResponse(
+        return sse_response(
             sse_generator(),
-            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
                 "Connection": "keep-alive",
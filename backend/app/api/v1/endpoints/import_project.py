@@ -3,7 +3,6 @@ Project Import API - Upload existing projects for analysis, bug fixing, and docu
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional, List, Dict, Any
@@ -22,6 +21,7 @@ from app.models.project import Project
 from app.models.project_file import ProjectFile
 from app.modules.agents.import_analyzer_agent import import_analyzer_agent
 from app.core.types import generate_uuid
+from app.utils.sse import sse_response
 
 router = APIRouter()
 
@@ -219,16 +219,15 @@ async def analyze_project(
                 project_name=project.name,
                 analysis_type=analysis_type
             ):
-                yield f"data: {json.dumps({'type': 'content', 'text': text})}\n\n"
+                yield {'type': 'content', 'text': text}
 
             yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
-        stream_analysis(),
-        media_type="text/event-stream"
+    return sse_response(
+        stream_analysis()
     )
 
 
@@ -283,16 +282,15 @@ async def fix_bugs(
                 files=files_data,
                 bug_description=bug_description
             ):
-                yield f"data: {json.dumps({'type': 'content', 'text': text})}\n\n"
+                yield {'type': 'content', 'text': text}
 
             yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
-        stream_fixes(),
-        media_type="text/event-stream"
+    return sse_response(
+        stream_fixes()
     )
 
 
@@ -347,16 +345,15 @@ async def generate_documentation(
                 project_name=project.name,
                 doc_type=doc_type
             ):
-                yield f"data: {json.dumps({'type': 'content', 'text': text})}\n\n"
+                yield {'type': 'content', 'text': text}
 
             yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
-        stream_docs(),
-        media_type="text/event-stream"
+    return sse_response(
+        stream_docs()
     )
 
 
@@ -15,15 +15,24 @@ Auto-fix is triggered automatically when errors are detected!
 import json
 import asyncio
 import re
-from typing import Dict, Set, Optional
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.pubsub import listen
 from app.services.log_bus import get_log_bus, LogBusManager
 from app.services.auto_fixer import get_auto_fixer, AutoFixConfig
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
 router = APIRouter()
 
 
@@ -172,6 +181,24 @@ BUILD_ERROR_PATTERNS = [
 ]
 
 
+# All substring patterns as one alternation, matched against the lower-cased message
+_BUILD_ERROR_SUBSTRINGS = re.compile(
+    "|".join(re.escape(p) for p in sorted({p.lower() for p in BUILD_ERROR_PATTERNS}, key=len, reverse=True))
+)
+# File path references with line numbers (common in build errors)
+# Supports: JS/TS, Python, Go, Rust, Java, C/C++, Ruby, PHP, C#
+_FILE_LINE_REF = re.compile(
+    r'[/\\][\w/\\]+\.(tsx?|jsx?|vue|svelte|py|go|rs|java|kt|c|cpp|h|hpp|rb|php|cs|swift|scala|ex|exs|erl|hs|ml|fs)[:(\d]'
+)
+# Python/Go/Rust/Java-style stack traces
+_STACK_TRACE = re.compile(
+    r'File "[^"]+\.py", line \d+'
+    r'|\.go:\d+:\d+:'
+    r'|--> [^:]+\.rs:\d+:\d+'
+    r'|at [\w.$]+\([^:]+\.java:\d+\)'
+)
+
+
 def is_build_error(message: str) -> bool:
     """
     Check if a message is a build error across ALL technologies.
@@ -185,34 +212,78 @@ def is_build_error(message: str) -> bool:
     message_lower = message.lower()
 
     # Check for build error patterns
-    for pattern in BUILD_ERROR_PATTERNS:
-        if pattern.lower() in message_lower:
-            return True
-
-    # Check for file path references with line numbers (common in build errors)
-    # Supports: JS/TS, Python, Go, Rust, Java, C/C++, Ruby, PHP, C#
-    file_extensions = r'\.(tsx?|jsx?|vue|svelte|py|go|rs|java|kt|c|cpp|h|hpp|rb|php|cs|swift|scala|ex|exs|erl|hs|ml|fs)'
-    if re.search(rf'[/\\][\w/\\]+{file_extensions}[:(\d]', message):
-        if 'error' in message_lower or 'failed' in message_lower or 'exception' in message_lower:
-            return True
-
-    # Check for Python-style stack traces
-    if re.search(r'File "[^"]+\.py", line \d+', message):
+    if _BUILD_ERROR_SUBSTRINGS.search(message_lower):
         return True
 
-    # Check for Go-style errors
-    if re.search(r'\.go:\d+:\d+:', message):
+    # Check for file path references with line numbers ("error" and "failed"
+    # are already substring patterns, so only "exception" is left to test)
+    if 'exception' in message_lower and _FILE_LINE_REF.search(message):
         return True
 
-    # Check for Rust-style errors
-    if re.search(r'--> [^:]+\.rs:\d+:\d+', message):
-        return True
+    # Check for Python/Go/Rust/Java-style stack traces
+    return _STACK_TRACE.search(message) is not None
 
-    # Check for Java-style stack traces
-    if re.search(r'at [\w.$]+\([^:]+\.java:\d+\)', message):
-        return True
 
-    return False
+class ClientSender:
+    """
+    Outbound side of one WebSocket: a bounded queue drained by its own writer
+    task, so a slow client only delays itself. When the queue is full the
+    oldest message is dropped.
+
+    With batch=True, messages that queue up while a send is in flight go
+    out together as one {"type": "log_batch", "messages": [...]} frame.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        batch: bool = False,
+        max_queue: int = 1000,
+        batch_max: int = 100,
+        on_dead: Optional[Callable[["ClientSender"], None]] = None
+    ):
+        self.websocket = websocket
+        self.batch = batch
+        self.batch_max = batch_max
+        # A deque rather than asyncio.Queue: send() runs once per client per log line
+        self.queue: Deque[dict] = deque(maxlen=max_queue)
+        self.dropped = 0
+        self.frames = 0
+        self._ready = asyncio.Event()
+        self._on_dead = on_dead
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, message: dict):
+        """Queue a message (never blocks)"""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(message)
+        self._ready.set()
+
+    async def _run(self):
+        queue = self.queue
+        try:
+            while True:
+                if not queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                if self.batch and len(queue) > 1:
+                    count = min(len(queue), self.batch_max)
+                    message = {"type": "log_batch", "messages": [queue.popleft() for _ in range(count)]}
+                else:
+                    message = queue.popleft()
+                await self.websocket.send_json(message)
+                self.frames += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"[LogStream] Send failed, dropping client: {e}")
+            if self._on_dead:
+                self._on_dead(self)
+
+    def close(self):
+        self._task.cancel()
 
 
 class LogStreamManager:
@@ -222,76 +293,193 @@ class LogStreamManager:
     Each project can have multiple connected clients (browser previews).
     Logs are broadcast to LogBus and can be forwarded to monitoring clients.
     Auto-fix is triggered automatically when errors are detected!
+
+    Broadcasts only enqueue onto each client's ClientSender, so one slow
+    browser tab cannot hold up other clients or the log receive loop. With
+    Redis available (start()), broadcasts are also relayed to the other
+    workers over pub/sub, in batches, so monitors see every project and
+    browser clients get fix events from whichever worker ran the fix.
     """
 
     def __init__(self):
-        # project_id -> set of connected WebSockets
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # project_id -> {WebSocket: ClientSender}
+        self.active_connections: Dict[str, Dict[WebSocket, ClientSender]] = {}
         # Monitoring connections (receive all logs)
-        self.monitors: Set[WebSocket] = set()
+        self.monitors: Dict[WebSocket, ClientSender] = {}
         # Fix callback (set by application)
         self._fix_callback: Optional[callable] = None
         # Track pending auto-fix tasks
         self._pending_fixes: Dict[str, asyncio.Task] = {}
+        # Cross-worker relay (Redis pub/sub)
+        self._origin = uuid.uuid4().hex
+        self._redis = None
+        self._relay_tasks: List[asyncio.Task] = []
+        self._outbox: Deque[dict] = deque(maxlen=settings.LOG_STREAM_RELAY_BUFFER)
+        self._outbox_ready = asyncio.Event()
+        self.stats = {"relay_published": 0, "relay_received": 0, "relay_dropped": 0, "dropped_clients": 0}
 
     def set_fix_callback(self, callback: callable):
         """Set the callback function for auto-fix"""
         self._fix_callback = callback
         logger.info("[LogStream] Auto-fix callback registered")
 
+    def _sender(self, websocket: WebSocket, batch: bool) -> ClientSender:
+        return ClientSender(
+            websocket,
+            batch=batch,
+            max_queue=settings.LOG_STREAM_SEND_QUEUE_SIZE,
+            batch_max=settings.LOG_STREAM_BATCH_MAX,
+            on_dead=self._drop_sender
+        )
+
     async def connect(self, websocket: WebSocket, project_id: str):
         """Accept a new WebSocket connection for a project"""
         await websocket.accept()
 
         if project_id not in self.active_connections:
-            self.active_connections[project_id] = set()
+            self.active_connections[project_id] = {}
 
-        self.active_connections[project_id].add(websocket)
+        self.active_connections[project_id][websocket] = self._sender(websocket, batch=False)
         logger.info(f"[LogStream] Client connected for project {project_id}")
 
     async def connect_monitor(self, websocket: WebSocket):
-        """Connect a monitoring client (receives all logs)"""
+        """Connect a monitoring client (receives all logs, batched)"""
         await websocket.accept()
-        self.monitors.add(websocket)
+        self.monitors[websocket] = self._sender(websocket, batch=True)
         logger.info("[LogStream] Monitor client connected")
 
     def disconnect(self, websocket: WebSocket, project_id: str = None):
         """Remove a WebSocket connection"""
         if project_id and project_id in self.active_connections:
-            self.active_connections[project_id].discard(websocket)
+            sender = self.active_connections[project_id].pop(websocket, None)
+            if sender:
+                sender.close()
             if not self.active_connections[project_id]:
                 del self.active_connections[project_id]
 
-        self.monitors.discard(websocket)
+        sender = self.monitors.pop(websocket, None)
+        if sender:
+            sender.close()
         logger.debug(f"[LogStream] Client disconnected")
 
+    def _drop_sender(self, sender: ClientSender):
+        """Forget a client whose socket failed (its writer task has ended)"""
+        self.stats["dropped_clients"] += 1
+        if self.monitors.get(sender.websocket) is sender:
+            del self.monitors[sender.websocket]
+        for project_id, conns in list(self.active_connections.items()):
+            if conns.get(sender.websocket) is sender:
+                del conns[sender.websocket]
+                if not conns:
+                    del self.active_connections[project_id]
+
+    def _deliver(self, scope: str, project_id: Optional[str], message: dict):
+        """Enqueue a message for this worker's clients"""
+        if scope == "monitors":
+            senders = list(self.monitors.values())
+        else:
+            senders = list(self.active_connections.get(project_id, {}).values())
+        for sender in senders:
+            sender.send(message)
+
     async def broadcast_to_monitors(self, message: dict):
-        """Broadcast log to all monitoring clients"""
-        dead_monitors = set()
+        """Broadcast log to all monitoring clients (on every worker)"""
+        self._deliver("monitors", None, message)
+        self._relay("monitors", None, message)
 
-        for monitor in self.monitors:
-            try:
-                await monitor.send_json(message)
-            except Exception:
-                dead_monitors.add(monitor)
+    async def broadcast_to_project(self, project_id: str, message: dict):
+        """Broadcast message to all clients connected to a project (on every worker)"""
+        self._deliver("project", project_id, message)
+        self._relay("project", project_id, message)
 
-        # Cleanup dead connections
-        self.monitors -= dead_monitors
+    # ============= CROSS-WORKER RELAY =============
 
-    async def broadcast_to_project(self, project_id: str, message: dict):
-        """Broadcast message to all clients connected to a project"""
-        if project_id not in self.active_connections:
+    async def start(self):
+        """Connect the Redis pub/sub relay (broadcasts stay worker-local without it)"""
+        if aioredis is None or not settings.REDIS_URL:
+            logger.warning("[LogStream] redis.asyncio not available, broadcasts are worker-local")
+            return
+        try:
+            self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+            pubsub = self._redis.pubsub()
+            await pubsub.subscribe(settings.LOG_STREAM_RELAY_CHANNEL)
+        except Exception as e:
+            logger.warning(f"[LogStream] Redis relay unavailable ({e}), broadcasts are worker-local")
+            self._redis = None
             return
+        self._relay_tasks = [
+            asyncio.create_task(
+                listen(pubsub, settings.LOG_STREAM_RELAY_CHANNEL, self._handle_relayed, "[LogStream]")
+            ),
+            asyncio.create_task(self._publish_loop()),
+        ]
+        logger.info(f"[LogStream] Relaying broadcasts via Redis channel {settings.LOG_STREAM_RELAY_CHANNEL}")
+
+    async def stop(self):
+        for task in self._relay_tasks:
+            task.cancel()
+        await asyncio.gather(*self._relay_tasks, return_exceptions=True)
+        self._relay_tasks = []
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def _relay(self, scope: str, project_id: Optional[str], message: dict):
+        if self._redis is None:
+            return
+        if len(self._outbox) == self._outbox.maxlen:
+            self.stats["relay_dropped"] += 1
+        self._outbox.append({"scope": scope, "project_id": project_id, "message": message})
+        self._outbox_ready.set()
+
+    async def _publish_loop(self):
+        """Publish queued broadcasts as one Redis message per interval"""
+        interval = settings.LOG_STREAM_RELAY_INTERVAL_MS / 1000
+        while True:
+            await self._outbox_ready.wait()
+            await asyncio.sleep(interval)
+            self._outbox_ready.clear()
+            await self._publish_pending()
 
-        dead_connections = set()
-        for ws in self.active_connections[project_id]:
-            try:
-                await ws.send_json(message)
-            except Exception:
-                dead_connections.add(ws)
+    async def _publish_pending(self):
+        if not self._outbox:
+            return
+        events = list(self._outbox)
+        self._outbox.clear()
+        try:
+            await self._redis.publish(
+                settings.LOG_STREAM_RELAY_CHANNEL,
+                json.dumps({"origin": self._origin, "events": events}, default=str)
+            )
+            self.stats["relay_published"] += len(events)
+        except Exception as e:
+            self.stats["relay_dropped"] += len(events)
+            logger.warning(f"[LogStream] Relay publish failed: {e}")
 
-        # Cleanup dead connections
-        self.active_connections[project_id] -= dead_connections
+    def _handle_relayed(self, data: str):
+        """Deliver broadcasts published by other workers"""
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") == self._origin:
+            return
+        for event in payload.get("events", []):
+            self._deliver(event.get("scope"), event.get("project_id"), event.get("message"))
+            self.stats["relay_received"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        senders = [s for conns in self.active_connections.values() for s in conns.values()]
+        senders += list(self.monitors.values())
+        return {
+            "active_projects": len(self.active_connections),
+            "total_connections": sum(len(conns) for conns in self.active_connections.values()),
+            "monitors": len(self.monitors),
+            "queued": sum(len(s.queue) for s in senders),
+            "dropped_messages": sum(s.dropped for s in senders),
+            "relay_enabled": self._redis is not None,
+            **self.stats,
+        }
 
     async def trigger_auto_fix(self, project_id: str, is_error: bool = False):
         """
@@ -395,10 +583,11 @@ async def log_stream(websocket: WebSocket, project_id: str):
                 log_type = log_entry.get("type", "unknown")
                 log_data = log_entry.get("data", {})
                 timestamp = log_entry.get("timestamp", datetime.utcnow().timestamp() * 1000)
+                message_str = None
+                build_error = None
 
-                # Log received message for debugging
-                message_preview = str(log_data.get("message", log_data))[:100]
-                logger.info(f"[LogStream] 📥 RECEIVED from {project_id}: source={source}, type={log_type}, message={message_preview}")
+                # Per-line logging is debug only: projects stream hundreds of lines a second
+                logger.debug(f"[LogStream] Received from {project_id}: source={source}, type={log_type}")
 
                 # Route to appropriate LogBus method
                 if source == "browser":
@@ -463,7 +652,8 @@ async def log_stream(websocket: WebSocket, project_id: str):
                         else:
                             message_str = str(log_data)
                     message_str = str(message_str)
-                    if log_type == "stderr" or is_build_error(message_str):
+                    build_error = is_build_error(message_str)
+                    if log_type == "stderr" or build_error:
                         log_bus.add_build_error(message=message_str)
                     else:
                         log_bus.add_build_log(message_str)
@@ -481,7 +671,8 @@ async def log_stream(websocket: WebSocket, project_id: str):
                             message_str = str(log_data)
                     message_str = str(message_str)
                     # Check if this is actually a build error (Vite/Webpack from container)
-                    if is_build_error(message_str):
+                    build_error = is_build_error(message_str)
+                    if build_error:
                         log_bus.add_build_error(message=message_str)
                     elif log_type == "stderr" or "error" in message_str.lower():
                         log_bus.add_backend_error(message=message_str)
@@ -501,7 +692,8 @@ async def log_stream(websocket: WebSocket, project_id: str):
                             message_str = str(log_data)
                     message_str = str(message_str)
                     # Check if this is actually a build error (Vite/Webpack from container)
-                    if is_build_error(message_str):
+                    build_error = is_build_error(message_str)
+                    if build_error:
                         log_bus.add_build_error(message=message_str)
                     elif log_type == "stderr" or "error" in message_str.lower():
                         log_bus.add_docker_error(message_str)
@@ -524,11 +716,15 @@ async def log_stream(websocket: WebSocket, project_id: str):
                     "error" in log_type.lower() or
                     log_type in ("runtime_error", "promise_rejection", "console_error", "stderr")
                 )
-                is_error = is_error_type or is_build_error(message_for_check)
+                if is_error_type:
+                    is_error = True
+                elif build_error is not None and message_for_check == message_str:
+                    is_error = build_error  # Same text was already classified above
+                else:
+                    is_error = is_build_error(message_for_check)
 
                 if is_error:
-                    logger.info(f"[LogStream] 🔧 ERROR DETECTED - triggering auto-fix for {project_id}")
-                    logger.info(f"[LogStream]    type={log_type}, is_error_type={is_error_type}, is_build_error={is_build_error(message_for_check)}")
+                    logger.info(f"[LogStream] 🔧 ERROR DETECTED - triggering auto-fix for {project_id} (type={log_type})")
                     # Trigger auto-fix in background (debounced)
                     asyncio.create_task(
                         log_stream_manager.trigger_auto_fix(project_id, is_error=True)
@@ -554,6 +750,8 @@ async def log_monitor(websocket: WebSocket):
     WebSocket endpoint for monitoring all logs.
 
     DevTools/admin can connect here to see all project logs in real-time.
+    Logs from every worker arrive here; lines that queue up while the client
+    is busy are sent as one {"type": "log_batch", "messages": [...]} frame.
     """
     await log_stream_manager.connect_monitor(websocket)
 
@@ -565,14 +763,7 @@ async def log_monitor(websocket: WebSocket):
             if data == "ping":
                 await websocket.send_text("pong")
             elif data == "get_stats":
-                stats = {
-                    "active_projects": len(log_stream_manager.active_connections),
-                    "total_connections": sum(
-                        len(conns) for conns in log_stream_manager.active_connections.values()
-                    ),
-                    "monitors": len(log_stream_manager.monitors)
-                }
-                await websocket.send_json(stats)
+                await websocket.send_json(log_stream_manager.get_stats())
 
     except WebSocketDisconnect:
         log_stream_manager.disconnect(websocket)
@@ -591,7 +782,8 @@ async def log_stream_status():
             for pid, conns in log_stream_manager.active_connections.items()
         },
         "monitor_count": len(log_stream_manager.monitors),
-        "auto_fix_enabled": log_stream_manager._fix_callback is not None
+        "auto_fix_enabled": log_stream_manager._fix_callback is not None,
+        "delivery": log_stream_manager.get_stats()
     }
 
 
@@ -9,10 +9,9 @@ This module provides REST API endpoints for:
 """
 
 from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any, AsyncIterator, TypeVar
+from typing import Optional, List, Dict, Any
 from enum import Enum
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
@@ -21,15 +20,6 @@ import json
 import uuid
 from datetime import datetime
 
-T = TypeVar('T')
-
-# SSE Keepalive intervals (seconds)
-# Use very aggressive keepalive (1s) to prevent any buffering/timeout issues
-# This ensures data flows constantly to the client, preventing proxy/browser timeouts
-SSE_KEEPALIVE_INITIAL_INTERVAL = 1  # First 60 seconds: send keepalive every 1s (very aggressive)
-SSE_KEEPALIVE_INTERVAL = 5  # After 60 seconds: send keepalive every 5s
-SSE_KEEPALIVE_AGGRESSIVE_DURATION = 60  # Duration of aggressive keepalive phase (longer)
-
 from app.modules.orchestrator.dynamic_orchestrator import (
     DynamicOrchestrator,
     AgentType,
@@ -47,6 +37,7 @@ from app.modules.auth.usage_limits import check_token_limit, deduct_tokens, log_
 from app.modules.auth.feature_flags import check_feature_access
 from app.services.sandbox_cleanup import touch_project
 from app.services.enterprise_tracker import EnterpriseTracker
+from app.utils.sse import sse_response
 from uuid import UUID as UUID_type
 
 router = APIRouter(prefix="/orchestrator", tags=["orchestrator"])
@@ -81,99 +72,6 @@ optional_security = HTTPBearer(auto_error=False)
 
 # ==================== Helper Functions ====================
 
-async def with_keepalive(async_iterator: AsyncIterator[T], project_id: str) -> AsyncIterator[T]:
-    """
-    Wrap an async iterator with SSE keepalive support using CONCURRENT background task.
-
-    This uses an asyncio.Queue to merge events from:
-    1. The main workflow event stream
-    2. A background keepalive task that sends keepalives every 0.5 seconds
-
-    The background task ensures keepalives are sent CONTINUOUSLY, not just after timeouts.
-    This prevents race conditions where the client disconnects before the timeout fires.
-    """
-    import time
-    start_time = time.time()
-
-    # Queue to merge events and keepalives
-    event_queue: asyncio.Queue = asyncio.Queue()
-    stream_done = asyncio.Event()
-    keepalive_count = 0
-
-    async def stream_events():
-        """Background task to stream events from the async iterator into the queue"""
-        try:
-            async for event in async_iterator:
-                await event_queue.put(("event", event))
-            await event_queue.put(("done", None))
-        except asyncio.CancelledError:
-            logger.debug(f"[SSE Keepalive] Stream task cancelled for {project_id}")
-            await event_queue.put(("cancelled", None))
-        except Exception as e:
-            logger.error(f"[SSE Keepalive] Stream error for {project_id}: {e}")
-            await event_queue.put(("error", str(e)))
-        finally:
-            stream_done.set()
-
-    async def send_keepalives():
-        """Background task to send keepalives every 0.5 seconds"""
-        nonlocal keepalive_count
-        while not stream_done.is_set():
-            try:
-                # Wait 0.5 seconds or until stream is done
-                await asyncio.wait_for(stream_done.wait(), timeout=0.5)
-                break  # Stream is done
-            except asyncio.TimeoutError:
-                # Send keepalive
-                keepalive_count += 1
-                elapsed = time.time() - start_time
-                logger.debug(f"[SSE Keepalive] #{keepalive_count} for {project_id} (elapsed: {elapsed:.1f}s)")
-                await event_queue.put(("keepalive", keepalive_count))
-
-    # Start both tasks concurrently
-    stream_task = asyncio.create_task(stream_events())
-    keepalive_task = asyncio.create_task(send_keepalives())
-
-    try:
-        while True:
-            try:
-                # Get next item from queue with a long timeout (backup)
-                event_type, event_data = await asyncio.wait_for(
-                    event_queue.get(),
-                    timeout=30.0  # Backup timeout - should never trigger with 0.5s keepalives
-                )
-
-                if event_type == "event":
-                    yield event_data
-                elif event_type == "keepalive":
-                    yield None  # Signal to send keepalive
-                elif event_type == "done":
-                    break
-                elif event_type == "cancelled":
-                    break
-                elif event_type == "error":
-                    logger.error(f"[SSE Keepalive] Error in stream: {event_data}")
-                    break
-
-            except asyncio.TimeoutError:
-                # Backup keepalive if queue times out
-                logger.warning(f"[SSE Keepalive] Queue timeout for {project_id}, sending backup keepalive")
-                yield None
-    finally:
-        # Clean up tasks
-        stream_done.set()
-        keepalive_task.cancel()
-        stream_task.cancel()
-        try:
-            await keepalive_task
-        except asyncio.CancelledError:
-            pass
-        try:
-            await stream_task
-        except asyncio.CancelledError:
-            pass
-
-
 async def get_or_create_project(
     db: AsyncSession,
     project_id: str,
@@ -343,11 +241,9 @@ async def event_generator(
     """
     Generator for Server-Sent Events (SSE) streaming.
 
-    Yields events in SSE format:
-    data: {"type": "status", "message": "Starting workflow..."}
-
-    IMPORTANT: Each yield MUST be followed by an await to allow the event loop
-    to flush the data to the client. Without this, events get buffered.
+    Yields event dicts ({"type", "data", "step", "agent", "timestamp"}) for
+    app.utils.sse, which batches them into SSE writes, merges content deltas
+    and sends keepalives while the workflow is idle.
 
     If tracker is provided, important agent responses will be saved to the database.
     """
@@ -367,9 +263,7 @@ async def event_generator(
             "timestamp": None
         }
         logger.info("[SSE Generator] Sending initial connected event")
-        yield f"data: {json.dumps(initial_event)}\n\n"
-        # CRITICAL: Allow event loop to flush
-        await asyncio.sleep(0)
+        yield initial_event
 
         logger.info("[SSE Generator] Starting workflow execution...")
         if max_files_limit:
@@ -378,8 +272,7 @@ async def event_generator(
         # Clear any previous cancellation for this project
         clear_cancellation(project_id)
 
-        # Execute workflow and stream events with keepalive wrapper
-        # The keepalive wrapper sends heartbeats every 30 seconds to prevent CloudFront timeout
+        # Keepalives during idle periods (e.g. waiting for Claude) come from the SSE writer
         workflow_events = orchestrator.execute_workflow(
             user_request=user_request,
             project_id=project_id,
@@ -387,14 +280,7 @@ async def event_generator(
             metadata=metadata
         )
 
-        async for event in with_keepalive(workflow_events, project_id):
-            # Handle keepalive signal (None event)
-            if event is None:
-                # Send SSE comment as keepalive - ignored by EventSource but keeps connection alive
-                yield ": keepalive\n\n"
-                await asyncio.sleep(0)
-                continue
-
+        async for event in workflow_events:
             # Check for cancellation before processing each event
             if is_project_cancelled(project_id):
                 logger.info(f"[SSE Generator] Project {project_id} cancelled, stopping generation")
@@ -405,10 +291,10 @@ async def event_generator(
                     "agent": None,
                     "timestamp": None
                 }
-                yield f"data: {json.dumps(cancelled_event)}\n\n"
-                await asyncio.sleep(0)
+                yield cancelled_event
                 # Clear cancellation flag after sending event
                 clear_cancellation(project_id)
+                await workflow_events.aclose()
                 return  # Exit the generator
 
             # Log all events for debugging
@@ -430,8 +316,7 @@ async def event_generator(
                         "agent": event.agent,
                         "timestamp": event.timestamp.isoformat() if event.timestamp else None
                     }
-                    yield f"data: {json.dumps(event_data)}\n\n"
-                    await asyncio.sleep(0)
+                    yield event_data
 
                     # Then send upgrade required event
                     upgrade_event = {
@@ -449,8 +334,7 @@ async def event_generator(
                         "timestamp": None
                     }
                     logger.info(f"[SSE Generator] File limit reached! Sending upgrade_required event")
-                    yield f"data: {json.dumps(upgrade_event)}\n\n"
-                    await asyncio.sleep(0)
+                    yield upgrade_event
 
                     # Send complete event to end the stream gracefully
                     complete_event = {
@@ -465,8 +349,8 @@ async def event_generator(
                         "agent": None,
                         "timestamp": None
                     }
-                    yield f"data: {json.dumps(complete_event)}\n\n"
-                    await asyncio.sleep(0)
+                    yield complete_event
+                    await workflow_events.aclose()
                     return  # Stop generation
 
             # Log plan_created events and save planned files to DB
@@ -596,13 +480,7 @@ async def event_generator(
                 "timestamp": event.timestamp
             }
 
-            # SSE format: "data: {json}\n\n"
-            event_message = f"data: {json.dumps(event_data)}\n\n"
-            yield event_message
-
-            # CRITICAL: Allow event loop to flush after each yield
-            # This ensures the event is sent to the client immediately
-            await asyncio.sleep(0.01)
+            yield event_data
 
             # Log after yielding for plan_created
             if event_type == "plan_created":
@@ -640,8 +518,7 @@ async def event_generator(
             "agent": None,
             "timestamp": None
         }
-        yield f"data: {json.dumps(error_event)}\n\n"
-        await asyncio.sleep(0)
+        yield error_event
 
     finally:
         # Send completion event
@@ -653,8 +530,7 @@ async def event_generator(
             "agent": None,
             "timestamp": None
         }
-        yield f"data: {json.dumps(complete_event)}\n\n"
-        await asyncio.sleep(0)
+        yield complete_event
 
 
 # ==================== Workflow Execution Endpoints ====================
@@ -662,6 +538,7 @@ async def event_generator(
 @router.post("/execute")
 async def execute_workflow(
     request: WorkflowExecuteRequest,
+    http_request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
     db: AsyncSession = Depends(get_db)
 ):
@@ -865,7 +742,7 @@ async def execute_workflow(
                     "data": {
                         "project_id": actual_project_id,
                         "message": "SSE connection established",
-                        "keepalive_interval": SSE_KEEPALIVE_INITIAL_INTERVAL
+                        "keepalive_interval": settings.SSE_KEEPALIVE_INITIAL_SECONDS
                     },
                     "step": None,
                     "agent": None,
@@ -903,7 +780,7 @@ async def execute_workflow(
                     tracker=tracker if current_user else None
                 ):
                     # Encode to bytes for proper streaming
-                    yield event.encode('utf-8')
+                    yield event
 
                 # ==================== PROJECT STATUS NOTE ====================
                 # Project status is now set INSIDE execute_workflow() in dynamic_orchestrator.py
@@ -995,9 +872,10 @@ async def execute_workflow(
                         pass
                 raise
 
-        return StreamingResponse(
+        return sse_response(
             byte_generator(),
-            media_type="text/event-stream",
+            request=http_request,
+            compress=True,
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
                 "Pragma": "no-cache",
@@ -1028,6 +906,7 @@ class ResumeRequest(BaseModel):
 @router.post("/resume")
 async def resume_generation(
     request: ResumeRequest,
+    http_request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
     db: AsyncSession = Depends(get_db)
 ):
@@ -1249,7 +1128,7 @@ Generate the remaining {len(pending_file_paths)} files needed to complete this p
                     "data": {
                         "project_id": request.project_id,
                         "message": "SSE connection established for resume",
-                        "keepalive_interval": SSE_KEEPALIVE_INITIAL_INTERVAL
+                        "keepalive_interval": settings.SSE_KEEPALIVE_INITIAL_SECONDS
                     },
                     "step": None,
                     "agent": None,
@@ -1335,7 +1214,7 @@ Generate the remaining {len(pending_file_paths)} files needed to complete this p
                         metadata=metadata,
                         tracker=None
                     ):
-                        yield event.encode('utf-8')
+                        yield event
                 else:
                     # All files already completed
                     complete_event = {
@@ -1587,9 +1466,10 @@ Generate the remaining {len(pending_file_paths)} files needed to complete this p
                     logger.error(f"[Resume] Failed to update project status: {db_err}")
                 raise
 
-        return StreamingResponse(
+        return sse_response(
             byte_generator(),
-            media_type="text/event-stream",
+            request=http_request,
+            compress=True,
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
                 "Pragma": "no-cache",
@@ -2091,6 +1971,7 @@ class RegenerateRequest(BaseModel):
 @router.post("/regenerate")
 async def regenerate_project(
     request: RegenerateRequest,
+    http_request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
     db: AsyncSession = Depends(get_db)
 ):
@@ -2175,15 +2056,13 @@ async def regenerate_project(
                     }
                 ):
                     event_type = event.type.value if hasattr(event.type, 'value') else str(event.type)
-                    event_data = {
+                    yield {
                         "type": event_type,
                         "data": event.data,
                         "step": event.step,
                         "agent": event.agent,
                         "timestamp": event.timestamp
                     }
-                    yield f"data: {json.dumps(event_data)}\n\n"
-                    await asyncio.sleep(0.01)
 
                 yield f"data: {json.dumps({'type': 'regenerate_complete', 'data': {'project_id': request.project_id, 'message': 'Project regenerated successfully'}})}\n\n"
 
@@ -2191,9 +2070,10 @@ async def regenerate_project(
                 logger.error(f"[Regenerate] Error: {e}", exc_info=True)
                 yield f"data: {json.dumps({'type': 'error', 'data': {'error': str(e)}})}\n\n"
 
-        return StreamingResponse(
+        return sse_response(
             regenerate_generator(),
-            media_type="text/event-stream",
+            request=http_request,
+            compress=True,
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
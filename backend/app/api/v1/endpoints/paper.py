@@ -3,7 +3,6 @@ IEEE Paper Upload API - Upload research papers for project generation
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
@@ -32,6 +31,7 @@ from app.models.user import User
 from app.models.project import Project
 from app.modules.agents.paper_analyzer_agent import paper_analyzer_agent
 from app.core.types import generate_uuid
+from app.utils.sse import sse_response
 router = APIRouter()
 
 # Max file size (10MB)
@@ -163,16 +163,15 @@ async def analyze_paper(
                 yield f"data: {json.dumps({'type': 'info', 'paper_title': paper_title, 'text_length': len(paper_text)})}\n\n"
 
                 async for chunk in paper_analyzer_agent.analyze_paper(paper_text, paper_title):
-                    yield f"data: {json.dumps({'type': 'content', 'text': chunk})}\n\n"
+                    yield {'type': 'content', 'text': chunk}
 
                 yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
             except Exception as e:
                 yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-        return StreamingResponse(
-            stream_analysis(),
-            media_type="text/event-stream"
+        return sse_response(
+            stream_analysis()
         )
 
     except ValueError as e:
@@ -249,9 +248,8 @@ async def generate_project_from_paper(
                 logger.error(f"Project generation error: {e}")
                 yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-        return StreamingResponse(
-            stream_generation(),
-            media_type="text/event-stream"
+        return sse_response(
+            stream_generation()
         )
 
     except ValueError as e:
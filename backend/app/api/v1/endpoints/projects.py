@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -18,6 +18,8 @@ from app.schemas.project import (
 from app.modules.auth.dependencies import get_current_user, get_user_project, get_user_project_with_db
 from app.modules.auth.usage_limits import check_project_limit, check_project_generation_allowed
 from app.services.project_service import ProjectService
+from app.services.project_search_service import project_search_service, like_pattern, LIKE_ESCAPE
+from app.utils.pagination import keyset_paginate
 from app.core.logging_config import logger
 
 router = APIRouter()
@@ -142,38 +144,55 @@ async def create_project(
 async def list_projects(
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count all projects (default: only without a cursor)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """List user's projects"""
+    """
+    List user's projects, newest first.
+
+    Pages are keyset-paginated on (created_at, id): follow next_cursor instead
+    of incrementing page. page > 1 without a cursor still uses OFFSET for
+    older clients.
+    """
 
     # Convert user_id to string for comparison with String(36) GUID columns
     user_id_str = str(current_user.id)
     logger.info(f"[Projects] Listing projects for user: {current_user.email} (ID: {user_id_str})")
 
-    # Count total with explicit string comparison
-    count_query = select(func.count(Project.id)).where(Project.user_id == user_id_str)
-    total = await db.scalar(count_query)
-    logger.info(f"[Projects] Found {total} projects for user {current_user.email}")
-
-    # Get projects
-    offset = (page - 1) * page_size
-    query = (
-        select(Project)
-        .where(Project.user_id == user_id_str)
-        .order_by(Project.created_at.desc())
-        .limit(page_size)
-        .offset(offset)
-    )
+    total = None
+    if include_total or (include_total is None and not cursor):
+        total = await db.scalar(select(func.count(Project.id)).where(Project.user_id == user_id_str))
+        logger.info(f"[Projects] Found {total} projects for user {current_user.email}")
 
-    result = await db.execute(query)
-    projects = result.scalars().all()
+    query = select(Project).where(Project.user_id == user_id_str)
+    next_cursor = None
+    if cursor or page <= 1:
+        try:
+            result = await keyset_paginate(
+                db, query, Project.created_at, Project.id,
+                cursor_key=lambda p: (p.created_at, str(p.id)),
+                page_size=page_size, cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        projects = result["items"]
+        next_cursor = result["next_cursor"]
+    else:
+        result = await db.execute(
+            query.order_by(Project.created_at.desc(), Project.id.desc())
+            .limit(page_size)
+            .offset((page - 1) * page_size)
+        )
+        projects = result.scalars().all()
 
     return {
         "projects": projects,
         "total": total,
         "page": page,
-        "page_size": page_size
+        "page_size": page_size,
+        "next_cursor": next_cursor
     }
 
 
@@ -184,34 +203,34 @@ async def search_projects(
     tech_stack: Optional[str] = Query(None, description="Filter by tech stack"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: Optional[bool] = Query(None, description="Count all matches (default: only without a cursor)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Search user's projects by title, description, or tech stack.
 
-    Search is case-insensitive and matches partial text.
+    Search is case-insensitive and matches partial text. Matching uses a
+    trigram index (pg_trgm on PostgreSQL, FTS5 on SQLite).
 
     Parameters:
     - q: Search query (required, searches in title and description)
     - status_filter: Filter by project status (draft, generating, ready, error)
     - tech_stack: Filter by tech stack (e.g., "react", "python")
-    - page: Page number (default: 1)
+    - page: Page number (default: 1); prefer cursor for further pages
     - page_size: Results per page (default: 10, max: 50)
+    - cursor: next_cursor from the previous response
+    - include_total: Count all matches (default: only on the first request)
     """
     user_id_str = str(current_user.id)
-    search_term = f"%{q.lower()}%"
 
     logger.info(f"[Projects] Search for '{q}' by user {current_user.email}")
 
     # Base query with user filter and search
     base_conditions = [
         Project.user_id == user_id_str,
-        or_(
-            func.lower(Project.title).like(search_term),
-            func.lower(Project.description).like(search_term),
-            func.lower(func.coalesce(Project.tech_stack, '')).like(search_term)
-        )
+        await project_search_service.match(db, q)
     ]
 
     # Add status filter if provided
@@ -224,27 +243,37 @@ async def search_projects(
 
     # Add tech stack filter if provided
     if tech_stack:
-        tech_filter = f"%{tech_stack.lower()}%"
-        base_conditions.append(func.lower(func.coalesce(Project.tech_stack, '')).like(tech_filter))
+        tech_filter = like_pattern(tech_stack)
+        base_conditions.append(func.lower(func.coalesce(Project.tech_stack, '')).like(tech_filter, escape=LIKE_ESCAPE))
 
     # Count total matching
-    count_query = select(func.count(Project.id)).where(*base_conditions)
-    total = await db.scalar(count_query)
-
-    # Get matching projects
-    offset = (page - 1) * page_size
-    query = (
-        select(Project)
-        .where(*base_conditions)
-        .order_by(Project.updated_at.desc())
-        .limit(page_size)
-        .offset(offset)
-    )
-
-    result = await db.execute(query)
-    projects = result.scalars().all()
+    total = None
+    if include_total or (include_total is None and not cursor):
+        total = await db.scalar(select(func.count(Project.id)).where(*base_conditions))
+
+    # Most recently updated first, served by ix_projects_user_updated
+    query = select(Project).where(*base_conditions)
+    next_cursor = None
+    if cursor or page <= 1:
+        try:
+            result = await keyset_paginate(
+                db, query, Project.updated_at, Project.id,
+                cursor_key=lambda p: (p.updated_at, str(p.id)),
+                page_size=page_size, cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        projects = result["items"]
+        next_cursor = result["next_cursor"]
+    else:
+        result = await db.execute(
+            query.order_by(Project.updated_at.desc(), Project.id.desc())
+            .limit(page_size)
+            .offset((page - 1) * page_size)
+        )
+        projects = result.scalars().all()
 
-    logger.info(f"[Projects] Search found {total} results for '{q}'")
+    logger.info(f"[Projects] Search found {total if total is not None else len(projects)} results for '{q}'")
 
     return {
         "query": q,
@@ -260,10 +289,11 @@ async def search_projects(
             }
             for p in projects
         ],
-        "total": total or 0,
+        "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": (total + page_size - 1) // page_size if total else 0
+        "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+        "next_cursor": next_cursor
     }
 
 
@@ -1845,8 +1875,10 @@ async def download_project(
     npm install
     npm run dev
     ```
+
+    The ZIP is streamed as it is built (no temp copy or temp archive).
     """
-    from fastapi.responses import FileResponse
+    from fastapi.responses import StreamingResponse
     from app.services.project_export import project_export
     from app.core.config import settings
     import os
@@ -1884,13 +1916,14 @@ async def download_project(
                 detail="Project files not found. Please run the project first."
             )
 
-        # Export project
-        result = await project_export.export_project(
+        # Plan export (source files + generated overlay)
+        plan = await project_export.plan_export(
             project_path=project_path,
             project_name=project.title or project_id,
             description=project.description or "",
             framework=project.framework
         )
+        result = plan.result
 
         if not result.success:
             raise HTTPException(
@@ -1898,12 +1931,15 @@ async def download_project(
                 detail=f"Export failed: {', '.join(result.errors)}"
             )
 
-        # Return ZIP file
-        return FileResponse(
-            path=result.zip_path,
-            filename=f"{project.title or project_id}.zip",
+        safe_name = "".join(c for c in (project.title or project_id) if c.isalnum() or c in (' ', '-', '_')).strip()
+        filename = f"{safe_name or project_id}.zip"
+
+        # Stream ZIP as it is built
+        return StreamingResponse(
+            project_export.stream_export(plan),
             media_type="application/zip",
             headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
                 "X-File-Count": str(result.file_count),
                 "X-Total-Size": str(result.total_size),
                 "X-Readme-Generated": str(result.readme_generated),
@@ -9,7 +9,6 @@ Endpoints:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
@@ -26,6 +25,7 @@ from app.models.document import Document, DocumentType as DBDocumentType
 from app.modules.auth.dependencies import get_current_user
 from app.modules.auth.feature_flags import require_feature, check_feature_access
 from app.services.checkpoint_service import checkpoint_service, CheckpointStatus
+from app.utils.sse import sse_response
 
 
 router = APIRouter()
@@ -523,9 +523,8 @@ async def resume_project(
             logger.error(f"[SmartResume] Error resuming project {project_id}: {e}", exc_info=True)
             yield f"data: {json.dumps({'type': 'error', 'data': {'error': str(e)}})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         smart_resume_generator(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
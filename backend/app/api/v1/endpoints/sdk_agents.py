@@ -6,7 +6,6 @@ These work alongside existing agents for a hybrid approach.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import json
@@ -16,6 +15,7 @@ from app.core.logging_config import logger
 from app.modules.auth.dependencies import get_current_user
 from app.modules.sdk_agents.sdk_fixer_agent import sdk_fixer_agent
 from app.modules.sdk_agents.sdk_orchestrator import sdk_orchestrator
+from app.utils.sse import sse_response
 
 
 router = APIRouter(prefix="/sdk", tags=["SDK Agents"])
@@ -139,9 +139,8 @@ async def fix_error_stream(
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream"
+    return sse_response(
+        event_generator()
     )
 
 
@@ -173,9 +172,8 @@ async def orchestrate_stream(
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream"
+    return sse_response(
+        event_generator()
     )
 
 
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import AsyncGenerator
@@ -12,6 +11,7 @@ from app.modules.auth.dependencies import get_current_user
 from app.utils.claude_client import claude_client
 from app.utils.token_manager import token_manager
 from app.core.logging_config import logger
+from app.utils.sse import sse_response
 
 router = APIRouter()
 
@@ -179,9 +179,8 @@ async def stream_code_generation(
         async for data in generate_code_stream(request.prompt, str(current_user.id), db):
             yield f"data: {data}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         event_stream(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -210,16 +209,15 @@ async def chat_stream(
                 max_tokens=2048
             ):
                 full_response += chunk
-                yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
+                yield {'type': 'content', 'content': chunk}
 
             yield f"data: {json.dumps({'type': 'complete', 'full_content': full_response})}\n\n"
 
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         chat_event_stream(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
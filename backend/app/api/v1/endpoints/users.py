@@ -433,7 +433,7 @@ async def seed_sample_employees(
     Creates specified number of sample users.
     """
     import random
-    from app.core.security import get_password_hash
+    from app.services.password_hasher import password_hasher
 
     first_names = [
         "Rahul", "Priya", "Amit", "Sneha", "Vikram", "Ananya", "Rohan", "Kavya",
@@ -459,7 +459,7 @@ async def seed_sample_employees(
 
     roles = list(UserRole)
     created_users = []
-    default_password = get_password_hash("Password123!")
+    default_password = await password_hasher.hash("Password123!")
 
     for i in range(count):
         first_name = random.choice(first_names)
@@ -19,7 +19,6 @@ Also includes:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, cast, String
 from pydantic import BaseModel
@@ -40,6 +39,7 @@ from app.services.workspace_restore import workspace_restore
 from app.services.unified_storage import unified_storage
 from app.services.sandbox_cleanup import touch_project
 from app.utils.pagination import paginate, create_paginated_response
+from app.utils.sse import sse_response
 
 
 router = APIRouter()
@@ -609,9 +609,8 @@ async def restore_workspace_stream(
             logger.error(f"[Workspace] Error streaming restore: {e}")
             yield f"data: {json.dumps({'type': 'error', 'data': {'error': str(e)}})}\n\n"
 
-    return StreamingResponse(
+    return sse_response(
         stream_restore(),
-        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
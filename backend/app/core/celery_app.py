@@ -9,6 +9,9 @@ celery_app = Celery(
     include=[
         "app.modules.projects.tasks",
         "app.modules.builds.tasks",
+        "app.modules.documents.tasks",
+        "app.modules.analytics.tasks",
+        "app.modules.campus_drive.tasks",
     ]
 )
 
@@ -63,5 +66,14 @@ celery_app.conf.update(
 
 # Celery beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
-    # Add periodic tasks here when needed
+    # Re-derive recent usage rollups from token_usage_logs (corrects any drift)
+    "compact-usage-rollups": {
+        "task": "app.modules.analytics.tasks.compact_usage_rollups",
+        "schedule": settings.USAGE_ROLLUP_COMPACTION_INTERVAL,
+    },
+    # Grade campus drive quizzes left unsubmitted past their deadline
+    "sweep-expired-quizzes": {
+        "task": "app.modules.campus_drive.tasks.sweep_expired_quizzes",
+        "schedule": settings.QUIZ_SWEEP_INTERVAL_SECONDS,
+    },
 }
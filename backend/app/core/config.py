@@ -124,6 +124,35 @@ class Settings(BaseSettings):
     CLAUDE_RETRY_BASE_DELAY: float = 2.0  # seconds
     CLAUDE_RETRY_MAX_DELAY: float = 30.0  # seconds
 
+    # Document section generation (adaptive window, follows API headroom)
+    DOC_SECTION_CONCURRENCY_INITIAL: int = 4
+    DOC_SECTION_CONCURRENCY_MAX: int = 8
+    DIAGRAM_RENDER_WORKERS: int = 4  # Processes for UML rendering (0 = render in threads)
+
+    # Document assembly (Word/PPT/PDF) render jobs
+    DOCUMENT_RENDER_BACKEND: str = "process"  # "process" (local pool) or "celery"
+    DOCUMENT_RENDER_WORKERS: int = 2  # Processes for local rendering (0 = render in threads)
+    DOCUMENT_RENDER_RESULT_TTL: int = 600  # seconds a finished job is reused for identical requests
+    DOCUMENT_RENDER_TIMEOUT: int = 300  # seconds to wait on a Celery render before failing the job
+
+    # Admin analytics usage rollups
+    USAGE_ROLLUP_COMPACTION_INTERVAL: int = 900  # seconds between recent-bucket rebuilds
+    USAGE_ROLLUP_COMPACTION_DAYS: int = 1  # rebuild today plus this many previous days
+
+    # Batched token usage ingestion (per-call usage is buffered and written in bulk)
+    USAGE_INGEST_BATCH_SIZE: int = 200  # records per multi-row insert
+    USAGE_INGEST_FLUSH_MS: int = 500  # max time a record waits before being written
+    USAGE_INGEST_MAX_QUEUE: int = 10000  # buffered records before new ones are dropped
+
+    # SSE transport (app/utils/sse.py)
+    SSE_FLUSH_WINDOW_MS: int = 30  # events arriving within this window go out as one write
+    SSE_MAX_BATCH_BYTES: int = 64 * 1024  # flush early once a batch grows past this
+    SSE_MAX_BUFFER_BYTES: int = 1024 * 1024  # pause the event source once a slow client lets this much pile up
+    SSE_KEEPALIVE_INITIAL_SECONDS: float = 1.0  # idle time before a keepalive, early in a stream
+    SSE_KEEPALIVE_SECONDS: float = 5.0  # idle time before a keepalive, afterwards
+    SSE_KEEPALIVE_AGGRESSIVE_SECONDS: float = 60.0  # length of the early phase
+    SSE_COMPRESSION_ENABLED: bool = False  # gzip streams that opt in, if the client accepts it
+
     # ==========================================
     # Storage Configuration
     # ==========================================
@@ -152,6 +181,10 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours - long sessions for better UX
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # 30 days refresh token
     BCRYPT_ROUNDS: int = 12  # 4 for dev (fast), 12 for prod (secure)
+    PASSWORD_HASH_WORKERS: int = 4  # bcrypt threads per worker process (off the event loop)
+    PASSWORD_HASH_MAX_QUEUE: int = 500  # Queued hashes per process before sign-ins get 429
+    PASSWORD_HASH_MAX_PER_IP: int = 50  # Queued + running hashes per client IP (campus NAT)
+    PASSWORD_HASH_MAX_PER_ACCOUNT: int = 3  # Queued + running hashes per account
 
     # ==========================================
     # Google OAuth
@@ -306,6 +339,10 @@ class Settings(BaseSettings):
     CONTAINER_PORT_RANGE_START: int = 10000
     CONTAINER_PORT_RANGE_END: int = 60000
 
+    # Port Leases (app/modules/execution/port_leases.py - shared by all executors)
+    PORT_LEASE_TTL_SECONDS: int = 86400  # Lease expiry if never released (matches max container lifetime)
+    PORT_LEASE_HEARTBEAT_SECONDS: int = 600  # Minimum gap between renewals of one project's lease
+
     # Container Lifecycle Timeouts (CENTRALIZED - used by all cleanup services)
     CONTAINER_IDLE_TIMEOUT_SECONDS: int = 1800  # 30 minutes - idle before cleanup
     CONTAINER_MAX_LIFETIME_SECONDS: int = 86400  # 24 hours - absolute max lifetime
@@ -404,6 +441,11 @@ class Settings(BaseSettings):
     HEALTH_RESET_AFTER: int = 300  # seconds
     HEALTH_CHECK_INTERVAL: int = 30  # seconds
     HEALTH_MAX_FAILURES: int = 3
+    HEALTH_PROBE_CONCURRENCY: int = 50  # Max probes in flight at once
+    HEALTH_PROBE_TIMEOUT: float = 3.0  # seconds per dev-server probe
+    HEALTH_PROBE_JITTER: float = 0.2  # +/- fraction of HEALTH_CHECK_INTERVAL
+    HEALTH_PROBE_MODE: str = "http"  # "http" (status line) or "tcp" (connect only)
+    HEALTH_PROBE_HOST: str = ""  # Host to probe mapped ports on (default: Docker host)
 
     # ==========================================
     # Cache TTL Settings (in seconds)
@@ -412,6 +454,30 @@ class Settings(BaseSettings):
     CACHE_TTL_PROJECT_FILES: int = 900  # 15 minutes
     CACHE_TTL_FILE_CONTENT: int = 300  # 5 minutes
     CACHE_TTL_USER_SESSION: int = 1800  # 30 minutes
+    CACHE_LOCAL_TTL_SECONDS: float = 30.0  # In-process copy (writes and deletes are also broadcast)
+    CACHE_LOCAL_MAX_ENTRIES: int = 10000  # In-process LRU bound per worker
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024  # In-process LRU bound on encoded value size
+    CACHE_SERIALIZER: str = "json"  # "json" or "msgpack" (needs the msgpack package)
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"  # Redis pub/sub channel
+
+    # ==========================================
+    # Entitlement Cache Settings
+    # ==========================================
+    ENTITLEMENT_CACHE_TTL_SECONDS: int = 60  # Redis copy of a user's identity/plan/limits snapshot
+    ENTITLEMENT_LOCAL_TTL_SECONDS: float = 10.0  # In-process copy (invalidations are also broadcast)
+    ENTITLEMENT_CACHE_MAX_ENTRIES: int = 10000  # In-process snapshots kept per worker
+    ENTITLEMENT_INVALIDATION_CHANNEL: str = "entitlements:invalidate"  # Redis pub/sub channel
+
+    # ==========================================
+    # Campus Drive Quiz Session Settings
+    # ==========================================
+    QUIZ_BANK_CACHE_TTL_SECONDS: int = 600  # Redis copy of a drive's question bank
+    QUIZ_BANK_LOCAL_TTL_SECONDS: float = 30.0  # In-process copy (commits to questions also clear it)
+    QUIZ_SESSION_GRACE_SECONDS: int = 3600  # Keep sessions/answers this long past the deadline for grading
+    QUIZ_SUBMIT_GRACE_SECONDS: int = 30  # Submits this late are still accepted; after it saved progress is graded
+    QUIZ_SWEEP_INTERVAL_SECONDS: int = 30  # Celery beat: grade quizzes whose deadline passed without a submit
+    QUIZ_SWEEP_BATCH_SIZE: int = 200  # Registrations graded per sweep transaction
+    QUIZ_RESULTS_CHANNEL: str = "quiz:results"  # Redis pub/sub channel for graded quiz events
 
     # ==========================================
     # Session Storage Settings
@@ -440,8 +506,16 @@ class Settings(BaseSettings):
     AUTOFIXER_FIX_COOLDOWN_SECONDS: int = 30  # Min seconds between fix attempts
     AUTOFIXER_FIX_WINDOW_SECONDS: int = 300  # 5 min window for max attempts
     AUTOFIXER_INSTALL_TIMEOUT: int = 120  # Timeout for install commands
+    CONTEXT_SNAPSHOT_RESCAN_SECONDS: float = 30.0  # Full stat walk of a cached project scan; writes are notified in between
     LOG_RETENTION_MINUTES: int = 30  # Log bus retention
 
+    # Log Stream WebSocket delivery
+    LOG_STREAM_SEND_QUEUE_SIZE: int = 1000  # Messages buffered per WebSocket before the oldest are dropped
+    LOG_STREAM_BATCH_MAX: int = 100  # Log lines per monitor frame
+    LOG_STREAM_RELAY_CHANNEL: str = "log-stream:broadcast"  # Redis pub/sub channel shared by workers
+    LOG_STREAM_RELAY_INTERVAL_MS: int = 50  # Broadcasts are published to Redis in batches this often
+    LOG_STREAM_RELAY_BUFFER: int = 20000  # Broadcasts held for publishing before the oldest are dropped
+
     # SimpleFixer Model & Cost Settings
     SIMPLEFIXER_HAIKU_MODEL: str = "claude-3-haiku-20240307"
     SIMPLEFIXER_SONNET_MODEL: str = "claude-sonnet-4-20250514"
@@ -569,6 +643,9 @@ class Settings(BaseSettings):
     SANDBOX_CLEANUP_INTERVAL_MINUTES: int = 5  # Check every 5 minutes
     SANDBOX_MIN_AGE_MINUTES: int = 5  # Don't delete projects younger than 5 min
     SANDBOX_CLEANUP_ENABLED: bool = True  # Enable/disable auto-cleanup
+    SANDBOX_CLEANUP_WORKERS: int = 2  # Background deletion workers
+    SANDBOX_CLEANUP_DELETIONS_PER_MINUTE: int = 30  # Rate limit across all workers
+    SANDBOX_SIZE_CACHE_MINUTES: int = 60  # Recompute cached project sizes after this
 
     # ==========================================
     # Storage Paths (configurable via env)
@@ -79,6 +79,18 @@ class InvalidTokenError(AuthenticationError):
         self.code = "INVALID_TOKEN"
 
 
+class PasswordHashBusyError(BharatBuildError):
+    """Too many password checks queued for this client, account or worker"""
+
+    def __init__(self, retry_after: int, scope: str = "server"):
+        super().__init__(
+            "Too many sign-in attempts in progress. Please try again shortly.",
+            code="PASSWORD_HASH_BUSY",
+            details={"retry_after_seconds": retry_after, "scope": scope}
+        )
+        self.retry_after = retry_after
+
+
 # ============================================
 # Resource Errors (404-type)
 # ============================================
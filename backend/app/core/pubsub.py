@@ -0,0 +1,58 @@
+"""
+Redis Pub/Sub Listener
+
+One reconnecting listen loop for the worker-to-worker broadcast channels
+(cache invalidation, entitlement invalidation, log stream relay):
+
+- Messages on the subscribed channel are passed to a handler
+- A dropped subscription is retried with exponential backoff
+  (1s doubling to PUBSUB_MAX_RETRY_SECONDS), and every failed
+  resubscribe is logged rather than ignored
+- Cancelling the listener task closes the pubsub
+
+Usage:
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(channel)
+    task = asyncio.create_task(listen(pubsub, channel, handle_message, "[Cache]"))
+"""
+import asyncio
+from typing import Any, Callable
+
+from app.core.logging_config import logger
+
+PUBSUB_MAX_RETRY_SECONDS = 30.0
+
+
+async def listen(pubsub, channel: str, handler: Callable[[Any], None], label: str):
+    """
+    Deliver every message on channel to handler until cancelled.
+
+    Args:
+        pubsub: Redis PubSub already subscribed to channel
+        channel: Channel to resubscribe to after a failure
+        handler: Called with each message's data
+        label: Log prefix of the owning service, e.g. "[Cache]"
+    """
+    delay = 1.0
+    try:
+        while True:
+            try:
+                async for item in pubsub.listen():
+                    delay = 1.0
+                    if item.get("type") == "message":
+                        handler(item["data"])
+            except Exception as e:
+                logger.warning(f"{label} Subscription to {channel} failed: {e}, retrying in {delay:.0f}s")
+
+            # Resubscribe until it sticks (listen() ending without an error needs it too)
+            while True:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, PUBSUB_MAX_RETRY_SECONDS)
+                try:
+                    await pubsub.subscribe(channel)
+                    break
+                except Exception as e:
+                    logger.warning(f"{label} Resubscribe to {channel} failed: {e}, retrying in {delay:.0f}s")
+    except asyncio.CancelledError:
+        await pubsub.close()
+        raise
@@ -25,6 +25,11 @@ from app.services.temp_session_storage import temp_storage
 from app.services.sandbox_cleanup import sandbox_cleanup
 from app.services.fix_executor import execute_fix
 from app.api.v1.endpoints.log_stream import log_stream_manager
+from app.modules.auth.entitlements import entitlement_cache
+from app.services.password_hasher import password_hasher
+from app.services.quiz_session_service import quiz_sessions
+from app.services.cache_service import cache_service
+from app.core.exceptions import PasswordHashBusyError
 import app.models  # Import models so metadata knows about them
 
 
@@ -186,6 +191,23 @@ async def lifespan(app: FastAPI):
     log_stream_manager.set_fix_callback(execute_fix)
     logger.info("Auto-fix callback registered - errors will be fixed automatically!")
 
+    # Relay log stream broadcasts between workers (Redis pub/sub)
+    await log_stream_manager.start()
+
+    # Share entitlement snapshots (plan, limits, feature flags) between workers
+    await entitlement_cache.start()
+
+    # Campus drive quiz sessions and answers (Redis)
+    await quiz_sessions.start()
+
+    # Drop in-process cache copies when other workers write or invalidate
+    await cache_service.start()
+
+    # ========== TOKEN USAGE INGESTION ==========
+    # Per-call token usage is buffered and written in batches
+    from app.services.usage_ingestion_service import usage_ingestion_service
+    await usage_ingestion_service.start()
+
     # ========== SUBSCRIPTION REMINDER SERVICE ==========
     # Send reminders to users who haven't subscribed
     try:
@@ -208,6 +230,27 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    # Stop the log stream relay
+    await log_stream_manager.stop()
+
+    # Stop the entitlement cache invalidation listener
+    await entitlement_cache.stop()
+
+    # Close the quiz session store
+    await quiz_sessions.stop()
+
+    # Stop the cache invalidation listener
+    await cache_service.close()
+
+    # Release the bcrypt worker threads
+    password_hasher.shutdown()
+
+    # Drain buffered token usage before the database goes away
+    try:
+        await usage_ingestion_service.stop()
+    except Exception as e:
+        logger.error(f"Failed to drain token usage buffer: {e}")
+
     # Stop sandbox cleanup service
     if settings.SANDBOX_CLEANUP_ENABLED:
         await sandbox_cleanup.stop()
@@ -279,6 +322,16 @@ app.add_middleware(SubdomainPreviewMiddleware)
 
 
 # Exception handlers
+@app.exception_handler(PasswordHashBusyError)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashBusyError):
+    logger.warning(f"[PasswordHasher] Refused ({exc.details['scope']}) for {request.client.host if request.client else 'unknown'}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.message, "error": exc.to_dict()},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Global exception: {exc}", exc_info=True)
@@ -5,7 +5,7 @@ from app.models.file_version import ProjectFileVersion
 from app.models.project_file import ProjectFile, FileGenerationStatus
 from app.models.document import Document
 from app.models.billing import Plan, Subscription, SubscriptionStatus, Transaction, PlanType
-from app.models.usage import UsageLog, TokenUsage, TokenUsageLog, AgentType, OperationType
+from app.models.usage import UsageLog, TokenUsage, TokenUsageLog, UsageRollup, RollupGranularity, AgentType, OperationType
 from app.models.api_key import APIKey, APIKeyStatus
 from app.models.audit_log import AuditLog
 from app.models.system_setting import SystemSetting
@@ -60,6 +60,8 @@ __all__ = [
     "UsageLog",
     "TokenUsage",
     "TokenUsageLog",
+    "UsageRollup",
+    "RollupGranularity",
     "AgentType",
     "OperationType",
     # API Keys
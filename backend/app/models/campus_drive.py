@@ -107,12 +107,19 @@ class CampusDriveRegistration(Base):
 
     # Quiz Results
     quiz_start_time = Column(DateTime, nullable=True)
+    # Set while the quiz is in progress, cleared once graded (the expiry sweep scans it)
+    quiz_deadline = Column(DateTime, nullable=True, index=True)
     quiz_end_time = Column(DateTime, nullable=True)
     quiz_score = Column(Float, nullable=True)
     total_marks = Column(Float, nullable=True)
     percentage = Column(Float, nullable=True)
     is_qualified = Column(Boolean, default=False)
 
+    # Question counts, so results need no response rows
+    total_questions = Column(Integer, nullable=True)
+    attempted_questions = Column(Integer, nullable=True)
+    correct_answers = Column(Integer, nullable=True)
+
     # Section-wise scores
     logical_score = Column(Float, default=0)
     technical_score = Column(Float, default=0)
@@ -45,6 +45,9 @@ class Project(Base):
         Index('ix_projects_status', 'status'),     # Status filters are common
         Index('ix_projects_created_at', 'created_at'),  # Ordering by date
         Index('ix_projects_user_status', 'user_id', 'status'),  # Compound for user + status queries
+        Index('ix_projects_user_created', 'user_id', 'created_at', 'id'),  # Keyset pagination of user listings
+        Index('ix_projects_user_updated', 'user_id', 'updated_at', 'id'),  # Keyset pagination of search results
+        # Text search: pg_trgm GIN index (ix_projects_search_trgm) is created by migration only
     )
 
     id = Column(GUID, primary_key=True, default=generate_uuid)
@@ -108,7 +111,7 @@ class Project(Base):
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
 
     # Relationships
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, JSON, Text, Enum as SQLEnum, Index
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, ForeignKey, JSON, Text, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -221,3 +221,46 @@ class TokenUsageLog(Base):
         total_paise = int((input_cost + output_cost) * 100)
 
         return total_paise
+
+
+class RollupGranularity(str, enum.Enum):
+    """Bucket sizes kept in usage_rollups"""
+    HOUR = "hour"
+    DAY = "day"
+
+
+class UsageRollup(Base):
+    """
+    Pre-aggregated TokenUsageLog totals for admin analytics.
+
+    One row per (granularity, bucket_start, user, project, model, agent).
+    Rows are incremented in the same transaction that writes the raw log
+    (see usage_rollup_service) and re-derived from the raw log for recent
+    buckets by the periodic compaction task, so dashboards never scan
+    token_usage_logs.
+    """
+    __tablename__ = "usage_rollups"
+
+    __table_args__ = (
+        Index('ix_usage_rollup_user_bucket', 'granularity', 'user_id', 'bucket_start'),
+    )
+
+    # Natural key (leading columns serve granularity + time window scans)
+    granularity = Column(String(8), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    user_id = Column(GUID, primary_key=True)
+    project_id = Column(String(36), primary_key=True, default="")  # "" when the call had no project
+    model = Column(String(50), primary_key=True)
+    agent_type = Column(String(20), primary_key=True)  # AgentType name, as stored in token_usage_logs
+
+    # Aggregated metrics
+    calls = Column(BigInteger, nullable=False, default=0)
+    input_tokens = Column(BigInteger, nullable=False, default=0)
+    output_tokens = Column(BigInteger, nullable=False, default=0)
+    total_tokens = Column(BigInteger, nullable=False, default=0)
+    cost_paise = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UsageRollup {self.granularity}:{self.bucket_start} {self.total_tokens} tokens>"
@@ -11,7 +11,7 @@ Architecture:
 
 Features:
 - Token limit handling via chunking
-- Parallel section generation for speed
+- Sliding-window section generation sized to API headroom, streamed in order
 - Retry logic for failed sections
 - College info integration (Certificate, Declaration, Acknowledgement)
 - Dynamic UML diagram generation
@@ -30,9 +30,11 @@ import asyncio
 from datetime import datetime
 from enum import Enum
 
+from app.core.config import settings
 from app.core.logging_config import logger
 from app.modules.agents.base_agent import BaseAgent, AgentContext
 from app.modules.automation.uml_generator import uml_generator
+from app.services.document_render_service import document_render_service, RenderJob
 
 
 @dataclass
@@ -480,6 +482,31 @@ def _get_ppt_structure(project_data: dict) -> dict:
 
 
 
+class SectionWindow:
+    """
+    Additive-increase / multiplicative-decrease limit on in-flight sections.
+
+    Grows by roughly one slot per window of clean completions and halves
+    whenever the Claude client reports a 429/529, so concurrency follows the
+    API headroom instead of a fixed batch size.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+
+    @property
+    def size(self) -> int:
+        return int(self._limit)
+
+    def on_success(self):
+        self._limit = min(float(self.maximum), self._limit + 1.0 / self.size)
+
+    def on_throttle(self):
+        self._limit = max(float(self.minimum), self._limit / 2)
+
+
 class ChunkedDocumentAgent(BaseAgent):
     """
     Chunked Document Generator - Handles large documents (60-80 pages)
@@ -1062,19 +1089,31 @@ JSON FORMAT (output exactly this structure):
 
             yield {"type": "outline_complete", "outline": outline}
 
+            # Project data + outline are identical for every section prompt;
+            # send them once as a prompt-cached prefix
+            shared_context = self._build_section_context(outline, project_data)
+
             # Phase 2: Generate each section
             yield {"type": "phase", "phase": "content", "message": "Generating section content..."}
 
             if parallel:
-                # Parallel generation for AI sections
-                generated_sections = await self._generate_sections_parallel(
+                # Sliding window over AI sections, emitted in document order
+                async for idx, entry in self._stream_sections(
                     structure["sections"],
                     outline,
                     project_data,
                     document_type,
                     college_info,
-                    max_retries
-                )
+                    max_retries,
+                    shared_context
+                ):
+                    generated_sections.append(entry)
+                    yield {
+                        "type": "section_complete",
+                        "section_id": entry["section_id"],
+                        "section_title": entry["title"],
+                        "progress": ((idx + 1) / total_sections) * 100
+                    }
                 yield {
                     "type": "sections_complete",
                     "sections_generated": len(generated_sections),
@@ -1100,7 +1139,8 @@ JSON FORMAT (output exactly this structure):
                         project_data,
                         document_type,
                         college_info,
-                        max_retries
+                        max_retries,
+                        shared_context
                     )
 
                     generated_sections.append({
@@ -1117,9 +1157,6 @@ JSON FORMAT (output exactly this structure):
                         "progress": ((idx + 1) / total_sections) * 100
                     }
 
-                    # Small delay to avoid rate limiting
-                    await asyncio.sleep(0.5)
-
             # Phase 3: Generate UML Diagrams
             yield {"type": "phase", "phase": "diagrams", "message": "Generating UML diagrams..."}
 
@@ -1141,16 +1178,18 @@ JSON FORMAT (output exactly this structure):
             # Phase 4: Assemble document
             yield {"type": "phase", "phase": "assembly", "message": "Assembling final document..."}
 
-            if document_type == DocumentType.PPT:
-                final_doc = await self._assemble_ppt(generated_sections, project_data, project_id, user_id)
-            else:
-                final_doc = await self._assemble_word_document(
-                    generated_sections,
-                    project_data,
-                    document_type,
-                    project_id,
-                    user_id
-                )
+            # Rendered in a worker; identical requests share the same job
+            job = self._submit_assembly(generated_sections, project_data, document_type, project_id, user_id)
+            async for event in job.events():
+                if event["type"] == "render_progress":
+                    yield {
+                        "type": "assembly_progress",
+                        "completed": event["completed"],
+                        "total": event["total"],
+                        "section_title": event["section"],
+                        "progress": event["progress"]
+                    }
+            final_doc = self._assembled_document(await job.wait(), generated_sections, document_type)
 
             # Get token usage for this document generation
             token_usage = self.get_token_usage()
@@ -1210,14 +1249,35 @@ Output JSON with section_id as keys.
             result = {"sections": {}}
         return result
 
+    def _build_section_context(self, outline: Dict, project_data: Dict) -> str:
+        """Project data and full outline shared by every section prompt"""
+        return f"""PROJECT DATA:
+- Name: {project_data.get('project_name')}
+- Type: {project_data.get('project_type')}
+- Technologies: {json.dumps(project_data.get('technologies', {}))}
+- Features: {json.dumps(project_data.get('features', []))}
+- API Endpoints: {json.dumps(project_data.get('api_endpoints', [])[:10])}
+- Database Tables: {json.dumps(project_data.get('database_tables', []))}
+
+DOCUMENT OUTLINE (keyed by section_id):
+{json.dumps(outline, indent=2)}
+"""
+
     async def _generate_section_content(
         self,
         section: Dict,
         outline: Dict,
         project_data: Dict,
-        document_type: DocumentType
+        document_type: DocumentType,
+        shared_context: Optional[str] = None
     ) -> Dict:
-        """Generate content for a single section"""
+        """
+        Generate content for a single section.
+
+        With shared_context (see _build_section_context) the project data and
+        outline travel in the cached system prefix and the user prompt only
+        carries the section-specific instructions.
+        """
 
         section_id = section["id"]
         section_title = section["title"]
@@ -1230,6 +1290,20 @@ Output JSON with section_id as keys.
         else:
             target_words = target_pages * 250
 
+        if shared_context:
+            project_block = "PROJECT DATA: see PROJECT DATA above."
+            outline_block = f"OUTLINE POINTS: use the entry for \"{section_id}\" in DOCUMENT OUTLINE above."
+        else:
+            project_block = f"""PROJECT DATA:
+- Name: {project_data.get('project_name')}
+- Type: {project_data.get('project_type')}
+- Technologies: {json.dumps(project_data.get('technologies', {}))}
+- Features: {json.dumps(project_data.get('features', []))}
+- API Endpoints: {json.dumps(project_data.get('api_endpoints', [])[:10])}
+- Database Tables: {json.dumps(project_data.get('database_tables', []))}"""
+            outline_block = f"""OUTLINE POINTS:
+{json.dumps(outline, indent=2)}"""
+
         # Use different prompt and system prompt for VIVA_QA
         if document_type == DocumentType.VIVA_QA:
             prompt = f"""Generate comprehensive VIVA Questions and Answers for this section:
@@ -1239,13 +1313,7 @@ SECTION: {section_title}
 QUESTIONS TO ANSWER:
 {json.dumps(subsections, indent=2)}
 
-PROJECT DATA:
-- Name: {project_data.get('project_name')}
-- Type: {project_data.get('project_type')}
-- Technologies: {json.dumps(project_data.get('technologies', {}))}
-- Features: {json.dumps(project_data.get('features', []))}
-- API Endpoints: {json.dumps(project_data.get('api_endpoints', [])[:10])}
-- Database Tables: {json.dumps(project_data.get('database_tables', []))}
+{project_block}
 
 REQUIREMENTS:
 1. Generate realistic viva questions that examiners would ask
@@ -1267,16 +1335,9 @@ TARGET WORDS: {target_words} minimum
 SUBSECTIONS TO COVER:
 {json.dumps(subsections, indent=2)}
 
-OUTLINE POINTS:
-{json.dumps(outline, indent=2)}
+{outline_block}
 
-PROJECT DATA:
-- Name: {project_data.get('project_name')}
-- Type: {project_data.get('project_type')}
-- Technologies: {json.dumps(project_data.get('technologies', {}))}
-- Features: {json.dumps(project_data.get('features', []))}
-- API Endpoints: {json.dumps(project_data.get('api_endpoints', [])[:10])}
-- Database Tables: {json.dumps(project_data.get('database_tables', []))}
+{project_block}
 
 REQUIREMENTS:
 1. Write detailed, professional content
@@ -1294,7 +1355,8 @@ Generate complete section content in JSON format.
             system_prompt=system_prompt,
             user_prompt=prompt,
             temperature=0.4,
-            max_tokens=8192  # Sonnet supports up to 8192 output tokens
+            max_tokens=8192,  # Sonnet supports up to 8192 output tokens
+            cached_context=shared_context
         )
 
         logger.info(f"[ChunkedDoc] Raw response length for {section_id}: {len(response) if response else 0} chars")
@@ -1509,59 +1571,61 @@ Place: {ci.college_name}
             "files": selected_code
         }
 
-    async def _assemble_word_document(
+    def _submit_assembly(
         self,
         sections: List[Dict],
         project_data: Dict,
         document_type: DocumentType,
         project_id: str = None,
         user_id: str = None
-    ) -> Dict:
-        """Assemble sections into Word document using python-docx"""
-
-        from app.modules.automation.word_generator import WordDocumentGenerator
-
-        generator = WordDocumentGenerator()
-
-        file_path = await generator.create_document(
-            sections=sections,
-            project_data=project_data,
-            document_type=document_type.value,
-            project_id=project_id,
-            user_id=user_id
-        )
+    ) -> RenderJob:
+        """Start (or join) the render job that assembles the Word/PPT file"""
+        payload = {
+            "sections": sections,
+            "project_data": project_data,
+            "project_id": project_id,
+            "user_id": user_id
+        }
+        if document_type == DocumentType.PPT:
+            return document_render_service.submit("pptx", payload, store=True)
+        payload["document_type"] = document_type.value
+        return document_render_service.submit("docx", payload, store=True)
 
+    def _assembled_document(self, result: Dict, sections: List[Dict], document_type: DocumentType) -> Dict:
+        if document_type == DocumentType.PPT:
+            return {
+                "path": result["path"],
+                "format": "pptx",
+                "slides": sum(s.get("slides", 1) for s in sections if isinstance(s, dict))
+            }
         return {
-            "path": file_path,
+            "path": result["path"],
             "format": "docx",
             "pages": sum(s.get("pages", 2) for s in sections if isinstance(s, dict))
         }
 
-    async def _assemble_ppt(
+    async def _assemble_word_document(
         self,
         sections: List[Dict],
         project_data: Dict,
+        document_type: DocumentType,
         project_id: str = None,
         user_id: str = None
     ) -> Dict:
-        """Assemble sections into PowerPoint"""
-
-        from app.modules.automation.ppt_generator_v2 import PPTGeneratorV2
+        """Assemble sections into Word document using python-docx (render worker)"""
+        job = self._submit_assembly(sections, project_data, document_type, project_id, user_id)
+        return self._assembled_document(await job.wait(), sections, document_type)
 
-        generator = PPTGeneratorV2()
-
-        file_path = await generator.create_presentation(
-            sections=sections,
-            project_data=project_data,
-            project_id=project_id,
-            user_id=user_id
-        )
-
-        return {
-            "path": file_path,
-            "format": "pptx",
-            "slides": sum(s.get("slides", 1) for s in sections if isinstance(s, dict))
-        }
+    async def _assemble_ppt(
+        self,
+        sections: List[Dict],
+        project_data: Dict,
+        project_id: str = None,
+        user_id: str = None
+    ) -> Dict:
+        """Assemble sections into PowerPoint (render worker)"""
+        job = self._submit_assembly(sections, project_data, DocumentType.PPT, project_id, user_id)
+        return self._assembled_document(await job.wait(), sections, DocumentType.PPT)
 
     def _parse_json(self, response: str, section_info: Optional[Dict] = None) -> Dict:
         """
@@ -1777,116 +1841,149 @@ Place: {ci.college_name}
         project_data: Dict,
         document_type: DocumentType,
         college_info: Optional[CollegeInfo],
-        max_retries: int
+        max_retries: int,
+        shared_context: Optional[str] = None
     ) -> List[Dict]:
+        """Generate all sections concurrently and return them in document order."""
+        return [
+            entry async for _, entry in self._stream_sections(
+                sections, outline, project_data, document_type, college_info, max_retries, shared_context
+            )
+        ]
+
+    async def _stream_sections(
+        self,
+        sections: List[Dict],
+        outline: Dict,
+        project_data: Dict,
+        document_type: DocumentType,
+        college_info: Optional[CollegeInfo],
+        max_retries: int,
+        shared_context: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[int, Dict], None]:
         """
-        Generate multiple sections in parallel for faster document generation.
+        Generate sections through a sliding window and yield (index, section)
+        in document order as soon as each prefix of the document is ready.
 
-        Sections are grouped by type:
-        - Template sections: Generated immediately (no API call)
-        - AI sections: Generated in parallel batches of 3
+        - Template/auto/code sections: resolved immediately (no API call)
+        - AI sections: a new one starts whenever a slot frees up; the number
+          of slots follows SectionWindow (grows on success, halves on 429/529)
         """
-        generated_sections = []
+        window = SectionWindow(
+            settings.DOC_SECTION_CONCURRENCY_INITIAL,
+            settings.DOC_SECTION_CONCURRENCY_MAX
+        )
 
-        # Separate sections by type
-        template_sections = []
-        ai_sections = []
-        auto_sections = []
-        code_sections = []
+        ready: Dict[int, Dict] = {}
+        ai_indexes: List[int] = []
 
-        for section in sections:
+        for idx, section in enumerate(sections):
             section_type = section.get("type", "generate")
-            if section_type == "template":
-                template_sections.append(section)
-            elif section_type == "auto":
-                auto_sections.append(section)
-            elif section_type == "code":
-                code_sections.append(section)
+            if section_type in ("template", "auto", "code"):
+                content = await self._generate_single_section(
+                    section, outline, project_data, document_type, college_info, max_retries
+                )
+                ready[idx] = self._section_entry(section, content, section_type)
             else:
-                ai_sections.append(section)
-
-        logger.info(f"[ChunkedDoc] Parallel: {len(template_sections)} templates, {len(ai_sections)} AI sections")
-
-        # 1. Generate template sections immediately (no API call)
-        for section in template_sections:
-            content = self._get_template_content(section["id"], project_data, college_info)
-            generated_sections.append({
-                "section_id": section["id"],
-                "title": section["title"],
-                "content": content,
-                "type": "template"
-            })
-
-        # 2. Generate auto sections
-        for section in auto_sections:
-            generated_sections.append({
-                "section_id": section["id"],
-                "title": section["title"],
-                "content": {"type": "auto", "section_id": section["id"]},
-                "type": "auto"
-            })
+                ai_indexes.append(idx)
 
-        # 3. Generate code sections
-        for section in code_sections:
-            content = self._get_code_content(section["id"], project_data)
-            generated_sections.append({
-                "section_id": section["id"],
-                "title": section["title"],
-                "content": content,
-                "type": "code"
-            })
+        logger.info(
+            f"[ChunkedDoc] Parallel: {len(sections) - len(ai_indexes)} non-AI, {len(ai_indexes)} AI sections, "
+            f"window {window.size}/{window.maximum}"
+        )
 
-        # 4. Generate AI sections in parallel batches
-        BATCH_SIZE = 3  # Process 3 sections at a time to avoid rate limits
+        pending = iter(ai_indexes)
+        in_flight: Dict[asyncio.Task, int] = {}
+        next_idx = 0
+        throttles_seen = getattr(self.claude, "throttle_count", 0)
 
-        for i in range(0, len(ai_sections), BATCH_SIZE):
-            batch = ai_sections[i:i + BATCH_SIZE]
+        try:
+            while True:
+                while next_idx in ready:
+                    yield next_idx, ready.pop(next_idx)
+                    next_idx += 1
+                if next_idx >= len(sections):
+                    break
 
-            # Create tasks for parallel execution
-            tasks = [
-                self._generate_single_section_with_retry(
-                    section,
-                    outline,
-                    project_data,
-                    document_type,
-                    college_info,
-                    max_retries
+                while len(in_flight) < window.size:
+                    idx = next(pending, None)
+                    if idx is None:
+                        break
+                    task = asyncio.create_task(self._generate_windowed_section(
+                        sections[idx], outline, project_data, document_type,
+                        college_info, max_retries, shared_context, window
+                    ))
+                    in_flight[task] = idx
+
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=1.0, return_when=asyncio.FIRST_COMPLETED
                 )
-                for section in batch
-            ]
-
-            # Execute batch in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for section, result in zip(batch, results):
-                if isinstance(result, Exception):
-                    logger.error(f"[ChunkedDoc] Section {section['id']} failed with exception: {result}")
-                    # Create project-specific fallback content instead of generic error
-                    content = self._create_fallback_content(section, project_data)
-                    content["error"] = str(result)
-                elif result is None or (isinstance(result, dict) and not result.get("content") and not result.get("subsections")):
-                    logger.warning(f"[ChunkedDoc] Section {section['id']} returned empty content")
-                    content = self._create_fallback_content(section, project_data)
-                    content["error"] = "Empty content returned"
-                else:
-                    content = result
 
-                generated_sections.append({
-                    "section_id": section["id"],
-                    "title": section["title"],
-                    "content": content,
-                    "type": "generate"
-                })
-
-            # Small delay between batches to avoid rate limiting
-            if i + BATCH_SIZE < len(ai_sections):
-                await asyncio.sleep(1.0)
+                # React as soon as the client reports a 429/529, not when the
+                # throttled section eventually finishes its retries
+                throttles = getattr(self.claude, "throttle_count", 0)
+                if throttles > throttles_seen:
+                    window.on_throttle()
+                    throttles_seen = throttles
+
+                for task in done:
+                    idx = in_flight.pop(task)
+                    section = sections[idx]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+                    ready[idx] = self._section_entry(
+                        section, self._checked_section_content(section, result, project_data), "generate"
+                    )
+        finally:
+            for task in in_flight:
+                task.cancel()
 
-        # Sort sections by original order
-        section_order = {s["id"]: idx for idx, s in enumerate(sections)}
-        generated_sections.sort(key=lambda x: section_order.get(x["section_id"], 999))
+    async def _generate_windowed_section(
+        self,
+        section: Dict,
+        outline: Dict,
+        project_data: Dict,
+        document_type: DocumentType,
+        college_info: Optional[CollegeInfo],
+        max_retries: int,
+        shared_context: Optional[str],
+        window: SectionWindow
+    ) -> Dict:
+        """Generate one AI section; a clean completion widens the window"""
+        throttles = getattr(self.claude, "throttle_count", 0)
+        content = await self._generate_single_section_with_retry(
+            section, outline, project_data, document_type, college_info, max_retries,
+            shared_context, window
+        )
+        # Throttles are applied by _stream_sections when they happen
+        if getattr(self.claude, "throttle_count", 0) == throttles:
+            window.on_success()
+        return content
+
+    def _checked_section_content(self, section: Dict, result: Any, project_data: Dict) -> Dict:
+        """Replace failed or empty AI section results with project-specific fallback content"""
+        if isinstance(result, Exception):
+            logger.error(f"[ChunkedDoc] Section {section['id']} failed with exception: {result}")
+            content = self._create_fallback_content(section, project_data)
+            content["error"] = str(result)
+        elif result is None or (isinstance(result, dict) and not result.get("content") and not result.get("subsections")):
+            logger.warning(f"[ChunkedDoc] Section {section['id']} returned empty content")
+            content = self._create_fallback_content(section, project_data)
+            content["error"] = "Empty content returned"
+        else:
+            content = result
+        return content
 
-        return generated_sections
+    @staticmethod
+    def _section_entry(section: Dict, content: Dict, section_type: str) -> Dict:
+        return {
+            "section_id": section["id"],
+            "title": section["title"],
+            "content": content,
+            "type": section_type
+        }
 
     async def _generate_single_section(
         self,
@@ -1895,7 +1992,8 @@ Place: {ci.college_name}
         project_data: Dict,
         document_type: DocumentType,
         college_info: Optional[CollegeInfo],
-        max_retries: int
+        max_retries: int,
+        shared_context: Optional[str] = None
     ) -> Dict:
         """Generate a single section with appropriate method based on type."""
         section_type = section.get("type", "generate")
@@ -1908,7 +2006,7 @@ Place: {ci.college_name}
             return self._get_code_content(section["id"], project_data)
         else:
             return await self._generate_single_section_with_retry(
-                section, outline, project_data, document_type, college_info, max_retries
+                section, outline, project_data, document_type, college_info, max_retries, shared_context
             )
 
     async def _generate_single_section_with_retry(
@@ -1918,7 +2016,9 @@ Place: {ci.college_name}
         project_data: Dict,
         document_type: DocumentType,
         college_info: Optional[CollegeInfo],
-        max_retries: int
+        max_retries: int,
+        shared_context: Optional[str] = None,
+        window: Optional[SectionWindow] = None
     ) -> Dict:
         """
         Generate a single section with retry logic.
@@ -1935,7 +2035,8 @@ Place: {ci.college_name}
                     section,
                     outline.get(section["id"], {}),
                     project_data,
-                    document_type
+                    document_type,
+                    shared_context
                 )
 
                 # Check if content is valid (not empty, not error)
@@ -1958,6 +2059,8 @@ Place: {ci.college_name}
                 # Check for rate limiting - use longer backoff
                 if "rate" in error_str or "429" in error_str or "overload" in error_str:
                     wait_time = (3 ** attempt) + 2  # Longer backoff for rate limits: 3s, 5s, 11s, 29s
+                    if window:
+                        window.on_throttle()
                     logger.warning(
                         f"[ChunkedDoc] Section {section['id']} rate limited (attempt {attempt + 1}/{max_retries})"
                     )
@@ -2022,14 +2125,15 @@ Place: {ci.college_name}
                         local_path = result.get('local_path')
                         if local_path and not local_path.startswith('['):
                             diagrams[diagram_type] = local_path
+                            render = "cached" if result.get('cached') else f"rendered in {result.get('render_ms')}ms"
                             if result.get('saved_to_cloud'):
-                                logger.info(f"[ChunkedDoc] {diagram_type} saved to S3: {result.get('s3_key')}")
+                                logger.info(f"[ChunkedDoc] {diagram_type} saved to S3: {result.get('s3_key')} ({render})")
 
                     logger.info(f"[ChunkedDoc] Generated {len(diagrams)} DYNAMIC UML diagrams (saved to S3+DB)")
                 except Exception as cloud_err:
                     logger.warning(f"[ChunkedDoc] Cloud save failed, falling back to local: {cloud_err}")
                     # Fallback to local generation if cloud save fails
-                    diagrams = uml_generator.generate_all_diagrams(
+                    diagrams = await uml_generator.generate_all_diagrams_async(
                         project_data=project_data,
                         project_id=project_id,
                         user_id=user_id
@@ -2038,7 +2142,7 @@ Place: {ci.college_name}
             else:
                 # Local-only generation if no user_id/project_id
                 logger.warning("[ChunkedDoc] No project_id/user_id - saving diagrams locally only")
-                diagrams = uml_generator.generate_all_diagrams(
+                diagrams = await uml_generator.generate_all_diagrams_async(
                     project_data=project_data,
                     project_id=project_id,
                     user_id=user_id
@@ -36,20 +36,17 @@ import json
 import re
 from datetime import datetime
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 from app.core.logging_config import logger
 from app.modules.agents.base_agent import BaseAgent, AgentContext
 from app.modules.automation import file_manager
 from app.modules.automation.pdf_generator import pdf_generator
 from app.modules.automation.ppt_generator import ppt_generator
+from app.services.document_render_service import document_render_service
 import tempfile
 import os
 import shutil
 
-# Thread pool for CPU-bound PDF generation
-_pdf_executor = ThreadPoolExecutor(max_workers=5)
-
 
 class DocumentGeneratorAgent(BaseAgent):
     """
@@ -1263,7 +1260,7 @@ Output valid JSON only.
         documents: Dict
     ) -> List[Dict]:
         """
-        ✅ OPTIMIZATION 22: Parallel PDF generation using ThreadPoolExecutor
+        ✅ OPTIMIZATION 22: Parallel PDF generation using render jobs
 
         Generates all PDFs concurrently instead of sequentially.
         This reduces PDF generation time from ~20s to ~5s.
@@ -1303,77 +1300,30 @@ Output valid JSON only.
         doc_data: Dict,
         docs_path
     ) -> Optional[Dict]:
-        """Generate a single PDF/PPTX file using thread pool for CPU-bound work"""
+        """Generate a single PDF/PPTX file as a render job (worker process, off the GIL)"""
         try:
-            loop = asyncio.get_event_loop()
-
             if doc_type in ["srs", "sds", "testing_plan", "project_report"]:
-                file_name = f"{doc_type.upper()}.pdf"
-                file_path = f"documentation/{file_name}"
-                final_path = docs_path / file_name
-
-                # Create temp file
-                with tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False) as tmp_file:
-                    tmp_path = tmp_file.name
-
-                # Run CPU-bound PDF generation in thread pool
-                success = await loop.run_in_executor(
-                    _pdf_executor,
-                    self._generate_pdf_sync,
-                    doc_type,
-                    doc_data,
-                    tmp_path
-                )
-
-                if success:
-                    # Copy to final location
-                    shutil.copy2(tmp_path, final_path)
-                    logger.info(f"[Document Generator] Generated {doc_type.upper()}.pdf")
-
-                    # Clean up temp file
-                    try:
-                        os.unlink(tmp_path)
-                    except (IOError, OSError) as e:
-                        logger.debug(f"Could not delete temp PDF file {tmp_path}: {e}")
+                kind, file_name = "pdf", f"{doc_type.upper()}.pdf"
+            elif doc_type == "ppt_content":
+                kind, file_name = "academic_pptx", "PRESENTATION.pptx"
+            else:
+                return None
 
-                    return {
-                        "path": file_path,
-                        "type": doc_type,
-                        "format": "pdf",
-                        "full_path": str(final_path)
-                    }
+            result = await document_render_service.render(kind, {
+                "doc_data": doc_data,
+                "document_type": doc_type
+            })
 
-            elif doc_type == "ppt_content":
-                file_name = "PRESENTATION.pptx"
-                file_path = f"documentation/{file_name}"
-                final_path = docs_path / file_name
-
-                with tempfile.NamedTemporaryFile(mode='wb', suffix='.pptx', delete=False) as tmp_file:
-                    tmp_path = tmp_file.name
-
-                # Run CPU-bound PPTX generation in thread pool
-                success = await loop.run_in_executor(
-                    _pdf_executor,
-                    ppt_generator.generate_project_presentation,
-                    doc_data,
-                    tmp_path
-                )
+            final_path = docs_path / file_name
+            await asyncio.to_thread(final_path.write_bytes, result["content"])
+            logger.info(f"[Document Generator] Generated {file_name}")
 
-                if success:
-                    shutil.copy2(tmp_path, final_path)
-                    logger.info(f"[Document Generator] Generated PRESENTATION.pptx")
-
-                    try:
-                        os.unlink(tmp_path)
-                    except (IOError, OSError) as e:
-                        logger.debug(f"Could not delete temp PPTX file {tmp_path}: {e}")
-
-                    return {
-                        "path": file_path,
-                        "type": doc_type,
-                        "format": "pptx",
-                        "full_path": str(final_path)
-                    }
+            return {
+                "path": f"documentation/{file_name}",
+                "type": doc_type,
+                "format": result["format"],
+                "full_path": str(final_path)
+            }
 
         except Exception as e:
             logger.error(f"[Document Generator] Error generating {doc_type}: {e}", exc_info=True)
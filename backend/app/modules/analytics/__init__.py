@@ -0,0 +1,3 @@
+"""
+Analytics Module - periodic maintenance of admin analytics aggregates
+"""
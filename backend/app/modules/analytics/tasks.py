@@ -0,0 +1,25 @@
+"""
+Analytics Celery tasks
+"""
+import asyncio
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.services.usage_rollup_service import usage_rollup_service
+
+
+@celery_app.task
+def compact_usage_rollups(days: int = None):
+    """
+    Periodic task: rebuild recent usage rollup buckets from the raw log
+
+    Incremental updates happen on write; this re-derives today's (and the
+    previous `days` days') buckets so a failed or concurrent write can't
+    leave the dashboards permanently off.
+    """
+    days = settings.USAGE_ROLLUP_COMPACTION_DAYS if days is None else days
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(usage_rollup_service.compact(days))
+    logger.info(f"[UsageRollup] Compacted last {days} day(s): {stats}")
+    return stats
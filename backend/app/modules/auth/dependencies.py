@@ -10,6 +10,7 @@ from app.core.security import decode_token
 from app.core.logging_config import logger, set_user_id, set_project_id
 from app.models.user import User, UserRole
 from app.models.project import Project
+from app.modules.auth.entitlements import entitlement_cache
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
@@ -39,10 +40,10 @@ async def get_optional_user(
         except ValueError:
             return None
 
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        snapshot = await entitlement_cache.get(user_id, db)
+        if not snapshot or not snapshot.is_active:
+            return None
+        user = await snapshot.load_user(db)
         return user if user and user.is_active else None
     except (HTTPException, ValueError) as e:
         logger.debug(f"Optional auth validation error: {e}")
@@ -86,11 +87,10 @@ async def get_current_user(
             detail="Invalid user ID format"
         )
 
-    # Get user from database - pass string directly, GUID type handles conversion
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    # Reject unknown/inactive users from the cached entitlement snapshot, then
+    # load the row itself (the snapshot never holds credentials)
+    snapshot = await entitlement_cache.get(user_id, db)
+    user = await snapshot.load_user(db) if snapshot else None
 
     if not user:
         logger.warning(f"User not found for id: {user_id}", extra={"event_type": "auth_validation_failed"})
@@ -189,16 +189,14 @@ async def get_current_user_optional(
         except ValueError:
             return None
 
-        # Get user from database
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        # Get user from the cached entitlement snapshot
+        snapshot = await entitlement_cache.get(user_id, db)
 
-        if not user or not user.is_active:
+        if not snapshot or not snapshot.is_active:
             return None
 
-        return user
+        user = await snapshot.load_user(db)
+        return user if user and user.is_active else None
     except (HTTPException, ValueError) as e:
         logger.debug(f"Optional user auth error: {e}")
         return None
@@ -0,0 +1,392 @@
+"""
+Entitlement Snapshot Cache
+==========================
+One snapshot per user holding everything the auth, usage limit and feature
+flag checks used to re-query on every request: the user's identity and
+access fields, the resolved plan limits, whether the user purchased tokens
+and the active plan's feature flags. Global feature flags are cached as one
+shared entry. Credentials and reset tokens are never cached; code that
+needs the full User row (or writes to it) loads it from the database.
+
+Snapshots live in a short-TTL in-process cache backed by Redis (shared by
+workers). Commits that touch users, subscriptions, token purchases, premium
+balances or feature flag settings invalidate the affected entries through
+SQLAlchemy session events, so payment, plan change and admin edit paths need
+no explicit calls; other workers drop their in-process copies on the
+invalidation broadcast.
+"""
+
+import asyncio
+import enum
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import DateTime, event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.pubsub import listen
+from app.models.billing import PlanType, Subscription
+from app.models.system_setting import SystemSetting
+from app.models.token_balance import TokenBalance, TokenPurchase
+from app.models.user import User
+from app.modules.auth.usage_limits import UserLimits, build_user_limits
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+KEY_PREFIX = "entitlements:"
+FLAGS_KEY = f"{KEY_PREFIX}feature-flags"
+FEATURE_FLAG_PREFIX = "features."
+
+# User columns the auth and limit checks read; nothing secret goes in the cache
+SNAPSHOT_USER_FIELDS = (
+    "id", "email", "username", "full_name", "role",
+    "is_active", "is_verified", "is_superuser", "college_id", "batch_id",
+)
+
+
+def _dump_column(column, value):
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+@dataclass
+class EntitlementSnapshot:
+    """A user's identity, plan limits and plan features at one point in time"""
+    user_id: str
+    user: Dict[str, Any]  # SNAPSHOT_USER_FIELDS values, JSON-safe
+    limits: UserLimits
+    has_token_purchase: bool = False
+    plan_name: Optional[str] = None  # Active subscription plan, None on the free tier
+    plan_features: Optional[Dict[str, Any]] = None
+    built_at: float = field(default_factory=time.time)
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.user.get("is_active"))
+
+    @property
+    def email(self) -> Optional[str]:
+        return self.user.get("email")
+
+    @classmethod
+    def from_user(cls, user: User, limits: UserLimits, has_token_purchase: bool, plan=None) -> "EntitlementSnapshot":
+        return cls(
+            user_id=str(user.id),
+            user={key: _dump_column(User.__table__.c[key], getattr(user, key)) for key in SNAPSHOT_USER_FIELDS},
+            limits=limits,
+            has_token_purchase=has_token_purchase,
+            plan_name=plan.name if plan else None,
+            plan_features=(plan.feature_flags or {}) if plan else None,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["limits"]["plan_type"] = self.limits.plan_type.value
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, data: str) -> "EntitlementSnapshot":
+        payload = json.loads(data)
+        limits = payload.pop("limits")
+        limits["plan_type"] = PlanType(limits["plan_type"])
+        # Entries written before SNAPSHOT_USER_FIELDS held every column
+        payload["user"] = {key: payload["user"].get(key) for key in SNAPSHOT_USER_FIELDS}
+        return cls(limits=UserLimits(**limits), **payload)
+
+    async def load_user(self, db: AsyncSession) -> Optional[User]:
+        """
+        The current User row. Free when the snapshot was just built in this
+        session (identity map), otherwise one primary key lookup.
+        """
+        return await db.get(User, self.user_id)
+
+
+async def load_entitlements(db: AsyncSession, user_id: str, user: Optional[User] = None) -> Optional[EntitlementSnapshot]:
+    """Build a snapshot from the database (None if the user does not exist)"""
+    from app.modules.auth.feature_flags import get_user_plan, has_token_purchase
+
+    if user is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+
+    purchased = await has_token_purchase(db, user_id)
+    # Token purchases grant Premium regardless of subscription
+    plan = None if purchased else await get_user_plan(db, user_id)
+    return EntitlementSnapshot.from_user(user, build_user_limits(purchased, plan), purchased, plan)
+
+
+async def load_feature_flags(db: AsyncSession) -> Dict[str, bool]:
+    """Global feature flags set by admins (features not listed are enabled)"""
+    result = await db.execute(
+        select(SystemSetting).where(SystemSetting.key.like(f"{FEATURE_FLAG_PREFIX}%"))
+    )
+    return {
+        setting.key[len(FEATURE_FLAG_PREFIX):]: bool(setting.value)
+        for setting in result.scalars().all()
+    }
+
+
+class EntitlementCache:
+    """
+    In-process LRU of entitlement snapshots with a Redis second tier.
+
+    Redis is optional: without it (or before start()) snapshots are cached
+    per worker only, and expire after ENTITLEMENT_LOCAL_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self._local: "OrderedDict[str, Tuple[float, EntitlementSnapshot]]" = OrderedDict()
+        self._flags: Optional[Tuple[float, Dict[str, bool]]] = None
+        # Bumped on every invalidation; a load that raced one is not cached
+        self._generation = 0
+        self._origin = uuid.uuid4().hex
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        self.stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "loads": 0,
+            "invalidations": 0,
+            "remote_invalidations": 0,
+        }
+
+    async def start(self):
+        """Connect the Redis tier and subscribe to invalidations from other workers"""
+        if aioredis is None or not settings.REDIS_URL:
+            logger.warning("[Entitlements] redis.asyncio not available, snapshots are cached per worker")
+            return
+        try:
+            self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True, db=settings.REDIS_CACHE_DB)
+            pubsub = self._redis.pubsub()
+            await pubsub.subscribe(settings.ENTITLEMENT_INVALIDATION_CHANNEL)
+        except Exception as e:
+            logger.warning(f"[Entitlements] Redis unavailable ({e}), snapshots are cached per worker")
+            self._redis = None
+            return
+        self._listener = asyncio.create_task(
+            listen(pubsub, settings.ENTITLEMENT_INVALIDATION_CHANNEL, self._handle_invalidation, "[Entitlements]")
+        )
+        logger.info("[Entitlements] Snapshot cache connected to Redis")
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    # ========== Reads ==========
+
+    async def get(self, user_id: str, db: AsyncSession, user: Optional[User] = None) -> Optional[EntitlementSnapshot]:
+        """Snapshot for a user, loading it on a miss (None if the user does not exist)"""
+        entry = self._local.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(user_id)
+            self.stats["local_hits"] += 1
+            return entry[1]
+
+        generation = self._generation
+        data = await self._redis_get(f"{KEY_PREFIX}{user_id}")
+        if data is not None:
+            try:
+                snapshot = EntitlementSnapshot.from_json(data)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"[Entitlements] Discarding unreadable snapshot for {user_id}: {e}")
+            else:
+                self.stats["redis_hits"] += 1
+                self._store_local(user_id, snapshot, generation)
+                return snapshot
+
+        snapshot = await load_entitlements(db, user_id, user)
+        self.stats["loads"] += 1
+        if snapshot is None:
+            return None
+        if self._store_local(user_id, snapshot, generation):
+            await self._redis_set(f"{KEY_PREFIX}{user_id}", snapshot.to_json())
+        return snapshot
+
+    async def get_feature_flags(self, db: AsyncSession) -> Dict[str, bool]:
+        """Global feature flags (feature name -> enabled)"""
+        if self._flags is not None and self._flags[0] > time.monotonic():
+            self.stats["local_hits"] += 1
+            return self._flags[1]
+
+        generation = self._generation
+        data = await self._redis_get(FLAGS_KEY)
+        if data is not None:
+            flags = json.loads(data)
+            self.stats["redis_hits"] += 1
+        else:
+            flags = await load_feature_flags(db)
+            self.stats["loads"] += 1
+            if generation == self._generation:
+                await self._redis_set(FLAGS_KEY, json.dumps(flags))
+        if generation == self._generation:
+            self._flags = (time.monotonic() + settings.ENTITLEMENT_LOCAL_TTL_SECONDS, flags)
+        return flags
+
+    def _store_local(self, user_id: str, snapshot: EntitlementSnapshot, generation: int) -> bool:
+        if generation != self._generation:
+            return False
+        self._local[user_id] = (time.monotonic() + settings.ENTITLEMENT_LOCAL_TTL_SECONDS, snapshot)
+        self._local.move_to_end(user_id)
+        while len(self._local) > settings.ENTITLEMENT_CACHE_MAX_ENTRIES:
+            self._local.popitem(last=False)
+        return True
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"[Entitlements] Redis get failed: {e}")
+            return None
+
+    async def _redis_set(self, key: str, data: str):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, data, ex=settings.ENTITLEMENT_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"[Entitlements] Redis set failed: {e}")
+
+    # ========== Invalidation ==========
+
+    def invalidate_local(self, user_ids: Iterable[str] = (), feature_flags: bool = False):
+        """Drop this worker's copies"""
+        self._generation += 1
+        for user_id in user_ids:
+            self._local.pop(user_id, None)
+        if feature_flags:
+            self._flags = None
+
+    async def invalidate(self, user_ids: Iterable[str] = (), feature_flags: bool = False):
+        """Drop snapshots everywhere: this worker, Redis and (via pub/sub) other workers"""
+        user_ids = list(user_ids)
+        self.invalidate_local(user_ids, feature_flags)
+        self.stats["invalidations"] += len(user_ids) + int(feature_flags)
+        if self._redis is None:
+            return
+        keys = [f"{KEY_PREFIX}{user_id}" for user_id in user_ids]
+        if feature_flags:
+            keys.append(FLAGS_KEY)
+        try:
+            if keys:
+                await self._redis.delete(*keys)
+            await self._redis.publish(
+                settings.ENTITLEMENT_INVALIDATION_CHANNEL,
+                json.dumps({"origin": self._origin, "users": user_ids, "feature_flags": feature_flags})
+            )
+        except Exception as e:
+            logger.warning(f"[Entitlements] Redis invalidation failed: {e}")
+
+    def invalidate_soon(self, user_ids: Iterable[str] = (), feature_flags: bool = False):
+        """Invalidate from synchronous code (session events): local now, Redis in a task"""
+        user_ids = list(user_ids)
+        self.invalidate_local(user_ids, feature_flags)
+        if self._redis is None:
+            self.stats["invalidations"] += len(user_ids) + int(feature_flags)
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self.invalidate(user_ids, feature_flags))
+        except RuntimeError:
+            # No loop (sync scripts, Celery): Redis entries expire on their TTL
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _handle_invalidation(self, data: str):
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") == self._origin:
+            return
+        self.invalidate_local(payload.get("users") or (), bool(payload.get("feature_flags")))
+        self.stats["remote_invalidations"] += 1
+
+    def clear(self):
+        self.invalidate_local(list(self._local), feature_flags=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "local_entries": len(self._local),
+            "redis_enabled": self._redis is not None,
+            **self.stats,
+        }
+
+
+# Singleton instance
+entitlement_cache = EntitlementCache()
+
+
+async def get_entitlements(user: User, db: AsyncSession) -> EntitlementSnapshot:
+    """Snapshot for an already loaded user"""
+    return await entitlement_cache.get(str(user.id), db, user=user)
+
+
+# ==================== Invalidation on commit ====================
+
+def _affected_entitlements(session: Session, objects: Iterable[Any]) -> Tuple[List[str], bool]:
+    user_ids = []
+    feature_flags = False
+    for obj in objects:
+        if isinstance(obj, User):
+            user_ids.append(obj.id)
+        elif isinstance(obj, (Subscription, TokenPurchase)):
+            user_ids.append(obj.user_id)
+        elif isinstance(obj, TokenBalance):
+            # Token usage updates the balance constantly; only premium grants matter
+            if obj in session.dirty and not inspect(obj).attrs.premium_tokens.history.has_changes():
+                continue
+            user_ids.append(obj.user_id)
+        elif isinstance(obj, SystemSetting) and (obj.key or "").startswith(FEATURE_FLAG_PREFIX):
+            feature_flags = True
+    return [str(user_id) for user_id in user_ids if user_id is not None], feature_flags
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_entitlement_changes(session, flush_context):
+    # new/dirty/deleted and attribute history still show the pre-flush state here
+    user_ids, feature_flags = _affected_entitlements(
+        session, list(session.new) + list(session.dirty) + list(session.deleted)
+    )
+    if user_ids or feature_flags:
+        pending = session.info.setdefault("entitlements_changed", {"users": set(), "feature_flags": False})
+        pending["users"].update(user_ids)
+        pending["feature_flags"] = pending["feature_flags"] or feature_flags
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_entitlements(session):
+    pending = session.info.pop("entitlements_changed", None)
+    if pending:
+        entitlement_cache.invalidate_soon(pending["users"], pending["feature_flags"])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_entitlement_changes(session, previous_transaction):
+    session.info.pop("entitlements_changed", None)
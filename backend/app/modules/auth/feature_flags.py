@@ -17,6 +17,7 @@ from app.models.user import User
 from app.models.system_setting import SystemSetting
 from app.models.billing import Plan, Subscription, SubscriptionStatus
 from app.modules.auth.dependencies import get_current_user
+from app.modules.auth.entitlements import entitlement_cache, get_entitlements
 
 
 # Default features for users without a plan (Free tier)
@@ -101,6 +102,7 @@ async def check_feature_access(
 ) -> dict:
     """
     Check if user has access to a feature.
+    Reads the cached entitlement snapshot and global flags, not the database.
 
     Returns:
         {
@@ -111,8 +113,8 @@ async def check_feature_access(
         }
     """
     # 1. Check global feature flag first (admin can disable for everyone)
-    global_enabled = await get_global_feature_flag(db, feature_name)
-    if not global_enabled:
+    feature_flags = await entitlement_cache.get_feature_flags(db)
+    if not feature_flags.get(feature_name, True):
         return {
             "allowed": False,
             "reason": f"Feature '{feature_name.replace('_', ' ')}' is currently disabled for maintenance",
@@ -122,7 +124,8 @@ async def check_feature_access(
 
     # 2. Check if user has token purchase (Premium via payment)
     # TokenPurchase grants ALL premium features
-    if await has_token_purchase(db, str(user.id)):
+    snapshot = await get_entitlements(user, db)
+    if snapshot.has_token_purchase:
         return {
             "allowed": True,
             "reason": None,
@@ -131,17 +134,14 @@ async def check_feature_access(
         }
 
     # 3. Check user's subscription plan
-    plan = await get_user_plan(db, str(user.id))
-
-    if plan is None:
+    if snapshot.plan_features is None:
         # User has no active subscription - use free tier
         current_plan = "Free"
         feature_allowed = FREE_TIER_FEATURES.get(feature_name, False)
     else:
-        current_plan = plan.name
+        current_plan = snapshot.plan_name
         # Check plan's feature_flags
-        feature_flags = plan.feature_flags or {}
-        feature_allowed = feature_flags.get(feature_name, False)
+        feature_allowed = snapshot.plan_features.get(feature_name, False)
 
     if feature_allowed:
         return {
@@ -4,7 +4,7 @@ Usage Limits Module
 Tracks user usage against plan limits and enforces feature access.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Optional, List, Dict, Any
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,7 +12,7 @@ from sqlalchemy import select, and_, func
 from datetime import datetime, timedelta
 
 from app.models.user import User
-from app.models.billing import Plan, Subscription, SubscriptionStatus, PlanType
+from app.models.billing import Plan, PlanType
 from app.models.usage import UsageLog, TokenUsage
 
 
@@ -27,9 +27,9 @@ class UsageLimitCheck:
     reset_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class UserLimits:
-    """User's current plan limits"""
+    """User's current plan limits (shared through the entitlement cache, so read-only)"""
     plan_name: str
     plan_type: PlanType
     token_limit: Optional[int] = None
@@ -81,92 +81,51 @@ FREE_LIMITS = UserLimits(
 )
 
 
-async def get_user_limits(user: User, db: AsyncSession) -> UserLimits:
-    """Get user's current plan limits"""
-    # First check if user has purchased tokens (token_purchases table)
-    # Users who purchased tokens get Premium access
-    from app.models.token_balance import TokenPurchase, TokenBalance
+# Limits for users who purchased tokens (Premium access)
+TOKEN_PURCHASE_LIMITS = UserLimits(
+    plan_name="Premium (Token Purchase)",
+    plan_type=PlanType.PRO,
+    token_limit=None,  # Unlimited for purchased tokens
+    project_limit=1,  # Allow 1 project per purchase
+    api_calls_limit=None,
+    code_generations_per_day=None,
+    auto_fixes_per_day=None,
+    documents_per_month=None,
+    concurrent_executions=5,
+    execution_timeout_minutes=30,
+    allowed_models=["haiku", "sonnet"],
+    feature_flags={
+        "project_generation": True,
+        "code_preview": True,
+        "bug_fixing": True,
+        "srs_document": True,
+        "sds_document": True,
+        "project_report": True,
+        "ppt_generation": True,
+        "viva_questions": True,
+        "plagiarism_check": True,
+        "code_execution": True,
+        "download_files": True
+    },
+    max_files_per_project=None  # Unlimited
+)
 
-    token_purchase_result = await db.execute(
-        select(TokenPurchase).where(
-            and_(
-                TokenPurchase.user_id == user.id,
-                TokenPurchase.payment_status == "success",
-                TokenPurchase.is_expired == False
-            )
-        ).limit(1)
-    )
-    has_token_purchase = token_purchase_result.scalar_one_or_none()
-
-    # Fallback: Check if user has premium_tokens in their balance
-    # This handles users who paid before TokenPurchase records were created
-    if not has_token_purchase:
-        balance_result = await db.execute(
-            select(TokenBalance).where(
-                and_(
-                    TokenBalance.user_id == user.id,
-                    TokenBalance.premium_tokens > 0
-                )
-            )
-        )
-        has_premium_balance = balance_result.scalar_one_or_none()
-        if has_premium_balance:
-            has_token_purchase = True  # Treat as having purchased
 
-    if has_token_purchase:
-        # User has purchased tokens - give them Premium access
-        return UserLimits(
-            plan_name="Premium (Token Purchase)",
-            plan_type=PlanType.PRO,
-            token_limit=None,  # Unlimited for purchased tokens
-            project_limit=1,  # Allow 1 project per purchase
-            api_calls_limit=None,
-            code_generations_per_day=None,
-            auto_fixes_per_day=None,
-            documents_per_month=None,
-            concurrent_executions=5,
-            execution_timeout_minutes=30,
-            allowed_models=["haiku", "sonnet"],
-            feature_flags={
-                "project_generation": True,
-                "code_preview": True,
-                "bug_fixing": True,
-                "srs_document": True,
-                "sds_document": True,
-                "project_report": True,
-                "ppt_generation": True,
-                "viva_questions": True,
-                "plagiarism_check": True,
-                "code_execution": True,
-                "download_files": True
-            },
-            max_files_per_project=None  # Unlimited
-        )
-
-    # Get active subscription
-    result = await db.execute(
-        select(Subscription).join(Plan).where(
-            and_(
-                Subscription.user_id == user.id,
-                Subscription.status == SubscriptionStatus.ACTIVE
-            )
-        )
-    )
-    subscription = result.scalar_one_or_none()
+def _copy_limits(limits: UserLimits) -> UserLimits:
+    """Copy of a module-level default, including its list and dict"""
+    return replace(limits, allowed_models=list(limits.allowed_models), feature_flags=dict(limits.feature_flags))
 
-    if not subscription:
-        return FREE_LIMITS
 
-    # Get the plan
-    plan_result = await db.execute(
-        select(Plan).where(Plan.id == subscription.plan_id)
-    )
-    plan = plan_result.scalar_one_or_none()
+def build_user_limits(has_token_purchase: bool, plan: Optional[Plan]) -> UserLimits:
+    """Resolve plan limits from a user's token purchase and active plan"""
+    # Users who purchased tokens get Premium access
+    if has_token_purchase:
+        return _copy_limits(TOKEN_PURCHASE_LIMITS)
 
     if not plan:
-        return FREE_LIMITS
+        return _copy_limits(FREE_LIMITS)
 
-    feature_flags = plan.feature_flags or {}
+    feature_flags = dict(plan.feature_flags or {})
     # Get max_files from feature_flags, None means unlimited (Premium)
     max_files = feature_flags.get("max_files_per_project", None)
 
@@ -181,12 +140,20 @@ async def get_user_limits(user: User, db: AsyncSession) -> UserLimits:
         documents_per_month=plan.documents_per_month,
         concurrent_executions=plan.concurrent_executions or 1,
         execution_timeout_minutes=plan.execution_timeout_minutes or 5,
-        allowed_models=plan.allowed_models or ["haiku"],
+        allowed_models=list(plan.allowed_models or ["haiku"]),
         feature_flags=feature_flags,
         max_files_per_project=max_files
     )
 
 
+async def get_user_limits(user: User, db: AsyncSession) -> UserLimits:
+    """Get user's current plan limits (from the cached entitlement snapshot)"""
+    from app.modules.auth.entitlements import get_entitlements
+
+    snapshot = await get_entitlements(user, db)
+    return snapshot.limits
+
+
 async def check_token_limit(user: User, db: AsyncSession, tokens_needed: int = 0) -> UsageLimitCheck:
     """Check if user has tokens remaining"""
     limits = await get_user_limits(user, db)
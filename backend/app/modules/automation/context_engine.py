@@ -17,6 +17,7 @@ from dataclasses import dataclass, field
 from collections import defaultdict
 
 from app.core.logging_config import logger
+from app.modules.automation.context_snapshot import SCAN_EXCLUDE_DIRS, context_snapshots, is_scanned_file
 
 
 @dataclass
@@ -213,69 +214,28 @@ class ContextEngine:
         self._file_cache: Dict[str, str] = {}
         self._import_graph: Dict[str, Set[str]] = defaultdict(set)
         self._missing_modules: List[Dict] = []  # Track modules that need to be created
+        # Cached scan shared by every engine for this project directory
+        self._snapshot = context_snapshots.get(self.project_path)
 
     def scan_project_files(self, extensions: Optional[List[str]] = None) -> List[Dict]:
         """
         Scan project directory for all source files.
         Like Bolt.new, this gives us full project context.
         Supports ALL major programming languages.
+
+        With the default extensions the result comes from the project's
+        cached snapshot (see context_snapshot.py); an explicit extension
+        list walks and reads the directory directly.
         """
         if extensions is None:
-            extensions = [
-                # JavaScript/TypeScript
-                '.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.vue', '.svelte',
-                # Python
-                '.py', '.pyx', '.pyi',
-                # Go
-                '.go',
-                # Rust
-                '.rs',
-                # Java/Kotlin
-                '.java', '.kt', '.kts', '.gradle',
-                # C/C++
-                '.c', '.cpp', '.cc', '.h', '.hpp', '.hh',
-                # C#/.NET
-                '.cs', '.csproj', '.sln',
-                # Ruby
-                '.rb', '.erb', '.rake',
-                # PHP
-                '.php', '.blade.php',
-                # Swift
-                '.swift',
-                # Scala
-                '.scala', '.sc',
-                # Elixir/Erlang
-                '.ex', '.exs', '.erl', '.hrl',
-                # Haskell
-                '.hs', '.lhs',
-                # F#/OCaml
-                '.fs', '.fsx', '.ml', '.mli',
-                # Clojure
-                '.clj', '.cljs', '.cljc', '.edn',
-                # Config files
-                '.json', '.yaml', '.yml', '.toml', '.xml', '.ini', '.env',
-                # Web
-                '.html', '.css', '.scss', '.sass', '.less',
-                # Docs
-                '.md', '.rst', '.txt',
-                # Shell
-                '.sh', '.bash', '.zsh', '.fish',
-                # Docker/Infra
-                '.dockerfile',
-            ]
+            return self._scan_snapshot()
 
         files = []
-        exclude_dirs = {
-            'node_modules', '__pycache__', '.git', 'dist', 'build', '.next',
-            'venv', '.venv', 'env', '.env', 'target', '.cache', 'vendor',
-            'coverage', '.nyc_output', 'obj', 'bin', '.gradle', '.idea',
-            '.vs', '.vscode', 'packages', '.dart_tool', 'Pods'
-        }
 
         try:
             for root, dirs, filenames in os.walk(self.project_path):
                 # Skip excluded directories
-                dirs[:] = [d for d in dirs if d not in exclude_dirs]
+                dirs[:] = [d for d in dirs if d not in SCAN_EXCLUDE_DIRS]
 
                 for filename in filenames:
                     ext = Path(filename).suffix.lower()
@@ -300,6 +260,26 @@ class ContextEngine:
             logger.error(f"[ContextEngine] Failed to scan project: {e}")
             return []
 
+    def _scan_snapshot(self) -> List[Dict]:
+        """
+        Default-extension scan served from the project's cached snapshot:
+        only new, changed or notified files are read from disk.
+        """
+        snapshot = self._snapshot
+        snapshot.refresh()
+        files = []
+        for path in list(snapshot.files):
+            content = snapshot.read(path)
+            if content is not None:
+                files.append({
+                    'path': path,
+                    'content': content,
+                    'size': len(content)
+                })
+
+        logger.info(f"[ContextEngine] Scanned {len(files)} project files")
+        return files
+
     def extract_missing_modules(self, errors: List[Dict]) -> List[Dict]:
         """
         Extract modules that need to be CREATED (not just fixed).
@@ -515,6 +495,7 @@ class ContextEngine:
             ContextPayload ready to send to Claude
         """
         logger.info(f"[ContextEngine] Building context for: {user_message[:50]}...")
+        self._snapshot.refresh()
 
         # 0. If no files provided, scan project directory
         if not all_files:
@@ -686,12 +667,23 @@ class ContextEngine:
                 content = self._read_file(path)
 
             if content:
-                imports = self._extract_imports(path, content)
+                imports = self._snapshot.imports(path, content, self._import_specifiers, self._resolve_import)
                 self._import_graph[path].update(imports)
 
     def _extract_imports(self, file_path: str, content: str) -> Set[str]:
         """Extract imported file paths from a file's content"""
         imports = set()
+        for import_path in self._import_specifiers(file_path, content):
+            # Resolve relative imports
+            resolved = self._resolve_import(file_path, import_path)
+            if resolved:
+                imports.add(resolved)
+
+        return imports
+
+    def _import_specifiers(self, file_path: str, content: str) -> List[str]:
+        """Import paths as written in a file's content (unresolved)"""
+        specifiers = []
         ext = Path(file_path).suffix.lstrip('.')
 
         # Get patterns for this file type
@@ -701,21 +693,16 @@ class ContextEngine:
             if ext in ['tsx', 'ts']:
                 patterns = self.IMPORT_PATTERNS.get('js')
             else:
-                return imports
+                return specifiers
 
         if not patterns:
-            return imports
+            return specifiers
 
         for pattern in patterns:
             for match in re.finditer(pattern, content, re.MULTILINE):
-                import_path = match.group(1)
-
-                # Resolve relative imports
-                resolved = self._resolve_import(file_path, import_path)
-                if resolved:
-                    imports.add(resolved)
+                specifiers.append(match.group(1))
 
-        return imports
+        return specifiers
 
     def _resolve_import(self, from_file: str, import_path: str) -> Optional[str]:
         """Resolve an import path to an actual file path"""
@@ -759,6 +746,8 @@ class ContextEngine:
 
     def _file_exists(self, path: str) -> bool:
         """Check if a file exists in the project"""
+        if is_scanned_file(path):
+            return self._snapshot.contains(path)
         full_path = self.project_path / path
         return full_path.exists()
 
@@ -766,6 +755,10 @@ class ContextEngine:
         """Read file content from disk with caching"""
         if path in self._file_cache:
             return self._file_cache[path]
+        if is_scanned_file(path):
+            content = self._snapshot.read(path)
+            if content is not None:
+                return content
 
         try:
             full_path = self.project_path / path
@@ -0,0 +1,322 @@
+"""
+Project Context Snapshot
+Cached project scan behind ContextEngine.
+
+The auto-fix loop builds fixer context several times per error. Instead of
+walking the project, reading every file and re-parsing every import on each
+call, a snapshot per project directory keeps the file list (size, mtime,
+hash), contents loaded on first use and each file's import specifiers.
+
+It is kept current two ways:
+- write notifications: sandbox writes, the patch appliers and FileManager
+  call notify_file_written(), and those paths are re-checked on next use
+- mtime fallback: every CONTEXT_SNAPSHOT_RESCAN_SECONDS the tree is walked
+  again (stat only) to pick up changes made by anything else (containers,
+  package managers, other workers)
+
+Usage:
+    snapshot = context_snapshots.get(project_path)
+    snapshot.refresh()
+    content = snapshot.read("src/App.tsx")
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+# Extensions picked up by a project scan
+SCAN_EXTENSIONS = frozenset([
+    # JavaScript/TypeScript
+    '.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.vue', '.svelte',
+    # Python
+    '.py', '.pyx', '.pyi',
+    # Go
+    '.go',
+    # Rust
+    '.rs',
+    # Java/Kotlin
+    '.java', '.kt', '.kts', '.gradle',
+    # C/C++
+    '.c', '.cpp', '.cc', '.h', '.hpp', '.hh',
+    # C#/.NET
+    '.cs', '.csproj', '.sln',
+    # Ruby
+    '.rb', '.erb', '.rake',
+    # PHP
+    '.php', '.blade.php',
+    # Swift
+    '.swift',
+    # Scala
+    '.scala', '.sc',
+    # Elixir/Erlang
+    '.ex', '.exs', '.erl', '.hrl',
+    # Haskell
+    '.hs', '.lhs',
+    # F#/OCaml
+    '.fs', '.fsx', '.ml', '.mli',
+    # Clojure
+    '.clj', '.cljs', '.cljc', '.edn',
+    # Config files
+    '.json', '.yaml', '.yml', '.toml', '.xml', '.ini', '.env',
+    # Web
+    '.html', '.css', '.scss', '.sass', '.less',
+    # Docs
+    '.md', '.rst', '.txt',
+    # Shell
+    '.sh', '.bash', '.zsh', '.fish',
+    # Docker/Infra
+    '.dockerfile',
+])
+
+# Extension-less files that are always scanned
+SCAN_FILENAMES = frozenset(['package.json', 'tsconfig.json', 'Dockerfile', 'requirements.txt'])
+
+SCAN_EXCLUDE_DIRS = frozenset([
+    'node_modules', '__pycache__', '.git', 'dist', 'build', '.next',
+    'venv', '.venv', 'env', '.env', 'target', '.cache', 'vendor',
+    'coverage', '.nyc_output', 'obj', 'bin', '.gradle', '.idea',
+    '.vs', '.vscode', 'packages', '.dart_tool', 'Pods'
+])
+
+# Project directories whose snapshot is kept in memory (least recently used are dropped)
+MAX_SNAPSHOTS = 32
+
+
+def is_scanned_file(rel_path: str) -> bool:
+    """Whether a project-relative path is part of a project scan"""
+    parts = rel_path.split('/')
+    if any(part in SCAN_EXCLUDE_DIRS or part in ('', '.', '..') for part in parts[:-1]):
+        return False
+    name = parts[-1]
+    return name in SCAN_FILENAMES or os.path.splitext(name)[1].lower() in SCAN_EXTENSIONS
+
+
+@dataclass
+class SnapshotFile:
+    path: str
+    size: int
+    mtime_ns: int
+    content: Optional[str] = None  # Loaded on first read
+    content_hash: Optional[str] = None
+    # Import specifiers as written in the file; kept while the content hash is unchanged
+    specifiers: Optional[List[str]] = None
+    # Specifiers resolved to project paths, valid for one paths_version
+    imports: Optional[Set[str]] = None
+    imports_version: int = -1
+
+
+@dataclass
+class ProjectSnapshot:
+    """Scan state of one project directory"""
+    root: str
+    files: Dict[str, SnapshotFile] = field(default_factory=dict)
+    # Project-relative paths written since the last refresh
+    pending: Set[str] = field(default_factory=set)
+    scanned_at: float = 0.0
+    # Bumped when files are added or removed (import resolution depends on it)
+    paths_version: int = 0
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def mark_written(self, rel_path: str):
+        with self.lock:
+            self.pending.add(rel_path)
+
+    def refresh(self, rescan_after: Optional[float] = None) -> int:
+        """
+        Bring the snapshot up to date: a full stat walk on first use or once
+        rescan_after seconds have passed, otherwise only the notified paths.
+
+        Returns:
+            Number of files added, changed or removed
+        """
+        if rescan_after is None:
+            rescan_after = settings.CONTEXT_SNAPSHOT_RESCAN_SECONDS
+        with self.lock:
+            if not self.scanned_at or time.monotonic() - self.scanned_at >= rescan_after:
+                return self._rescan()
+            return self._apply_pending()
+
+    def _rescan(self) -> int:
+        seen: Dict[str, os.stat_result] = {}
+        try:
+            for root, dirs, filenames in os.walk(self.root):
+                dirs[:] = [d for d in dirs if d not in SCAN_EXCLUDE_DIRS]
+                rel_root = os.path.relpath(root, self.root).replace('\\', '/')
+                for filename in filenames:
+                    if filename not in SCAN_FILENAMES and os.path.splitext(filename)[1].lower() not in SCAN_EXTENSIONS:
+                        continue
+                    rel_path = filename if rel_root == '.' else f"{rel_root}/{filename}"
+                    try:
+                        seen[rel_path] = os.stat(os.path.join(root, filename))
+                    except OSError:
+                        continue
+        except Exception as e:
+            logger.error(f"[ContextSnapshot] Failed to scan {self.root}: {e}")
+
+        removed = [p for p in self.files if p not in seen]
+        for path in removed:
+            del self.files[path]
+        paths_changed = bool(removed) or any(p not in self.files for p in seen)
+        changed = len(removed)
+        for path, stat in seen.items():
+            if self._update(path, stat):
+                changed += 1
+        if paths_changed:
+            self.paths_version += 1
+
+        self.pending.clear()
+        self.scanned_at = time.monotonic()
+        logger.debug(f"[ContextSnapshot] Rescanned {self.root}: {len(self.files)} files, {changed} changed")
+        return changed
+
+    def _apply_pending(self) -> int:
+        if not self.pending:
+            return 0
+        changed = 0
+        paths_changed = False
+        for path in self.pending:
+            if not is_scanned_file(path):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.root, path))
+            except OSError:
+                stat = None
+            if stat is None:
+                if self.files.pop(path, None) is not None:
+                    paths_changed = True
+                    changed += 1
+                continue
+            paths_changed = paths_changed or path not in self.files
+            # A notified write is re-read even if mtime and size look unchanged
+            self._update(path, stat, force=True)
+            changed += 1
+        if paths_changed:
+            self.paths_version += 1
+        self.pending.clear()
+        return changed
+
+    def _update(self, path: str, stat: os.stat_result, force: bool = False) -> bool:
+        entry = self.files.get(path)
+        if entry is None:
+            self.files[path] = SnapshotFile(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            return True
+        if not force and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            return False
+        # Content is re-read on next use; specifiers survive if the hash matches
+        entry.size = stat.st_size
+        entry.mtime_ns = stat.st_mtime_ns
+        entry.content = None
+        return True
+
+    def read(self, path: str) -> Optional[str]:
+        """Content of a scanned file (loaded and cached on first read), None if unknown"""
+        with self.lock:
+            if path in self.pending:
+                self._apply_pending()
+            entry = self.files.get(path)
+            if entry is None:
+                return None
+            if entry.content is None:
+                try:
+                    with open(os.path.join(self.root, path), 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+                except OSError as e:
+                    logger.warning(f"[ContextSnapshot] Failed to read {path}: {e}")
+                    return None
+                digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+                if digest != entry.content_hash:
+                    entry.specifiers = None
+                    entry.imports = None
+                entry.content = content
+                entry.content_hash = digest
+            return entry.content
+
+    def imports(self, path: str, content: str, parse: Callable[[str, str], List[str]],
+                resolve: Callable[[str, str], Optional[str]]) -> Set[str]:
+        """
+        Resolved imports of a file, reusing the parsed specifiers while its
+        content is unchanged and the resolution while no file was added or
+        removed. Content that differs from disk is parsed without caching.
+        """
+        with self.lock:
+            entry = self.files.get(path)
+            if entry is None or self.read(path) != content:
+                return {r for r in (resolve(path, s) for s in parse(path, content)) if r}
+            if entry.specifiers is None:
+                entry.specifiers = parse(path, content)
+            if entry.imports is None or entry.imports_version != self.paths_version:
+                entry.imports = {r for r in (resolve(path, s) for s in entry.specifiers) if r}
+                entry.imports_version = self.paths_version
+            return entry.imports
+
+    def contains(self, path: str) -> bool:
+        with self.lock:
+            if path in self.pending:
+                self._apply_pending()
+            return path in self.files
+
+
+class ContextSnapshotCache:
+    """LRU of ProjectSnapshot by project directory"""
+
+    def __init__(self, max_projects: int = MAX_SNAPSHOTS):
+        self.max_projects = max_projects
+        self._snapshots: "OrderedDict[str, ProjectSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "notifications": 0}
+
+    def get(self, project_path: Union[str, Path]) -> ProjectSnapshot:
+        root = os.path.abspath(project_path)
+        with self._lock:
+            snapshot = self._snapshots.get(root)
+            if snapshot is not None:
+                self._snapshots.move_to_end(root)
+                self.stats["hits"] += 1
+                return snapshot
+            self.stats["misses"] += 1
+            snapshot = self._snapshots[root] = ProjectSnapshot(root=root)
+            while len(self._snapshots) > self.max_projects:
+                self._snapshots.popitem(last=False)
+                self.stats["evictions"] += 1
+            return snapshot
+
+    def notify(self, path: Union[str, Path]):
+        """Record a write (or delete) of an absolute path in the snapshot that contains it"""
+        full_path = os.path.abspath(path)
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+        for snapshot in snapshots:
+            if full_path.startswith(snapshot.root + os.sep):
+                snapshot.mark_written(full_path[len(snapshot.root) + 1:].replace('\\', '/'))
+                self.stats["notifications"] += 1
+
+    def invalidate(self, project_path: Union[str, Path]):
+        with self._lock:
+            self._snapshots.pop(os.path.abspath(project_path), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+        return {
+            **self.stats,
+            "projects": len(snapshots),
+            "files": sum(len(s.files) for s in snapshots),
+            "loaded_bytes": sum(len(f.content) for s in snapshots for f in list(s.files.values()) if f.content),
+        }
+
+
+# Singleton instance
+context_snapshots = ContextSnapshotCache()
+
+
+def notify_file_written(path: Union[str, Path]):
+    """Tell cached project scans that a file was written or deleted (no filesystem access)"""
+    context_snapshots.notify(path)
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from app.core.logging_config import logger
 from app.modules.bolt.patch_applier import apply_unified_patch
+from app.modules.automation.context_snapshot import notify_file_written
 
 
 class FileManager:
@@ -118,6 +119,7 @@ class FileManager:
             # Write file
             with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            notify_file_written(full_path)
 
             logger.info(f"Created file: {project_id}/{file_path}")
 
@@ -167,6 +169,7 @@ class FileManager:
 
             with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            notify_file_written(full_path)
 
             logger.info(f"Updated file: {project_id}/{file_path}")
 
@@ -236,6 +239,7 @@ class FileManager:
                 }
 
             full_path.unlink()
+            notify_file_written(full_path)
 
             logger.info(f"Deleted file: {project_id}/{file_path}")
 
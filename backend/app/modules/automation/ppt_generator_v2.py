@@ -13,8 +13,7 @@ Features:
 - Animations suggestions
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
 import os
 import tempfile
 from io import BytesIO
@@ -26,9 +25,6 @@ from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.dml import MSO_THEME_COLOR
 
-from app.core.logging_config import logger
-from app.core.config import settings
-
 
 class PPTGeneratorV2:
     """
@@ -74,71 +70,51 @@ class PPTGeneratorV2:
         Returns:
             Path to generated presentation
         """
+        from app.services.document_render_service import document_render_service
+
+        # Assembly runs as a render job (worker process, deduplicated)
+        result = await document_render_service.render("pptx", {
+            "sections": sections,
+            "project_data": project_data,
+            "project_id": project_id,
+            "user_id": user_id
+        }, store=True)
+        return result["path"]
+
+    def render(
+        self,
+        sections: List[Dict],
+        project_data: Dict,
+        project_id: str = None,
+        user_id: str = None,
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> bytes:
+        """
+        Build the presentation and return the .pptx bytes.
+
+        CPU-bound (python-pptx); called inside a render worker.
+        progress(done, total, section_title) is called after each section.
+        """
         # Store user_id for diagram generation
         self.user_id = user_id
         self.project_id = project_id
 
-        try:
-            # Create presentation
-            self.prs = Presentation()
-            self.prs.slide_width = self.SLIDE_WIDTH
-            self.prs.slide_height = self.SLIDE_HEIGHT
-
-            # Add slides for each section
-            for section in sections:
-                await self._add_section_slides(section, project_data)
-
-            project_name = project_data.get('project_name', 'Presentation')
-            filename = f"{project_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"
-
-            # Save to S3 and PostgreSQL directly from memory (no local files)
-            if project_id and user_id:
-                try:
-                    from app.services.document_storage_service import document_storage
-
-                    # Save presentation to BytesIO buffer (no local file)
-                    buffer = BytesIO()
-                    self.prs.save(buffer)
-                    buffer.seek(0)
-                    content = buffer.read()
-
-                    save_result = await document_storage.save_document_from_bytes(
-                        user_id=user_id,
-                        project_id=project_id,
-                        content=content,
-                        file_name=filename,
-                        title=f"{project_name} - Presentation",
-                        doc_type='ppt',
-                        content_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                        extra_metadata={
-                            'project_name': project_name,
-                            'document_type': 'ppt',
-                            'generated_at': datetime.now().isoformat()
-                        }
-                    )
-
-                    if save_result:
-                        logger.info(f"[PPTGenerator] Saved to S3+DB: {save_result.get('s3_key')}")
-                        # Return S3 key as the "path" (no local file created)
-                        return save_result.get('s3_key', filename)
-                    else:
-                        logger.warning(f"[PPTGenerator] Failed to save to cloud storage")
-                except Exception as e:
-                    logger.error(f"[PPTGenerator] Error saving to S3+DB: {e}")
-
-            # Fallback: save locally only if no project/user (shouldn't happen in production)
-            output_dir = settings.GENERATED_DIR / "presentations"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            file_path = output_dir / filename
-            self.prs.save(str(file_path))
-            logger.info(f"[PPTGenerator] Created local presentation (fallback): {file_path}")
-            return str(file_path)
-
-        except Exception as e:
-            logger.error(f"[PPTGenerator] Error: {e}", exc_info=True)
-            raise
-
-    async def _add_section_slides(self, section: Dict, project_data: Dict):
+        # Create presentation
+        self.prs = Presentation()
+        self.prs.slide_width = self.SLIDE_WIDTH
+        self.prs.slide_height = self.SLIDE_HEIGHT
+
+        # Add slides for each section
+        for index, section in enumerate(sections, 1):
+            self._add_section_slides(section, project_data)
+            if progress:
+                progress(index, len(sections), section.get("title") or section.get("section_id", ""))
+
+        buffer = BytesIO()
+        self.prs.save(buffer)
+        return buffer.getvalue()
+
+    def _add_section_slides(self, section: Dict, project_data: Dict):
         """Add slides for a section"""
         section_type = section.get("type", "generate")
         section_id = section.get("section_id", "")
@@ -15,13 +15,25 @@ Supported Diagrams:
 9. Data Flow Diagram (DFD)
 
 Output: PNG images for Word/PPT embedding
+
+generate_all_diagrams_async / generate_all_diagrams_and_save render the
+diagram set concurrently in a process pool (PIL drawing is CPU-bound and
+would otherwise block the event loop) and skip diagrams whose extracted
+model hash matches the last render for the same project.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import hashlib
+import json
+import multiprocessing
 import os
 import tempfile
+import time
 from io import BytesIO
 
 from app.core.logging_config import logger
@@ -35,6 +47,38 @@ except ImportError:
     PIL_AVAILABLE = False
     logger.warning("PIL not available for diagram generation")
 
+# Bump when drawing code changes so cached renders are invalidated
+RENDER_VERSION = 1
+
+# Per output directory: diagram_type -> {model_hash, local_path, s3_key, ...}
+CACHE_MANIFEST = ".diagram_cache.json"
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for diagram rendering (None = render in threads)"""
+    global _render_pool
+    if _render_pool is None and settings.DIAGRAM_RENDER_WORKERS > 0:
+        # spawn: forking a threaded server process can deadlock the child
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.DIAGRAM_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _render_pool
+
+
+def _reset_render_pool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+    _render_pool = None
+
+
+def _render_in_worker(diagram_type: str, model: Dict, project_id: Optional[str], user_id: Optional[str]) -> Tuple[str, float]:
+    """Process-pool entry point; uses the worker's own UMLGenerator"""
+    return uml_generator.timed_render(diagram_type, model, project_id, user_id)
+
 
 class UMLGenerator:
     """
@@ -1370,75 +1414,233 @@ class UMLGenerator:
         # Return a path to indicate diagram should be generated
         return f"[{diagram_type} - Placeholder]"
 
-    def generate_all_diagrams(self, project_data: Dict, project_id: str = None, user_id: str = None) -> Dict[str, str]:
-        """
-        Generate all UML diagrams for a project - FULLY DYNAMIC
+    # ==================== Batch Rendering ====================
 
-        Args:
-            project_data: Project data with features, classes, etc.
+    def build_diagram_models(self, project_data: Dict) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract the data each diagram is drawn from - FULLY DYNAMIC
 
         Returns:
-            Dict mapping diagram type to file path
+            Dict mapping diagram type to the keyword arguments of its generate_* method
         """
-        diagrams = {}
-
         project_name = project_data.get('project_name', 'System')
-        features = project_data.get('features', [])
-        technologies = project_data.get('technologies', {})
-        api_endpoints = project_data.get('api_endpoints', [])
-        database_tables = project_data.get('database_tables', [])
+        participants, messages = self._extract_sequence_from_project(project_data)
+        external_entities, data_stores, data_flows = self._extract_dfd_from_project(project_data)
+
+        return {
+            # 1. Use Case Diagram - based on features
+            'use_case': {
+                'project_name': project_name,
+                'actors': self._extract_actors_from_project(project_data),
+                'use_cases': self._extract_use_cases_from_project(project_data)
+            },
+            # 2. Class Diagram - based on tables and code
+            'class': {'classes': self._extract_classes_from_project(project_data)},
+            # 3. Sequence Diagram - based on API endpoints
+            'sequence': {'participants': participants, 'messages': messages},
+            # 4. Activity Diagram - based on features/workflow
+            'activity': {'activities': self._extract_activities_from_project(project_data)},
+            # 5. ER Diagram - based on database tables
+            'er': {'entities': self._extract_entities_from_project(project_data)},
+            # 6. DFD Level 0 - based on project structure
+            'dfd_0': {
+                'level': 0,
+                'processes': [project_name],
+                'data_stores': data_stores,
+                'external_entities': external_entities,
+                'data_flows': data_flows
+            },
+            # 7. System Architecture Diagram - three-tier architecture with tech stack
+            'architecture': {'project_data': project_data}
+        }
 
-        # 1. Use Case Diagram - DYNAMIC based on features
-        actors = self._extract_actors_from_project(project_data)
-        use_cases = self._extract_use_cases_from_project(project_data)
+    def _architecture_model(self, project_data: Dict) -> Dict[str, Any]:
+        """Everything generate_system_architecture_diagram reads from project_data"""
+        return {
+            'project_name': project_data.get('project_name', 'System'),
+            'technologies': project_data.get('technologies', {}),
+            'features': project_data.get('features', []),
+            'frontend': self._infer_frontend_tech(project_data),
+            'backend': self._infer_backend_tech(project_data),
+            'database': self._infer_database_tech(project_data),
+            'client_devices': self._detect_client_devices(project_data),
+            'api_type': self._detect_api_type(project_data),
+            'external_services': self._detect_external_services(project_data),
+            'orm': self._detect_orm(project_data),
+            'cache_storage': self._detect_cache_storage(project_data),
+            'infrastructure': self._detect_infrastructure(project_data),
+            'security_features': self._detect_security_features(project_data)
+        }
 
-        diagrams['use_case'] = self.generate_use_case_diagram(
-            project_name=project_name,
-            actors=actors,
-            use_cases=use_cases,
-            project_id=project_id,
-            user_id=user_id
+    def model_hash(self, diagram_type: str, model: Dict[str, Any]) -> str:
+        """Stable hash of a diagram's extracted model (cache key)"""
+        if diagram_type == 'architecture':
+            model = self._architecture_model(model['project_data'])
+        payload = json.dumps(
+            {'version': RENDER_VERSION, 'type': diagram_type, 'model': model},
+            sort_keys=True,
+            default=str
         )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-        # 2. Class Diagram - DYNAMIC based on tables and code
-        classes = self._extract_classes_from_project(project_data)
-        diagrams['class'] = self.generate_class_diagram(classes, project_id=project_id, user_id=user_id)
+    def render_diagram(self, diagram_type: str, model: Dict[str, Any], project_id: str = None, user_id: str = None) -> str:
+        """Render one diagram from its model; returns the PNG path"""
+        if diagram_type == 'architecture':
+            return self.generate_system_architecture_diagram(
+                model['project_data'], project_id=project_id, user_id=user_id
+            )
 
-        # 3. Sequence Diagram - DYNAMIC based on API endpoints
-        participants, messages = self._extract_sequence_from_project(project_data)
-        diagrams['sequence'] = self.generate_sequence_diagram(participants, messages, project_id=project_id, user_id=user_id)
+        renderers = {
+            'use_case': self.generate_use_case_diagram,
+            'class': self.generate_class_diagram,
+            'sequence': self.generate_sequence_diagram,
+            'activity': self.generate_activity_diagram,
+            'er': self.generate_er_diagram,
+            'dfd_0': self.generate_dfd
+        }
+        return renderers[diagram_type](**model, project_id=project_id, user_id=user_id)
+
+    def timed_render(self, diagram_type: str, model: Dict[str, Any], project_id: str = None, user_id: str = None) -> Tuple[str, float]:
+        """render_diagram plus elapsed milliseconds"""
+        start = time.perf_counter()
+        path = self.render_diagram(diagram_type, model, project_id, user_id)
+        return path, (time.perf_counter() - start) * 1000
+
+    async def _render_async(self, diagram_type: str, model: Dict[str, Any], project_id: str, user_id: str) -> Tuple[str, float]:
+        """Render off the event loop: process pool, or a thread if the pool is unavailable"""
+        pool = _get_render_pool()
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(pool, _render_in_worker, diagram_type, model, project_id, user_id)
+            except BrokenProcessPool:
+                logger.warning(f"[UMLGenerator] Render pool broken, rendering {diagram_type} in a thread")
+                _reset_render_pool()
+        return await asyncio.to_thread(self.timed_render, diagram_type, model, project_id, user_id)
+
+    def _load_manifest(self, output_dir: Path) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads((output_dir / CACHE_MANIFEST).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _update_manifest(self, output_dir: Path, updates: Dict[str, Dict[str, Any]]):
+        """Merge entries into the cache manifest (atomic replace)"""
+        if not updates:
+            return
+        manifest = self._load_manifest(output_dir)
+        for diagram_type, fields in updates.items():
+            manifest[diagram_type] = {**manifest.get(diagram_type, {}), **fields}
+        tmp = output_dir / f"{CACHE_MANIFEST}.{os.getpid()}.tmp"
+        try:
+            tmp.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+            os.replace(tmp, output_dir / CACHE_MANIFEST)
+        except OSError as e:
+            logger.warning(f"[UMLGenerator] Could not write diagram cache manifest: {e}")
+
+    async def render_all_diagrams(self, project_data: Dict, project_id: str = None, user_id: str = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Render all diagrams concurrently, reusing output whose model hash is unchanged
 
-        # 4. Activity Diagram - DYNAMIC based on features/workflow
-        activities = self._extract_activities_from_project(project_data)
-        diagrams['activity'] = self.generate_activity_diagram(activities, project_id=project_id, user_id=user_id)
+        Returns:
+            Dict mapping diagram type to:
+            {
+                'local_path': '/path/to/file.png',
+                'model_hash': '...',
+                'render_ms': 123.4,   # 0 when cached
+                'cached': False,
+                's3_key' / 'file_url' / 'document_id': stored values on cache hits
+            }
+        """
+        project_name = project_data.get('project_name', 'System')
+        models = self.build_diagram_models(project_data)
+        output_dir = self.get_output_dir(project_id, user_id)
+        manifest = self._load_manifest(output_dir)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        to_render = []
+        for diagram_type, model in models.items():
+            model_hash = self.model_hash(diagram_type, model)
+            entry = manifest.get(diagram_type, {})
+            if entry.get('model_hash') == model_hash and Path(entry.get('local_path') or '').is_file():
+                results[diagram_type] = {**entry, 'render_ms': 0.0, 'cached': True}
+            else:
+                to_render.append((diagram_type, model, model_hash))
 
-        # 5. ER Diagram - DYNAMIC based on database tables
-        entities = self._extract_entities_from_project(project_data)
-        diagrams['er'] = self.generate_er_diagram(entities, project_id=project_id, user_id=user_id)
+        async def render(diagram_type: str, model: Dict[str, Any], model_hash: str):
+            try:
+                path, elapsed_ms = await self._render_async(diagram_type, model, project_id, user_id)
+            except Exception as e:
+                logger.error(f"[UMLGenerator] Error rendering {diagram_type}: {e}")
+                return diagram_type, {'local_path': None, 'model_hash': model_hash, 'cached': False, 'error': str(e)}
+            return diagram_type, {
+                'local_path': path,
+                'model_hash': model_hash,
+                'render_ms': round(elapsed_ms, 1),
+                'cached': False
+            }
 
-        # 6. DFD Level 0 - DYNAMIC based on project structure
-        external_entities, data_stores, data_flows = self._extract_dfd_from_project(project_data)
-        diagrams['dfd_0'] = self.generate_dfd(
-            level=0,
-            processes=[project_name],
-            project_id=project_id,
-            user_id=user_id,
-            data_stores=data_stores,
-            external_entities=external_entities,
-            data_flows=data_flows
-        )
+        rendered = await asyncio.gather(*(render(*item) for item in to_render))
 
-        # 7. System Architecture Diagram - Shows three-tier architecture with tech stack
-        diagrams['architecture'] = self.generate_system_architecture_diagram(
-            project_data=project_data,
-            project_id=project_id,
-            user_id=user_id
+        updates = {}
+        for diagram_type, result in rendered:
+            results[diagram_type] = result
+            local_path = result.get('local_path')
+            if local_path and not local_path.startswith('['):
+                # New render supersedes any stored cloud copy of the old one
+                updates[diagram_type] = {
+                    'model_hash': result['model_hash'],
+                    'local_path': local_path,
+                    's3_key': None,
+                    'file_url': None,
+                    'document_id': None
+                }
+        self._update_manifest(output_dir, updates)
+
+        timings = ", ".join(
+            f"{t}=cached" if r.get('cached') else f"{t}={r.get('render_ms', 0):.0f}ms"
+            for t, r in results.items()
         )
+        logger.info(
+            f"[UMLGenerator] Diagrams for {project_name}: {len(to_render)} rendered, "
+            f"{len(models) - len(to_render)} cached ({timings})"
+        )
+
+        return {diagram_type: results[diagram_type] for diagram_type in models}
+
+    def generate_all_diagrams(self, project_data: Dict, project_id: str = None, user_id: str = None) -> Dict[str, str]:
+        """
+        Generate all UML diagrams for a project - FULLY DYNAMIC (synchronous, in-process)
+
+        Prefer generate_all_diagrams_async from async code.
+
+        Args:
+            project_data: Project data with features, classes, etc.
+
+        Returns:
+            Dict mapping diagram type to file path
+        """
+        project_name = project_data.get('project_name', 'System')
+
+        diagrams = {
+            diagram_type: self.render_diagram(diagram_type, model, project_id, user_id)
+            for diagram_type, model in self.build_diagram_models(project_data).items()
+        }
 
         logger.info(f"[UMLGenerator] Generated {len(diagrams)} diagrams for {project_name}")
 
         return diagrams
 
+    async def generate_all_diagrams_async(self, project_data: Dict, project_id: str = None, user_id: str = None) -> Dict[str, str]:
+        """
+        Generate all UML diagrams concurrently in the render pool, reusing cached output
+
+        Returns:
+            Dict mapping diagram type to file path
+        """
+        results = await self.render_all_diagrams(project_data, project_id, user_id)
+        return {t: r['local_path'] for t, r in results.items() if r.get('local_path')}
+
     async def generate_all_diagrams_and_save(
         self,
         project_data: Dict,
@@ -1448,6 +1650,9 @@ class UMLGenerator:
         """
         Generate all UML diagrams and save them to S3 + PostgreSQL.
 
+        Diagrams whose model is unchanged since the last run return the stored
+        local path and S3 key without re-rendering or re-uploading.
+
         Args:
             project_data: Project data with features, classes, etc.
             project_id: Project UUID (required for storage)
@@ -1460,7 +1665,9 @@ class UMLGenerator:
                     'local_path': '/path/to/file.png',
                     's3_key': 'documents/user/project/diagrams/...',
                     'file_url': 'https://...',
-                    'document_id': 'uuid'
+                    'document_id': 'uuid',
+                    'render_ms': 123.4,
+                    'cached': False
                 },
                 ...
             }
@@ -1470,22 +1677,36 @@ class UMLGenerator:
         if not project_id or not user_id:
             logger.error("[UMLGenerator] project_id and user_id are required for saving diagrams")
             # Fall back to local-only generation
-            local_diagrams = self.generate_all_diagrams(project_data, project_id, user_id)
-            return {k: {'local_path': v, 's3_key': None, 'file_url': None} for k, v in local_diagrams.items()}
+            rendered = await self.render_all_diagrams(project_data, project_id, user_id)
+            return {
+                k: {'local_path': v.get('local_path'), 's3_key': None, 'file_url': None,
+                    'render_ms': v.get('render_ms'), 'cached': v.get('cached', False)}
+                for k, v in rendered.items()
+            }
 
         project_name = project_data.get('project_name', 'System')
         logger.info(f"[UMLGenerator] Generating and saving diagrams for {project_name} to S3+DB")
 
         # Generate diagrams locally first
-        local_diagrams = self.generate_all_diagrams(project_data, project_id, user_id)
+        rendered = await self.render_all_diagrams(project_data, project_id, user_id)
+
+        async def save(diagram_type: str, render: Dict[str, Any]) -> Dict[str, Any]:
+            local_path = render.get('local_path')
+            timing = {'render_ms': render.get('render_ms'), 'cached': render.get('cached', False)}
 
-        # Save each diagram to S3 and DB
-        results = {}
-        for diagram_type, local_path in local_diagrams.items():
             if not local_path or local_path.startswith('['):
                 # Skip placeholders
-                results[diagram_type] = {'local_path': local_path, 'error': 'Placeholder or failed'}
-                continue
+                return {'local_path': local_path, 'error': render.get('error', 'Placeholder or failed'), **timing}
+
+            if render.get('cached') and render.get('s3_key'):
+                return {
+                    'local_path': local_path,
+                    's3_key': render.get('s3_key'),
+                    'file_url': render.get('file_url'),
+                    'document_id': render.get('document_id'),
+                    'saved_to_cloud': True,
+                    **timing
+                }
 
             try:
                 save_result = await document_storage.save_diagram(
@@ -1500,29 +1721,42 @@ class UMLGenerator:
                 )
 
                 if save_result:
-                    results[diagram_type] = {
+                    logger.info(f"[UMLGenerator] Saved {diagram_type} diagram to S3+DB")
+                    return {
                         'local_path': local_path,
                         's3_key': save_result.get('s3_key'),
                         'file_url': save_result.get('file_url'),
                         'document_id': save_result.get('document_id'),
-                        'saved_to_cloud': True
-                    }
-                    logger.info(f"[UMLGenerator] Saved {diagram_type} diagram to S3+DB")
-                else:
-                    results[diagram_type] = {
-                        'local_path': local_path,
-                        'saved_to_cloud': False,
-                        'error': 'Failed to save to cloud'
+                        'saved_to_cloud': True,
+                        **timing
                     }
+                return {
+                    'local_path': local_path,
+                    'saved_to_cloud': False,
+                    'error': 'Failed to save to cloud',
+                    **timing
+                }
 
             except Exception as e:
                 logger.error(f"[UMLGenerator] Error saving {diagram_type}: {e}")
-                results[diagram_type] = {
+                return {
                     'local_path': local_path,
                     'saved_to_cloud': False,
-                    'error': str(e)
+                    'error': str(e),
+                    **timing
                 }
 
+        # Save each diagram to S3 and DB
+        saved = await asyncio.gather(*(save(t, r) for t, r in rendered.items()))
+        results = dict(zip(rendered.keys(), saved))
+
+        # Remember cloud copies so unchanged diagrams skip the upload next time
+        self._update_manifest(self.get_output_dir(project_id, user_id), {
+            t: {k: r.get(k) for k in ('s3_key', 'file_url', 'document_id')}
+            for t, r in results.items()
+            if r.get('saved_to_cloud') and not r.get('cached')
+        })
+
         saved_count = sum(1 for r in results.values() if r.get('saved_to_cloud'))
         logger.info(f"[UMLGenerator] Saved {saved_count}/{len(results)} diagrams to S3+DB")
 
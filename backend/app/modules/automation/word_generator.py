@@ -13,7 +13,7 @@ Features:
 - Page numbers
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 import os
 import tempfile
@@ -31,7 +31,6 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
 from app.core.logging_config import logger
-from app.core.config import settings
 from app.modules.automation.uml_generator import uml_generator
 
 
@@ -114,76 +113,63 @@ class WordDocumentGenerator:
     ) -> str:
         """
         Internal document creation logic (wrapped by timeout in create_document).
+
+        Assembly runs as a render job (worker process, deduplicated); the
+        result is saved to S3+DB, or locally when there is no project/user.
         """
-        try:
-            # Create document
-            self.document = Document()
-
-            # Setup document properties
-            self._setup_document_properties(project_data)
-
-            # Create custom styles
-            self._create_custom_styles()
-
-            # Setup page layout
-            self._setup_page_layout()
-
-            # Add sections
-            for section in sections:
-                await self._add_section(section, project_data)
-
-            # Add table of contents (placeholder - Word will update)
-            self._update_toc_fields()
-
-            project_name = project_data.get('project_name', 'Document')
-            filename = f"{project_name}_{document_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-
-            # Save to S3 and PostgreSQL directly from memory (no local files)
-            if project_id and user_id:
-                try:
-                    from app.services.document_storage_service import document_storage
-
-                    # Save document to BytesIO buffer (no local file)
-                    buffer = BytesIO()
-                    self.document.save(buffer)
-                    buffer.seek(0)
-                    content = buffer.read()
-
-                    save_result = await document_storage.save_document_from_bytes(
-                        user_id=user_id,
-                        project_id=project_id,
-                        content=content,
-                        file_name=filename,
-                        title=f"{project_name} - {document_type.upper()}",
-                        doc_type=document_type,
-                        content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        extra_metadata={
-                            'project_name': project_name,
-                            'document_type': document_type,
-                            'generated_at': datetime.now().isoformat()
-                        }
-                    )
-
-                    if save_result:
-                        logger.info(f"[WordGenerator] Saved to S3+DB: {save_result.get('s3_key')}")
-                        # Return S3 key as the "path" (no local file created)
-                        return save_result.get('s3_key', filename)
-                    else:
-                        logger.warning(f"[WordGenerator] Failed to save to cloud storage")
-                except Exception as e:
-                    logger.error(f"[WordGenerator] Error saving to S3+DB: {e}")
-
-            # Fallback: save locally only if no project/user (shouldn't happen in production)
-            output_dir = settings.GENERATED_DIR / "documents"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            file_path = output_dir / filename
-            self.document.save(str(file_path))
-            logger.info(f"[WordGenerator] Created local document (fallback): {file_path}")
-            return str(file_path)
+        from app.services.document_render_service import document_render_service
+
+        result = await document_render_service.render("docx", {
+            "sections": sections,
+            "project_data": project_data,
+            "document_type": document_type,
+            "project_id": project_id,
+            "user_id": user_id
+        }, store=True)
+        return result["path"]
+
+    def render(
+        self,
+        sections: List[Dict],
+        project_data: Dict,
+        document_type: str,
+        project_id: str = None,
+        user_id: str = None,
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> bytes:
+        """
+        Build the document and return the .docx bytes.
 
-        except Exception as e:
-            logger.error(f"[WordGenerator] Error: {e}", exc_info=True)
-            raise
+        CPU-bound (python-docx); called inside a render worker.
+        progress(done, total, section_title) is called after each section.
+        """
+        self.user_id = user_id
+        self.project_id = project_id
+
+        # Create document
+        self.document = Document()
+
+        # Setup document properties
+        self._setup_document_properties(project_data)
+
+        # Create custom styles
+        self._create_custom_styles()
+
+        # Setup page layout
+        self._setup_page_layout()
+
+        # Add sections
+        for index, section in enumerate(sections, 1):
+            self._add_section(section, project_data)
+            if progress:
+                progress(index, len(sections), section.get("title") or section.get("section_id", ""))
+
+        # Add table of contents (placeholder - Word will update)
+        self._update_toc_fields()
+
+        buffer = BytesIO()
+        self.document.save(buffer)
+        return buffer.getvalue()
 
     def _setup_document_properties(self, project_data: Dict):
         """Set document properties"""
@@ -413,7 +399,7 @@ class WordDocumentGenerator:
 
         self.styles_created = True
 
-    async def _add_section(self, section: Dict, project_data: Dict):
+    def _add_section(self, section: Dict, project_data: Dict):
         """Add a section to the document with error handling per section"""
         section_type = section.get("type", "generate")
         section_id = section.get("section_id", "")
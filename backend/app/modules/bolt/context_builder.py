@@ -3,10 +3,18 @@ AI Context Builder for Bolt.new-style code generation
 Builds intelligent context from project files for Claude API
 """
 
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
+from functools import lru_cache
 import re
+import time
 from dataclasses import dataclass
 from app.core.logging_config import logger
+from app.modules.bolt.context_index import (
+    ContextIndexCache,
+    ProjectIndex,
+    context_index_cache,
+    term_counts
+)
 
 
 @dataclass
@@ -42,8 +50,20 @@ class BoltContextBuilder:
         'these', 'those'
     }
 
-    def __init__(self):
-        pass
+    # Relevance weights
+    SELECTED_FILE_SCORE = 100
+    PATH_KEYWORD_SCORE = 30
+    BM25_WEIGHT = 10
+    RECENCY_SCORE = 25  # for a file edited just now, halving every RECENCY_HALF_LIFE
+    RECENCY_HALF_LIFE = 30 * 60
+
+    # Budget: one whole file may use at most this share of max_tokens
+    # (the selected file excepted); larger files contribute excerpts
+    MAX_FILE_SHARE = 0.5
+    SNIPPET_CONTEXT_LINES = 6
+
+    def __init__(self, index_cache: Optional[ContextIndexCache] = None):
+        self.index_cache = index_cache or context_index_cache
 
     def build_context(
         self,
@@ -52,7 +72,8 @@ class BoltContextBuilder:
         project_name: str = "Project",
         selected_file_path: Optional[str] = None,
         max_files: int = 10,
-        max_tokens: int = 50000
+        max_tokens: int = 50000,
+        index_key: Optional[str] = None
     ) -> AIContext:
         """
         Build intelligent context from project files
@@ -64,79 +85,164 @@ class BoltContextBuilder:
             selected_file_path: Currently selected file path
             max_files: Maximum files to include
             max_tokens: Approximate token limit
+            index_key: Project key for the cached token index (None = index this request only)
 
         Returns:
             AIContext object
         """
-        # Detect project type and tech stack
-        project_type = self._detect_project_type(files)
-        tech_stack = self._detect_tech_stack(files)
-
-        # Build file tree
-        file_tree = self._build_file_tree(files)
+        index = self.index_cache.get(index_key) if index_key else ProjectIndex()
 
         # Extract keywords from prompt
         keywords = self._extract_keywords(user_prompt)
 
-        # Score and rank files
-        scored_files = []
-        for file in files:
-            if file.get('type') == 'folder':
-                continue
+        with index.lock:
+            index.sync(files)
+            self._refresh_project_facts(index, files)
+            project_facts = (index.project_type, index.file_tree, list(index.tech_stack), index.dependencies)
 
-            score = self._calculate_relevance(
-                file,
-                keywords,
-                selected_file_path
-            )
+            # Score and rank files (keeping spares for files the budget skips)
+            scored_files = [
+                (path, score, index.files[path], index.matched_terms(path, keywords))
+                for path, score in self._rank(index, keywords, selected_file_path)[:max_files * 4]
+            ]
 
-            if score > 0:
-                scored_files.append({
-                    'file': file,
-                    'score': score
-                })
-
-        # Sort by score and limit
-        scored_files.sort(key=lambda x: x['score'], reverse=True)
-        scored_files = scored_files[:max_files]
-
-        # Convert to ContextFile objects with token limiting
+        # Fill the token budget in rank order; files that don't fit are
+        # excerpted around their matches or skipped, never ending the selection
         selected_files = []
-        total_tokens = 0
-
-        for item in scored_files:
-            file = item['file']
-            content = file.get('content', '')
-            file_tokens = self._estimate_tokens(content)
+        remaining = max_tokens
 
-            if total_tokens + file_tokens > max_tokens:
+        for path, score, entry, matched in scored_files:
+            if len(selected_files) >= max_files or remaining <= 0:
                 break
 
+            is_selected = path == selected_file_path
+            reason = self._get_inclusion_reason(path, selected_file_path, matched)
+
+            whole_file_limit = remaining if is_selected else min(remaining, max_tokens * self.MAX_FILE_SHARE)
+            if entry.tokens <= whole_file_limit:
+                content = entry.content
+                file_tokens = entry.tokens
+            else:
+                content, ranges = self._extract_snippets(
+                    entry.content, matched, int(whole_file_limit) * 4, head_fallback=is_selected
+                )
+                if not content:
+                    continue
+                file_tokens = self._estimate_tokens(content)
+                reason += f" (excerpt: lines {', '.join(f'{a}-{b}' for a, b in ranges)})"
+
             selected_files.append(ContextFile(
-                path=file['path'],
+                path=path,
                 content=content,
-                language=file.get('language', 'plaintext'),
-                relevance_score=item['score'],
-                reason=self._get_inclusion_reason(
-                    file,
-                    selected_file_path,
-                    keywords
-                )
+                language=entry.language,
+                relevance_score=score,
+                reason=reason
             ))
+            remaining -= file_tokens
 
-            total_tokens += file_tokens
-
+        project_type, file_tree, tech_stack, dependencies = project_facts
         return AIContext(
             project_name=project_name,
             project_type=project_type,
             file_tree=file_tree,
             selected_files=selected_files,
             tech_stack=tech_stack,
-            dependencies=self._extract_dependencies(files),
+            dependencies=dependencies,
             current_file=selected_file_path,
             user_goal=user_prompt
         )
 
+    def _refresh_project_facts(self, index: ProjectIndex, files: List[Dict]):
+        """Recompute file tree, project type and tech stack only when they can have changed"""
+        package_json = index.files.get('package.json')
+        package_hash = package_json.content_hash if package_json else None
+        if not index.structure_dirty and package_hash == index.package_hash:
+            return
+
+        index.project_type = self._detect_project_type(files)
+        index.tech_stack = self._detect_tech_stack(files)
+        index.file_tree = self._build_file_tree(files)
+        index.dependencies = self._extract_dependencies(files)
+        index.package_hash = package_hash
+        index.structure_dirty = False
+
+    def _rank(
+        self,
+        index: ProjectIndex,
+        keywords: Set[str],
+        selected_file_path: Optional[str]
+    ) -> List[Tuple[str, float]]:
+        """(path, score) for every file worth including, best first"""
+        bm25 = index.bm25(keywords)
+        now = time.time()
+        scored = []
+
+        for path, entry in index.files.items():
+            prior = _path_prior(path)
+            if prior is None:
+                continue
+
+            score = prior + self.BM25_WEIGHT * bm25.get(path, 0.0)
+            if selected_file_path and path == selected_file_path:
+                score += self.SELECTED_FILE_SCORE
+            score += self.PATH_KEYWORD_SCORE * len(keywords & entry.path_terms)
+            if entry.changed_at:
+                score += self.RECENCY_SCORE * 0.5 ** ((now - entry.changed_at) / self.RECENCY_HALF_LIFE)
+
+            if score > 0:
+                scored.append((path, score))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
+
+    def _extract_snippets(
+        self,
+        content: str,
+        keywords: List[str],
+        max_chars: int,
+        head_fallback: bool = False
+    ) -> Tuple[str, List[Tuple[int, int]]]:
+        """
+        Lines around keyword matches, merged into ranges and cut to max_chars.
+
+        Returns:
+            (excerpt text, [(first_line, last_line), ...]) with 1-based line numbers
+        """
+        lines = content.splitlines()
+        hits = [
+            i for i, line in enumerate(lines)
+            if keywords and any(k in line.lower() for k in keywords)
+        ]
+        if not hits:
+            if not head_fallback:
+                return "", []
+            hits = [0]
+
+        windows: List[List[int]] = []
+        for i in hits:
+            start = max(0, i - self.SNIPPET_CONTEXT_LINES)
+            end = min(len(lines), i + self.SNIPPET_CONTEXT_LINES + 1)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+
+        parts, ranges, used = [], [], 0
+        for start, end in windows:
+            block = "\n".join(lines[start:end])
+            if used + len(block) > max_chars:
+                block = block[:max(0, max_chars - used)]
+                if not block:
+                    break
+                end = start + block.count("\n") + 1
+            parts.append(block)
+            ranges.append((start + 1, end))
+            used += len(block) + 5
+            if used >= max_chars:
+                break
+
+        return "\n...\n".join(parts), ranges
+
     def format_for_claude(self, context: AIContext) -> str:
         """Format context for Claude API"""
         prompt = f"# Project: {context.project_name}\n\n"
@@ -233,63 +339,12 @@ class BoltContextBuilder:
 
         return stack
 
-    def _calculate_relevance(
-        self,
-        file: Dict,
-        keywords: Set[str],
-        selected_file_path: Optional[str]
-    ) -> float:
-        """Calculate file relevance score"""
-        score = 0.0
-
-        # Current/selected file gets highest priority
-        if selected_file_path and file['path'] == selected_file_path:
-            score += 100
-
-        # Keyword matching in filename
-        file_name = file['path'].lower()
-        for keyword in keywords:
-            if keyword in file_name:
-                score += 30
-
-        # Keyword matching in content
-        content = (file.get('content') or '').lower()
-        for keyword in keywords:
-            if keyword in content:
-                score += 20
-
-        # File type bonuses
-        if re.search(r'\.(tsx?|jsx?)$', file['path']):
-            score += 15  # Source files
-        if 'component' in file_name:
-            score += 10
-        if 'util' in file_name or 'helper' in file_name:
-            score += 8
-        if 'type' in file_name or 'interface' in file_name:
-            score += 5
-
-        # Penalties
-        if re.search(r'\.(test|spec)\.', file['path']):
-            score -= 50
-        if re.search(r'\.(config|rc)\.', file['path']):
-            score -= 30
-        if 'node_modules' in file['path']:
-            score = 0
-        if '.git' in file['path']:
-            score = 0
-        if re.search(r'\.(lock|log)$', file['path']):
-            score = 0
-
-        return max(0, score)
-
     def _extract_keywords(self, prompt: str) -> Set[str]:
-        """Extract keywords from user prompt"""
-        words = re.sub(r'[^\w\s]', ' ', prompt.lower()).split()
-        keywords = {
-            word for word in words
-            if len(word) > 2 and word not in self.STOP_WORDS
+        """Extract keywords from user prompt (as index terms: camelCase is split too)"""
+        return {
+            term for term in term_counts(prompt)
+            if len(term) > 2 and term not in self.STOP_WORDS
         }
-        return keywords
 
     def _build_file_tree(self, files: List[Dict]) -> str:
         """Build text representation of file tree"""
@@ -301,9 +356,13 @@ class BoltContextBuilder:
 
             for i, part in enumerate(parts):
                 if i == len(parts) - 1:
-                    current[part] = file.get('type', 'file')
+                    # Folder entries may come before or after their children
+                    if file.get('type') == 'folder':
+                        current.setdefault(part, {})
+                    else:
+                        current[part] = 'file'
                 else:
-                    if part not in current:
+                    if not isinstance(current.get(part), dict):
                         current[part] = {}
                     current = current[part]
 
@@ -330,23 +389,18 @@ class BoltContextBuilder:
 
     def _get_inclusion_reason(
         self,
-        file: Dict,
+        path: str,
         selected_file_path: Optional[str],
-        keywords: Set[str]
+        matched_keywords: List[str]
     ) -> str:
         """Get reason for file inclusion"""
-        if selected_file_path and file['path'] == selected_file_path:
+        if selected_file_path and path == selected_file_path:
             return "Currently selected file"
 
-        matched_keywords = [
-            k for k in keywords
-            if k in file['path'].lower() or k in (file.get('content') or '').lower()
-        ]
-
         if matched_keywords:
-            return f"Matches keywords: {', '.join(list(matched_keywords)[:3])}"
+            return f"Matches keywords: {', '.join(matched_keywords[:3])}"
 
-        if re.search(r'\.(tsx?|jsx?)$', file['path']):
+        if re.search(r'\.(tsx?|jsx?)$', path):
             return "Main source file"
 
         return "Related to project"
@@ -372,5 +426,38 @@ class BoltContextBuilder:
         return None
 
 
+@lru_cache(maxsize=65536)
+def _path_prior(path: str) -> Optional[float]:
+    """
+    Path-only part of a file's relevance (file type bonuses and penalties).
+
+    Returns:
+        Score adjustment, or None for files that are never included
+    """
+    if 'node_modules' in path or '.git' in path or re.search(r'\.(lock|log)$', path):
+        return None
+
+    score = 0.0
+    file_name = path.lower()
+
+    # File type bonuses
+    if re.search(r'\.(tsx?|jsx?)$', path):
+        score += 15  # Source files
+    if 'component' in file_name:
+        score += 10
+    if 'util' in file_name or 'helper' in file_name:
+        score += 8
+    if 'type' in file_name or 'interface' in file_name:
+        score += 5
+
+    # Penalties
+    if re.search(r'\.(test|spec)\.', path):
+        score -= 50
+    if re.search(r'\.(config|rc)\.', path):
+        score -= 30
+
+    return score
+
+
 # Singleton instance
 context_builder = BoltContextBuilder()
@@ -0,0 +1,229 @@
+"""
+Project Context Index
+Per-project token index behind BoltContextBuilder.
+
+Files are tokenized once and re-indexed only when their content hash
+changes, so ranking a prompt is a postings lookup (BM25) instead of
+lower()-ing and substring-scanning every file on every request. The file
+tree, project type and tech stack are cached with the index and rebuilt
+only when the set of paths or package.json changes.
+
+Usage:
+    index = context_index_cache.get(project_id)
+    index.sync(files)
+    scores = index.bm25(index.query_terms("fix the login form"))
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.logging_config import logger
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Projects whose index is kept in memory (least recently used are dropped)
+MAX_CACHED_PROJECTS = 256
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+# Sub-words of identifiers: UserProfile -> User, Profile; HTTPClient -> HTTP, Client
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def term_counts(text: str) -> Counter:
+    """
+    Term frequencies for code or prose: lower-cased words plus the camelCase
+    parts of compound identifiers (userProfile counts as userprofile, user
+    and profile).
+    """
+    # One regex pass over the text; identifiers are split once per distinct word
+    counts: Counter = Counter()
+    for word, count in Counter(_WORD.findall(text)).items():
+        parts = _SUBWORD.findall(word)
+        if len(parts) > 1:
+            counts[word.lower()] += count
+        for part in parts:
+            counts[part.lower()] += count
+    return counts
+
+
+def content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+@dataclass
+class IndexedFile:
+    path: str
+    content: str
+    language: str
+    content_hash: str
+    terms: Counter
+    path_terms: Set[str]
+    length: int
+    tokens: int
+    # When an edit was indexed (0 for files present when the index was built)
+    changed_at: float = 0.0
+
+
+@dataclass
+class ProjectIndex:
+    """Inverted index over one project's files, kept in sync by content hash"""
+    files: Dict[str, IndexedFile] = field(default_factory=dict)
+    postings: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    folders: Set[str] = field(default_factory=set)
+    total_length: int = 0
+    built: bool = False
+    # Cached project facts, recomputed only when paths or package.json change
+    file_tree: str = ""
+    project_type: str = "unknown"
+    tech_stack: List[str] = field(default_factory=list)
+    dependencies: Optional[Dict[str, str]] = None
+    package_hash: Optional[str] = None
+    structure_dirty: bool = True
+    # Held while a request syncs and ranks (builds run in worker threads)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def sync(self, files: List[Dict[str, Any]]) -> int:
+        """
+        Bring the index in line with the request's files: index new and
+        changed files, drop files that are gone.
+
+        Returns:
+            Number of files (re)indexed
+        """
+        now = time.time()
+        seen: Set[str] = set()
+        folders: Set[str] = set()
+        reindexed = 0
+
+        for file in files:
+            path = file["path"]
+            if file.get("type") == "folder":
+                folders.add(path)
+                continue
+            seen.add(path)
+            content = file.get("content") or ""
+            existing = self.files.get(path)
+            # Unchanged content is detected by comparison (a memcmp), so only
+            # new and edited files pay for hashing
+            if existing is not None and existing.content == content:
+                continue
+            digest = content_hash(content)
+            if existing is not None and existing.content_hash == digest:
+                continue
+            if existing is not None:
+                self._remove(existing)
+            else:
+                self.structure_dirty = True
+            self._add(IndexedFile(
+                path=path,
+                content=content,
+                language=file.get("language", "plaintext"),
+                content_hash=digest,
+                terms=term_counts(content),
+                path_terms=set(term_counts(path)),
+                length=0,
+                tokens=len(content) // 4,
+                changed_at=now if self.built else 0.0
+            ))
+            reindexed += 1
+
+        for path in [p for p in self.files if p not in seen]:
+            self._remove(self.files.pop(path))
+            self.structure_dirty = True
+        if folders != self.folders:
+            self.folders = folders
+            self.structure_dirty = True
+
+        self.built = True
+        if reindexed:
+            logger.debug(f"[ContextIndex] Re-indexed {reindexed} of {len(self.files)} files")
+        return reindexed
+
+    def _add(self, entry: IndexedFile):
+        entry.length = sum(entry.terms.values())
+        self.files[entry.path] = entry
+        self.total_length += entry.length
+        for term, tf in entry.terms.items():
+            self.postings.setdefault(term, {})[entry.path] = tf
+
+    def _remove(self, entry: IndexedFile):
+        self.total_length -= entry.length
+        for term in entry.terms:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(entry.path, None)
+                if not docs:
+                    del self.postings[term]
+
+    def query_terms(self, text: str, stop_words: Iterable[str] = ()) -> Set[str]:
+        """Index terms for a prompt (words of 3+ characters, minus stop words)"""
+        stop = set(stop_words)
+        return {term for term in term_counts(text) if len(term) > 2 and term not in stop}
+
+    def bm25(self, terms: Iterable[str]) -> Dict[str, float]:
+        """BM25 score per path for the files containing at least one term"""
+        n = len(self.files)
+        if not n:
+            return {}
+        avgdl = max(self.total_length / n, 1.0)
+        scores: Dict[str, float] = {}
+        for term in terms:
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for path, tf in docs.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.files[path].length / avgdl)
+                scores[path] = scores.get(path, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def matched_terms(self, path: str, terms: Iterable[str]) -> List[str]:
+        entry = self.files[path]
+        return [t for t in terms if t in entry.terms or t in entry.path_terms]
+
+
+class ContextIndexCache:
+    """LRU of ProjectIndex by project key"""
+
+    def __init__(self, max_projects: int = MAX_CACHED_PROJECTS):
+        self.max_projects = max_projects
+        self._indexes: "OrderedDict[str, ProjectIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> ProjectIndex:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                self.stats["hits"] += 1
+                return index
+            self.stats["misses"] += 1
+            index = self._indexes[key] = ProjectIndex()
+            while len(self._indexes) > self.max_projects:
+                self._indexes.popitem(last=False)
+                self.stats["evictions"] += 1
+            return index
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._indexes.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "projects": len(self._indexes),
+            "files": sum(len(i.files) for i in self._indexes.values()),
+        }
+
+
+# Singleton instance
+context_index_cache = ContextIndexCache()
@@ -0,0 +1,3 @@
+"""
+Campus Drive Module - periodic quiz housekeeping
+"""
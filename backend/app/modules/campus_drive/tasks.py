@@ -0,0 +1,24 @@
+"""
+Campus drive Celery tasks
+"""
+import asyncio
+
+from app.core.celery_app import celery_app
+from app.core.logging_config import logger
+from app.services.quiz_session_service import quiz_sessions
+
+
+@celery_app.task
+def sweep_expired_quizzes(batch_size: int = None):
+    """
+    Periodic task: grade quizzes whose deadline passed without a submit
+
+    Takers who close the tab (or whose final submit never arrives) are
+    graded from their saved progress in batches, instead of waiting for a
+    submit that may never come.
+    """
+    loop = asyncio.get_event_loop()
+    graded = loop.run_until_complete(quiz_sessions.sweep(batch_size))
+    if graded:
+        logger.info(f"[QuizSessions] Swept {graded} expired quiz(zes)")
+    return graded
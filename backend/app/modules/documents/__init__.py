@@ -0,0 +1,3 @@
+"""
+Documents Module - background rendering of generated documents
+"""
@@ -0,0 +1,42 @@
+"""
+Document render Celery tasks
+
+Runs document assembly on a Celery worker (DOCUMENT_RENDER_BACKEND=celery)
+so python-docx/reportlab CPU time never lands on an API process. Progress
+is reported through the task state; the API relays it to subscribers.
+"""
+import asyncio
+from typing import Any, Dict
+
+from app.core.celery_app import celery_app
+from app.core.logging_config import logger
+from app.services.document_render_service import document_render_service, run_renderer
+
+
+@celery_app.task(
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def render_document_task(self, job_id: str, kind: str, payload: Dict[str, Any]):
+    """
+    Render a document and save it to S3+DB (Celery task)
+
+    Args:
+        job_id: Render job id (dedup key) for logging
+        kind: "docx", "pptx", "pdf" or "academic_pptx"
+        payload: Renderer input (see DocumentRenderService.submit)
+
+    Returns:
+        Storage result with path, plus render_ms and size_bytes
+    """
+    logger.info(f"[DocumentRender] Worker rendering {kind} job {job_id}")
+
+    def progress(done: int, total: int, label: str):
+        self.update_state(state="PROGRESS", meta={"completed": done, "total": total, "section": label})
+
+    content, render_ms = run_renderer(kind, payload, progress)
+
+    loop = asyncio.get_event_loop()
+    stored = loop.run_until_complete(document_render_service.store(kind, payload, content))
+    return {**stored, "render_ms": round(render_ms, 1), "size_bytes": len(content)}
@@ -32,7 +32,6 @@ import uuid
 import json
 import time
 import socket
-import random
 import platform
 import re
 from typing import Optional, Dict, Any, AsyncGenerator, List, Set, Tuple
@@ -40,9 +39,9 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
-from threading import Lock
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.modules.execution.port_leases import LOCAL_HOST, PortLeaseService, port_leases
 
 # Import workspace restore for fixing common project issues
 try:
@@ -150,10 +149,10 @@ class PortManager:
     Manages dynamic port allocation for multi-user Docker containers.
 
     Features:
-    - Checks if port is actually available (not just tracking)
-    - Tracks ports per project to prevent conflicts
-    - Releases ports when containers are deleted
-    - Handles concurrent port allocation safely
+    - Leases ports through the shared port lease service, so no two
+      workers or executors can hand out the same host port
+    - Checks if port is actually available (local Docker hosts)
+    - Releases ports when containers are deleted (or their lease expires)
     - Recovers from server restarts by scanning Docker
     """
 
@@ -161,10 +160,8 @@ class PortManager:
     PORT_RANGE_START = settings.CONTAINER_PORT_RANGE_START
     PORT_RANGE_END = settings.CONTAINER_PORT_RANGE_END
 
-    def __init__(self):
-        self._allocated_ports: Dict[str, Set[int]] = {}  # project_id -> set of ports
-        self._all_ports_in_use: Set[int] = set()
-        self._lock = Lock()
+    def __init__(self, leases: Optional[PortLeaseService] = None):
+        self._leases = leases or port_leases
 
     def _is_port_available(self, port: int) -> bool:
         """Check if a port is actually available on the host"""
@@ -176,12 +173,13 @@ class PortManager:
         except (socket.error, OSError):
             return False
 
-    def allocate_port(self, project_id: str) -> int:
+    def allocate_port(self, project_id: str, host: str = LOCAL_HOST) -> int:
         """
         Allocate a unique available port for a project.
 
         Args:
             project_id: Project identifier
+            host: Docker host the port is mapped on (LOCAL_HOST or its URL)
 
         Returns:
             Available port number
@@ -189,81 +187,50 @@ class PortManager:
         Raises:
             RuntimeError: If no ports are available
         """
-        with self._lock:
-            # Try up to 100 random ports to find an available one
-            attempts = 0
-            max_attempts = 100
-
-            while attempts < max_attempts:
-                # Pick a random port in range (better distribution for multi-user)
-                port = random.randint(self.PORT_RANGE_START, self.PORT_RANGE_END)
-
-                # Skip if already tracked as in use
-                if port in self._all_ports_in_use:
-                    attempts += 1
-                    continue
-
-                # Actually check if port is available
-                if self._is_port_available(port):
-                    # Track it
-                    self._all_ports_in_use.add(port)
-                    if project_id not in self._allocated_ports:
-                        self._allocated_ports[project_id] = set()
-                    self._allocated_ports[project_id].add(port)
-
-                    logger.info(f"Allocated port {port} for project {project_id}")
-                    return port
-
-                attempts += 1
-
-            # If random selection fails, try sequential
-            for port in range(self.PORT_RANGE_START, self.PORT_RANGE_END):
-                if port not in self._all_ports_in_use and self._is_port_available(port):
-                    self._all_ports_in_use.add(port)
-                    if project_id not in self._allocated_ports:
-                        self._allocated_ports[project_id] = set()
-                    self._allocated_ports[project_id].add(port)
-
-                    logger.info(f"Allocated port {port} for project {project_id} (sequential)")
-                    return port
-
-            raise RuntimeError("No available ports in range")
-
-    def release_ports(self, project_id: str):
+        # A bind test only says something about this machine
+        is_free = self._is_port_available if host == LOCAL_HOST else None
+        port = self._leases.acquire(
+            project_id, host=host, port_range=(self.PORT_RANGE_START, self.PORT_RANGE_END), is_free=is_free
+        )[0]
+        logger.info(f"Allocated port {port} for project {project_id}")
+        return port
+
+    def attach_container(self, project_id: str, container_id: str, host: str = LOCAL_HOST):
+        """Tie the project's ports to its container (freed when Docker destroys it)"""
+        self._leases.attach(project_id, container_id, host=host)
+
+    def release_ports(self, project_id: str, host: str = LOCAL_HOST):
         """
         Release all ports allocated to a project.
 
         Args:
             project_id: Project identifier
+            host: Docker host the ports are mapped on
         """
-        with self._lock:
-            if project_id in self._allocated_ports:
-                ports = self._allocated_ports[project_id]
-                self._all_ports_in_use -= ports
-                del self._allocated_ports[project_id]
-                logger.info(f"Released {len(ports)} ports for project {project_id}: {ports}")
-
-    def release_port(self, project_id: str, port: int):
+        ports = self._leases.release(project_id, host=host)
+        if ports:
+            logger.info(f"Released {len(ports)} ports for project {project_id}: {ports}")
+
+    def release_port(self, project_id: str, port: int, host: str = LOCAL_HOST):
         """Release a specific port"""
-        with self._lock:
-            if project_id in self._allocated_ports:
-                self._allocated_ports[project_id].discard(port)
-            self._all_ports_in_use.discard(port)
+        self._leases.release(project_id, host=host, ports=[port])
 
-    def get_project_ports(self, project_id: str) -> Set[int]:
+    def get_project_ports(self, project_id: str, host: str = LOCAL_HOST) -> Set[int]:
         """Get all ports allocated to a project"""
-        return self._allocated_ports.get(project_id, set()).copy()
+        return set(self._leases.ports(project_id, host=host))
 
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self, host: str = LOCAL_HOST) -> Dict[str, Any]:
         """Get port allocation statistics"""
+        leased, owners = self._leases.usage(host)
         return {
-            "total_allocated": len(self._all_ports_in_use),
-            "projects_with_ports": len(self._allocated_ports),
+            "total_allocated": leased,
+            "projects_with_ports": owners,
             "port_range": f"{self.PORT_RANGE_START}-{self.PORT_RANGE_END}",
-            "available": self.PORT_RANGE_END - self.PORT_RANGE_START - len(self._all_ports_in_use)
+            "available": self.PORT_RANGE_END - self.PORT_RANGE_START - leased,
+            "leases": self._leases.get_stats(),
         }
 
-    def recover_from_docker(self, docker_client):
+    def recover_from_docker(self, docker_client, host: str = LOCAL_HOST):
         """
         Recover port allocations from running Docker containers.
         Called on startup to handle server restarts.
@@ -273,23 +240,22 @@ class PortManager:
                 filters={"label": "bharatbuild=true"}
             )
 
+            recovered = 0
             for container in containers:
                 project_id = container.labels.get("project_id", "unknown")
                 ports = container.ports
+                host_ports = [
+                    int(binding.get("HostPort", 0))
+                    for host_bindings in (ports or {}).values() if host_bindings
+                    for binding in host_bindings
+                ]
+                host_ports = [port for port in host_ports if port > 0]
 
-                if ports:
-                    for container_port, host_bindings in ports.items():
-                        if host_bindings:
-                            for binding in host_bindings:
-                                host_port = int(binding.get("HostPort", 0))
-                                if host_port > 0:
-                                    with self._lock:
-                                        self._all_ports_in_use.add(host_port)
-                                        if project_id not in self._allocated_ports:
-                                            self._allocated_ports[project_id] = set()
-                                        self._allocated_ports[project_id].add(host_port)
+                if host_ports:
+                    recovered += len(self._leases.adopt(project_id, host_ports, host=host))
+                    self._leases.attach(project_id, container.id, host=host)
 
-            logger.info(f"Recovered {len(self._all_ports_in_use)} ports from {len(containers)} containers")
+            logger.info(f"Recovered {recovered} ports from {len(containers)} containers")
 
         except Exception as e:
             logger.warning(f"Could not recover ports from Docker: {e}")
@@ -460,12 +426,13 @@ class ContainerManager:
         # Redis state service for persistence
         self._state_service = get_container_state_service() if REDIS_STATE_AVAILABLE else None
 
-        # Port manager for multi-user port allocation
+        # Port manager for multi-user port allocation (leases are per Docker host)
         self.port_manager = get_port_manager()
+        self.port_host = self.docker_host or LOCAL_HOST
 
         # Recover ports from existing Docker containers (handles server restart)
         if self.docker:
-            self.port_manager.recover_from_docker(self.docker)
+            self.port_manager.recover_from_docker(self.docker, host=self.port_host)
             # Recover container tracking from Docker (handles server restart)
             self._recover_containers_from_docker()
 
@@ -810,7 +777,7 @@ class ContainerManager:
 
     def _allocate_port_for_project(self, project_id: str) -> int:
         """Allocate a unique available host port for a project"""
-        return self.port_manager.allocate_port(project_id)
+        return self.port_manager.allocate_port(project_id, host=self.port_host)
 
     def _recover_containers_from_docker(self):
         """
@@ -961,7 +928,7 @@ class ContainerManager:
             logger.info(f"Found existing Docker container {container_name}, removing it...")
             existing_container.remove(force=True)
             # Release any ports that were tracked for this project
-            self.port_manager.release_ports(project_id)
+            self.port_manager.release_ports(project_id, host=self.port_host)
         except docker.errors.NotFound:
             pass  # Container doesn't exist, good
         except Exception as e:
@@ -1074,6 +1041,7 @@ class ContainerManager:
 
             # Create container
             container = self.docker.containers.run(**container_kwargs)
+            self.port_manager.attach_container(project_id, container.id, host=self.port_host)
 
             # Create container record
             project_container = ProjectContainer(
@@ -1100,6 +1068,8 @@ class ContainerManager:
         except docker.errors.ImageNotFound:
             # Base image not found - try to pull or fallback to node image
             logger.warning(f"Image {image} not found, attempting to pull...")
+            # The retry allocates its own ports
+            self.port_manager.release_ports(project_id, host=self.port_host)
             try:
                 self.docker.images.pull(image)
                 return await self.create_container(project_id, user_id, project_type, config)
@@ -1114,6 +1084,7 @@ class ContainerManager:
 
         except Exception as e:
             logger.error(f"Failed to create container: {e}")
+            self.port_manager.release_ports(project_id, host=self.port_host)
             raise RuntimeError(f"Container creation failed: {e}")
 
     async def execute_command(self,
@@ -1492,7 +1463,7 @@ class ContainerManager:
                 logger.info(f"Deleted project files at {project_path}")
 
         # Release allocated ports
-        self.port_manager.release_ports(project_id)
+        self.port_manager.release_ports(project_id, host=self.port_host)
 
         # Remove from tracking
         del self.containers[project_id]
@@ -19,6 +19,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 from app.core.logging_config import logger
+from app.modules.execution.port_leases import PortLeaseService, port_leases
 from app.utils.config_templates import get_template, VITE_REACT_TEMPLATES
 from app.services.log_bus import get_log_bus
 from app.services.fix_executor import FixExecutor
@@ -5584,7 +5585,9 @@ class PortAllocator:
     Dynamic Port Allocator for Multi-User Isolation
 
     Allocates unique ports for each project to avoid conflicts when
-    multiple users run Docker containers simultaneously.
+    multiple users run Docker containers simultaneously. Ports are leased
+    through the shared port lease service, so they never collide with
+    ports handed out by another worker or by ContainerManager.
 
     Port Ranges:
     - Frontend: 3000-3999 (1000 projects)
@@ -5598,16 +5601,15 @@ class PortAllocator:
     BACKEND_PORT_START = 8000
     BACKEND_PORT_END = 8999
     OVERFLOW_PORT_START = 10000
+    OVERFLOW_PORT_END = 65000
 
-    def __init__(self):
+    def __init__(self, leases: Optional[PortLeaseService] = None):
+        self._leases = leases or port_leases
         self._allocated_ports: Dict[str, Dict[str, int]] = {}  # project_id -> {frontend: port, backend: port}
-        self._used_ports: set = set()
 
     def _is_port_available(self, port: int) -> bool:
         """Check if a port is available on the host"""
         import socket
-        if port in self._used_ports:
-            return False
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.bind(('localhost', port))
@@ -5615,16 +5617,15 @@ class PortAllocator:
         except OSError:
             return False
 
-    def _find_available_port(self, start: int, end: int) -> Optional[int]:
-        """Find an available port in range"""
-        for port in range(start, end + 1):
-            if self._is_port_available(port):
-                return port
-        # Overflow to high ports
-        for port in range(self.OVERFLOW_PORT_START, 65000):
-            if self._is_port_available(port):
-                return port
-        return None
+    def _lease_port(self, project_id: str, start: int, end: int) -> int:
+        """Lease a port in range, overflowing to high ports"""
+        try:
+            return self._leases.acquire(project_id, port_range=(start, end), is_free=self._is_port_available)[0]
+        except RuntimeError:
+            return self._leases.acquire(
+                project_id, port_range=(self.OVERFLOW_PORT_START, self.OVERFLOW_PORT_END),
+                is_free=self._is_port_available
+            )[0]
 
     def allocate_ports(self, project_id: str) -> Dict[str, int]:
         """
@@ -5635,38 +5636,27 @@ class PortAllocator:
         if project_id in self._allocated_ports:
             return self._allocated_ports[project_id]
 
-        # Find available ports
-        frontend_port = self._find_available_port(
-            self.FRONTEND_PORT_START,
-            self.FRONTEND_PORT_END
-        )
-        backend_port = self._find_available_port(
-            self.BACKEND_PORT_START,
-            self.BACKEND_PORT_END
-        )
-
-        if frontend_port and backend_port:
-            self._used_ports.add(frontend_port)
-            self._used_ports.add(backend_port)
+        try:
+            frontend_port = self._lease_port(project_id, self.FRONTEND_PORT_START, self.FRONTEND_PORT_END)
+            backend_port = self._lease_port(project_id, self.BACKEND_PORT_START, self.BACKEND_PORT_END)
+        except RuntimeError:
+            self._leases.release(project_id)
+            raise RuntimeError("No available ports - server at capacity")
 
-            allocation = {
-                "frontend": frontend_port,
-                "backend": backend_port
-            }
-            self._allocated_ports[project_id] = allocation
+        allocation = {
+            "frontend": frontend_port,
+            "backend": backend_port
+        }
+        self._allocated_ports[project_id] = allocation
 
-            logger.info(f"Allocated ports for project {project_id}: frontend={frontend_port}, backend={backend_port}")
-            return allocation
-        else:
-            raise RuntimeError("No available ports - server at capacity")
+        logger.info(f"Allocated ports for project {project_id}: frontend={frontend_port}, backend={backend_port}")
+        return allocation
 
     def release_ports(self, project_id: str):
         """Release ports when project stops"""
-        if project_id in self._allocated_ports:
-            allocation = self._allocated_ports[project_id]
-            self._used_ports.discard(allocation.get("frontend"))
-            self._used_ports.discard(allocation.get("backend"))
-            del self._allocated_ports[project_id]
+        allocation = self._allocated_ports.pop(project_id, None)
+        released = self._leases.release(project_id)
+        if allocation or released:
             logger.info(f"Released ports for project {project_id}")
 
     def get_ports(self, project_id: str) -> Optional[Dict[str, int]]:
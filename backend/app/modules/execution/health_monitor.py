@@ -6,15 +6,42 @@ This module monitors container health and automatically:
 2. Restarts failed containers
 3. Cleans up zombie containers
 4. Alerts on repeated failures
+
+Running/exited state comes from the Docker events stream (one long-lived
+connection) instead of polling every container. Active probes hit the dev
+server's mapped port over HTTP or TCP on a bounded worker pool, each with
+its own timeout, on jittered per-container schedules - so a tick does not
+grow with container count and one hung dev server cannot stall the rest.
 """
 
 import asyncio
-from typing import Dict, Optional, List, Callable, Any
+import heapq
+import random
+import threading
+from typing import Dict, Optional, List, Callable, Any, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from urllib.parse import urlparse
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.modules.execution.container_manager import ContainerStatus
+from app.modules.execution.port_leases import LOCAL_HOST, port_leases
+
+
+# Docker events that change whether a container is running
+_RUNNING_EVENTS = {"start", "restart", "unpause"}
+_EXITED_EVENTS = {"die", "oom"}
+_WATCHED_EVENTS = sorted(_RUNNING_EVENTS | _EXITED_EVENTS | {"pause", "destroy"})
+
+# Internal marker queued after (re)connecting to the events stream
+_RECONCILE = "__reconcile__"
+
+# Longest the scheduler sleeps before looking for new containers
+SCHEDULER_IDLE_SECONDS = 1.0
+
+# Cap on the events-stream reconnect backoff
+EVENTS_MAX_BACKOFF_SECONDS = 30.0
 
 
 class HealthStatus(Enum):
@@ -56,6 +83,9 @@ class ContainerHealth:
     last_restart: Optional[datetime] = None
     last_healthy: Optional[datetime] = None
     is_monitored: bool = True
+    docker_status: str = "unknown"  # Last state seen on the Docker events stream
+    ready: bool = False             # Dev server answered a probe since the last start
+    next_check_at: float = 0.0      # Event-loop time of the next scheduled probe
 
 
 class HealthMonitor:
@@ -63,7 +93,9 @@ class HealthMonitor:
     Monitors container health and manages restarts.
 
     Features:
-    - Periodic health checks (every 30s)
+    - Container state from the Docker events stream (no per-container polling)
+    - HTTP/TCP probes of the dev-server port on a bounded worker pool
+    - Per-probe timeouts and jittered schedules
     - Automatic restart on failure
     - Exponential backoff for repeated failures
     - Alerts for persistent issues
@@ -72,7 +104,11 @@ class HealthMonitor:
     def __init__(self,
                  container_manager,  # ContainerManager instance
                  check_interval: int = None,
-                 restart_policy: Optional[RestartPolicy] = None):
+                 restart_policy: Optional[RestartPolicy] = None,
+                 max_concurrent_probes: Optional[int] = None,
+                 probe_timeout: Optional[float] = None,
+                 jitter: Optional[float] = None,
+                 probe_mode: Optional[str] = None):
         """
         Initialize health monitor.
 
@@ -80,13 +116,22 @@ class HealthMonitor:
             container_manager: ContainerManager instance
             check_interval: Seconds between health checks (from settings if not provided)
             restart_policy: Restart configuration
+            max_concurrent_probes: Probe workers (from settings if not provided)
+            probe_timeout: Seconds before a probe counts as failed
+            jitter: +/- fraction of check_interval applied to each schedule
+            probe_mode: "http" or "tcp"
         """
         self.container_manager = container_manager
         self.check_interval = check_interval or settings.HEALTH_CHECK_INTERVAL
         self.restart_policy = restart_policy or RestartPolicy()
+        self.max_concurrent_probes = max_concurrent_probes or settings.HEALTH_PROBE_CONCURRENCY
+        self.probe_timeout = probe_timeout or settings.HEALTH_PROBE_TIMEOUT
+        self.jitter = settings.HEALTH_PROBE_JITTER if jitter is None else jitter
+        self.probe_mode = probe_mode or settings.HEALTH_PROBE_MODE
 
         # Track health state per container
         self.health_states: Dict[str, ContainerHealth] = {}
+        self._project_by_container: Dict[str, str] = {}
 
         # Callbacks for events
         self.on_unhealthy: Optional[Callable[[str, HealthCheck], Any]] = None
@@ -95,47 +140,262 @@ class HealthMonitor:
 
         # Running state
         self._running = False
-        self._task: Optional[asyncio.Task] = None
+        self._tasks: List[asyncio.Task] = []
+        self._schedule: List[Tuple[float, str]] = []  # heap of (due, project_id)
+        self._queued: Set[str] = set()
+        self._restarting: Set[str] = set()
+        self._probe_queue: Optional[asyncio.Queue] = None
+        self._events: Optional[asyncio.Queue] = None
+        self._events_thread: Optional[threading.Thread] = None
+        self._events_stream = None
+        self._stop_event = threading.Event()
+
+    @property
+    def _docker(self):
+        return getattr(self.container_manager, "docker", None)
 
     async def start(self):
-        """Start the health monitoring loop"""
+        """Start the event watcher, scheduler and probe workers"""
         if self._running:
             return
 
         self._running = True
-        self._task = asyncio.create_task(self._monitor_loop())
-        logger.info("Health monitor started")
+        self._stop_event.clear()
+        self._probe_queue = asyncio.Queue()
+        self._events = asyncio.Queue()
+
+        await self._reconcile()
+
+        self._tasks = [asyncio.create_task(self._schedule_loop()), asyncio.create_task(self._event_loop())]
+        self._tasks += [
+            asyncio.create_task(self._probe_worker())
+            for _ in range(self.max_concurrent_probes)
+        ]
+
+        if self._docker is not None:
+            self._events_thread = threading.Thread(
+                target=self._watch_events,
+                args=(asyncio.get_running_loop(),),
+                name="health-monitor-events",
+                daemon=True
+            )
+            self._events_thread.start()
+
+        logger.info(f"Health monitor started ({self.max_concurrent_probes} probe workers)")
 
     async def stop(self):
-        """Stop the health monitoring loop"""
+        """Stop the health monitor"""
         self._running = False
-        if self._task:
-            self._task.cancel()
+        self._stop_event.set()
+
+        stream = self._events_stream
+        if stream is not None and hasattr(stream, "close"):
             try:
-                await self._task
-            except asyncio.CancelledError:
+                stream.close()
+            except Exception:
                 pass
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._schedule = []
+        self._queued.clear()
         logger.info("Health monitor stopped")
 
-    async def _monitor_loop(self):
-        """Main monitoring loop"""
+    # ==================== Docker events ====================
+
+    def _watch_events(self, loop: asyncio.AbstractEventLoop):
+        """Blocking reader for the Docker events stream (runs in its own thread)"""
+        backoff = 1.0
+        connected_once = False
+        while not self._stop_event.is_set():
+            try:
+                stream = self._docker.events(
+                    decode=True,
+                    filters={"type": "container", "event": _WATCHED_EVENTS}
+                )
+                self._events_stream = stream
+                if connected_once:
+                    # Events may have been missed while disconnected
+                    loop.call_soon_threadsafe(self._events.put_nowait, {"Action": _RECONCILE})
+                connected_once = True
+                backoff = 1.0
+                for event in stream:
+                    if self._stop_event.is_set():
+                        break
+                    loop.call_soon_threadsafe(self._events.put_nowait, event)
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                logger.warning(f"Docker events stream error: {e}, reconnecting in {backoff:.0f}s")
+            finally:
+                self._events_stream = None
+
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, EVENTS_MAX_BACKOFF_SECONDS)
+
+    async def _event_loop(self):
+        """Apply Docker events to health state"""
         while self._running:
+            event = await self._events.get()
             try:
-                await self._check_all_containers()
+                await self._handle_event(event)
             except Exception as e:
-                logger.error(f"Health check error: {e}")
+                logger.error(f"Health event error: {e}")
 
-            await asyncio.sleep(self.check_interval)
+    async def _handle_event(self, event: Dict[str, Any]):
+        """Handle a single Docker container event"""
+        action = (event.get("Action") or event.get("status") or "").split(":")[0]
+        if action == _RECONCILE:
+            await self._reconcile()
+            return
 
-    async def _check_all_containers(self):
-        """Check health of all monitored containers"""
-        for project_id in list(self.container_manager.containers.keys()):
-            if project_id not in self.health_states:
-                self._register_container(project_id)
+        container_id = (event.get("Actor") or {}).get("ID") or event.get("id")
+        if action == "destroy" and container_id:
+            # Free the container's host ports whichever worker leased them
+            try:
+                await asyncio.to_thread(port_leases.reclaim_container, container_id)
+            except Exception as e:
+                logger.warning(f"Could not reclaim ports of container {container_id[:12]}: {e}")
+
+        project_id = self._project_by_container.get(container_id)
+        if project_id is None:
+            self._sync_registrations()
+            project_id = self._project_by_container.get(container_id)
+            if project_id is None:
+                return  # Not one of ours
+
+        if action in _RUNNING_EVENTS:
+            await self._apply_status(project_id, "running")
+        elif action in _EXITED_EVENTS:
+            await self._apply_status(project_id, "exited" if action == "die" else "oom")
+        elif action == "pause":
+            await self._apply_status(project_id, "paused")
+        elif action == "destroy":
+            await self._apply_status(project_id, "removed")
+
+    async def _reconcile(self):
+        """Resync every container's state with a single list call"""
+        self._sync_registrations()
+        if self._docker is None:
+            return
+
+        try:
+            containers = await asyncio.to_thread(self._docker.containers.list, all=True, sparse=True)
+        except Exception as e:
+            logger.warning(f"Health monitor could not list containers: {e}")
+            return
+
+        statuses = {c.id: c.status for c in containers}
+        for project_id, health_state in list(self.health_states.items()):
+            await self._apply_status(project_id, statuses.get(health_state.container_id, "removed"))
+
+    async def _apply_status(self, project_id: str, status: str):
+        """Record a container state change and react to it"""
+        health_state = self.health_states.get(project_id)
+        if not health_state:
+            return
+
+        previous = health_state.docker_status
+        health_state.docker_status = status
+        if status == previous:
+            return
+
+        if status == "running":
+            if previous != "unknown":
+                # (Re)started - give the dev server a fresh chance to come up
+                health_state.ready = False
+                self._schedule_check(project_id, self._jittered(self.check_interval))
+            return
+
+        health_state.ready = False
+        if not health_state.is_monitored or project_id in self._restarting:
+            return
+
+        if status == "removed":
+            await self._handle_missing_container(project_id, health_state)
+        elif status in ("exited", "oom", "dead") and not self._intentionally_stopped(project_id):
+            await self._handle_stopped_container(project_id, health_state, status)
+
+    # ==================== Scheduling ====================
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _schedule_check(self, project_id: str, delay: float):
+        health_state = self.health_states.get(project_id)
+        if not health_state:
+            return
+        health_state.next_check_at = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._schedule, (health_state.next_check_at, project_id))
+
+    def _sync_registrations(self):
+        """Pick up new containers and forget ones the manager no longer tracks"""
+        containers = self.container_manager.containers
+
+        for project_id in list(self.health_states):
+            container = containers.get(project_id)
+            if container is None or container.container_id != self.health_states[project_id].container_id:
+                self._project_by_container.pop(self.health_states[project_id].container_id, None)
+                del self.health_states[project_id]
 
-            health_state = self.health_states.get(project_id)
-            if health_state and health_state.is_monitored:
+        for project_id in containers.keys() - self.health_states.keys():
+            self._register_container(project_id)
+
+    async def _schedule_loop(self):
+        """Queue containers whose next probe is due"""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            try:
+                self._sync_registrations()
+                now = loop.time()
+                while self._schedule and self._schedule[0][0] <= now:
+                    due, project_id = heapq.heappop(self._schedule)
+                    health_state = self.health_states.get(project_id)
+                    if not health_state or health_state.next_check_at != due:
+                        continue  # Rescheduled or unregistered since
+                    if health_state.is_monitored and project_id not in self._queued:
+                        self._queued.add(project_id)
+                        self._probe_queue.put_nowait(project_id)
+
+                delay = self._schedule[0][0] - now if self._schedule else SCHEDULER_IDLE_SECONDS
+                await asyncio.sleep(min(max(delay, 0), SCHEDULER_IDLE_SECONDS))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Health check error: {e}")
+                await asyncio.sleep(SCHEDULER_IDLE_SECONDS)
+
+    async def _probe_worker(self):
+        """Run queued probes; the pool size bounds concurrent probes"""
+        while self._running:
+            project_id = await self._probe_queue.get()
+            try:
                 await self._check_container(project_id)
+            except Exception as e:
+                logger.error(f"Health check error for {project_id}: {e}")
+            finally:
+                self._queued.discard(project_id)
+                self._schedule_check(project_id, self._jittered(self.check_interval))
+
+    async def _check_all_containers(self):
+        """Probe every monitored container once, bounded by the probe pool size"""
+        self._sync_registrations()
+        semaphore = asyncio.Semaphore(self.max_concurrent_probes)
+
+        async def check(project_id: str):
+            async with semaphore:
+                try:
+                    await self._check_container(project_id)
+                except Exception as e:
+                    logger.error(f"Health check error for {project_id}: {e}")
+
+        await asyncio.gather(*(
+            check(project_id)
+            for project_id, health_state in list(self.health_states.items())
+            if health_state.is_monitored
+        ))
 
     def _register_container(self, project_id: str):
         """Register a container for health monitoring"""
@@ -146,14 +406,72 @@ class HealthMonitor:
                 container_id=container.container_id,
                 last_healthy=datetime.utcnow()
             )
+            self._project_by_container[container.container_id] = project_id
+            if self._running:
+                # Spread first probes across the interval
+                self._schedule_check(project_id, random.uniform(0, self.check_interval))
+
+    # ==================== Probes ====================
+
+    def _intentionally_stopped(self, project_id: str) -> bool:
+        """Paused/stopped by the container manager (idle), not crashed"""
+        container = self.container_manager.containers.get(project_id)
+        return container is not None and container.status == ContainerStatus.STOPPED
+
+    def _probe_target(self, container) -> Optional[Tuple[str, int]]:
+        """(host, port) of the dev server, or None if none has been detected"""
+        if not container.active_port:
+            return None
+        host_port = container.port_mappings.get(container.active_port)
+        if not host_port:
+            return None
+
+        host = settings.HEALTH_PROBE_HOST
+        if not host and container.docker_host:
+            host = urlparse(container.docker_host).hostname
+        return host or "127.0.0.1", host_port
+
+    async def _renew_port_lease(self, project_id: str, container):
+        """Heartbeat the running container's port lease (at most every PORT_LEASE_HEARTBEAT_SECONDS)"""
+        host = getattr(self.container_manager, "port_host", LOCAL_HOST)
+        if not container.port_mappings or not port_leases.heartbeat_due(project_id, host):
+            return
+        try:
+            await asyncio.to_thread(port_leases.heartbeat, project_id, host, container.container_id)
+        except Exception as e:
+            logger.warning(f"Could not renew port lease for {project_id}: {e}")
+
+    async def _probe(self, host: str, port: int) -> Optional[str]:
+        """Probe a dev server; returns None if healthy, else an error message"""
+        writer = None
+        try:
+            async def probe():
+                nonlocal writer
+                reader, writer = await asyncio.open_connection(host, port)
+                if self.probe_mode == "http":
+                    writer.write(b"HEAD / HTTP/1.0\r\nHost: localhost\r\n\r\n")
+                    await writer.drain()
+                    status_line = await reader.readline()
+                    if not status_line.startswith(b"HTTP/"):
+                        return f"No HTTP response on port {port}"
+                return None
+
+            return await asyncio.wait_for(probe(), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            return f"Probe timed out after {self.probe_timeout}s on port {port}"
+        except OSError as e:
+            return f"Port {port} unreachable: {e}"
+        finally:
+            if writer is not None:
+                writer.close()
 
     async def _check_container(self, project_id: str) -> HealthCheck:
         """
         Check health of a single container.
 
         Health check:
-        1. Container exists and is running
-        2. Can execute a simple command (echo test)
+        1. Container is running (from the Docker events stream)
+        2. Dev server port answers an HTTP/TCP probe within the timeout
         3. Response time is reasonable
         """
         health_state = self.health_states.get(project_id)
@@ -165,65 +483,72 @@ class HealthMonitor:
                 error_message="Container not registered"
             )
 
-        start_time = datetime.utcnow()
+        container = self.container_manager.containers.get(project_id)
+        if not container:
+            return await self._handle_missing_container(project_id, health_state)
 
-        try:
-            container = self.container_manager.containers.get(project_id)
-            if not container:
-                return await self._handle_missing_container(project_id, health_state)
+        if self._intentionally_stopped(project_id) or health_state.docker_status == "paused":
+            return health_state.last_check or HealthCheck(
+                status=HealthStatus.UNKNOWN,
+                checked_at=datetime.utcnow(),
+                response_time_ms=0,
+                error_message="Container paused"
+            )
 
-            # Get Docker container
-            docker_container = self.container_manager.docker.containers.get(
-                container.container_id
+        if health_state.docker_status not in ("running", "unknown"):
+            return await self._handle_stopped_container(
+                project_id, health_state, health_state.docker_status
             )
 
-            # Check container status
-            docker_container.reload()
-            status = docker_container.status
+        await self._renew_port_lease(project_id, container)
 
-            if status != "running":
-                return await self._handle_stopped_container(
-                    project_id, health_state, status
-                )
+        target = self._probe_target(container)
+        if target is None:
+            # No dev server detected yet - liveness comes from the events stream
+            return self._mark_healthy(project_id, health_state, 0)
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        error = await self._probe(*target)
+        response_time = (loop.time() - start_time) * 1000
+
+        if error is None:
+            health_state.ready = True
+            return self._mark_healthy(project_id, health_state, response_time)
 
-            # Execute health check command
-            exec_result = docker_container.exec_run(
-                "echo healthy",
-                timeout=10
+        if not health_state.ready:
+            # Dev server has not come up since the last start - not a failure
+            health_check = HealthCheck(
+                status=HealthStatus.STARTING,
+                checked_at=datetime.utcnow(),
+                response_time_ms=response_time,
+                error_message=error
             )
+            health_state.last_check = health_check
+            return health_check
 
-            response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+        return await self._handle_unhealthy(project_id, health_state, error)
 
-            if exec_result.exit_code == 0:
-                health_check = HealthCheck(
-                    status=HealthStatus.HEALTHY,
-                    checked_at=datetime.utcnow(),
-                    response_time_ms=response_time,
-                    consecutive_failures=0
-                )
-                health_state.last_check = health_check
-                health_state.last_healthy = datetime.utcnow()
-
-                # Reset restart count if healthy for a while
-                if health_state.restart_count > 0:
-                    if health_state.last_restart:
-                        time_since_restart = (datetime.utcnow() - health_state.last_restart).total_seconds()
-                        if time_since_restart > self.restart_policy.reset_after_seconds:
-                            health_state.restart_count = 0
-                            logger.info(f"Reset restart count for {project_id}")
-
-                return health_check
-            else:
-                return await self._handle_unhealthy(
-                    project_id, health_state,
-                    f"Health check failed: exit code {exec_result.exit_code}"
-                )
+    def _mark_healthy(self, project_id: str, health_state: ContainerHealth, response_time: float) -> HealthCheck:
+        """Record a passing check"""
+        health_check = HealthCheck(
+            status=HealthStatus.HEALTHY,
+            checked_at=datetime.utcnow(),
+            response_time_ms=response_time,
+            consecutive_failures=0
+        )
+        health_state.last_check = health_check
+        health_state.last_healthy = datetime.utcnow()
 
-        except Exception as e:
-            response_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-            return await self._handle_unhealthy(
-                project_id, health_state, str(e)
-            )
+        # Reset restart count if healthy for a while
+        if health_state.restart_count > 0:
+            if health_state.last_restart:
+                time_since_restart = (datetime.utcnow() - health_state.last_restart).total_seconds()
+                if time_since_restart > self.restart_policy.reset_after_seconds:
+                    health_state.restart_count = 0
+                    logger.info(f"Reset restart count for {project_id}")
+
+        return health_check
 
     async def _handle_missing_container(self,
                                         project_id: str,
@@ -321,19 +646,20 @@ class HealthMonitor:
 
         logger.info(f"Attempting restart of {project_id} (attempt {health_state.restart_count + 1})")
 
-        try:
-            container = self.container_manager.containers.get(project_id)
-            if not container:
-                return
+        container = self.container_manager.containers.get(project_id)
+        if not container or project_id in self._restarting:
+            return
 
-            # Get Docker container and restart
-            docker_container = self.container_manager.docker.containers.get(
-                container.container_id
+        # Mark first: the restart's own die/start events must not re-trigger it
+        self._restarting.add(project_id)
+        health_state.restart_count += 1
+        health_state.last_restart = datetime.utcnow()
+        try:
+            # Docker SDK calls block - keep them off the event loop
+            docker_container = await asyncio.to_thread(
+                self.container_manager.docker.containers.get, container.container_id
             )
-            docker_container.restart(timeout=30)
-
-            health_state.restart_count += 1
-            health_state.last_restart = datetime.utcnow()
+            await asyncio.to_thread(docker_container.restart, timeout=30)
 
             if self.on_restart:
                 await self._safe_callback(
@@ -344,8 +670,8 @@ class HealthMonitor:
 
         except Exception as e:
             logger.error(f"Failed to restart container {project_id}: {e}")
-            health_state.restart_count += 1
-            health_state.last_restart = datetime.utcnow()
+        finally:
+            self._restarting.discard(project_id)
 
     async def _safe_callback(self, callback: Callable, *args):
         """Execute callback safely"""
@@ -0,0 +1,409 @@
+"""
+Port Leases - one host-port allocator shared by every executor and worker
+
+Host ports for containers used to be picked by each executor on its own:
+ContainerManager and DockerComposeExecutor tracked them in process-local
+sets, and the sandbox executor probed the remote host (`ss`, `docker ps`)
+on every start. Two workers starting containers at the same time could
+still hand out the same port.
+
+Here every port on a host is a lease key claimed with SET NX, so exactly
+one owner (a project) can hold it, whichever worker asks. An owner's ports
+are grouped in one lease that can be tied to container IDs:
+
+- leases expire after PORT_LEASE_TTL_SECONDS unless renewed (heartbeat),
+  so a worker that dies without releasing cannot leak ports forever
+- release() frees an owner's ports on stop; reclaim_container() does the
+  same from Docker `destroy` events (health monitor)
+- allocators start at a shared per-host cursor, so concurrent requests
+  spread over the range instead of racing for its first free port
+
+Redis is optional: without it leases are kept in this process (correct
+for a single worker only, like the allocators this replaces).
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+KEY_PREFIX = "portlease:"
+
+# Host key for containers on the Docker daemon this process talks to by default
+LOCAL_HOST = "local"
+
+# Most candidates claimed per round trip while searching a range
+CLAIM_BATCH = 32
+
+
+# ==================== Stores ====================
+
+class _LocalStore:
+    """In-process stand-in for the few Redis operations leases need"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[float, str]] = {}
+        self._sets: Dict[str, Tuple[float, Set[str]]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def _live(self, store: dict, key: str):
+        entry = store.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del store[key]
+            return None
+        return entry[1]
+
+    def claim(self, keys: List[str], value: str, ttl: int) -> List[bool]:
+        with self._lock:
+            claimed = []
+            for key in keys:
+                held = self._live(self._values, key)
+                claimed.append(held is None)
+                if held is None:
+                    self._values[key] = (time.time() + ttl, value)
+            return claimed
+
+    def release(self, keys: List[str], value: str) -> List[str]:
+        with self._lock:
+            released = [key for key in keys if self._live(self._values, key) == value]
+            for key in released:
+                del self._values[key]
+            return released
+
+    def holders(self, keys: List[str]) -> List[Optional[str]]:
+        with self._lock:
+            return [self._live(self._values, key) for key in keys]
+
+    def expire(self, keys: List[str], ttl: int):
+        with self._lock:
+            for store in (self._values, self._sets):
+                for key in keys:
+                    value = self._live(store, key)
+                    if value is not None:
+                        store[key] = (time.time() + ttl, value)
+
+    def add_members(self, key: str, members: Iterable[str], ttl: int):
+        with self._lock:
+            current = self._live(self._sets, key) or set()
+            current.update(members)
+            self._sets[key] = (time.time() + ttl, current)
+
+    def remove_members(self, key: str, members: Iterable[str]):
+        with self._lock:
+            current = self._live(self._sets, key)
+            if current is not None:
+                current.difference_update(members)
+                if not current:
+                    del self._sets[key]
+
+    def members(self, key: str) -> Set[str]:
+        with self._lock:
+            return set(self._live(self._sets, key) or ())
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(self._values, key)
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._values[key] = (time.time() + ttl, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+            self._sets.pop(key, None)
+
+    def incr(self, key: str, amount: int) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            return self._counters[key]
+
+    def count(self, prefix: str) -> int:
+        with self._lock:
+            return sum(
+                1 for store in (self._values, self._sets) for key in list(store)
+                if key.startswith(prefix) and self._live(store, key) is not None
+            )
+
+
+class _RedisStore:
+    """Lease operations on a (synchronous) Redis client"""
+
+    def __init__(self, client):
+        self._redis = client
+
+    def claim(self, keys: List[str], value: str, ttl: int) -> List[bool]:
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, value, nx=True, ex=ttl)
+        return [bool(claimed) for claimed in pipe.execute()]
+
+    def release(self, keys: List[str], value: str) -> List[str]:
+        """Delete the keys still held by value (WATCH, so a key re-leased meanwhile is kept)"""
+        if not keys:
+            return []
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(*keys)
+                    held = [key for key, holder in zip(keys, pipe.mget(keys)) if holder == value]
+                    pipe.multi()
+                    if held:
+                        pipe.delete(*held)
+                    pipe.execute()
+                    return held
+                except redis.WatchError:
+                    continue
+
+    def holders(self, keys: List[str]) -> List[Optional[str]]:
+        return self._redis.mget(keys) if keys else []
+
+    def expire(self, keys: List[str], ttl: int):
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    def add_members(self, key: str, members: Iterable[str], ttl: int):
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.sadd(key, *members)
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+    def remove_members(self, key: str, members: Iterable[str]):
+        members = list(members)
+        if members:
+            self._redis.srem(key, *members)
+
+    def members(self, key: str) -> Set[str]:
+        return set(self._redis.smembers(key))
+
+    def get(self, key: str) -> Optional[str]:
+        return self._redis.get(key)
+
+    def set(self, key: str, value: str, ttl: int):
+        self._redis.set(key, value, ex=ttl)
+
+    def delete(self, key: str):
+        self._redis.delete(key)
+
+    def incr(self, key: str, amount: int) -> int:
+        return self._redis.incrby(key, amount)
+
+    def count(self, prefix: str) -> int:
+        return sum(1 for _ in self._redis.scan_iter(match=f"{prefix}*", count=1000))
+
+
+# ==================== Service ====================
+
+class PortLeaseService:
+    """
+    Host-port leases per (host, owner), safe across threads, workers and
+    executors. Owners are project IDs; hosts are LOCAL_HOST or the sandbox
+    Docker host URL.
+    """
+
+    def __init__(self, store=None):
+        self._store = store
+        self._init_lock = threading.Lock()
+        self._last_heartbeat: Dict[Tuple[str, str], float] = {}
+        self.stats = {
+            "allocated": 0,
+            "released": 0,
+            "reclaimed": 0,
+            "claim_conflicts": 0,
+            "exhausted": 0,
+        }
+
+    def _get_store(self):
+        """Redis when reachable, else in-process (decided on first use)"""
+        if self._store is None:
+            with self._init_lock:
+                if self._store is None:
+                    self._store = self._connect()
+        return self._store
+
+    def _connect(self):
+        if redis is None or not settings.REDIS_URL:
+            logger.warning("[PortLeases] redis not available, port leases are kept per worker")
+            return _LocalStore()
+        try:
+            client = redis.Redis.from_url(
+                settings.REDIS_URL, db=settings.REDIS_CACHE_DB, decode_responses=True,
+                socket_timeout=5, socket_connect_timeout=5
+            )
+            client.ping()
+        except Exception as e:
+            logger.warning(f"[PortLeases] Redis unavailable ({e}), port leases are kept per worker")
+            return _LocalStore()
+        logger.info("[PortLeases] Using Redis for port leases")
+        return _RedisStore(client)
+
+    @staticmethod
+    def _port_key(host: str, port: int) -> str:
+        return f"{KEY_PREFIX}{host}:port:{port}"
+
+    @staticmethod
+    def _owner_key(host: str, owner: str) -> str:
+        return f"{KEY_PREFIX}{host}:owner:{owner}"
+
+    @staticmethod
+    def _container_key(container_id: str) -> str:
+        return f"{KEY_PREFIX}container:{container_id}"
+
+    # ========== Allocation ==========
+
+    def acquire(self, owner: str, count: int = 1, host: str = LOCAL_HOST,
+                port_range: Tuple[int, int] = None, exclude: Iterable[int] = (),
+                is_free: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """
+        Lease `count` more ports in port_range (inclusive) to owner.
+
+        Ports in exclude, or rejected by is_free (an optional local check,
+        e.g. a bind test), are skipped. All or nothing: raises RuntimeError
+        if the range can't supply `count` ports.
+        """
+        owner, store = str(owner), self._get_store()
+        start, end = port_range or (settings.CONTAINER_PORT_RANGE_START, settings.CONTAINER_PORT_RANGE_END)
+        size = end - start + 1
+        excluded = set(exclude)
+        ttl = settings.PORT_LEASE_TTL_SECONDS
+
+        # Each request starts where the previous one (on any worker) stopped
+        offset = (store.incr(f"{KEY_PREFIX}{host}:cursor", count) - count) % size
+        acquired: List[int] = []
+        scanned = 0
+        while len(acquired) < count and scanned < size:
+            # Claim only what is still missing, so nothing is over-claimed and handed back
+            wanted = min(CLAIM_BATCH, count - len(acquired))
+            candidates = []
+            while len(candidates) < wanted and scanned < size:
+                port = start + (offset + scanned) % size
+                scanned += 1
+                if port not in excluded and (is_free is None or is_free(port)):
+                    candidates.append(port)
+            if not candidates:
+                continue
+            claimed = store.claim([self._port_key(host, port) for port in candidates], owner, ttl)
+            for port, won in zip(candidates, claimed):
+                if won:
+                    acquired.append(port)
+                else:
+                    self.stats["claim_conflicts"] += 1
+
+        if len(acquired) < count:
+            store.release([self._port_key(host, port) for port in acquired], owner)
+            self.stats["exhausted"] += 1
+            raise RuntimeError(f"No available ports in range {start}-{end} on {host}")
+
+        store.add_members(self._owner_key(host, owner), [str(port) for port in acquired], ttl)
+        self.stats["allocated"] += len(acquired)
+        logger.info(f"[PortLeases] Leased {acquired} on {host} to {owner}")
+        return acquired
+
+    def adopt(self, owner: str, ports: Iterable[int], host: str = LOCAL_HOST) -> List[int]:
+        """Lease specific ports (already bound by a running container); returns those now held by owner"""
+        owner, store = str(owner), self._get_store()
+        ports = list(ports)
+        keys = [self._port_key(host, port) for port in ports]
+        store.claim(keys, owner, settings.PORT_LEASE_TTL_SECONDS)
+        held = [port for port, holder in zip(ports, store.holders(keys)) if holder == owner]
+        for port in set(ports) - set(held):
+            logger.warning(f"[PortLeases] Port {port} on {host} is leased to another owner, not adopting it for {owner}")
+        if held:
+            store.add_members(self._owner_key(host, owner), [str(port) for port in held], settings.PORT_LEASE_TTL_SECONDS)
+        return held
+
+    def ports(self, owner: str, host: str = LOCAL_HOST) -> List[int]:
+        """Ports currently leased to owner"""
+        return sorted(int(port) for port in self._get_store().members(self._owner_key(host, str(owner))))
+
+    # ========== Lifetime ==========
+
+    def attach(self, owner: str, container_id: str, host: str = LOCAL_HOST):
+        """Tie owner's lease to a container, so its destroy event frees the ports"""
+        self._get_store().set(
+            self._container_key(container_id), json.dumps({"host": host, "owner": str(owner)}),
+            settings.PORT_LEASE_TTL_SECONDS
+        )
+
+    def heartbeat_due(self, owner: str, host: str = LOCAL_HOST) -> bool:
+        """Whether heartbeat() would renew now (no I/O, safe on the event loop)"""
+        last = self._last_heartbeat.get((host, str(owner)))
+        return last is None or time.monotonic() - last >= settings.PORT_LEASE_HEARTBEAT_SECONDS
+
+    def heartbeat(self, owner: str, host: str = LOCAL_HOST, container_id: Optional[str] = None) -> bool:
+        """
+        Renew owner's lease. Calls within PORT_LEASE_HEARTBEAT_SECONDS of
+        the last renewal are skipped, so it is cheap to call per health probe.
+        """
+        owner = str(owner)
+        if not self.heartbeat_due(owner, host):
+            return False
+        self._last_heartbeat[(host, owner)] = time.monotonic()
+
+        store = self._get_store()
+        keys = [self._owner_key(host, owner)]
+        keys.extend(self._port_key(host, int(port)) for port in store.members(keys[0]))
+        if container_id:
+            keys.append(self._container_key(container_id))
+        store.expire(keys, settings.PORT_LEASE_TTL_SECONDS)
+        return True
+
+    def release(self, owner: str, host: str = LOCAL_HOST, ports: Optional[Iterable[int]] = None) -> List[int]:
+        """Free owner's ports (all of them, or just `ports`); ports re-leased to someone else are untouched"""
+        owner, store = str(owner), self._get_store()
+        owner_key = self._owner_key(host, owner)
+        if ports is None:
+            ports = sorted(int(port) for port in store.members(owner_key))
+        ports = list(ports)
+        if not ports:
+            return []
+        released_keys = set(store.release([self._port_key(host, port) for port in ports], owner))
+        store.remove_members(owner_key, [str(port) for port in ports])
+        released = [port for port in ports if self._port_key(host, port) in released_keys]
+        self._last_heartbeat.pop((host, owner), None)
+        self.stats["released"] += len(released)
+        logger.info(f"[PortLeases] Released {released} on {host} from {owner}")
+        return released
+
+    def reclaim_container(self, container_id: str) -> List[int]:
+        """Free the lease tied to a container that no longer exists"""
+        store = self._get_store()
+        data = store.get(self._container_key(container_id))
+        if data is None:
+            return []
+        store.delete(self._container_key(container_id))
+        try:
+            lease = json.loads(data)
+        except ValueError:
+            return []
+        released = self.release(lease["owner"], lease["host"])
+        self.stats["reclaimed"] += len(released)
+        return released
+
+    def usage(self, host: str = LOCAL_HOST) -> Tuple[int, int]:
+        """(leased ports, owners holding them) on a host - scans keys, meant for admin views"""
+        store = self._get_store()
+        return store.count(f"{KEY_PREFIX}{host}:port:"), store.count(f"{KEY_PREFIX}{host}:owner:")
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "redis" if isinstance(self._store, _RedisStore) else "local",
+            **self.stats,
+        }
+
+
+# Singleton instance
+port_leases = PortLeaseService()
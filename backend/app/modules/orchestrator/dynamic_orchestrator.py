@@ -883,13 +883,11 @@ class ExecutionContext:
             "file_path": file_path
         })
 
-        # IMMEDIATE SAVE: Save token usage right away (don't wait until end)
-        # This ensures tokens are tracked even if workflow fails later
-        asyncio.create_task(self._save_token_immediately(
-            input_tokens, output_tokens, model, agent_type, operation, file_path
-        ))
+        # Buffered for the batched usage writer (log row, rollups, project and
+        # user totals), so usage is tracked even if the workflow fails later
+        self._record_usage(input_tokens, output_tokens, model, agent_type, operation, file_path)
 
-    async def _save_token_immediately(
+    def _record_usage(
         self,
         input_tokens: int,
         output_tokens: int,
@@ -898,12 +896,12 @@ class ExecutionContext:
         operation: str,
         file_path: str
     ):
-        """Save token usage to database immediately (fire-and-forget)"""
+        """Queue one usage record for usage_ingestion_service (non-blocking)"""
         if not self.user_id:
             return  # Can't save without user_id
 
         try:
-            from app.services.token_tracker import token_tracker
+            from app.services.usage_ingestion_service import usage_ingestion_service
             from app.models.usage import AgentType as AgentTypeEnum, OperationType
 
             # Map string to enum
@@ -917,7 +915,7 @@ class ExecutionContext:
             except ValueError:
                 op_enum = OperationType.OTHER
 
-            await token_tracker.log_transaction_simple(
+            usage_ingestion_service.record(
                 user_id=str(self.user_id),
                 project_id=str(self.project_id),
                 agent_type=agent_enum,
@@ -928,28 +926,8 @@ class ExecutionContext:
                 file_path=file_path
             )
 
-            # Also update project total_tokens incrementally
-            await self._update_project_tokens()
-
-        except Exception as e:
-            logger.warning(f"[TokenTracker] Immediate save failed (non-critical): {e}")
-
-    async def _update_project_tokens(self):
-        """Update project's total_tokens field incrementally"""
-        try:
-            from app.core.database import async_session
-            from sqlalchemy import update
-
-            async with async_session() as db:
-                await db.execute(
-                    update(Project)
-                    .where(Project.id == self.project_id)
-                    .values(total_tokens=self.total_tokens)
-                )
-                await db.commit()
         except Exception as e:
-            # Non-critical, just log
-            logger.debug(f"[TokenTracker] Project token update skipped: {e}")
+            logger.warning(f"[TokenTracker] Usage record failed (non-critical): {e}")
 
     @property
     def total_tokens(self) -> int:
@@ -3177,62 +3155,14 @@ class DynamicOrchestrator:
                 step=len(workflow)
             )
 
-            # Save token usage to database
+            # Persist buffered token usage (log rows, project/user totals) before completing
             if user_id and context.total_tokens > 0:
                 try:
-                    from app.modules.auth.usage_limits import deduct_tokens
-                    from app.models.user import User
-                    from app.core.database import async_session
-                    from sqlalchemy import select
-
-                    async with async_session() as token_db:
-                        # Get user
-                        user_result = await token_db.execute(
-                            select(User).where(User.id == user_id)
-                        )
-                        user = user_result.scalar_one_or_none()
-
-                        if user:
-                            # Deduct tokens for each model used
-                            for model_name, usage in context.token_usage_by_model.items():
-                                model_total = usage["input"] + usage["output"]
-                                await deduct_tokens(user, token_db, model_total, model_name)
-                                logger.info(f"[TokenTracker] Saved {model_total} tokens for model {model_name}")
-
-                            logger.info(f"[TokenTracker] Total tokens saved: {context.total_tokens} (input: {context.total_input_tokens}, output: {context.total_output_tokens})")
-
-                            # Save detailed token transactions
-                            if context.pending_token_transactions:
-                                from app.services.token_tracker import token_tracker
-                                from app.models.usage import AgentType, OperationType
-
-                                for tx in context.pending_token_transactions:
-                                    try:
-                                        # Map string agent_type to enum
-                                        agent_type_str = tx.get("agent_type", "other")
-                                        agent_type = AgentType(agent_type_str) if agent_type_str in [e.value for e in AgentType] else AgentType.OTHER
-
-                                        # Map string operation to enum
-                                        operation_str = tx.get("operation", "other")
-                                        operation = OperationType(operation_str) if operation_str in [e.value for e in OperationType] else OperationType.OTHER
-
-                                        await token_tracker.log_transaction(
-                                            db=token_db,
-                                            user_id=str(user_id),
-                                            project_id=str(project_id),
-                                            agent_type=agent_type,
-                                            operation=operation,
-                                            model=tx.get("model", "haiku"),
-                                            input_tokens=tx.get("input_tokens", 0),
-                                            output_tokens=tx.get("output_tokens", 0),
-                                            file_path=tx.get("file_path"),
-                                            metadata=tx.get("metadata")
-                                        )
-                                    except Exception as tx_err:
-                                        logger.warning(f"[TokenTracker] Failed to save transaction: {tx_err}")
-
-                                logger.info(f"[TokenTracker] Saved {len(context.pending_token_transactions)} detailed token transactions")
-
+                    from app.services.usage_ingestion_service import usage_ingestion_service
+                    # One request per model per run in token_usage.total_requests
+                    usage_ingestion_service.record_run(str(user_id), context.token_usage_by_model)
+                    await usage_ingestion_service.flush()
+                    logger.info(f"[TokenTracker] Total tokens saved: {context.total_tokens} (input: {context.total_input_tokens}, output: {context.total_output_tokens})")
                 except Exception as token_err:
                     logger.warning(f"[TokenTracker] Failed to save token usage: {token_err}")
 
@@ -147,10 +147,12 @@ class AdminProjectResponse(BaseModel):
 class AdminProjectsResponse(BaseModel):
     """Paginated projects response"""
     items: List[AdminProjectResponse]
-    total: int
+    total: Optional[int] = None  # Omitted on cursor pages unless include_total=true
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    total_estimated: bool = False
 
 
 class StorageStats(BaseModel):
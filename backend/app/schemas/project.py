@@ -46,6 +46,7 @@ class ProjectResponse(BaseModel):
 
 class ProjectListResponse(BaseModel):
     projects: List[ProjectResponse]
-    total: int
+    total: Optional[int] = None  # Omitted on cursor pages unless include_total=true
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
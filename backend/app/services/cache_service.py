@@ -1,16 +1,156 @@
 """
 Redis Cache Service - High-performance caching layer
 Optimized for 100K+ users with intelligent TTL and LRU eviction
+
+Two tiers:
+- an in-process LRU per worker, bounded by entry count and encoded bytes,
+  whose copies live at most CACHE_LOCAL_TTL_SECONDS, so hot keys (project
+  metadata, file lists) skip the network
+- Redis, shared by all workers
+
+Writes and deletes are announced on CACHE_INVALIDATION_CHANNEL in the same
+round trip, and other workers drop their in-process copies when the message
+arrives; without the subscription (before start(), Redis restarts) copies
+fall back to expiring on the local TTL. In-process copies are only kept for
+values Redis accepted, so a worker never serves something the others could
+not be told about.
+
+Values are stored encoded (JSON by default, msgpack if configured, never
+pickle), so a caller mutating a returned value can't change the cache.
 """
 
+import asyncio
+import fnmatch
 import json
-import pickle
-from typing import Optional, Any, List
-from datetime import timedelta
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 import redis.asyncio as redis
 
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.pubsub import listen
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# ==================== Serializers ====================
+
+class JSONSerializer:
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackSerializer:
+    """Smaller and faster than JSON for the same (JSON-compatible) values"""
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class TextSerializer:
+    """Plain UTF-8 strings (file content, ids)"""
+    name = "text"
+
+    def dumps(self, value: str) -> bytes:
+        return value.encode("utf-8")
+
+    def loads(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+
+def get_serializer(name: str):
+    """Serializer by name; msgpack falls back to JSON when the package is missing"""
+    if name == "msgpack":
+        if msgpack is not None:
+            return MsgpackSerializer()
+        logger.warning("[Cache] msgpack is not installed, using JSON")
+        return JSONSerializer()
+    if name == "json":
+        return JSONSerializer()
+    if name == "text":
+        return TextSerializer()
+    raise ValueError(f"Unknown cache serializer: {name}")
+
+
+# ==================== In-process tier ====================
+
+class LocalCache:
+    """LRU of encoded values with per-entry expiry, bounded by entries and total bytes"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, data: bytes, ttl: float):
+        self._drop(key)
+        if ttl <= 0 or len(data) > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self.bytes += len(data)
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def delete(self, keys: Iterable[str]):
+        for key in keys:
+            self._drop(key)
+
+    def delete_matching(self, pattern: str):
+        """Drop keys matching a Redis-style glob pattern"""
+        for key in [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]:
+            self._drop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry[1])
+
+
+def _latency_summary(samples: Iterable[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    return {
+        "samples": len(ordered),
+        "p50": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p99": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
 
 
 class CacheService:
@@ -22,6 +162,7 @@ class CacheService:
     - Active project files: 15 minutes TTL (LRU eviction)
     - File content: 5 minutes TTL (for hot files)
     - User sessions: 30 minutes TTL
+    - Every key is also kept in-process for up to CACHE_LOCAL_TTL_SECONDS
     """
 
     # TTL constants loaded from settings (in seconds)
@@ -47,9 +188,31 @@ class CacheService:
     PREFIX_CONTENT = "content:"
     PREFIX_USER = "user:"
 
+    LATENCY_SAMPLES = 1024  # Redis round trips kept per operation for the latency summary
+
     def __init__(self):
         self._pool = None
         self._redis = None
+        self._local = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_MAX_BYTES)
+        self.serializer = get_serializer(settings.CACHE_SERIALIZER)
+        self.text = TextSerializer()
+        # Bumped on every invalidation; a read that raced one is not kept in-process
+        self._generation = 0
+        self._loads: Dict[str, asyncio.Future] = {}
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._latency: Dict[str, deque] = {}
+        self.stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "loads": 0,
+            "coalesced_loads": 0,
+            "invalidations": 0,
+            "remote_invalidations": 0,
+            "errors": 0,
+        }
 
     async def _get_redis(self) -> redis.Redis:
         """Lazy initialization of Redis connection pool"""
@@ -64,8 +227,31 @@ class CacheService:
             logger.info("Redis cache connection established")
         return self._redis
 
+    async def start(self):
+        """Subscribe to invalidations from other workers"""
+        if self._listener is not None:
+            return
+        try:
+            r = await self._get_redis()
+            pubsub = r.pubsub()
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+        except Exception as e:
+            logger.warning(
+                f"[Cache] Invalidation subscription unavailable ({e}), "
+                f"in-process copies expire after {settings.CACHE_LOCAL_TTL_SECONDS}s"
+            )
+            return
+        self._listener = asyncio.create_task(
+            listen(pubsub, settings.CACHE_INVALIDATION_CHANNEL, self._handle_invalidation, "[Cache]")
+        )
+        logger.info("[Cache] Subscribed to cache invalidations")
+
     async def close(self):
         """Close Redis connection"""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
         if self._redis:
             await self._redis.close()
             self._redis = None
@@ -73,190 +259,345 @@ class CacheService:
             await self._pool.disconnect()
             self._pool = None
 
-    # ========== Project Metadata Cache ==========
+    # ========== Generic Operations ==========
 
-    async def get_project(self, project_id: str) -> Optional[dict]:
-        """Get cached project metadata"""
+    async def get(self, key: str, serializer=None) -> Optional[Any]:
+        """Cached value (in-process first, then Redis), None on a miss or error"""
+        serializer = serializer or self.serializer
+        data = self._local.get(key)
+        if data is not None:
+            self.stats["local_hits"] += 1
+            return self._decode(key, data, serializer)
+
+        generation = self._generation
         try:
             r = await self._get_redis()
-            key = f"{self.PREFIX_PROJECT}{project_id}"
-            data = await r.get(key)
-            if data:
-                logger.debug(f"Cache HIT: project {project_id}")
-                return json.loads(data)
-            logger.debug(f"Cache MISS: project {project_id}")
-            return None
+            data = await self._timed("get", r.get(key))
         except Exception as e:
-            logger.warning(f"Cache error (get_project): {e}")
+            self._error("get", e)
             return None
-
-    async def set_project(self, project_id: str, data: dict) -> bool:
-        """Cache project metadata"""
+        if data is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["redis_hits"] += 1
+        value = self._decode(key, data, serializer)
+        if value is not None and generation == self._generation:
+            self._local.set(key, data, settings.CACHE_LOCAL_TTL_SECONDS)
+        return value
+
+    async def get_many(self, keys: Iterable[str], serializer=None) -> Dict[str, Any]:
+        """Values of the cached keys; the ones not held in-process come from one MGET"""
+        serializer = serializer or self.serializer
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            data = self._local.get(key)
+            if data is None:
+                missing.append(key)
+                continue
+            self.stats["local_hits"] += 1
+            value = self._decode(key, data, serializer)
+            if value is not None:
+                found[key] = value
+        if not missing:
+            return found
+
+        generation = self._generation
         try:
             r = await self._get_redis()
-            key = f"{self.PREFIX_PROJECT}{project_id}"
-            await r.setex(key, self.TTL_PROJECT_META, json.dumps(data))
-            logger.debug(f"Cached project: {project_id}")
+            values = await self._timed("get", r.mget(missing))
+        except Exception as e:
+            self._error("get_many", e)
+            return found
+        for key, data in zip(missing, values):
+            if data is None:
+                self.stats["misses"] += 1
+                continue
+            self.stats["redis_hits"] += 1
+            value = self._decode(key, data, serializer)
+            if value is None:
+                continue
+            found[key] = value
+            if generation == self._generation:
+                self._local.set(key, data, settings.CACHE_LOCAL_TTL_SECONDS)
+        return found
+
+    async def set(self, key: str, value: Any, ttl: int, serializer=None) -> bool:
+        """Cache a value for ttl seconds"""
+        return await self.set_many({key: value}, ttl, serializer)
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: int, serializer=None) -> bool:
+        """Cache several values in one pipelined round trip"""
+        serializer = serializer or self.serializer
+        return await self._store([(key, serializer.dumps(value), ttl) for key, value in mapping.items()])
+
+    async def delete(self, *keys: str) -> bool:
+        """Remove keys here, in Redis and (via pub/sub) in other workers"""
+        if not keys:
             return True
+        self._invalidate_local(keys)
+        try:
+            r = await self._get_redis()
+            async with r.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, self._message(keys=keys))
+                await self._timed("delete", pipe.execute())
         except Exception as e:
-            logger.warning(f"Cache error (set_project): {e}")
+            self._error("delete", e)
             return False
+        self.stats["invalidations"] += len(keys)
+        return True
+
+    async def delete_matching(self, pattern: str) -> int:
+        """Remove every key matching a glob pattern; returns the number of Redis keys deleted"""
+        self._invalidate_local(patterns=[pattern])
+        r = await self._get_redis()
+        keys = [key async for key in r.scan_iter(match=pattern, count=100)]
+        async with r.pipeline(transaction=False) as pipe:
+            if keys:
+                pipe.delete(*keys)
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, self._message(patterns=[pattern]))
+            await self._timed("delete", pipe.execute())
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int,
+                         serializer=None) -> Optional[Any]:
+        """
+        Cached value, or loader()'s result cached for ttl seconds (None is
+        not cached). Concurrent misses for a key in this worker share one
+        loader call instead of all recomputing it.
+        """
+        value = await self.get(key, serializer)
+        if value is not None:
+            return value
 
-    async def invalidate_project(self, project_id: str) -> bool:
-        """Invalidate project cache"""
+        pending = self._loads.get(key)
+        if pending is not None:
+            self.stats["coalesced_loads"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loads[key] = future
         try:
-            r = await self._get_redis()
-            keys = [
-                f"{self.PREFIX_PROJECT}{project_id}",
-                f"{self.PREFIX_FILES}{project_id}"
-            ]
-            await r.delete(*keys)
-            logger.debug(f"Invalidated cache for project: {project_id}")
+            value = await loader()
+            self.stats["loads"] += 1
+            if value is not None:
+                await self.set(key, value, ttl, serializer)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: with no waiters, asyncio would log it
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._loads.pop(key, None)
+
+    async def _store(self, entries: List[Tuple[str, bytes, int]]) -> bool:
+        """Write encoded entries and announce them to other workers, in one round trip"""
+        if not entries:
             return True
+        keys = [key for key, _, _ in entries]
+        self._invalidate_local(keys)
+        try:
+            r = await self._get_redis()
+            async with r.pipeline(transaction=False) as pipe:
+                for key, data, ttl in entries:
+                    pipe.setex(key, ttl, data)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, self._message(keys=keys))
+                await self._timed("set", pipe.execute())
         except Exception as e:
-            logger.warning(f"Cache error (invalidate_project): {e}")
+            self._error("set", e)
             return False
+        for key, data, ttl in entries:
+            self._local.set(key, data, min(ttl, settings.CACHE_LOCAL_TTL_SECONDS))
+        self.stats["sets"] += len(entries)
+        return True
+
+    def _decode(self, key: str, data: bytes, serializer) -> Optional[Any]:
+        try:
+            return serializer.loads(data)
+        except Exception as e:
+            # Written by another serializer (CACHE_SERIALIZER changed) or corrupt: a miss
+            logger.warning(f"Cache error (decode {key}): {e}")
+            self._local.delete([key])
+            self.stats["errors"] += 1
+            return None
+
+    async def _timed(self, operation: str, awaitable: Awaitable[Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            samples = self._latency.get(operation)
+            if samples is None:
+                samples = self._latency[operation] = deque(maxlen=self.LATENCY_SAMPLES)
+            samples.append(time.perf_counter() - started)
+
+    def _error(self, operation: str, error: Exception):
+        self.stats["errors"] += 1
+        logger.warning(f"Cache error ({operation}): {error}")
+
+    # ========== Invalidation Broadcast ==========
+
+    def _invalidate_local(self, keys: Iterable[str] = (), patterns: Iterable[str] = ()):
+        self._generation += 1
+        self._local.delete(keys)
+        for pattern in patterns:
+            self._local.delete_matching(pattern)
+
+    def _message(self, keys: Iterable[str] = (), patterns: Iterable[str] = ()) -> str:
+        return json.dumps({"origin": self._origin, "keys": list(keys), "patterns": list(patterns)})
+
+    def _handle_invalidation(self, data: Any):
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") == self._origin:
+            return
+        self._invalidate_local(payload.get("keys") or (), payload.get("patterns") or ())
+        self.stats["remote_invalidations"] += 1
+
+    # ========== Project Metadata Cache ==========
+
+    async def get_project(self, project_id: str) -> Optional[dict]:
+        """Get cached project metadata"""
+        data = await self.get(f"{self.PREFIX_PROJECT}{project_id}")
+        if data is not None:
+            logger.debug(f"Cache HIT: project {project_id}")
+        else:
+            logger.debug(f"Cache MISS: project {project_id}")
+        return data
+
+    async def set_project(self, project_id: str, data: dict) -> bool:
+        """Cache project metadata"""
+        cached = await self.set(f"{self.PREFIX_PROJECT}{project_id}", data, self.TTL_PROJECT_META)
+        if cached:
+            logger.debug(f"Cached project: {project_id}")
+        return cached
+
+    async def invalidate_project(self, project_id: str) -> bool:
+        """Invalidate project cache"""
+        invalidated = await self.delete(
+            f"{self.PREFIX_PROJECT}{project_id}",
+            f"{self.PREFIX_FILES}{project_id}"
+        )
+        if invalidated:
+            logger.debug(f"Invalidated cache for project: {project_id}")
+        return invalidated
 
     # ========== Project Files List Cache ==========
 
     async def get_project_files(self, project_id: str) -> Optional[List[dict]]:
         """Get cached list of project files"""
-        try:
-            r = await self._get_redis()
-            key = f"{self.PREFIX_FILES}{project_id}"
-            data = await r.get(key)
-            if data:
-                logger.debug(f"Cache HIT: files for project {project_id}")
-                return json.loads(data)
-            return None
-        except Exception as e:
-            logger.warning(f"Cache error (get_project_files): {e}")
-            return None
+        data = await self.get(f"{self.PREFIX_FILES}{project_id}")
+        if data is not None:
+            logger.debug(f"Cache HIT: files for project {project_id}")
+        return data
 
     async def set_project_files(self, project_id: str, files: List[dict]) -> bool:
         """Cache list of project files"""
-        try:
-            r = await self._get_redis()
-            key = f"{self.PREFIX_FILES}{project_id}"
-            await r.setex(key, self.TTL_PROJECT_FILES, json.dumps(files))
+        cached = await self.set(f"{self.PREFIX_FILES}{project_id}", files, self.TTL_PROJECT_FILES)
+        if cached:
             logger.debug(f"Cached {len(files)} files for project: {project_id}")
-            return True
-        except Exception as e:
-            logger.warning(f"Cache error (set_project_files): {e}")
-            return False
+        return cached
 
     # ========== File Content Cache ==========
 
     async def get_file_content(self, project_id: str, file_path: str) -> Optional[str]:
         """Get cached file content"""
-        try:
-            r = await self._get_redis()
-            key = f"{self.PREFIX_CONTENT}{project_id}:{file_path}"
-            data = await r.get(key)
-            if data:
-                logger.debug(f"Cache HIT: content for {file_path}")
-                return data.decode('utf-8')
-            return None
-        except Exception as e:
-            logger.warning(f"Cache error (get_file_content): {e}")
-            return None
+        data = await self.get(f"{self.PREFIX_CONTENT}{project_id}:{file_path}", self.text)
+        if data is not None:
+            logger.debug(f"Cache HIT: content for {file_path}")
+        return data
 
     async def set_file_content(self, project_id: str, file_path: str, content: str) -> bool:
         """Cache file content (only for frequently accessed files)"""
-        try:
-            r = await self._get_redis()
-            key = f"{self.PREFIX_CONTENT}{project_id}:{file_path}"
-            # Only cache files under 100KB
-            if len(content) < 102400:
-                await r.setex(key, self.TTL_FILE_CONTENT, content.encode('utf-8'))
-                logger.debug(f"Cached content for: {file_path}")
-            return True
-        except Exception as e:
-            logger.warning(f"Cache error (set_file_content): {e}")
-            return False
+        # Only cache files under 100KB
+        if len(content) < 102400:
+            if not await self.set(
+                f"{self.PREFIX_CONTENT}{project_id}:{file_path}", content, self.TTL_FILE_CONTENT, self.text
+            ):
+                return False
+            logger.debug(f"Cached content for: {file_path}")
+        return True
 
     async def invalidate_file(self, project_id: str, file_path: str) -> bool:
         """
         Invalidate file content cache.
         Also invalidates file list and project metadata (since updated_at changes).
         """
-        try:
-            r = await self._get_redis()
-            keys = [
-                f"{self.PREFIX_CONTENT}{project_id}:{file_path}",  # File content
-                f"{self.PREFIX_FILES}{project_id}",  # File list
-                f"{self.PREFIX_PROJECT}{project_id}"  # Project metadata (updated_at changes)
-            ]
-            await r.delete(*keys)
+        invalidated = await self.delete(
+            f"{self.PREFIX_CONTENT}{project_id}:{file_path}",  # File content
+            f"{self.PREFIX_FILES}{project_id}",  # File list
+            f"{self.PREFIX_PROJECT}{project_id}"  # Project metadata (updated_at changes)
+        )
+        if invalidated:
             logger.debug(f"Invalidated cache for file: {file_path} in project: {project_id}")
-            return True
-        except Exception as e:
-            logger.warning(f"Cache error (invalidate_file): {e}")
-            return False
+        return invalidated
 
     # ========== User Session Cache ==========
 
     async def get_user_active_project(self, user_id: str) -> Optional[str]:
         """Get user's currently active project ID"""
-        try:
-            r = await self._get_redis()
-            key = f"{self.PREFIX_USER}{user_id}:active_project"
-            data = await r.get(key)
-            return data.decode('utf-8') if data else None
-        except Exception as e:
-            logger.warning(f"Cache error (get_user_active_project): {e}")
-            return None
+        return await self.get(f"{self.PREFIX_USER}{user_id}:active_project", self.text)
 
     async def set_user_active_project(self, user_id: str, project_id: str) -> bool:
         """Set user's currently active project"""
-        try:
-            r = await self._get_redis()
-            key = f"{self.PREFIX_USER}{user_id}:active_project"
-            await r.setex(key, self.TTL_USER_SESSION, project_id.encode('utf-8'))
-            return True
-        except Exception as e:
-            logger.warning(f"Cache error (set_user_active_project): {e}")
-            return False
+        return await self.set(
+            f"{self.PREFIX_USER}{user_id}:active_project", project_id, self.TTL_USER_SESSION, self.text
+        )
 
     # ========== Bulk Operations ==========
 
     async def warm_project_cache(self, project_id: str, metadata: dict, files: List[dict]) -> bool:
         """Warm cache with project data (called on project load)"""
-        try:
-            await self.set_project(project_id, metadata)
-            await self.set_project_files(project_id, files)
+        warmed = await self._store([
+            (f"{self.PREFIX_PROJECT}{project_id}", self.serializer.dumps(metadata), self.TTL_PROJECT_META),
+            (f"{self.PREFIX_FILES}{project_id}", self.serializer.dumps(files), self.TTL_PROJECT_FILES),
+        ])
+        if warmed:
             logger.info(f"Warmed cache for project: {project_id}")
-            return True
-        except Exception as e:
-            logger.warning(f"Failed to warm cache: {e}")
-            return False
+        return warmed
 
     async def clear_all_project_cache(self, project_id: str) -> bool:
         """Clear all cache related to a project"""
         try:
-            r = await self._get_redis()
-            # Find all keys for this project
-            pattern = f"*{project_id}*"
-            cursor = 0
-            keys_to_delete = []
-
-            while True:
-                cursor, keys = await r.scan(cursor, match=pattern, count=100)
-                keys_to_delete.extend(keys)
-                if cursor == 0:
-                    break
-
-            if keys_to_delete:
-                await r.delete(*keys_to_delete)
-                logger.info(f"Cleared {len(keys_to_delete)} cache keys for project: {project_id}")
-
+            deleted = await self.delete_matching(f"*{project_id}*")
+            if deleted:
+                logger.info(f"Cleared {deleted} cache keys for project: {project_id}")
             return True
         except Exception as e:
-            logger.warning(f"Cache error (clear_all_project_cache): {e}")
+            self._error("clear_all_project_cache", e)
             return False
 
     # ========== Stats ==========
 
+    def clear(self):
+        """Drop this worker's in-process copies"""
+        self._invalidate_local()
+        self._local.clear()
+
+    def get_stats(self) -> dict:
+        """In-process tier size, hit ratios and Redis round-trip latency"""
+        hits = self.stats["local_hits"] + self.stats["redis_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "local_entries": len(self._local),
+            "local_bytes": self._local.bytes,
+            "local_evictions": self._local.evictions,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "local_hit_ratio": round(self.stats["local_hits"] / lookups, 4) if lookups else 0.0,
+            "redis_latency_ms": {
+                operation: _latency_summary(samples) for operation, samples in self._latency.items()
+            },
+            "invalidation_listener": self._listener is not None,
+            "serializer": self.serializer.name,
+            **self.stats,
+        }
+
     async def get_cache_stats(self) -> dict:
         """Get cache statistics"""
         try:
@@ -265,11 +606,12 @@ class CacheService:
             return {
                 'used_memory': info.get('used_memory_human', 'N/A'),
                 'connected_clients': info.get('connected_clients', 0),
-                'total_keys': await r.dbsize()
+                'total_keys': await r.dbsize(),
+                **self.get_stats()
             }
         except Exception as e:
             logger.warning(f"Cache error (get_cache_stats): {e}")
-            return {}
+            return self.get_stats()
 
 
 # Singleton instance
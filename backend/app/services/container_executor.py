@@ -33,6 +33,7 @@ from pathlib import Path
 _port_allocation_lock = threading.Lock()
 
 from app.core.logging_config import logger
+from app.modules.execution.port_leases import LOCAL_HOST, port_leases
 from app.services.execution_context import (
     ExecutionContext,
     ExecutionState,
@@ -1869,10 +1870,13 @@ class ContainerExecutor:
         # DYNAMIC PORT ALLOCATION - Prevents port conflicts automatically
         # =================================================================
         yield f"  🔌 Allocating dynamic ports...\n"
+        port_host = self._port_lease_host()
         try:
             port_mapping, dynamic_frontend_port, dynamic_backend_port = self._allocate_dynamic_ports(
                 compose_file=compose_file,
-                project_path=project_path
+                project_path=project_path,
+                project_id=project_id,
+                port_host=port_host
             )
 
             if port_mapping:
@@ -2836,6 +2840,7 @@ class ContainerExecutor:
             "started_at": now,
             "last_activity": now,  # Track last user activity for idle detection
             "preview_url": preview_url,
+            "port_host": port_host,  # Port lease host, released on stop
             "docker_compose": True  # Flag for compose-based deployment
         }
 
@@ -3401,88 +3406,64 @@ class ContainerExecutor:
     # Prevents port conflicts by automatically assigning available ports at runtime
     # Works with any docker-compose.yml regardless of what ports are specified
 
-    def _find_available_ports_on_sandbox(self, count: int = 5, start_port: int = 35000, end_port: int = 39999) -> List[int]:
+    def _port_lease_host(self) -> str:
+        """Host key for port leases: the sandbox Docker host, or LOCAL_HOST (shared with ContainerManager)"""
+        if self._is_remote_sandbox():
+            return _get_sandbox_docker_host() or LOCAL_HOST
+        return LOCAL_HOST
+
+    def _lease_ports_on_sandbox(self, project_id: str, count: int, host: str,
+                                start_port: int = 35000, end_port: int = 39999) -> List[int]:
         """
-        Find available ports on the sandbox that are not in use.
+        Lease host ports on the sandbox for a project.
 
-        Uses `ss -tlnp` to check which ports are currently in use, then returns
-        a list of available ports in the specified range.
+        Ports come from the shared port lease service, so concurrent starts
+        on any worker never get the same port, and nothing is probed on the
+        sandbox. The project's previous lease (an earlier run) is freed
+        first.
 
         IMPORTANT: This function:
         1. Uses high port range (35000+) to avoid system port conflicts
-        2. Pre-blocks all SYSTEM_PORTS (80, 443, 8080, etc.)
+        2. Never hands out SYSTEM_PORTS (80, 443, 8080, etc.)
 
         Args:
-            count: Number of available ports to find
-            start_port: Start of port range to search (default 35000)
-            end_port: End of port range to search (default 39999)
+            project_id: Project identifier (lease owner)
+            count: Number of ports to lease
+            host: Port lease host (see _port_lease_host)
+            start_port: Start of port range (default 35000)
+            end_port: End of port range (default 39999)
 
         Returns:
-            List of available port numbers
-        """
-        try:
-            # Ensure start_port is above system ports
-            if start_port < 1024:
-                start_port = 35000
-                logger.warning(f"[ContainerExecutor] Sandbox start_port adjusted to {start_port} to avoid system ports")
-
-            # Get list of ports currently in use
-            cmd = "ss -tlnp 2>/dev/null | grep LISTEN | awk '{print $4}' | grep -oE '[0-9]+$' | sort -u"
-            exit_code, output = self._run_shell_on_sandbox(cmd, timeout=10)
+            List of leased port numbers
 
-            # Pre-block all system ports for safety
-            used_ports = set(SYSTEM_PORTS)
-            if exit_code == 0 and output:
-                for line in output.strip().split('\n'):
-                    try:
-                        port = int(line.strip())
-                        used_ports.add(port)
-                    except ValueError:
-                        pass
-
-            # Also check Docker containers for exposed ports
-            docker_cmd = "docker ps --format '{{.Ports}}' 2>/dev/null | grep -oE ':[0-9]+' | tr -d ':' | sort -u"
-            exit_code, docker_output = self._run_shell_on_sandbox(docker_cmd, timeout=10)
-            if exit_code == 0 and docker_output:
-                for line in docker_output.strip().split('\n'):
-                    try:
-                        port = int(line.strip())
-                        used_ports.add(port)
-                    except ValueError:
-                        pass
-
-            logger.info(f"[ContainerExecutor] Found {len(used_ports)} ports in use on sandbox")
-
-            # Find available ports
-            available = []
-            for port in range(start_port, end_port + 1):
-                if port not in used_ports:
-                    available.append(port)
-                    if len(available) >= count:
-                        break
-
-            logger.info(f"[ContainerExecutor] Found {len(available)} available ports: {available}")
-            return available
-
-        except Exception as e:
-            logger.error(f"[ContainerExecutor] Error finding available ports: {e}")
-            # Fallback: return sequential ports and hope for the best
-            return list(range(start_port, start_port + count))
+        Raises:
+            RuntimeError: If the range can't supply `count` ports
+        """
+        port_leases.release(project_id, host=host)
+        ports = port_leases.acquire(
+            project_id, count=count, host=host, port_range=(start_port, end_port), exclude=SYSTEM_PORTS
+        )
+        logger.info(f"[ContainerExecutor] Leased {len(ports)} ports on sandbox: {ports}")
+        return ports
 
     def _allocate_dynamic_ports(
         self,
         compose_file: str,
-        project_path: str
+        project_path: str,
+        project_id: str,
+        port_host: str = LOCAL_HOST
     ) -> Tuple[Dict[int, int], Optional[int], Optional[int]]:
         """
         Allocate dynamic ports for all services in docker-compose.yml.
 
-        Reads the compose file, finds all port mappings, allocates available ports,
-        and rewrites the compose file with the new port mappings.
+        Reads the compose file, finds all port mappings, leases ports for the
+        project, and rewrites the compose file with the new port mappings.
 
         Args:
             compose_file: Path to docker-compose.yml
             project_path: Project directory path
+            project_id: Project identifier (port lease owner)
+            port_host: Port lease host (see _port_lease_host)
 
         Returns:
             Tuple of (port_mapping, frontend_port, backend_port)
@@ -3569,57 +3550,32 @@ class ContainerExecutor:
             if system_ports_found:
                 logger.warning(f"[ContainerExecutor] Found SYSTEM PORTS that must be remapped: {system_ports_found}")
 
-            # Find available ports - request extra to ensure system ports get remapped
-            available_ports = self._find_available_ports_on_sandbox(count=len(ports_needed) + 5)
-
-            if len(available_ports) < len(ports_needed):
-                logger.warning(f"[ContainerExecutor] Not enough available ports: need {len(ports_needed)}, found {len(available_ports)}")
-                # Generate fallback ports for any remaining (especially system ports)
-                fallback_start = 36000
-                while len(available_ports) < len(ports_needed):
-                    if fallback_start not in available_ports:
-                        available_ports.append(fallback_start)
-                    fallback_start += 1
+            # Lease one port per mapping (all or nothing, so system ports always get remapped)
+            available_ports = self._lease_ports_on_sandbox(project_id, len(ports_needed), port_host)
 
             # Allocate ports and update compose data
             modified = False
-            for i, (service_name, port_idx, original_port, container_port) in enumerate(ports_needed):
-                if i < len(available_ports):
-                    new_port = available_ports[i]
-                    port_mapping[original_port] = new_port
-
-                    # Update compose data
-                    service = compose_data['services'][service_name]
-                    # Remove /tcp or /udp suffix if present for container port
-                    container_port_clean = container_port.split('/')[0]
-                    service['ports'][port_idx] = f"{new_port}:{container_port}"
-                    modified = True
-
-                    # Log system port remapping explicitly
-                    if original_port in SYSTEM_PORTS:
-                        logger.info(f"[ContainerExecutor] SYSTEM PORT REMAPPED: {service_name}: {original_port}:{container_port} -> {new_port}:{container_port}")
-                    else:
-                        logger.info(f"[ContainerExecutor] {service_name}: {original_port}:{container_port} -> {new_port}:{container_port}")
-
-                    # Track frontend/backend ports
-                    if any(name in service_name.lower() for name in ['frontend', 'web', 'ui', 'nginx', 'app']):
-                        if frontend_port is None:  # First match
-                            frontend_port = new_port
-                    elif any(name in service_name.lower() for name in ['backend', 'api', 'server']):
-                        if backend_port is None:  # First match
-                            backend_port = new_port
+            for (service_name, port_idx, original_port, container_port), new_port in zip(ports_needed, available_ports):
+                port_mapping[original_port] = new_port
+
+                # Update compose data
+                service = compose_data['services'][service_name]
+                service['ports'][port_idx] = f"{new_port}:{container_port}"
+                modified = True
+
+                # Log system port remapping explicitly
+                if original_port in SYSTEM_PORTS:
+                    logger.info(f"[ContainerExecutor] SYSTEM PORT REMAPPED: {service_name}: {original_port}:{container_port} -> {new_port}:{container_port}")
                 else:
-                    # CRITICAL: System ports MUST be remapped - fail loudly if we can't
-                    if original_port in SYSTEM_PORTS:
-                        logger.error(f"[ContainerExecutor] CRITICAL: Could not remap system port {original_port} for {service_name}")
-                        # Generate emergency fallback port
-                        emergency_port = 37000 + i
-                        port_mapping[original_port] = emergency_port
-                        service = compose_data['services'][service_name]
-                        container_port_clean = container_port.split('/')[0]
-                        service['ports'][port_idx] = f"{emergency_port}:{container_port}"
-                        modified = True
-                        logger.warning(f"[ContainerExecutor] EMERGENCY: {service_name}: {original_port} -> {emergency_port}")
+                    logger.info(f"[ContainerExecutor] {service_name}: {original_port}:{container_port} -> {new_port}:{container_port}")
+
+                # Track frontend/backend ports
+                if any(name in service_name.lower() for name in ['frontend', 'web', 'ui', 'nginx', 'app']):
+                    if frontend_port is None:  # First match
+                        frontend_port = new_port
+                elif any(name in service_name.lower() for name in ['backend', 'api', 'server']):
+                    if backend_port is None:  # First match
+                        backend_port = new_port
 
             # Write updated compose file
             if modified:
@@ -3632,12 +3588,14 @@ class ContainerExecutor:
                     logger.info(f"[ContainerExecutor] Updated compose file with dynamic ports: {port_mapping}")
                 else:
                     logger.error("[ContainerExecutor] Failed to write updated compose file")
+                    port_leases.release(project_id, host=port_host)
                     return {}, None, None
 
             return port_mapping, frontend_port, backend_port
 
         except Exception as e:
             logger.error(f"[ContainerExecutor] Error allocating dynamic ports: {e}")
+            port_leases.release(project_id, host=port_host)
             return {}, None, None
 
     def _write_file_to_sandbox(self, file_path: str, content: str) -> bool:
@@ -4587,6 +4545,9 @@ fi
             except Exception as e:
                 errors.append(f"Docker Compose: {e}")
 
+            # Free the host ports leased for the compose services
+            port_leases.release(project_id, host=container_info.get("port_host", self._port_lease_host()))
+
             # Remove from active containers
             del self.active_containers[project_id]
 
@@ -11,12 +11,18 @@ Redis Key Structure:
 - container:{project_id} -> Container details (JSON)
 - user:{user_id}:containers -> Set of project_ids
 - container:{project_id}:heartbeat -> Last activity timestamp
+- container:index:last_activity -> Sorted set of project_ids by last activity (epoch)
+- container:index:created_at -> Sorted set of project_ids by creation time (epoch)
+
+Cleanup ticks read candidates from the sorted sets with ZRANGEBYSCORE and
+fetch only those records with a pipelined MGET, so the cost of a tick grows
+with the number of idle containers rather than the size of the fleet.
 """
 
 import json
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Set
+from typing import Optional, Dict, Any, List, Set, Iterable
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -29,6 +35,25 @@ except ImportError:
     aioredis = None
 
 
+# Keys fetched per MGET when loading candidate records
+MGET_CHUNK_SIZE = 500
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_score(timestamp: str) -> float:
+    """Convert a naive UTC ISO timestamp to a sorted-set score (epoch seconds)"""
+    try:
+        return (datetime.fromisoformat(timestamp) - _EPOCH).total_seconds()
+    except (ValueError, TypeError):
+        return 0.0  # Invalid timestamp sorts first, i.e. is treated as expired
+
+
+def _from_score(score: float) -> str:
+    """Convert a sorted-set score back to a naive UTC ISO timestamp"""
+    return (_EPOCH + timedelta(seconds=score)).isoformat()
+
+
 class ContainerState(str, Enum):
     """Container lifecycle states"""
     CREATING = "creating"
@@ -132,6 +157,10 @@ class ContainerStateService:
             await self._redis.ping()
             logger.info("[ContainerState] Connected to Redis")
             self._initialized = True
+
+            # Records written before the indexes existed are picked up once
+            if not await self._redis.exists(self._get_activity_index_key()):
+                await self.rebuild_index()
             return True
         except Exception as e:
             logger.warning(f"[ContainerState] Redis connection failed: {e}, using local cache")
@@ -157,6 +186,14 @@ class ContainerStateService:
         """Get Redis key for container heartbeat"""
         return f"{settings.REDIS_CONTAINER_STATE_PREFIX}{project_id}:heartbeat"
 
+    def _get_activity_index_key(self) -> str:
+        """Get Redis key for the last-activity sorted set"""
+        return f"{settings.REDIS_CONTAINER_STATE_PREFIX}index:last_activity"
+
+    def _get_created_index_key(self) -> str:
+        """Get Redis key for the created-at sorted set"""
+        return f"{settings.REDIS_CONTAINER_STATE_PREFIX}index:created_at"
+
     async def save_container(self, info: ContainerInfo) -> bool:
         """
         Save container info to Redis.
@@ -174,21 +211,22 @@ class ContainerStateService:
 
         if self._redis:
             try:
-                # Save container info
                 container_key = self._get_container_key(info.project_id)
-                await self._redis.setex(
-                    container_key,
-                    settings.REDIS_CONTAINER_STATE_TTL,
-                    json.dumps(info.to_dict())
-                )
-
-                # Add to user's container set
                 user_key = self._get_user_containers_key(info.user_id)
-                await self._redis.sadd(user_key, info.project_id)
-                await self._redis.expire(user_key, settings.REDIS_CONTAINER_STATE_TTL)
 
-                # Update heartbeat
-                await self.update_heartbeat(info.project_id)
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.setex(container_key, settings.REDIS_CONTAINER_STATE_TTL, json.dumps(info.to_dict()))
+                pipe.sadd(user_key, info.project_id)
+                pipe.expire(user_key, settings.REDIS_CONTAINER_STATE_TTL)
+                pipe.setex(
+                    self._get_heartbeat_key(info.project_id),
+                    settings.CONTAINER_IDLE_TIMEOUT_SECONDS + 60,
+                    info.last_activity
+                )
+                # GT: a stale snapshot never moves last activity backwards
+                pipe.zadd(self._get_activity_index_key(), {info.project_id: _to_score(info.last_activity)}, gt=True)
+                pipe.zadd(self._get_created_index_key(), {info.project_id: _to_score(info.created_at)})
+                await pipe.execute()
 
                 logger.debug(f"[ContainerState] Saved container {info.project_id} for user {info.user_id}")
                 return True
@@ -213,10 +251,12 @@ class ContainerStateService:
         # Check Redis first
         if self._redis:
             try:
-                container_key = self._get_container_key(project_id)
-                data = await self._redis.get(container_key)
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.get(self._get_container_key(project_id))
+                pipe.zscore(self._get_activity_index_key(), project_id)
+                data, last_activity = await pipe.execute()
                 if data:
-                    info = ContainerInfo.from_dict(json.loads(data))
+                    info = self._decode(data, last_activity)
                     self._local_cache[project_id] = info  # Update local cache
                     return info
             except Exception as e:
@@ -244,9 +284,9 @@ class ContainerStateService:
                 user_key = self._get_user_containers_key(user_id)
                 project_ids = await self._redis.smembers(user_key)
 
-                for project_id in project_ids:
-                    info = await self.get_container(project_id)
-                    if info and info.state != ContainerState.DELETED.value:
+                for info in await self._load_many(project_ids):
+                    self._local_cache[info.project_id] = info
+                    if info.state != ContainerState.DELETED.value:
                         containers.append(info)
             except Exception as e:
                 logger.warning(f"[ContainerState] Redis user containers failed: {e}")
@@ -266,33 +306,52 @@ class ContainerStateService:
         Args:
             project_id: Project identifier
 
+        Returns:
+            True if successful
+        """
+        return await self.update_heartbeats([project_id])
+
+    async def update_heartbeats(self, project_ids: Iterable[str]) -> bool:
+        """
+        Update heartbeats for several containers in one round trip.
+
+        Last activity lives in the sorted-set index, so a heartbeat never
+        has to read, decode and rewrite the container record.
+
+        Args:
+            project_ids: Project identifiers
+
         Returns:
             True if successful
         """
         await self.initialize()
 
-        now = datetime.utcnow().isoformat()
+        project_ids = list(project_ids)
+        if not project_ids:
+            return True
+
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        score = (now - _EPOCH).total_seconds()
 
         # Update local cache
-        if project_id in self._local_cache:
-            self._local_cache[project_id].last_activity = now
+        for project_id in project_ids:
+            if project_id in self._local_cache:
+                self._local_cache[project_id].last_activity = now_iso
 
         if self._redis:
             try:
-                # Update heartbeat key
-                heartbeat_key = self._get_heartbeat_key(project_id)
-                await self._redis.setex(
-                    heartbeat_key,
-                    settings.CONTAINER_IDLE_TIMEOUT_SECONDS + 60,  # Slightly longer than idle timeout
-                    now
-                )
-
-                # Also update the container info
-                info = await self.get_container(project_id)
-                if info:
-                    info.last_activity = now
-                    await self.save_container(info)
-
+                pipe = self._redis.pipeline(transaction=False)
+                for project_id in project_ids:
+                    pipe.setex(
+                        self._get_heartbeat_key(project_id),
+                        settings.CONTAINER_IDLE_TIMEOUT_SECONDS + 60,  # Slightly longer than idle timeout
+                        now_iso
+                    )
+                    # XX: only containers that are still tracked
+                    pipe.zadd(self._get_activity_index_key(), {project_id: score}, xx=True)
+                    pipe.expire(self._get_container_key(project_id), settings.REDIS_CONTAINER_STATE_TTL)
+                await pipe.execute()
                 return True
             except Exception as e:
                 logger.warning(f"[ContainerState] Heartbeat update failed: {e}")
@@ -338,18 +397,15 @@ class ContainerStateService:
 
         if self._redis:
             try:
-                # Delete container key
-                container_key = self._get_container_key(project_id)
-                await self._redis.delete(container_key)
-
-                # Delete heartbeat key
-                heartbeat_key = self._get_heartbeat_key(project_id)
-                await self._redis.delete(heartbeat_key)
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.delete(self._get_container_key(project_id), self._get_heartbeat_key(project_id))
+                pipe.zrem(self._get_activity_index_key(), project_id)
+                pipe.zrem(self._get_created_index_key(), project_id)
 
                 # Remove from user's container set
                 if user_id:
-                    user_key = self._get_user_containers_key(user_id)
-                    await self._redis.srem(user_key, project_id)
+                    pipe.srem(self._get_user_containers_key(user_id), project_id)
+                await pipe.execute()
 
                 logger.info(f"[ContainerState] Deleted container state for {project_id}")
                 return True
@@ -358,6 +414,101 @@ class ContainerStateService:
 
         return True
 
+    # ==================== Index helpers ====================
+
+    def _decode(self, data: str, last_activity: Optional[float] = None) -> ContainerInfo:
+        """Decode a stored record, taking last activity from the index when known"""
+        info = ContainerInfo.from_dict(json.loads(data))
+        if last_activity is not None:
+            info.last_activity = _from_score(last_activity)
+        return info
+
+    async def _load_many(
+        self,
+        project_ids: Iterable[str],
+        last_activity: Optional[Dict[str, float]] = None
+    ) -> List[ContainerInfo]:
+        """
+        Fetch many records with chunked MGETs in a single pipeline.
+
+        Index entries whose record has expired out of Redis are pruned.
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return []
+
+        if last_activity is None:
+            pipe = self._redis.pipeline(transaction=False)
+            for project_id in project_ids:
+                pipe.zscore(self._get_activity_index_key(), project_id)
+            last_activity = dict(zip(project_ids, await pipe.execute()))
+
+        pipe = self._redis.pipeline(transaction=False)
+        for i in range(0, len(project_ids), MGET_CHUNK_SIZE):
+            pipe.mget([self._get_container_key(p) for p in project_ids[i:i + MGET_CHUNK_SIZE]])
+        values = [v for chunk in await pipe.execute() for v in chunk]
+
+        containers = []
+        missing = []
+        for project_id, data in zip(project_ids, values):
+            if data is None:
+                missing.append(project_id)
+                continue
+            try:
+                containers.append(self._decode(data, last_activity.get(project_id)))
+            except Exception:
+                pass
+
+        if missing:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.zrem(self._get_activity_index_key(), *missing)
+            pipe.zrem(self._get_created_index_key(), *missing)
+            await pipe.execute()
+
+        return containers
+
+    async def rebuild_index(self) -> int:
+        """
+        Rebuild the sorted-set indexes from a full keyspace scan.
+
+        Only needed once for records written before the indexes existed;
+        normal operation keeps them current on every save/heartbeat.
+
+        Returns:
+            Number of containers indexed
+        """
+        await self.initialize()
+        if not self._redis:
+            return 0
+
+        prefix = settings.REDIS_CONTAINER_STATE_PREFIX
+        index_prefix = f"{prefix}index:"
+        indexed = 0
+        cursor = 0
+        while True:
+            cursor, keys = await self._redis.scan(cursor, match=f"{prefix}*", count=500)
+            keys = [k for k in keys if not k.endswith(":heartbeat") and not k.startswith(index_prefix)]
+            if keys:
+                pipe = self._redis.pipeline(transaction=False)
+                for data in await self._redis.mget(keys):
+                    if not data:
+                        continue
+                    try:
+                        info = ContainerInfo.from_dict(json.loads(data))
+                    except Exception:
+                        continue
+                    pipe.zadd(self._get_activity_index_key(), {info.project_id: _to_score(info.last_activity)}, gt=True)
+                    pipe.zadd(self._get_created_index_key(), {info.project_id: _to_score(info.created_at)})
+                    indexed += 1
+                await pipe.execute()
+            if cursor == 0:
+                break
+
+        logger.info(f"[ContainerState] Indexed {indexed} containers")
+        return indexed
+
+    # ==================== Cleanup queries ====================
+
     async def get_expired_containers(self) -> List[ContainerInfo]:
         """
         Get all expired containers (for cleanup).
@@ -374,30 +525,21 @@ class ContainerStateService:
         # Check Redis
         if self._redis:
             try:
-                # Scan all container keys
-                prefix = settings.REDIS_CONTAINER_STATE_PREFIX
-                cursor = 0
-                while True:
-                    cursor, keys = await self._redis.scan(cursor, match=f"{prefix}*", count=100)
-                    for key in keys:
-                        if ":heartbeat" in key:
-                            continue  # Skip heartbeat keys
-                        try:
-                            data = await self._redis.get(key)
-                            if data:
-                                info = ContainerInfo.from_dict(json.loads(data))
-                                if info.is_expired(idle_timeout, max_lifetime):
-                                    expired.append(info)
-                        except Exception:
-                            pass
-                    if cursor == 0:
-                        break
+                now = (datetime.utcnow() - _EPOCH).total_seconds()
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.zrangebyscore(self._get_activity_index_key(), "-inf", f"({now - idle_timeout}")
+                pipe.zrangebyscore(self._get_created_index_key(), "-inf", f"({now - max_lifetime}")
+                idle, too_old = await pipe.execute()
+
+                # dict.fromkeys keeps order while dropping duplicates
+                expired = await self._load_many(dict.fromkeys(idle + too_old))
             except Exception as e:
-                logger.warning(f"[ContainerState] Failed to scan Redis for expired: {e}")
+                logger.warning(f"[ContainerState] Failed to query Redis for expired: {e}")
 
         # Also check local cache
+        seen = {info.project_id for info in expired}
         for project_id, info in list(self._local_cache.items()):
-            if info.is_expired(idle_timeout, max_lifetime) and info not in expired:
+            if project_id not in seen and info.is_expired(idle_timeout, max_lifetime):
                 expired.append(info)
 
         return expired
@@ -411,7 +553,6 @@ class ContainerStateService:
         """
         await self.initialize()
 
-        to_pause = []
         pause_after = settings.CONTAINER_PAUSE_AFTER_IDLE_SECONDS
 
         # Check local cache and Redis
@@ -419,35 +560,25 @@ class ContainerStateService:
 
         if self._redis:
             try:
-                prefix = settings.REDIS_CONTAINER_STATE_PREFIX
-                cursor = 0
-                while True:
-                    cursor, keys = await self._redis.scan(cursor, match=f"{prefix}*", count=100)
-                    for key in keys:
-                        if ":heartbeat" in key:
-                            continue
-                        try:
-                            data = await self._redis.get(key)
-                            if data:
-                                all_containers.append(ContainerInfo.from_dict(json.loads(data)))
-                        except Exception:
-                            pass
-                    if cursor == 0:
-                        break
+                now = (datetime.utcnow() - _EPOCH).total_seconds()
+                idle = await self._redis.zrangebyscore(
+                    self._get_activity_index_key(), "-inf", f"({now - pause_after}", withscores=True
+                )
+                all_containers = await self._load_many([p for p, _ in idle], dict(idle))
             except Exception as e:
-                logger.warning(f"[ContainerState] Failed to scan for pause candidates: {e}")
+                logger.warning(f"[ContainerState] Failed to query pause candidates: {e}")
 
         # Add local cache
-        for info in self._local_cache.values():
-            if info not in all_containers:
+        seen = {info.project_id for info in all_containers}
+        for project_id, info in self._local_cache.items():
+            if project_id not in seen:
                 all_containers.append(info)
 
         # Filter to those that should be paused
-        for info in all_containers:
-            if info.state == ContainerState.RUNNING.value and info.should_pause(pause_after):
-                to_pause.append(info)
-
-        return to_pause
+        return [
+            info for info in all_containers
+            if info.state == ContainerState.RUNNING.value and info.should_pause(pause_after)
+        ]
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get container state statistics"""
@@ -464,29 +595,16 @@ class ContainerStateService:
 
         if self._redis:
             try:
-                prefix = settings.REDIS_CONTAINER_STATE_PREFIX
-                cursor = 0
-                while True:
-                    cursor, keys = await self._redis.scan(cursor, match=f"{prefix}*", count=100)
-                    for key in keys:
-                        if ":heartbeat" in key:
-                            continue
-                        stats["total_containers"] += 1
-                        try:
-                            data = await self._redis.get(key)
-                            if data:
-                                info = json.loads(data)
-                                state = info.get("state", "unknown")
-                                if state == "running":
-                                    stats["running"] += 1
-                                elif state == "paused":
-                                    stats["paused"] += 1
-                                elif state == "stopped":
-                                    stats["stopped"] += 1
-                        except Exception:
-                            pass
-                    if cursor == 0:
-                        break
+                project_ids = await self._redis.zrange(self._get_created_index_key(), 0, -1)
+                containers = await self._load_many(project_ids, {})
+                stats["total_containers"] = len(containers)
+                for info in containers:
+                    if info.state == "running":
+                        stats["running"] += 1
+                    elif info.state == "paused":
+                        stats["paused"] += 1
+                    elif info.state == "stopped":
+                        stats["stopped"] += 1
             except Exception as e:
                 logger.warning(f"[ContainerState] Failed to get stats: {e}")
 
@@ -521,6 +639,11 @@ async def update_container_heartbeat(project_id: str) -> bool:
     return await get_container_state_service().update_heartbeat(project_id)
 
 
+async def update_container_heartbeats(project_ids: Iterable[str]) -> bool:
+    """Update several container heartbeats in one round trip"""
+    return await get_container_state_service().update_heartbeats(project_ids)
+
+
 async def delete_container_state(project_id: str) -> bool:
     """Delete container state"""
     return await get_container_state_service().delete_container(project_id)
@@ -0,0 +1,468 @@
+"""
+Document Render Service
+
+Word/PPT/PDF assembly (python-docx, python-pptx, reportlab) is CPU-bound
+and holds the GIL, so running it in the API process slows every other
+request on the worker. Assembly is submitted as a render job instead:
+
+- The job payload (section model + project data) is plain JSON-able data,
+  rendered in a spawn process pool or, with DOCUMENT_RENDER_BACKEND=celery,
+  by the Celery app (document_render queue)
+- Progress events stream back to every subscriber of the job
+- Rendered output is saved to S3+DB (or returned as bytes)
+- Identical requests share one job: while it runs, and for
+  DOCUMENT_RENDER_RESULT_TTL seconds after it finishes
+
+Usage:
+    job = document_render_service.submit("docx", payload, store=True)
+    async for event in job.events():
+        ...  # {"type": "render_progress", "completed": 3, "total": 12, ...}
+    result = await job.wait()  # {"path": s3_key, "format": "docx", ...}
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+ProgressCallback = Callable[[int, int, str], None]
+
+# kind -> (file extension, MIME type, local fallback folder)
+RENDER_FORMATS = {
+    "docx": ("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "documents"),
+    "pptx": ("pptx", "application/vnd.openxmlformats-officedocument.presentationml.presentation", "presentations"),
+    "pdf": ("pdf", "application/pdf", "documents"),
+    "academic_pptx": ("pptx", "application/vnd.openxmlformats-officedocument.presentationml.presentation", "presentations"),
+}
+
+PDF_RENDERERS = {
+    "srs": "generate_srs_pdf",
+    "sds": "generate_sds_pdf",
+    "testing_plan": "generate_testing_plan_pdf",
+    "project_report": "generate_project_report_pdf",
+}
+
+# Finished jobs kept for reuse (bytes results included)
+MAX_CACHED_RESULTS = 32
+
+
+class RenderError(Exception):
+    """Raised when a render job fails"""
+    pass
+
+
+# ==================== Renderers (run in workers) ====================
+
+def _render_docx(payload: Dict[str, Any], progress: ProgressCallback) -> bytes:
+    from app.modules.automation.word_generator import WordDocumentGenerator
+    return WordDocumentGenerator().render(
+        payload["sections"],
+        payload["project_data"],
+        payload["document_type"],
+        project_id=payload.get("project_id"),
+        user_id=payload.get("user_id"),
+        progress=progress
+    )
+
+
+def _render_pptx(payload: Dict[str, Any], progress: ProgressCallback) -> bytes:
+    from app.modules.automation.ppt_generator_v2 import PPTGeneratorV2
+    return PPTGeneratorV2().render(
+        payload["sections"],
+        payload["project_data"],
+        project_id=payload.get("project_id"),
+        user_id=payload.get("user_id"),
+        progress=progress
+    )
+
+
+def _render_to_file(payload: Dict[str, Any], progress: ProgressCallback, suffix: str, generate) -> bytes:
+    """Run a generator that writes to a path, return the file content"""
+    progress(0, 1, payload.get("document_type", ""))
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        if not generate(payload["doc_data"], tmp_path):
+            raise RenderError(f"{payload.get('document_type')} generator reported failure")
+        content = Path(tmp_path).read_bytes()
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    progress(1, 1, payload.get("document_type", ""))
+    return content
+
+
+def _render_pdf(payload: Dict[str, Any], progress: ProgressCallback) -> bytes:
+    from app.modules.automation.pdf_generator import pdf_generator
+    method = PDF_RENDERERS.get(payload["document_type"])
+    if not method:
+        raise RenderError(f"No PDF renderer for {payload['document_type']}")
+    return _render_to_file(payload, progress, ".pdf", getattr(pdf_generator, method))
+
+
+def _render_academic_pptx(payload: Dict[str, Any], progress: ProgressCallback) -> bytes:
+    from app.modules.automation.ppt_generator import ppt_generator
+    return _render_to_file(payload, progress, ".pptx", ppt_generator.generate_project_presentation)
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any], ProgressCallback], bytes]] = {
+    "docx": _render_docx,
+    "pptx": _render_pptx,
+    "pdf": _render_pdf,
+    "academic_pptx": _render_academic_pptx,
+}
+
+
+def run_renderer(kind: str, payload: Dict[str, Any], progress: ProgressCallback) -> Tuple[bytes, float]:
+    """Render `payload` as `kind`; returns (content, elapsed ms)"""
+    start = time.perf_counter()
+    content = RENDERERS[kind](payload, progress)
+    return content, (time.perf_counter() - start) * 1000
+
+
+# Set in each pool worker by _init_worker
+_worker_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _worker_progress_queue
+    _worker_progress_queue = progress_queue
+
+
+def _render_in_worker(job_id: str, kind: str, payload: Dict[str, Any]) -> Tuple[bytes, float]:
+    """Process-pool entry point; progress goes back over the shared queue"""
+    def progress(done: int, total: int, label: str):
+        if _worker_progress_queue is not None:
+            _worker_progress_queue.put((job_id, done, total, label))
+
+    return run_renderer(kind, payload, progress)
+
+
+# ==================== Jobs ====================
+
+class RenderJob:
+    """One render; any number of callers can follow its events and await its result"""
+
+    def __init__(self, job_id: str, kind: str, payload: Dict[str, Any], store: bool):
+        self.job_id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.store = store
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+        self.progress: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.done = False
+
+        self._changed = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def publish(self, done: int, total: int, label: str = ""):
+        if self.done:
+            return  # late message from a worker
+        self.progress.append({
+            "type": "render_progress",
+            "job_id": self.job_id,
+            "completed": done,
+            "total": total,
+            "section": label,
+            "progress": round(done / total * 100, 1) if total else 0
+        })
+        self._wake()
+
+    def publish_threadsafe(self, done: int, total: int, label: str = ""):
+        self._loop.call_soon_threadsafe(self.publish, done, total, label)
+
+    def finish(self, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        self.result = result
+        self.error = error
+        self.done = True
+        self.finished_at = time.time()
+        self._finished.set()
+        self._wake()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Progress events so far and as they arrive, then render_complete/render_error"""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.progress):
+                yield self.progress[index]
+                index += 1
+            if self.done:
+                break
+            await changed.wait()
+
+        if self.error:
+            yield {"type": "render_error", "job_id": self.job_id, "error": self.error}
+        else:
+            yield {"type": "render_complete", "job_id": self.job_id, **self._public_result()}
+
+    async def wait(self) -> Dict[str, Any]:
+        """Result dict; raises RenderError if the render failed"""
+        # Cancelling one waiter must not cancel a job others share
+        await asyncio.shield(self._finished.wait())
+        if self.error:
+            raise RenderError(self.error)
+        return self.result
+
+    def _public_result(self) -> Dict[str, Any]:
+        return {k: v for k, v in (self.result or {}).items() if k != "content"}
+
+
+class DocumentRenderService:
+    """Deduplicated render jobs on a process pool or Celery"""
+
+    def __init__(self):
+        self._jobs: "OrderedDict[str, RenderJob]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._pump: Optional[threading.Thread] = None
+        self._pool_lock = threading.Lock()
+
+    # ==================== Public API ====================
+
+    @staticmethod
+    def job_key(kind: str, payload: Dict[str, Any], store: bool) -> str:
+        """Identical kind + payload + store render to identical output"""
+        blob = json.dumps([kind, payload, store], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+    def submit(self, kind: str, payload: Dict[str, Any], store: bool = False) -> RenderJob:
+        """
+        Start a render job, or join the identical one already running/finished.
+
+        Args:
+            kind: "docx", "pptx", "pdf" or "academic_pptx"
+            payload: Renderer input. docx/pptx: sections, project_data,
+                document_type, project_id, user_id. pdf/academic_pptx:
+                doc_data, document_type.
+            store: Save to S3+DB (local fallback) and return the path
+                instead of the bytes
+        """
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown render kind: {kind}")
+
+        self._evict_expired()
+        job_id = self.job_key(kind, payload, store)
+        job = self._jobs.get(job_id)
+        if job is not None and not job.error:
+            logger.info(f"[DocumentRender] Reusing {kind} job {job_id} ({'finished' if job.done else 'running'})")
+            return job
+
+        job = RenderJob(job_id, kind, payload, store)
+        self._jobs[job_id] = job
+        asyncio.create_task(self._run(job))
+        return job
+
+    async def render(self, kind: str, payload: Dict[str, Any], store: bool = False) -> Dict[str, Any]:
+        """Submit and wait for the result"""
+        return await self.submit(kind, payload, store).wait()
+
+    def get_job(self, job_id: str) -> Optional[RenderJob]:
+        return self._jobs.get(job_id)
+
+    # ==================== Execution ====================
+
+    async def _run(self, job: RenderJob):
+        try:
+            if settings.DOCUMENT_RENDER_BACKEND == "celery" and job.store:
+                result = await self._run_celery(job)
+            else:
+                content, render_ms = await self._render_local(job)
+                result = {"render_ms": round(render_ms, 1), "size_bytes": len(content)}
+                if job.store:
+                    result.update(await self.store(job.kind, job.payload, content))
+                else:
+                    result["content"] = content
+            result.update({"job_id": job.job_id, "format": RENDER_FORMATS[job.kind][0]})
+            logger.info(
+                f"[DocumentRender] {job.kind} job {job.job_id} done in {result.get('render_ms', 0):.0f}ms "
+                f"({result.get('size_bytes', 0)} bytes)"
+            )
+            job.finish(result=result)
+        except Exception as e:
+            logger.error(f"[DocumentRender] {job.kind} job {job.job_id} failed: {e}", exc_info=True)
+            job.finish(error=str(e))
+
+    async def _render_local(self, job: RenderJob) -> Tuple[bytes, float]:
+        """Process pool, or a thread if the pool is disabled or broken"""
+        pool = self._get_pool()
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(pool, _render_in_worker, job.job_id, job.kind, job.payload)
+            except BrokenProcessPool:
+                logger.warning(f"[DocumentRender] Render pool broken, rendering {job.job_id} in a thread")
+                self._reset_pool()
+        return await asyncio.to_thread(run_renderer, job.kind, job.payload, job.publish_threadsafe)
+
+    async def _run_celery(self, job: RenderJob) -> Dict[str, Any]:
+        """Dispatch to the Celery worker and relay PROGRESS state until it finishes"""
+        from app.modules.documents.tasks import render_document_task
+
+        async_result = await asyncio.to_thread(
+            render_document_task.apply_async, args=[job.job_id, job.kind, job.payload]
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.DOCUMENT_RENDER_TIMEOUT
+        seen = 0
+        while True:
+            state = await asyncio.to_thread(lambda: async_result.state)
+            if state == "PROGRESS":
+                meta = async_result.info or {}
+                if meta.get("completed", 0) > seen:
+                    seen = meta["completed"]
+                    job.publish(seen, meta.get("total", 0), meta.get("section", ""))
+            elif state == "SUCCESS":
+                result = async_result.result
+                if not result or not result.get("path"):
+                    raise RenderError("Render worker returned no document")
+                return result
+            elif state in ("FAILURE", "REVOKED"):
+                raise RenderError(str(async_result.info))
+            if loop.time() >= deadline:
+                # No worker picked it up, or it is stuck: don't leave the job pending forever
+                await asyncio.to_thread(async_result.revoke)
+                raise RenderError(
+                    f"Render worker did not finish within {settings.DOCUMENT_RENDER_TIMEOUT}s"
+                )
+            await asyncio.sleep(0.5)
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._pool_lock:
+            if self._pool is None and settings.DOCUMENT_RENDER_WORKERS > 0:
+                # spawn: forking a threaded server process can deadlock the child
+                ctx = multiprocessing.get_context("spawn")
+                self._progress_queue = ctx.Queue()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=settings.DOCUMENT_RENDER_WORKERS,
+                    mp_context=ctx,
+                    initializer=_init_worker,
+                    initargs=(self._progress_queue,)
+                )
+                self._pump = threading.Thread(
+                    target=self._pump_progress, args=(self._progress_queue,),
+                    name="document-render-progress", daemon=True
+                )
+                self._pump.start()
+            return self._pool
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            if self._progress_queue is not None:
+                self._progress_queue.put(None)  # stops the pump thread
+            self._pool = None
+            self._progress_queue = None
+
+    def _pump_progress(self, progress_queue):
+        """Forward worker progress messages to their jobs' event loops"""
+        while True:
+            try:
+                message = progress_queue.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            job_id, done, total, label = message
+            job = self._jobs.get(job_id)
+            if job is not None and not job.done:
+                try:
+                    job.publish_threadsafe(done, total, label)
+                except RuntimeError:
+                    pass  # job's event loop has closed
+
+    def _evict_expired(self):
+        """Drop finished jobs past the reuse TTL, and the oldest beyond MAX_CACHED_RESULTS"""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished:
+            if job.error or now - job.finished_at > settings.DOCUMENT_RENDER_RESULT_TTL:
+                self._jobs.pop(job.job_id, None)
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[:max(0, len(finished) - MAX_CACHED_RESULTS)]:
+            self._jobs.pop(job.job_id, None)
+
+    # ==================== Storage ====================
+
+    async def store(self, kind: str, payload: Dict[str, Any], content: bytes) -> Dict[str, Any]:
+        """
+        Save rendered output to S3 and PostgreSQL; local file only when
+        there is no project/user (or cloud storage failed).
+
+        Returns dict with path (S3 key or local path) plus storage fields.
+        """
+        extension, content_type, local_folder = RENDER_FORMATS[kind]
+        project_data = payload.get("project_data") or payload.get("doc_data") or {}
+        project_name = project_data.get("project_name", "Document")
+        document_type = payload.get("document_type") or "ppt"
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if kind == "pptx":
+            filename = f"{project_name}_{timestamp}.{extension}"
+            title = f"{project_name} - Presentation"
+        else:
+            filename = f"{project_name}_{document_type}_{timestamp}.{extension}"
+            title = f"{project_name} - {document_type.upper()}"
+
+        project_id = payload.get("project_id")
+        user_id = payload.get("user_id")
+        if project_id and user_id:
+            try:
+                from app.services.document_storage_service import document_storage
+
+                save_result = await document_storage.save_document_from_bytes(
+                    user_id=user_id,
+                    project_id=project_id,
+                    content=content,
+                    file_name=filename,
+                    title=title,
+                    doc_type=document_type,
+                    content_type=content_type,
+                    extra_metadata={
+                        'project_name': project_name,
+                        'document_type': document_type,
+                        'generated_at': datetime.now().isoformat()
+                    }
+                )
+                if save_result:
+                    logger.info(f"[DocumentRender] Saved to S3+DB: {save_result.get('s3_key')}")
+                    return {"path": save_result.get('s3_key', filename), **save_result}
+                logger.warning("[DocumentRender] Failed to save to cloud storage")
+            except Exception as e:
+                logger.error(f"[DocumentRender] Error saving to S3+DB: {e}")
+
+        # Fallback: save locally only if no project/user (shouldn't happen in production)
+        output_dir = settings.GENERATED_DIR / local_folder
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_path = output_dir / filename
+        await asyncio.to_thread(file_path.write_bytes, content)
+        logger.info(f"[DocumentRender] Created local file (fallback): {file_path}")
+        return {"path": str(file_path), "size_bytes": len(content)}
+
+
+# Singleton instance
+document_render_service = DocumentRenderService()
@@ -0,0 +1,185 @@
+"""
+Password Hasher - bcrypt off the event loop
+============================================
+bcrypt is slow by design (~250ms at 12 rounds). Called inline from an async
+endpoint it blocks every other request on the worker, so a classroom
+logging in together stalls streaming for everyone.
+
+This service runs verify/hash in a bounded thread pool (bcrypt releases the
+GIL) and puts admission control in front of it:
+- per client IP and per account caps on queued + running operations
+- a cap on the total queue, beyond which requests are refused
+- round-robin dispatch across client IPs, so one IP's burst (or a
+  credential-stuffing script) cannot starve everyone else
+
+It also reports when a stored hash uses a different cost factor than
+BCRYPT_ROUNDS so login can rehash it transparently.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import PasswordHashBusyError
+from app.core.logging_config import logger
+from app.core.security import get_password_hash, verify_password
+
+Job = Tuple[asyncio.Future, Callable, tuple]
+
+
+class PasswordHasher:
+    """Fair, bounded bcrypt worker pool"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Client IP -> queued jobs; dispatch rotates through IPs in order
+        self._queues: "OrderedDict[str, Deque[Job]]" = OrderedDict()
+        self._queued = 0
+        self._running = 0
+        self._per_ip: Dict[str, int] = {}
+        self._per_account: Dict[str, int] = {}
+        self._avg_seconds = 0.25  # Running estimate of one bcrypt call
+        self.stats = {
+            "completed": 0,
+            "rejected_ip": 0,
+            "rejected_account": 0,
+            "rejected_queue": 0,
+            "rehashed": 0,
+        }
+
+    # ========== Public API ==========
+
+    async def verify(self, password: str, hashed: Optional[str], ip: Optional[str] = None,
+                     account: Optional[str] = None) -> bool:
+        """Check a password against its bcrypt hash without blocking the loop"""
+        if not hashed:
+            return False
+        return await self._submit(verify_password, (password, hashed), ip, account)
+
+    async def hash(self, password: str, ip: Optional[str] = None, account: Optional[str] = None) -> str:
+        """Hash a password with BCRYPT_ROUNDS without blocking the loop"""
+        return await self._submit(get_password_hash, (password,), ip, account)
+
+    @staticmethod
+    def needs_rehash(hashed: Optional[str]) -> bool:
+        """True if the hash was made with a different cost factor than BCRYPT_ROUNDS"""
+        if not hashed:
+            return False
+        try:
+            # $2b$12$<salt+hash>
+            return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return False
+
+    async def verify_and_update(self, user, password: str, ip: Optional[str] = None) -> bool:
+        """
+        Verify a user's password and, if the stored hash uses an outdated cost
+        factor, replace it. The caller commits.
+        """
+        account = (user.email or "").lower() if user else None
+        if not await self.verify(password, user.hashed_password, ip=ip, account=account):
+            return False
+        if self.needs_rehash(user.hashed_password):
+            user.hashed_password = await self.hash(password, ip=ip, account=account)
+            self.stats["rehashed"] += 1
+            logger.info(f"[PasswordHasher] Rehashed password for {user.email} at {settings.BCRYPT_ROUNDS} rounds")
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queued,
+            "queued_ips": len(self._queues),
+            "avg_ms": round(self._avg_seconds * 1000, 1),
+            **self.stats,
+        }
+
+    # ========== Admission and dispatch ==========
+
+    async def _submit(self, fn: Callable, args: tuple, ip: Optional[str], account: Optional[str]):
+        ip = ip or "unknown"
+        self._admit(ip, account)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queues.setdefault(ip, deque()).append((future, fn, args))
+        self._queued += 1
+        self._per_ip[ip] = self._per_ip.get(ip, 0) + 1
+        if account:
+            self._per_account[account] = self._per_account.get(account, 0) + 1
+        try:
+            self._dispatch()
+            return await future
+        finally:
+            self._release(self._per_ip, ip)
+            if account:
+                self._release(self._per_account, account)
+
+    def _admit(self, ip: str, account: Optional[str]):
+        if self._queued >= settings.PASSWORD_HASH_MAX_QUEUE:
+            self.stats["rejected_queue"] += 1
+            raise PasswordHashBusyError(self._retry_after(self._queued), scope="server")
+        if self._per_ip.get(ip, 0) >= settings.PASSWORD_HASH_MAX_PER_IP:
+            self.stats["rejected_ip"] += 1
+            raise PasswordHashBusyError(self._retry_after(self._per_ip[ip]), scope="ip")
+        if account and self._per_account.get(account, 0) >= settings.PASSWORD_HASH_MAX_PER_ACCOUNT:
+            self.stats["rejected_account"] += 1
+            raise PasswordHashBusyError(self._retry_after(self._per_account[account]), scope="account")
+
+    def _retry_after(self, ahead: int) -> int:
+        return max(1, round((ahead + 1) * self._avg_seconds / self.workers))
+
+    @staticmethod
+    def _release(counts: Dict[str, int], key: str):
+        remaining = counts.get(key, 0) - 1
+        if remaining > 0:
+            counts[key] = remaining
+        else:
+            counts.pop(key, None)
+
+    def _dispatch(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        loop = asyncio.get_running_loop()
+        while self._running < self.workers and self._queues:
+            ip, queue = next(iter(self._queues.items()))
+            future, fn, args = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(ip)
+            else:
+                del self._queues[ip]
+            if future.cancelled():
+                # Client went away while queued
+                continue
+            self._running += 1
+            started = time.perf_counter()
+            work = loop.run_in_executor(self._executor, fn, *args)
+            work.add_done_callback(lambda done, f=future, s=started: self._finished(done, f, s))
+
+    def _finished(self, done: asyncio.Future, future: asyncio.Future, started: float):
+        self._running -= 1
+        self.stats["completed"] += 1
+        self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * (time.perf_counter() - started)
+        if not future.cancelled():
+            if done.cancelled():
+                future.cancel()
+            elif done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+        self._dispatch()
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
@@ -25,6 +25,7 @@ from datetime import datetime
 import json
 
 from app.core.logging_config import logger
+from app.modules.automation.context_snapshot import notify_file_written
 from app.services.diff_parser import DiffParser, ParsedDiff, ApplyResult as DiffApplyResult
 
 
@@ -247,6 +248,7 @@ class PatchApplier:
                 temp_path = target_path.with_suffix(target_path.suffix + ".tmp")
                 temp_path.write_text(content, encoding='utf-8')
                 temp_path.replace(target_path)
+                notify_file_written(target_path)
 
                 written_files.append(file_path)
                 logger.info(f"[PatchApplier] Wrote: {file_path}")
@@ -324,6 +326,7 @@ class PatchApplier:
             try:
                 target_path.parent.mkdir(parents=True, exist_ok=True)
                 target_path.write_text(content, encoding='utf-8')
+                notify_file_written(target_path)
                 created_files.append(file_path)
                 logger.info(f"[PatchApplier] Created: {file_path}")
             except Exception as e:
@@ -427,6 +430,7 @@ class PatchApplier:
             temp_path = target_path.with_suffix(target_path.suffix + '.tmp')
             temp_path.write_text(result.new_content, encoding='utf-8')
             temp_path.replace(target_path)
+            notify_file_written(target_path)
 
             logger.info(f"[PatchApplier] Applied patch to {actual_file}: +{result.lines_added} -{result.lines_deleted}")
 
@@ -467,6 +471,7 @@ class PatchApplier:
             try:
                 full_path = self.project_path / file_path
                 full_path.write_text(content, encoding='utf-8')
+                notify_file_written(full_path)
                 logger.info(f"[PatchApplier] Rolled back: {file_path}")
             except Exception as e:
                 logger.error(f"[PatchApplier] Failed to rollback {file_path}: {e}")
@@ -9,7 +9,12 @@ GOALS:
 3. .env.example for environment variables
 4. Remove BharatBuild-specific code (error-capture.js, etc.)
 5. Validate project structure before export
-6. Generate ZIP file for download
+6. Stream the ZIP for download
+
+The export is planned as the project's own files (read at stream time,
+platform code stripped on the fly) plus a small overlay of generated files
+(package.json, README.md, .env.example, .gitignore). Nothing is copied: the
+ZIP is produced while it is being sent.
 
 SUPPORTED FRAMEWORKS:
 - React (Vite, CRA)
@@ -23,16 +28,17 @@ SUPPORTED FRAMEWORKS:
 
 import os
 import json
-import zipfile
 import tempfile
 import shutil
+import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 import re
 
 from app.core.logging_config import logger
+from app.utils.zip_stream import ZipEntry, stream_zip, walk_files
 
 
 # =============================================================================
@@ -397,6 +403,30 @@ PATTERNS_TO_REMOVE = [
     r"/api/v1/errors/browser",
 ]
 
+# Files whose content is scrubbed of PATTERNS_TO_REMOVE
+CLEANABLE_SUFFIXES = {".js", ".jsx", ".ts", ".tsx", ".html", ".vue"}
+
+# Directories never included in the download
+SKIP_DIRS = {"node_modules"}
+
+_ERROR_CAPTURE_SCRIPT = re.compile(r'<script[^>]*src=["\'][^"\']*error-capture\.js["\'][^>]*></script>')
+_PLATFORM_PATTERNS = [re.compile(pattern) for pattern in PATTERNS_TO_REMOVE]
+
+
+def clean_platform_code(data: bytes) -> bytes:
+    """Remove platform-specific code from a source file's content"""
+    content = data.decode("utf-8", errors="ignore")
+    original = content
+
+    # Remove error capture script injection
+    content = _ERROR_CAPTURE_SCRIPT.sub('', content)
+
+    # Remove platform-specific globals
+    for pattern in _PLATFORM_PATTERNS:
+        content = pattern.sub('', content)
+
+    return data if content == original else content.encode("utf-8")
+
 
 # =============================================================================
 # EXPORT SERVICE
@@ -415,6 +445,15 @@ class ExportResult:
     env_example_generated: bool = False
 
 
+@dataclass
+class ExportPlan:
+    """Everything that goes into an export ZIP, in archive order"""
+    project_name: str
+    framework: str
+    entries: List[ZipEntry]
+    result: ExportResult
+
+
 class ProjectExportService:
     """
     Service to export projects for local development.
@@ -425,21 +464,25 @@ class ProjectExportService:
     3. Generating README.md
     4. Creating .env.example
     5. Removing platform-specific code
+
+    Usage:
+        plan = await project_export.plan_export(project_path, "My App")
+        return StreamingResponse(project_export.stream_export(plan), media_type="application/zip")
     """
 
     def __init__(self):
         self.temp_dir = Path(tempfile.gettempdir()) / "bharatbuild_exports"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
-    async def export_project(
+    async def plan_export(
         self,
         project_path: str,
         project_name: str,
         description: str = "",
         framework: Optional[str] = None,
-    ) -> ExportResult:
+    ) -> ExportPlan:
         """
-        Export a project as a download-ready ZIP file.
+        Plan a download-ready export without copying or writing anything.
 
         Args:
             project_path: Path to project files
@@ -447,58 +490,136 @@ class ProjectExportService:
             description: Project description
             framework: Framework type (auto-detected if not provided)
 
+        Returns:
+            ExportPlan; plan.result carries counts, warnings and errors.
+            total_size counts source files before platform code is stripped.
+        """
+        try:
+            return await asyncio.to_thread(
+                self._build_plan, Path(project_path), project_name, description, framework
+            )
+        except Exception as e:
+            logger.error(f"[ProjectExport] Export failed: {e}")
+            result = ExportResult(success=False)
+            result.errors.append(str(e))
+            return ExportPlan(project_name=project_name, framework=framework or "", entries=[], result=result)
+
+    def stream_export(self, plan: ExportPlan) -> Iterator[bytes]:
+        """ZIP bytes for a plan, produced as they are sent (iterate in a thread)"""
+        return stream_zip(plan.entries)
+
+    async def export_project(
+        self,
+        project_path: str,
+        project_name: str,
+        description: str = "",
+        framework: Optional[str] = None,
+    ) -> ExportResult:
+        """
+        Export a project as a download-ready ZIP file on disk.
+
+        Prefer plan_export + stream_export for HTTP downloads.
+
         Returns:
             ExportResult with ZIP path or errors
         """
-        result = ExportResult(success=False)
+        plan = await self.plan_export(project_path, project_name, description, framework)
+        result = plan.result
+        if not result.success:
+            return result
+
+        zip_name = f"{project_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        zip_path = self.temp_dir / zip_name
+
+        def write():
+            with open(zip_path, "wb") as f:
+                for chunk in self.stream_export(plan):
+                    f.write(chunk)
 
         try:
-            source_path = Path(project_path)
-            if not source_path.exists():
-                result.errors.append(f"Project path does not exist: {project_path}")
-                return result
+            await asyncio.to_thread(write)
+        except Exception as e:
+            logger.error(f"[ProjectExport] Export failed: {e}")
+            result.success = False
+            result.errors.append(str(e))
+            return result
 
-            # Detect framework
-            if not framework:
-                framework = self._detect_framework(source_path)
-                logger.info(f"[ProjectExport] Detected framework: {framework}")
+        result.zip_path = str(zip_path)
+        logger.info(f"[ProjectExport] Created ZIP: {zip_path}")
+        return result
 
-            # Create temp directory for export
-            export_id = f"{project_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            export_path = self.temp_dir / export_id
+    def _build_plan(
+        self,
+        source_path: Path,
+        project_name: str,
+        description: str,
+        framework: Optional[str]
+    ) -> ExportPlan:
+        result = ExportResult(success=False)
 
-            # Copy project files
-            shutil.copytree(source_path, export_path, dirs_exist_ok=True)
+        if not source_path.exists():
+            result.errors.append(f"Project path does not exist: {source_path}")
+            return ExportPlan(project_name=project_name, framework=framework or "", entries=[], result=result)
 
-            # Process the export
-            await self._remove_platform_files(export_path, result)
-            await self._clean_platform_code(export_path, result)
-            await self._ensure_package_json(export_path, framework, project_name, result)
-            await self._generate_readme(export_path, project_name, description, framework, result)
-            await self._generate_env_example(export_path, framework, result)
-            await self._ensure_gitignore(export_path)
-            await self._validate_project(export_path, framework, result)
+        # Detect framework
+        if not framework:
+            framework = self._detect_framework(source_path)
+            logger.info(f"[ProjectExport] Detected framework: {framework}")
 
-            # Create ZIP file
-            zip_path = await self._create_zip(export_path, project_name)
+        files = self._collect_files(source_path, result)
 
-            # Count files and size
-            result.file_count = sum(1 for _ in export_path.rglob("*") if _.is_file())
-            result.total_size = sum(f.stat().st_size for f in export_path.rglob("*") if f.is_file())
+        # Generated files overlay (replace or add to the project's own)
+        overlay: Dict[str, bytes] = {}
+        package_data = self._ensure_package_json(source_path, framework, project_name)
+        overlay["package.json"] = json.dumps(package_data, indent=2).encode("utf-8")
 
-            # Cleanup export directory
-            shutil.rmtree(export_path)
+        top_level = self._top_level_names(list(files) + list(overlay))
+        overlay["README.md"] = self._generate_readme(
+            source_path, top_level, project_name, description, framework, package_data
+        ).encode("utf-8")
+        result.readme_generated = True
 
-            result.success = True
-            result.zip_path = str(zip_path)
+        env_example = self._generate_env_example(source_path, framework)
+        if env_example:
+            overlay[".env.example"] = env_example.encode("utf-8")
+            result.env_example_generated = True
 
-            logger.info(f"[ProjectExport] Successfully exported {project_name}: {result.file_count} files, {result.total_size} bytes")
+        if ".gitignore" not in files:
+            overlay[".gitignore"] = GITIGNORE_TEMPLATE.encode("utf-8")
+            logger.info(f"[ProjectExport] Generated .gitignore")
 
-        except Exception as e:
-            logger.error(f"[ProjectExport] Export failed: {e}")
-            result.errors.append(str(e))
+        entries = [entry for name, entry in files.items() if name not in overlay]
+        entries.extend(ZipEntry.from_bytes(name, data) for name, data in overlay.items())
 
-        return result
+        self._validate_project({entry.arcname for entry in entries}, framework, result)
+
+        result.file_count = len(entries)
+        result.total_size = sum(entry.size for entry in entries)
+        result.success = True
+
+        logger.info(f"[ProjectExport] Planned export of {project_name}: {result.file_count} files, {result.total_size} bytes")
+
+        return ExportPlan(project_name=project_name, framework=framework, entries=entries, result=result)
+
+    def _collect_files(self, path: Path, result: ExportResult) -> Dict[str, ZipEntry]:
+        """Project files to export, minus platform files (FILES_TO_REMOVE) and node_modules"""
+        files: Dict[str, ZipEntry] = {}
+        removed = set()
+
+        for rel, file_path, stat in walk_files(path, SKIP_DIRS):
+            parts = rel.split("/")
+            hit = next((i for i, part in enumerate(parts) if part in FILES_TO_REMOVE), None)
+            if hit is not None:
+                removed.add(("/".join(parts[:hit + 1]), parts[hit]))
+                continue
+
+            transform = clean_platform_code if Path(rel).suffix in CLEANABLE_SUFFIXES else None
+            files[rel] = ZipEntry.from_file(rel, file_path, stat, transform)
+
+        for _, file_name in sorted(removed):
+            result.warnings.append(f"Removed platform file: {file_name}")
+
+        return files
 
     def _detect_framework(self, path: Path) -> str:
         """Detect project framework from files"""
@@ -552,56 +673,8 @@ class ProjectExportService:
         # Default to React Vite
         return "react-vite"
 
-    async def _remove_platform_files(self, path: Path, result: ExportResult):
-        """Remove BharatBuild-specific files"""
-        for file_name in FILES_TO_REMOVE:
-            for file_path in path.rglob(file_name):
-                try:
-                    if file_path.is_file():
-                        file_path.unlink()
-                    elif file_path.is_dir():
-                        shutil.rmtree(file_path)
-                    result.warnings.append(f"Removed platform file: {file_name}")
-                except Exception as e:
-                    logger.warning(f"[ProjectExport] Failed to remove {file_path}: {e}")
-
-    async def _clean_platform_code(self, path: Path, result: ExportResult):
-        """Remove platform-specific code from files"""
-        for file_path in path.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if file_path.suffix not in [".js", ".jsx", ".ts", ".tsx", ".html", ".vue"]:
-                continue
-
-            try:
-                content = file_path.read_text(encoding="utf-8", errors="ignore")
-                original = content
-
-                # Remove error capture script injection
-                content = re.sub(
-                    r'<script[^>]*src=["\'][^"\']*error-capture\.js["\'][^>]*></script>',
-                    '',
-                    content
-                )
-
-                # Remove platform-specific globals
-                for pattern in PATTERNS_TO_REMOVE:
-                    content = re.sub(pattern, '', content)
-
-                if content != original:
-                    file_path.write_text(content, encoding="utf-8")
-
-            except Exception as e:
-                logger.warning(f"[ProjectExport] Failed to clean {file_path}: {e}")
-
-    async def _ensure_package_json(
-        self,
-        path: Path,
-        framework: str,
-        project_name: str,
-        result: ExportResult
-    ):
-        """Ensure package.json is complete with all dependencies"""
+    def _ensure_package_json(self, path: Path, framework: str, project_name: str) -> Dict[str, Any]:
+        """Complete package.json with all dependencies"""
         package_path = path / "package.json"
         config = FRAMEWORK_CONFIGS.get(framework, {})
 
@@ -644,34 +717,41 @@ class ProjectExportService:
                 if dep not in package_data["devDependencies"]:
                     package_data["devDependencies"][dep] = version
 
-        # Write updated package.json
-        package_path.write_text(json.dumps(package_data, indent=2))
         logger.info(f"[ProjectExport] Updated package.json with {len(package_data.get('dependencies', {}))} dependencies")
+        return package_data
+
+    def _top_level_names(self, rel_paths: List[str]) -> List[str]:
+        """Top-level entries of the export ("src/" for directories)"""
+        names = set()
+        for rel in rel_paths:
+            head, sep, _ = rel.partition("/")
+            names.add(head + sep)
+        return sorted(names)
 
-    async def _generate_readme(
+    def _generate_readme(
         self,
         path: Path,
+        top_level: List[str],
         project_name: str,
         description: str,
         framework: str,
-        result: ExportResult
-    ):
+        package_data: Dict[str, Any]
+    ) -> str:
         """Generate README.md with setup instructions"""
-        readme_path = path / "README.md"
         config = FRAMEWORK_CONFIGS.get(framework, FRAMEWORK_CONFIGS["react-vite"])
 
         # Generate project structure
-        structure_lines = []
-        for item in sorted(path.iterdir()):
-            if item.name.startswith(".") and item.name not in [".env.example", ".gitignore"]:
-                continue
-            if item.name == "node_modules":
-                continue
-            prefix = "├──" if item != list(path.iterdir())[-1] else "└──"
-            structure_lines.append(f"{prefix} {item.name}{'/' if item.is_dir() else ''}")
+        shown = [
+            name for name in top_level
+            if not (name.startswith(".") and name not in [".env.example", ".gitignore"])
+        ]
+        structure_lines = [
+            f"{'└──' if i == len(shown) - 1 else '├──'} {name}"
+            for i, name in enumerate(shown)
+        ]
 
         # Detect technologies
-        technologies = self._detect_technologies(path)
+        technologies = self._detect_technologies(path, package_data)
 
         readme_content = README_TEMPLATE.format(
             project_name=project_name,
@@ -684,35 +764,31 @@ class ProjectExportService:
             technologies="\n".join(f"- {tech}" for tech in technologies)
         )
 
-        readme_path.write_text(readme_content)
-        result.readme_generated = True
         logger.info(f"[ProjectExport] Generated README.md")
+        return readme_content
 
-    def _detect_technologies(self, path: Path) -> List[str]:
+    def _detect_technologies(self, path: Path, package_data: Dict[str, Any]) -> List[str]:
         """Detect technologies used in the project"""
         technologies = []
 
-        package_path = path / "package.json"
-        if package_path.exists():
-            data = json.loads(package_path.read_text())
-            deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-
-            if "react" in deps:
-                technologies.append("React")
-            if "next" in deps:
-                technologies.append("Next.js")
-            if "vue" in deps:
-                technologies.append("Vue.js")
-            if "@angular/core" in deps:
-                technologies.append("Angular")
-            if "vite" in deps:
-                technologies.append("Vite")
-            if "tailwindcss" in deps:
-                technologies.append("Tailwind CSS")
-            if "typescript" in deps:
-                technologies.append("TypeScript")
-            if "express" in deps:
-                technologies.append("Express.js")
+        deps = {**package_data.get("dependencies", {}), **package_data.get("devDependencies", {})}
+
+        if "react" in deps:
+            technologies.append("React")
+        if "next" in deps:
+            technologies.append("Next.js")
+        if "vue" in deps:
+            technologies.append("Vue.js")
+        if "@angular/core" in deps:
+            technologies.append("Angular")
+        if "vite" in deps:
+            technologies.append("Vite")
+        if "tailwindcss" in deps:
+            technologies.append("Tailwind CSS")
+        if "typescript" in deps:
+            technologies.append("TypeScript")
+        if "express" in deps:
+            technologies.append("Express.js")
 
         reqs_path = path / "requirements.txt"
         if reqs_path.exists():
@@ -729,10 +805,8 @@ class ProjectExportService:
 
         return technologies
 
-    async def _generate_env_example(self, path: Path, framework: str, result: ExportResult):
-        """Generate .env.example file"""
-        env_path = path / ".env.example"
-
+    def _generate_env_example(self, path: Path, framework: str) -> Optional[str]:
+        """Generate .env.example content (None when there is nothing to document)"""
         # Check for existing .env files to copy structure
         existing_env = path / ".env"
         existing_local = path / ".env.local"
@@ -761,30 +835,24 @@ class ProjectExportService:
             if not any("DATABASE_URL" in v for v in env_vars):
                 env_vars.append("DATABASE_URL=sqlite:///./app.db")
 
-        if env_vars:
-            content = "# Environment Variables\n"
-            content += "# Copy this file to .env and fill in your values\n\n"
-            content += "\n".join(env_vars)
-            env_path.write_text(content)
-            result.env_example_generated = True
-            logger.info(f"[ProjectExport] Generated .env.example with {len(env_vars)} variables")
+        if not env_vars:
+            return None
 
-    async def _ensure_gitignore(self, path: Path):
-        """Ensure .gitignore exists"""
-        gitignore_path = path / ".gitignore"
-        if not gitignore_path.exists():
-            gitignore_path.write_text(GITIGNORE_TEMPLATE)
-            logger.info(f"[ProjectExport] Generated .gitignore")
+        content = "# Environment Variables\n"
+        content += "# Copy this file to .env and fill in your values\n\n"
+        content += "\n".join(env_vars)
+        logger.info(f"[ProjectExport] Generated .env.example with {len(env_vars)} variables")
+        return content
 
-    async def _validate_project(self, path: Path, framework: str, result: ExportResult):
+    def _validate_project(self, names: set, framework: str, result: ExportResult):
         """Validate project is ready for local development"""
         # Check for required files based on framework
         if framework in ["react-vite", "react-cra", "nextjs", "vue", "angular", "express"]:
-            if not (path / "package.json").exists():
+            if "package.json" not in names:
                 result.errors.append("Missing package.json")
 
         if framework in ["python-fastapi", "python-flask"]:
-            if not (path / "requirements.txt").exists():
+            if "requirements.txt" not in names:
                 result.warnings.append("Missing requirements.txt - you may need to create it")
 
         # Check for entry point
@@ -794,27 +862,10 @@ class ProjectExportService:
             "pages/index.tsx", "pages/index.js", "app/page.tsx",
             "main.py", "app.py", "index.js", "server.js"
         ]
-        has_entry = any((path / ep).exists() for ep in entry_points)
+        has_entry = any(ep in names for ep in entry_points)
         if not has_entry:
             result.warnings.append("No entry point found - project may not run correctly")
 
-    async def _create_zip(self, source_path: Path, project_name: str) -> Path:
-        """Create ZIP file from project directory"""
-        zip_name = f"{project_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        zip_path = self.temp_dir / zip_name
-
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in source_path.rglob("*"):
-                if file_path.is_file():
-                    # Skip node_modules
-                    if "node_modules" in file_path.parts:
-                        continue
-                    arcname = file_path.relative_to(source_path)
-                    zipf.write(file_path, arcname)
-
-        logger.info(f"[ProjectExport] Created ZIP: {zip_path}")
-        return zip_path
-
     def cleanup_old_exports(self, max_age_hours: int = 24):
         """Clean up old export files"""
         cutoff = datetime.now().timestamp() - (max_age_hours * 3600)
@@ -0,0 +1,131 @@
+"""
+Project Search Service
+======================
+Indexed substring search over project title, description and tech stack.
+
+- PostgreSQL: the search document expression below is covered by a pg_trgm
+  GIN index (migration add_project_search_index), so LIKE '%term%' is
+  answered from the index instead of scanning every project
+- SQLite (dev/tests): an FTS5 table with the trigram tokenizer, kept in
+  sync with projects by triggers and created on first use
+
+Terms shorter than three characters can't use either trigram index and fall
+back to a plain LIKE on the same expression, restricted by the caller's
+other filters.
+
+Usage:
+    condition = await project_search_service.match(db, q)
+    query = select(Project).where(Project.user_id == user_id, condition)
+"""
+
+from sqlalchemy import text, literal_column, select, table, column, ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging_config import logger
+from app.models.project import Project
+
+# Must stay identical to the expression indexed in add_project_search_index
+PG_SEARCH_DOCUMENT = (
+    "lower(coalesce(projects.title, '') || ' ' || coalesce(projects.description, '') "
+    "|| ' ' || coalesce(projects.tech_stack::text, ''))"
+)
+SQLITE_SEARCH_DOCUMENT = (
+    "lower(coalesce(projects.title, '') || ' ' || coalesce(projects.description, '') "
+    "|| ' ' || coalesce(projects.tech_stack, ''))"
+)
+
+# Shortest term a trigram index can answer
+MIN_INDEXED_TERM = 3
+
+FTS_TABLE = "projects_fts"
+
+_SQLITE_FTS_DDL = [
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "project_id UNINDEXED, title, description, tech_stack, tokenize='trigram')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON projects BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, project_id, title, description, tech_stack) "
+    "VALUES (new.rowid, new.id, new.title, new.description, new.tech_stack); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON projects BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid; END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, description, tech_stack ON projects BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid; "
+    f"INSERT INTO {FTS_TABLE}(rowid, project_id, title, description, tech_stack) "
+    "VALUES (new.rowid, new.id, new.title, new.description, new.tech_stack); END",
+    f"INSERT INTO {FTS_TABLE}(rowid, project_id, title, description, tech_stack) "
+    "SELECT rowid, id, title, description, tech_stack FROM projects",
+]
+
+
+# Escape character for LIKE patterns built by like_pattern()
+LIKE_ESCAPE = "!"
+
+
+def like_pattern(term: str) -> str:
+    """'%term%' with LIKE wildcards in the term escaped (with LIKE_ESCAPE)"""
+    escaped = term.lower().replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"%{escaped}%"
+
+
+class ProjectSearchService:
+    """
+    Builds index-backed search conditions for Project queries.
+    """
+
+    @staticmethod
+    def _dialect(db: AsyncSession) -> str:
+        bind = db.bind
+        return bind.dialect.name if bind is not None else "postgresql"
+
+    def document(self, db: AsyncSession):
+        """Lower-cased title + description + tech stack expression"""
+        if self._dialect(db) == "sqlite":
+            return literal_column(SQLITE_SEARCH_DOCUMENT)
+        return literal_column(PG_SEARCH_DOCUMENT)
+
+    def contains(self, db: AsyncSession, term: str) -> ColumnElement:
+        """Substring condition on the search document (trigram-indexed on PostgreSQL)"""
+        return self.document(db).like(like_pattern(term), escape=LIKE_ESCAPE)
+
+    async def match(self, db: AsyncSession, term: str) -> ColumnElement:
+        """Condition selecting projects whose title, description or tech stack contains term"""
+        term = term.strip()
+        if self._dialect(db) != "sqlite" or len(term) < MIN_INDEXED_TERM:
+            return self.contains(db, term)
+
+        await self.ensure_sqlite_index(db)
+        phrase = '"' + term.replace('"', '""') + '"'
+        fts = table(FTS_TABLE, column("project_id"))
+        matches = select(fts.c.project_id).where(
+            text(f"{FTS_TABLE} MATCH :fts_phrase").bindparams(fts_phrase=phrase)
+        )
+        return Project.id.in_(matches)
+
+    async def ensure_sqlite_index(self, db: AsyncSession) -> bool:
+        """
+        Create the FTS5 table and sync triggers if they are missing (e.g. the
+        projects table was recreated). Runs on its own connection.
+
+        Returns:
+            True if the index was (re)built
+        """
+        exists = await db.scalar(text(
+            f"SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name = '{FTS_TABLE}_au'"
+        ))
+        if exists:
+            return False
+
+        try:
+            async with db.bind.begin() as conn:
+                for statement in _SQLITE_FTS_DDL:
+                    await conn.execute(text(statement))
+        except Exception as e:
+            # A concurrent first search may have built it already
+            logger.warning(f"[ProjectSearch] SQLite FTS5 index build skipped: {e}")
+            return False
+        logger.info("[ProjectSearch] Built SQLite FTS5 trigram index for projects")
+        return True
+
+
+# Singleton instance
+project_search_service = ProjectSearchService()
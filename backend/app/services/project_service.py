@@ -42,15 +42,15 @@ class ProjectService:
     # ========== Project Operations ==========
 
     async def get_project(self, project_id: UUID) -> Optional[dict]:
-        """Get project with caching"""
-        project_id_str = str(project_id)
-
-        # Try cache first
-        cached = await cache_service.get_project(project_id_str)
-        if cached:
-            return cached
+        """Get project with caching (concurrent misses share one query)"""
+        return await cache_service.get_or_set(
+            f"{cache_service.PREFIX_PROJECT}{project_id}",
+            lambda: self._load_project(project_id),
+            cache_service.TTL_PROJECT_META
+        )
 
-        # Fetch from database
+    async def _load_project(self, project_id: UUID) -> Optional[dict]:
+        """Project metadata from the database"""
         result = await self.db.execute(
             select(Project).where(Project.id == project_id)
         )
@@ -69,9 +69,6 @@ class ProjectService:
             'updated_at': project.updated_at.isoformat() if project.updated_at else None
         }
 
-        # Cache for future requests
-        await cache_service.set_project(project_id_str, project_data)
-
         return project_data
 
     async def get_project_with_files(self, project_id: UUID) -> Optional[dict]:
@@ -94,13 +91,16 @@ class ProjectService:
     # ========== File Operations ==========
 
     async def get_project_files(self, project_id: UUID) -> List[dict]:
-        """Get all files for a project with caching"""
-        project_id_str = str(project_id)
+        """Get all files for a project with caching (concurrent misses share one query)"""
+        return await cache_service.get_or_set(
+            f"{cache_service.PREFIX_FILES}{project_id}",
+            lambda: self._load_project_files(project_id),
+            cache_service.TTL_PROJECT_FILES
+        )
 
-        # Try cache first
-        cached = await cache_service.get_project_files(project_id_str)
-        if cached:
-            return cached
+    async def _load_project_files(self, project_id: UUID) -> List[dict]:
+        """File metadata for a project from the database"""
+        project_id_str = str(project_id)
 
         # Fetch from database - cast to handle UUID/VARCHAR mismatch
         from sqlalchemy import cast, String as SQLString
@@ -124,9 +124,6 @@ class ProjectService:
             }
             files_data.append(file_data)
 
-        # Cache the file list
-        await cache_service.set_project_files(project_id_str, files_data)
-
         return files_data
 
     async def get_file_content(self, project_id: UUID, file_path: str) -> Optional[str]:
@@ -0,0 +1,868 @@
+"""
+Quiz Session Service - campus drive quiz state for concurrent takers
+=====================================================================
+A drive's quiz opens for hundreds of students at once. Instead of reloading
+the drive and the whole question bank per request and rewriting every saved
+answer on each auto-save, the quiz runs on three pieces of state:
+
+- the question bank, cached per drive (in process, backed by Redis) and
+  dropped when a commit touches the drive or its questions
+- a session per taker, materialized once at start: the selected questions,
+  each question's option order and what is needed to grade it. Selection
+  and shuffles are seeded with sha256 (not the per-process salted hash()),
+  so any worker rebuilds the same session from the registration
+- the taker's answers, a Redis hash updated one field per answer
+
+Responses reach Postgres in one batch when the quiz is graded. A submit
+more than QUIZ_SUBMIT_GRACE_SECONDS past the deadline is graded from saved
+progress only, and quizzes nobody submits are graded in bulk by the expiry
+sweep (Celery beat, app/modules/campus_drive/tasks.py), which scans the
+indexed registration deadline. Every graded quiz is published on
+QUIZ_RESULTS_CHANNEL. Without Redis, sessions and answers are kept per
+worker, which is only suitable for single-worker deployments.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.models.campus_drive import (
+    CampusDrive,
+    CampusDriveQuestion,
+    CampusDriveRegistration,
+    CampusDriveResponse,
+    QuestionCategory,
+    RegistrationStatus,
+)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+KEY_PREFIX = "quiz:"
+BANK_PREFIX = f"{KEY_PREFIX}bank:"
+
+COMPLETED_STATUSES = (
+    RegistrationStatus.QUIZ_COMPLETED,
+    RegistrationStatus.QUALIFIED,
+    RegistrationStatus.NOT_QUALIFIED,
+)
+
+
+def stable_rng(*parts: Any) -> random.Random:
+    """Random generator seeded from the parts, identical in every process"""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+# ==================== Question bank ====================
+
+@dataclass
+class BankQuestion:
+    id: str
+    question_text: str
+    category: str
+    options: List[str]
+    correct_option: int
+    marks: float
+
+
+@dataclass
+class QuestionBank:
+    """A drive's quiz configuration and every question it can draw from"""
+    drive_id: str
+    drive_name: str
+    duration_minutes: int
+    passing_percentage: float
+    category_counts: Dict[str, int]
+    questions: List[BankQuestion]  # Sorted by id, so selection does not depend on row order
+    built_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self.by_id = {q.id: q for q in self.questions}
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "QuestionBank":
+        payload = json.loads(data)
+        payload["questions"] = [BankQuestion(**q) for q in payload["questions"]]
+        return cls(**payload)
+
+
+async def load_bank(db: AsyncSession, drive_id: str) -> Optional[QuestionBank]:
+    """Build a drive's bank from the database (None if the drive does not exist)"""
+    result = await db.execute(select(CampusDrive).where(CampusDrive.id == drive_id))
+    drive = result.scalar_one_or_none()
+    if drive is None:
+        return None
+
+    q_result = await db.execute(
+        select(CampusDriveQuestion).where(
+            (CampusDriveQuestion.campus_drive_id == drive_id) |
+            (CampusDriveQuestion.is_global == True)
+        )
+    )
+    questions = sorted(
+        (
+            BankQuestion(
+                id=str(q.id),
+                question_text=q.question_text,
+                category=q.category.value,
+                options=list(q.options),
+                correct_option=q.correct_option,
+                marks=q.marks if q.marks is not None else 1.0,
+            )
+            for q in q_result.scalars().all()
+        ),
+        key=lambda q: q.id,
+    )
+    return QuestionBank(
+        drive_id=str(drive.id),
+        drive_name=drive.name,
+        duration_minutes=drive.quiz_duration_minutes,
+        passing_percentage=drive.passing_percentage,
+        category_counts={
+            QuestionCategory.LOGICAL.value: drive.logical_questions or 0,
+            QuestionCategory.TECHNICAL.value: drive.technical_questions or 0,
+            QuestionCategory.AI_ML.value: drive.ai_ml_questions or 0,
+            QuestionCategory.ENGLISH.value: drive.english_questions or 0,
+            QuestionCategory.CODING.value: drive.coding_questions or 0,
+        },
+        questions=questions,
+    )
+
+
+# ==================== Sessions ====================
+
+@dataclass
+class SessionItem:
+    """One question as served to a taker"""
+    question_id: str
+    order: List[int]  # order[shown position] = index in the stored options
+    category: str
+    marks: float
+    correct_option: int
+
+
+@dataclass
+class QuizSession:
+    registration_id: str
+    drive_id: str
+    email: str
+    started_at: datetime
+    duration_minutes: int
+    passing_percentage: float
+    items: List[SessionItem]
+
+    @property
+    def deadline(self) -> datetime:
+        return self.started_at + timedelta(minutes=self.duration_minutes)
+
+    def seconds_remaining(self, now: Optional[datetime] = None) -> int:
+        return max(0, int((self.deadline - (now or datetime.utcnow())).total_seconds()))
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["started_at"] = self.started_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, data: str) -> "QuizSession":
+        payload = json.loads(data)
+        payload["started_at"] = datetime.fromisoformat(payload["started_at"])
+        payload["items"] = [SessionItem(**item) for item in payload["items"]]
+        return cls(**payload)
+
+
+def materialize_session(bank: QuestionBank, registration_id: str, email: str, started_at: datetime) -> QuizSession:
+    """Pick and shuffle a taker's questions; the same inputs always give the same session"""
+    registration_id = str(registration_id)
+    by_category: Dict[str, List[BankQuestion]] = {}
+    for q in bank.questions:
+        by_category.setdefault(q.category, []).append(q)
+
+    selected: List[BankQuestion] = []
+    for category in QuestionCategory:
+        count = bank.category_counts.get(category.value, 0)
+        if count <= 0:
+            continue
+        pool = by_category.get(category.value, [])
+        if len(pool) > count:
+            pool = stable_rng(registration_id, bank.drive_id, category.value).sample(pool, count)
+        selected.extend(pool)
+    stable_rng(registration_id, bank.drive_id).shuffle(selected)
+
+    items = []
+    for q in selected:
+        order = list(range(len(q.options)))
+        stable_rng(registration_id, q.id).shuffle(order)
+        items.append(SessionItem(q.id, order, q.category, q.marks, q.correct_option))
+
+    return QuizSession(
+        registration_id=registration_id,
+        drive_id=bank.drive_id,
+        email=email,
+        started_at=started_at,
+        duration_minutes=bank.duration_minutes,
+        passing_percentage=bank.passing_percentage,
+        items=items,
+    )
+
+
+# ==================== Grading ====================
+
+@dataclass
+class QuizGrade:
+    total_questions: int
+    attempted: int
+    correct: int
+    wrong: int
+    total_marks: float
+    marks_obtained: float
+    percentage: float
+    is_qualified: bool
+    section_scores: Dict[str, Dict[str, float]]  # category -> {"obtained", "total"}
+    responses: List[Dict[str, Any]]  # campus_drive_responses rows
+
+
+def grade_session(session: QuizSession, answers: Dict[str, int], answered_at: Optional[datetime] = None) -> QuizGrade:
+    """
+    Grade every question served in the session. Answers are shown option
+    positions; unanswered questions count towards the total.
+    """
+    answered_at = answered_at or datetime.utcnow()
+    section_scores = {c.value: {"obtained": 0, "total": 0} for c in QuestionCategory}
+    total_marks = marks_obtained = 0
+    correct = attempted = 0
+    responses = []
+
+    for item in session.items:
+        shown = answers.get(item.question_id)
+        if shown is not None and not 0 <= shown < len(item.order):
+            shown = None
+        is_correct = shown is not None and item.order[shown] == item.correct_option
+        marks = item.marks if is_correct else 0
+
+        total_marks += item.marks
+        marks_obtained += marks
+        attempted += shown is not None
+        correct += is_correct
+        section = section_scores.setdefault(item.category, {"obtained": 0, "total": 0})
+        section["total"] += item.marks
+        section["obtained"] += marks
+
+        responses.append({
+            "registration_id": session.registration_id,
+            "question_id": item.question_id,
+            "selected_option": shown,
+            "is_correct": is_correct,
+            "marks_obtained": marks,
+            "answered_at": answered_at,
+        })
+
+    percentage = (marks_obtained / total_marks * 100) if total_marks > 0 else 0
+    return QuizGrade(
+        total_questions=len(session.items),
+        attempted=attempted,
+        correct=correct,
+        wrong=attempted - correct,
+        total_marks=total_marks,
+        marks_obtained=marks_obtained,
+        percentage=percentage,
+        is_qualified=percentage >= session.passing_percentage,
+        section_scores=section_scores,
+        responses=responses,
+    )
+
+
+def grade_values(grade: QuizGrade, finished_at: datetime) -> Dict[str, Any]:
+    """Registration columns for a graded quiz"""
+    sections = grade.section_scores
+    return {
+        "status": RegistrationStatus.QUALIFIED if grade.is_qualified else RegistrationStatus.NOT_QUALIFIED,
+        "quiz_end_time": finished_at,
+        "quiz_score": grade.marks_obtained,
+        "total_marks": grade.total_marks,
+        "percentage": grade.percentage,
+        "is_qualified": grade.is_qualified,
+        "logical_score": sections[QuestionCategory.LOGICAL.value]["obtained"],
+        "technical_score": sections[QuestionCategory.TECHNICAL.value]["obtained"],
+        "ai_ml_score": sections[QuestionCategory.AI_ML.value]["obtained"],
+        "english_score": sections[QuestionCategory.ENGLISH.value]["obtained"],
+        "coding_score": sections[QuestionCategory.CODING.value]["obtained"],
+        "total_questions": grade.total_questions,
+        "attempted_questions": grade.attempted,
+        "correct_answers": grade.correct,
+        "quiz_deadline": None,  # Graded: out of the expiry sweep's index range
+    }
+
+
+def result_event(session: QuizSession, grade: QuizGrade, finished_at: datetime,
+                 auto_submitted: bool = False) -> Dict[str, Any]:
+    """Message published on QUIZ_RESULTS_CHANNEL for a graded quiz"""
+    return {
+        "type": "quiz_graded",
+        "drive_id": session.drive_id,
+        "registration_id": session.registration_id,
+        "email": session.email,
+        "percentage": round(grade.percentage, 2),
+        "is_qualified": grade.is_qualified,
+        "auto_submitted": auto_submitted,
+        "finished_at": finished_at.isoformat(),
+    }
+
+
+async def record_result(db: AsyncSession, session: QuizSession, grade: QuizGrade,
+                        finished_at: Optional[datetime] = None) -> bool:
+    """
+    Write a graded quiz: the registration update and all responses in one
+    batch. Returns False (writing nothing) if the quiz was already graded.
+    The caller commits.
+    """
+    result = await db.execute(
+        update(CampusDriveRegistration)
+        .where(
+            CampusDriveRegistration.id == session.registration_id,
+            CampusDriveRegistration.status == RegistrationStatus.QUIZ_IN_PROGRESS,
+        )
+        .values(**grade_values(grade, finished_at or datetime.utcnow()))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+    # Progress saved row by row before sessions existed
+    await db.execute(
+        delete(CampusDriveResponse).where(CampusDriveResponse.registration_id == session.registration_id)
+    )
+    if grade.responses:
+        await db.execute(insert(CampusDriveResponse).execution_options(render_nulls=True), grade.responses)
+    return True
+
+
+# ==================== Service ====================
+
+class QuizSessionService:
+    """
+    Question banks, taker sessions and in-progress answers.
+
+    Redis is optional: without it (or before start()) everything is kept in
+    this process.
+    """
+
+    def __init__(self):
+        self._redis = None
+        self._banks: Dict[str, Tuple[float, QuestionBank]] = {}
+        self._bank_loads: Dict[str, asyncio.Future] = {}
+        # Bumped on every bank invalidation; a load that raced one is not cached
+        self._generation = 0
+        self._pending: Set[asyncio.Task] = set()
+        # Fallback storage: key -> (expires at, unix time; value)
+        self._local_sessions: Dict[str, Tuple[float, str]] = {}
+        self._local_answers: Dict[str, Tuple[float, Dict[str, int]]] = {}
+        self.stats = {
+            "bank_hits": 0,
+            "bank_loads": 0,
+            "sessions_started": 0,
+            "sessions_rebuilt": 0,
+            "answers_saved": 0,
+            "graded": 0,
+            "late_submits": 0,
+            "auto_graded": 0,
+        }
+
+    async def start(self):
+        if self._redis is not None:
+            return
+        if aioredis is None or not settings.REDIS_URL:
+            logger.warning("[QuizSessions] redis.asyncio not available, quiz sessions are kept per worker")
+            return
+        try:
+            self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True, db=settings.REDIS_CACHE_DB)
+            await self._redis.ping()
+        except Exception as e:
+            logger.warning(f"[QuizSessions] Redis unavailable ({e}), quiz sessions are kept per worker")
+            self._redis = None
+            return
+        logger.info("[QuizSessions] Connected to Redis")
+
+    async def stop(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    # ========== Question banks ==========
+
+    async def get_bank(self, db: AsyncSession, drive_id: str) -> Optional[QuestionBank]:
+        """A drive's question bank; concurrent misses share one load"""
+        drive_id = str(drive_id)
+        entry = self._banks.get(drive_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.stats["bank_hits"] += 1
+            return entry[1]
+
+        pending = self._bank_loads.get(drive_id)
+        if pending is not None:
+            self.stats["bank_hits"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._bank_loads[drive_id] = future
+        try:
+            bank = await self._fetch_bank(db, drive_id)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: with no waiters, asyncio would log it
+            raise
+        else:
+            future.set_result(bank)
+            return bank
+        finally:
+            self._bank_loads.pop(drive_id, None)
+
+    async def _fetch_bank(self, db: AsyncSession, drive_id: str) -> Optional[QuestionBank]:
+        generation = self._generation
+        bank = None
+        data = await self._cache_get(f"{BANK_PREFIX}{drive_id}")
+        if data is not None:
+            try:
+                bank = QuestionBank.from_json(data)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"[QuizSessions] Discarding unreadable bank for drive {drive_id}: {e}")
+
+        if bank is None:
+            bank = await load_bank(db, drive_id)
+            self.stats["bank_loads"] += 1
+            if bank is None:
+                return None
+            if generation == self._generation:
+                await self._cache_set(f"{BANK_PREFIX}{drive_id}", bank.to_json())
+
+        if generation == self._generation:
+            self._banks[drive_id] = (time.monotonic() + settings.QUIZ_BANK_LOCAL_TTL_SECONDS, bank)
+        return bank
+
+    def invalidate_banks_local(self, drive_ids: Optional[Iterable[str]] = None):
+        """Drop this worker's banks (all of them when drive_ids is None)"""
+        self._generation += 1
+        if drive_ids is None:
+            self._banks.clear()
+        else:
+            for drive_id in drive_ids:
+                self._banks.pop(str(drive_id), None)
+
+    async def invalidate_banks(self, drive_ids: Optional[Iterable[str]] = None):
+        """Drop banks here and in Redis; other workers pick changes up within QUIZ_BANK_LOCAL_TTL_SECONDS"""
+        drive_ids = None if drive_ids is None else [str(d) for d in drive_ids]
+        self.invalidate_banks_local(drive_ids)
+        if self._redis is None:
+            return
+        try:
+            if drive_ids is None:
+                keys = [key async for key in self._redis.scan_iter(match=f"{BANK_PREFIX}*")]
+            else:
+                keys = [f"{BANK_PREFIX}{drive_id}" for drive_id in drive_ids]
+            if keys:
+                await self._redis.delete(*keys)
+        except Exception as e:
+            logger.warning(f"[QuizSessions] Redis bank invalidation failed: {e}")
+
+    def invalidate_banks_soon(self, drive_ids: Optional[Iterable[str]] = None):
+        """Invalidate from synchronous code (session events): local now, Redis in a task"""
+        drive_ids = None if drive_ids is None else list(drive_ids)
+        self.invalidate_banks_local(drive_ids)
+        if self._redis is None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self.invalidate_banks(drive_ids))
+        except RuntimeError:
+            # No loop (sync scripts, Celery): Redis entries expire on their TTL
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"[QuizSessions] Redis get failed: {e}")
+            return None
+
+    async def _cache_set(self, key: str, data: str):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, data, ex=settings.QUIZ_BANK_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"[QuizSessions] Redis set failed: {e}")
+
+    # ========== Sessions ==========
+
+    @staticmethod
+    def _session_key(drive_id: str, email: str) -> str:
+        return f"{KEY_PREFIX}session:{drive_id}:{email}"
+
+    @staticmethod
+    def _answers_key(registration_id: str) -> str:
+        return f"{KEY_PREFIX}answers:{registration_id}"
+
+    @staticmethod
+    def _expires_at(session: QuizSession) -> int:
+        return int((session.deadline - datetime.utcnow()).total_seconds() + time.time()) + settings.QUIZ_SESSION_GRACE_SECONDS
+
+    async def get_session(self, drive_id: str, email: str) -> Optional[QuizSession]:
+        """A stored session, without touching the database"""
+        key = self._session_key(drive_id, email)
+        if self._redis is not None:
+            data = await self._redis.get(key)
+        else:
+            entry = self._local_sessions.get(key)
+            data = entry[1] if entry is not None and entry[0] > time.time() else None
+        return QuizSession.from_json(data) if data is not None else None
+
+    async def save_session(self, session: QuizSession):
+        key = self._session_key(session.drive_id, session.email)
+        expires_at = self._expires_at(session)
+        if self._redis is not None:
+            await self._redis.set(key, session.to_json(), exat=expires_at)
+        else:
+            self._purge_local()
+            self._local_sessions[key] = (expires_at, session.to_json())
+
+    async def start_session(self, bank: QuestionBank, registration: CampusDriveRegistration,
+                            rebuilt: bool = False) -> QuizSession:
+        """Materialize and store a taker's session (quiz_start_time must be set)"""
+        session = materialize_session(bank, registration.id, registration.email, registration.quiz_start_time)
+        await self.save_session(session)
+        self.stats["sessions_rebuilt" if rebuilt else "sessions_started"] += 1
+        return session
+
+    async def open_session(self, db: AsyncSession, drive_id: str, email: str) -> Optional[QuizSession]:
+        """
+        The taker's session, rebuilt from the registration if it is in
+        progress but not stored (Redis restart, quiz started before sessions
+        existed). None if there is no quiz in progress.
+        """
+        session = await self.get_session(drive_id, email)
+        if session is not None:
+            return session
+
+        result = await db.execute(
+            select(CampusDriveRegistration).where(
+                CampusDriveRegistration.campus_drive_id == drive_id,
+                CampusDriveRegistration.email == email
+            )
+        )
+        registration = result.scalar_one_or_none()
+        if (registration is None or registration.status != RegistrationStatus.QUIZ_IN_PROGRESS
+                or not registration.quiz_start_time):
+            return None
+        bank = await self.get_bank(db, drive_id)
+        if bank is None:
+            return None
+
+        session = await self.start_session(bank, registration, rebuilt=True)
+        # Answers saved to the database by earlier progress saves
+        saved = await db.execute(
+            select(CampusDriveResponse.question_id, CampusDriveResponse.selected_option).where(
+                CampusDriveResponse.registration_id == registration.id
+            )
+        )
+        await self.save_answers(session, {str(qid): option for qid, option in saved.all()})
+        logger.info(f"[QuizSessions] Rebuilt session for registration {registration.id}")
+        return session
+
+    async def discard(self, *sessions: QuizSession):
+        """Forget graded sessions and their answers"""
+        session_keys = [self._session_key(s.drive_id, s.email) for s in sessions]
+        answer_keys = [self._answers_key(s.registration_id) for s in sessions]
+        if self._redis is not None:
+            if session_keys:
+                await self._redis.delete(*session_keys, *answer_keys)
+        else:
+            for key in session_keys:
+                self._local_sessions.pop(key, None)
+            for key in answer_keys:
+                self._local_answers.pop(key, None)
+
+    async def _stored_many(self, registrations: List[CampusDriveRegistration]) -> List[Tuple[Optional[str], Dict[str, int]]]:
+        """Stored session JSON and answers for each registration, in one Redis round trip"""
+        session_keys = [self._session_key(str(r.campus_drive_id), r.email) for r in registrations]
+        answer_keys = [self._answers_key(str(r.id)) for r in registrations]
+        if self._redis is None:
+            now = time.time()
+            stored = []
+            for session_key, answers_key in zip(session_keys, answer_keys):
+                entry = self._local_sessions.get(session_key)
+                answers = self._local_answers.get(answers_key)
+                stored.append((
+                    entry[1] if entry is not None and entry[0] > now else None,
+                    dict(answers[1]) if answers is not None else {},
+                ))
+            return stored
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for session_key, answers_key in zip(session_keys, answer_keys):
+                pipe.get(session_key)
+                pipe.hgetall(answers_key)
+            replies = await pipe.execute()
+        return [
+            (data, {qid: int(option) for qid, option in (answers or {}).items()})
+            for data, answers in zip(replies[::2], replies[1::2])
+        ]
+
+    # ========== Answers ==========
+
+    async def save_answers(self, session: QuizSession, answers: Dict[str, Optional[int]]) -> int:
+        """
+        Upsert answers (question id -> shown option position). Questions not
+        in the session and out-of-range options are ignored. Returns the
+        number stored.
+        """
+        valid = {item.question_id: len(item.order) for item in session.items}
+        mapping = {
+            str(qid): option for qid, option in answers.items()
+            if option is not None and 0 <= option < valid.get(str(qid), 0)
+        }
+        if not mapping:
+            return 0
+
+        key = self._answers_key(session.registration_id)
+        expires_at = self._expires_at(session)
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=mapping)
+                pipe.expireat(key, expires_at)
+                await pipe.execute()
+        else:
+            stored = self._local_answers.setdefault(key, (expires_at, {}))[1]
+            stored.update(mapping)
+        self.stats["answers_saved"] += len(mapping)
+        return len(mapping)
+
+    async def get_answers(self, session: QuizSession) -> Dict[str, int]:
+        key = self._answers_key(session.registration_id)
+        if self._redis is not None:
+            return {qid: int(option) for qid, option in (await self._redis.hgetall(key)).items()}
+        entry = self._local_answers.get(key)
+        return dict(entry[1]) if entry is not None else {}
+
+    def _purge_local(self):
+        now = time.time()
+        for store in (self._local_sessions, self._local_answers):
+            for key in [key for key, (expires_at, _) in store.items() if expires_at <= now]:
+                del store[key]
+
+    # ========== Grading ==========
+
+    async def grade(self, db: AsyncSession, session: QuizSession,
+                    final_answers: Optional[Dict[str, Optional[int]]] = None) -> Optional[QuizGrade]:
+        """
+        Grade a session from its saved answers (overridden by final_answers),
+        write the result and commit. None if it was already graded.
+
+        final_answers are ignored once QUIZ_SUBMIT_GRACE_SECONDS past the
+        deadline: the quiz is graded from progress saved in time.
+        """
+        now = datetime.utcnow()
+        finished_at = now
+        if now > session.deadline + timedelta(seconds=settings.QUIZ_SUBMIT_GRACE_SECONDS):
+            logger.warning(
+                f"[QuizSessions] Late submit for registration {session.registration_id} "
+                f"({int((now - session.deadline).total_seconds())}s past deadline), grading saved progress"
+            )
+            self.stats["late_submits"] += 1
+            final_answers = None
+            finished_at = session.deadline
+
+        answers = await self.get_answers(session)
+        answers.update({qid: option for qid, option in (final_answers or {}).items() if option is not None})
+        grade = grade_session(session, answers, answered_at=finished_at)
+        if not await record_result(db, session, grade, finished_at):
+            await db.rollback()
+            await self.discard(session)
+            return None
+        await db.commit()
+        await self.discard(session)
+        self.stats["graded"] += 1
+        await self._publish_results([result_event(session, grade, finished_at)])
+        return grade
+
+    async def sweep_expired(self, db: AsyncSession, now: Optional[datetime] = None,
+                            batch_size: Optional[int] = None) -> int:
+        """
+        Grade one batch of quizzes whose deadline (plus the submit grace)
+        passed without a submit, from their saved progress, and commit.
+
+        Rows are locked with SKIP LOCKED, so concurrent sweeps and submits
+        never grade a quiz twice. Returns the number of registrations taken
+        from the deadline index.
+        """
+        now = now or datetime.utcnow()
+        batch_size = batch_size or settings.QUIZ_SWEEP_BATCH_SIZE
+        result = await db.execute(
+            select(CampusDriveRegistration)
+            .where(
+                CampusDriveRegistration.quiz_deadline < now - timedelta(seconds=settings.QUIZ_SUBMIT_GRACE_SECONDS),
+                CampusDriveRegistration.status == RegistrationStatus.QUIZ_IN_PROGRESS,
+            )
+            .order_by(CampusDriveRegistration.quiz_deadline)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        registrations = result.scalars().all()
+        if not registrations:
+            return 0
+
+        stored = await self._stored_many(registrations)
+
+        # Sessions lost from the store are rebuilt; their answers come from
+        # rows saved before sessions existed
+        missing = [r.id for r, (data, _) in zip(registrations, stored) if data is None]
+        saved: Dict[str, Dict[str, int]] = {}
+        if missing:
+            rows = await db.execute(
+                select(
+                    CampusDriveResponse.registration_id,
+                    CampusDriveResponse.question_id,
+                    CampusDriveResponse.selected_option,
+                ).where(
+                    CampusDriveResponse.registration_id.in_(missing),
+                    CampusDriveResponse.selected_option.isnot(None),
+                )
+            )
+            for registration_id, question_id, option in rows.all():
+                saved.setdefault(str(registration_id), {})[str(question_id)] = option
+
+        sessions, updates, responses, events = [], [], [], []
+        for registration, (data, answers) in zip(registrations, stored):
+            if data is not None:
+                session = QuizSession.from_json(data)
+            else:
+                bank = await self.get_bank(db, registration.campus_drive_id)
+                if bank is None or not registration.quiz_start_time:
+                    logger.warning(f"[QuizSessions] Cannot grade registration {registration.id}, dropping its deadline")
+                    registration.quiz_deadline = None
+                    continue
+                session = materialize_session(bank, registration.id, registration.email, registration.quiz_start_time)
+                answers = {**saved.get(session.registration_id, {}), **answers}
+
+            grade = grade_session(session, answers, answered_at=session.deadline)
+            sessions.append(session)
+            updates.append({"id": registration.id, **grade_values(grade, session.deadline)})
+            responses.extend(grade.responses)
+            events.append(result_event(session, grade, session.deadline, auto_submitted=True))
+
+        # One executemany UPDATE by primary key (the rows are locked above),
+        # then responses are replaced with one DELETE and one batched INSERT
+        if sessions:
+            await db.execute(update(CampusDriveRegistration), updates)
+            await db.execute(
+                delete(CampusDriveResponse).where(
+                    CampusDriveResponse.registration_id.in_([s.registration_id for s in sessions])
+                )
+            )
+        if responses:
+            await db.execute(insert(CampusDriveResponse).execution_options(render_nulls=True), responses)
+        await db.commit()
+
+        await self.discard(*sessions)
+        self.stats["auto_graded"] += len(sessions)
+        await self._publish_results(events)
+        logger.info(f"[QuizSessions] Auto-graded {len(sessions)} expired quiz(zes)")
+        return len(registrations)
+
+    async def sweep(self, batch_size: Optional[int] = None) -> int:
+        """Grade every expired quiz, one batch per transaction (own sessions)"""
+        from app.core.database import AsyncSessionLocal
+
+        await self.start()
+        batch_size = batch_size or settings.QUIZ_SWEEP_BATCH_SIZE
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                try:
+                    swept = await self.sweep_expired(db, batch_size=batch_size)
+                except Exception:
+                    await db.rollback()
+                    raise
+            total += swept
+            if swept < batch_size:
+                return total
+
+    async def _publish_results(self, events: List[Dict[str, Any]]):
+        if self._redis is None or not events:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for payload in events:
+                    pipe.publish(settings.QUIZ_RESULTS_CHANNEL, json.dumps(payload))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"[QuizSessions] Publishing {len(events)} result event(s) failed: {e}")
+
+    def clear(self):
+        self.invalidate_banks_local()
+        self._local_sessions.clear()
+        self._local_answers.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "banks": len(self._banks),
+            "local_sessions": len(self._local_sessions),
+            "redis_enabled": self._redis is not None,
+            **self.stats,
+        }
+
+
+# Singleton instance
+quiz_sessions = QuizSessionService()
+
+
+# ==================== Bank invalidation on commit ====================
+
+@event.listens_for(Session, "after_flush")
+def _collect_bank_changes(session, flush_context):
+    drive_ids = set()
+    all_drives = False
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, CampusDrive):
+            drive_ids.add(str(obj.id))
+        elif isinstance(obj, CampusDriveQuestion):
+            if obj.is_global or obj.campus_drive_id is None:
+                all_drives = True
+            else:
+                drive_ids.add(str(obj.campus_drive_id))
+    if drive_ids or all_drives:
+        pending = session.info.setdefault("quiz_banks_changed", {"drives": set(), "all": False})
+        pending["drives"].update(drive_ids)
+        pending["all"] = pending["all"] or all_drives
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_banks(session):
+    pending = session.info.pop("quiz_banks_changed", None)
+    if pending:
+        quiz_sessions.invalidate_banks_soon(None if pending["all"] else pending["drives"])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_bank_changes(session, previous_transaction):
+    session.info.pop("quiz_banks_changed", None)
@@ -17,16 +17,34 @@ Users can:
 """
 
 import asyncio
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 import shutil
 import json
-from typing import Dict, Optional, List
+import time
+from typing import Dict, Optional, List, Set, Tuple, Any
 import os
 
 from app.core.logging_config import logger
 
 
+# Activity index persisted in the sandbox root so restarts don't need mtime walks
+ACTIVITY_INDEX_FILE = ".activity_index.json"
+
+# Marker written by protect_project()
+PROTECTED_MARKER = ".protected"
+
+# Heavy directories skipped when estimating activity of unindexed projects
+ACTIVITY_SKIP_DIRS = {
+    "node_modules", ".git", "dist", "build", ".next", ".nuxt", "__pycache__",
+    "venv", ".venv", "target", ".gradle", ".cache",
+}
+
+# Stale project sizes recomputed (off the event loop) per cleanup tick
+SIZE_REFRESH_PER_TICK = 20
+
+
 class SandboxCleanupService:
     """
     Automatic cleanup service for ephemeral project sandboxes.
@@ -36,6 +54,15 @@ class SandboxCleanupService:
     - Auto-deleted after idle timeout
     - No permanent storage by default
 
+    A tick never walks project trees on the event loop:
+    - Last activity comes from an index fed by touch_project() and sandbox
+      file writes (persisted to ACTIVITY_INDEX_FILE); projects missing from
+      it are estimated once with a walk that skips node_modules etc.
+    - Project sizes are cached and refreshed a few per tick in a thread
+    - Deletions go through a rate-limited pool of background workers, which
+      measure freed space while removing the tree
+    - Each deletion is published to metric subscribers as it completes
+
     Uses CENTRALIZED settings from config.py for all timeouts.
     """
 
@@ -45,6 +72,8 @@ class SandboxCleanupService:
         idle_timeout_minutes: int = None,
         cleanup_interval_minutes: int = None,
         min_project_age_minutes: int = None,
+        max_concurrent_deletions: int = None,
+        deletions_per_minute: int = None,
     ):
         # Import centralized settings
         from app.core.config import settings
@@ -60,18 +89,40 @@ class SandboxCleanupService:
         self.idle_timeout = timedelta(minutes=idle_timeout)
         self.cleanup_interval = timedelta(minutes=cleanup_interval)
         self.min_age = timedelta(minutes=min_age)
+        self.size_cache_ttl = timedelta(minutes=settings.SANDBOX_SIZE_CACHE_MINUTES)
+
+        self.max_concurrent_deletions = max_concurrent_deletions or settings.SANDBOX_CLEANUP_WORKERS
+        self.deletions_per_minute = deletions_per_minute or settings.SANDBOX_CLEANUP_DELETIONS_PER_MINUTE
 
         self.running = False
         self._task: Optional[asyncio.Task] = None
 
-        # Track active sessions (project_id -> last_activity)
+        # Activity index (project_id -> last_activity)
         self._active_sessions: Dict[str, datetime] = {}
+        self._index_loaded = False
+        self._index_dirty = False
+
+        # Cached project sizes (project_id -> (computed_at, bytes))
+        self._size_cache: Dict[str, Tuple[datetime, int]] = {}
+
+        # Deletion pool
+        self._delete_queue: Optional[asyncio.Queue] = None
+        self._pending_deletions: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self._last_deletion_started = 0.0
+
+        # Metric subscribers (see subscribe_metrics)
+        self._subscribers: List[asyncio.Queue] = []
+        self.recent_deletions: deque = deque(maxlen=100)
 
         # Cleanup stats
         self.stats = {
             "total_cleaned": 0,
             "last_cleanup": None,
             "space_freed_mb": 0,
+            "deletion_errors": 0,
+            "last_tick_ms": 0,
         }
 
     async def start(self):
@@ -81,8 +132,13 @@ class SandboxCleanupService:
             return
 
         self.running = True
+        await self._load_index()
+        self._ensure_workers()
         self._task = asyncio.create_task(self._cleanup_loop())
-        logger.info(f"[SandboxCleanup] Started - Idle timeout: {self.idle_timeout}, Interval: {self.cleanup_interval}")
+        logger.info(
+            f"[SandboxCleanup] Started - Idle timeout: {self.idle_timeout}, Interval: {self.cleanup_interval}, "
+            f"Workers: {self.max_concurrent_deletions}, Rate: {self.deletions_per_minute}/min"
+        )
 
     async def stop(self):
         """Stop the cleanup service"""
@@ -93,6 +149,15 @@ class SandboxCleanupService:
                 await self._task
             except asyncio.CancelledError:
                 pass
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._delete_queue = None
+        self._pending_deletions.clear()
+
+        await self._save_index()
         logger.info("[SandboxCleanup] Stopped")
 
     async def _cleanup_loop(self):
@@ -107,44 +172,55 @@ class SandboxCleanupService:
 
     async def cleanup_old_projects(self) -> Dict:
         """
-        Delete projects that have been idle longer than the timeout.
+        Queue projects that have been idle longer than the timeout for deletion.
+
+        Deletion itself happens on the background worker pool; results are
+        reported through stats, recent_deletions and metric subscribers.
+        Call wait_for_deletions() to block until the queue drains.
 
         Returns:
             Dict with cleanup results
         """
-        if not self.sandbox_path.exists():
+        if not await asyncio.to_thread(self.sandbox_path.exists):
             logger.debug(f"[SandboxCleanup] Sandbox path doesn't exist: {self.sandbox_path}")
-            return {"deleted": 0, "skipped": 0, "errors": 0}
+            return {"queued": [], "deleted": [], "skipped": [], "errors": []}
+
+        tick_start = time.monotonic()
+        await self._load_index()
+        self._ensure_workers()
 
         now = datetime.now()
         results = {
+            "queued": [],
             "deleted": [],
             "skipped": [],
             "errors": [],
-            "space_freed_bytes": 0,
         }
 
-        for project_dir in self.sandbox_path.iterdir():
-            if not project_dir.is_dir():
-                continue
+        # One scandir of the sandbox root; no per-project tree walks
+        entries = await asyncio.to_thread(self._scan_projects)
 
-            project_id = project_dir.name
+        unindexed = [name for name, _, _ in entries if name not in self._active_sessions]
+        if unindexed:
+            estimated = await asyncio.to_thread(
+                lambda: {name: self._estimate_last_activity(self.sandbox_path / name) for name in unindexed}
+            )
+            self._active_sessions.update(estimated)
+            self._index_dirty = True
 
+        for project_id, dir_mtime, protected in entries:
             try:
-                # Check if project has active session
-                if project_id in self._active_sessions:
-                    last_activity = self._active_sessions[project_id]
-                    if now - last_activity < self.idle_timeout:
-                        results["skipped"].append({
-                            "id": project_id,
-                            "reason": "active_session",
-                            "last_activity": last_activity.isoformat()
-                        })
-                        continue
+                if protected:
+                    results["skipped"].append({"id": project_id, "reason": "protected"})
+                    continue
+
+                if project_id in self._pending_deletions:
+                    results["skipped"].append({"id": project_id, "reason": "deletion_pending"})
+                    continue
 
-                # Check file system last modified time
-                mtime = self._get_last_modified(project_dir)
-                age = now - mtime
+                # Directory mtime is a cheap lower bound for writes the index missed
+                last_activity = max(self._active_sessions[project_id], dir_mtime)
+                age = now - last_activity
 
                 # Skip if too young
                 if age < self.min_age:
@@ -157,26 +233,12 @@ class SandboxCleanupService:
 
                 # Check if idle timeout exceeded
                 if age > self.idle_timeout:
-                    # Calculate size before deletion
-                    size_bytes = self._get_dir_size(project_dir)
-
-                    # Stop any running Docker containers for this project
-                    await self._stop_project_containers(project_id)
-
-                    # Delete the project
-                    shutil.rmtree(project_dir)
-
-                    # Remove from active sessions if present
-                    self._active_sessions.pop(project_id, None)
-
-                    results["deleted"].append({
+                    self._pending_deletions.add(project_id)
+                    self._delete_queue.put_nowait(project_id)
+                    results["queued"].append({
                         "id": project_id,
                         "age_minutes": age.total_seconds() / 60,
-                        "size_mb": size_bytes / (1024 * 1024)
                     })
-                    results["space_freed_bytes"] += size_bytes
-
-                    logger.info(f"[SandboxCleanup] Deleted: {project_id} (age: {age.total_seconds() / 60:.1f}min, size: {size_bytes / 1024 / 1024:.2f} MB)")
                 else:
                     results["skipped"].append({
                         "id": project_id,
@@ -192,21 +254,274 @@ class SandboxCleanupService:
                     "error": str(e)
                 })
 
+        # Refresh a few stale size estimates off the event loop
+        live = {name for name, _, _ in entries}
+        await self._refresh_sizes(live)
+        for project_id in list(self._active_sessions):
+            if project_id not in live and project_id not in self._pending_deletions:
+                del self._active_sessions[project_id]
+                self._size_cache.pop(project_id, None)
+                self._index_dirty = True
+        await self._save_index()
+
         # Update stats
-        self.stats["total_cleaned"] += len(results["deleted"])
         self.stats["last_cleanup"] = now.isoformat()
-        self.stats["space_freed_mb"] += results["space_freed_bytes"] / (1024 * 1024)
-
-        if results["deleted"]:
+        self.stats["last_tick_ms"] = (time.monotonic() - tick_start) * 1000
+
+        self._emit({
+            "event": "tick",
+            "projects": len(entries),
+            "queued": len(results["queued"]),
+            "skipped": len(results["skipped"]),
+            "errors": len(results["errors"]),
+            "pending_deletions": len(self._pending_deletions),
+            "duration_ms": self.stats["last_tick_ms"],
+        })
+
+        if results["queued"]:
             logger.info(
-                f"[SandboxCleanup] Cleanup complete: "
-                f"{len(results['deleted'])} deleted, "
+                f"[SandboxCleanup] Tick complete: "
+                f"{len(results['queued'])} queued for deletion, "
                 f"{len(results['skipped'])} skipped, "
-                f"{results['space_freed_bytes'] / 1024 / 1024:.2f} MB freed"
+                f"{self.stats['last_tick_ms']:.0f} ms"
             )
 
         return results
 
+    async def wait_for_deletions(self):
+        """Block until every queued deletion has finished"""
+        if self._delete_queue is not None:
+            await self._delete_queue.join()
+
+    # ==================== Deletion pool ====================
+
+    def _ensure_workers(self):
+        """Start deletion workers on first use"""
+        if self._workers:
+            return
+        self._delete_queue = asyncio.Queue()
+        self._rate_lock = asyncio.Lock()
+        self._workers = [
+            asyncio.create_task(self._deletion_worker())
+            for _ in range(self.max_concurrent_deletions)
+        ]
+
+    async def _deletion_worker(self):
+        """Delete queued projects one at a time"""
+        while True:
+            project_id = await self._delete_queue.get()
+            try:
+                await self._delete_project(project_id)
+            except Exception as e:
+                logger.error(f"[SandboxCleanup] Deletion worker error for {project_id}: {e}")
+            finally:
+                self._pending_deletions.discard(project_id)
+                self._delete_queue.task_done()
+
+    async def _wait_for_rate_limit(self):
+        """Space deletion starts so EFS isn't hammered by bulk removals"""
+        async with self._rate_lock:
+            interval = 60.0 / self.deletions_per_minute
+            wait = self._last_deletion_started + interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_deletion_started = time.monotonic()
+
+    async def _delete_project(self, project_id: str):
+        """Stop a project's containers and remove its sandbox directory"""
+        await self._wait_for_rate_limit()
+
+        # The project may have been touched while it waited in the queue
+        last_activity = self._active_sessions.get(project_id)
+        if last_activity and datetime.now() - last_activity < self.idle_timeout:
+            self._emit({"event": "deletion_skipped", "id": project_id, "reason": "touched_while_queued"})
+            return
+
+        project_dir = self.sandbox_path / project_id
+        started = time.monotonic()
+        try:
+            # Stop any running Docker containers for this project
+            await self._stop_project_containers(project_id)
+
+            # Delete the project, measuring freed space on the way
+            size_bytes = await asyncio.to_thread(self._remove_tree, project_dir)
+        except Exception as e:
+            self.stats["deletion_errors"] += 1
+            logger.error(f"[SandboxCleanup] Failed to delete {project_id}: {e}")
+            self._emit({"event": "deletion_failed", "id": project_id, "error": str(e)})
+            return
+
+        # Remove from activity index
+        age = datetime.now() - last_activity if last_activity else None
+        self._active_sessions.pop(project_id, None)
+        self._size_cache.pop(project_id, None)
+        self._index_dirty = True
+
+        record = {
+            "id": project_id,
+            "age_minutes": age.total_seconds() / 60 if age else None,
+            "size_mb": size_bytes / (1024 * 1024),
+            "duration_ms": (time.monotonic() - started) * 1000,
+            "deleted_at": datetime.now().isoformat(),
+        }
+        self.recent_deletions.append(record)
+        self.stats["total_cleaned"] += 1
+        self.stats["space_freed_mb"] += record["size_mb"]
+        self._emit({"event": "deleted", **record})
+
+        logger.info(f"[SandboxCleanup] Deleted: {project_id} (size: {record['size_mb']:.2f} MB, {record['duration_ms']:.0f} ms)")
+
+    @staticmethod
+    def _remove_tree(path: Path) -> int:
+        """Remove a directory tree bottom-up, returning the bytes freed"""
+        if not path.exists():
+            return 0
+
+        freed = 0
+        try:
+            for dirpath, dirnames, filenames in os.walk(path, topdown=False):
+                for name in filenames:
+                    file_path = os.path.join(dirpath, name)
+                    try:
+                        freed += os.lstat(file_path).st_size
+                        os.unlink(file_path)
+                    except FileNotFoundError:
+                        pass
+                for name in dirnames:
+                    dir_path = os.path.join(dirpath, name)
+                    if os.path.islink(dir_path):
+                        os.unlink(dir_path)
+                    else:
+                        os.rmdir(dir_path)
+            os.rmdir(path)
+        except OSError:
+            # Permission quirks etc. - let shutil deal with what is left
+            shutil.rmtree(path, ignore_errors=False)
+        return freed
+
+    # ==================== Metrics ====================
+
+    def subscribe_metrics(self, maxsize: int = 1000) -> asyncio.Queue:
+        """
+        Receive cleanup metrics as they happen.
+
+        Events: {"event": "tick", ...}, {"event": "deleted", ...},
+        {"event": "deletion_failed", ...}, {"event": "deletion_skipped", ...}
+        """
+        subscriber = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe_metrics(self, subscriber: asyncio.Queue):
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def _emit(self, metric: Dict[str, Any]):
+        """Publish a metric to subscribers; slow subscribers drop events"""
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(metric)
+            except asyncio.QueueFull:
+                pass
+
+    # ==================== Activity index ====================
+
+    def _index_path(self) -> Path:
+        return self.sandbox_path / ACTIVITY_INDEX_FILE
+
+    async def _load_index(self):
+        """Load the persisted activity index once"""
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+
+        def load() -> Dict[str, str]:
+            try:
+                return json.loads(self._index_path().read_text())
+            except (OSError, ValueError):
+                return {}
+
+        for project_id, timestamp in (await asyncio.to_thread(load)).items():
+            try:
+                last_activity = datetime.fromisoformat(timestamp)
+            except (TypeError, ValueError):
+                continue
+            if last_activity > self._active_sessions.get(project_id, datetime.min):
+                self._active_sessions[project_id] = last_activity
+
+    async def _save_index(self):
+        """Persist the activity index atomically if it changed"""
+        if not self._index_dirty:
+            return
+        self._index_dirty = False
+        snapshot = {project_id: ts.isoformat() for project_id, ts in self._active_sessions.items()}
+
+        def save():
+            if not self.sandbox_path.exists():
+                return
+            tmp = self._index_path().with_suffix(".tmp")
+            tmp.write_text(json.dumps(snapshot))
+            os.replace(tmp, self._index_path())
+
+        try:
+            await asyncio.to_thread(save)
+        except OSError as e:
+            self._index_dirty = True
+            logger.warning(f"[SandboxCleanup] Could not persist activity index: {e}")
+
+    def _scan_projects(self) -> List[Tuple[str, datetime, bool]]:
+        """(project_id, directory mtime, protected) for each sandbox entry"""
+        entries = []
+        with os.scandir(self.sandbox_path) as it:
+            for entry in it:
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    mtime = datetime.fromtimestamp(entry.stat().st_mtime)
+                except OSError:
+                    continue
+                protected = os.path.exists(os.path.join(entry.path, PROTECTED_MARKER))
+                entries.append((entry.name, mtime, protected))
+        return entries
+
+    def _estimate_last_activity(self, path: Path) -> datetime:
+        """
+        Newest mtime in a project, skipping dependency/build directories.
+
+        Only used for projects missing from the activity index (created
+        before it existed or outside this process).
+        """
+        try:
+            latest = path.stat().st_mtime
+        except OSError:
+            return datetime.now()
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if d not in ACTIVITY_SKIP_DIRS]
+            for name in filenames:
+                try:
+                    latest = max(latest, os.stat(os.path.join(dirpath, name)).st_mtime)
+                except OSError:
+                    pass
+        return datetime.fromtimestamp(latest)
+
+    async def _refresh_sizes(self, live: Set[str]):
+        """Recompute a bounded number of missing/stale cached sizes"""
+        now = datetime.now()
+        stale = [
+            project_id for project_id in live
+            if project_id not in self._pending_deletions
+            and (project_id not in self._size_cache or now - self._size_cache[project_id][0] > self.size_cache_ttl)
+        ][:SIZE_REFRESH_PER_TICK]
+        if not stale:
+            return
+
+        sizes = await asyncio.to_thread(
+            lambda: {project_id: self._get_dir_size(self.sandbox_path / project_id) for project_id in stale}
+        )
+        for project_id, size in sizes.items():
+            self._size_cache[project_id] = (now, size)
+
     def touch_project(self, project_id: str):
         """
         Mark a project as active (reset its idle timer).
@@ -217,15 +532,21 @@ class SandboxCleanupService:
         - Commands are executed
         """
         self._active_sessions[project_id] = datetime.now()
+        self._index_dirty = True
 
-        # Also update the filesystem mtime
-        project_path = self.sandbox_path / project_id
-        if project_path.exists():
-            try:
-                # Touch the directory to update mtime
-                project_path.touch()
-            except Exception:
-                pass
+    def touch_path(self, path: Path):
+        """
+        Mark the sandbox entry containing `path` as active.
+
+        Called after sandbox file writes; no filesystem access.
+        """
+        try:
+            relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.sandbox_path))
+        except ValueError:
+            return  # Different drive on Windows
+        top = relative.split(os.sep, 1)[0]
+        if top and top not in (".", ".."):
+            self.touch_project(top)
 
     def get_project_expiry(self, project_id: str) -> Optional[Dict]:
         """
@@ -240,11 +561,13 @@ class SandboxCleanupService:
 
         now = datetime.now()
 
-        # Check active session first
+        # Check activity index first
         if project_id in self._active_sessions:
             last_activity = self._active_sessions[project_id]
         else:
-            last_activity = self._get_last_modified(project_path)
+            last_activity = self._estimate_last_activity(project_path)
+            self._active_sessions[project_id] = last_activity
+            self._index_dirty = True
 
         age = now - last_activity
         expires_at = last_activity + self.idle_timeout
@@ -295,50 +618,30 @@ class SandboxCleanupService:
             logger.info(f"[SandboxCleanup] Protected project: {project_id}")
 
     def get_stats(self) -> Dict:
-        """Get cleanup statistics"""
-        # Count current projects
-        project_count = 0
-        total_size = 0
-
-        if self.sandbox_path.exists():
-            for project_dir in self.sandbox_path.iterdir():
-                if project_dir.is_dir():
-                    project_count += 1
-                    total_size += self._get_dir_size(project_dir)
-
+        """Get cleanup statistics (sizes come from the cache, never a walk)"""
         return {
             **self.stats,
-            "current_projects": project_count,
-            "current_size_mb": total_size / (1024 * 1024),
-            "active_sessions": len(self._active_sessions),
+            "current_projects": len(self._active_sessions),
+            "current_size_mb": sum(size for _, size in self._size_cache.values()) / (1024 * 1024),
+            "sized_projects": len(self._size_cache),
+            "pending_deletions": len(self._pending_deletions),
+            "active_sessions": sum(
+                1 for ts in self._active_sessions.values()
+                if datetime.now() - ts < self.idle_timeout
+            ),
             "sandbox_path": str(self.sandbox_path),
             "idle_timeout_minutes": self.idle_timeout.total_seconds() / 60,
         }
 
-    def _get_last_modified(self, path: Path) -> datetime:
-        """Get the most recent modification time of a directory tree"""
-        latest = datetime.fromtimestamp(path.stat().st_mtime)
-
-        try:
-            for item in path.rglob("*"):
-                if item.is_file():
-                    mtime = datetime.fromtimestamp(item.stat().st_mtime)
-                    if mtime > latest:
-                        latest = mtime
-        except Exception:
-            pass
-
-        return latest
-
     def _get_dir_size(self, path: Path) -> int:
-        """Get total size of directory in bytes"""
+        """Get total size of directory in bytes (blocking - run in a thread)"""
         total = 0
-        try:
-            for item in path.rglob("*"):
-                if item.is_file():
-                    total += item.stat().st_size
-        except Exception:
-            pass
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
         return total
 
     async def _stop_project_containers(self, project_id: str):
@@ -349,6 +652,10 @@ class SandboxCleanupService:
         - Containers named after the project_id
         - Docker Compose services for the project
         """
+        # docker CLI calls block - run them off the event loop
+        await asyncio.to_thread(self._stop_project_containers_sync, project_id)
+
+    def _stop_project_containers_sync(self, project_id: str):
         import subprocess
 
         try:
@@ -418,6 +725,11 @@ def touch_project(project_id: str):
     sandbox_cleanup.touch_project(project_id)
 
 
+def touch_path(path: Path):
+    """Touch the project containing a sandbox path (after file writes)"""
+    sandbox_cleanup.touch_path(path)
+
+
 def get_project_expiry(project_id: str):
     """Get project expiry info"""
     return sandbox_cleanup.get_project_expiry(project_id)
@@ -20,7 +20,7 @@ Usage:
     # Store plan
     storage.write_plan(session_id, plan_dict)
 
-    # Generate ZIP for download
+    # Generate ZIP for download (or stream it: storage.stream_zip(session_id))
     zip_path = storage.create_zip(session_id)
 
     # Cleanup after download
@@ -37,11 +37,12 @@ import aiofiles
 import aiofiles.os
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
 from dataclasses import dataclass, field
 import threading
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.utils.zip_stream import ZipEntry, stream_zip, walk_files
 
 # Configuration - loaded from settings (can be overridden via .env)
 TEMP_BASE_DIR = Path("/tmp/bharatbuild_sessions")
@@ -368,16 +369,7 @@ class TempSessionStorage:
             return None
 
         zip_path = self._get_zip_path(session_id)
-
-        # Get project name for ZIP root folder
-        if not project_name:
-            metadata = self.get_session_info(session_id)
-            project_name = metadata.project_name if metadata else "project"
-
-        project_name = project_name or "project"
-        # Sanitize project name for filesystem
-        project_name = "".join(c for c in project_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        project_name = project_name or "project"
+        project_name = self._zip_root_name(session_id, project_name)
 
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for file_path in files_path.rglob('*'):
@@ -394,6 +386,37 @@ class TempSessionStorage:
         logger.info(f"Created ZIP for session {session_id}: {zip_path}")
         return zip_path
 
+    def stream_zip(self, session_id: str, project_name: Optional[str] = None) -> Optional[Iterator[bytes]]:
+        """
+        ZIP of all session files, generated while it is sent (no ZIP on disk).
+
+        Returns:
+            Iterator of ZIP bytes, or None if the session has no files
+        """
+        files_path = self._get_files_path(session_id)
+
+        if not files_path.exists():
+            logger.error(f"No files found for session {session_id}")
+            return None
+
+        root = self._zip_root_name(session_id, project_name)
+        entries = (
+            ZipEntry.from_file(f"{root}/{rel}", path, stat)
+            for rel, path, stat in walk_files(files_path)
+        )
+        return stream_zip(entries)
+
+    def _zip_root_name(self, session_id: str, project_name: Optional[str]) -> str:
+        """Sanitized project name used as the ZIP root folder"""
+        if not project_name:
+            metadata = self.get_session_info(session_id)
+            project_name = metadata.project_name if metadata else "project"
+
+        project_name = project_name or "project"
+        # Sanitize project name for filesystem
+        project_name = "".join(c for c in project_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        return project_name or "project"
+
     def get_zip_path(self, session_id: str) -> Optional[Path]:
         """Get path to existing ZIP file"""
         zip_path = self._get_zip_path(session_id)
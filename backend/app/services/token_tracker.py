@@ -38,6 +38,7 @@ from app.models.usage import (
     AgentType,
     OperationType
 )
+from app.services.usage_rollup_service import usage_rollup_service
 
 
 class TokenTracker:
@@ -100,6 +101,9 @@ class TokenTracker:
             )
 
             db.add(transaction)
+            await db.flush()
+            # Admin analytics buckets, committed together with the log row
+            await usage_rollup_service.apply(db, [transaction])
             await db.commit()
             await db.refresh(transaction)
 
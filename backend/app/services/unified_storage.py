@@ -34,6 +34,8 @@ from dataclasses import dataclass, field
 from uuid import UUID
 
 from app.services.storage_service import storage_service
+from app.services.sandbox_cleanup import touch_path
+from app.modules.automation.context_snapshot import notify_file_written
 from app.core.config import settings
 from app.core.logging_config import logger
 
@@ -406,7 +408,10 @@ class UnifiedStorageService:
             if sandbox_docker_host:
                 # Write to REMOTE EC2 sandbox using Docker
                 logger.debug(f"[Sandbox] Using remote EC2 sandbox: {sandbox_docker_host}")
-                return await self._write_to_remote_sandbox(project_id, file_path, content, user_id)
+                written = await self._write_to_remote_sandbox(project_id, file_path, content, user_id)
+                if written:
+                    notify_file_written(self.sandbox_path / (user_id or "") / project_id / file_path)
+                return written
 
             # Local sandbox (ECS or development)
             sandbox = self.get_sandbox_path(project_id, user_id)
@@ -415,6 +420,8 @@ class UnifiedStorageService:
 
             with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            touch_path(full_path)  # Keep the cleanup activity index current
+            notify_file_written(full_path)  # Refresh cached fixer context scans
 
             logger.info(f"[Sandbox] ✓ Wrote to local sandbox: {user_id or 'anon'}/{project_id}/{file_path} ({len(content)} bytes)")
             return True
@@ -468,7 +475,10 @@ class UnifiedStorageService:
             if sandbox_docker_host:
                 # Write to REMOTE EC2 sandbox using Docker (SYNC version)
                 logger.debug(f"[SandboxSync] Using remote EC2 sandbox: {sandbox_docker_host}")
-                return self._write_to_remote_sandbox_sync(project_id, file_path, content, user_id)
+                written = self._write_to_remote_sandbox_sync(project_id, file_path, content, user_id)
+                if written:
+                    notify_file_written(self.sandbox_path / (user_id or "") / project_id / file_path)
+                return written
 
             # Local sandbox (ECS or development)
             sandbox = self.get_sandbox_path(project_id, user_id)
@@ -477,6 +487,8 @@ class UnifiedStorageService:
 
             with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            touch_path(full_path)  # Keep the cleanup activity index current
+            notify_file_written(full_path)  # Refresh cached fixer context scans
 
             logger.info(f"[SandboxSync] ✓ Wrote to local sandbox: {user_id or 'anon'}/{project_id}/{file_path} ({len(content)} bytes)")
             return True
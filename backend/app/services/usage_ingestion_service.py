@@ -0,0 +1,399 @@
+"""
+Usage Ingestion Service
+=======================
+Batched, asynchronous writer for per-call token usage.
+
+Claude calls made during generation used to commit one TokenUsageLog row
+(plus a project UPDATE) each, from fire-and-forget tasks. Calls are now
+recorded into a bounded in-process buffer and a single flusher task writes
+them in batches:
+
+- one multi-row INSERT into token_usage_logs per batch
+- the matching usage_rollups increments (same transaction)
+- one UPDATE applying all projects.total_tokens deltas
+- one UPDATE (plus an INSERT for new rows) applying per-user daily
+  token_usage deltas used by the monthly limit checks
+
+token_usage.total_requests counts generation runs, not API calls: it goes
+up once per model used in a run, queued by record_run() when the run
+finalizes. Per-call records only add tokens.
+
+A batch is written once USAGE_INGEST_BATCH_SIZE records are waiting or
+USAGE_INGEST_FLUSH_MS after the first one arrived, whichever comes first.
+stop() drains everything still buffered (called from the app lifespan).
+
+Usage:
+    usage_ingestion_service.record(
+        user_id=user_id,
+        project_id=project_id,
+        agent_type=AgentType.WRITER,
+        operation=OperationType.GENERATE_FILE,
+        model="haiku",
+        input_tokens=1000,
+        output_tokens=2000,
+        file_path="src/App.tsx"
+    )
+    usage_ingestion_service.record_run(user_id, ["haiku", "sonnet"])
+    await usage_ingestion_service.flush()   # optional: write now
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, update, insert, case, and_, func
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.types import generate_uuid
+from app.models.project import Project
+from app.models.usage import TokenUsageLog, TokenUsage, AgentType, OperationType
+from app.services.usage_rollup_service import usage_rollup_service
+
+# A batch that fails this many times is dropped (e.g. it references a deleted user)
+MAX_FLUSH_ATTEMPTS = 3
+
+
+class UsageIngestionService:
+    """
+    Bounded buffer of usage records with a background batch flusher.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue: Optional[int] = None
+    ):
+        self.batch_size = batch_size or settings.USAGE_INGEST_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.USAGE_INGEST_FLUSH_MS / 1000
+        self.max_queue = max_queue or settings.USAGE_INGEST_MAX_QUEUE
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._pending: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed_flushes": 0,
+            "flushes": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+            "max_queue_depth": 0,
+        }
+
+    # ==================== Lifecycle ====================
+
+    async def start(self):
+        """Start the flusher task on the running loop (idempotent)"""
+        self._ensure_started()
+        logger.info(
+            f"[UsageIngestion] Flusher started (batch={self.batch_size}, "
+            f"interval={self.flush_interval * 1000:.0f}ms, max_queue={self.max_queue})"
+        )
+
+    async def stop(self):
+        """Stop the flusher and write everything still buffered"""
+        if self._task:
+            # Cancel between batches so no popped batch is lost mid-write
+            async with self._lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._buffer:
+            await self.flush()
+        logger.info(f"[UsageIngestion] Flusher stopped: {self.get_stats()}")
+
+    def _ensure_started(self):
+        """Start lazily for callers outside the app lifespan (scripts, workers)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._pending = asyncio.Event()
+            self._full = asyncio.Event()
+            self._lock = asyncio.Lock()
+            if self._buffer:
+                self._pending.set()
+            self._task = loop.create_task(self._run())
+
+    # ==================== Producer ====================
+
+    def record(
+        self,
+        user_id: str,
+        project_id: Optional[str],
+        agent_type: AgentType,
+        operation: OperationType,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        file_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Buffer one usage record (non-blocking).
+
+        Returns:
+            False if the buffer is full and the record was dropped
+        """
+        return self._enqueue({
+            "id": generate_uuid(),
+            "user_id": str(user_id) if user_id else None,
+            "project_id": str(project_id) if project_id else None,
+            "agent_type": agent_type,
+            "operation": operation,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "cost_paise": TokenUsageLog.calculate_cost_paise(input_tokens, output_tokens, model),
+            "file_path": file_path,
+            "error_message": None,
+            "extra_data": metadata,
+            "created_at": datetime.utcnow(),
+        }, f"{input_tokens + output_tokens} tokens")
+
+    def record_run(self, user_id: str, models: Iterable[str]) -> bool:
+        """
+        Count one request per model used by a finished run (non-blocking).
+
+        Adds to token_usage.total_requests only; no log row is written.
+
+        Returns:
+            False if the buffer is full and any count was dropped
+        """
+        queued = True
+        for model in dict.fromkeys(models):
+            queued = self._enqueue({
+                "_requests": 1,
+                "user_id": str(user_id) if user_id else None,
+                "model": model,
+                "created_at": datetime.utcnow(),
+            }, f"a {model} request count") and queued
+        return queued
+
+    def _enqueue(self, row: Dict[str, Any], description: str) -> bool:
+        if len(self._buffer) >= self.max_queue:
+            self.stats["dropped"] += 1
+            logger.error(
+                f"[UsageIngestion] Buffer full ({self.max_queue}), dropped "
+                f"{description} for user {row['user_id']}"
+            )
+            return False
+
+        self._buffer.append(row)
+        self.stats["recorded"] += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._buffer))
+
+        self._ensure_started()
+        if self._pending is not None:
+            self._pending.set()
+            if len(self._buffer) >= self.batch_size:
+                self._full.set()
+        return True
+
+    # ==================== Flusher ====================
+
+    async def _run(self):
+        while True:
+            await self._pending.wait()
+            if len(self._buffer) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            try:
+                written = await self.flush()
+            except Exception as e:
+                logger.error(f"[UsageIngestion] Flush loop error: {e}")
+                written = 0
+            if self._buffer and not written:
+                # Database unavailable: back off instead of retrying in a tight loop
+                await asyncio.sleep(self.flush_interval)
+
+    async def flush(self) -> int:
+        """
+        Write every buffered record now, in batches of batch_size.
+
+        Returns:
+            Number of records written
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        written = 0
+        async with self._lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                if await self._write_batch(batch):
+                    written += len(batch)
+                else:
+                    self._requeue(batch)
+                    break
+
+            if not self._buffer and self._pending is not None:
+                self._pending.clear()
+            if len(self._buffer) < self.batch_size and self._full is not None:
+                self._full.clear()
+        return written
+
+    def _requeue(self, batch: List[Dict[str, Any]]):
+        """Put a failed batch back at the front, dropping it after MAX_FLUSH_ATTEMPTS"""
+        retry = []
+        for row in batch:
+            row["_attempts"] = row.get("_attempts", 0) + 1
+            if row["_attempts"] < MAX_FLUSH_ATTEMPTS:
+                retry.append(row)
+        dropped = len(batch) - len(retry)
+        room = max(0, self.max_queue - len(self._buffer))
+        dropped += max(0, len(retry) - room)
+        self._buffer[:0] = retry[:room]
+        if dropped:
+            self.stats["dropped"] += dropped
+            logger.error(f"[UsageIngestion] Dropped {dropped} usage records after repeated flush failures")
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        from app.core.database import AsyncSessionLocal
+
+        start = time.perf_counter()
+        # record_run() counts carry no log row
+        rows = [
+            {k: v for k, v in row.items() if not k.startswith("_")}
+            for row in batch if "_requests" not in row
+        ]
+        try:
+            async with AsyncSessionLocal() as db:
+                try:
+                    if rows:
+                        await db.execute(insert(TokenUsageLog), rows)
+                        # Admin analytics buckets, committed together with the log rows
+                        await usage_rollup_service.apply(db, [TokenUsageLog(**row) for row in rows])
+                        await self._apply_project_totals(db, rows)
+                    await self._apply_user_totals(db, batch)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+        except Exception as e:
+            self.stats["failed_flushes"] += 1
+            logger.error(f"[UsageIngestion] Failed to write {len(batch)} usage records: {e}")
+            return False
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats["flushes"] += 1
+        self.stats["written"] += len(batch)
+        self.stats["last_flush_ms"] = round(elapsed_ms, 2)
+        self.stats["max_flush_ms"] = round(max(self.stats["max_flush_ms"], elapsed_ms), 2)
+        self.stats["total_flush_ms"] += elapsed_ms
+        logger.debug(f"[UsageIngestion] Wrote {len(batch)} usage records in {elapsed_ms:.1f}ms")
+        return True
+
+    async def _apply_project_totals(self, db, rows: List[Dict[str, Any]]):
+        """projects.total_tokens += delta for every project in the batch (one UPDATE)"""
+        deltas: Dict[str, int] = defaultdict(int)
+        for row in rows:
+            if row["project_id"]:
+                deltas[row["project_id"]] += row["total_tokens"]
+        if not deltas:
+            return
+
+        await db.execute(
+            update(Project)
+            .where(Project.id.in_(list(deltas)))
+            .values(total_tokens=func.coalesce(Project.total_tokens, 0) + case(deltas, value=Project.id, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _apply_user_totals(self, db, rows: List[Dict[str, Any]]):
+        """Add the batch to each user's daily token_usage row (one UPDATE + INSERT for new days)
+
+        Tokens come from the per-call rows, total_requests from record_run() counts.
+        """
+        totals: Dict[Tuple[str, datetime], Dict[str, int]] = {}
+        for row in rows:
+            day = row["created_at"].replace(hour=0, minute=0, second=0, microsecond=0)
+            entry = totals.setdefault((row["user_id"], day), {
+                "total_tokens": 0, "total_requests": 0, "haiku_tokens": 0, "sonnet_tokens": 0
+            })
+            model = (row["model"] or "").lower()
+            tokens = row.get("total_tokens", 0)
+            entry["total_tokens"] += tokens
+            entry["total_requests"] += row.get("_requests", 0)
+            if "haiku" in model:
+                entry["haiku_tokens"] += tokens
+            elif "sonnet" in model:
+                entry["sonnet_tokens"] += tokens
+
+        days = {day for _, day in totals}
+        existing = await db.execute(
+            select(TokenUsage.id, TokenUsage.user_id, TokenUsage.date).where(and_(
+                TokenUsage.user_id.in_({user_id for user_id, _ in totals}),
+                TokenUsage.date.in_(days)
+            ))
+        )
+        ids: Dict[Tuple[str, datetime], str] = {}
+        for usage_id, user_id, day in existing.all():
+            ids.setdefault((str(user_id), day), str(usage_id))
+
+        if ids:
+            by_id = {usage_id: totals[key] for key, usage_id in ids.items()}
+            await db.execute(
+                update(TokenUsage)
+                .where(TokenUsage.id.in_(list(by_id)))
+                .values(
+                    updated_at=datetime.utcnow(),
+                    **{
+                        column: func.coalesce(getattr(TokenUsage, column), 0) + case(
+                            {usage_id: entry[column] for usage_id, entry in by_id.items()},
+                            value=TokenUsage.id, else_=0
+                        )
+                        for column in ("total_tokens", "total_requests", "haiku_tokens", "sonnet_tokens")
+                    }
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        new_rows = [
+            {"id": generate_uuid(), "user_id": user_id, "date": day, **entry}
+            for (user_id, day), entry in totals.items() if (user_id, day) not in ids
+        ]
+        if new_rows:
+            await db.execute(insert(TokenUsage), new_rows)
+
+    # ==================== Metrics ====================
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and flush latency metrics"""
+        flushes = self.stats["flushes"]
+        return {
+            **{k: v for k, v in self.stats.items() if k != "total_flush_ms"},
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "avg_flush_ms": round(self.stats["total_flush_ms"] / flushes, 2) if flushes else 0.0,
+            "running": bool(self._task and not self._task.done()),
+        }
+
+
+# Singleton instance
+usage_ingestion_service = UsageIngestionService()
@@ -0,0 +1,259 @@
+"""
+Usage Rollup Service
+====================
+Keeps hourly and daily aggregates of TokenUsageLog in usage_rollups so the
+admin analytics endpoints read pre-summed buckets instead of scanning the
+raw log on every dashboard load.
+
+- apply(): increment the buckets for freshly written log rows inside the
+  caller's transaction (INSERT ... ON CONFLICT DO UPDATE)
+- rebuild(): re-derive buckets from the raw log; used for backfill and by
+  the periodic compaction task that corrects drift in recent buckets
+- On PostgreSQL apply() holds a shared and rebuild() an exclusive
+  transaction advisory lock, so an increment can never land between a
+  rebuild's DELETE and its INSERT ... SELECT
+- hour_bucket()/day_bucket(): dialect-aware truncation for queries
+
+Usage:
+    db.add(log)
+    await db.flush()
+    await usage_rollup_service.apply(db, [log])
+    await db.commit()
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, date, timedelta
+from sqlalchemy import select, delete, insert as sa_insert, func, literal, cast, String, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging_config import logger
+from app.models.usage import TokenUsageLog, UsageRollup, RollupGranularity, AgentType
+
+ROLLUP_METRICS = ("calls", "input_tokens", "output_tokens", "total_tokens", "cost_paise")
+KEY_COLUMNS = ("granularity", "bucket_start", "user_id", "project_id", "model", "agent_type")
+
+# Rows per INSERT statement (keeps bind parameters under driver limits)
+UPSERT_CHUNK = 1000
+
+# pg_advisory_xact_lock key serializing rebuild() against apply()
+ROLLUP_LOCK_KEY = 0x75726F6C  # "urol"
+
+# SQLite keeps DateTime as text in SQLAlchemy's format; truncated buckets must match it
+_SQLITE_FORMATS = {
+    RollupGranularity.HOUR: '%Y-%m-%d %H:00:00.000000',
+    RollupGranularity.DAY: '%Y-%m-%d 00:00:00.000000',
+}
+
+
+def truncate(ts: datetime, granularity: RollupGranularity) -> datetime:
+    """Start of the hour/day bucket containing ts"""
+    if granularity == RollupGranularity.HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_value(value: Any) -> Optional[datetime]:
+    """Normalize a bucket column/expression result (datetime, date or SQLite text)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def agent_label(agent_type: str) -> str:
+    """AgentType name (as stored) -> public value"""
+    try:
+        return AgentType[agent_type].value
+    except KeyError:
+        return (agent_type or "unknown").lower()
+
+
+class UsageRollupService:
+    """
+    Incremental hourly/daily usage aggregates.
+    """
+
+    @staticmethod
+    def _dialect(db: AsyncSession) -> str:
+        bind = db.bind
+        return bind.dialect.name if bind is not None else "postgresql"
+
+    def bucket(self, db: AsyncSession, column, granularity: RollupGranularity):
+        """SQL expression truncating a timestamp column to the bucket start"""
+        if self._dialect(db) == "sqlite":
+            return func.strftime(_SQLITE_FORMATS[granularity], column)
+        return func.date_trunc(granularity.value, column)
+
+    def hour_bucket(self, db: AsyncSession, column):
+        return self.bucket(db, column, RollupGranularity.HOUR)
+
+    def day_bucket(self, db: AsyncSession, column):
+        return self.bucket(db, column, RollupGranularity.DAY)
+
+    async def _lock(self, db: AsyncSession, exclusive: bool):
+        """Take the rollup advisory lock until the transaction ends (PostgreSQL only)"""
+        if self._dialect(db) != "postgresql":
+            return  # SQLite serializes writers already
+        lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+        await db.execute(select(lock(ROLLUP_LOCK_KEY)))
+
+    # ==================== Write path ====================
+
+    def aggregate(self, logs: Iterable[TokenUsageLog]) -> List[Dict[str, Any]]:
+        """Sum log rows into one row per (granularity, bucket, dimensions)"""
+        totals: Dict[Tuple, Dict[str, Any]] = {}
+        for log in logs:
+            created_at = log.created_at or datetime.utcnow()
+            agent = log.agent_type.name if isinstance(log.agent_type, AgentType) else str(log.agent_type or AgentType.OTHER.name)
+            for granularity in RollupGranularity:
+                key = (
+                    granularity.value,
+                    truncate(created_at, granularity),
+                    str(log.user_id),
+                    str(log.project_id or ""),
+                    log.model or "",
+                    agent,
+                )
+                row = totals.get(key)
+                if row is None:
+                    row = totals[key] = {**dict(zip(KEY_COLUMNS, key)), **{m: 0 for m in ROLLUP_METRICS}}
+                row["calls"] += 1
+                row["input_tokens"] += log.input_tokens or 0
+                row["output_tokens"] += log.output_tokens or 0
+                row["total_tokens"] += log.total_tokens or 0
+                row["cost_paise"] += log.cost_paise or 0
+        return list(totals.values())
+
+    def _insert(self, db: AsyncSession):
+        """Dialect insert() supporting on_conflict_do_update, or None"""
+        dialect = self._dialect(db)
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+            return insert
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            return insert
+        return None
+
+    async def apply(self, db: AsyncSession, logs: Iterable[TokenUsageLog]) -> int:
+        """
+        Add log rows to their hour and day buckets. Does not commit: call
+        in the same transaction as the log insert so both land together.
+
+        Returns:
+            Number of bucket rows touched
+        """
+        rows = self.aggregate(logs)
+        if not rows:
+            return 0
+
+        await self._lock(db, exclusive=False)
+        insert = self._insert(db)
+        if insert is None:
+            await self._apply_generic(db, rows)
+            return len(rows)
+
+        now = datetime.utcnow()
+        for i in range(0, len(rows), UPSERT_CHUNK):
+            stmt = insert(UsageRollup).values([{**row, "updated_at": now} for row in rows[i:i + UPSERT_CHUNK]])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(KEY_COLUMNS),
+                set_={
+                    **{m: getattr(UsageRollup, m) + getattr(stmt.excluded, m) for m in ROLLUP_METRICS},
+                    "updated_at": now
+                }
+            )
+            await db.execute(stmt)
+        return len(rows)
+
+    async def _apply_generic(self, db: AsyncSession, rows: List[Dict[str, Any]]):
+        """Read-modify-write fallback for dialects without ON CONFLICT"""
+        for row in rows:
+            existing = await db.get(UsageRollup, tuple(row[k] for k in KEY_COLUMNS))
+            if existing is None:
+                db.add(UsageRollup(**row))
+            else:
+                for m in ROLLUP_METRICS:
+                    setattr(existing, m, getattr(existing, m) + row[m])
+
+    # ==================== Rebuild / compaction ====================
+
+    async def rebuild(self, db: AsyncSession, since: datetime, until: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Recompute every bucket from the start of `since`'s day up to `until`
+        (default: everything after) from token_usage_logs. Does not commit;
+        apply() calls wait until the caller's transaction ends.
+
+        Returns:
+            Dict with hour_rows and day_rows written
+        """
+        start = truncate(since, RollupGranularity.DAY)
+        end = truncate(until, RollupGranularity.DAY) + timedelta(days=1) if until else None
+        now = datetime.utcnow()
+
+        # Waits for in-flight apply() transactions, so their logs are visible below
+        await self._lock(db, exclusive=True)
+
+        window = [UsageRollup.bucket_start >= start]
+        if end:
+            window.append(UsageRollup.bucket_start < end)
+        await db.execute(delete(UsageRollup).where(and_(*window)))
+
+        insert = self._insert(db) or sa_insert
+        columns = [*KEY_COLUMNS, *ROLLUP_METRICS, "updated_at"]
+
+        # Hour buckets from the raw log
+        hour = self.hour_bucket(db, TokenUsageLog.created_at)
+        project = func.coalesce(TokenUsageLog.project_id, "")
+        agent = cast(TokenUsageLog.agent_type, String)
+        raw_window = [TokenUsageLog.created_at >= start]
+        if end:
+            raw_window.append(TokenUsageLog.created_at < end)
+        hours = (
+            select(
+                literal(RollupGranularity.HOUR.value), hour, TokenUsageLog.user_id, project,
+                TokenUsageLog.model, agent,
+                func.count(), func.sum(TokenUsageLog.input_tokens), func.sum(TokenUsageLog.output_tokens),
+                func.sum(TokenUsageLog.total_tokens), func.sum(TokenUsageLog.cost_paise),
+                literal(now)
+            )
+            .where(and_(*raw_window))
+            .group_by(hour, TokenUsageLog.user_id, project, TokenUsageLog.model, agent)
+        )
+        hour_result = await db.execute(insert(UsageRollup).from_select(columns, hours))
+
+        # Day buckets from the hour buckets just written
+        day = self.day_bucket(db, UsageRollup.bucket_start)
+        days = (
+            select(
+                literal(RollupGranularity.DAY.value), day, UsageRollup.user_id, UsageRollup.project_id,
+                UsageRollup.model, UsageRollup.agent_type,
+                *[func.sum(getattr(UsageRollup, m)) for m in ROLLUP_METRICS],
+                literal(now)
+            )
+            .where(and_(UsageRollup.granularity == RollupGranularity.HOUR.value, *window))
+            .group_by(day, UsageRollup.user_id, UsageRollup.project_id, UsageRollup.model, UsageRollup.agent_type)
+        )
+        day_result = await db.execute(insert(UsageRollup).from_select(columns, days))
+
+        stats = {"hour_rows": hour_result.rowcount or 0, "day_rows": day_result.rowcount or 0}
+        logger.info(f"[UsageRollup] Rebuilt buckets since {start.isoformat()}: {stats}")
+        return stats
+
+    async def compact(self, days: int = 1) -> Dict[str, int]:
+        """Rebuild today's and the previous `days` days' buckets (own session)"""
+        from app.core.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            try:
+                stats = await self.rebuild(db, datetime.utcnow() - timedelta(days=days))
+                await db.commit()
+                return stats
+            except Exception:
+                await db.rollback()
+                raise
+
+
+# Singleton instance
+usage_rollup_service = UsageRollupService()
@@ -36,6 +36,10 @@ class ClaudeClient:
             pool=REQUEST_TIMEOUT
         )
 
+        # Retries are handled below with our own backoff; SDK-level retries would
+        # multiply attempts and hide 429/529s from throttle_count
+        client_kwargs["max_retries"] = 0
+
         if settings.USE_MOCK_CLAUDE:
             logger.info("Mock Claude API mode enabled")
 
@@ -44,6 +48,10 @@ class ClaudeClient:
         self.haiku_model = settings.CLAUDE_HAIKU_MODEL
         self.sonnet_model = settings.CLAUDE_SONNET_MODEL
 
+        # Rate-limit/overload responses seen so far; callers sample it to
+        # size their concurrency to the available API headroom
+        self.throttle_count = 0
+
         logger.info(f"Claude client initialized: timeout={REQUEST_TIMEOUT}s, models=[{self.haiku_model}, {self.sonnet_model}]")
 
     def _is_retryable_error(self, error: Exception) -> bool:
@@ -74,6 +82,26 @@ class ClaudeClient:
                          'connection', 'timeout', 'network', 'dns', 'socket']
         return any(err in error_str for err in network_errors)
 
+    def _is_throttle_error(self, error: Exception) -> bool:
+        """Check if an error means the API is out of headroom (429/529)"""
+        if getattr(error, 'status_code', None) in (429, 529):
+            return True
+        error_str = str(error).lower()
+        return 'rate_limit' in error_str or 'overload' in error_str
+
+    def _build_system(self, system_prompt: Optional[str], cached_context: Optional[str]):
+        """
+        System prompt, optionally followed by a cacheable context block.
+
+        Requests that share the same system prompt + cached_context prefix are
+        served from the API's prompt cache instead of re-processing it.
+        """
+        if not cached_context:
+            return system_prompt if system_prompt else ""
+        blocks = [{"type": "text", "text": system_prompt}] if system_prompt else []
+        blocks.append({"type": "text", "text": cached_context, "cache_control": {"type": "ephemeral"}})
+        return blocks
+
     def _calculate_retry_delay(self, attempt: int) -> float:
         """Calculate delay with exponential backoff and jitter"""
         delay = min(BASE_DELAY * (2 ** attempt), MAX_DELAY)
@@ -88,7 +116,8 @@ class ClaudeClient:
         model: str = "haiku",
         max_tokens: int = None,
         temperature: float = None,
-        messages: Optional[List[Dict[str, str]]] = None
+        messages: Optional[List[Dict[str, str]]] = None,
+        cached_context: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate response from Claude (non-streaming)
@@ -100,6 +129,8 @@ class ClaudeClient:
             max_tokens: Maximum tokens to generate
             temperature: Temperature for generation
             messages: Optional list of previous messages for conversation
+            cached_context: Shared context appended to the system prompt and
+                marked for prompt caching (reused across related calls)
 
         Returns:
             Dict with response and metadata
@@ -135,7 +166,7 @@ class ClaudeClient:
                     model=model_name,
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    system=system_prompt if system_prompt else "",
+                    system=self._build_system(system_prompt, cached_context),
                     messages=messages
                 )
 
@@ -148,6 +179,8 @@ class ClaudeClient:
                     "input_tokens": response.usage.input_tokens,
                     "output_tokens": response.usage.output_tokens,
                     "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+                    "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", None) or 0,
+                    "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", None) or 0,
                     "stop_reason": response.stop_reason,
                     "id": response.id
                 }
@@ -169,6 +202,8 @@ class ClaudeClient:
             except Exception as e:
                 last_error = e
                 error_type = type(e).__name__
+                if self._is_throttle_error(e):
+                    self.throttle_count += 1
                 if self._is_retryable_error(e) and attempt < MAX_RETRIES:
                     delay = self._calculate_retry_delay(attempt)
                     logger.warning(
@@ -283,6 +318,8 @@ class ClaudeClient:
             except Exception as e:
                 last_error = e
                 error_type = type(e).__name__
+                if self._is_throttle_error(e):
+                    self.throttle_count += 1
                 # Only retry if we haven't started yielding yet (can't recover mid-stream)
                 if not has_yielded and self._is_retryable_error(e) and attempt < MAX_RETRIES:
                     delay = self._calculate_retry_delay(attempt)
@@ -2,10 +2,18 @@
 Pagination Utility Module
 
 Provides standardized pagination helpers for all API endpoints.
+
+- paginate()/create_paginated_response(): page/offset pagination with totals
+- keyset_paginate(): cursor pagination over (sort column, id); cost does not
+  grow with the page number and no COUNT(*) is needed
+- estimate_count(): cheap row-count estimate for large unfiltered tables
 """
-from typing import TypeVar, Generic, List, Optional, Any
+import base64
+import json
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional, Any, Callable, Sequence
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
 
@@ -122,3 +130,106 @@ def create_paginated_response(
         "has_next": page < total_pages,
         "has_previous": page > 1
     }
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for the keyset values of the last row on a page"""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> List[Any]:
+    """
+    Decode a cursor from encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError("Invalid cursor")
+    try:
+        return [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in payload]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    query: Select,
+    order_column: Any,
+    id_column: Any,
+    cursor_key: Callable[[Any], Sequence[Any]],
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    scalars: bool = True
+) -> dict:
+    """
+    Cursor pagination ordered by (order_column, id_column).
+
+    Rows after the cursor are selected with a row-value comparison, so an
+    index on (..., order_column, id_column) serves every page equally fast.
+
+    Args:
+        db: Database session
+        query: Base SQLAlchemy query (filters applied, no ordering)
+        order_column: Column or expression to sort by (must not be NULL)
+        id_column: Unique tie-breaker column
+        cursor_key: Returns (order value, id) for a result item
+        page_size: Items per page
+        cursor: next_cursor from the previous page
+        descending: Newest first
+        scalars: Return scalar items instead of rows
+
+    Returns:
+        Dictionary with items, next_cursor, has_next
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    page_size = max(1, min(100, page_size))
+
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        key = tuple_(order_column, id_column)
+        query = query.where(key < after if descending else key > after)
+
+    if descending:
+        query = query.order_by(order_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(order_column.asc(), id_column.asc())
+
+    result = await db.execute(query.limit(page_size + 1))
+    items = list(result.scalars().all() if scalars else result.all())
+
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(*cursor_key(items[-1])) if has_next else None,
+        "has_next": has_next
+    }
+
+
+async def estimate_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Planner row estimate for a whole table (PostgreSQL only).
+
+    Returns:
+        Estimated row count, or None when no estimate is available
+    """
+    bind = db.bind
+    if bind is None or bind.dialect.name != "postgresql":
+        return None
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+        {"name": table_name}
+    )
+    # -1 / 0 until the table has been vacuumed or analyzed
+    return int(estimate) if estimate and estimate > 0 else None
@@ -0,0 +1,400 @@
+"""
+SSE Transport
+
+Turns an async stream of events into Server-Sent Events writes:
+
+- Events arriving within SSE_FLUSH_WINDOW_MS of the first buffered one go
+  out as a single write, so a burst of token deltas costs one socket write
+- Consecutive content deltas for the same target are merged into one frame
+  (e.g. file_chunk events for the same path)
+- A run of status/progress updates of the same shape collapses to the latest
+- The source is paused (backpressure) once SSE_MAX_BUFFER_BYTES is waiting
+  for a slow client, so a stalled reader cannot grow memory without limit
+- Keepalive comments are only sent after the stream has actually been idle
+  (SSE_KEEPALIVE_INITIAL_SECONDS early on, SSE_KEEPALIVE_SECONDS later)
+- Streams can opt in to gzip, flushed per write, when the client accepts it
+
+Sources yield event dicts (coalesced here and JSON-encoded) or preformatted
+SSE text/bytes (batched as-is, never merged). None items are skipped.
+
+Usage:
+    async def events():
+        yield {"type": "status", "data": {"message": "Starting..."}}
+        async for chunk in claude_stream:
+            yield {"type": "content", "text": chunk}
+
+    return sse_response(events(), request=request, compress=True)
+"""
+import asyncio
+import json
+import time
+import zlib
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Union
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+SSEItem = Union[Dict[str, Any], str, bytes, None]
+
+# Event types whose text field is an append-only delta (merged with the next one)
+DELTA_EVENTS = {"content", "file_chunk"}
+# Where a delta's text lives: top level or under "data"
+DELTA_FIELDS = ("chunk", "text", "content")
+
+# Event types where a newer event of the same shape replaces an older one
+SUPERSEDED_EVENTS = {"status", "progress", "document_progress"}
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+DEFAULT_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+}
+
+# Seconds covered by the frames/sec and bytes/sec rates
+RATE_WINDOW = 60
+
+
+def format_event(event: Dict[str, Any]) -> bytes:
+    """SSE frame for an event dict: data: {json}\\n\\n"""
+    return f"data: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+def _delta_location(event: Dict[str, Any]):
+    """(container, field) holding the delta text of a content event, or None"""
+    if event.get("type") not in DELTA_EVENTS:
+        return None
+    data = event.get("data")
+    if isinstance(data, dict):
+        for field in DELTA_FIELDS:
+            if isinstance(data.get(field), str):
+                return "data", field
+    for field in DELTA_FIELDS:
+        if isinstance(event.get(field), str):
+            return None, field
+    return None
+
+
+def _without(event: Dict[str, Any], location) -> Dict[str, Any]:
+    """The event minus its delta text and timestamp, for comparing delta targets"""
+    container, field = location
+    rest = {k: v for k, v in event.items() if k not in ("timestamp", field if container is None else container)}
+    if container is not None:
+        rest[container] = {k: v for k, v in event[container].items() if k != field}
+    return rest
+
+
+def _merge_delta(previous: Dict[str, Any], event: Dict[str, Any]) -> bool:
+    """Append event's delta to previous (in place) if both target the same thing"""
+    location = _delta_location(event)
+    if location is None or previous.get("type") != event.get("type"):
+        return False
+    if _delta_location(previous) != location or _without(previous, location) != _without(event, location):
+        return False
+    container, field = location
+    if container is None:
+        previous[field] += event[field]
+    else:
+        previous[container] = {**previous[container], field: previous[container][field] + event[container][field]}
+    return True
+
+
+def _supersedes(previous: Dict[str, Any], event: Dict[str, Any]) -> bool:
+    """True if event is a newer update of the same kind as previous"""
+    if event.get("type") not in SUPERSEDED_EVENTS or previous.get("type") != event.get("type"):
+        return False
+    if previous.get("agent") != event.get("agent") or previous.get("step") != event.get("step"):
+        return False
+    # Same shape only: a status carrying extra flags (e.g. documents_skipped) is never dropped
+    old, new = previous.get("data"), event.get("data")
+    if isinstance(old, dict) and isinstance(new, dict):
+        return old.keys() == new.keys()
+    return previous.keys() == event.keys() and old is None and new is None
+
+
+def coalesce(items: List[SSEItem]) -> List[Union[Dict[str, Any], bytes]]:
+    """
+    Merge adjacent content deltas and drop superseded status/progress events.
+    Raw frames are kept in place and end any run.
+
+    Returns:
+        Items in their original order, as dicts (events) and bytes (raw frames)
+    """
+    out: List[Union[Dict[str, Any], bytes]] = []
+    for item in items:
+        if item is None:
+            continue
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        if isinstance(item, bytes):
+            out.append(item)
+            continue
+
+        # Events in out are our own copies, so merging into them is safe
+        previous = out[-1] if out and isinstance(out[-1], dict) else None
+        if previous is not None:
+            if _merge_delta(previous, item):
+                sse_metrics.merged += 1
+                continue
+            if _supersedes(previous, item):
+                sse_metrics.superseded += 1
+                out[-1] = dict(item)
+                continue
+        out.append(dict(item))
+    return out
+
+
+class SSEMetrics:
+    """Frame/byte counters for all SSE streams, with rates over the last RATE_WINDOW seconds"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.active_streams = 0
+        self.streams = 0
+        self.events_in = 0
+        self.frames = 0
+        self.writes = 0
+        self.keepalives = 0
+        self.backpressure_waits = 0
+        self.merged = 0
+        self.superseded = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        # [second, frames, bytes_sent] buckets
+        self._buckets: deque = deque()
+
+    def record_write(self, frames: int, raw: int, sent: int):
+        self.frames += frames
+        self.writes += 1
+        self.bytes_raw += raw
+        self.bytes_sent += sent
+
+        second = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += frames
+            self._buckets[-1][2] += sent
+        else:
+            self._buckets.append([second, frames, sent])
+        while self._buckets and self._buckets[0][0] <= second - RATE_WINDOW:
+            self._buckets.popleft()
+
+    def get_stats(self) -> Dict[str, Any]:
+        cutoff = int(time.monotonic()) - RATE_WINDOW
+        recent = [b for b in self._buckets if b[0] > cutoff]
+        return {
+            "active_streams": self.active_streams,
+            "streams": self.streams,
+            "events_in": self.events_in,
+            "frames": self.frames,
+            "writes": self.writes,
+            "keepalives": self.keepalives,
+            "backpressure_waits": self.backpressure_waits,
+            "merged_deltas": self.merged,
+            "superseded_events": self.superseded,
+            "bytes_raw": self.bytes_raw,
+            "bytes_sent": self.bytes_sent,
+            "frames_per_sec": round(sum(b[1] for b in recent) / RATE_WINDOW, 2),
+            "bytes_per_sec": round(sum(b[2] for b in recent) / RATE_WINDOW, 2),
+            "events_per_write": round(self.events_in / self.writes, 2) if self.writes else 0,
+            "compression_ratio": round(self.bytes_raw / self.bytes_sent, 2) if self.bytes_sent else 0,
+        }
+
+
+class SSEWriter:
+    """
+    Writes one SSE stream. Use stream() as the StreamingResponse body.
+
+    Args:
+        flush_window: Seconds events are buffered before a write (0 = write each immediately)
+        max_buffer_bytes: Buffered size at which the source is paused until the client catches up
+        compress: gzip the stream (the response must send Content-Encoding: gzip)
+    """
+
+    def __init__(
+        self,
+        flush_window: Optional[float] = None,
+        max_batch_bytes: Optional[int] = None,
+        max_buffer_bytes: Optional[int] = None,
+        keepalive_initial: Optional[float] = None,
+        keepalive_interval: Optional[float] = None,
+        keepalive_aggressive_for: Optional[float] = None,
+        compress: bool = False
+    ):
+        self.flush_window = (
+            settings.SSE_FLUSH_WINDOW_MS / 1000 if flush_window is None else flush_window
+        )
+        self.max_batch_bytes = max_batch_bytes or settings.SSE_MAX_BATCH_BYTES
+        self.max_buffer_bytes = max_buffer_bytes or settings.SSE_MAX_BUFFER_BYTES
+        self.keepalive_initial = keepalive_initial or settings.SSE_KEEPALIVE_INITIAL_SECONDS
+        self.keepalive_interval = keepalive_interval or settings.SSE_KEEPALIVE_SECONDS
+        self.keepalive_aggressive_for = (
+            settings.SSE_KEEPALIVE_AGGRESSIVE_SECONDS if keepalive_aggressive_for is None
+            else keepalive_aggressive_for
+        )
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def _idle_timeout(self, elapsed: float) -> float:
+        if elapsed < self.keepalive_aggressive_for:
+            return self.keepalive_initial
+        return self.keepalive_interval
+
+    def _encode(self, items: List[SSEItem]) -> Optional[bytes]:
+        frames = coalesce(items)
+        if not frames:
+            return None
+        payload = b"".join(f if isinstance(f, bytes) else format_event(f) for f in frames)
+        return self._write(payload, len(frames))
+
+    def _write(self, payload: bytes, frames: int) -> bytes:
+        data = payload
+        if self._compressor:
+            data = self._compressor.compress(payload) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        sse_metrics.record_write(frames, len(payload), len(data))
+        return data
+
+    async def stream(self, source: AsyncIterable[SSEItem]) -> AsyncIterator[bytes]:
+        """
+        Yield the encoded writes for source. The source is read by one pump
+        task into a buffer, so a burst of events costs a list append each,
+        not a wakeup of this generator per event. The pump stops reading
+        while max_buffer_bytes is waiting to be written.
+        """
+        loop = asyncio.get_running_loop()
+        buffer: List[SSEItem] = []
+        ready = asyncio.Event()
+        drained = asyncio.Event()
+        state = {"done": False, "error": None, "bytes": 0}
+
+        async def pump():
+            iterator = source.__aiter__()
+            try:
+                async for item in iterator:
+                    if item is None:
+                        continue
+                    while state["bytes"] >= self.max_buffer_bytes:
+                        sse_metrics.backpressure_waits += 1
+                        drained.clear()
+                        await drained.wait()
+                    buffer.append(item)
+                    # Event dicts are counted at a rough size to avoid encoding them twice
+                    state["bytes"] += len(item) if isinstance(item, (str, bytes)) else 256
+                    ready.set()
+            except Exception as e:
+                state["error"] = e
+            finally:
+                state["done"] = True
+                ready.set()
+                aclose = getattr(iterator, "aclose", None)
+                if aclose is not None:
+                    try:
+                        await aclose()
+                    except Exception as e:
+                        logger.debug(f"[SSE] Error closing event source: {e}")
+
+        async def wait_ready(timeout: float) -> bool:
+            if timeout <= 0:
+                return ready.is_set()
+            try:
+                await asyncio.wait_for(ready.wait(), timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+        def take() -> Optional[bytes]:
+            items = buffer[:]
+            buffer.clear()
+            state["bytes"] = 0
+            drained.set()
+            sse_metrics.events_in += len(items)
+            return self._encode(items)
+
+        sse_metrics.streams += 1
+        sse_metrics.active_streams += 1
+        started = last_write = loop.time()
+        pump_task = asyncio.create_task(pump())
+        try:
+            while True:
+                if not buffer and not state["done"]:
+                    ready.clear()
+                    idle_for = last_write + self._idle_timeout(loop.time() - started) - loop.time()
+                    if not await wait_ready(idle_for):
+                        last_write = loop.time()
+                        sse_metrics.keepalives += 1
+                        yield self._write(KEEPALIVE_FRAME, 1)
+                        continue
+
+                # Hold the batch open for the flush window (or until it is large)
+                deadline = loop.time() + self.flush_window
+                while (
+                    not state["done"]
+                    and state["bytes"] < self.max_batch_bytes
+                    and loop.time() < deadline
+                ):
+                    ready.clear()
+                    await wait_ready(deadline - loop.time())
+
+                if buffer:
+                    data = take()
+                    if data:
+                        last_write = loop.time()
+                        yield data
+                if state["done"] and not buffer:
+                    break
+
+            if self._compressor:
+                tail = self._compressor.flush()
+                if tail:
+                    yield tail
+            if state["error"] is not None:
+                raise state["error"]
+        finally:
+            sse_metrics.active_streams -= 1
+            if not pump_task.done():
+                pump_task.cancel()
+            try:
+                await pump_task
+            except asyncio.CancelledError:
+                pass
+
+
+def accepts_gzip(request: Optional[Request]) -> bool:
+    if request is None:
+        return False
+    encodings = request.headers.get("accept-encoding", "")
+    return "gzip" in [e.split(";")[0].strip().lower() for e in encodings.split(",")]
+
+
+def sse_response(
+    source: AsyncIterable[SSEItem],
+    request: Optional[Request] = None,
+    compress: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+    **writer_options
+) -> StreamingResponse:
+    """
+    StreamingResponse for an event source through SSEWriter.
+
+    Args:
+        source: Async iterator of event dicts and/or preformatted SSE text
+        request: Incoming request (needed to honour compress)
+        compress: gzip this stream if SSE_COMPRESSION_ENABLED and the client accepts gzip
+        headers: Response headers (default: no-cache, keep-alive, no proxy buffering)
+    """
+    headers = dict(DEFAULT_HEADERS if headers is None else headers)
+    gzip = compress and settings.SSE_COMPRESSION_ENABLED and accepts_gzip(request)
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    writer = SSEWriter(compress=gzip, **writer_options)
+    return StreamingResponse(writer.stream(source), media_type="text/event-stream", headers=headers)
+
+
+# Singleton instance
+sse_metrics = SSEMetrics()
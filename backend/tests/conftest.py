@@ -25,6 +25,8 @@ from app.main import app
 from app.core.database import Base, get_db
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash, create_access_token
+from app.modules.auth.entitlements import entitlement_cache
+from app.services.quiz_session_service import quiz_sessions
 
 fake = Faker()
 
@@ -58,6 +60,9 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Tables are dropped without commits, so cached snapshots are not invalidated
+    entitlement_cache.clear()
+    quiz_sessions.clear()
 
 
 @pytest.fixture
@@ -573,6 +573,82 @@ class TestChunkedDocumentAgent:
         for doc_type in doc_types:
             assert doc_type in ["srs", "sds", "project_report", "ppt", "viva_qa"]
 
+    def test_section_window_grows_and_halves(self):
+        """Test the section window widens on success and halves on throttling"""
+        from app.modules.agents.chunked_document_agent import SectionWindow
+
+        window = SectionWindow(initial=4, maximum=8)
+        for _ in range(4):
+            window.on_success()
+        assert window.size == 5
+
+        window.on_throttle()
+        assert window.size == 2
+        for _ in range(10):
+            window.on_throttle()
+        assert window.size == 1
+
+        for _ in range(100):
+            window.on_success()
+        assert window.size == 8
+
+    @pytest.mark.asyncio
+    async def test_sections_stream_in_document_order(self):
+        """Test sections are yielded in order while bounded by the window"""
+        import asyncio
+        from app.modules.agents.chunked_document_agent import ChunkedDocumentAgent, DocumentType
+
+        agent = ChunkedDocumentAgent()
+        sections = [{"id": "cover", "title": "Cover", "type": "template"}] + [
+            {"id": f"s{i}", "title": f"Section {i}", "type": "generate"} for i in range(10)
+        ]
+        active = 0
+        peak = 0
+
+        async def fake_content(section, outline, project_data, document_type, shared_context=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            # Later sections finish first
+            await asyncio.sleep(0.001 * (10 - int(section["id"][1:])))
+            active -= 1
+            return {"content": f"body {section['id']}", "shared": shared_context}
+
+        with patch.object(agent, "_generate_section_content", side_effect=fake_content), \
+                patch.object(agent, "_get_template_content", return_value={"content": "cover"}):
+            results = [
+                (idx, entry) async for idx, entry in agent._stream_sections(
+                    sections, {}, {}, DocumentType.PROJECT_REPORT, None, 1, "CTX"
+                )
+            ]
+
+        assert [idx for idx, _ in results] == list(range(11))
+        assert [entry["section_id"] for _, entry in results] == [s["id"] for s in sections]
+        assert all(entry["content"]["shared"] == "CTX" for _, entry in results[1:])
+        assert 1 < peak <= 8
+
+    @pytest.mark.asyncio
+    async def test_section_prompt_uses_cached_context(self):
+        """Test shared project data/outline go in cached_context, not the prompt"""
+        from app.modules.agents.chunked_document_agent import ChunkedDocumentAgent, DocumentType
+
+        agent = ChunkedDocumentAgent()
+        project_data = {"project_name": "UniqueProjectName", "features": ["f1"]}
+        shared = agent._build_section_context({"intro": {"points": ["a"]}}, project_data)
+        assert "UniqueProjectName" in shared
+
+        call = AsyncMock(return_value='{"content": "text"}')
+        with patch.object(agent, "_call_claude", call):
+            await agent._generate_section_content(
+                {"id": "intro", "title": "Introduction"}, {}, project_data,
+                DocumentType.PROJECT_REPORT, shared
+            )
+
+        kwargs = call.call_args.kwargs
+        assert kwargs["cached_context"] == shared
+        assert "UniqueProjectName" not in kwargs["user_prompt"]
+        assert '"intro"' in kwargs["user_prompt"]
+
 
 class TestAgentErrorHandling:
     """Tests for error handling across agents"""
@@ -0,0 +1,154 @@
+"""
+Unit Tests for LogStreamManager delivery (per-client queues, batching, relay)
+"""
+import asyncio
+import json
+import pytest
+
+from app.api.v1.endpoints.log_stream import ClientSender, LogStreamManager, is_build_error
+
+
+class FakeWebSocket:
+    """Records frames; optionally slow or broken"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(message)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, data):
+        self.published.append((channel, json.loads(data)))
+
+
+async def settle(seconds: float = 0.01):
+    await asyncio.sleep(seconds)
+
+
+class TestIsBuildError:
+    """Test the precompiled build error classifier"""
+
+    def test_matches_patterns_and_traces(self):
+        assert is_build_error("src/App.tsx(3,1): error TS2304: Cannot find name 'x'")
+        assert is_build_error('  File "/app/main.py", line 3, in <module>')
+        assert is_build_error("Module Not Found: ./Header")
+        assert not is_build_error("  VITE v5.0.0  ready in 320 ms")
+        assert not is_build_error("")
+
+
+class TestLogStreamManager:
+    """Test that slow or dead clients do not hold up others"""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_broadcast(self):
+        manager = LogStreamManager()
+        slow, fast = FakeWebSocket(delay=0.5), FakeWebSocket()
+        await manager.connect(slow, "p1")
+        await manager.connect(fast, "p1")
+
+        started = asyncio.get_running_loop().time()
+        for i in range(3):
+            await manager.broadcast_to_project("p1", {"type": "fix_started", "n": i})
+        assert asyncio.get_running_loop().time() - started < 0.05
+
+        await settle()
+        assert [f["n"] for f in fast.frames] == [0, 1, 2]
+        assert slow.frames == []
+        manager.disconnect(slow, "p1")
+        manager.disconnect(fast, "p1")
+        assert manager.active_connections == {}
+
+    @pytest.mark.asyncio
+    async def test_monitor_frames_batch_queued_lines(self):
+        manager = LogStreamManager()
+        monitor = FakeWebSocket(delay=0.02)
+        await manager.connect_monitor(monitor)
+
+        await manager.broadcast_to_monitors({"project_id": "p1", "data": {"message": "0"}})
+        await settle(0.001)
+        for i in range(1, 10):
+            await manager.broadcast_to_monitors({"project_id": "p1", "data": {"message": str(i)}})
+        await settle(0.1)
+
+        # First line goes out alone, the rest queued behind it arrive as one frame
+        assert monitor.frames[0]["data"]["message"] == "0"
+        assert monitor.frames[1]["type"] == "log_batch"
+        assert [m["data"]["message"] for m in monitor.frames[1]["messages"]] == [str(i) for i in range(1, 10)]
+        manager.disconnect(monitor)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        sender = ClientSender(FakeWebSocket(delay=1), max_queue=3)
+        for i in range(6):
+            sender.send({"n": i})
+
+        # The writer task has not run yet, so nothing was taken off the queue
+        assert sender.dropped == 3
+        assert [m["n"] for m in sender.queue] == [3, 4, 5]
+        sender.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_client_is_removed(self):
+        manager = LogStreamManager()
+        broken = FakeWebSocket(fail=True)
+        await manager.connect(broken, "p1")
+
+        await manager.broadcast_to_project("p1", {"type": "fix_failed"})
+        await settle()
+
+        assert "p1" not in manager.active_connections
+        assert manager.get_stats()["dropped_clients"] == 1
+
+
+class TestRelay:
+    """Test cross-worker fan-out payloads"""
+
+    @pytest.mark.asyncio
+    async def test_broadcasts_published_in_one_batch(self):
+        manager = LogStreamManager()
+        manager._redis = FakeRedis()
+
+        await manager.broadcast_to_monitors({"project_id": "p1", "data": {}})
+        await manager.broadcast_to_project("p1", {"type": "fix_started"})
+        await manager._publish_pending()
+
+        (channel, payload), = manager._redis.published
+        assert payload["origin"] == manager._origin
+        assert [e["scope"] for e in payload["events"]] == ["monitors", "project"]
+        assert manager.get_stats()["relay_published"] == 2
+
+    @pytest.mark.asyncio
+    async def test_relayed_events_reach_local_clients_once(self):
+        sender_worker, receiver_worker = LogStreamManager(), LogStreamManager()
+        sender_worker._redis = FakeRedis()
+        browser, monitor = FakeWebSocket(), FakeWebSocket()
+        await receiver_worker.connect(browser, "p1")
+        await receiver_worker.connect_monitor(monitor)
+
+        await sender_worker.broadcast_to_project("p1", {"type": "fix_completed"})
+        await sender_worker.broadcast_to_monitors({"project_id": "p2", "data": {}})
+        await sender_worker._publish_pending()
+        data = json.dumps(sender_worker._redis.published[0][1])
+
+        receiver_worker._handle_relayed(data)
+        sender_worker._handle_relayed(data)  # Own messages are ignored
+        await settle()
+
+        assert browser.frames == [{"type": "fix_completed"}]
+        assert monitor.frames == [{"project_id": "p2", "data": {}}]
+        receiver_worker.disconnect(browser, "p1")
+        receiver_worker.disconnect(monitor)
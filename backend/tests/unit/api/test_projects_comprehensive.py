@@ -7,7 +7,7 @@ from unittest.mock import patch, AsyncMock, MagicMock
 from httpx import AsyncClient
 from faker import Faker
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.models.user import User, UserRole
 from app.models.project import Project, ProjectStatus, ProjectMode
@@ -121,6 +121,48 @@ class TestListProjects:
         assert data["page_size"] == 5
 
 
+    @pytest.mark.asyncio
+    async def test_list_projects_cursor_walks_all_pages(self, client: AsyncClient, test_user, auth_headers, db_session):
+        """Following next_cursor returns every project once, newest first"""
+        base = datetime(2026, 1, 1)
+        for i in range(7):
+            db_session.add(Project(
+                user_id=str(test_user.id),
+                title=f"Project {i}",
+                mode=ProjectMode.STUDENT,
+                status=ProjectStatus.DRAFT,
+                # Two projects share a timestamp to exercise the id tie-breaker
+                created_at=base.replace(day=1 + min(i, 5))
+            ))
+        await db_session.commit()
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            url = "/api/v1/projects/?page_size=3" + (f"&cursor={cursor}" if cursor else "")
+            response = await client.get(url, headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            if cursor is None:
+                assert data["total"] == 7
+            else:
+                assert data["total"] is None
+            seen.extend(p["title"] for p in data["projects"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+        assert seen[-1] == "Project 0"
+
+    @pytest.mark.asyncio
+    async def test_list_projects_invalid_cursor(self, client: AsyncClient, test_user, auth_headers):
+        """A malformed cursor is a 400, not a 500"""
+        response = await client.get("/api/v1/projects/?cursor=not-a-cursor", headers=auth_headers)
+
+        assert response.status_code == 400
+
 class TestSearchProjects:
     """Test project search endpoint"""
 
@@ -174,6 +216,72 @@ class TestSearchProjects:
 
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_search_projects_matches_substrings(self, client: AsyncClient, test_user, auth_headers, db_session):
+        """Indexed search matches partial words in title, description and tech stack"""
+        db_session.add_all([
+            Project(user_id=str(test_user.id), title="Attendance Tracker", description="Face recognition",
+                    mode=ProjectMode.STUDENT, status=ProjectStatus.DRAFT),
+            Project(user_id=str(test_user.id), title="Shop", description="An e-commerce DASHBOARD",
+                    mode=ProjectMode.STUDENT, status=ProjectStatus.DRAFT, tech_stack={"frontend": ["React"]}),
+            Project(user_id=str(test_user.id), title="Blog", description="Markdown blog 100% static",
+                    mode=ProjectMode.STUDENT, status=ProjectStatus.DRAFT),
+        ])
+        await db_session.commit()
+
+        async def titles(q):
+            response = await client.get(f"/api/v1/projects/search?q={q}", headers=auth_headers)
+            assert response.status_code == 200
+            return sorted(p["title"] for p in response.json()["projects"])
+
+        assert await titles("tendan") == ["Attendance Tracker"]
+        assert await titles("dashboard") == ["Shop"]
+        assert await titles("react") == ["Shop"]
+        assert await titles("sh") == ["Shop"]
+        assert await titles("100%25") == ["Blog"]
+        assert await titles("0%25 s") == ["Blog"]
+        assert await titles("zzz") == []
+
+    @pytest.mark.asyncio
+    async def test_search_projects_cursor_pagination(self, client: AsyncClient, test_user, auth_headers, db_session):
+        """Search results page with next_cursor"""
+        for i in range(5):
+            db_session.add(Project(user_id=str(test_user.id), title=f"Inventory App {i}",
+                                   mode=ProjectMode.STUDENT, status=ProjectStatus.DRAFT))
+        await db_session.commit()
+
+        first = (await client.get("/api/v1/projects/search?q=inventory&page_size=3", headers=auth_headers)).json()
+        assert first["total"] == 5
+        assert len(first["projects"]) == 3
+
+        second = (await client.get(
+            f"/api/v1/projects/search?q=inventory&page_size=3&cursor={first['next_cursor']}",
+            headers=auth_headers
+        )).json()
+        assert len(second["projects"]) == 2
+        assert second["next_cursor"] is None
+        ids = {p["id"] for p in first["projects"]} | {p["id"] for p in second["projects"]}
+        assert len(ids) == 5
+
+    @pytest.mark.asyncio
+    async def test_search_projects_ordered_by_updated_at(self, client: AsyncClient, test_user, auth_headers, db_session):
+        """Pages follow (updated_at, id), most recently updated first"""
+        base = datetime(2026, 1, 1)
+        for i, hours in enumerate([3, 1, 4, 0, 2]):
+            db_session.add(Project(user_id=str(test_user.id), title=f"Ledger {i}",
+                                   mode=ProjectMode.STUDENT, status=ProjectStatus.DRAFT,
+                                   created_at=base, updated_at=base + timedelta(hours=hours)))
+        await db_session.commit()
+
+        first = (await client.get("/api/v1/projects/search?q=ledger&page_size=2", headers=auth_headers)).json()
+        rest = (await client.get(
+            f"/api/v1/projects/search?q=ledger&page_size=3&cursor={first['next_cursor']}",
+            headers=auth_headers
+        )).json()
+
+        titles = [p["title"] for p in first["projects"] + rest["projects"]]
+        assert titles == ["Ledger 2", "Ledger 0", "Ledger 4", "Ledger 1", "Ledger 3"]
+
 
 class TestGetProject:
     """Test get single project endpoint"""
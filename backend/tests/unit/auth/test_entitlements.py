@@ -0,0 +1,221 @@
+"""
+Unit Tests for the cached entitlement snapshot
+Tests for: snapshot reuse, commit-driven invalidation, user loading
+"""
+import json
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from app.core.security import create_access_token
+from app.models.billing import Plan, Subscription, SubscriptionStatus, PlanType
+from app.models.system_setting import SystemSetting
+from app.models.token_balance import TokenBalance, TokenPurchase
+from app.models.user import User
+from app.modules.auth.dependencies import get_current_user
+from app.modules.auth.entitlements import (
+    SNAPSHOT_USER_FIELDS,
+    EntitlementCache,
+    EntitlementSnapshot,
+    entitlement_cache,
+)
+from app.modules.auth.feature_flags import check_feature_access
+from app.modules.auth.usage_limits import FREE_LIMITS, check_all_limits, get_user_limits
+
+
+@contextmanager
+def count_queries(db_session):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def credentials_for(user):
+    token = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role.value})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class TestEntitlementSnapshot:
+    """Test snapshot serialization and reattachment"""
+
+    @pytest.mark.asyncio
+    async def test_json_round_trip(self, db_session, test_user):
+        snapshot = EntitlementSnapshot.from_user(test_user, FREE_LIMITS, has_token_purchase=False)
+        restored = EntitlementSnapshot.from_json(snapshot.to_json())
+
+        assert restored.limits == FREE_LIMITS
+        assert restored.email == test_user.email
+        assert restored.is_active is True
+        assert restored.plan_features is None
+
+    @pytest.mark.asyncio
+    async def test_snapshot_never_holds_credentials(self, db_session, test_user):
+        test_user.reset_token_hash = "reset-hash"
+        snapshot = EntitlementSnapshot.from_user(test_user, FREE_LIMITS, has_token_purchase=False)
+        data = snapshot.to_json()
+
+        assert set(snapshot.user) == set(SNAPSHOT_USER_FIELDS)
+        assert test_user.hashed_password not in data
+        assert "reset-hash" not in data
+
+    @pytest.mark.asyncio
+    async def test_loaded_user_is_the_current_row(self, db_session, test_user):
+        entitlement_cache.clear()
+        snapshot = await entitlement_cache.get(str(test_user.id), db_session)
+
+        # Changed behind the cached snapshot's back
+        test_user.full_name = "Renamed"
+        await db_session.commit()
+        db_session.expunge_all()
+
+        user = await snapshot.load_user(db_session)
+        assert user.full_name == "Renamed"
+        assert user.hashed_password == test_user.hashed_password
+
+        user.full_name = "Renamed again"
+        await db_session.commit()
+        db_session.expunge_all()
+        assert (await db_session.get(User, str(test_user.id))).full_name == "Renamed again"
+
+
+class TestEntitlementCache:
+    """Test that checks read the snapshot instead of the database"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_checks_do_not_query_plan_tables(self, db_session, test_user):
+        entitlement_cache.clear()
+        await get_current_user(credentials_for(test_user), db_session)
+        db_session.expunge_all()  # As in a fresh request session
+
+        with count_queries(db_session) as statements:
+            user = await get_current_user(credentials_for(test_user), db_session)
+            limits = await get_user_limits(user, db_session)
+            access = await check_feature_access(db_session, user, "code_execution")
+            access = await check_feature_access(db_session, user, "code_execution")
+
+        assert limits.plan_name == "Free"
+        assert access["allowed"] is True
+        # The user row by primary key and the global flag lookup, once
+        assert len(statements) == 2
+
+        with count_queries(db_session) as statements:
+            assert (await check_all_limits(user, db_session)).allowed
+        # Monthly token usage and today's API calls are still live counts
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_payment_commit_invalidates_snapshot(self, db_session, test_user):
+        entitlement_cache.clear()
+        assert (await get_user_limits(test_user, db_session)).plan_name == "Free"
+
+        db_session.add(TokenPurchase(
+            user_id=str(test_user.id),
+            package_name="pro",
+            tokens_purchased=10000,
+            amount_paid=100,
+            payment_status="success",
+            valid_from=datetime.utcnow(),
+            is_expired=False
+        ))
+        await db_session.commit()
+
+        limits = await get_user_limits(test_user, db_session)
+        assert limits.token_limit is None
+        assert (await check_feature_access(db_session, test_user, "bug_fixing"))["current_plan"] == "Premium"
+
+    @pytest.mark.asyncio
+    async def test_plan_change_invalidates_snapshot(self, db_session, test_user):
+        entitlement_cache.clear()
+        assert (await check_feature_access(db_session, test_user, "bug_fixing"))["allowed"] is False
+
+        plan = Plan(
+            name="Student",
+            slug="student",
+            plan_type=PlanType.STUDENT,
+            price=0,
+            feature_flags={"bug_fixing": True}
+        )
+        db_session.add(plan)
+        await db_session.flush()
+        db_session.add(Subscription(
+            user_id=str(test_user.id),
+            plan_id=plan.id,
+            status=SubscriptionStatus.ACTIVE,
+            current_period_start=datetime.utcnow(),
+            current_period_end=datetime.utcnow() + timedelta(days=30)
+        ))
+        await db_session.commit()
+
+        access = await check_feature_access(db_session, test_user, "bug_fixing")
+        assert access["allowed"] is True
+        assert access["current_plan"] == "Student"
+
+    @pytest.mark.asyncio
+    async def test_admin_flag_edit_invalidates_flags(self, db_session, test_user):
+        entitlement_cache.clear()
+        assert (await check_feature_access(db_session, test_user, "code_execution"))["allowed"] is True
+
+        db_session.add(SystemSetting(key="features.code_execution", value=False, category="features"))
+        await db_session.commit()
+
+        access = await check_feature_access(db_session, test_user, "code_execution")
+        assert access["allowed"] is False
+        assert access["upgrade_to"] is None
+
+    @pytest.mark.asyncio
+    async def test_deactivation_takes_effect_on_next_request(self, db_session, test_user):
+        entitlement_cache.clear()
+        await get_current_user(credentials_for(test_user), db_session)
+
+        test_user.is_active = False
+        await db_session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(credentials_for(test_user), db_session)
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_token_usage_does_not_invalidate(self, db_session, test_user):
+        balance = TokenBalance(user_id=str(test_user.id))
+        db_session.add(balance)
+        await db_session.commit()
+        entitlement_cache.clear()
+        await get_user_limits(test_user, db_session)
+        loads = entitlement_cache.stats["loads"]
+
+        balance.premium_used = 5
+        await db_session.commit()
+        await get_user_limits(test_user, db_session)
+        assert entitlement_cache.stats["loads"] == loads
+
+        balance.premium_tokens = 1000
+        await db_session.commit()
+        assert (await get_user_limits(test_user, db_session)).token_limit is None
+
+
+class TestRemoteInvalidation:
+    """Test invalidations broadcast by other workers"""
+
+    def test_drops_local_copies_except_own_messages(self):
+        cache = EntitlementCache()
+        cache._store_local("u1", object(), cache._generation)
+        cache._flags = (float("inf"), {"api_access": False})
+
+        cache._handle_invalidation(json.dumps({"origin": cache._origin, "users": ["u1"], "feature_flags": True}))
+        assert "u1" in cache._local
+
+        cache._handle_invalidation(json.dumps({"origin": "other", "users": ["u1"], "feature_flags": True}))
+        assert "u1" not in cache._local
+        assert cache._flags is None
+        assert cache.get_stats()["remote_invalidations"] == 1
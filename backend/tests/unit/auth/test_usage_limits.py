@@ -5,12 +5,15 @@ Tests for: plan limits, token limits, project limits, rate limits
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from datetime import datetime, timedelta
+from dataclasses import FrozenInstanceError
 from faker import Faker
 
 from app.modules.auth.usage_limits import (
     UserLimits,
     UsageLimitCheck,
     FREE_LIMITS,
+    TOKEN_PURCHASE_LIMITS,
+    build_user_limits,
     get_user_limits,
     check_token_limit,
     check_project_limit,
@@ -56,6 +59,21 @@ class TestUserLimits:
 
         assert limits.is_unlimited is False
 
+    def test_limits_are_read_only(self):
+        """Test limits cannot be reassigned in place"""
+        with pytest.raises(FrozenInstanceError):
+            FREE_LIMITS.token_limit = None
+
+    def test_built_limits_do_not_share_defaults(self):
+        """Test changing returned limits leaves the module defaults alone"""
+        limits = build_user_limits(has_token_purchase=True, plan=None)
+        limits.feature_flags["bug_fixing"] = False
+        limits.allowed_models.append("opus")
+
+        assert TOKEN_PURCHASE_LIMITS.feature_flags["bug_fixing"] is True
+        assert "opus" not in TOKEN_PURCHASE_LIMITS.allowed_models
+        assert build_user_limits(has_token_purchase=False, plan=None) is not FREE_LIMITS
+
 
 class TestFreeLimits:
     """Test FREE_LIMITS default"""
@@ -0,0 +1,100 @@
+"""
+Unit Tests for the cached project scan behind ContextEngine
+"""
+import os
+
+from app.modules.automation.context_engine import ContextEngine
+from app.modules.automation.context_snapshot import ContextSnapshotCache, context_snapshots, notify_file_written
+
+
+def write(root, path, content):
+    full = root / path
+    full.parent.mkdir(parents=True, exist_ok=True)
+    full.write_text(content)
+    return full
+
+
+def make_project(root):
+    write(root, "package.json", '{"dependencies": {"react": "18"}}')
+    write(root, "src/App.tsx", "import Header from './components/Header'\nexport default App")
+    write(root, "src/components/Header.tsx", "export default function Header() {}")
+    write(root, "node_modules/react/index.js", "module.exports = {}")
+
+
+class TestProjectSnapshot:
+    """Test incremental refresh from notifications and mtime rescans"""
+
+    def test_notified_write_is_reread_without_rescan(self, tmp_path):
+        make_project(tmp_path)
+        cache = ContextSnapshotCache()
+        snapshot = cache.get(tmp_path)
+        snapshot.refresh(rescan_after=3600)
+
+        assert set(snapshot.files) == {"package.json", "src/App.tsx", "src/components/Header.tsx"}
+        assert "Header" in snapshot.read("src/components/Header.tsx")
+
+        # Same size, and mtime may not move within the filesystem's granularity
+        full = write(tmp_path, "src/components/Header.tsx", "export default function Footer() {}")
+        stat = full.stat()
+        os.utime(full, ns=(stat.st_atime_ns, snapshot.files["src/components/Header.tsx"].mtime_ns))
+        write(tmp_path, "src/New.ts", "export const x = 1")
+        cache.notify(full)
+        cache.notify(tmp_path / "src/New.ts")
+
+        assert snapshot.refresh(rescan_after=3600) == 2
+        assert "Footer" in snapshot.read("src/components/Header.tsx")
+        assert snapshot.contains("src/New.ts")
+
+    def test_rescan_picks_up_unnotified_changes(self, tmp_path):
+        make_project(tmp_path)
+        snapshot = ContextSnapshotCache().get(tmp_path)
+        snapshot.refresh()
+        snapshot.read("src/App.tsx")
+        version = snapshot.paths_version
+
+        write(tmp_path, "src/App.tsx", "export default function App() { return null }")
+        (tmp_path / "package.json").unlink()
+
+        assert snapshot.refresh(rescan_after=3600) == 0
+        assert snapshot.refresh(rescan_after=0) == 2
+        assert "package.json" not in snapshot.files
+        assert "return null" in snapshot.read("src/App.tsx")
+        assert snapshot.paths_version == version + 1
+
+    def test_notify_ignores_other_projects(self, tmp_path):
+        cache = ContextSnapshotCache()
+        snapshot = cache.get(tmp_path / "a")
+        cache.notify(tmp_path / "ab" / "x.ts")
+        cache.notify(tmp_path / "a" / "x.ts")
+
+        assert snapshot.pending == {"x.ts"}
+
+
+class TestContextEngineSnapshot:
+    """Test that ContextEngine reuses the snapshot across calls"""
+
+    def test_import_graph_follows_new_files(self, tmp_path):
+        make_project(tmp_path)
+        write(tmp_path, "src/main.tsx", "import App from './App'\nimport { api } from './api'")
+        context_snapshots.invalidate(tmp_path)
+
+        engine = ContextEngine(str(tmp_path))
+        files = engine.scan_project_files()
+        assert "node_modules/react/index.js" not in {f["path"] for f in files}
+        engine._build_import_graph(files)
+        assert engine._import_graph["src/main.tsx"] == {"src/App.tsx"}
+
+        # A fixer creates the missing module through a notifying writer
+        notify_file_written(write(tmp_path, "src/api.ts", "export const api = {}"))
+
+        engine = ContextEngine(str(tmp_path))
+        files = engine.scan_project_files()
+        engine._build_import_graph(files)
+        assert engine._import_graph["src/main.tsx"] == {"src/App.tsx", "src/api.ts"}
+
+    def test_explicit_extensions_bypass_snapshot(self, tmp_path):
+        make_project(tmp_path)
+        write(tmp_path, "README.md", "# readme")
+        engine = ContextEngine(str(tmp_path))
+
+        assert {f["path"] for f in engine.scan_project_files(extensions=[".md"])} == {"README.md", "package.json"}
@@ -0,0 +1,113 @@
+"""
+Unit Tests for UMLGenerator batch rendering (render pool + model-hash cache)
+"""
+import pytest
+from pathlib import Path
+from unittest.mock import patch, AsyncMock
+
+from app.core.config import settings
+from app.modules.automation import uml_generator as uml_module
+from app.modules.automation.uml_generator import UMLGenerator
+
+
+PROJECT_DATA = {
+    "project_name": "Library Manager",
+    "project_type": "Web Application",
+    "features": ["User login and registration", "Admin can manage books", "Search books", "Issue and return books"],
+    "technologies": {"frontend": ["React"], "backend": ["FastAPI"], "database": ["PostgreSQL"]},
+    "api_endpoints": [{"method": "GET", "path": "/api/books"}, {"method": "POST", "path": "/api/auth/login"}],
+    "database_tables": ["users", "books", "loans"],
+}
+
+DIAGRAM_TYPES = ["use_case", "class", "sequence", "activity", "er", "dfd_0", "architecture"]
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """Generator writing into tmp_path, rendering in threads"""
+    monkeypatch.setattr(settings, "DIAGRAM_RENDER_WORKERS", 0)
+    monkeypatch.setattr(settings, "_diagrams_dir", tmp_path)
+    uml_module._reset_render_pool()
+    return UMLGenerator()
+
+
+class TestDiagramModels:
+    """Test extracted diagram models and their hashes"""
+
+    def test_models_cover_all_diagrams(self, generator):
+        models = generator.build_diagram_models(PROJECT_DATA)
+        assert list(models) == DIAGRAM_TYPES
+
+    def test_hash_is_stable_and_model_sensitive(self, generator):
+        models = generator.build_diagram_models(PROJECT_DATA)
+        again = generator.build_diagram_models(dict(PROJECT_DATA))
+        for diagram_type in DIAGRAM_TYPES:
+            assert generator.model_hash(diagram_type, models[diagram_type]) == \
+                generator.model_hash(diagram_type, again[diagram_type])
+
+        changed = generator.build_diagram_models({**PROJECT_DATA, "database_tables": ["users", "books", "fines"]})
+        assert generator.model_hash("er", models["er"]) != generator.model_hash("er", changed["er"])
+
+
+class TestRenderAllDiagrams:
+    """Test concurrent rendering and cache reuse"""
+
+    @pytest.mark.asyncio
+    async def test_renders_all_then_reuses_cache(self, generator):
+        first = await generator.render_all_diagrams(PROJECT_DATA, "proj-1", "user-1")
+
+        assert list(first) == DIAGRAM_TYPES
+        for result in first.values():
+            assert result["cached"] is False
+            assert result["render_ms"] >= 0
+            assert Path(result["local_path"]).is_file()
+
+        with patch.object(generator, "render_diagram") as render:
+            second = await generator.render_all_diagrams(PROJECT_DATA, "proj-1", "user-1")
+
+        render.assert_not_called()
+        assert all(r["cached"] for r in second.values())
+        assert {t: r["local_path"] for t, r in second.items()} == {t: r["local_path"] for t, r in first.items()}
+
+    @pytest.mark.asyncio
+    async def test_only_changed_models_rerender(self, generator):
+        await generator.render_all_diagrams(PROJECT_DATA, "proj-1", "user-1")
+
+        changed = {**PROJECT_DATA, "database_tables": ["users", "books", "fines"]}
+        results = await generator.render_all_diagrams(changed, "proj-1", "user-1")
+
+        assert results["er"]["cached"] is False
+        assert results["use_case"]["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_saved_diagrams_skip_upload_on_rerun(self, generator):
+        save = AsyncMock(side_effect=lambda **kw: {
+            "s3_key": f"diagrams/{kw['diagram_type']}.png", "file_url": "u", "document_id": "d"
+        })
+        with patch("app.services.document_storage_service.document_storage.save_diagram", save):
+            first = await generator.generate_all_diagrams_and_save(PROJECT_DATA, "proj-1", "user-1")
+            assert save.await_count == len(DIAGRAM_TYPES)
+
+            second = await generator.generate_all_diagrams_and_save(PROJECT_DATA, "proj-1", "user-1")
+
+        assert save.await_count == len(DIAGRAM_TYPES)
+        assert second["er"]["s3_key"] == first["er"]["s3_key"] == "diagrams/er.png"
+        assert second["er"]["saved_to_cloud"] is True
+        assert second["er"]["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_process_pool_rendering(self, tmp_path, monkeypatch):
+        """Workers are spawned processes that render into the configured path"""
+        monkeypatch.setenv("DIAGRAMS_PATH", str(tmp_path))
+        monkeypatch.setattr(settings, "DIAGRAM_RENDER_WORKERS", 2)
+        monkeypatch.setattr(settings, "_diagrams_dir", tmp_path)
+        uml_module._reset_render_pool()
+        try:
+            paths = await UMLGenerator().generate_all_diagrams_async(PROJECT_DATA, "proj-2", "user-1")
+        finally:
+            uml_module._reset_render_pool()
+
+        assert sorted(paths) == sorted(DIAGRAM_TYPES)
+        for path in paths.values():
+            assert Path(path).is_file()
+            assert Path(path).is_relative_to(tmp_path)
@@ -0,0 +1,71 @@
+"""
+Unit Tests for the shared Redis pub/sub listener
+"""
+import asyncio
+import logging
+
+import pytest
+
+from app.core.pubsub import listen
+
+
+class FlakyPubSub:
+    """PubSub whose first listen() drops and whose first resubscribe fails"""
+
+    def __init__(self):
+        self.listens = 0
+        self.subscribes = 0
+        self.closed = False
+
+    async def listen(self):
+        self.listens += 1
+        yield {"type": "subscribe", "data": 1}
+        yield {"type": "message", "data": f"message-{self.listens}"}
+        if self.listens == 1:
+            raise ConnectionError("connection reset")
+        await asyncio.Event().wait()
+
+    async def subscribe(self, channel):
+        self.subscribes += 1
+        if self.subscribes == 1:
+            raise ConnectionError("still down")
+
+    async def close(self):
+        self.closed = True
+
+
+class TestListen:
+    """Test delivery, resubscription and shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_resubscribes_with_logged_failures(self, monkeypatch, caplog):
+        real_sleep = asyncio.sleep
+        sleeps = []
+
+        async def fast_sleep(delay):
+            sleeps.append(delay)
+            await real_sleep(0)
+
+        monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+        received = []
+        second_message = asyncio.Event()
+
+        def handler(data):
+            received.append(data)
+            if len(received) == 2:
+                second_message.set()
+
+        pubsub = FlakyPubSub()
+        with caplog.at_level(logging.WARNING):
+            task = asyncio.create_task(listen(pubsub, "chan", handler, "[Test]"))
+            await asyncio.wait_for(second_message.wait(), 1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert received == ["message-1", "message-2"]
+        assert pubsub.subscribes == 2
+        assert sleeps == [1.0, 2.0]  # Backs off instead of retrying every second
+        assert "Subscription to chan failed: connection reset" in caplog.text
+        assert "Resubscribe to chan failed: still down" in caplog.text
+        assert pubsub.closed
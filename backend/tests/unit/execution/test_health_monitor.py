@@ -0,0 +1,237 @@
+"""
+Unit Tests for HealthMonitor (event-driven state, pooled probes)
+"""
+import asyncio
+import queue
+import socket
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.modules.execution.container_manager import ContainerStatus, ProjectContainer
+from app.modules.execution.health_monitor import HealthMonitor, HealthStatus
+
+
+class FakeEventStream:
+    """Blocking iterator over queued events, like docker's CancellableStream"""
+
+    def __init__(self, events: "queue.Queue"):
+        self._events = events
+
+    def __iter__(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self._events.put(None)
+
+
+class FakeContainer:
+    def __init__(self, client, container_id: str, status: str = "running"):
+        self._client = client
+        self.id = container_id
+        self.status = status
+        self.restarts = 0
+
+    def restart(self, timeout=None):
+        self.restarts += 1
+        self._client.emit("die", self.id)
+        self._client.emit("start", self.id)
+
+
+class FakeContainers:
+    def __init__(self):
+        self.by_id = {}
+        self.get_calls = 0
+
+    def get(self, container_id):
+        self.get_calls += 1
+        return self.by_id[container_id]
+
+    def list(self, all=False, sparse=False):
+        return list(self.by_id.values())
+
+
+class FakeDockerClient:
+    """Just enough of docker.DockerClient for the health monitor"""
+
+    def __init__(self):
+        self.containers = FakeContainers()
+        self._events = queue.Queue()
+
+    def add(self, container_id: str, status: str = "running") -> FakeContainer:
+        container = FakeContainer(self, container_id, status)
+        self.containers.by_id[container_id] = container
+        return container
+
+    def emit(self, action: str, container_id: str):
+        self.containers.by_id[container_id].status = {
+            "start": "running", "die": "exited", "pause": "paused"
+        }.get(action, self.containers.by_id[container_id].status)
+        self._events.put({"Type": "container", "Action": action, "Actor": {"ID": container_id}})
+
+    def events(self, decode=False, filters=None):
+        return FakeEventStream(self._events)
+
+
+def make_manager(count: int, port_for=lambda i: None):
+    docker = FakeDockerClient()
+    containers = {}
+    for i in range(count):
+        container_id = f"{i:064x}"
+        docker.add(container_id)
+        port = port_for(i)
+        containers[f"project-{i}"] = ProjectContainer(
+            container_id=container_id,
+            project_id=f"project-{i}",
+            user_id="user-1",
+            status=ContainerStatus.RUNNING,
+            created_at=datetime.utcnow(),
+            last_activity=datetime.utcnow(),
+            port_mappings={3000: port} if port else {},
+            active_port=3000 if port else None,
+        )
+    return SimpleNamespace(containers=containers, docker=docker)
+
+
+async def wait_until(condition, timeout: float = 3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def dev_servers():
+    """An HTTP dev server, a hung one (accepts, never answers) and a closed port"""
+    async def ok(reader, writer):
+        await reader.readline()
+        writer.write(b"HTTP/1.1 200 OK\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    hung_clients = []
+
+    async def hung(reader, writer):
+        hung_clients.append(writer)
+
+    ok_server = await asyncio.start_server(ok, "127.0.0.1", 0)
+    hung_server = await asyncio.start_server(hung, "127.0.0.1", 0)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        closed_port = s.getsockname()[1]
+
+    yield SimpleNamespace(
+        ok=ok_server.sockets[0].getsockname()[1],
+        hung=hung_server.sockets[0].getsockname()[1],
+        closed=closed_port,
+    )
+
+    for writer in hung_clients:
+        writer.close()
+    for server in (ok_server, hung_server):
+        server.close()
+
+
+class TestHealthMonitorProbes:
+    """Active probes run concurrently with per-probe timeouts"""
+
+    async def test_sweep_of_1000_containers_is_bounded_by_hung_probes(self, dev_servers):
+        manager = make_manager(1000, lambda i: dev_servers.hung if i % 100 == 0 else dev_servers.ok)
+        monitor = HealthMonitor(manager, max_concurrent_probes=100, probe_timeout=0.5)
+        monitor._sync_registrations()
+        for project_id, state in monitor.health_states.items():
+            state.docker_status = "running"
+            state.ready = True
+
+        start = time.monotonic()
+        await monitor._check_all_containers()
+        elapsed = time.monotonic() - start
+
+        # Ten hung probes in sequence alone would take 5s
+        assert elapsed < 2.5
+        assert sorted(monitor.get_unhealthy_containers()) == sorted(f"project-{i}" for i in range(0, 1000, 100))
+        # State comes from events, not per-container Docker calls
+        assert manager.docker.containers.get_calls == 0
+
+    async def test_probe_failure_before_dev_server_is_up_is_starting(self, dev_servers):
+        manager = make_manager(1, lambda i: dev_servers.closed)
+        monitor = HealthMonitor(manager, probe_timeout=0.5)
+        monitor._sync_registrations()
+
+        check = await monitor._check_container("project-0")
+
+        assert check.status == HealthStatus.STARTING
+        assert check.consecutive_failures == 0
+
+    async def test_container_without_dev_server_is_healthy_while_running(self):
+        manager = make_manager(1)
+        monitor = HealthMonitor(manager)
+        monitor._sync_registrations()
+
+        check = await monitor._check_container("project-0")
+
+        assert check.status == HealthStatus.HEALTHY
+
+
+class TestHealthMonitorEvents:
+    """Running/exited state comes from the Docker events stream"""
+
+    async def test_die_event_triggers_restart(self):
+        manager = make_manager(1000)
+        monitor = HealthMonitor(manager, check_interval=3600)
+        await monitor.start()
+        try:
+            container_id = manager.containers["project-7"].container_id
+            manager.docker.emit("die", container_id)
+
+            fake = manager.docker.containers.by_id[container_id]
+            await wait_until(lambda: fake.restarts == 1 and monitor.get_health("project-7").docker_status == "running")
+            assert monitor.get_health("project-7").restart_count == 1
+            # The restart's own die/start events do not trigger another one
+            await asyncio.sleep(0.1)
+            assert fake.restarts == 1
+        finally:
+            await monitor.stop()
+
+    async def test_pause_event_does_not_restart(self):
+        manager = make_manager(10)
+        monitor = HealthMonitor(manager, check_interval=3600)
+        await monitor.start()
+        try:
+            container_id = manager.containers["project-3"].container_id
+            manager.docker.emit("pause", container_id)
+
+            await wait_until(lambda: monitor.get_health("project-3").docker_status == "paused")
+            assert manager.docker.containers.by_id[container_id].restarts == 0
+        finally:
+            await monitor.stop()
+
+    async def test_exited_container_found_on_start_is_restarted(self):
+        manager = make_manager(5)
+        exited = manager.docker.containers.by_id[manager.containers["project-2"].container_id]
+        exited.status = "exited"
+
+        monitor = HealthMonitor(manager, check_interval=3600)
+        await monitor.start()
+        try:
+            await wait_until(lambda: exited.restarts == 1)
+        finally:
+            await monitor.stop()
+
+    async def test_first_probes_are_spread_across_the_interval(self):
+        manager = make_manager(1000)
+        monitor = HealthMonitor(manager, check_interval=30)
+        await monitor.start()
+        try:
+            due = [state.next_check_at for state in monitor.health_states.values()]
+            assert max(due) - min(due) > 20
+            assert len(set(due)) > 900
+        finally:
+            await monitor.stop()
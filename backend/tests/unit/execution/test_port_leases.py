@@ -0,0 +1,117 @@
+"""
+Unit Tests for PortLeaseService (shared host-port leases)
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import pytest
+
+from app.modules.execution.container_manager import PortManager
+from app.modules.execution.docker_executor import PortAllocator
+from app.modules.execution.port_leases import PortLeaseService, _LocalStore, _RedisStore
+
+
+def redis_workers(count: int):
+    """Lease services of `count` workers sharing one Redis"""
+    server = fakeredis.FakeServer()
+    return [
+        PortLeaseService(store=_RedisStore(fakeredis.FakeRedis(server=server, decode_responses=True)))
+        for _ in range(count)
+    ]
+
+
+class TestConcurrentAllocation:
+    """Test that parallel allocations never collide"""
+
+    @pytest.mark.parametrize("backend", ["redis", "local"])
+    def test_1000_parallel_allocations_get_distinct_ports(self, backend):
+        if backend == "redis":
+            workers = redis_workers(4)
+        else:
+            workers = [PortLeaseService(store=_LocalStore())]
+
+        def allocate(i):
+            leases = workers[i % len(workers)]
+            return leases.acquire(f"project-{i}", host="tcp://10.0.1.50:2375", port_range=(35000, 36199))[0]
+
+        with ThreadPoolExecutor(max_workers=64) as pool:
+            ports = list(pool.map(allocate, range(1000)))
+
+        assert len(set(ports)) == 1000
+        assert all(35000 <= port <= 36199 for port in ports)
+        assert workers[0].ports("project-7", host="tcp://10.0.1.50:2375") == [ports[7]]
+
+    def test_exhausted_range_is_all_or_nothing(self):
+        leases, = redis_workers(1)
+        assert leases.acquire("a", count=3, port_range=(5000, 5004), exclude={5001}) == [5000, 5002, 5003]
+
+        with pytest.raises(RuntimeError):
+            leases.acquire("b", count=3, port_range=(5000, 5004))
+
+        assert leases.ports("b") == []
+        assert sorted(leases.acquire("b", count=2, port_range=(5000, 5004))) == [5001, 5004]
+        assert leases.stats["exhausted"] == 1
+
+    def test_executors_share_one_lease_space(self):
+        leases = PortLeaseService(store=_LocalStore())
+        manager = PortManager(leases)
+        allocator = PortAllocator(leases)
+        allocator.FRONTEND_PORT_END = allocator.FRONTEND_PORT_START  # Force overflow into the manager's range
+        allocator.OVERFLOW_PORT_START, allocator.OVERFLOW_PORT_END = 10000, 10003
+        manager.PORT_RANGE_START, manager.PORT_RANGE_END = 10000, 10003
+        manager._is_port_available = lambda port: True
+        allocator._is_port_available = lambda port: True
+
+        container_ports = {manager.allocate_port("p1") for _ in range(2)}
+        allocator.allocate_ports("p0")
+        compose_ports = allocator.allocate_ports("p2")
+
+        assert compose_ports["frontend"] in range(10000, 10004)
+        assert compose_ports["frontend"] not in container_ports
+        assert manager.get_stats()["total_allocated"] == 6
+
+
+class TestLeaseLifetime:
+    """Test release, reclaim and heartbeat"""
+
+    def test_release_only_frees_the_owners_ports(self):
+        worker_a, worker_b = redis_workers(2)
+        ports = worker_a.acquire("p1", count=2, port_range=(6000, 6001))
+        worker_a.release("p1", ports=[ports[0]])
+        assert worker_b.acquire("p2", port_range=(6000, 6001)) == [ports[0]]
+
+        # A stale release for a port now held by p2 leaves it alone
+        assert worker_a.release("p1", ports=[ports[0]]) == []
+        assert worker_b.ports("p2") == [ports[0]]
+        assert worker_b.release("p1") == [ports[1]]
+        assert worker_b.ports("p1") == []
+
+    def test_destroyed_container_frees_its_ports(self):
+        worker_a, worker_b = redis_workers(2)
+        ports = worker_a.acquire("p1", count=2, host="sandbox", port_range=(7000, 7099))
+        worker_a.attach("p1", "c0ffee", host="sandbox")
+
+        assert worker_b.reclaim_container("c0ffee") == ports
+        assert worker_b.reclaim_container("c0ffee") == []
+        assert worker_a.ports("p1", host="sandbox") == []
+        assert worker_b.stats["reclaimed"] == 2
+
+    def test_heartbeat_renews_lease_and_is_throttled(self):
+        client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        leases = PortLeaseService(store=_RedisStore(client))
+        port, = leases.acquire("p1", port_range=(8000, 8009))
+        leases.attach("p1", "c1")
+        for key in ("portlease:local:port:%d" % port, "portlease:local:owner:p1", "portlease:container:c1"):
+            client.expire(key, 10)
+
+        assert leases.heartbeat("p1", container_id="c1") is True
+        assert leases.heartbeat("p1", container_id="c1") is False
+        assert client.ttl("portlease:local:port:%d" % port) > 10
+        assert client.ttl("portlease:container:c1") > 10
+
+    def test_adopt_keeps_other_owners_ports(self):
+        leases = PortLeaseService(store=_LocalStore())
+        leases.acquire("p1", port_range=(9000, 9000))
+
+        assert leases.adopt("p2", [9000, 9001]) == [9001]
+        assert leases.ports("p1") == [9000]
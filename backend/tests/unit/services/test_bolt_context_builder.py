@@ -0,0 +1,139 @@
+"""
+Unit Tests for BoltContextBuilder (cached token index, BM25 ranking, budgeted selection)
+"""
+import json
+
+from app.modules.bolt.context_builder import BoltContextBuilder
+from app.modules.bolt.context_index import ContextIndexCache, ProjectIndex, term_counts
+
+
+def make_files():
+    return [
+        {"path": "package.json", "content": json.dumps({"dependencies": {"react": "18"}}), "language": "json"},
+        {"path": "src", "type": "folder"},
+        {"path": "src/App.tsx", "content": "export default function App() { return <Layout /> }",
+         "language": "typescript"},
+        {"path": "src/components/LoginForm.tsx",
+         "content": "export function LoginForm() {\n  const [password, setPassword] = useState('')\n"
+                    "  return <form onSubmit={login}>password</form>\n}", "language": "typescript"},
+        {"path": "src/utils/format.ts", "content": "export const formatDate = (d) => d.toISOString()",
+         "language": "typescript"},
+        {"path": "src/components/LoginForm.test.tsx", "content": "test('login password', () => {})",
+         "language": "typescript"},
+        {"path": "node_modules/react/index.js", "content": "password login", "language": "javascript"},
+    ]
+
+
+class TestContextIndex:
+    """Test tokenization and incremental index updates"""
+
+    def test_term_counts_split_identifiers(self):
+        counts = term_counts("const userProfile = getHTTPClient(user_id)")
+        assert counts["user"] == 2
+        assert counts["userprofile"] == 1
+        assert counts["profile"] == 1
+        assert counts["http"] == 1
+        assert counts["client"] == 1
+
+    def test_sync_reindexes_only_changed_files(self):
+        index = ProjectIndex()
+        files = make_files()
+        assert index.sync(files) == 6
+
+        assert index.sync(files) == 0
+
+        files[2] = {**files[2], "content": "export default function App() { return <Dashboard /> }"}
+        assert index.sync(files) == 1
+        assert "dashboard" in index.postings
+        assert "layout" not in index.postings
+        assert index.files["src/App.tsx"].changed_at > 0
+
+        assert index.sync(files[:3]) == 0
+        assert set(index.files) == {"package.json", "src/App.tsx"}
+        assert "password" not in index.postings
+
+    def test_bm25_prefers_focused_documents(self):
+        index = ProjectIndex()
+        index.sync([
+            {"path": "a.ts", "content": "password " * 3 + "x " * 10},
+            {"path": "b.ts", "content": "password " + "x " * 400},
+            {"path": "c.ts", "content": "nothing here"},
+        ])
+        scores = index.bm25({"password"})
+
+        assert set(scores) == {"a.ts", "b.ts"}
+        assert scores["a.ts"] > scores["b.ts"]
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ContextIndexCache(max_projects=2)
+        first = cache.get("p1")
+        second = cache.get("p2")
+        assert cache.get("p1") is first
+        cache.get("p3")
+
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["misses"] == 3
+        assert cache.get("p1") is first
+        assert cache.get("p2") is not second
+
+
+class TestBoltContextBuilder:
+    """Test ranking and token-budgeted selection"""
+
+    def builder(self):
+        return BoltContextBuilder(index_cache=ContextIndexCache())
+
+    def test_ranks_matching_file_first_and_excludes_vendored(self):
+        context = self.builder().build_context("fix the login password form", make_files(), index_key="p")
+        paths = [f.path for f in context.selected_files]
+
+        assert paths[0] == "src/components/LoginForm.tsx"
+        assert "node_modules/react/index.js" not in paths
+        assert context.selected_files[0].reason.startswith("Matches keywords")
+        assert context.project_type == "react"
+        assert context.tech_stack == ["React", "TypeScript"]
+        assert "LoginForm.tsx" in context.file_tree
+
+    def test_project_facts_cached_until_structure_changes(self):
+        builder = self.builder()
+        files = make_files()
+        builder.build_context("login", files, index_key="p")
+        index = builder.index_cache.get("p")
+        index.file_tree = "cached"
+
+        assert builder.build_context("login", files, index_key="p").file_tree == "cached"
+
+        files.append({"path": "src/New.tsx", "content": "", "language": "typescript"})
+        assert "New.tsx" in builder.build_context("login", files, index_key="p").file_tree
+
+    def test_large_file_is_excerpted_instead_of_starving_others(self):
+        """A top-ranked file over the budget share contributes snippets; the rest still fit"""
+        big = "\n".join(f"const filler{i} = {i}" for i in range(3000))
+        big = big.replace("const filler1500 = 1500", "function checkoutTotal(cart) { return 0 }")
+        files = [
+            {"path": "src/Checkout.tsx", "content": big + "\n// checkout checkout", "language": "typescript"},
+            {"path": "src/CheckoutButton.tsx", "content": "export const CheckoutButton = () => null",
+             "language": "typescript"},
+        ]
+        context = self.builder().build_context("checkout total", files, max_tokens=2000, index_key="p")
+        selected = {f.path: f for f in context.selected_files}
+
+        assert set(selected) == {"src/Checkout.tsx", "src/CheckoutButton.tsx"}
+        excerpt = selected["src/Checkout.tsx"]
+        assert "excerpt: lines" in excerpt.reason
+        assert "checkoutTotal" in excerpt.content
+        assert len(excerpt.content) // 4 <= 1000
+
+    def test_recently_edited_file_gets_boost(self):
+        builder = self.builder()
+        files = [
+            {"path": "src/a.ts", "content": "export const a = 1", "language": "typescript"},
+            {"path": "src/b.ts", "content": "export const b = 1", "language": "typescript"},
+        ]
+        builder.build_context("update", files, index_key="p")
+        files[1] = {**files[1], "content": "export const b = 2"}
+        context = builder.build_context("update", files, index_key="p")
+
+        assert context.selected_files[0].path == "src/b.ts"
+        assert context.selected_files[0].relevance_score > context.selected_files[1].relevance_score
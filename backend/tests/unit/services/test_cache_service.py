@@ -0,0 +1,172 @@
+"""
+Unit Tests for CacheService (in-process tier, pipelining, invalidation broadcast)
+"""
+import asyncio
+import importlib
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.services.cache_service import (
+    CacheService,
+    JSONSerializer,
+    LocalCache,
+    TextSerializer,
+    get_serializer,
+)
+
+
+def make_cache(server):
+    cache = CacheService()
+    cache._redis = FakeRedis(server=server)
+    return cache
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+class TestLocalCache:
+    """Test the bounded in-process LRU"""
+
+    def test_evicts_least_recently_used_by_entries_and_bytes(self):
+        local = LocalCache(max_entries=3, max_bytes=10)
+        local.set("a", b"1", 30)
+        local.set("b", b"2", 30)
+        local.set("c", b"3", 30)
+        local.get("a")
+        local.set("d", b"4", 30)
+        assert local.get("b") is None
+        assert local.get("a") == b"1"
+
+        local.set("big", b"x" * 8, 30)
+        assert local.get("c") is None
+        assert local.bytes == 10
+        local.set("huge", b"x" * 11, 30)
+        assert local.get("huge") is None
+
+    def test_expiry_and_patterns(self):
+        local = LocalCache(max_entries=10, max_bytes=100)
+        local.set("files:p1", b"[]", 0)
+        assert local.get("files:p1") is None
+        local.set("files:p1", b"[]", 30)
+        local.set("content:p1:a.py", b"x", 30)
+        local.set("content:p2:a.py", b"y", 30)
+        local.delete_matching("*p1*")
+        assert len(local) == 1 and local.bytes == 1
+
+
+class TestSerializers:
+    """Test pluggable serializers"""
+
+    def test_round_trips(self):
+        value = {"id": "p1", "files": [1, 2], "meta": None}
+        assert JSONSerializer().loads(JSONSerializer().dumps(value)) == value
+        assert TextSerializer().loads(TextSerializer().dumps("héllo")) == "héllo"
+        serializer = get_serializer("msgpack")
+        assert serializer.loads(serializer.dumps(value)) == value
+        with pytest.raises(ValueError):
+            get_serializer("pickle")
+
+    def test_msgpack_falls_back_to_json(self, monkeypatch):
+        monkeypatch.setattr(importlib.import_module("app.services.cache_service"), "msgpack", None)
+        assert get_serializer("msgpack").name == "json"
+
+
+class TestTwoTierCache:
+    """Test reads, writes and invalidation across the two tiers"""
+
+    @pytest.mark.asyncio
+    async def test_hot_keys_are_served_in_process(self):
+        cache = make_cache(FakeServer())
+        await cache.set_project("p1", {"title": "Shop"})
+
+        for _ in range(5):
+            project = await cache.get_project("p1")
+        project["title"] = "mutated"
+
+        assert await cache.get_project("p1") == {"title": "Shop"}
+        stats = cache.get_stats()
+        assert stats["local_hits"] == 6 and stats["redis_hits"] == 0
+        assert stats["hit_ratio"] == 1.0
+        assert stats["redis_latency_ms"]["set"]["samples"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_and_set_many_take_one_round_trip(self):
+        server = FakeServer()
+        writer, reader = make_cache(server), make_cache(server)
+        assert await writer.set_many({f"k{i}": {"n": i} for i in range(20)}, ttl=60)
+        assert writer.get_stats()["redis_latency_ms"]["set"]["samples"] == 1
+
+        await reader.get("k0")
+        found = await reader.get_many([f"k{i}" for i in range(25)])
+
+        assert found == {f"k{i}": {"n": i} for i in range(20)}
+        stats = reader.get_stats()
+        assert stats["redis_latency_ms"]["get"]["samples"] == 2
+        assert (stats["local_hits"], stats["redis_hits"], stats["misses"]) == (1, 20, 5)
+        assert await reader.get_many([f"k{i}" for i in range(20)]) == found
+        assert reader.get_stats()["redis_latency_ms"]["get"]["samples"] == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_and_deletes_reach_other_workers(self):
+        server = FakeServer()
+        worker_a, worker_b = make_cache(server), make_cache(server)
+        await worker_b.start()
+        try:
+            await worker_a.set_user_active_project("u1", "p1")
+            assert await worker_b.get_user_active_project("u1") == "p1"
+
+            await worker_a.set_user_active_project("u1", "p2")
+            assert await wait_for(lambda: worker_b.stats["remote_invalidations"] == 2)
+            assert await worker_b.get_user_active_project("u1") == "p2"
+
+            await worker_a.set_file_content("p1", "app.py", "print(1)")
+            assert await worker_b.get_file_content("p1", "app.py") == "print(1)"
+            await worker_a.clear_all_project_cache("p1")
+            assert await wait_for(lambda: worker_b.stats["remote_invalidations"] == 4)
+            assert await worker_b.get_file_content("p1", "app.py") is None
+        finally:
+            await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = make_cache(FakeServer())
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"plan": "pro"}
+
+        values = await asyncio.gather(*(cache.get_or_set("plan:pro", load, ttl=60) for _ in range(50)))
+
+        assert calls == 1
+        assert all(value == {"plan": "pro"} for value in values)
+        assert cache.stats["coalesced_loads"] == 49
+        assert await cache.get_or_set("plan:pro", load, ttl=60) == {"plan": "pro"}
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_misses(self):
+        cache = CacheService()
+
+        class BrokenRedis:
+            async def get(self, key):
+                raise ConnectionError("down")
+
+            def pipeline(self, transaction=True):
+                raise ConnectionError("down")
+
+        cache._redis = BrokenRedis()
+        assert await cache.set_project("p1", {"title": "x"}) is False
+        assert await cache.get_project("p1") is None
+        assert cache.get_stats()["local_entries"] == 0
+        assert cache.stats["errors"] == 2
@@ -0,0 +1,135 @@
+"""
+Unit Tests for ContainerStateService sorted-set indexes
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.core.config import settings
+from app.services.container_state import (
+    ContainerInfo,
+    ContainerState,
+    ContainerStateService,
+)
+
+
+def make_info(project_id: str, idle_seconds: int = 0, age_seconds: int = 0,
+              state: str = ContainerState.RUNNING.value) -> ContainerInfo:
+    now = datetime.utcnow()
+    return ContainerInfo(
+        container_id=f"c-{project_id}",
+        project_id=project_id,
+        user_id="user-1",
+        state=state,
+        created_at=(now - timedelta(seconds=max(age_seconds, idle_seconds))).isoformat(),
+        last_activity=(now - timedelta(seconds=idle_seconds)).isoformat(),
+        port_mappings={3000: 10000},
+    )
+
+
+@pytest.fixture
+async def service():
+    svc = ContainerStateService()
+    svc._redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    svc._initialized = True
+    yield svc
+    await svc._redis.aclose()
+
+
+class TestContainerStateIndexes:
+    """Expiry and pause candidates come from the sorted-set indexes"""
+
+    async def test_save_indexes_container(self, service):
+        await service.save_container(make_info("p1"))
+
+        assert await service._redis.zscore(service._get_activity_index_key(), "p1") is not None
+        assert await service._redis.zscore(service._get_created_index_key(), "p1") is not None
+
+    async def test_expired_by_idle_and_lifetime(self, service):
+        idle = settings.CONTAINER_IDLE_TIMEOUT_SECONDS
+        lifetime = settings.CONTAINER_MAX_LIFETIME_SECONDS
+        await service.save_container(make_info("fresh"))
+        await service.save_container(make_info("idle", idle_seconds=idle + 60))
+        await service.save_container(make_info("old", age_seconds=lifetime + 60))
+        service._local_cache.clear()
+
+        expired = await service.get_expired_containers()
+
+        assert sorted(info.project_id for info in expired) == ["idle", "old"]
+
+    async def test_containers_to_pause_only_running(self, service):
+        pause_after = settings.CONTAINER_PAUSE_AFTER_IDLE_SECONDS
+        await service.save_container(make_info("active"))
+        await service.save_container(make_info("idle", idle_seconds=pause_after + 30))
+        await service.save_container(
+            make_info("paused", idle_seconds=pause_after + 30, state=ContainerState.PAUSED.value)
+        )
+        service._local_cache.clear()
+
+        to_pause = await service.get_containers_to_pause()
+
+        assert [info.project_id for info in to_pause] == ["idle"]
+
+    async def test_heartbeat_moves_container_out_of_pause_window(self, service):
+        pause_after = settings.CONTAINER_PAUSE_AFTER_IDLE_SECONDS
+        await service.save_container(make_info("p1", idle_seconds=pause_after + 30))
+        service._local_cache.clear()
+
+        await service.update_heartbeats(["p1", "unknown"])
+
+        assert await service.get_containers_to_pause() == []
+        # Heartbeats never add untracked containers to the index
+        assert await service._redis.zscore(service._get_activity_index_key(), "unknown") is None
+        info = await service.get_container("p1")
+        assert not info.should_pause(pause_after)
+
+    async def test_stale_snapshot_does_not_rewind_activity(self, service):
+        pause_after = settings.CONTAINER_PAUSE_AFTER_IDLE_SECONDS
+        stale = make_info("p1", idle_seconds=pause_after + 30)
+        await service.save_container(stale)
+        await service.update_heartbeat("p1")
+
+        stale.last_activity = (datetime.utcnow() - timedelta(seconds=pause_after + 30)).isoformat()
+        await service.save_container(stale)
+        service._local_cache.clear()
+
+        assert await service.get_containers_to_pause() == []
+
+    async def test_delete_removes_index_entries(self, service):
+        await service.save_container(make_info("p1"))
+        await service.delete_container("p1")
+
+        assert await service._redis.zcard(service._get_activity_index_key()) == 0
+        assert await service._redis.zcard(service._get_created_index_key()) == 0
+
+    async def test_expired_records_are_pruned_from_index(self, service):
+        idle = settings.CONTAINER_IDLE_TIMEOUT_SECONDS
+        await service.save_container(make_info("gone", idle_seconds=idle + 60))
+        await service._redis.delete(service._get_container_key("gone"))
+        service._local_cache.clear()
+
+        assert await service.get_expired_containers() == []
+        assert await service._redis.zcard(service._get_activity_index_key()) == 0
+
+    async def test_rebuild_index_from_legacy_records(self, service):
+        idle = settings.CONTAINER_IDLE_TIMEOUT_SECONDS
+        legacy = make_info("legacy", idle_seconds=idle + 60)
+        await service._redis.set(service._get_container_key("legacy"), json.dumps(legacy.to_dict()))
+        await service._redis.set(service._get_heartbeat_key("legacy"), legacy.last_activity)
+
+        assert await service.rebuild_index() == 1
+        expired = await service.get_expired_containers()
+        assert [info.project_id for info in expired] == ["legacy"]
+
+    async def test_stats(self, service):
+        await service.save_container(make_info("r1"))
+        await service.save_container(make_info("p1", state=ContainerState.PAUSED.value))
+
+        stats = await service.get_stats()
+
+        assert stats["total_containers"] == 2
+        assert stats["running"] == 1
+        assert stats["paused"] == 1
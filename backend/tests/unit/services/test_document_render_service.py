@@ -0,0 +1,159 @@
+"""
+Unit Tests for DocumentRenderService
+"""
+import asyncio
+import io
+import zipfile
+import pytest
+
+from app.services import document_render_service as drs
+from app.services.document_render_service import DocumentRenderService, RenderError
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Render in threads: same job/dedup/progress path without spawning workers
+    monkeypatch.setattr(drs.settings, "DOCUMENT_RENDER_WORKERS", 0)
+    monkeypatch.setattr(drs.settings, "DOCUMENT_RENDER_BACKEND", "process")
+    return DocumentRenderService()
+
+
+@pytest.fixture
+def fake_renderer(monkeypatch):
+    calls = []
+
+    def render(payload, progress):
+        calls.append(payload)
+        if payload.get("fail"):
+            raise ValueError("boom")
+        for i in range(1, 4):
+            progress(i, 3, f"section {i}")
+        return b"rendered:" + payload["name"].encode()
+
+    monkeypatch.setitem(drs.RENDERERS, "docx", render)
+    return calls
+
+
+class TestDocumentRenderService:
+    """Test render job execution, progress and deduplication"""
+
+    @pytest.mark.asyncio
+    async def test_render_returns_content(self, service, fake_renderer):
+        result = await service.render("docx", {"name": "a"})
+
+        assert result["content"] == b"rendered:a"
+        assert result["format"] == "docx"
+        assert result["size_bytes"] == len(b"rendered:a")
+
+    @pytest.mark.asyncio
+    async def test_events_stream_progress_then_complete(self, service, fake_renderer):
+        job = service.submit("docx", {"name": "a"})
+        events = [event async for event in job.events()]
+
+        progress = [e for e in events if e["type"] == "render_progress"]
+        assert [e["completed"] for e in progress] == [1, 2, 3]
+        assert progress[-1]["progress"] == 100
+        assert events[-1]["type"] == "render_complete"
+        assert "content" not in events[-1]
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_job(self, service, fake_renderer):
+        first = service.submit("docx", {"name": "a"})
+        second = service.submit("docx", {"name": "a"})
+        other = service.submit("docx", {"name": "b"})
+
+        assert first is second
+        assert other is not first
+        await asyncio.gather(first.wait(), other.wait())
+
+        # Finished jobs are reused within the TTL
+        assert service.submit("docx", {"name": "a"}) is first
+        assert len(fake_renderer) == 2
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_gets_full_history(self, service, fake_renderer):
+        job = service.submit("docx", {"name": "a"})
+        await job.wait()
+
+        events = [event async for event in service.submit("docx", {"name": "a"}).events()]
+        assert len(events) == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_is_reported_and_not_reused(self, service, fake_renderer):
+        job = service.submit("docx", {"name": "a", "fail": True})
+
+        with pytest.raises(RenderError, match="boom"):
+            await job.wait()
+        events = [event async for event in job.events()]
+        assert events[-1] == {"type": "render_error", "job_id": job.job_id, "error": "boom"}
+
+        retry = service.submit("docx", {"name": "a", "fail": True})
+        assert retry is not job
+        with pytest.raises(RenderError):
+            await retry.wait()
+
+    @pytest.mark.asyncio
+    async def test_expired_results_are_dropped(self, service, fake_renderer, monkeypatch):
+        job = service.submit("docx", {"name": "a"})
+        await job.wait()
+
+        monkeypatch.setattr(drs.settings, "DOCUMENT_RENDER_RESULT_TTL", 0)
+        job.finished_at -= 1
+        assert service.submit("docx", {"name": "a"}) is not job
+
+    @pytest.mark.asyncio
+    async def test_store_saves_instead_of_returning_bytes(self, service, fake_renderer, monkeypatch):
+        stored = []
+
+        async def fake_store(kind, payload, content):
+            stored.append((kind, content))
+            return {"path": "documents/u/p/word/a.docx", "s3_key": "documents/u/p/word/a.docx"}
+
+        monkeypatch.setattr(service, "store", fake_store)
+        result = await service.render("docx", {"name": "a"}, store=True)
+
+        assert result["path"] == "documents/u/p/word/a.docx"
+        assert "content" not in result
+        assert stored == [("docx", b"rendered:a")]
+
+    @pytest.mark.asyncio
+    async def test_celery_job_fails_when_no_worker_finishes(self, service, monkeypatch):
+        from app.modules.documents import tasks
+
+        class PendingResult:
+            state = "PENDING"
+            revoked = False
+
+            def revoke(self):
+                self.revoked = True
+
+        pending = PendingResult()
+        monkeypatch.setattr(tasks.render_document_task, "apply_async", lambda **kwargs: pending)
+        monkeypatch.setattr(drs.settings, "DOCUMENT_RENDER_BACKEND", "celery")
+        monkeypatch.setattr(drs.settings, "DOCUMENT_RENDER_TIMEOUT", 0)
+
+        with pytest.raises(RenderError, match="did not finish"):
+            await service.render("docx", {"name": "a"}, store=True)
+        assert pending.revoked
+
+    def test_unknown_kind(self, service):
+        with pytest.raises(ValueError):
+            service.submit("odt", {})
+
+    @pytest.mark.asyncio
+    async def test_renders_word_document(self, service):
+        sections = [
+            {"section_id": "intro", "title": "Introduction", "type": "generate",
+             "content": {"content": "Overview of the system."}},
+            {"section_id": "toc", "title": "Contents", "type": "auto", "content": {}},
+        ]
+        job = service.submit("docx", {
+            "sections": sections,
+            "project_data": {"project_name": "Demo"},
+            "document_type": "project_report"
+        })
+        events = [event async for event in job.events()]
+        result = await job.wait()
+
+        assert [e["completed"] for e in events if e["type"] == "render_progress"] == [1, 2]
+        assert "word/document.xml" in zipfile.ZipFile(io.BytesIO(result["content"])).namelist()
@@ -0,0 +1,141 @@
+"""
+Unit Tests for PasswordHasher (bcrypt pool, admission control, rehash)
+"""
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import PasswordHashBusyError
+from app.core.security import get_password_hash
+from app.services.password_hasher import PasswordHasher
+
+
+async def measure_loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.005):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+class TestEventLoopLag:
+    """Test that a login burst does not stall other coroutines"""
+
+    @pytest.mark.asyncio
+    async def test_200_concurrent_logins(self, monkeypatch):
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 6)
+        hashed = get_password_hash("correct horse")
+        users = [SimpleNamespace(email=f"student{i}@college.edu", hashed_password=hashed) for i in range(200)]
+        hasher = PasswordHasher(workers=4)
+
+        # The same burst run inline, for scale
+        started = time.perf_counter()
+        for user in users[:20]:
+            get_password_hash("correct horse")
+        inline_block = (time.perf_counter() - started) * 10
+
+        stop, lag = asyncio.Event(), []
+        ticker = asyncio.create_task(measure_loop_lag(stop, lag))
+        results = await asyncio.gather(*(
+            hasher.verify_and_update(user, "correct horse", ip=f"10.0.{i % 8}.1")
+            for i, user in enumerate(users)
+        ))
+        stop.set()
+        await ticker
+        hasher.shutdown()
+
+        assert all(results)
+        assert hasher.get_stats()["completed"] == 200
+        # Inline, the loop would have been blocked for the whole burst
+        assert max(lag) < min(0.1, inline_block / 4), f"max lag {max(lag) * 1000:.1f}ms"
+        assert statistics.median(lag) < 0.02
+
+
+class TestRehash:
+    """Test transparent rehash when BCRYPT_ROUNDS changes"""
+
+    @pytest.mark.asyncio
+    async def test_login_upgrades_cost_factor(self, monkeypatch):
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+        user = SimpleNamespace(email="a@b.c", hashed_password=get_password_hash("pw-123456"))
+        hasher = PasswordHasher(workers=1)
+
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+        assert hasher.needs_rehash(user.hashed_password)
+        assert await hasher.verify_and_update(user, "pw-123456")
+        assert user.hashed_password.startswith("$2b$05$")
+        assert not await hasher.verify_and_update(user, "wrong")
+        assert hasher.get_stats()["rehashed"] == 1
+        hasher.shutdown()
+
+    def test_unparseable_hash_is_left_alone(self):
+        assert not PasswordHasher.needs_rehash(None)
+        assert not PasswordHasher.needs_rehash("not-a-bcrypt-hash")
+
+
+class TestAdmission:
+    """Test per-IP/per-account caps and fair dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_caps_reject_with_retry_after(self, monkeypatch):
+        monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PER_ACCOUNT", 2)
+        monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PER_IP", 3)
+        hasher = PasswordHasher(workers=1)
+
+        pending = [
+            asyncio.create_task(hasher._submit(time.sleep, (0.05,), "1.1.1.1", "victim@x.com"))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHashBusyError) as exc_info:
+            await hasher._submit(time.sleep, (0.05,), "2.2.2.2", "victim@x.com")
+        assert exc_info.value.details["scope"] == "account"
+        assert exc_info.value.retry_after >= 1
+
+        pending.append(asyncio.create_task(hasher._submit(time.sleep, (0.05,), "1.1.1.1", "other@x.com")))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHashBusyError) as exc_info:
+            await hasher._submit(time.sleep, (0.05,), "1.1.1.1", "third@x.com")
+        assert exc_info.value.details["scope"] == "ip"
+
+        await asyncio.gather(*pending)
+        # Capacity is released once the burst drains
+        await hasher._submit(time.sleep, (0,), "1.1.1.1", "victim@x.com")
+        assert hasher.get_stats()["rejected_account"] == 1
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_bursting_ip_does_not_starve_others(self):
+        hasher = PasswordHasher(workers=1)
+        finished = []
+
+        async def login(ip, n):
+            await hasher._submit(time.sleep, (0.01,), ip, None)
+            finished.append((ip, n))
+
+        burst = [asyncio.create_task(login("6.6.6.6", n)) for n in range(10)]
+        await asyncio.sleep(0)
+        student = asyncio.create_task(login("10.0.0.1", 0))
+        await asyncio.gather(student, *burst)
+
+        assert finished.index(("10.0.0.1", 0)) <= 2
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        hasher = PasswordHasher(workers=1)
+        first = asyncio.create_task(hasher._submit(time.sleep, (0.02,), "a", None))
+        abandoned = asyncio.create_task(hasher._submit(time.sleep, (1,), "a", None))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+
+        started = time.perf_counter()
+        await first
+        await hasher._submit(time.sleep, (0,), "a", None)
+        assert time.perf_counter() - started < 0.5
+        assert hasher.get_stats()["queued"] == 0
+        hasher.shutdown()
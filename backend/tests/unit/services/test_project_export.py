@@ -0,0 +1,157 @@
+"""
+Unit Tests for streaming project export (ProjectExportService + zip_stream)
+"""
+import io
+import os
+import json
+import zipfile
+import pytest
+
+from app.services.project_export import ProjectExportService, clean_platform_code
+from app.utils.zip_stream import ZipEntry, stream_zip
+
+
+def unzip(chunks) -> zipfile.ZipFile:
+    zf = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert zf.testzip() is None
+    return zf
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "App.tsx").write_text("export const url = window.__errorCapture;\n")
+    (root / "src" / "logo.bin").write_bytes(bytes(range(256)) * 1000)
+    (root / "index.html").write_text(
+        '<html><script src="/error-capture.js"></script><div id="root"></div></html>'
+    )
+    (root / "error-capture.js").write_text("report()")
+    (root / ".bharatbuild").mkdir()
+    (root / ".bharatbuild" / "state.json").write_text("{}")
+    (root / "node_modules" / "react").mkdir(parents=True)
+    (root / "node_modules" / "react" / "index.js").write_text("module.exports = {}")
+    (root / "package.json").write_text(json.dumps({"name": "demo", "dependencies": {"react": "^18.0.0"}}))
+    (root / ".env").write_text("VITE_KEY=secret\n")
+    (root / "vite.config.ts").write_text("export default {}")
+    return root
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.gettempdir", lambda: str(tmp_path / "tmp"))
+    return ProjectExportService()
+
+
+class TestStreamZip:
+    """Test the streaming ZIP writer"""
+
+    def test_streams_files_bytes_and_transforms(self, tmp_path):
+        big = tmp_path / "big.bin"
+        big.write_bytes(b"x" * 300_000)
+        text = tmp_path / "a.js"
+        text.write_text("hello")
+
+        chunks = list(stream_zip([
+            ZipEntry.from_file("big.bin", big),
+            ZipEntry.from_file("a.js", text, transform=lambda b: b.upper()),
+            ZipEntry.from_bytes("README.md", b"readme"),
+        ]))
+
+        zf = unzip(chunks)
+        assert zf.read("big.bin") == b"x" * 300_000
+        assert zf.read("a.js") == b"HELLO"
+        assert zf.read("README.md") == b"readme"
+
+    def test_yields_before_finishing(self, tmp_path):
+        """First chunk is produced before later files are read"""
+        files = []
+        for i in range(5):
+            path = tmp_path / f"f{i}.bin"
+            path.write_bytes(os.urandom(200_000))  # incompressible
+            files.append(ZipEntry.from_file(path.name, path))
+
+        stream = stream_zip(files)
+        next(stream)
+        (tmp_path / "f4.bin").unlink()  # not opened yet
+        with pytest.raises(FileNotFoundError):
+            list(stream)
+
+
+class TestProjectExport:
+    """Test export planning and streaming"""
+
+    @pytest.mark.asyncio
+    async def test_plan_and_stream(self, service, project):
+        plan = await service.plan_export(str(project), "Demo App", "A demo")
+
+        assert plan.result.success
+        assert plan.framework == "react-vite"
+        names = unzip(service.stream_export(plan)).namelist()
+
+        assert "src/App.tsx" in names
+        assert "src/logo.bin" in names
+        assert not any(n.startswith("node_modules/") for n in names)
+        assert "error-capture.js" not in names
+        assert not any(n.startswith(".bharatbuild") for n in names)
+        for generated in ("README.md", ".env.example", ".gitignore", "package.json"):
+            assert generated in names
+        assert plan.result.file_count == len(names)
+        assert any("error-capture.js" in w for w in plan.result.warnings)
+
+    @pytest.mark.asyncio
+    async def test_overlay_and_cleaning(self, service, project):
+        plan = await service.plan_export(str(project), "Demo App", "A demo")
+        zf = unzip(service.stream_export(plan))
+
+        assert b"__errorCapture" not in zf.read("src/App.tsx")
+        assert b"error-capture.js" not in zf.read("index.html")
+        assert zf.read("src/logo.bin") == (project / "src" / "logo.bin").read_bytes()
+
+        package = json.loads(zf.read("package.json"))
+        assert package["name"] == "demo"
+        assert "vite" in package["devDependencies"]
+        assert b"VITE_KEY=your_value_here" in zf.read(".env.example")
+        assert "# Demo App" in zf.read("README.md").decode()
+
+        # Source tree untouched
+        assert "__errorCapture" in (project / "src" / "App.tsx").read_text()
+        assert not (project / "README.md").exists()
+
+    @pytest.mark.asyncio
+    async def test_export_project_writes_zip_without_copy(self, service, project):
+        result = await service.export_project(str(project), "Demo App")
+
+        assert result.success
+        assert zipfile.ZipFile(result.zip_path).testzip() is None
+        assert [p.suffix for p in service.temp_dir.iterdir()] == [".zip"]
+
+    @pytest.mark.asyncio
+    async def test_missing_project(self, service, tmp_path):
+        plan = await service.plan_export(str(tmp_path / "missing"), "X")
+        assert not plan.result.success
+        assert plan.entries == []
+
+    def test_clean_platform_code_keeps_unchanged_bytes(self):
+        data = b"const a = 1;\xff"
+        assert clean_platform_code(data) is data
+
+
+class TestTempSessionStreamZip:
+    """Test session ZIPs streamed from temp storage"""
+
+    def test_stream_zip_uses_project_root_folder(self, tmp_path, monkeypatch):
+        from app.services import temp_session_storage as tss
+
+        monkeypatch.setattr(tss, "TEMP_BASE_DIR", tmp_path)
+        storage = tss.TempSessionStorage.__new__(tss.TempSessionStorage)
+        storage._sessions = {}
+        storage._lock = __import__("threading").Lock()
+        files = tmp_path / "s1" / "files" / "src"
+        files.mkdir(parents=True)
+        (files / "main.py").write_text("print('hi')")
+        monkeypatch.setattr(storage, "_get_files_path", lambda sid: tmp_path / sid / "files")
+
+        zf = unzip(storage.stream_zip("s1", "My App!"))
+        assert zf.namelist() == ["My App/src/main.py"]
+        assert storage.stream_zip("missing", "x") is None
@@ -0,0 +1,464 @@
+"""
+Unit Tests for QuizSessionService (question bank cache, sessions, answers, grading)
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from app.api.v1.endpoints.campus_drive import get_result, resume_quiz, save_quiz_progress, start_quiz, submit_quiz
+from app.models.campus_drive import (
+    CampusDrive,
+    CampusDriveQuestion,
+    CampusDriveRegistration,
+    CampusDriveResponse,
+    QuestionCategory,
+    RegistrationStatus,
+)
+from app.schemas.campus_drive import QuizProgressSave, QuizSubmission
+from app.services.quiz_session_service import (
+    QuizSessionService,
+    SessionItem,
+    QuizSession,
+    grade_session,
+    quiz_sessions,
+    stable_rng,
+)
+
+
+@contextmanager
+def count_queries(db_session):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hset(self, key, mapping):
+        self.calls.append(("hset", key, mapping))
+
+    def expireat(self, key, when):
+        self.calls.append(("expireat", key, when))
+
+    def get(self, key):
+        self.calls.append(("get", key, None))
+
+    def hgetall(self, key):
+        self.calls.append(("hgetall", key, None))
+
+    def publish(self, channel, message):
+        self.calls.append(("publish", channel, message))
+
+    async def execute(self):
+        replies = []
+        for name, key, arg in self.calls:
+            if name == "hset":
+                self.redis.hashes.setdefault(key, {}).update({k: str(v) for k, v in arg.items()})
+            elif name == "expireat":
+                self.redis.expiry[key] = arg
+            elif name == "get":
+                replies.append(self.redis.strings.get(key))
+            elif name == "hgetall":
+                replies.append(dict(self.redis.hashes.get(key, {})))
+            else:
+                self.redis.published.append((key, arg))
+        self.redis.executed += 1
+        return replies
+
+
+class FakeRedis:
+    def __init__(self):
+        self.strings = {}
+        self.hashes = {}
+        self.expiry = {}
+        self.published = []
+        self.executed = 0
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def set(self, key, value, ex=None, exat=None):
+        self.strings[key] = value
+        self.expiry[key] = exat or ex
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.strings.pop(key, None)
+            self.hashes.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+async def seed_drive(db_session, per_category=4, count=2, takers=1):
+    drive = CampusDrive(
+        name="Drive",
+        quiz_duration_minutes=30,
+        passing_percentage=50.0,
+        logical_questions=count,
+        technical_questions=count,
+        ai_ml_questions=count,
+        english_questions=count,
+        coding_questions=count,
+    )
+    db_session.add(drive)
+    await db_session.flush()
+    for category in QuestionCategory:
+        for i in range(per_category):
+            db_session.add(CampusDriveQuestion(
+                question_text=f"{category.value} {i}",
+                category=category,
+                options=["a", "b", "c", "d"],
+                correct_option=i % 4,
+                marks=1.0,
+                is_global=True
+            ))
+    for n in range(takers):
+        db_session.add(CampusDriveRegistration(
+            campus_drive_id=drive.id,
+            full_name=f"Student {n}",
+            email=f"student{n}@college.edu",
+            phone="9999999999",
+            college_name="College",
+            department="CSE",
+            year_of_study="4",
+        ))
+    await db_session.commit()
+    return str(drive.id)
+
+
+async def expire(db_session, service, drive_id, email, seconds_ago=60):
+    """Move a started quiz's clock back so its deadline passed seconds_ago"""
+    session = await service.get_session(drive_id, email)
+    shift = session.deadline - datetime.utcnow() + timedelta(seconds=seconds_ago)
+    session.started_at -= shift
+    await service.save_session(session)
+    registration = (await db_session.execute(
+        select(CampusDriveRegistration).where(CampusDriveRegistration.email == email)
+    )).scalar_one()
+    registration.quiz_start_time -= shift
+    registration.quiz_deadline -= shift
+    await db_session.commit()
+    return registration
+
+
+async def correct_answers(db_session, drive_id, email):
+    """Shown option positions that pick each served question's correct option"""
+    session = await quiz_sessions.get_session(drive_id, email)
+    return {item.question_id: item.order.index(item.correct_option) for item in session.items}
+
+
+class TestDeterministicShuffles:
+    """Test that selection and option order do not depend on the process"""
+
+    def test_stable_rng_ignores_hash_seed(self):
+        code = (
+            "from app.services.quiz_session_service import stable_rng;"
+            "print(stable_rng('reg-1', 'q-1').sample(range(100), 5))"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed}, cwd=os.getcwd()
+            ).stdout.strip().splitlines()[-1]
+            for seed in ("1", "2")
+        }
+        assert outputs == {str(stable_rng("reg-1", "q-1").sample(range(100), 5))}
+
+    def test_grading_maps_shown_positions_back(self):
+        session = QuizSession(
+            registration_id="r1", drive_id="d1", email="a@b.c", started_at=datetime.utcnow(),
+            duration_minutes=30, passing_percentage=50.0,
+            items=[
+                SessionItem("q1", [3, 2, 1, 0], "logical", 1.0, correct_option=0),
+                SessionItem("q2", [1, 0, 2, 3], "coding", 2.0, correct_option=1),
+                SessionItem("q3", [0, 1, 2, 3], "english", 1.0, correct_option=2),
+            ],
+        )
+        grade = grade_session(session, {"q1": 3, "q2": 1, "q3": 7})
+
+        assert (grade.attempted, grade.correct, grade.wrong) == (2, 1, 1)
+        assert grade.marks_obtained == 1.0 and grade.total_marks == 4.0
+        assert grade.section_scores["logical"] == {"obtained": 1.0, "total": 1.0}
+        assert not grade.is_qualified
+        assert [r["selected_option"] for r in grade.responses] == [3, 1, None]
+
+
+class TestQuizFlow:
+    """Test the quiz endpoints on top of sessions"""
+
+    @pytest.mark.asyncio
+    async def test_start_save_submit(self, db_session):
+        drive_id = await seed_drive(db_session)
+        email = "student0@college.edu"
+
+        started = await start_quiz(drive_id, email, db_session)
+        assert started.total_questions == 10
+        # A refresh serves the same questions without restarting the timer
+        with count_queries(db_session) as statements:
+            again = await start_quiz(drive_id, email, db_session)
+        assert statements == []
+        assert [q.id for q in again.questions] == [q.id for q in started.questions]
+        assert [q.options for q in again.questions] == [q.options for q in started.questions]
+        assert again.start_time == started.start_time
+
+        answers = await correct_answers(db_session, drive_id, email)
+        first_half = dict(list(answers.items())[:5])
+        with count_queries(db_session) as statements:
+            saved = await save_quiz_progress(drive_id, email, QuizProgressSave(answers=[
+                {"question_id": qid, "selected_option": option} for qid, option in first_half.items()
+            ]), db_session)
+        assert saved.saved_count == 5
+        assert statements == []
+
+        # The rest arrive with the submission; saved progress fills in the first half
+        result = await submit_quiz(drive_id, email, QuizSubmission(answers=[
+            {"question_id": qid, "selected_option": option} for qid, option in answers.items() if qid not in first_half
+        ]), db_session)
+        assert result.correct == 10 and result.percentage == 100
+        assert result.is_qualified
+
+        rows = await db_session.execute(select(func.count(CampusDriveResponse.id)))
+        assert rows.scalar() == 10
+        registration = (await db_session.execute(
+            select(CampusDriveRegistration).where(CampusDriveRegistration.email == email)
+        )).scalar_one()
+        await db_session.refresh(registration)
+        assert registration.status == RegistrationStatus.QUALIFIED
+
+        with pytest.raises(HTTPException) as exc_info:
+            await submit_quiz(drive_id, email, QuizSubmission(answers=[]), db_session)
+        assert exc_info.value.detail == "Quiz already submitted"
+
+    @pytest.mark.asyncio
+    async def test_omitted_questions_count_against_total(self, db_session):
+        drive_id = await seed_drive(db_session)
+        email = "student0@college.edu"
+        await start_quiz(drive_id, email, db_session)
+        answers = await correct_answers(db_session, drive_id, email)
+
+        qid, option = next(iter(answers.items()))
+        result = await submit_quiz(drive_id, email, QuizSubmission(answers=[
+            {"question_id": qid, "selected_option": option}
+        ]), db_session)
+        assert result.total_questions == 10
+        assert result.percentage == 10
+
+    @pytest.mark.asyncio
+    async def test_lost_session_is_rebuilt_identically(self, db_session):
+        drive_id = await seed_drive(db_session)
+        email = "student0@college.edu"
+        started = await start_quiz(drive_id, email, db_session)
+        registration_id = str(started.registration_id)
+        # Progress saved to the database before sessions existed
+        db_session.add(CampusDriveResponse(
+            registration_id=registration_id, question_id=str(started.questions[0].id), selected_option=2
+        ))
+        await db_session.commit()
+
+        quiz_sessions.clear()
+        resumed = await resume_quiz(drive_id, email, db_session)
+
+        assert resumed.can_resume
+        assert [q.id for q in resumed.questions] == [q.id for q in started.questions]
+        assert [q.options for q in resumed.questions] == [q.options for q in started.questions]
+        assert [(a.question_id, a.selected_option) for a in resumed.saved_answers] == [
+            (str(started.questions[0].id), 2)
+        ]
+        assert quiz_sessions.get_stats()["sessions_rebuilt"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_started_and_unknown(self, db_session):
+        drive_id = await seed_drive(db_session)
+        with pytest.raises(HTTPException) as exc_info:
+            await resume_quiz(drive_id, "student0@college.edu", db_session)
+        assert exc_info.value.detail == "Quiz not started yet"
+        with pytest.raises(HTTPException) as exc_info:
+            await save_quiz_progress(drive_id, "nobody@college.edu", QuizProgressSave(answers=[]), db_session)
+        assert exc_info.value.status_code == 404
+
+
+class TestQuestionBank:
+    """Test the per-drive bank cache"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, db_session):
+        drive_id = await seed_drive(db_session)
+        service = QuizSessionService()
+
+        banks = await asyncio.gather(*(service.get_bank(db_session, drive_id) for _ in range(20)))
+        assert all(bank is banks[0] for bank in banks)
+        assert service.stats["bank_loads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_question_commit_invalidates_bank(self, db_session):
+        drive_id = await seed_drive(db_session)
+        bank = await quiz_sessions.get_bank(db_session, drive_id)
+        assert len(bank.questions) == 20
+        assert await quiz_sessions.get_bank(db_session, drive_id) is bank
+
+        db_session.add(CampusDriveQuestion(
+            question_text="new", category=QuestionCategory.CODING, options=["a", "b"], correct_option=0
+        ))
+        await db_session.commit()
+        assert len((await quiz_sessions.get_bank(db_session, drive_id)).questions) == 21
+
+
+class TestRedisStore:
+    """Test sessions and answers kept in Redis"""
+
+    @pytest.mark.asyncio
+    async def test_answers_are_upserted_per_question(self, db_session):
+        drive_id = await seed_drive(db_session)
+        service = QuizSessionService()
+        service._redis = FakeRedis()
+        registration = (await db_session.execute(select(CampusDriveRegistration))).scalar_one()
+        registration.quiz_start_time = datetime.utcnow()
+
+        session = await service.start_session(await service.get_bank(db_session, drive_id), registration)
+        assert await service.get_session(drive_id, registration.email) == session
+
+        first, second = session.items[0].question_id, session.items[1].question_id
+        assert await service.save_answers(session, {first: 1, "not-served": 0}) == 1
+        assert await service.save_answers(session, {first: 3, second: 0, "x": None}) == 2
+        assert await service.get_answers(session) == {first: 3, second: 0}
+        assert service._redis.expiry[service._answers_key(session.registration_id)] > 0
+
+        await service.discard(session)
+        assert await service.get_session(drive_id, registration.email) is None
+        assert await service.get_answers(session) == {}
+
+
+class TestDeadlines:
+    """Test the server-side deadline, late submits and the expiry sweep"""
+
+    @pytest.mark.asyncio
+    async def test_late_submit_grades_saved_progress(self, db_session):
+        drive_id = await seed_drive(db_session)
+        email = "student0@college.edu"
+        await start_quiz(drive_id, email, db_session)
+        answers = await correct_answers(db_session, drive_id, email)
+        saved_qid = next(iter(answers))
+        await save_quiz_progress(drive_id, email, QuizProgressSave(answers=[
+            {"question_id": saved_qid, "selected_option": answers[saved_qid]}
+        ]), db_session)
+        registration = await expire(db_session, quiz_sessions, drive_id, email)
+        deadline = registration.quiz_deadline
+
+        result = await submit_quiz(drive_id, email, QuizSubmission(answers=[
+            {"question_id": qid, "selected_option": option} for qid, option in answers.items()
+        ]), db_session)
+
+        assert result.correct == 1
+        assert quiz_sessions.get_stats()["late_submits"] == 1
+        await db_session.refresh(registration)
+        assert registration.quiz_deadline is None
+        assert registration.quiz_end_time == deadline
+
+    @pytest.mark.asyncio
+    async def test_sweep_grades_expired_quizzes_in_bulk(self, db_session):
+        drive_id = await seed_drive(db_session, takers=3)
+        for n in range(3):
+            await start_quiz(drive_id, f"student{n}@college.edu", db_session)
+        answers = await correct_answers(db_session, drive_id, "student0@college.edu")
+        session = await quiz_sessions.get_session(drive_id, "student0@college.edu")
+        await quiz_sessions.save_answers(session, dict(list(answers.items())[:3]))
+        await expire(db_session, quiz_sessions, drive_id, "student0@college.edu")
+        # Session lost; progress only in rows saved before sessions existed
+        lost = await expire(db_session, quiz_sessions, drive_id, "student1@college.edu")
+        lost_session = await quiz_sessions.get_session(drive_id, "student1@college.edu")
+        lost_answers = await correct_answers(db_session, drive_id, "student1@college.edu")
+        await quiz_sessions.discard(lost_session)
+        qid = next(iter(lost_answers))
+        db_session.add(CampusDriveResponse(registration_id=lost.id, question_id=qid, selected_option=lost_answers[qid]))
+        await db_session.commit()
+
+        with count_queries(db_session) as statements:
+            swept = await quiz_sessions.sweep_expired(db_session)
+        assert swept == 2
+        writes = [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+        assert len(writes) == 3  # registrations UPDATE, responses DELETE, responses INSERT
+
+        registrations = {
+            r.email: r for r in (await db_session.execute(select(CampusDriveRegistration))).scalars().all()
+        }
+        for r in registrations.values():
+            await db_session.refresh(r)
+        assert registrations["student0@college.edu"].correct_answers == 3
+        assert registrations["student1@college.edu"].correct_answers == 1
+        assert registrations["student0@college.edu"].status == RegistrationStatus.NOT_QUALIFIED
+        assert registrations["student2@college.edu"].status == RegistrationStatus.QUIZ_IN_PROGRESS
+        rows = await db_session.execute(select(func.count(CampusDriveResponse.id)))
+        assert rows.scalar() == 20
+        assert await quiz_sessions.get_session(drive_id, "student0@college.edu") is None
+
+        assert await quiz_sessions.sweep_expired(db_session) == 0
+        with pytest.raises(HTTPException) as exc_info:
+            await submit_quiz(drive_id, "student0@college.edu", QuizSubmission(answers=[]), db_session)
+        assert exc_info.value.detail == "Quiz already submitted"
+
+    @pytest.mark.asyncio
+    async def test_result_reads_only_the_registration(self, db_session):
+        drive_id = await seed_drive(db_session)
+        email = "student0@college.edu"
+        await start_quiz(drive_id, email, db_session)
+        answers = await correct_answers(db_session, drive_id, email)
+        submitted = await submit_quiz(drive_id, email, QuizSubmission(answers=[
+            {"question_id": qid, "selected_option": option} for qid, option in list(answers.items())[:4]
+        ]), db_session)
+        await quiz_sessions.get_bank(db_session, drive_id)
+
+        with count_queries(db_session) as statements:
+            result = await get_result(drive_id, email, db_session)
+        assert len(statements) == 1
+        assert (result.total_questions, result.attempted, result.correct) == (10, 4, 4)
+        assert result.percentage == submitted.percentage
+        assert result.coding_total == 2
+
+    @pytest.mark.asyncio
+    async def test_sweep_uses_one_redis_round_trip_and_publishes(self, db_session):
+        drive_id = await seed_drive(db_session, takers=2)
+        service = QuizSessionService()
+        service._redis = FakeRedis()
+        bank = await service.get_bank(db_session, drive_id)
+        for registration in (await db_session.execute(select(CampusDriveRegistration))).scalars().all():
+            registration.status = RegistrationStatus.QUIZ_IN_PROGRESS
+            registration.quiz_start_time = datetime.utcnow() - timedelta(hours=1)
+            registration.quiz_deadline = registration.quiz_start_time + timedelta(minutes=bank.duration_minutes)
+            await service.start_session(bank, registration)
+        await db_session.commit()
+
+        assert await service.sweep_expired(db_session) == 2
+        assert service._redis.executed == 2  # Sessions and answers read, events published
+        events = [json.loads(message) for _, message in service._redis.published]
+        assert sorted(e["email"] for e in events) == ["student0@college.edu", "student1@college.edu"]
+        assert all(e["auto_submitted"] and e["type"] == "quiz_graded" for e in events)
+        assert [key for key in service._redis.strings if key.startswith("quiz:session:")] == []
@@ -0,0 +1,140 @@
+"""
+Unit Tests for SandboxCleanupService (activity index, deletion pool, metrics)
+"""
+import os
+import time
+
+import pytest
+
+from app.services.sandbox_cleanup import SandboxCleanupService, ACTIVITY_INDEX_FILE
+
+
+def make_project(root, name, age_hours: float = 0, files: int = 3, node_modules_age_hours: float = None):
+    """Create a project whose files (and directories) are `age_hours` old"""
+    project = root / name
+    (project / "src").mkdir(parents=True)
+    for i in range(files):
+        (project / "src" / f"file{i}.js").write_text("x" * 1024)
+
+    if node_modules_age_hours is not None:
+        (project / "node_modules" / "pkg").mkdir(parents=True)
+        (project / "node_modules" / "pkg" / "index.js").write_text("y" * 2048)
+
+    stamp = time.time() - age_hours * 3600
+    for dirpath, dirnames, filenames in os.walk(project, topdown=False):
+        in_node_modules = "node_modules" in os.path.relpath(dirpath, project).split(os.sep)
+        ts = time.time() - node_modules_age_hours * 3600 if in_node_modules else stamp
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (ts, ts))
+        os.utime(dirpath, (stamp, stamp))
+    return project
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    svc = SandboxCleanupService(
+        sandbox_path=str(tmp_path),
+        idle_timeout_minutes=60,
+        min_project_age_minutes=5,
+        deletions_per_minute=6000,
+    )
+
+    async def no_containers(project_id):
+        return None
+
+    monkeypatch.setattr(svc, "_stop_project_containers", no_containers)
+    return svc
+
+
+class TestSandboxCleanup:
+    """Idle detection comes from the activity index; deletion is pooled"""
+
+    async def test_idle_project_deleted_and_streamed(self, service, tmp_path):
+        make_project(tmp_path, "idle", age_hours=3)
+        make_project(tmp_path, "fresh", age_hours=0.5)
+        metrics = service.subscribe_metrics()
+
+        results = await service.cleanup_old_projects()
+        await service.wait_for_deletions()
+
+        assert [q["id"] for q in results["queued"]] == ["idle"]
+        assert not (tmp_path / "idle").exists()
+        assert (tmp_path / "fresh").exists()
+
+        events = []
+        while not metrics.empty():
+            events.append(metrics.get_nowait())
+        deleted = [e for e in events if e["event"] == "deleted"]
+        assert len(deleted) == 1 and deleted[0]["id"] == "idle"
+        assert deleted[0]["size_mb"] == pytest.approx(3 * 1024 / (1024 * 1024))
+        assert service.stats["total_cleaned"] == 1
+
+    async def test_touched_project_survives(self, service, tmp_path):
+        make_project(tmp_path, "old-but-active", age_hours=3)
+        service.touch_project("old-but-active")
+
+        results = await service.cleanup_old_projects()
+        await service.wait_for_deletions()
+
+        assert results["queued"] == []
+        assert (tmp_path / "old-but-active").exists()
+
+    async def test_file_write_touch_path_maps_to_top_level_entry(self, service, tmp_path):
+        make_project(tmp_path, "user-1", age_hours=3)
+        service.touch_path(tmp_path / "user-1" / "project-9" / "src" / "App.tsx")
+
+        results = await service.cleanup_old_projects()
+
+        assert results["queued"] == []
+
+    async def test_node_modules_mtime_ignored_for_unindexed_projects(self, service, tmp_path):
+        make_project(tmp_path, "stale", age_hours=3, node_modules_age_hours=0)
+
+        results = await service.cleanup_old_projects()
+        await service.wait_for_deletions()
+
+        assert [q["id"] for q in results["queued"]] == ["stale"]
+        assert not (tmp_path / "stale").exists()
+
+    async def test_protected_project_skipped(self, service, tmp_path):
+        make_project(tmp_path, "saved", age_hours=3)
+        (tmp_path / "saved" / ".protected").write_text("{}")
+
+        results = await service.cleanup_old_projects()
+
+        assert results["queued"] == []
+        assert {"id": "saved", "reason": "protected"} in results["skipped"]
+
+    async def test_deletions_are_rate_limited(self, service, tmp_path):
+        service.deletions_per_minute = 600  # one every 0.1s
+        for i in range(4):
+            make_project(tmp_path, f"idle-{i}", age_hours=3, files=1)
+
+        start = time.monotonic()
+        await service.cleanup_old_projects()
+        await service.wait_for_deletions()
+
+        assert time.monotonic() - start >= 0.3
+        assert service.stats["total_cleaned"] == 4
+
+    async def test_activity_index_persists(self, service, tmp_path):
+        make_project(tmp_path, "kept", age_hours=3)
+        service.touch_project("kept")
+        await service.cleanup_old_projects()
+        assert (tmp_path / ACTIVITY_INDEX_FILE).exists()
+
+        restarted = SandboxCleanupService(sandbox_path=str(tmp_path), idle_timeout_minutes=60)
+        results = await restarted.cleanup_old_projects()
+
+        assert results["queued"] == []
+
+    async def test_stats_use_cached_sizes(self, service, tmp_path):
+        make_project(tmp_path, "p1", age_hours=0.5, files=2)
+        await service.cleanup_old_projects()
+
+        # Grow the project; stats should not re-walk it
+        (tmp_path / "p1" / "big.bin").write_bytes(b"0" * 10240)
+        stats = service.get_stats()
+
+        assert stats["current_projects"] == 1
+        assert stats["current_size_mb"] == pytest.approx(2 * 1024 / (1024 * 1024))
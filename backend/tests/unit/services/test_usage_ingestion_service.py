@@ -0,0 +1,169 @@
+"""
+Unit Tests for UsageIngestionService (batched token usage writer)
+"""
+import asyncio
+import pytest
+from sqlalchemy import select, func
+
+from app.models.project import Project, ProjectMode, ProjectStatus
+from app.models.usage import TokenUsageLog, TokenUsage, UsageRollup, AgentType, OperationType
+from app.services.usage_ingestion_service import UsageIngestionService
+
+
+def record(service, user_id, project_id=None, model="haiku", input_tokens=100, output_tokens=50):
+    return service.record(
+        user_id=user_id,
+        project_id=project_id,
+        agent_type=AgentType.WRITER,
+        operation=OperationType.GENERATE_FILE,
+        model=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        file_path="src/App.tsx"
+    )
+
+
+@pytest.fixture
+async def project(db_session, test_user):
+    project = Project(
+        user_id=str(test_user.id),
+        title="Usage Project",
+        description="Test",
+        mode=ProjectMode.STUDENT,
+        status=ProjectStatus.PROCESSING,
+        total_tokens=1000
+    )
+    db_session.add(project)
+    await db_session.commit()
+    return project
+
+
+class TestUsageIngestionService:
+    """Test buffering, batched writes and derived totals"""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_logs_rollups_and_totals(self, db_session, test_user, project):
+        """One flush inserts every log row and applies project/user deltas"""
+        service = UsageIngestionService(batch_size=50, flush_interval=60, max_queue=100)
+        for _ in range(5):
+            record(service, test_user.id, project.id)
+        record(service, test_user.id, project.id, model="sonnet", input_tokens=300, output_tokens=200)
+        assert service.queue_depth == 6
+
+        assert await service.flush() == 6
+        service.record_run(test_user.id, ["haiku", "sonnet"])
+        assert await service.flush() == 2
+        await service.stop()
+        assert service.queue_depth == 0
+
+        assert await db_session.scalar(select(func.count()).select_from(TokenUsageLog)) == 6
+        assert await db_session.scalar(select(func.sum(UsageRollup.calls)).where(UsageRollup.granularity == "day")) == 6
+
+        await db_session.refresh(project)
+        assert project.total_tokens == 1000 + 5 * 150 + 500
+
+        usage = (await db_session.execute(select(TokenUsage))).scalar_one()
+        assert usage.total_tokens == 1250
+        assert usage.total_requests == 2
+        assert usage.haiku_tokens == 750
+        assert usage.sonnet_tokens == 500
+
+    @pytest.mark.asyncio
+    async def test_existing_daily_usage_is_incremented(self, db_session, test_user):
+        """A second flush adds to today's token_usage row instead of creating another"""
+        service = UsageIngestionService(batch_size=50, flush_interval=60, max_queue=100)
+        record(service, test_user.id)
+        service.record_run(test_user.id, ["haiku"])
+        await service.flush()
+        record(service, test_user.id)
+        record(service, test_user.id)
+        service.record_run(test_user.id, ["haiku"])
+        await service.flush()
+        await service.stop()
+
+        rows = (await db_session.execute(select(TokenUsage))).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].total_tokens == 450
+        assert rows[0].total_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_requests_count_runs_not_calls(self, db_session, test_user, project):
+        """total_requests goes up once per model per run, however many calls it made"""
+        service = UsageIngestionService(batch_size=50, flush_interval=60, max_queue=100)
+        calls = {"haiku": 0, "sonnet": 0}
+        for model in ["haiku", "haiku", "sonnet", "haiku"]:
+            record(service, test_user.id, project.id, model=model)
+            calls[model] += 1
+        service.record_run(test_user.id, calls)
+        await service.flush()
+        await service.stop()
+
+        usage = (await db_session.execute(select(TokenUsage))).scalar_one()
+        assert usage.total_requests == 2
+        assert usage.total_tokens == 600
+        assert await db_session.scalar(select(func.count()).select_from(TokenUsageLog)) == 4
+
+    @pytest.mark.asyncio
+    async def test_flusher_writes_after_interval(self, db_session, test_user):
+        """Records are written by the background flusher without an explicit flush"""
+        service = UsageIngestionService(batch_size=50, flush_interval=0.05, max_queue=100)
+        record(service, test_user.id)
+        record(service, test_user.id)
+
+        for _ in range(100):
+            if service.stats["written"] == 2:
+                break
+            await asyncio.sleep(0.02)
+        stats = service.get_stats()
+        await service.stop()
+
+        assert stats["written"] == 2
+        assert stats["flushes"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["last_flush_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_in_batches(self, db_session, test_user):
+        """A full batch is written without waiting for the interval"""
+        service = UsageIngestionService(batch_size=10, flush_interval=60, max_queue=100)
+        for _ in range(25):
+            record(service, test_user.id)
+
+        for _ in range(100):
+            if service.stats["written"] >= 20:
+                break
+            await asyncio.sleep(0.02)
+        assert service.stats["written"] >= 20
+
+        await service.stop()
+        assert service.stats["written"] == 25
+        assert service.stats["flushes"] == 3
+        assert await db_session.scalar(select(func.count()).select_from(TokenUsageLog)) == 25
+
+    def test_full_buffer_drops_records(self):
+        """record() never blocks: records beyond max_queue are counted as dropped"""
+        service = UsageIngestionService(batch_size=10, flush_interval=60, max_queue=3)
+        results = [record(service, "user-1") for _ in range(5)]
+
+        assert results == [True, True, True, False, False]
+        stats = service.get_stats()
+        assert stats["queue_depth"] == 3
+        assert stats["dropped"] == 2
+        assert stats["max_queue_depth"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_requeued_then_dropped(self, db_session):
+        """Rows the database rejects are retried, then dropped after MAX_FLUSH_ATTEMPTS"""
+        service = UsageIngestionService(batch_size=10, flush_interval=60, max_queue=100)
+        record(service, None)  # user_id is NOT NULL
+
+        assert await service.flush() == 0
+        assert service.queue_depth == 1
+        await service.flush()
+        await service.flush()
+        await service.stop()
+
+        stats = service.get_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["dropped"] == 1
+        assert stats["failed_flushes"] == 3
@@ -0,0 +1,161 @@
+"""
+Unit Tests for UsageRollupService and the rollup-backed admin analytics
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import select
+
+from app.models.usage import TokenUsageLog, UsageRollup, AgentType, OperationType
+from app.services.usage_rollup_service import UsageRollupService, usage_rollup_service, bucket_value
+from app.api.v1.endpoints.admin import analytics
+
+
+def make_log(user_id, created_at, model="claude-3-haiku-20240307", project_id=None,
+             agent_type=AgentType.WRITER, input_tokens=100, output_tokens=50):
+    return TokenUsageLog(
+        user_id=user_id,
+        project_id=project_id,
+        agent_type=agent_type,
+        operation=OperationType.GENERATE_FILE,
+        model=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+        cost_paise=10,
+        created_at=created_at
+    )
+
+
+async def write_logs(db, logs):
+    """Insert raw logs and apply them to the rollups, as token_tracker does"""
+    db.add_all(logs)
+    await db.flush()
+    await usage_rollup_service.apply(db, logs)
+    await db.commit()
+
+
+async def rollup_totals(db, granularity):
+    result = await db.execute(
+        select(UsageRollup).where(UsageRollup.granularity == granularity)
+    )
+    return {
+        (bucket_value(r.bucket_start), r.user_id, r.project_id, r.model, r.agent_type): (r.calls, r.total_tokens, r.cost_paise)
+        for r in result.scalars()
+    }
+
+
+class TestUsageRollupService:
+    """Test incremental updates and rebuild"""
+
+    def test_aggregate_buckets_by_hour_and_day(self):
+        ts = datetime(2026, 5, 4, 10, 15)
+        logs = [make_log("u1", ts), make_log("u1", ts + timedelta(minutes=30)), make_log("u1", ts + timedelta(hours=2))]
+
+        rows = usage_rollup_service.aggregate(logs)
+        hours = [r for r in rows if r["granularity"] == "hour"]
+        days = [r for r in rows if r["granularity"] == "day"]
+
+        assert sorted((r["bucket_start"].hour, r["calls"]) for r in hours) == [(10, 2), (12, 1)]
+        assert len(days) == 1
+        assert days[0]["calls"] == 3
+        assert days[0]["total_tokens"] == 450
+        assert days[0]["agent_type"] == "WRITER"
+        assert days[0]["project_id"] == ""
+
+    @pytest.mark.asyncio
+    async def test_apply_increments_existing_buckets(self, db_session, test_user):
+        ts = datetime.utcnow().replace(minute=5)
+        await write_logs(db_session, [make_log(test_user.id, ts)])
+        await write_logs(db_session, [make_log(test_user.id, ts + timedelta(minutes=1))])
+
+        day = await rollup_totals(db_session, "day")
+        assert list(day.values()) == [(2, 300, 20)]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental(self, db_session, test_user):
+        now = datetime.utcnow()
+        logs = [
+            make_log(test_user.id, now - timedelta(days=d, hours=h), model=model, agent_type=agent)
+            for d in range(3)
+            for h in range(0, 24, 7)
+            for model, agent in (("claude-3-haiku-20240307", AgentType.WRITER), ("sonnet", AgentType.FIXER))
+        ]
+        await write_logs(db_session, logs)
+        incremental = (await rollup_totals(db_session, "hour"), await rollup_totals(db_session, "day"))
+
+        stats = await usage_rollup_service.rebuild(db_session, now - timedelta(days=5))
+        await db_session.commit()
+        rebuilt = (await rollup_totals(db_session, "hour"), await rollup_totals(db_session, "day"))
+
+        assert rebuilt == incremental
+        assert stats["day_rows"] == len(incremental[1])
+
+    @pytest.mark.asyncio
+    async def test_rebuild_and_apply_share_an_advisory_lock_on_postgres(self, monkeypatch):
+        monkeypatch.setattr(UsageRollupService, "_dialect", staticmethod(lambda db: "postgresql"))
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await usage_rollup_service.apply(db, [make_log("u1", datetime(2026, 5, 4, 10))])
+        await usage_rollup_service.rebuild(db, datetime(2026, 5, 4))
+
+        statements = [str(call.args[0]) for call in db.execute.call_args_list]
+        assert "pg_advisory_xact_lock_shared" in statements[0]
+        rebuild_first = statements[2]  # after apply's lock and upsert
+        assert "pg_advisory_xact_lock(" in rebuild_first
+        assert statements[3].startswith("DELETE FROM usage_rollups")
+
+
+class TestRollupAnalytics:
+    """Test admin analytics endpoints served from rollups"""
+
+    @pytest.mark.asyncio
+    async def test_token_usage_and_model_usage(self, db_session, test_user):
+        now = datetime.utcnow()
+        await write_logs(db_session, [
+            make_log(test_user.id, now, model="claude-3-haiku-20240307"),
+            make_log(test_user.id, now - timedelta(days=1), model="claude-sonnet-4-20250514"),
+            make_log(test_user.id, now - timedelta(days=40), model="claude-sonnet-4-20250514"),
+        ])
+
+        usage = await analytics.get_token_usage(days=7, db=db_session, current_admin=None)
+        assert usage.total_tokens == 450
+        assert usage.tokens_by_model == {"haiku": 150, "sonnet": 300, "opus": 0}
+        assert len(usage.daily_usage) == 7
+        assert [p.value for p in usage.daily_usage[-2:]] == [150.0, 150.0]
+        assert usage.top_users[0]["tokens"] == 300
+
+        models = await analytics.get_model_usage(days=7, db=db_session, current_admin=None)
+        assert models["models"]["sonnet"]["calls"] == 1
+        assert models["models"]["haiku"]["tokens"] == 150
+
+        calls = await analytics.get_api_calls(days=7, db=db_session, current_admin=None)
+        assert calls.total_calls == 3
+        assert calls.calls_by_endpoint == {"writer": 2}
+
+    @pytest.mark.asyncio
+    async def test_overview_and_trends(self, db_session, test_user):
+        now = datetime.utcnow()
+        await write_logs(db_session, [
+            make_log(test_user.id, now, project_id="p1"),
+            make_log(test_user.id, now, project_id="p2"),
+            make_log(test_user.id, now),
+        ])
+
+        overview = await analytics.get_analytics_overview(db=db_session, current_admin=None)
+        assert overview["api"]["calls_today"] == 3
+        assert overview["api"]["tokens_today"] == 450
+        assert overview["users"]["new_today"] == 1
+
+        trends = await analytics.get_cost_trends(days=7, granularity="daily", db=db_session, current_admin=None)
+        assert trends["daily_data"][-1]["projects"] == 2
+        assert trends["daily_data"][-1]["api_calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_user_growth_cumulative(self, db_session, test_user):
+        growth = await analytics.get_user_growth(days=5, db=db_session, current_admin=None)
+
+        assert growth.total_users == 1
+        assert [p.value for p in growth.data] == [0.0, 0.0, 0.0, 0.0, 1.0]
+        assert growth.data[-1].label == "+1"
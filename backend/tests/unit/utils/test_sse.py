@@ -0,0 +1,190 @@
+"""
+Unit Tests for the SSE transport (batching, coalescing, idle keepalives)
+"""
+import asyncio
+import gzip
+import json
+import pytest
+
+from app.utils.sse import SSEWriter, coalesce, sse_metrics
+
+
+def parse(body: bytes):
+    """Events and comment lines in an SSE body"""
+    frames = [f for f in body.decode().split("\n\n") if f]
+    return [json.loads(f[len("data: "):]) if f.startswith("data: ") else f for f in frames]
+
+
+async def collect(writer, source):
+    return [chunk async for chunk in writer.stream(source)]
+
+
+class TestCoalesce:
+    """Test delta merging and status superseding"""
+
+    def test_merges_adjacent_deltas_for_same_target(self):
+        """file_chunk deltas for one path merge; a different path starts a new frame"""
+        items = [
+            {"type": "file_chunk", "data": {"path": "a.py", "chunk": "de"}},
+            {"type": "file_chunk", "data": {"path": "a.py", "chunk": "f "}},
+            {"type": "file_chunk", "data": {"path": "b.py", "chunk": "x"}},
+            {"type": "content", "text": "Hel"},
+            {"type": "content", "text": "lo"},
+        ]
+        out = coalesce(items)
+
+        assert out == [
+            {"type": "file_chunk", "data": {"path": "a.py", "chunk": "def "}},
+            {"type": "file_chunk", "data": {"path": "b.py", "chunk": "x"}},
+            {"type": "content", "text": "Hello"},
+        ]
+        # Source events are not modified
+        assert items[0]["data"]["chunk"] == "de"
+
+    def test_keeps_order_around_other_events(self):
+        """Deltas separated by another event or a raw frame are not merged"""
+        out = coalesce([
+            {"type": "content", "text": "a"},
+            {"type": "file_complete", "data": {"path": "a.py"}},
+            {"type": "content", "text": "b"},
+            ": keepalive\n\n",
+            {"type": "content", "text": "c"},
+        ])
+
+        assert [o if isinstance(o, bytes) else o.get("text", o["type"]) for o in out] == [
+            "a", "file_complete", "b", b": keepalive\n\n", "c"
+        ]
+
+    def test_superseded_status_keeps_latest(self):
+        """A run of same-shape status events collapses; extra flags are never dropped"""
+        out = coalesce([
+            {"type": "status", "data": {"message": "1"}, "agent": "planner"},
+            {"type": "status", "data": {"message": "2"}, "agent": "planner"},
+            {"type": "status", "data": {"message": "3", "documents_skipped": True}, "agent": "planner"},
+            {"type": "status", "data": {"message": "4"}, "agent": "writer"},
+        ])
+
+        assert [o["data"]["message"] for o in out] == ["2", "3", "4"]
+
+
+class TestSSEWriter:
+    """Test flush windows, keepalives and compression"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_written_once(self):
+        """Events inside one flush window go out as a single write"""
+        async def source():
+            yield b": connection-init\n\n"
+            for i in range(50):
+                yield {"type": "content", "text": str(i % 10)}
+            yield {"type": "complete", "data": {}}
+
+        writer = SSEWriter(flush_window=0.05, keepalive_initial=10)
+        chunks = await collect(writer, source())
+
+        assert len(chunks) == 1
+        events = parse(chunks[0])
+        assert events[0] == ": connection-init"
+        assert events[1] == {"type": "content", "text": "0123456789" * 5}
+        assert events[2]["type"] == "complete"
+
+    @pytest.mark.asyncio
+    async def test_zero_window_adds_no_delay(self):
+        """With no flush window, events are written as soon as they arrive"""
+        async def source():
+            for i in range(3):
+                yield {"type": "content", "text": str(i)}
+                await asyncio.sleep(0.02)
+
+        chunks = await collect(SSEWriter(flush_window=0, keepalive_initial=10), source())
+        assert len(chunks) == 3
+
+    @pytest.mark.asyncio
+    async def test_keepalive_only_when_idle(self):
+        """A slow source gets keepalives; a busy one does not"""
+        async def slow():
+            await asyncio.sleep(0.25)
+            yield {"type": "complete", "data": {}}
+
+        async def busy():
+            for _ in range(10):
+                await asyncio.sleep(0.02)
+                yield {"type": "content", "text": "x"}
+
+        writer = SSEWriter(flush_window=0.01, keepalive_initial=0.1, keepalive_aggressive_for=60)
+        slow_chunks = await collect(writer, slow())
+        busy_chunks = await collect(writer, busy())
+
+        assert slow_chunks[:2] == [b": keepalive\n\n", b": keepalive\n\n"]
+        assert parse(slow_chunks[-1]) == [{"type": "complete", "data": {}}]
+        assert b": keepalive\n\n" not in busy_chunks
+
+    @pytest.mark.asyncio
+    async def test_gzip_stream_decompresses_to_same_frames(self):
+        async def source():
+            yield {"type": "status", "data": {"message": "Starting"}}
+            await asyncio.sleep(0.02)
+            yield {"type": "content", "text": "x" * 2000}
+
+        chunks = await collect(SSEWriter(flush_window=0.005, keepalive_initial=10, compress=True), source())
+        events = parse(gzip.decompress(b"".join(chunks)))
+
+        assert events == [
+            {"type": "status", "data": {"message": "Starting"}},
+            {"type": "content", "text": "x" * 2000},
+        ]
+        assert sum(len(c) for c in chunks) < 2000
+
+    @pytest.mark.asyncio
+    async def test_source_error_flushes_then_raises(self):
+        async def source():
+            yield {"type": "content", "text": "partial"}
+            raise RuntimeError("boom")
+
+        chunks = []
+        with pytest.raises(RuntimeError):
+            async for chunk in SSEWriter(flush_window=0.05, keepalive_initial=10).stream(source()):
+                chunks.append(chunk)
+        assert parse(chunks[0]) == [{"type": "content", "text": "partial"}]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_pauses_the_source(self):
+        """The pump stops reading once max_buffer_bytes is waiting to be written"""
+        produced = 0
+
+        async def source():
+            nonlocal produced
+            for i in range(200):
+                produced += 1
+                yield f"data: {'x' * 1000}\n\n"
+
+        writer = SSEWriter(flush_window=0, max_batch_bytes=2000, max_buffer_bytes=8000, keepalive_initial=10)
+        stream = writer.stream(source())
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)  # Client stalls
+
+        # The first write drained at most 8 events; the pump then refilled
+        # 8 more and is holding one, instead of reading all 200
+        assert first.count(b"data: ") <= 8
+        assert produced <= 17
+        rest = [chunk async for chunk in stream]
+        assert sum(c.count(b"data: ") for c in [first, *rest]) == 200
+
+    @pytest.mark.asyncio
+    async def test_metrics_count_frames_and_bytes(self):
+        sse_metrics.reset()
+
+        async def source():
+            for _ in range(4):
+                yield {"type": "content", "text": "ab"}
+
+        chunks = await collect(SSEWriter(flush_window=0.05, keepalive_initial=10), source())
+        stats = sse_metrics.get_stats()
+
+        assert stats["events_in"] == 4
+        assert stats["frames"] == 1
+        assert stats["writes"] == 1
+        assert stats["merged_deltas"] == 3
+        assert stats["bytes_sent"] == len(chunks[0])
+        assert stats["bytes_per_sec"] > 0
+        assert stats["active_streams"] == 0
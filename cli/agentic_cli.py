@@ -20,28 +20,17 @@ import time
 import json
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from dataclasses import dataclass, field
 
-import httpx
-from rich.console import Console, Group
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.markdown import Markdown
-from rich.text import Text
-from rich.live import Live
-from rich.spinner import Spinner
-from rich.table import Table
-from rich.box import ROUNDED, SIMPLE
-from rich.style import Style
-from rich.padding import Padding
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.styles import Style as PTStyle
-from prompt_toolkit.formatted_text import HTML
-
 from cli.config import CLIConfig
 
+# httpx and rich are imported where they are used, so loading this module
+# stays cheap on the headless path (see tests/performance/cli_startup_benchmark.py)
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.live import Live
+
 
 # =============================================================================
 # Colors and Styles (Claude Code inspired)
@@ -57,11 +46,11 @@ COLORS = {
     "text": "#E5E7EB",         # Light gray - main text
 }
 
-# Prompt toolkit style
-PT_STYLE = PTStyle.from_dict({
+# Prompt toolkit style (built on first interactive use)
+PT_STYLE = {
     'prompt': '#7C3AED bold',
     'input': '#E5E7EB',
-})
+}
 
 
 @dataclass
@@ -80,9 +69,12 @@ class ClaudeCodeCLI:
     A CLI that feels exactly like Claude Code.
     """
 
-    def __init__(self, config: CLIConfig, console: Console = None):
+    def __init__(self, config: CLIConfig, console: "Console" = None):
         self.config = config
-        self.console = console or Console(force_terminal=True, color_system="truecolor")
+        if console is None:
+            from rich.console import Console
+            console = Console(force_terminal=True, color_system="truecolor")
+        self.console = console
         self.working_dir = Path(config.working_directory).resolve()
 
         # API configuration
@@ -114,6 +106,8 @@ class ClaudeCodeCLI:
 
     def _print_welcome(self):
         """Print welcome banner"""
+        from rich.text import Text
+
         self.console.print()
 
         # Simple, clean header like Claude Code
@@ -137,8 +131,10 @@ class ClaudeCodeCLI:
         self.console.print(tips)
         self.console.print()
 
-    def _print_tool_start(self, tool_name: str, tool_input: Dict) -> Live:
+    def _print_tool_start(self, tool_name: str, tool_input: Dict) -> None:
         """Print tool call start with spinner"""
+        from rich.text import Text
+
         # Tool icons
         icons = {
             "read_file": "Read",
@@ -180,6 +176,8 @@ class ClaudeCodeCLI:
 
     def _print_tool_result(self, result: ToolResult):
         """Print tool result"""
+        from rich.text import Text
+
         if result.success:
             # Show success with duration
             status = Text()
@@ -209,12 +207,16 @@ class ClaudeCodeCLI:
         if text.strip():
             self.console.print()
             try:
+                from rich.markdown import Markdown
                 self.console.print(Markdown(text))
             except:
                 self.console.print(text)
 
-    def _print_thinking(self) -> Live:
+    def _print_thinking(self) -> "Live":
         """Show thinking spinner"""
+        from rich.live import Live
+        from rich.spinner import Spinner
+
         spinner = Spinner("dots", text="Thinking...", style="#7C3AED")
         live = Live(spinner, console=self.console, refresh_per_second=10)
         live.start()
@@ -222,6 +224,8 @@ class ClaudeCodeCLI:
 
     def _print_cost_summary(self):
         """Print token usage and cost"""
+        from rich.text import Text
+
         self.console.print()
 
         summary = Text()
@@ -249,6 +253,10 @@ class ClaudeCodeCLI:
         if self.permission_mode == "deny":
             return False
 
+        from rich.box import ROUNDED
+        from rich.table import Table
+        from rich.text import Text
+
         # Show what will be done
         self.console.print()
 
@@ -494,6 +502,8 @@ class ClaudeCodeCLI:
                 for r in tool_results
             ]
 
+        import httpx
+
         async with httpx.AsyncClient(timeout=120.0) as client:
             response = await client.post(
                 f"{self.api_base_url}/agentic/chat",
@@ -599,9 +609,16 @@ class ClaudeCodeCLI:
         # History
         history_file = Path.home() / ".bharatbuild" / "history"
         history_file.parent.mkdir(exist_ok=True)
+
+        # prompt_toolkit is only needed for the REPL; headless runs never load it
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.styles import Style as PTStyle
+        from prompt_toolkit.formatted_text import HTML
+
         session = PromptSession(
             history=FileHistory(str(history_file)),
-            style=PT_STYLE
+            style=PTStyle.from_dict(PT_STYLE)
         )
 
         while True:
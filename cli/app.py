@@ -10,32 +10,24 @@ import sys
 import json
 import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, AsyncGenerator
 from dataclasses import dataclass, field
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.syntax import Syntax
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.live import Live
-from rich.table import Table
 from rich.text import Text
 from rich.prompt import Prompt, Confirm
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.styles import Style
-from prompt_toolkit.formatted_text import HTML
-
 from cli.config import CLIConfig
 from cli.tools import ToolExecutor
 from cli.renderer import ResponseRenderer
 from cli.session import SessionManager
 from cli.commands import SlashCommandHandler
 
+if TYPE_CHECKING:
+    from prompt_toolkit.formatted_text import HTML
+    from prompt_toolkit.key_binding import KeyBindings
+
 
 @dataclass
 class Message:
@@ -63,19 +55,10 @@ class BharatBuildCLI:
         self.total_cost = 0.0
         self._running = True
 
-        # Key bindings for prompt_toolkit
-        self.key_bindings = self._create_key_bindings()
-
-        # Prompt style - Claude Code inspired
-        self.prompt_style = Style.from_dict({
-            'prompt': '#00D9FF bold',      # Cyan prompt symbol
-            'path': '#4ADE80',              # Green path
-            'git': '#FF79C6',               # Pink/magenta git branch
-            'user': '#E5E5E5',              # Light text for user input
-        })
-
-    def _create_key_bindings(self) -> KeyBindings:
+    def _create_key_bindings(self) -> "KeyBindings":
         """Create keyboard shortcuts"""
+        from prompt_toolkit.key_binding import KeyBindings
+
         kb = KeyBindings()
 
         @kb.add('c-l')
@@ -159,8 +142,10 @@ class BharatBuildCLI:
             pass
         return ""
 
-    def _get_prompt_text(self) -> HTML:
+    def _get_prompt_text(self) -> "HTML":
         """Get Claude Code style prompt text with path and git"""
+        from prompt_toolkit.formatted_text import HTML
+
         cwd = Path(self.config.working_directory).name or "~"
         git_branch = self._get_git_branch()
 
@@ -172,12 +157,26 @@ class BharatBuildCLI:
         """Run interactive REPL mode"""
         self._print_welcome()
 
+        # prompt_toolkit is only needed for the REPL; headless runs never load it
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.styles import Style
+
+        # Prompt style - Claude Code inspired
+        prompt_style = Style.from_dict({
+            'prompt': '#00D9FF bold',      # Cyan prompt symbol
+            'path': '#4ADE80',              # Green path
+            'git': '#FF79C6',               # Pink/magenta git branch
+            'user': '#E5E5E5',              # Light text for user input
+        })
+
         # Create prompt session with history
         session = PromptSession(
             history=FileHistory(self.config.history_file),
             auto_suggest=AutoSuggestFromHistory(),
-            key_bindings=self.key_bindings,
-            style=self.prompt_style,
+            key_bindings=self._create_key_bindings(),
+            style=prompt_style,
             multiline=False,
             enable_history_search=True
         )
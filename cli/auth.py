@@ -25,23 +25,17 @@ import os
 import json
 import hashlib
 import secrets
-import webbrowser
 import threading
 import time
-import httpx
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 from datetime import datetime, timedelta
 from enum import Enum
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
 from rich.console import Console
-from rich.prompt import Prompt, Confirm
-from rich.panel import Panel
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 
 class AuthProvider(str, Enum):
@@ -87,66 +81,76 @@ class UserCredentials:
     last_login: str = ""
 
 
-class OAuthCallbackHandler(BaseHTTPRequestHandler):
-    """Handle OAuth callback for browser-based auth"""
-
-    auth_code = None
-    state = None
-
-    def do_GET(self):
-        """Handle GET request from OAuth callback"""
-        query = urlparse(self.path).query
-        params = parse_qs(query)
-
-        OAuthCallbackHandler.auth_code = params.get("code", [None])[0]
-        OAuthCallbackHandler.state = params.get("state", [None])[0]
-
-        # Send success response
-        self.send_response(200)
-        self.send_header("Content-type", "text/html")
-        self.end_headers()
-
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>BharatBuild - Login Successful</title>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    height: 100vh;
-                    margin: 0;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                }
-                .card {
-                    background: white;
-                    padding: 2rem 3rem;
-                    border-radius: 12px;
-                    box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-                    text-align: center;
-                }
-                h1 { color: #333; margin-bottom: 0.5rem; }
-                p { color: #666; }
-                .success { color: #10b981; font-size: 48px; }
-            </style>
-        </head>
-        <body>
-            <div class="card">
-                <div class="success">✓</div>
-                <h1>Login Successful!</h1>
-                <p>You can close this window and return to the CLI.</p>
-            </div>
-        </body>
-        </html>
-        """
-        self.wfile.write(html.encode())
+@lru_cache(maxsize=None)
+def _oauth_callback_handler():
+    """
+    Build the OAuth callback handler class on first browser login, so
+    http.server is not imported on every CLI start.
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class OAuthCallbackHandler(BaseHTTPRequestHandler):
+        """Handle OAuth callback for browser-based auth"""
+
+        auth_code = None
+        state = None
+
+        def do_GET(self):
+            """Handle GET request from OAuth callback"""
+            query = urlparse(self.path).query
+            params = parse_qs(query)
+
+            OAuthCallbackHandler.auth_code = params.get("code", [None])[0]
+            OAuthCallbackHandler.state = params.get("state", [None])[0]
+
+            # Send success response
+            self.send_response(200)
+            self.send_header("Content-type", "text/html")
+            self.end_headers()
+
+            html = """
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>BharatBuild - Login Successful</title>
+                <style>
+                    body {
+                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                        display: flex;
+                        justify-content: center;
+                        align-items: center;
+                        height: 100vh;
+                        margin: 0;
+                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    }
+                    .card {
+                        background: white;
+                        padding: 2rem 3rem;
+                        border-radius: 12px;
+                        box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+                        text-align: center;
+                    }
+                    h1 { color: #333; margin-bottom: 0.5rem; }
+                    p { color: #666; }
+                    .success { color: #10b981; font-size: 48px; }
+                </style>
+            </head>
+            <body>
+                <div class="card">
+                    <div class="success">✓</div>
+                    <h1>Login Successful!</h1>
+                    <p>You can close this window and return to the CLI.</p>
+                </div>
+            </body>
+            </html>
+            """
+            self.wfile.write(html.encode())
+
+        def log_message(self, format, *args):
+            """Suppress server logs"""
+            pass
 
-    def log_message(self, format, *args):
-        """Suppress server logs"""
-        pass
+    return OAuthCallbackHandler
 
 
 class CLIAuthManager:
@@ -283,6 +287,8 @@ class CLIAuthManager:
         1. Web UI after registration
         2. Profile page → API Access → Generate CLI Token
         """
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 # Validate token with backend
@@ -323,6 +329,8 @@ class CLIAuthManager:
 
     async def login_with_credentials(self, email: str, password: str) -> bool:
         """Login using email and password"""
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 # Step 1: Login to get tokens
@@ -387,6 +395,8 @@ class CLIAuthManager:
         if not self.credentials or not self.credentials.refresh_token:
             return False
 
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
@@ -413,6 +423,9 @@ class CLIAuthManager:
 
     async def interactive_login(self) -> bool:
         """Interactive login flow"""
+        from rich.panel import Panel
+        from rich.prompt import Prompt
+
         self.console.print(Panel(
             "[bold cyan]BharatBuild AI - Login[/bold cyan]\n\n"
             "Login using your registered account.\n"
@@ -437,6 +450,8 @@ class CLIAuthManager:
 
     def show_status(self):
         """Show current authentication status"""
+        from rich.panel import Panel
+
         if self.is_authenticated():
             self.console.print(Panel(
                 f"[green]Authenticated[/green]\n\n"
@@ -460,6 +475,8 @@ class CLIAuthManager:
 
     def login_extended(self, provider: AuthProvider = None):
         """Extended interactive login with multiple providers"""
+        from rich.prompt import Confirm, Prompt
+
         if self.is_authenticated():
             self.console.print(f"[yellow]Already logged in as {self.credentials.email}[/yellow]")
             if not Confirm.ask("Login with a different account?", default=False):
@@ -510,6 +527,8 @@ class CLIAuthManager:
 
     def _login_with_api_key(self):
         """Login with API key"""
+        from rich.prompt import Prompt
+
         self.console.print("\n[bold]API Key Login[/bold]")
         self.console.print("[dim]Enter your BharatBuild API key (starts with 'bb_')[/dim]\n")
 
@@ -523,6 +542,8 @@ class CLIAuthManager:
             self.console.print("[yellow]Warning: API key should start with 'bb_'[/yellow]")
 
         # Validate API key
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -581,7 +602,11 @@ class CLIAuthManager:
         self.console.print("[dim]If browser doesn't open, visit this URL:[/dim]")
         self.console.print(f"[dim]{auth_url}[/dim]\n")
 
+        import webbrowser
+        from http.server import HTTPServer
+
         # Start callback server
+        OAuthCallbackHandler = _oauth_callback_handler()
         server = HTTPServer(('localhost', self.CALLBACK_PORT), OAuthCallbackHandler)
         server_thread = threading.Thread(target=server.handle_request)
         server_thread.start()
@@ -593,6 +618,8 @@ class CLIAuthManager:
             self.console.print(f"[yellow]Could not open browser: {e}[/yellow]")
 
         # Wait for callback
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -671,6 +698,8 @@ class CLIAuthManager:
 
     def _show_user_panel(self):
         """Display user info panel"""
+        from rich.panel import Panel
+
         if not self.credentials:
             return
 
@@ -729,6 +758,8 @@ class CLIAuthManager:
 
     def show_account(self):
         """Show account management options"""
+        from rich.prompt import Prompt
+
         if not self.is_authenticated():
             self.console.print("[dim]Not logged in[/dim]")
             return
@@ -755,6 +786,8 @@ class CLIAuthManager:
 
     def _show_usage(self):
         """Show detailed usage statistics"""
+        from rich.table import Table
+
         if not self.credentials:
             return
 
@@ -790,6 +823,8 @@ class CLIAuthManager:
 
     def _show_upgrade(self):
         """Show upgrade options"""
+        from rich.table import Table
+
         self.console.print("\n[bold cyan]Upgrade Your Plan[/bold cyan]\n")
 
         plans = [
@@ -813,6 +848,9 @@ class CLIAuthManager:
 
     def _show_api_keys(self):
         """Show API key management"""
+        import webbrowser
+        from rich.prompt import Confirm
+
         self.console.print("\n[bold cyan]API Keys[/bold cyan]\n")
 
         self.console.print("[dim]API keys are managed at https://bharatbuild.dev/settings/api-keys[/dim]")
@@ -43,6 +43,42 @@ class CompactedSegment:
     key_points: List[str] = field(default_factory=list)
     files_mentioned: List[str] = field(default_factory=list)
     tools_used: List[str] = field(default_factory=list)
+    summary_tokens: int = 0
+
+
+@dataclass
+class TokenLedger:
+    """
+    Running token totals, updated as messages are added, rewritten or dropped.
+
+    Keeps should_compact() and get_stats() O(1) regardless of history length.
+    """
+    message_tokens: int = 0
+    summary_tokens: int = 0
+    by_role: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return self.message_tokens + self.summary_tokens
+
+    def add(self, role: MessageRole, tokens: int):
+        self.message_tokens += tokens
+        self.by_role[role.value] = self.by_role.get(role.value, 0) + tokens
+
+    def remove(self, role: MessageRole, tokens: int):
+        self.add(role, -tokens)
+
+    def clear(self):
+        self.message_tokens = 0
+        self.summary_tokens = 0
+        self.by_role.clear()
+
+
+# Compaction stages that run per message; each keeps a cursor so a message is
+# only ever processed once per stage.
+STAGE_TOOL_OUTPUTS = "tool_outputs"
+STAGE_FILE_CONTENTS = "file_contents"
+STAGE_DEDUP = "dedup"
 
 
 class ContextCompactor:
@@ -83,16 +119,62 @@ class ContextCompactor:
 
         self._messages: List[Message] = []
         self._compacted_segments: List[CompactedSegment] = []
-        self._total_tokens = 0
+        self._ledger = TokenLedger()
+
+        # Index of the first message each stage has not processed yet
+        self._cursors: Dict[str, int] = {
+            STAGE_TOOL_OUTPUTS: 0,
+            STAGE_FILE_CONTENTS: 0,
+            STAGE_DEDUP: 0,
+        }
+        # Content hash -> number of live messages with it (dedup stage only)
+        self._seen_hashes: Dict[int, int] = {}
+        self._summary_cache: Optional[str] = None
+
+    @property
+    def _total_tokens(self) -> int:
+        return self._ledger.total
 
     def add_message(self, message: Message):
         """Add a message to context"""
-        # Estimate tokens if not provided
+        # Estimate tokens once; the estimate is cached on the message
         if message.tokens == 0:
             message.tokens = self._estimate_tokens(message.content)
 
         self._messages.append(message)
-        self._total_tokens += message.tokens
+        self._ledger.add(message.role, message.tokens)
+
+    def _rewrite_message(self, msg: Message, content: str) -> int:
+        """Replace a message's content, keeping the ledger in sync. Returns tokens saved."""
+        if content == msg.content:
+            return 0
+
+        new_tokens = self._estimate_tokens(content)
+        saved = msg.tokens - new_tokens
+        self._ledger.remove(msg.role, saved)
+        msg.content = content
+        msg.tokens = new_tokens
+        return saved
+
+    def _drop_prefix(self, count: int):
+        """Drop the first `count` messages and shift stage cursors to match"""
+        for msg in self._messages[:min(count, self._cursors[STAGE_DEDUP])]:
+            content_hash = self._content_hash(msg)
+            remaining = self._seen_hashes.get(content_hash, 0) - 1
+            if remaining > 0:
+                self._seen_hashes[content_hash] = remaining
+            else:
+                self._seen_hashes.pop(content_hash, None)
+
+        self._messages = self._messages[count:]
+        for stage, cursor in self._cursors.items():
+            self._cursors[stage] = max(0, cursor - count)
+
+    def _pending(self, stage: str) -> List[Message]:
+        """Messages the given stage has not processed yet; advances its cursor"""
+        start = self._cursors[stage]
+        self._cursors[stage] = len(self._messages)
+        return self._messages[start:]
 
     def get_messages(self) -> List[Dict[str, Any]]:
         """Get messages for API call"""
@@ -100,7 +182,9 @@ class ContextCompactor:
 
         # Add compacted history as system message
         if self._compacted_segments:
-            summary = self._build_compacted_summary()
+            if self._summary_cache is None:
+                self._summary_cache = self._build_compacted_summary()
+            summary = self._summary_cache
             result.append({
                 "role": "system",
                 "content": f"[Conversation History Summary]\n{summary}"
@@ -124,6 +208,9 @@ class ContextCompactor:
         """
         Compact the context to reduce tokens.
 
+        Each strategy only looks at messages it has not processed before, so
+        repeated compactions cost proportional to new history, not all of it.
+
         Returns number of tokens saved.
         """
         if not self._messages:
@@ -158,7 +245,6 @@ class ContextCompactor:
 
         # Find messages to compact
         messages_to_compact = self._messages[:-self.keep_recent_messages]
-        recent_messages = self._messages[-self.keep_recent_messages:]
 
         if not messages_to_compact:
             return 0
@@ -168,11 +254,7 @@ class ContextCompactor:
 
         # Create summary
         summary = self._create_summary(messages_to_compact)
-
-        # Extract key information
-        key_points = self._extract_key_points(messages_to_compact)
-        files_mentioned = self._extract_files(messages_to_compact)
-        tools_used = self._extract_tools(messages_to_compact)
+        summary_tokens = self._estimate_tokens(summary)
 
         # Create compacted segment
         segment = CompactedSegment(
@@ -181,74 +263,73 @@ class ContextCompactor:
             original_tokens=original_tokens,
             start_time=messages_to_compact[0].timestamp,
             end_time=messages_to_compact[-1].timestamp,
-            key_points=key_points,
-            files_mentioned=files_mentioned,
-            tools_used=tools_used
+            key_points=self._extract_key_points(messages_to_compact),
+            files_mentioned=self._extract_files(messages_to_compact),
+            tools_used=self._extract_tools(messages_to_compact),
+            summary_tokens=summary_tokens
         )
 
         self._compacted_segments.append(segment)
+        self._summary_cache = None
 
-        # Update messages
-        self._messages = recent_messages
+        # Update messages and ledger
+        for msg in messages_to_compact:
+            self._ledger.remove(msg.role, msg.tokens)
+        self._ledger.summary_tokens += summary_tokens
+        self._drop_prefix(len(messages_to_compact))
 
-        # Update token count
-        summary_tokens = self._estimate_tokens(summary)
-        tokens_saved = original_tokens - summary_tokens
-        self._total_tokens -= tokens_saved
-
-        return tokens_saved
+        return original_tokens - summary_tokens
 
     def _compress_tool_outputs(self) -> int:
         """Compress verbose tool outputs"""
         tokens_saved = 0
 
-        for msg in self._messages:
+        for msg in self._pending(STAGE_TOOL_OUTPUTS):
             if msg.role == MessageRole.TOOL:
-                original_tokens = msg.tokens
-                msg.content = self._compress_output(msg.content)
-                msg.tokens = self._estimate_tokens(msg.content)
-                tokens_saved += original_tokens - msg.tokens
+                tokens_saved += self._rewrite_message(msg, self._compress_output(msg.content))
 
-        self._total_tokens -= tokens_saved
         return tokens_saved
 
     def _truncate_file_contents(self) -> int:
         """Truncate long file contents in messages"""
         tokens_saved = 0
 
-        for msg in self._messages:
+        for msg in self._pending(STAGE_FILE_CONTENTS):
             # Look for file content patterns
             if "```" in msg.content and len(msg.content) > 5000:
-                original_tokens = msg.tokens
-                msg.content = self._truncate_code_blocks(msg.content)
-                msg.tokens = self._estimate_tokens(msg.content)
-                tokens_saved += original_tokens - msg.tokens
+                tokens_saved += self._rewrite_message(msg, self._truncate_code_blocks(msg.content))
 
-        self._total_tokens -= tokens_saved
         return tokens_saved
 
     def _remove_redundant(self) -> int:
         """Remove redundant messages"""
+        start = self._cursors[STAGE_DEDUP]
         tokens_saved = 0
-        new_messages = []
+        kept = []
 
-        seen_contents = set()
-
-        for msg in self._messages:
+        for msg in self._messages[start:]:
             # Skip exact duplicates
-            content_hash = hash(msg.content[:500])  # Hash first 500 chars
-            if content_hash in seen_contents:
+            content_hash = self._content_hash(msg)
+            if content_hash in self._seen_hashes:
                 tokens_saved += msg.tokens
+                self._ledger.remove(msg.role, msg.tokens)
                 continue
 
-            seen_contents.add(content_hash)
-            new_messages.append(msg)
+            self._seen_hashes[content_hash] = 1
+            kept.append(msg)
 
-        self._messages = new_messages
-        self._total_tokens -= tokens_saved
+        self._messages = self._messages[:start] + kept
+        self._cursors[STAGE_DEDUP] = len(self._messages)
+        # Other stages may have pointed past dropped messages
+        for stage in (STAGE_TOOL_OUTPUTS, STAGE_FILE_CONTENTS):
+            self._cursors[stage] = min(self._cursors[stage], len(self._messages))
 
         return tokens_saved
 
+    @staticmethod
+    def _content_hash(msg: Message) -> int:
+        return hash(msg.content[:500])  # Hash first 500 chars
+
     def _create_summary(self, messages: List[Message]) -> str:
         """Create a summary of messages"""
         parts = []
@@ -407,10 +488,11 @@ class ContextCompactor:
         return {
             "total_messages": len(self._messages),
             "total_tokens": self._total_tokens,
+            "tokens_by_role": dict(self._ledger.by_role),
             "compacted_segments": len(self._compacted_segments),
             "compacted_messages": sum(s.original_messages for s in self._compacted_segments),
-            "tokens_saved": sum(s.original_tokens for s in self._compacted_segments) - sum(
-                self._estimate_tokens(s.summary) for s in self._compacted_segments
+            "tokens_saved": sum(
+                s.original_tokens - s.summary_tokens for s in self._compacted_segments
             )
         }
 
@@ -457,7 +539,11 @@ class ContextCompactor:
         """Clear all context"""
         self._messages.clear()
         self._compacted_segments.clear()
-        self._total_tokens = 0
+        self._ledger.clear()
+        self._seen_hashes.clear()
+        self._summary_cache = None
+        for stage in self._cursors:
+            self._cursors[stage] = 0
         self.console.print("[green]✓ Context cleared[/green]")
 
 
@@ -20,6 +20,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from cli.journal import Journal
+
 
 class ModelTier(str, Enum):
     """Model pricing tiers"""
@@ -100,6 +102,9 @@ class CostTracker:
         cost = tracker.get_session_cost()
     """
 
+    MAX_SESSIONS = 100
+    MAX_RECORDS_PER_SESSION = 50
+
     def __init__(
         self,
         console: Console,
@@ -118,78 +123,119 @@ class CostTracker:
         )
 
         # Load history
+        self._journal = Journal(self.config_dir / "history.jsonl", compact_threshold=2000)
         self._history: List[SessionStats] = []
         self._load_history()
 
+    @staticmethod
+    def _record_to_dict(r: UsageRecord) -> Dict[str, Any]:
+        return {
+            "timestamp": r.timestamp,
+            "model": r.model,
+            "input_tokens": r.input_tokens,
+            "output_tokens": r.output_tokens,
+            "total_tokens": r.total_tokens,
+            "cost": r.cost,
+            "prompt_preview": r.prompt_preview
+        }
+
+    def _session_to_dict(self, session: SessionStats) -> Dict[str, Any]:
+        return {
+            "session_id": session.session_id,
+            "started_at": session.started_at,
+            "ended_at": session.ended_at,
+            "total_requests": session.total_requests,
+            "total_input_tokens": session.total_input_tokens,
+            "total_output_tokens": session.total_output_tokens,
+            "total_tokens": session.total_tokens,
+            "total_cost": session.total_cost,
+            "model_breakdown": session.model_breakdown,
+            "records": [
+                self._record_to_dict(r)
+                for r in session.records[-self.MAX_RECORDS_PER_SESSION:]
+            ]
+        }
+
+    @staticmethod
+    def _session_from_dict(session_data: Dict[str, Any]) -> SessionStats:
+        return SessionStats(
+            session_id=session_data["session_id"],
+            started_at=session_data["started_at"],
+            ended_at=session_data.get("ended_at"),
+            total_requests=session_data.get("total_requests", 0),
+            total_input_tokens=session_data.get("total_input_tokens", 0),
+            total_output_tokens=session_data.get("total_output_tokens", 0),
+            total_tokens=session_data.get("total_tokens", 0),
+            total_cost=session_data.get("total_cost", 0.0),
+            model_breakdown=session_data.get("model_breakdown", {}),
+            records=[UsageRecord(**r) for r in session_data.get("records", [])]
+        )
+
     def _load_history(self):
-        """Load cost history"""
-        history_file = self.config_dir / "history.json"
+        """
+        Load cost history.
 
-        if history_file.exists():
-            try:
-                with open(history_file) as f:
+        The journal holds "session" snapshots (written on compaction),
+        "record" deltas (one per request) and "end" markers.
+        """
+        try:
+            if self._journal.exists():
+                # Session ids have one-second resolution; started_at disambiguates
+                sessions: Dict[tuple, SessionStats] = {}
+                for entry in self._journal.replay():
+                    op = entry.get("op")
+                    if op == "session":
+                        session = self._session_from_dict(entry["session"])
+                        sessions[(session.session_id, session.started_at)] = session
+                    elif op == "record":
+                        key = (entry["session_id"], entry["started_at"])
+                        session = sessions.get(key)
+                        if session is None:
+                            session = SessionStats(session_id=key[0], started_at=key[1])
+                            sessions[key] = session
+                        self._apply_record(session, UsageRecord(**entry["record"]))
+                        del session.records[:-self.MAX_RECORDS_PER_SESSION]
+                    elif op == "end":
+                        key = (entry["session_id"], entry["started_at"])
+                        if key in sessions:
+                            sessions[key].ended_at = entry["ended_at"]
+                self._history = list(sessions.values())[-self.MAX_SESSIONS:]
+                return
+
+            # Migrate the pre-journal history.json
+            legacy_file = self.config_dir / "history.json"
+            if legacy_file.exists():
+                with open(legacy_file) as f:
                     data = json.load(f)
+                self._history = [self._session_from_dict(d) for d in data.get("sessions", [])]
+                self._journal.compact(
+                    {"op": "session", "session": self._session_to_dict(s)} for s in self._history
+                )
+                legacy_file.unlink()
 
-                for session_data in data.get("sessions", []):
-                    records = [
-                        UsageRecord(**r) for r in session_data.get("records", [])
-                    ]
-
-                    session = SessionStats(
-                        session_id=session_data["session_id"],
-                        started_at=session_data["started_at"],
-                        ended_at=session_data.get("ended_at"),
-                        total_requests=session_data.get("total_requests", 0),
-                        total_input_tokens=session_data.get("total_input_tokens", 0),
-                        total_output_tokens=session_data.get("total_output_tokens", 0),
-                        total_tokens=session_data.get("total_tokens", 0),
-                        total_cost=session_data.get("total_cost", 0.0),
-                        model_breakdown=session_data.get("model_breakdown", {}),
-                        records=records
-                    )
-                    self._history.append(session)
-
-            except Exception as e:
-                self.console.print(f"[yellow]Warning: Could not load cost history: {e}[/yellow]")
+        except Exception as e:
+            self.console.print(f"[yellow]Warning: Could not load cost history: {e}[/yellow]")
 
     def _save_history(self):
-        """Save cost history"""
-        history_file = self.config_dir / "history.json"
-
+        """Compact cost history into one snapshot per session"""
         try:
-            sessions_data = []
-
             # Include current session
             all_sessions = self._history + [self._session]
 
-            for session in all_sessions[-100:]:  # Keep last 100 sessions
-                sessions_data.append({
-                    "session_id": session.session_id,
-                    "started_at": session.started_at,
-                    "ended_at": session.ended_at,
-                    "total_requests": session.total_requests,
-                    "total_input_tokens": session.total_input_tokens,
-                    "total_output_tokens": session.total_output_tokens,
-                    "total_tokens": session.total_tokens,
-                    "total_cost": session.total_cost,
-                    "model_breakdown": session.model_breakdown,
-                    "records": [
-                        {
-                            "timestamp": r.timestamp,
-                            "model": r.model,
-                            "input_tokens": r.input_tokens,
-                            "output_tokens": r.output_tokens,
-                            "total_tokens": r.total_tokens,
-                            "cost": r.cost,
-                            "prompt_preview": r.prompt_preview
-                        }
-                        for r in session.records[-50:]  # Keep last 50 records per session
-                    ]
-                })
-
-            with open(history_file, 'w') as f:
-                json.dump({"sessions": sessions_data}, f, indent=2)
+            self._journal.compact(
+                {"op": "session", "session": self._session_to_dict(session)}
+                for session in all_sessions[-self.MAX_SESSIONS:]  # Keep last 100 sessions
+            )
+
+        except Exception as e:
+            self.console.print(f"[yellow]Warning: Could not save cost history: {e}[/yellow]")
 
+    def _append(self, entry: Dict[str, Any]):
+        """Append to the history journal, compacting when it grows stale"""
+        try:
+            self._journal.append(entry)
+            if self._journal.needs_compaction():
+                self._save_history()
         except Exception as e:
             self.console.print(f"[yellow]Warning: Could not save cost history: {e}[/yellow]")
 
@@ -245,31 +291,39 @@ class CostTracker:
         )
 
         # Update session
-        self._session.records.append(record)
-        self._session.total_requests += 1
-        self._session.total_input_tokens += input_tokens
-        self._session.total_output_tokens += output_tokens
-        self._session.total_tokens += total_tokens
-        self._session.total_cost += cost
+        self._apply_record(self._session, record)
+
+        # Persist the delta (O(1), independent of history size)
+        self._append({
+            "op": "record",
+            "session_id": self._session.session_id,
+            "started_at": self._session.started_at,
+            "record": self._record_to_dict(record)
+        })
+
+    def _apply_record(self, session: SessionStats, record: UsageRecord):
+        """Add a usage record to a session's totals"""
+        session.records.append(record)
+        session.total_requests += 1
+        session.total_input_tokens += record.input_tokens
+        session.total_output_tokens += record.output_tokens
+        session.total_tokens += record.total_tokens
+        session.total_cost += record.cost
 
         # Update model breakdown
-        tier = self._get_model_tier(model).value
-        if tier not in self._session.model_breakdown:
-            self._session.model_breakdown[tier] = {
+        tier = self._get_model_tier(record.model).value
+        if tier not in session.model_breakdown:
+            session.model_breakdown[tier] = {
                 "requests": 0,
                 "input_tokens": 0,
                 "output_tokens": 0,
                 "cost": 0.0
             }
 
-        self._session.model_breakdown[tier]["requests"] += 1
-        self._session.model_breakdown[tier]["input_tokens"] += input_tokens
-        self._session.model_breakdown[tier]["output_tokens"] += output_tokens
-        self._session.model_breakdown[tier]["cost"] += cost
-
-        # Auto-save periodically
-        if self._session.total_requests % 10 == 0:
-            self._save_history()
+        session.model_breakdown[tier]["requests"] += 1
+        session.model_breakdown[tier]["input_tokens"] += record.input_tokens
+        session.model_breakdown[tier]["output_tokens"] += record.output_tokens
+        session.model_breakdown[tier]["cost"] += record.cost
 
     def get_session_cost(self) -> float:
         """Get current session total cost"""
@@ -287,7 +341,12 @@ class CostTracker:
         # Add to history if has usage
         if self._session.total_requests > 0:
             self._history.append(self._session)
-            self._save_history()
+            self._append({
+                "op": "end",
+                "session_id": self._session.session_id,
+                "started_at": self._session.started_at,
+                "ended_at": self._session.ended_at
+            })
 
         # Start new session
         self._session = SessionStats(
@@ -300,7 +359,14 @@ class CostTracker:
     def end_session(self):
         """End current session and save"""
         self._session.ended_at = datetime.now().isoformat()
-        self._save_history()
+        if self._session.total_requests > 0:
+            self._append({
+                "op": "end",
+                "session_id": self._session.session_id,
+                "started_at": self._session.started_at,
+                "ended_at": self._session.ended_at
+            })
+        self._journal.sync()
 
     # ==================== Display ====================
 
@@ -0,0 +1,428 @@
+"""
+BharatBuild CLI File Walker
+
+Shared, ignore-aware directory traversal used by the Glob/Grep/ListDir tools:
+  - Prunes ProjectIndexer.IGNORE_DIRS (node_modules, .git, build dirs, ...)
+  - Honours .gitignore files found along the way
+  - Skips binary files by sniffing their first bytes
+  - Streams grep matches and stops at a max-results cutoff
+  - Uses mmap for large files so they are not read into memory at once
+
+All blocking work runs on a thread pool; the async helpers never block the
+event loop.
+"""
+
+import asyncio
+import fnmatch
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator, Pattern
+
+from cli.project_index import ProjectIndexer
+
+
+# Bytes sniffed to decide whether a file is binary
+BINARY_SNIFF_BYTES = 8192
+
+# Files at or above this size are searched through mmap
+MMAP_THRESHOLD = 256 * 1024
+
+# Default cap on grep matches returned by a single search
+DEFAULT_MAX_RESULTS = 1000
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for file-system work"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=min(8, (os.cpu_count() or 2) + 2),
+            thread_name_prefix="bharatbuild-walk"
+        )
+    return _executor
+
+
+def glob_to_regex(pattern: str) -> Pattern[str]:
+    """
+    Compile a glob with Path.glob semantics, matched against posix paths
+    relative to the glob's start: `*`, `?` and `[...]` stay within one path
+    segment and a `**` segment matches zero or more directories.
+    """
+    parts = []
+    segments = [seg for seg in pattern.strip("/").split("/") if seg not in ("", ".")]
+    for i, seg in enumerate(segments):
+        last = i == len(segments) - 1
+        if seg == "**":
+            parts.append(".*" if last else "(?:[^/]+/)*")
+            continue
+
+        out = []
+        j = 0
+        while j < len(seg):
+            c = seg[j]
+            if c == "*":
+                out.append("[^/]*")
+            elif c == "?":
+                out.append("[^/]")
+            elif c == "[":
+                end = seg.find("]", j + 2 if seg[j + 1:j + 2] in ("!", "]") else j + 1)
+                if end == -1:
+                    out.append(re.escape(c))
+                else:
+                    body = seg[j + 1:end].replace("\\", "\\\\")
+                    if body.startswith("!"):
+                        body = "^" + body[1:]
+                    out.append(f"[{body}]")
+                    j = end
+            else:
+                out.append(re.escape(c))
+            j += 1
+        parts.append("".join(out) + ("" if last else "/"))
+
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
+def is_binary_file(path: Path) -> bool:
+    """Check whether a file looks binary by sniffing its first bytes"""
+    try:
+        with open(path, "rb") as f:
+            chunk = f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return True
+
+    if not chunk:
+        return False
+    if b"\x00" in chunk:
+        return True
+
+    try:
+        chunk.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte sequence cut at the sniff boundary is still text
+        if e.start < len(chunk) - 3:
+            return True
+    return False
+
+
+@dataclass
+class IgnoreRule:
+    """A single .gitignore pattern"""
+    pattern: str
+    base: str  # directory (relative to root, posix) the rule was declared in
+    negated: bool = False
+    dir_only: bool = False
+    anchored: bool = False
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+
+        if self.anchored:
+            return fnmatch.fnmatchcase(rel_path, self.pattern)
+
+        name = rel_path.rsplit("/", 1)[-1]
+        return (
+            fnmatch.fnmatchcase(name, self.pattern)
+            or fnmatch.fnmatchcase(rel_path, self.pattern)
+            or fnmatch.fnmatchcase(rel_path, "*/" + self.pattern)
+        )
+
+
+@dataclass
+class GitIgnore:
+    """Accumulated .gitignore rules for a tree (last matching rule wins)"""
+    rules: List[IgnoreRule] = field(default_factory=list)
+
+    def load(self, gitignore_path: Path, base: str = ""):
+        """Add rules from a .gitignore file located in directory `base`"""
+        try:
+            lines = gitignore_path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        except OSError:
+            return
+
+        for raw in lines:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if line.startswith("**/"):
+                line = line[3:]
+                anchored = "/" in line
+
+            if line:
+                self.rules.append(IgnoreRule(
+                    pattern=line,
+                    base=base,
+                    negated=negated,
+                    dir_only=dir_only,
+                    anchored=anchored
+                ))
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        ignored = False
+        for rule in self.rules:
+            if rule.matches(rel_path, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+
+class FileWalker:
+    """
+    Walks a project tree, skipping ignored directories and files.
+
+    Usage:
+        walker = FileWalker(project_root)
+
+        # All non-ignored files matching a glob
+        files = await walker.glob("**/*.py")
+
+        # Streaming grep with a result cap
+        matches = await walker.grep("useState", file_pattern="*.tsx", max_results=200)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        ignore_dirs: Optional[set] = None,
+        use_gitignore: bool = True
+    ):
+        self.root = Path(root).resolve()
+        self.ignore_dirs = ignore_dirs if ignore_dirs is not None else ProjectIndexer.IGNORE_DIRS
+        self.use_gitignore = use_gitignore
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def _for(self, start: Optional[Path]) -> "FileWalker":
+        """Walker to use for `start`; paths outside the root get their own walker"""
+        if start is None or Path(start).resolve().is_relative_to(self.root):
+            return self
+        return FileWalker(start, self.ignore_dirs, self.use_gitignore)
+
+    # ==================== Traversal ====================
+
+    def iter_files(
+        self,
+        start: Optional[Path] = None,
+        include_dirs: bool = False,
+        max_depth: Optional[int] = None
+    ) -> Iterator[Path]:
+        """
+        Yield every non-ignored file under `start` (defaults to root), plus
+        directories when include_dirs is set. max_depth limits how many
+        levels below `start` are visited (1 = direct children).
+        """
+        start = Path(start).resolve() if start else self.root
+        gitignore = GitIgnore()
+
+        if self.use_gitignore:
+            # Pick up .gitignore files from root down to the start directory
+            parts = [] if start == self.root else list(start.relative_to(self.root).parts)
+            current = self.root
+            for i in range(len(parts) + 1):
+                base = "/".join(parts[:i])
+                gitignore.load(current / ".gitignore", base)
+                if i < len(parts):
+                    current = current / parts[i]
+
+        for dirpath, dirnames, filenames in os.walk(start):
+            current = Path(dirpath)
+            rel_dir = "" if current == self.root else self._rel(current)
+            depth = 0 if current == start else len(current.relative_to(start).parts)
+
+            if self.use_gitignore and current != start and ".gitignore" in filenames:
+                gitignore.load(current / ".gitignore", rel_dir)
+
+            kept = []
+            for d in dirnames:
+                if d in self.ignore_dirs:
+                    continue
+                rel = f"{rel_dir}/{d}" if rel_dir else d
+                if gitignore.rules and gitignore.is_ignored(rel, is_dir=True):
+                    continue
+                kept.append(d)
+            dirnames[:] = sorted(kept)
+
+            if include_dirs:
+                for d in dirnames:
+                    yield current / d
+            if max_depth is not None and depth + 1 >= max_depth:
+                dirnames[:] = []
+
+            for name in sorted(filenames):
+                rel = f"{rel_dir}/{name}" if rel_dir else name
+                if gitignore.rules and gitignore.is_ignored(rel):
+                    continue
+                yield current / name
+
+    def iter_glob(self, pattern: str, start: Optional[Path] = None, files_only: bool = False) -> Iterator[Path]:
+        """
+        Yield non-ignored entries under `start` matching `pattern` with
+        Path.glob semantics: "*.py" matches direct children only, "**/*.py"
+        at any depth, and directories are included unless files_only is set.
+        """
+        start = Path(start).resolve() if start else self.root
+        regex = glob_to_regex(pattern)
+        segments = [seg for seg in pattern.strip("/").split("/") if seg not in ("", ".")]
+        # Without "**" nothing deeper than the pattern itself can match
+        max_depth = None if "**" in segments else len(segments)
+
+        for path in self.iter_files(start, include_dirs=not files_only, max_depth=max_depth):
+            if regex.match(path.relative_to(start).as_posix()):
+                yield path
+
+    def list_dir(self, directory: Path, pattern: str = "*") -> List[Path]:
+        """
+        List entries of a directory matching `pattern` (Path.glob semantics),
+        skipping ignored entries. Patterns with "/" or "**" reach below
+        the direct children.
+        """
+        directory = Path(directory).resolve()
+        if "/" in pattern or "**" in pattern:
+            return sorted(self.iter_glob(pattern, directory))
+
+        gitignore = GitIgnore()
+        if self.use_gitignore:
+            gitignore.load(self.root / ".gitignore")
+            if directory != self.root:
+                gitignore.load(directory / ".gitignore", self._rel(directory))
+
+        items = []
+        for item in directory.iterdir():
+            if not fnmatch.fnmatchcase(item.name, pattern):
+                continue
+            is_dir = item.is_dir()
+            if is_dir and item.name in self.ignore_dirs:
+                continue
+            if gitignore.rules and gitignore.is_ignored(self._rel(item), is_dir=is_dir):
+                continue
+            items.append(item)
+        return sorted(items)
+
+    # ==================== Search ====================
+
+    def _search_file(self, path: Path, regex: Pattern[str]) -> Iterator[Dict[str, Any]]:
+        """Yield matches in a single file"""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+
+        if size == 0 or is_binary_file(path):
+            return
+
+        rel = self._rel(path)
+
+        if size >= MMAP_THRESHOLD:
+            yield from self._search_mmap(path, rel, regex)
+            return
+
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for i, line in enumerate(f, 1):
+                    if regex.search(line):
+                        yield {"file": rel, "line": i, "content": line.strip()}
+        except OSError:
+            return
+
+    def _search_mmap(self, path: Path, rel: str, regex: Pattern[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Search a large file through mmap, one line at a time (so `^`, `\\s`
+        and `[^x]` behave as on the small-file path), decoding only
+        matching lines.
+        """
+        try:
+            byte_regex = re.compile(regex.pattern.encode("utf-8"), regex.flags & ~re.UNICODE)
+        except (re.error, UnicodeEncodeError):
+            byte_regex = None  # str-only syntax (e.g. \u escapes): match decoded lines
+
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line_no, line in enumerate(iter(mm.readline, b""), 1):
+                    if line.endswith(b"\r\n"):
+                        line = line[:-2] + b"\n"  # as text mode reads it
+                    if byte_regex is not None:
+                        if not byte_regex.search(line):
+                            continue
+                        text = line.decode("utf-8", errors="replace")
+                    else:
+                        text = line.decode("utf-8", errors="replace")
+                        if not regex.search(text):
+                            continue
+                    yield {"file": rel, "line": line_no, "content": text.strip()}
+        except (OSError, ValueError):
+            return
+
+    def iter_grep(
+        self,
+        regex: Pattern[str],
+        start: Optional[Path] = None,
+        file_pattern: str = "*"
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream matches of `regex` across non-ignored, non-binary files (file_pattern applies at any depth, like rglob)"""
+        for path in self.iter_glob(f"**/{file_pattern}", start, files_only=True):
+            yield from self._search_file(path, regex)
+
+    def grep_sync(
+        self,
+        pattern: str,
+        start: Optional[Path] = None,
+        file_pattern: str = "*",
+        max_results: int = DEFAULT_MAX_RESULTS
+    ) -> List[Dict[str, Any]]:
+        """Collect up to `max_results` matches, stopping the walk early"""
+        try:
+            regex = re.compile(pattern)
+        except re.error:
+            # Treat as literal string if not valid regex
+            regex = re.compile(re.escape(pattern))
+
+        results = []
+        for match in self.iter_grep(regex, start, file_pattern):
+            results.append(match)
+            if len(results) >= max_results:
+                break
+        return results
+
+    # ==================== Async API ====================
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+
+    async def glob(self, pattern: str, start: Optional[Path] = None) -> List[Path]:
+        walker = self._for(start)
+        return await self._run(lambda: list(walker.iter_glob(pattern, start)))
+
+    async def list(self, directory: Path, pattern: str = "*") -> List[Path]:
+        return await self._run(self._for(directory).list_dir, directory, pattern)
+
+    async def grep(
+        self,
+        pattern: str,
+        start: Optional[Path] = None,
+        file_pattern: str = "*",
+        max_results: int = DEFAULT_MAX_RESULTS
+    ) -> List[Dict[str, Any]]:
+        walker = self._for(start)
+        return await self._run(walker.grep_sync, pattern, start, file_pattern, max_results)
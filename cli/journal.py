@@ -0,0 +1,177 @@
+"""
+BharatBuild CLI Journal
+
+Append-only JSONL journal used for local persistence (sessions, session
+index, cost history, telemetry events):
+  - Appending a record is O(1) regardless of how much history exists
+  - fsync is batched (every N records or T seconds) instead of per write
+  - A torn final line from a crash is skipped on replay, never fatal
+  - Compaction rewrites the live state to a temp file and atomically
+    replaces the journal once enough superseded records pile up
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Iterator, IO
+
+
+class Journal:
+    """
+    Append-only JSONL file.
+
+    Usage:
+        journal = Journal(path)
+
+        # Persist a change
+        journal.append({"op": "message", "message": {...}})
+
+        # Rebuild state
+        for record in journal.replay():
+            ...
+
+        # Rewrite once superseded records dominate
+        if journal.needs_compaction():
+            journal.compact(current_state_records)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_every: int = 20,
+        fsync_interval: float = 1.0,
+        compact_threshold: int = 1000
+    ):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+
+        self._file: Optional[IO[str]] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Records in the file since it was last compacted. Seeded from the
+        # existing file so short-lived processes still reach the threshold.
+        self._records = self._count_lines()
+
+    # ==================== Writing ====================
+
+    def _open(self) -> IO[str]:
+        if self._file is None or self._file.closed:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def append(self, record: Dict[str, Any]):
+        """Append one record; flushed to the OS now, fsynced in batches"""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]):
+        """Append several records with a single write"""
+        lines = "".join(json.dumps(r, separators=(",", ":"), default=str) + "\n" for r in records)
+        if not lines:
+            return
+
+        f = self._open()
+        f.write(lines)
+        f.flush()
+
+        count = lines.count("\n")
+        self._records += count
+        self._unsynced += count
+        if (
+            self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self):
+        """Force pending appends to disk"""
+        if self._file and not self._file.closed and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self.sync()
+            self._file.close()
+        self._file = None
+
+    # ==================== Reading ====================
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _count_lines(self) -> int:
+        """Count records on disk without parsing them"""
+        try:
+            with open(self.path, "rb") as f:
+                return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 16), b""))
+        except FileNotFoundError:
+            return 0
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Yield records in append order, skipping a torn or corrupt line"""
+        self._records = 0
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partial write from a crash
+                self._records += 1
+                yield record
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """Read only the first record (cheap header lookups)"""
+        if not self.path.exists():
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    return json.loads(line)
+                except json.JSONDecodeError:
+                    return None
+        return None
+
+    # ==================== Compaction ====================
+
+    def needs_compaction(self, live_records: int = 0) -> bool:
+        """True once superseded records outnumber the threshold"""
+        return self._records - live_records > self.compact_threshold
+
+    def compact(self, records: Iterable[Dict[str, Any]]):
+        """Atomically replace the journal with `records`"""
+        was_open = self._file is not None and not self._file.closed
+        self.close()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        count = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+        self._records = count
+        if was_open:
+            self._open()
+
+    def delete(self):
+        """Remove the journal file"""
+        self.close()
+        self._records = 0
+        if self.path.exists():
+            self.path.unlink()
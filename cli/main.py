@@ -20,7 +20,6 @@ Modes:
 """
 
 import argparse
-import asyncio
 import sys
 import os
 from pathlib import Path
@@ -28,7 +27,54 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from cli.config import CLIConfig
+# Keep module-level imports to the stdlib: `--version`, `--help` and headless
+# runs in CI should not pay for rich, httpx, prompt_toolkit or the template
+# modules. Subsystems are imported inside the code paths that use them.
+
+
+def _cmd_login(args, auth_manager, console) -> int:
+    """Login command"""
+    import asyncio
+
+    if args.token:
+        # Login with token
+        success = asyncio.run(auth_manager.login_with_token(args.token))
+    else:
+        # Interactive login
+        success = asyncio.run(auth_manager.interactive_login())
+
+    if success:
+        console.print("\n[green]✓ Login successful![/green]")
+        console.print(f"Welcome, [bold]{auth_manager.credentials.name}[/bold]!")
+        console.print("\nYou can now use BharatBuild AI. Try:")
+        console.print("  [cyan]bharatbuild[/cyan]                    Start interactive mode")
+        console.print('  [cyan]bharatbuild "your request"[/cyan]    Run a single prompt')
+    else:
+        console.print("\n[red]✗ Login failed[/red]")
+        console.print("Please check your credentials or register at the web portal.")
+    return 0 if success else 1
+
+
+def _cmd_logout(args, auth_manager, console) -> int:
+    """Logout command"""
+    auth_manager.logout()
+    return 0
+
+
+def _cmd_status(args, auth_manager, console) -> int:
+    """Status / whoami command"""
+    auth_manager.show_status()
+    return 0
+
+
+# Subcommand registry: name -> (help text, handler). Handlers are only
+# resolved when their command is dispatched.
+COMMANDS = {
+    "login": ("Login to BharatBuild", _cmd_login),
+    "logout": ("Logout from BharatBuild", _cmd_logout),
+    "status": ("Show authentication status", _cmd_status),
+    "whoami": ("Show current user info", _cmd_status),
+}
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -90,18 +136,13 @@ Slash Commands:
     # Subcommands for auth
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
-    # Login command
-    login_parser = subparsers.add_parser("login", help="Login to BharatBuild")
-    login_parser.add_argument("--token", "-t", help="Login with CLI token from web portal")
+    command_parsers = {
+        name: subparsers.add_parser(name, help=help_text)
+        for name, (help_text, _) in COMMANDS.items()
+    }
 
-    # Logout command
-    subparsers.add_parser("logout", help="Logout from BharatBuild")
-
-    # Status command
-    subparsers.add_parser("status", help="Show authentication status")
-
-    # Whoami command
-    subparsers.add_parser("whoami", help="Show current user info")
+    # Login with token
+    command_parsers["login"].add_argument("--token", "-t", help="Login with CLI token from web portal")
 
     # Positional argument for prompt
     parser.add_argument(
@@ -260,35 +301,9 @@ def main():
     auth_manager = get_auth_manager(args.server_url)
 
     # Handle authentication commands first
-    if args.command == "login":
-        # Login command
-        if args.token:
-            # Login with token
-            success = asyncio.run(auth_manager.login_with_token(args.token))
-        else:
-            # Interactive login
-            success = asyncio.run(auth_manager.interactive_login())
-
-        if success:
-            console.print("\n[green]✓ Login successful![/green]")
-            console.print(f"Welcome, [bold]{auth_manager.credentials.name}[/bold]!")
-            console.print("\nYou can now use BharatBuild AI. Try:")
-            console.print("  [cyan]bharatbuild[/cyan]                    Start interactive mode")
-            console.print('  [cyan]bharatbuild "your request"[/cyan]    Run a single prompt')
-        else:
-            console.print("\n[red]✗ Login failed[/red]")
-            console.print("Please check your credentials or register at the web portal.")
-        sys.exit(0 if success else 1)
-
-    elif args.command == "logout":
-        # Logout command
-        auth_manager.logout()
-        sys.exit(0)
-
-    elif args.command == "status" or args.command == "whoami":
-        # Status command
-        auth_manager.show_status()
-        sys.exit(0)
+    if args.command in COMMANDS:
+        _, handler = COMMANDS[args.command]
+        sys.exit(handler(args, auth_manager, console))
 
     # For all operations, require authentication (uses backend API)
     if not auth_manager.is_authenticated():
@@ -299,6 +314,9 @@ def main():
         console.print("\nDon't have an account? Register at the web portal.")
         sys.exit(1)
 
+    import asyncio
+    from cli.config import CLIConfig
+
     # Determine the prompt
     prompt = args.prompt or args.prompt_flag
 
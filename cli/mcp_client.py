@@ -10,11 +10,13 @@ Enables connection to MCP servers for extended capabilities:
 
 import os
 import json
+import time
 import asyncio
-import subprocess
+import hashlib
+from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime
 
@@ -24,11 +26,19 @@ from rich.table import Table
 from rich.text import Text
 
 
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+# Default time allowed for one server's connect + handshake
+DEFAULT_CONNECT_TIMEOUT = 15.0
+
+# Default time allowed for a single JSON-RPC request
+DEFAULT_REQUEST_TIMEOUT = 60.0
+
+
 class MCPTransport(str, Enum):
     """MCP transport types"""
     STDIO = "stdio"         # Process with stdin/stdout
     HTTP = "http"           # HTTP/HTTPS endpoint
-    WEBSOCKET = "websocket" # WebSocket connection
 
 
 class MCPServerStatus(str, Enum):
@@ -66,10 +76,230 @@ class MCPServerConfig:
     command: Optional[str] = None       # For stdio transport
     args: List[str] = field(default_factory=list)
     env: Dict[str, str] = field(default_factory=dict)
-    url: Optional[str] = None           # For http/websocket transport
+    url: Optional[str] = None           # For http transport
     enabled: bool = True
     auto_connect: bool = True
 
+    def fingerprint(self) -> str:
+        """Hash of the fields that determine which server binary/endpoint runs"""
+        key = json.dumps(
+            {"transport": self.transport.value, "command": self.command, "args": self.args, "url": self.url},
+            sort_keys=True
+        )
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+@dataclass
+class ToolLatency:
+    """Latency statistics for one MCP tool"""
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def record(self, elapsed_ms: float, success: bool):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if not success:
+            self.errors += 1
+
+
+class MCPError(Exception):
+    """Error returned by an MCP server or raised by its transport"""
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class MCPConnection(ABC):
+    """
+    Multiplexed JSON-RPC 2.0 connection to one MCP server.
+
+    Requests are tagged with an id and matched to responses as they arrive,
+    so several requests can be in flight at once on one server.
+    """
+
+    def __init__(self, request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        self.request_timeout = request_timeout
+        self._next_id = 0
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    @abstractmethod
+    async def open(self):
+        """Start the transport"""
+
+    @abstractmethod
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a request and return its result"""
+
+    @abstractmethod
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a notification (no response expected)"""
+
+    @abstractmethod
+    async def close(self):
+        """Stop the transport and fail any requests still in flight"""
+
+    @staticmethod
+    def _unwrap(message: Dict[str, Any]) -> Any:
+        if "error" in message:
+            error = message["error"] or {}
+            raise MCPError(error.get("message", "Unknown MCP error"), error.get("code"), error.get("data"))
+        return message.get("result")
+
+
+class StdioConnection(MCPConnection):
+    """Newline-delimited JSON-RPC over a subprocess's stdin/stdout"""
+
+    def __init__(self, config: MCPServerConfig, request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        super().__init__(request_timeout)
+        self.config = config
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def open(self):
+        if not self.config.command:
+            raise ValueError("No command specified for stdio server")
+
+        # Build environment
+        env = os.environ.copy()
+        env.update(self.config.env)
+
+        self.process = await asyncio.create_subprocess_exec(
+            self.config.command,
+            *self.config.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            limit=16 * 1024 * 1024
+        )
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        """Dispatch responses to the futures waiting on their request ids"""
+        error: Exception = MCPError("Server closed the connection")
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # servers may log non-protocol lines
+                # Server-initiated requests and notifications share the id
+                # space with our responses; only results/errors resolve futures
+                if not isinstance(message, dict) or "method" in message:
+                    continue
+                if "result" not in message and "error" not in message:
+                    continue
+                future = self._pending.pop(message.get("id"), None)
+                if future and not future.done():
+                    future.set_result(message)
+        except Exception as e:
+            error = MCPError(f"Read failed: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def _send(self, payload: Dict[str, Any]):
+        if not self.process or self.process.returncode is not None:
+            raise MCPError("Server process is not running")
+        data = (json.dumps(payload) + "\n").encode()
+        async with self._write_lock:
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        request_id = self._new_id()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        payload = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            payload["params"] = params
+
+        try:
+            await self._send(payload)
+            message = await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        return self._unwrap(message)
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        payload = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            payload["params"] = params
+        await self._send(payload)
+
+    async def close(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self.process and self.process.returncode is None:
+            try:
+                self.process.terminate()
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except Exception:
+                self.process.kill()
+        self.process = None
+
+
+class HTTPConnection(MCPConnection):
+    """JSON-RPC over HTTP POST with a pooled keep-alive client"""
+
+    def __init__(self, config: MCPServerConfig, request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        super().__init__(request_timeout)
+        self.config = config
+        self._client = None
+
+    async def open(self):
+        import httpx
+
+        if not self.config.url:
+            raise ValueError("No URL specified for HTTP server")
+
+        self._client = httpx.AsyncClient(
+            timeout=self.request_timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={"Accept": "application/json"}
+        )
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        payload = {"jsonrpc": "2.0", "id": self._new_id(), "method": method}
+        if params is not None:
+            payload["params"] = params
+        response = await self._client.post(self.config.url, json=payload)
+        response.raise_for_status()
+        return self._unwrap(response.json())
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        payload = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            payload["params"] = params
+        await self._client.post(self.config.url, json=payload)
+
+    async def close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
 
 @dataclass
 class MCPServerState:
@@ -78,9 +308,12 @@ class MCPServerState:
     status: MCPServerStatus = MCPServerStatus.DISCONNECTED
     tools: List[MCPTool] = field(default_factory=list)
     resources: List[MCPResource] = field(default_factory=list)
-    process: Optional[subprocess.Popen] = None
+    connection: Optional[MCPConnection] = None
+    server_info: Dict[str, Any] = field(default_factory=dict)
+    capabilities: Dict[str, Any] = field(default_factory=dict)
     error_message: Optional[str] = None
     connected_at: Optional[datetime] = None
+    connect_ms: float = 0.0
 
 
 class MCPClient:
@@ -93,14 +326,19 @@ class MCPClient:
         # Add a server
         await client.add_server("github", "npx", ["-y", "@modelcontextprotocol/server-github"])
 
-        # Connect to all servers
+        # Connect to all servers (concurrently, each with its own timeout)
         await client.connect_all()
 
-        # List available tools
+        # List available tools (served from the capabilities cache when the
+        # server version and config are unchanged)
         tools = client.get_all_tools()
 
-        # Call a tool
+        # Call tools - several calls to one server can be in flight at once
         result = await client.call_tool("github", "search_repos", {"query": "python"})
+        results = await asyncio.gather(
+            client.call_tool("github", "get_issue", {"number": 1}),
+            client.call_tool("github", "get_issue", {"number": 2}),
+        )
 
         # Read a resource
         content = await client.read_resource("github", "repo://owner/repo")
@@ -109,17 +347,23 @@ class MCPClient:
     def __init__(
         self,
         console: Console,
-        config_dir: Optional[Path] = None
+        config_dir: Optional[Path] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT
     ):
         self.console = console
         self.config_dir = config_dir or (Path.home() / ".bharatbuild" / "mcp")
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
 
         self._servers: Dict[str, MCPServerState] = {}
         self._tool_callbacks: Dict[str, Callable] = {}
+        self._tool_latency: Dict[str, ToolLatency] = {}  # "server.tool" -> stats
 
-        # Load saved configurations
+        # Load saved configurations and cached capabilities
         self._load_configs()
+        self._capabilities_cache = self._load_capabilities_cache()
 
     def _load_configs(self):
         """Load server configurations from disk"""
@@ -131,9 +375,17 @@ class MCPClient:
                     data = json.load(f)
 
                 for name, config_data in data.get("servers", {}).items():
+                    try:
+                        transport = MCPTransport(config_data.get("transport", "stdio"))
+                    except ValueError:
+                        self.console.print(
+                            f"[yellow]Warning: Skipping MCP server '{name}': "
+                            f"unsupported transport '{config_data.get('transport')}'[/yellow]"
+                        )
+                        continue
                     config = MCPServerConfig(
                         name=name,
-                        transport=MCPTransport(config_data.get("transport", "stdio")),
+                        transport=transport,
                         command=config_data.get("command"),
                         args=config_data.get("args", []),
                         env=config_data.get("env", {}),
@@ -170,6 +422,66 @@ class MCPClient:
         except Exception as e:
             self.console.print(f"[yellow]Warning: Could not save MCP configs: {e}[/yellow]")
 
+    # ==================== Capabilities Cache ====================
+
+    @property
+    def _capabilities_file(self) -> Path:
+        return self.config_dir / "capabilities.json"
+
+    def _load_capabilities_cache(self) -> Dict[str, Any]:
+        """Load cached tools/resources, keyed by server name"""
+        try:
+            with open(self._capabilities_file) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_capabilities_cache(self):
+        try:
+            tmp = self._capabilities_file.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._capabilities_cache, f, indent=2)
+            os.replace(tmp, self._capabilities_file)
+        except Exception as e:
+            self.console.print(f"[yellow]Warning: Could not save MCP capabilities cache: {e}[/yellow]")
+
+    @staticmethod
+    def _cache_key(state: MCPServerState) -> Dict[str, Any]:
+        """What a cache entry must match to be reused"""
+        return {
+            "fingerprint": state.config.fingerprint(),
+            "server_name": state.server_info.get("name"),
+            "server_version": state.server_info.get("version"),
+        }
+
+    def _apply_cached_capabilities(self, state: MCPServerState) -> bool:
+        """Use cached tools/resources if they were recorded for this exact server build"""
+        entry = self._capabilities_cache.get(state.config.name)
+        # Without a server version there is nothing to validate against
+        if not entry or not state.server_info.get("version"):
+            return False
+        if entry.get("key") != self._cache_key(state):
+            return False
+
+        name = state.config.name
+        state.tools = [MCPTool(server_name=name, **t) for t in entry.get("tools", [])]
+        state.resources = [MCPResource(server_name=name, **r) for r in entry.get("resources", [])]
+        return True
+
+    def _store_capabilities(self, state: MCPServerState):
+        def strip(item) -> Dict[str, Any]:
+            data = asdict(item)
+            data.pop("server_name", None)
+            return data
+
+        self._capabilities_cache[state.config.name] = {
+            "key": self._cache_key(state),
+            "tools": [strip(t) for t in state.tools],
+            "resources": [strip(r) for r in state.resources],
+            "cached_at": datetime.now().isoformat(),
+        }
+        self._save_capabilities_cache()
+
     # ==================== Server Management ====================
 
     async def add_server(
@@ -197,12 +509,18 @@ class MCPClient:
 
         # Determine transport type
         if url:
-            if url.startswith("ws://") or url.startswith("wss://"):
-                transport = MCPTransport.WEBSOCKET
-            else:
-                transport = MCPTransport.HTTP
-        else:
+            if not url.startswith(("http://", "https://")):
+                self.console.print(
+                    f"[red]Unsupported MCP server URL '{url}': only http:// and https:// "
+                    f"are supported (use a stdio command for local servers)[/red]"
+                )
+                return False
+            transport = MCPTransport.HTTP
+        elif command:
             transport = MCPTransport.STDIO
+        else:
+            self.console.print("[red]An MCP server needs either a command or a URL[/red]")
+            return False
 
         config = MCPServerConfig(
             name=name,
@@ -253,30 +571,52 @@ class MCPClient:
 
         state.status = MCPServerStatus.CONNECTING
         self.console.print(f"[dim]Connecting to {name}...[/dim]")
+        start = time.perf_counter()
 
         try:
-            if state.config.transport == MCPTransport.STDIO:
-                await self._connect_stdio(state)
-            elif state.config.transport == MCPTransport.HTTP:
-                await self._connect_http(state)
-            elif state.config.transport == MCPTransport.WEBSOCKET:
-                await self._connect_websocket(state)
+            await asyncio.wait_for(self._open_and_initialize(state), self.connect_timeout)
 
             state.status = MCPServerStatus.CONNECTED
             state.connected_at = datetime.now()
-            self.console.print(f"[green]✓ Connected to {name}[/green]")
-
-            # Fetch capabilities
-            await self._fetch_capabilities(state)
-
+            state.error_message = None
+            state.connect_ms = (time.perf_counter() - start) * 1000
+            self.console.print(f"[green]✓ Connected to {name}[/green] [dim]({state.connect_ms:.0f}ms)[/dim]")
             return True
 
         except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError(f"timed out after {self.connect_timeout:.0f}s")
+            if state.connection:
+                await state.connection.close()
+                state.connection = None
             state.status = MCPServerStatus.ERROR
             state.error_message = str(e)
             self.console.print(f"[red]✗ Failed to connect to {name}: {e}[/red]")
             return False
 
+    async def _open_and_initialize(self, state: MCPServerState):
+        """Open the transport, run the MCP handshake and load capabilities"""
+        if state.config.transport == MCPTransport.STDIO:
+            state.connection = StdioConnection(state.config, self.request_timeout)
+        elif state.config.transport == MCPTransport.HTTP:
+            state.connection = HTTPConnection(state.config, self.request_timeout)
+        else:
+            raise MCPError(f"Unsupported transport: {state.config.transport.value}")
+
+        await state.connection.open()
+
+        result = await state.connection.request("initialize", {
+            "protocolVersion": MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "bharatbuild-cli", "version": "1.0.0"},
+        }) or {}
+        state.server_info = result.get("serverInfo", {})
+        state.capabilities = result.get("capabilities", {})
+        await state.connection.notify("notifications/initialized")
+
+        if not self._apply_cached_capabilities(state):
+            await self._fetch_capabilities(state)
+
     async def disconnect_server(self, name: str) -> bool:
         """Disconnect from an MCP server"""
         if name not in self._servers:
@@ -284,13 +624,9 @@ class MCPClient:
 
         state = self._servers[name]
 
-        if state.process:
-            try:
-                state.process.terminate()
-                state.process.wait(timeout=5)
-            except Exception:
-                state.process.kill()
-            state.process = None
+        if state.connection:
+            await state.connection.close()
+            state.connection = None
 
         state.status = MCPServerStatus.DISCONNECTED
         state.tools = []
@@ -299,77 +635,75 @@ class MCPClient:
         self.console.print(f"[dim]Disconnected from {name}[/dim]")
         return True
 
-    async def connect_all(self):
-        """Connect to all enabled servers"""
-        for name, state in self._servers.items():
-            if state.config.enabled and state.config.auto_connect:
-                await self.connect_server(name)
+    async def connect_all(self) -> Dict[str, bool]:
+        """
+        Connect to all enabled servers concurrently.
+
+        Startup waits for the slowest handshake rather than the sum of all;
+        each server is bounded by connect_timeout.
+        """
+        names = [
+            name for name, state in self._servers.items()
+            if state.config.enabled and state.config.auto_connect
+        ]
+        results = await asyncio.gather(*(self.connect_server(name) for name in names))
+        return dict(zip(names, results))
 
     async def disconnect_all(self):
         """Disconnect from all servers"""
-        for name in list(self._servers.keys()):
-            await self.disconnect_server(name)
-
-    # ==================== Transport Implementations ====================
-
-    async def _connect_stdio(self, state: MCPServerState):
-        """Connect to stdio-based MCP server"""
-        config = state.config
-
-        if not config.command:
-            raise ValueError("No command specified for stdio server")
+        await asyncio.gather(*(self.disconnect_server(name) for name in list(self._servers.keys())))
 
-        # Build environment
-        env = os.environ.copy()
-        env.update(config.env)
-
-        # Start process
-        cmd = [config.command] + config.args
-        state.process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            env=env,
-            text=True
+    async def _fetch_capabilities(self, state: MCPServerState):
+        """Fetch tools and resources from the server and cache them"""
+        name = state.config.name
+        conn = state.connection
+
+        async def list_all(method: str, key: str) -> List[Dict[str, Any]]:
+            items, cursor = [], None
+            while True:
+                result = await conn.request(method, {"cursor": cursor} if cursor else None) or {}
+                items.extend(result.get(key, []))
+                cursor = result.get("nextCursor")
+                if not cursor:
+                    return items
+
+        want_tools = "tools" in state.capabilities or not state.capabilities
+        want_resources = "resources" in state.capabilities
+
+        tools, resources = await asyncio.gather(
+            list_all("tools/list", "tools") if want_tools else asyncio.sleep(0, []),
+            list_all("resources/list", "resources") if want_resources else asyncio.sleep(0, []),
         )
 
-        # Wait briefly to check if process started
-        await asyncio.sleep(0.5)
-
-        if state.process.poll() is not None:
-            stderr = state.process.stderr.read() if state.process.stderr else ""
-            raise RuntimeError(f"Process exited immediately: {stderr}")
-
-    async def _connect_http(self, state: MCPServerState):
-        """Connect to HTTP-based MCP server"""
-        import httpx
-
-        if not state.config.url:
-            raise ValueError("No URL specified for HTTP server")
-
-        # Test connection
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(state.config.url)
-            response.raise_for_status()
-
-    async def _connect_websocket(self, state: MCPServerState):
-        """Connect to WebSocket-based MCP server"""
-        # WebSocket implementation would go here
-        raise NotImplementedError("WebSocket transport not yet implemented")
-
-    async def _fetch_capabilities(self, state: MCPServerState):
-        """Fetch tools and resources from server"""
-        # This would implement the MCP protocol to fetch capabilities
-        # For now, we'll simulate it
+        state.tools = [
+            MCPTool(
+                name=t["name"],
+                description=t.get("description", ""),
+                input_schema=t.get("inputSchema", {}),
+                server_name=name
+            )
+            for t in tools
+        ]
+        state.resources = [
+            MCPResource(
+                uri=r["uri"],
+                name=r.get("name", r["uri"]),
+                description=r.get("description", ""),
+                mime_type=r.get("mimeType"),
+                server_name=name
+            )
+            for r in resources
+        ]
 
-        # In a real implementation, this would:
-        # 1. Send "initialize" request
-        # 2. Send "tools/list" request
-        # 3. Send "resources/list" request
-        # 4. Store the results
+        if state.server_info.get("version"):
+            self._store_capabilities(state)
 
-        pass
+    async def refresh_capabilities(self, name: str):
+        """Re-query a connected server's tools/resources, bypassing the cache"""
+        state = self._servers.get(name)
+        if not state or state.status != MCPServerStatus.CONNECTED:
+            raise RuntimeError(f"Server '{name}' not connected")
+        await self._fetch_capabilities(state)
 
     # ==================== Tool & Resource Access ====================
 
@@ -414,13 +748,20 @@ class MCPClient:
         if state.status != MCPServerStatus.CONNECTED:
             raise RuntimeError(f"Server '{server_name}' not connected")
 
-        # In a real implementation, this would send the tool call via the appropriate transport
-        # and return the result
-
         self.console.print(f"[dim]Calling {server_name}.{tool_name}...[/dim]")
 
-        # Placeholder result
-        return {"status": "success", "result": None}
+        stats = self._tool_latency.setdefault(f"{server_name}.{tool_name}", ToolLatency())
+        start = time.perf_counter()
+        success = False
+        try:
+            result = await state.connection.request("tools/call", {
+                "name": tool_name,
+                "arguments": arguments,
+            }) or {}
+            success = not result.get("isError", False)
+            return result
+        finally:
+            stats.record((time.perf_counter() - start) * 1000, success)
 
     async def read_resource(
         self,
@@ -440,13 +781,25 @@ class MCPClient:
         if state.status != MCPServerStatus.CONNECTED:
             raise RuntimeError(f"Server '{server_name}' not connected")
 
-        # In a real implementation, this would send the resource read request
-        # via the appropriate transport and return the content
-
         self.console.print(f"[dim]Reading {uri} from {server_name}...[/dim]")
 
-        # Placeholder result
-        return ""
+        result = await state.connection.request("resources/read", {"uri": uri}) or {}
+        return "\n".join(
+            c.get("text", "") for c in result.get("contents", []) if "text" in c
+        )
+
+    def get_tool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool latency statistics, keyed by "server.tool" """
+        return {
+            key: {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "avg_ms": round(stats.avg_ms, 1),
+                "max_ms": round(stats.max_ms, 1),
+                "last_ms": round(stats.last_ms, 1),
+            }
+            for key, stats in self._tool_latency.items()
+        }
 
     # ==================== Display ====================
 
@@ -513,6 +866,26 @@ class MCPClient:
 
         self.console.print(table)
 
+    def show_metrics(self):
+        """Show per-tool latency metrics"""
+        metrics = self.get_tool_metrics()
+
+        if not metrics:
+            self.console.print("[dim]No MCP tool calls yet[/dim]")
+            return
+
+        table = Table(title="MCP Tool Latency", show_header=True, header_style="bold cyan")
+        table.add_column("Tool", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("Avg (ms)", justify="right")
+        table.add_column("Max (ms)", justify="right")
+
+        for key, m in sorted(metrics.items(), key=lambda item: -item[1]["avg_ms"]):
+            table.add_row(key, str(m["calls"]), str(m["errors"]), f"{m['avg_ms']:.1f}", f"{m['max_ms']:.1f}")
+
+        self.console.print(table)
+
     def show_resources(self, server_name: Optional[str] = None):
         """Show available resources"""
         if server_name:
@@ -20,6 +20,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
 
+from cli.journal import Journal
+
 
 class SessionState(str, Enum):
     """Session state"""
@@ -49,6 +51,40 @@ class Session:
     metadata: SessionMetadata
     messages: List[Dict[str, Any]] = field(default_factory=list)
     context: Dict[str, Any] = field(default_factory=dict)
+    # Number of messages already written to the session journal
+    persisted: int = field(default=0, repr=False, compare=False)
+
+
+def _metadata_to_dict(metadata: SessionMetadata) -> Dict[str, Any]:
+    return {
+        "id": metadata.id,
+        "created_at": metadata.created_at,
+        "updated_at": metadata.updated_at,
+        "state": metadata.state.value,
+        "project_dir": metadata.project_dir,
+        "project_name": metadata.project_name,
+        "summary": metadata.summary,
+        "message_count": metadata.message_count,
+        "token_count": metadata.token_count
+    }
+
+
+def _metadata_from_dict(data: Dict[str, Any]) -> SessionMetadata:
+    return SessionMetadata(
+        id=data["id"],
+        created_at=data["created_at"],
+        updated_at=data.get("updated_at", data["created_at"]),
+        state=SessionState(data.get("state", "completed")),
+        project_dir=data.get("project_dir", ""),
+        project_name=data.get("project_name", ""),
+        summary=data.get("summary", ""),
+        message_count=data.get("message_count", 0),
+        token_count=data.get("token_count", 0)
+    )
+
+
+def _estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content", ""))) // 4 for m in messages)
 
 
 class SessionManager:
@@ -62,6 +98,11 @@ class SessionManager:
     - Session history
     - Session archiving
 
+    Persistence is journaled: each session is an append-only JSONL file and
+    the index is a JSONL log of upserts/deletes, so saving a message costs
+    the same regardless of history size. The index holds metadata only;
+    messages are read from a session journal when it is resumed.
+
     Usage:
         manager = SessionManager(console, config_dir)
 
@@ -97,65 +138,74 @@ class SessionManager:
 
         # Current session
         self._current_session: Optional[Session] = None
+        self._journals: Dict[str, Journal] = {}
 
         # Session index
+        self._index_journal = Journal(
+            self.sessions_dir / "index.jsonl",
+            compact_threshold=self.MAX_SESSIONS * 4
+        )
         self._sessions: List[SessionMetadata] = []
         self._load_index()
 
     def _load_index(self):
-        """Load session index"""
-        index_file = self.sessions_dir / "index.json"
-
-        if index_file.exists():
-            try:
-                with open(index_file) as f:
+        """Load session index (metadata only)"""
+        try:
+            if self._index_journal.exists():
+                sessions: Dict[str, SessionMetadata] = {}
+                for record in self._index_journal.replay():
+                    if record.get("op") == "upsert":
+                        metadata = _metadata_from_dict(record["session"])
+                        sessions[metadata.id] = metadata
+                    elif record.get("op") == "delete":
+                        sessions.pop(record.get("id"), None)
+                self._sessions = list(sessions.values())
+                return
+
+            # Migrate the pre-journal index.json
+            legacy_index = self.sessions_dir / "index.json"
+            if legacy_index.exists():
+                with open(legacy_index) as f:
                     data = json.load(f)
+                self._sessions = [_metadata_from_dict(d) for d in data.get("sessions", [])]
+                self._compact_index()
+                legacy_index.unlink()
 
-                for session_data in data.get("sessions", []):
-                    metadata = SessionMetadata(
-                        id=session_data["id"],
-                        created_at=session_data["created_at"],
-                        updated_at=session_data.get("updated_at", session_data["created_at"]),
-                        state=SessionState(session_data.get("state", "completed")),
-                        project_dir=session_data.get("project_dir", ""),
-                        project_name=session_data.get("project_name", ""),
-                        summary=session_data.get("summary", ""),
-                        message_count=session_data.get("message_count", 0),
-                        token_count=session_data.get("token_count", 0)
-                    )
-                    self._sessions.append(metadata)
-
-            except Exception as e:
-                self.console.print(f"[yellow]Warning: Could not load session index: {e}[/yellow]")
-
-    def _save_index(self):
-        """Save session index"""
-        index_file = self.sessions_dir / "index.json"
-
-        data = {
-            "sessions": [
-                {
-                    "id": s.id,
-                    "created_at": s.created_at,
-                    "updated_at": s.updated_at,
-                    "state": s.state.value,
-                    "project_dir": s.project_dir,
-                    "project_name": s.project_name,
-                    "summary": s.summary,
-                    "message_count": s.message_count,
-                    "token_count": s.token_count
-                }
-                for s in self._sessions[-self.MAX_SESSIONS:]
-            ]
-        }
+        except Exception as e:
+            self.console.print(f"[yellow]Warning: Could not load session index: {e}[/yellow]")
 
-        with open(index_file, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _save_index(self, metadata: Optional[SessionMetadata] = None):
+        """Record an index change (or rewrite the whole index if no session is given)"""
+        if metadata is None:
+            self._compact_index()
+            return
+
+        self._index_journal.append({"op": "upsert", "session": _metadata_to_dict(metadata)})
+        if self._index_journal.needs_compaction(len(self._sessions)):
+            self._compact_index()
+
+    def _compact_index(self):
+        """Rewrite the index journal with the current sessions"""
+        self._index_journal.compact(
+            {"op": "upsert", "session": _metadata_to_dict(s)}
+            for s in self._sessions[-self.MAX_SESSIONS:]
+        )
 
     def _get_session_file(self, session_id: str) -> Path:
-        """Get session file path"""
+        """Get legacy (pre-journal) session file path"""
         return self.sessions_dir / f"{session_id}.json"
 
+    def _get_journal(self, session_id: str) -> Journal:
+        """Get the journal for a session"""
+        if session_id not in self._journals:
+            self._journals[session_id] = Journal(self.sessions_dir / f"{session_id}.jsonl")
+        return self._journals[session_id]
+
+    def _close_journal(self, session_id: str):
+        journal = self._journals.pop(session_id, None)
+        if journal:
+            journal.close()
+
     # ==================== Session Operations ====================
 
     def create_session(self) -> Session:
@@ -179,7 +229,7 @@ class SessionManager:
 
         # Save
         self._save_session_file(session)
-        self._save_index()
+        self._save_index(metadata)
 
         return session
 
@@ -197,11 +247,11 @@ class SessionManager:
         session.metadata.updated_at = datetime.now().isoformat()
         session.metadata.message_count = len(session.messages)
 
-        # Estimate tokens
-        session.metadata.token_count = sum(
-            len(str(m.get("content", ""))) // 4
-            for m in session.messages
-        )
+        # Estimate tokens (only for messages not yet counted)
+        if len(session.messages) < session.persisted:
+            session.metadata.token_count = _estimate_tokens(session.messages)
+        else:
+            session.metadata.token_count += _estimate_tokens(session.messages[session.persisted:])
 
         # Generate summary from first user message
         if not session.metadata.summary and session.messages:
@@ -222,56 +272,84 @@ class SessionManager:
                 self._sessions[i] = session.metadata
                 break
 
-        self._save_index()
+        self._save_index(session.metadata)
+
+    def _session_records(self, session: Session):
+        """Full journal contents for a session"""
+        yield {"op": "meta", "metadata": _metadata_to_dict(session.metadata)}
+        if session.context:
+            yield {"op": "context", "context": session.context}
+        for message in session.messages:
+            yield {"op": "message", "message": message}
 
     def _save_session_file(self, session: Session):
-        """Save session to file"""
-        session_file = self._get_session_file(session.metadata.id)
-
-        data = {
-            "metadata": {
-                "id": session.metadata.id,
-                "created_at": session.metadata.created_at,
-                "updated_at": session.metadata.updated_at,
-                "state": session.metadata.state.value,
-                "project_dir": session.metadata.project_dir,
-                "project_name": session.metadata.project_name,
-                "summary": session.metadata.summary,
-                "message_count": session.metadata.message_count,
-                "token_count": session.metadata.token_count
-            },
-            "messages": session.messages,
-            "context": session.context
-        }
-
-        with open(session_file, 'w') as f:
-            json.dump(data, f, indent=2)
-
-    def load_session(self, session_id: str) -> Optional[Session]:
-        """Load session from disk"""
-        session_file = self._get_session_file(session_id)
+        """Append unsaved messages and the latest metadata to the session journal"""
+        journal = self._get_journal(session.metadata.id)
+
+        if len(session.messages) < session.persisted or not journal.exists():
+            # History was rewritten (or never journaled) - write it out in full
+            journal.compact(self._session_records(session))
+        else:
+            records = [
+                {"op": "message", "message": m}
+                for m in session.messages[session.persisted:]
+            ]
+            records.append({"op": "meta", "metadata": _metadata_to_dict(session.metadata)})
+            journal.append_many(records)
 
-        if not session_file.exists():
-            return None
+            if journal.needs_compaction(len(session.messages) + 2):
+                journal.compact(self._session_records(session))
+
+        session.persisted = len(session.messages)
+
+    def load_session(self, session_id: str, include_messages: bool = True) -> Optional[Session]:
+        """
+        Load session from disk.
+
+        With include_messages=False only metadata is read (from the index when
+        possible), which is what listings and detail views need.
+        """
+        if not include_messages:
+            for metadata in self._sessions:
+                if metadata.id == session_id:
+                    return Session(metadata=metadata)
+
+        journal = self._get_journal(session_id)
 
         try:
+            if journal.exists():
+                if not include_messages:
+                    header = journal.first()
+                    if header and header.get("op") == "meta":
+                        return Session(metadata=_metadata_from_dict(header["metadata"]))
+
+                metadata = None
+                messages: List[Dict[str, Any]] = []
+                context: Dict[str, Any] = {}
+                for record in journal.replay():
+                    op = record.get("op")
+                    if op == "meta":
+                        metadata = _metadata_from_dict(record["metadata"])
+                    elif op == "message":
+                        messages.append(record["message"])
+                    elif op == "context":
+                        context.update(record["context"])
+
+                if metadata is None:
+                    return None
+                metadata.message_count = len(messages)
+                return Session(metadata=metadata, messages=messages, context=context, persisted=len(messages))
+
+            # Pre-journal session file
+            session_file = self._get_session_file(session_id)
+            if not session_file.exists():
+                return None
+
             with open(session_file) as f:
                 data = json.load(f)
 
-            metadata = SessionMetadata(
-                id=data["metadata"]["id"],
-                created_at=data["metadata"]["created_at"],
-                updated_at=data["metadata"].get("updated_at", data["metadata"]["created_at"]),
-                state=SessionState(data["metadata"].get("state", "completed")),
-                project_dir=data["metadata"].get("project_dir", ""),
-                project_name=data["metadata"].get("project_name", ""),
-                summary=data["metadata"].get("summary", ""),
-                message_count=data["metadata"].get("message_count", 0),
-                token_count=data["metadata"].get("token_count", 0)
-            )
-
             return Session(
-                metadata=metadata,
+                metadata=_metadata_from_dict(data["metadata"]),
                 messages=data.get("messages", []),
                 context=data.get("context", {})
             )
@@ -324,19 +402,26 @@ class SessionManager:
 
         session.metadata.state = SessionState.COMPLETED
         self.save_session(session)
+        self._close_journal(session.metadata.id)
 
         if session == self._current_session:
             self._current_session = None
 
     def add_message(self, message: Dict[str, Any]):
-        """Add message to current session"""
-        if not self._current_session:
+        """Add message to current session (appended to its journal immediately)"""
+        session = self._current_session
+        if not session:
             return
 
-        self._current_session.messages.append(message)
+        session.messages.append(message)
 
-        # Auto-save periodically
-        if len(self._current_session.messages) % self.AUTO_SAVE_INTERVAL == 0:
+        if session.persisted == len(session.messages) - 1:
+            self._get_journal(session.metadata.id).append({"op": "message", "message": message})
+            session.persisted += 1
+            session.metadata.token_count += _estimate_tokens([message])
+
+        # Refresh metadata and index periodically
+        if len(session.messages) % self.AUTO_SAVE_INTERVAL == 0:
             self.save_session()
 
     def update_context(self, context: Dict[str, Any]):
@@ -345,19 +430,22 @@ class SessionManager:
             return
 
         self._current_session.context.update(context)
+        self._get_journal(self._current_session.metadata.id).append({"op": "context", "context": context})
 
     # ==================== Session Management ====================
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
-        session_file = self._get_session_file(session_id)
+        self._get_journal(session_id).delete()
+        self._journals.pop(session_id, None)
 
+        session_file = self._get_session_file(session_id)
         if session_file.exists():
             session_file.unlink()
 
         # Remove from index
         self._sessions = [s for s in self._sessions if s.id != session_id]
-        self._save_index()
+        self._index_journal.append({"op": "delete", "id": session_id})
 
         self.console.print(f"[green]✓ Deleted session: {session_id}[/green]")
         return True
@@ -367,7 +455,7 @@ class SessionManager:
         for session in self._sessions:
             if session.id == session_id:
                 session.state = SessionState.ARCHIVED
-                self._save_index()
+                self._save_index(session)
                 self.console.print(f"[green]✓ Archived session: {session_id}[/green]")
                 return True
 
@@ -448,7 +536,7 @@ class SessionManager:
 
     def show_session(self, session_id: str):
         """Show session details"""
-        session = self.load_session(session_id)
+        session = self.load_session(session_id, include_messages=False)
 
         if not session:
             self.console.print(f"[red]Session not found: {session_id}[/red]")
@@ -498,7 +586,7 @@ Manage and resume conversation sessions.
   [green]/session clear[/green]      Clear old sessions
 
 [bold]Auto-Save:[/bold]
-  Sessions are automatically saved every 5 messages.
+  Messages are saved as they are added.
   Interrupted sessions can be resumed later.
 
 [bold]Examples:[/bold]
@@ -21,6 +21,8 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm
 
+from cli.journal import Journal
+
 
 class TelemetryEvent(str, Enum):
     """Types of telemetry events"""
@@ -85,11 +87,15 @@ class TelemetryManager:
             telemetry.track_event("command_used", {"command": "help"})
     """
 
+    MAX_STORED_EVENTS = 100
+
     def __init__(self, console: Console, config_dir: Path = None):
         self.console = console
         self.config_dir = config_dir or Path.home() / ".bharatbuild"
         self.config_file = self.config_dir / "telemetry.json"
-        self.events_file = self.config_dir / "telemetry_events.json"
+        self.events_file = self.config_dir / "telemetry_events.jsonl"
+        self._events_journal = Journal(self.events_file, compact_threshold=self.MAX_STORED_EVENTS)
+        self._migrate_legacy_events()
 
         # Load config
         self.config = self._load_config()
@@ -136,6 +142,21 @@ class TelemetryManager:
                 "share_model_usage": config.share_model_usage,
             }, f, indent=2)
 
+    def _migrate_legacy_events(self):
+        """Move events from the pre-journal telemetry_events.json into the journal"""
+        legacy_file = self.config_dir / "telemetry_events.json"
+        if not legacy_file.exists():
+            return
+
+        try:
+            if not self._events_journal.exists():
+                with open(legacy_file) as f:
+                    events = json.load(f)
+                self._events_journal.compact(events[-self.MAX_STORED_EVENTS:])
+            legacy_file.unlink()
+        except Exception:
+            pass
+
     def _generate_anonymous_id(self) -> str:
         """Generate anonymous installation ID"""
         # Use random UUID - no machine-identifiable info
@@ -166,8 +187,7 @@ class TelemetryManager:
 
         # Clear any pending events
         self._events.clear()
-        if self.events_file.exists():
-            self.events_file.unlink()
+        self._events_journal.delete()
 
         self.console.print("[green]✓ Telemetry disabled[/green]")
         self.console.print("[dim]No data will be collected or sent[/dim]")
@@ -306,21 +326,14 @@ class TelemetryManager:
             return
 
         try:
-            existing = []
-            if self.events_file.exists():
-                with open(self.events_file) as f:
-                    existing = json.load(f)
-
             # Add new events
-            existing.extend([asdict(e) for e in self._events])
+            self._events_journal.append_many(asdict(e) for e in self._events)
+            self._events.clear()
 
             # Keep only recent events (max 100)
-            existing = existing[-100:]
-
-            with open(self.events_file, 'w') as f:
-                json.dump(existing, f)
-
-            self._events.clear()
+            if self._events_journal.needs_compaction(self.MAX_STORED_EVENTS):
+                recent = list(self._events_journal.replay())[-self.MAX_STORED_EVENTS:]
+                self._events_journal.compact(recent)
 
         except Exception:
             pass
@@ -331,8 +344,7 @@ class TelemetryManager:
 
         # In a real implementation, this would send to server
         # For now, just clear local events
-        if self.events_file.exists():
-            self.events_file.unlink()
+        self._events_journal.delete()
 
     # ==================== Display ====================
 
@@ -0,0 +1,104 @@
+"""
+Unit Tests for the CLI FileWalker (glob semantics, line-by-line search)
+"""
+import asyncio
+import re
+
+import pytest
+from rich.console import Console
+
+from cli import file_walker
+from cli.config import CLIConfig
+from cli.file_walker import FileWalker, glob_to_regex
+from cli.tools import ToolExecutor
+
+
+SOURCE = (
+    "import os\n"
+    "from x import y  # import\n"
+    "    import sys\r\n"
+    "value = 'café'\n"
+    "a = 1\n"
+    "b\n"
+    "end\n"
+    "import json"
+)
+
+PATTERNS = [r"^import", r"import\s+\w+", r"b\s", r"[^x]+end", r"[^=]\n", r"café", "import$"]
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "main.py").write_text("print(1)\n")
+    (tmp_path / "src" / "app.py").write_text("import os\n")
+    (tmp_path / "src" / "pkg" / "util.py").write_text("import re\n")
+    (tmp_path / "src" / "pkg" / "notes.txt").write_text("import nothing\n")
+    (tmp_path / "node_modules" / "lib" / "index.py").write_text("import os\n")
+    return tmp_path
+
+
+class TestSearchPaths:
+    """Test that small files and mmap'd large files give the same matches"""
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_mmap_path_matches_small_file_path(self, tmp_path, monkeypatch, pattern):
+        path = tmp_path / "big.py"
+        path.write_bytes(SOURCE.encode("utf-8"))
+        walker = FileWalker(tmp_path)
+        regex = re.compile(pattern)
+
+        monkeypatch.setattr(file_walker, "MMAP_THRESHOLD", 10 ** 9)
+        small = list(walker._search_file(path, regex))
+        monkeypatch.setattr(file_walker, "MMAP_THRESHOLD", 1)
+        large = list(walker._search_file(path, regex))
+
+        assert large == small
+
+    def test_mmap_reports_each_line_once_with_its_number(self, tmp_path):
+        path = tmp_path / "big.py"
+        path.write_bytes(SOURCE.encode("utf-8"))
+
+        matches = list(FileWalker(tmp_path)._search_mmap(path, "big.py", re.compile(r"^import")))
+
+        assert [(m["line"], m["content"]) for m in matches] == [(1, "import os"), (8, "import json")]
+
+
+class TestGlobSemantics:
+    """Test that globs follow Path.glob"""
+
+    @pytest.mark.parametrize("pattern,path,expected", [
+        ("*.py", "main.py", True),
+        ("*.py", "src/app.py", False),
+        ("**/*.py", "main.py", True),
+        ("**/*.py", "src/pkg/util.py", True),
+        ("src/*.py", "src/app.py", True),
+        ("src/*.py", "src/pkg/util.py", False),
+        ("src/[!a]*", "src/pkg", True),
+    ])
+    def test_glob_to_regex(self, pattern, path, expected):
+        assert bool(glob_to_regex(pattern).match(path)) is expected
+
+    def test_glob_files_matches_path_glob_minus_ignored(self, project):
+        tools = ToolExecutor(CLIConfig(working_directory=str(project)), Console(quiet=True))
+
+        def glob(pattern):
+            return asyncio.run(tools.glob_files(pattern))
+
+        assert glob("*.py") == ["main.py"]
+        assert glob("src/*.py") == ["src/app.py"]
+        assert glob("**/*.py") == ["main.py", "src/app.py", "src/pkg/util.py"]
+        assert glob("src/*") == ["src/app.py", "src/pkg"]
+        assert glob("*") == ["main.py", "src"]
+
+    def test_list_and_grep_skip_ignored_dirs(self, project):
+        tools = ToolExecutor(CLIConfig(working_directory=str(project)), Console(quiet=True))
+
+        assert asyncio.run(tools.list_files(".")) == ["main.py", "src"]
+        assert asyncio.run(tools.list_files("src", "**/*.py")) == ["src/app.py", "src/pkg/util.py"]
+
+        matches = asyncio.run(tools.grep_files(r"^import", file_pattern="*.py"))
+        assert [(m["file"], m["content"]) for m in matches] == [
+            ("src/app.py", "import os"), ("src/pkg/util.py", "import re")
+        ]
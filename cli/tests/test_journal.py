@@ -0,0 +1,123 @@
+"""
+Unit Tests for the CLI Journal and the stores built on it (telemetry,
+sessions, cost history), run as a series of short-lived processes
+"""
+import json
+
+from rich.console import Console
+
+from cli.cost_tracker import CostTracker
+from cli.journal import Journal
+from cli.session_manager import SessionManager
+from cli.telemetry import TelemetryManager
+
+
+def line_count(path) -> int:
+    return len(path.read_text().splitlines())
+
+
+class TestJournal:
+    """Test append, replay and compaction bookkeeping"""
+
+    def test_record_count_is_seeded_from_existing_file(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        journal = Journal(path, compact_threshold=5)
+        journal.append_many({"n": i} for i in range(4))
+        journal.close()
+
+        reopened = Journal(path, compact_threshold=5)
+        assert not reopened.needs_compaction()
+        reopened.append_many([{"n": 4}, {"n": 5}])
+        assert reopened.needs_compaction()
+
+    def test_torn_final_line_is_skipped(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text('{"n": 1}\n{"n": 2}\n{"n": ')
+
+        assert list(Journal(path).replay()) == [{"n": 1}, {"n": 2}]
+
+    def test_compact_replaces_contents(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        journal = Journal(path, compact_threshold=2)
+        journal.append_many({"n": i} for i in range(5))
+        journal.compact([{"n": 4}])
+        journal.append({"n": 5})
+
+        assert list(Journal(path).replay()) == [{"n": 4}, {"n": 5}]
+        assert not journal.needs_compaction()
+
+
+class TestTelemetryJournal:
+    """Test that the telemetry event store stays bounded across runs"""
+
+    def test_short_runs_stay_capped(self, tmp_path):
+        for run in range(30):
+            telemetry = TelemetryManager(Console(quiet=True), config_dir=tmp_path)
+            telemetry.config.enabled = True
+            for i in range(10):
+                telemetry.track_command(f"cmd-{run}-{i}")
+            telemetry._events_journal.close()
+
+        events = list(Journal(telemetry.events_file).replay())
+        assert len(events) <= 2 * TelemetryManager.MAX_STORED_EVENTS
+        assert events[-1]["data"] == {"command": "cmd-29-9"}
+
+    def test_legacy_events_file_is_migrated(self, tmp_path):
+        legacy = tmp_path / "telemetry_events.json"
+        legacy.write_text(json.dumps([
+            {"event_type": "command_used", "timestamp": "t", "data": {"command": str(i)}}
+            for i in range(150)
+        ]))
+
+        telemetry = TelemetryManager(Console(quiet=True), config_dir=tmp_path)
+
+        events = list(Journal(telemetry.events_file).replay())
+        assert not legacy.exists()
+        assert len(events) == TelemetryManager.MAX_STORED_EVENTS
+        assert events[0]["data"] == {"command": "50"}
+
+
+class TestSessionJournal:
+    """Test that the session index compacts across runs and sessions survive"""
+
+    def test_resumed_session_keeps_messages_and_index_is_compacted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SessionManager, "MAX_SESSIONS", 2)
+        console = Console(quiet=True)
+
+        manager = SessionManager(console, config_dir=tmp_path, project_dir=tmp_path)
+        session_id = manager.create_session().metadata.id
+        manager.end_session()
+
+        for run in range(20):
+            manager = SessionManager(console, config_dir=tmp_path, project_dir=tmp_path)
+            session = manager.resume_session(session_id)
+            assert len(session.messages) == run
+            manager.add_message({"role": "user", "content": f"message {run}"})
+            manager.end_session()
+
+        index = tmp_path / "sessions" / "index.jsonl"
+        assert line_count(index) <= SessionManager.MAX_SESSIONS * 4 + 2
+        session = SessionManager(console, config_dir=tmp_path, project_dir=tmp_path).load_session(session_id)
+        assert session.messages[-1]["content"] == "message 19"
+        assert session.metadata.message_count == 20
+
+
+class TestCostJournal:
+    """Test that cost history compacts across runs without losing totals"""
+
+    def test_history_is_compacted_across_runs(self, tmp_path):
+        console = Console(quiet=True)
+        for run in range(10):
+            tracker = CostTracker(console, config_dir=tmp_path)
+            tracker._journal.compact_threshold = 10
+            tracker._session.session_id = f"run-{run}"
+            for _ in range(4):
+                tracker.record_usage(1000, 500)
+            tracker.end_session()
+            tracker._journal.close()
+
+        tracker = CostTracker(console, config_dir=tmp_path)
+        assert line_count(tmp_path / "history.jsonl") <= 10 + 10 + 1
+        assert len(tracker._history) == 10
+        assert sum(s.total_requests for s in tracker._history) == 40
+        assert all(s.ended_at for s in tracker._history)
@@ -0,0 +1,164 @@
+"""
+Unit Tests for the CLI MCP client (stdio multiplexing, capabilities cache)
+"""
+import asyncio
+import sys
+import time
+
+import pytest
+from rich.console import Console
+
+from cli.mcp_client import MCPClient, MCPConnection, MCPTransport
+
+
+# Minimal MCP server: answers tools/call after the requested delay on a
+# thread, so responses arrive out of order. Before every response it also
+# sends a server-initiated request that reuses the client's id, plus a
+# notification, which the client must not mistake for responses.
+FAKE_SERVER = r'''
+import json, os, sys, threading, time
+
+lock = threading.Lock()
+
+def send(message):
+    with lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+def reply(request, result):
+    send({"jsonrpc": "2.0", "id": request["id"], "method": "ping"})
+    send({"jsonrpc": "2.0", "method": "notifications/message", "params": {"data": "hi"}})
+    send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+def call(request):
+    args = request["params"]["arguments"]
+    time.sleep(args.get("delay", 0))
+    reply(request, {"content": [{"type": "text", "text": args["text"]}]})
+
+print("fake server starting", flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    method = request.get("method")
+    if "id" not in request:
+        continue
+    if method == "initialize":
+        reply(request, {"serverInfo": {"name": "fake", "version": "1.0"}, "capabilities": {"tools": {}}})
+    elif method == "tools/list":
+        with open(os.environ["FAKE_MCP_LOG"], "a") as log:
+            log.write("tools/list\n")
+        reply(request, {"tools": [{"name": "echo", "description": "Echo text", "inputSchema": {}}]})
+    elif method == "tools/call":
+        threading.Thread(target=call, args=(request,), daemon=True).start()
+'''
+
+
+@pytest.fixture
+def fake_server(tmp_path):
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    log = tmp_path / "calls.log"
+    log.touch()
+    return script, log
+
+
+def make_client(tmp_path, request_timeout=5.0) -> MCPClient:
+    return MCPClient(Console(quiet=True), config_dir=tmp_path / "mcp", request_timeout=request_timeout)
+
+
+async def connect(client: MCPClient, fake_server) -> None:
+    script, log = fake_server
+    assert await client.add_server(
+        "fake", sys.executable, [str(script)], env={"FAKE_MCP_LOG": str(log)}
+    )
+
+
+class TestStdioConnection:
+    """Test request multiplexing over a real subprocess"""
+
+    def test_concurrent_calls_are_matched_to_their_responses(self, tmp_path, fake_server):
+        async def run():
+            client = make_client(tmp_path)
+            await connect(client, fake_server)
+            try:
+                start = time.perf_counter()
+                results = await asyncio.gather(*(
+                    client.call_tool("fake", "echo", {"text": f"call-{i}", "delay": 0.4 - i * 0.1})
+                    for i in range(4)
+                ))
+                return results, time.perf_counter() - start
+            finally:
+                await client.disconnect_all()
+
+        results, elapsed = asyncio.run(run())
+
+        assert [r["content"][0]["text"] for r in results] == [f"call-{i}" for i in range(4)]
+        assert elapsed < 0.9  # In flight together, not one after another
+
+    def test_request_timeout_leaves_connection_usable(self, tmp_path, fake_server):
+        async def run():
+            client = make_client(tmp_path, request_timeout=0.3)
+            await connect(client, fake_server)
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.call_tool("fake", "echo", {"text": "slow", "delay": 2})
+                result = await client.call_tool("fake", "echo", {"text": "fast"})
+                return result, client.get_tool_metrics()["fake.echo"]
+            finally:
+                await client.disconnect_all()
+
+        result, metrics = asyncio.run(run())
+
+        assert result["content"][0]["text"] == "fast"
+        assert (metrics["calls"], metrics["errors"]) == (2, 1)
+
+    def test_connection_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            MCPConnection()
+
+
+class TestCapabilitiesCache:
+    """Test that tools are listed once per server build"""
+
+    def test_reconnect_uses_cached_tools(self, tmp_path, fake_server):
+        _, log = fake_server
+
+        async def run():
+            seen = []
+            for _ in range(2):
+                client = make_client(tmp_path)
+                if "fake" in client._servers:
+                    assert await client.connect_server("fake")
+                else:
+                    await connect(client, fake_server)
+                seen.append([t.name for t in client.get_all_tools()])
+                await client.disconnect_all()
+            return seen
+
+        assert asyncio.run(run()) == [["echo"], ["echo"]]
+        assert log.read_text().splitlines() == ["tools/list"]
+
+
+class TestServerConfig:
+    """Test transport selection and rejection"""
+
+    def test_websocket_url_is_rejected(self, tmp_path):
+        client = make_client(tmp_path)
+
+        assert asyncio.run(client.add_server("ws", url="ws://localhost:9000/mcp", auto_connect=False)) is False
+        assert "ws" not in client._servers
+
+    def test_http_url_selects_http_transport(self, tmp_path):
+        client = make_client(tmp_path)
+
+        assert asyncio.run(client.add_server("api", url="https://example.com/mcp", auto_connect=False))
+        assert client._servers["api"].config.transport == MCPTransport.HTTP
+
+    def test_saved_websocket_config_is_skipped(self, tmp_path):
+        config_dir = tmp_path / "mcp"
+        config_dir.mkdir()
+        (config_dir / "servers.json").write_text(
+            '{"servers": {"ws": {"transport": "websocket", "url": "ws://x"},'
+            ' "local": {"transport": "stdio", "command": "true"}}}'
+        )
+
+        assert list(make_client(tmp_path)._servers) == ["local"]
@@ -17,6 +17,7 @@ from rich.syntax import Syntax
 from rich.panel import Panel
 
 from cli.config import CLIConfig
+from cli.file_walker import FileWalker, DEFAULT_MAX_RESULTS
 
 
 @dataclass
@@ -49,6 +50,7 @@ class ToolExecutor:
         self.working_dir = Path(config.working_directory).resolve()
         self.file_history: List[FileOperation] = []
         self.command_history: List[CommandResult] = []
+        self.file_walker = FileWalker(self.working_dir)
 
     def _resolve_path(self, path: str) -> Path:
         """Resolve path relative to working directory"""
@@ -199,7 +201,7 @@ class ToolExecutor:
             raise
 
     async def list_files(self, path: str = ".", pattern: str = "*") -> List[str]:
-        """List files in a directory"""
+        """List files in a directory (ignored directories and .gitignore'd files are skipped)"""
         dir_path = self._resolve_path(path)
 
         if not dir_path.exists():
@@ -208,56 +210,37 @@ class ToolExecutor:
         if not dir_path.is_dir():
             return [str(dir_path)]
 
-        files = []
-        for item in dir_path.glob(pattern):
-            rel_path = item.relative_to(self.working_dir)
-            files.append(str(rel_path))
-
-        return sorted(files)
+        items = await self.file_walker.list(dir_path, pattern)
+        return sorted(str(item.relative_to(self.working_dir)) for item in items)
 
     async def glob_files(self, pattern: str) -> List[str]:
-        """Find files matching a glob pattern"""
-        files = []
-        for item in self.working_dir.glob(pattern):
-            rel_path = item.relative_to(self.working_dir)
-            files.append(str(rel_path))
-        return sorted(files)
+        """
+        Find files and directories matching a glob pattern (Path.glob
+        semantics: "*.py" is top-level only, "**/*.py" recurses); ignored
+        directories and .gitignore'd entries are skipped.
+        """
+        files = await self.file_walker.glob(pattern)
+        return sorted(str(item.relative_to(self.working_dir)) for item in files)
 
     async def grep_files(
         self,
         pattern: str,
         path: str = ".",
-        file_pattern: str = "*"
+        file_pattern: str = "*",
+        max_results: int = DEFAULT_MAX_RESULTS
     ) -> List[Dict[str, Any]]:
-        """Search for pattern in files"""
-        import re
-
+        """Search for pattern in files, stopping after max_results matches"""
         dir_path = self._resolve_path(path)
-        results = []
 
-        try:
-            regex = re.compile(pattern)
-        except re.error:
-            # Treat as literal string if not valid regex
-            regex = re.compile(re.escape(pattern))
-
-        for file_path in dir_path.rglob(file_pattern):
-            if not file_path.is_file():
-                continue
+        if not dir_path.exists():
+            return []
 
-            try:
-                content = file_path.read_text(encoding='utf-8')
-                for i, line in enumerate(content.split('\n'), 1):
-                    if regex.search(line):
-                        results.append({
-                            "file": str(file_path.relative_to(self.working_dir)),
-                            "line": i,
-                            "content": line.strip()
-                        })
-            except (UnicodeDecodeError, PermissionError):
-                continue
-
-        return results
+        return await self.file_walker.grep(
+            pattern,
+            start=dir_path,
+            file_pattern=file_pattern,
+            max_results=max_results
+        )
 
     # ==================== Bash Commands ====================
 
@@ -7,6 +7,9 @@ Use this for development and testing to avoid API costs.
 Usage:
     python server.py [--port 8001] [--delay 0.5]
 
+    # Realistic non-streaming latency, 429s past 8 in-flight requests
+    python server.py --latency 1.5 --per-token-latency 0.01 --jitter 0.2 --max-concurrency 8
+
 Endpoints:
     POST /v1/messages - Create a message (streaming and non-streaming)
     GET /health - Health check
@@ -14,6 +17,7 @@ Endpoints:
 
 import argparse
 import asyncio
+import hashlib
 import json
 import time
 import uuid
@@ -46,6 +50,12 @@ class Config:
     response_delay: float = 0.02  # Delay between streaming chunks (seconds)
     typing_speed: int = 50  # Characters per chunk for streaming
     mock_responses: Dict[str, str] = {}  # Custom responses for specific prompts
+    latency: float = 0.0  # Base non-streaming latency (seconds); 0 = response_delay * 10
+    per_token_latency: float = 0.0  # Extra seconds per output token (non-streaming)
+    jitter: float = 0.0  # +/- fraction applied to simulated latency
+    max_concurrency: int = 0  # In-flight requests before answering 429 (0 = unlimited)
+    active_requests: int = 0
+    prompt_cache: set = set()  # Hashes of cache_control prefixes seen so far
 
 config = Config()
 
@@ -58,6 +68,11 @@ class ContentBlock(BaseModel):
     type: str = "text"
     text: str = ""
 
+class SystemBlock(BaseModel):
+    type: str = "text"
+    text: str = ""
+    cache_control: Optional[Dict[str, Any]] = None
+
 class Message(BaseModel):
     role: str
     content: str | List[ContentBlock]
@@ -66,7 +81,7 @@ class MessagesRequest(BaseModel):
     model: str
     max_tokens: int = 4096
     messages: List[Message]
-    system: Optional[str] = None
+    system: Optional[str | List[SystemBlock]] = None
     stream: bool = False
     temperature: Optional[float] = 0.7
     top_p: Optional[float] = None
@@ -77,6 +92,8 @@ class MessagesRequest(BaseModel):
 class Usage(BaseModel):
     input_tokens: int
     output_tokens: int
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
 
 class MessagesResponse(BaseModel):
     id: str
@@ -222,6 +239,47 @@ def count_tokens(text: str) -> int:
     return len(text) // 4 + 1
 
 
+def system_text(system: Optional[str | List[SystemBlock]]) -> str:
+    """Flatten a system prompt given as a string or a list of text blocks."""
+    if not system:
+        return ""
+    if isinstance(system, str):
+        return system
+    return "\n\n".join(block.text for block in system)
+
+
+def cached_prefix_tokens(model: str, system: Optional[str | List[SystemBlock]]) -> tuple:
+    """
+    Simulate prompt caching: the system blocks up to the last cache_control
+    breakpoint form the cached prefix.
+
+    Returns (cache_creation_tokens, cache_read_tokens).
+    """
+    if not system or isinstance(system, str):
+        return 0, 0
+    breakpoint_idx = max((i for i, b in enumerate(system) if b.cache_control), default=-1)
+    if breakpoint_idx < 0:
+        return 0, 0
+
+    prefix = "\n\n".join(block.text for block in system[:breakpoint_idx + 1])
+    tokens = count_tokens(prefix)
+    key = hashlib.sha256(f"{model}:{prefix}".encode()).hexdigest()
+    if key in config.prompt_cache:
+        return 0, tokens
+    config.prompt_cache.add(key)
+    return tokens, 0
+
+
+def simulated_latency(output_tokens: int) -> float:
+    """Seconds a non-streaming response takes under the configured latency model."""
+    if not config.latency and not config.per_token_latency:
+        return config.response_delay * 10
+    delay = config.latency + config.per_token_latency * output_tokens
+    if config.jitter:
+        delay *= 1 + random.uniform(-config.jitter, config.jitter)
+    return max(0.0, delay)
+
+
 def generate_message_id() -> str:
     """Generate a message ID similar to Anthropic's format."""
     return f"msg_{uuid.uuid4().hex[:24]}"
@@ -254,18 +312,32 @@ async def create_message(
     if not api_key:
         raise HTTPException(status_code=401, detail="Missing API key")
 
+    # Simulated rate limit on concurrent requests
+    if config.max_concurrency and config.active_requests >= config.max_concurrency:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": "1"},
+            content={
+                "type": "error",
+                "error": {"type": "rate_limit_error", "message": "Mock concurrency limit exceeded"}
+            }
+        )
+
+    system = system_text(request.system)
+
     # Generate mock response
-    response_text = get_mock_response(request.messages, request.system)
+    response_text = get_mock_response(request.messages, system)
 
-    # Calculate token usage
-    input_text = request.system or ""
+    # Calculate token usage (cached prefix is billed separately, as upstream)
+    cache_creation, cache_read = cached_prefix_tokens(request.model, request.system)
+    input_text = system
     for msg in request.messages:
         content = msg.content
         if isinstance(content, list):
             content = " ".join([c.text for c in content if hasattr(c, 'text')])
         input_text += content
 
-    input_tokens = count_tokens(input_text)
+    input_tokens = max(1, count_tokens(input_text) - cache_creation - cache_read)
     output_tokens = count_tokens(response_text)
 
     message_id = generate_message_id()
@@ -289,7 +361,11 @@ async def create_message(
         )
     else:
         # Non-streaming response
-        await asyncio.sleep(config.response_delay * 10)  # Simulate processing time
+        config.active_requests += 1
+        try:
+            await asyncio.sleep(simulated_latency(output_tokens))  # Simulate processing time
+        finally:
+            config.active_requests -= 1
 
         return MessagesResponse(
             id=message_id,
@@ -298,7 +374,12 @@ async def create_message(
             content=[ContentBlock(type="text", text=response_text)],
             model=request.model,
             stop_reason="end_turn",
-            usage=Usage(input_tokens=input_tokens, output_tokens=output_tokens)
+            usage=Usage(
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cache_creation_input_tokens=cache_creation,
+                cache_read_input_tokens=cache_read
+            )
         )
 
 
@@ -376,7 +457,7 @@ async def stream_response(
 @app.post("/v1/messages/count_tokens")
 async def count_tokens_endpoint(request: MessagesRequest):
     """Count tokens in a message (mock implementation)."""
-    input_text = request.system or ""
+    input_text = system_text(request.system)
     for msg in request.messages:
         content = msg.content
         if isinstance(content, list):
@@ -412,11 +493,37 @@ async def set_delay(delay: float):
     return {"status": "ok", "delay": delay}
 
 
+@app.post("/mock/set-latency")
+async def set_latency(
+    latency: float = 0.0,
+    per_token_latency: float = 0.0,
+    jitter: float = 0.0,
+    max_concurrency: int = 0
+):
+    """Set the non-streaming latency model and concurrency limit."""
+    config.latency = latency
+    config.per_token_latency = per_token_latency
+    config.jitter = jitter
+    config.max_concurrency = max_concurrency
+    return {"status": "ok"}
+
+
+@app.post("/mock/reset-cache")
+async def reset_prompt_cache():
+    """Forget all cached prompt prefixes."""
+    config.prompt_cache.clear()
+    return {"status": "ok"}
+
+
 @app.get("/mock/config")
 async def get_config():
     """Get current mock server configuration."""
     return {
         "response_delay": config.response_delay,
+        "latency": config.latency,
+        "per_token_latency": config.per_token_latency,
+        "jitter": config.jitter,
+        "max_concurrency": config.max_concurrency,
         "typing_speed": config.typing_speed,
         "custom_responses": list(config.mock_responses.keys())
     }
@@ -431,9 +538,17 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=8001, help="Port to run the server on")
     parser.add_argument("--host", type=str, default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--delay", type=float, default=0.02, help="Delay between streaming chunks")
+    parser.add_argument("--latency", type=float, default=0.0, help="Base non-streaming latency (seconds)")
+    parser.add_argument("--per-token-latency", type=float, default=0.0, help="Extra seconds per output token")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- fraction applied to latency")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="In-flight requests before 429 (0 = unlimited)")
 
     args = parser.parse_args()
     config.response_delay = args.delay
+    config.latency = args.latency
+    config.per_token_latency = args.per_token_latency
+    config.jitter = args.jitter
+    config.max_concurrency = args.max_concurrency
 
     print(f"""
 ============================================================
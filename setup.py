@@ -38,7 +38,7 @@ setup(
     author_email="team@bharatbuild.ai",
     url="https://github.com/bharatbuild/bharatbuild-ai",
     license="MIT",
-    packages=find_packages(),
+    packages=find_packages(exclude=["cli.tests"]),
     python_requires=">=3.9",
     install_requires=cli_requirements,
     extras_require={
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - CLI Context Compaction Benchmark
+Simulates a long agentic session and checks that per-turn context
+bookkeeping (add, should_compact, compact, get_messages) stays flat as
+history grows.
+
+Usage:
+    python cli_compaction_benchmark.py
+    python cli_compaction_benchmark.py --messages 5000 --max-ratio 3
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from rich.console import Console  # noqa: E402
+
+from cli.auto_compact import ContextCompactor, Message, MessageRole  # noqa: E402
+
+
+def make_message(i: int) -> Message:
+    """Rotate through user / assistant / tool messages of realistic sizes"""
+    kind = i % 3
+    if kind == 0:
+        return Message(role=MessageRole.USER, content=f"Step {i}: update src/app/module_{i}.py and run tests")
+    if kind == 1:
+        body = "\n".join(f"    line_{j} = {j}" for j in range(150))
+        return Message(
+            role=MessageRole.ASSISTANT,
+            content=f"- Modified 'src/app/module_{i}.py'\n```python\n{body}\n```\n" + "x" * 3000
+        )
+    output = "\n".join(f"test_{i}_{j} PASSED" for j in range(80))
+    return Message(role=MessageRole.TOOL, content=output, metadata={"tool_name": "Bash"})
+
+
+def run(messages: int, max_tokens: int, window: int) -> list:
+    compactor = ContextCompactor(Console(file=io.StringIO()), max_context_tokens=max_tokens)
+    turn_times = []
+
+    for i in range(messages):
+        start = time.perf_counter()
+        compactor.add_message(make_message(i))
+        if compactor.should_compact(max_tokens):
+            compactor.compact(target_tokens=max_tokens // 2)
+        compactor.get_messages()
+        turn_times.append((time.perf_counter() - start) * 1_000_000)
+
+    stats = compactor.get_stats()
+    print(f"Messages: {messages}, compacted segments: {stats['compacted_segments']}, "
+          f"live tokens: {stats['total_tokens']:,}")
+    return [statistics.median(turn_times[i:i + window]) for i in range(0, messages, window)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI context compaction")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--max-tokens", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=200, help="Turns per reported window")
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="Fail if the last window's median exceeds the first by this factor")
+    args = parser.parse_args()
+
+    medians = run(args.messages, args.max_tokens, args.window)
+
+    for n, median in enumerate(medians):
+        print(f"  turns {n * args.window:>5}-{(n + 1) * args.window - 1:<5}  median {median:8.1f} us/turn")
+
+    # Skip the first window: it includes warm-up before the first compaction
+    baseline = medians[1] if len(medians) > 1 else medians[0]
+    ratio = medians[-1] / max(baseline, 0.001)
+    print(f"\nLast/first median ratio: {ratio:.2f} (budget {args.max_ratio})")
+
+    if ratio > args.max_ratio:
+        print("FAIL: per-turn overhead grows with history")
+        sys.exit(1)
+    print("PASS: per-turn overhead is flat")
+
+
+if __name__ == "__main__":
+    main()
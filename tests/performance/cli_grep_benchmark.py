@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - CLI Grep/Glob Benchmark
+Compare the naive rglob-based search against the ignore-aware FileWalker.
+
+Runs against an existing React project (with node_modules installed) or
+generates a synthetic one.
+
+Usage:
+    python cli_grep_benchmark.py --project ~/code/my-react-app
+    python cli_grep_benchmark.py --synthetic --packages 800
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from cli.file_walker import FileWalker  # noqa: E402
+
+
+def build_synthetic_project(root: Path, packages: int, src_files: int) -> Path:
+    """Create a React-like tree with a populated node_modules"""
+    rng = random.Random(42)
+    (root / ".gitignore").write_text("node_modules/\nbuild/\n*.log\n")
+
+    src = root / "src" / "components"
+    src.mkdir(parents=True)
+    for i in range(src_files):
+        body = "\n".join(
+            f"const value{j} = useState({j});" if rng.random() < 0.05 else f"// line {j}"
+            for j in range(120)
+        )
+        (src / f"Component{i}.tsx").write_text(f"import React from 'react';\n{body}\n")
+
+    for p in range(packages):
+        pkg = root / "node_modules" / f"pkg-{p}" / "dist"
+        pkg.mkdir(parents=True)
+        (pkg / "index.js").write_text("function useState(x) { return x; }\n" * 400)
+        (pkg / "index.d.ts").write_text("export declare function useState<T>(x: T): T;\n" * 50)
+        (pkg.parent / "package.json").write_text(f'{{"name": "pkg-{p}", "version": "1.0.0"}}')
+
+    build = root / "build" / "static"
+    build.mkdir(parents=True)
+    (build / "main.js").write_text("useState();" * 100000)
+    return root
+
+
+def naive_grep(root: Path, pattern: str, file_pattern: str = "*"):
+    """The previous ToolExecutor.grep_files implementation"""
+    regex = re.compile(pattern)
+    results = []
+    for file_path in root.rglob(file_pattern):
+        if not file_path.is_file():
+            continue
+        try:
+            content = file_path.read_text(encoding="utf-8")
+            for i, line in enumerate(content.split("\n"), 1):
+                if regex.search(line):
+                    results.append((str(file_path.relative_to(root)), i))
+        except (UnicodeDecodeError, PermissionError):
+            continue
+    return results
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<38} {elapsed:>10.1f} ms   ({len(result)} results)")
+    return elapsed
+
+
+def run(root: Path, pattern: str, max_results: int):
+    walker = FileWalker(root)
+
+    print(f"\nProject: {root}")
+    print(f"Pattern: {pattern!r}\n")
+
+    naive = timed("naive rglob grep (all files)", lambda: naive_grep(root, pattern))
+    walker_all = timed(
+        "FileWalker grep (no cap)",
+        lambda: walker.grep_sync(pattern, max_results=10**9)
+    )
+    walker_capped = timed(
+        f"FileWalker grep (max_results={max_results})",
+        lambda: walker.grep_sync(pattern, max_results=max_results)
+    )
+    timed("naive rglob glob **/*.tsx", lambda: list(root.glob("**/*.tsx")))
+    timed("FileWalker glob **/*.tsx", lambda: list(walker.iter_glob("**/*.tsx")))
+
+    async def concurrent():
+        return await asyncio.gather(*(walker.grep(pattern, max_results=max_results) for _ in range(8)))
+
+    timed("8 concurrent async greps", lambda: asyncio.run(concurrent()))
+
+    print(f"\n  Speedup (uncapped): {naive / max(walker_all, 0.001):.1f}x")
+    print(f"  Speedup (capped):   {naive / max(walker_capped, 0.001):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI grep/glob")
+    parser.add_argument("--project", type=Path, help="Existing project to search")
+    parser.add_argument("--synthetic", action="store_true", help="Generate a synthetic React project")
+    parser.add_argument("--packages", type=int, default=500, help="node_modules packages to generate")
+    parser.add_argument("--src-files", type=int, default=300, help="Source files to generate")
+    parser.add_argument("--pattern", default="useState", help="Regex to search for")
+    parser.add_argument("--max-results", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.project:
+        run(args.project.resolve(), args.pattern, args.max_results)
+        return
+
+    tmp = Path(tempfile.mkdtemp(prefix="bb-grep-bench-"))
+    try:
+        print(f"Generating synthetic project ({args.packages} packages, {args.src_files} source files)...")
+        build_synthetic_project(tmp, args.packages, args.src_files)
+        run(tmp, args.pattern, args.max_results)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - CLI Startup Benchmark
+Measures cold-start import cost of the bharatbuild CLI with
+`python -X importtime` and fails when it regresses past a budget.
+
+Scenarios:
+    version   - `bharatbuild --version`
+    headless  - modules loaded before a one-shot prompt is sent
+
+The headless path always needs asyncio and rich.console (the agent loop and
+its output). Their cost depends mostly on the machine, so it is reported as
+the runtime floor and the budget covers only what the CLI imports on top.
+
+Usage:
+    python cli_startup_benchmark.py
+    python cli_startup_benchmark.py --budget-version 40 --budget-headless 60 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# An installed CLI runs from compiled bytecode; without it every run would
+# also measure compiling the CLI sources
+ENV = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+SCENARIOS = {
+    "version": (
+        "import sys; sys.argv = ['bharatbuild', '--version']\n"
+        "import cli.main\n"
+        "try:\n"
+        "    cli.main.create_parser().parse_args()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+    "headless": (
+        "import cli.main, cli.auth, cli.config, cli.agentic_cli\n"
+    ),
+}
+
+# Imports a scenario needs regardless of the CLI code (excluded from its budget)
+RUNTIME_FLOOR = {
+    "headless": "import asyncio, rich.console",
+}
+
+# Modules that must not be imported on these paths
+FORBIDDEN = {
+    "version": ["rich", "httpx", "prompt_toolkit", "cli.auth", "cli.templates"],
+    "headless": ["prompt_toolkit", "cli.templates", "cli.themes", "cli.vim_mode",
+                 "cli.plugins", "cli.mcp_client", "markdown_it",
+                 "httpx", "http.server", "webbrowser", "rich.table", "rich.prompt"],
+}
+
+
+def measure(code: str, baseline: frozenset = frozenset()):
+    """
+    Run code in a fresh interpreter; return (import ms, imported modules).
+
+    Modules in `baseline` (those an empty interpreter already loads via
+    site/sitecustomize) are excluded so the figure reflects the CLI only.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        env=ENV,
+        capture_output=True,
+        text=True
+    )
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  <self us> | <cumulative us> | <indented module name>"
+        self_us, _, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if name in baseline:
+            continue
+        total_us += int(self_us)
+        modules.add(name)
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-version", type=float, default=25.0, help="ms")
+    parser.add_argument("--budget-headless", type=float, default=60.0, help="ms above the runtime floor")
+    args = parser.parse_args()
+
+    budgets = {"version": args.budget_version, "headless": args.budget_headless}
+    failed = False
+
+    _, baseline = measure("pass")
+    baseline = frozenset(baseline)
+
+    for scenario, code in SCENARIOS.items():
+        measure(code)  # warm-up: writes .pyc files
+        excluded = baseline
+        floor = RUNTIME_FLOOR.get(scenario)
+        if floor:
+            floor_ms = statistics.median(measure(floor, baseline)[0] for _ in range(args.runs))
+            excluded = baseline | measure(floor)[1]
+            print(f"{scenario:<10} runtime floor {floor_ms:8.1f} ms ({floor[len('import '):]}), not budgeted")
+
+        samples = []
+        modules = set()
+        for _ in range(args.runs):
+            ms, modules = measure(code, excluded)
+            samples.append(ms)
+
+        median = statistics.median(samples)
+        status = "OK" if median <= budgets[scenario] else "OVER BUDGET"
+        print(f"{scenario:<10} median import time {median:8.1f} ms "
+              f"(budget {budgets[scenario]:.0f} ms, {len(modules)} modules)  {status}")
+        if median > budgets[scenario]:
+            failed = True
+
+        leaked = sorted(
+            name for name in modules
+            if any(name == f or name.startswith(f + ".") for f in FORBIDDEN[scenario])
+        )
+        if leaked:
+            failed = True
+            print(f"  eagerly imported: {', '.join(leaked[:10])}")
+
+    if failed:
+        print("\nFAIL: CLI cold start regressed")
+        sys.exit(1)
+    print("\nPASS")
+
+
+if __name__ == "__main__":
+    main()
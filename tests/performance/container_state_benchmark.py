@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Container State Cleanup Tick Benchmark
+Seeds fakeredis with container records and compares one cleanup tick
+(get_expired_containers + get_containers_to_pause) using the previous
+SCAN + GET-per-key implementation against the sorted-set indexes.
+
+Usage:
+    python container_state_benchmark.py
+    python container_state_benchmark.py --containers 50000 --idle-fraction 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+import fakeredis  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.container_state import (  # noqa: E402
+    ContainerInfo,
+    ContainerState,
+    ContainerStateService,
+)
+
+
+async def seed(service: ContainerStateService, containers: int, idle_fraction: float):
+    """Write records through save_container so the indexes are populated"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    idle_after = settings.CONTAINER_IDLE_TIMEOUT_SECONDS
+
+    for i in range(containers):
+        idle = rng.random() < idle_fraction
+        last = now - timedelta(seconds=idle_after + 60 if idle else rng.randint(0, 120))
+        await service.save_container(ContainerInfo(
+            container_id=f"container-{i}",
+            project_id=f"project-{i}",
+            user_id=f"user-{i % 2000}",
+            state=ContainerState.RUNNING.value,
+            created_at=(last - timedelta(minutes=5)).isoformat(),
+            last_activity=last.isoformat(),
+            port_mappings={3000: 10000 + i % 20000},
+        ))
+    service._local_cache.clear()
+
+
+async def legacy_scan(redis):
+    """The previous SCAN + GET-per-key walk (run once per query)"""
+    prefix = settings.REDIS_CONTAINER_STATE_PREFIX
+    records = []
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor, match=f"{prefix}*", count=100)
+        for key in keys:
+            if ":heartbeat" in key or key.startswith(f"{prefix}index:"):
+                continue
+            data = await redis.get(key)
+            if data:
+                records.append(ContainerInfo.from_dict(json.loads(data)))
+        if cursor == 0:
+            break
+    return records
+
+
+async def legacy_tick(redis):
+    idle_timeout = settings.CONTAINER_IDLE_TIMEOUT_SECONDS
+    max_lifetime = settings.CONTAINER_MAX_LIFETIME_SECONDS
+    pause_after = settings.CONTAINER_PAUSE_AFTER_IDLE_SECONDS
+
+    expired = [i for i in await legacy_scan(redis) if i.is_expired(idle_timeout, max_lifetime)]
+    to_pause = [
+        i for i in await legacy_scan(redis)
+        if i.state == ContainerState.RUNNING.value and i.should_pause(pause_after)
+    ]
+    return expired, to_pause
+
+
+async def indexed_tick(service: ContainerStateService):
+    return await service.get_expired_containers(), await service.get_containers_to_pause()
+
+
+async def timed(label: str, tick, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await tick()
+        samples.append((time.perf_counter() - start) * 1000)
+    best = min(samples)
+    print(f"  {label:<28} {best:>10.1f} ms/tick   "
+          f"({len(result[0])} expired, {len(result[1])} to pause)")
+    return best, result
+
+
+async def main_async(args):
+    service = ContainerStateService()
+    service._redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    service._initialized = True
+
+    print(f"Seeding {args.containers:,} containers ({args.idle_fraction:.0%} idle)...")
+    await seed(service, args.containers, args.idle_fraction)
+
+    print()
+    legacy_ms, legacy = await timed("SCAN + GET per key", lambda: legacy_tick(service._redis), args.runs)
+    indexed_ms, indexed = await timed("ZRANGEBYSCORE + MGET", lambda: indexed_tick(service), args.runs)
+
+    same = (
+        sorted(i.project_id for i in legacy[0]) == sorted(i.project_id for i in indexed[0])
+        and sorted(i.project_id for i in legacy[1]) == sorted(i.project_id for i in indexed[1])
+    )
+    print(f"\n  Speedup: {legacy_ms / max(indexed_ms, 0.001):.1f}x")
+    print(f"  Same candidates: {same}")
+    await service._redis.aclose()
+
+    if not same:
+        print("FAIL: indexed tick returned different candidates")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark container cleanup ticks")
+    parser.add_argument("--containers", type=int, default=20000)
+    parser.add_argument("--idle-fraction", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=3)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
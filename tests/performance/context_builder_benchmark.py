@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Bolt Context Builder Benchmark
+Generates a synthetic project (2,000 files by default) and times
+BoltContextBuilder.build_context for a series of prompts, as the Bolt chat
+endpoints call it:
+
+- legacy: the previous per-request path (lower() + substring search of
+  every file for every keyword, tech stack and file tree rebuilt each call)
+- cold: the indexed builder's first request for a project (builds the index)
+- warm: later requests against the cached index, unchanged files
+- edit: a request after one file changed (one file re-indexed)
+
+Also reports how much of the token budget each path fills and how many
+files it includes.
+
+Usage:
+    python context_builder_benchmark.py
+    python context_builder_benchmark.py --files 5000 --lines 300 --runs 20
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+DOMAINS = ["user", "auth", "cart", "checkout", "order", "product", "invoice", "payment", "profile",
+           "search", "review", "shipping", "coupon", "inventory", "report", "notification"]
+KINDS = ["Form", "List", "Card", "Modal", "Service", "Store", "Hook", "Table", "Page", "Api"]
+PROMPTS = [
+    "fix the checkout total when a coupon is applied",
+    "add pagination to the order list page",
+    "the user profile form does not save the avatar",
+    "show shipping status in the invoice card",
+    "refactor the payment service to retry failed charges",
+]
+
+
+def make_project(n_files: int, lines: int, seed: int = 3):
+    rng = random.Random(seed)
+    files = [{
+        "path": "package.json",
+        "content": json.dumps({"dependencies": {"react": "18", "vite": "5"}, "devDependencies": {"typescript": "5"}}),
+        "language": "json",
+    }]
+    for i in range(n_files - 1):
+        domain, kind = rng.choice(DOMAINS), rng.choice(KINDS)
+        name = f"{domain.title()}{kind}{i}"
+        body = []
+        for line in range(lines):
+            other = rng.choice(DOMAINS)
+            body.append(f"  const {other}{rng.choice(KINDS)}{line} = use{domain.title()}State('{other}', {line})")
+        files.append({
+            "path": f"src/{domain}/{name}.tsx",
+            "content": f"export function {name}() {{\n" + "\n".join(body) + "\n}\n",
+            "language": "typescript",
+        })
+    return files
+
+
+class LegacyContextBuilder:
+    """The previous build_context: substring scan of every file per keyword, per request"""
+
+    def __init__(self):
+        from app.modules.bolt.context_builder import BoltContextBuilder
+        self._helpers = BoltContextBuilder()
+
+    def _relevance(self, file, keywords, selected):
+        score = 0.0
+        if selected and file["path"] == selected:
+            score += 100
+        name = file["path"].lower()
+        for k in keywords:
+            if k in name:
+                score += 30
+        content = (file.get("content") or "").lower()
+        for k in keywords:
+            if k in content:
+                score += 20
+        if re.search(r"\.(tsx?|jsx?)$", file["path"]):
+            score += 15
+        if "component" in name:
+            score += 10
+        if re.search(r"\.(test|spec)\.", file["path"]):
+            score -= 50
+        return max(0, score)
+
+    def build_context(self, prompt, files, max_files=10, max_tokens=50000):
+        h = self._helpers
+        h._detect_project_type(files)
+        h._detect_tech_stack(files)
+        h._build_file_tree(files)
+        h._extract_dependencies(files)
+        words = re.sub(r"[^\w\s]", " ", prompt.lower()).split()
+        keywords = {w for w in words if len(w) > 2 and w not in h.STOP_WORDS}
+        scored = [(self._relevance(f, keywords, None), f) for f in files]
+        scored = sorted([s for s in scored if s[0] > 0], key=lambda s: s[0], reverse=True)[:max_files]
+        selected, total = [], 0
+        for score, f in scored:
+            tokens = len(f["content"]) // 4
+            if total + tokens > max_tokens:
+                break
+            selected.append(f)
+            total += tokens
+        return selected, total
+
+
+def timed(fn, runs):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Bolt context building on a large project")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=120, help="Lines per generated file")
+    parser.add_argument("--max-tokens", type=int, default=50000)
+    parser.add_argument("--max-files", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    from app.modules.bolt.context_builder import BoltContextBuilder
+    from app.modules.bolt.context_index import ContextIndexCache
+
+    files = make_project(args.files, args.lines)
+    size_mb = sum(len(f["content"]) for f in files) / 1e6
+    print(f"Project: {len(files):,} files, {size_mb:.1f} MB, budget {args.max_tokens:,} tokens, "
+          f"max {args.max_files} files (median of {args.runs} runs per prompt)\n")
+
+    legacy = LegacyContextBuilder()
+    builder = BoltContextBuilder(index_cache=ContextIndexCache())
+    kwargs = dict(max_files=args.max_files, max_tokens=args.max_tokens)
+
+    start = time.perf_counter()
+    builder.build_context(PROMPTS[0], files, index_key="bench", **kwargs)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    print(f"  {'prompt':<52}{'legacy':>10}{'warm':>9}{'speedup':>9}{'files':>8}{'tokens used':>14}")
+    legacy_all, warm_all = [], []
+    for prompt in PROMPTS:
+        legacy_ms, (legacy_files, legacy_tokens) = timed(lambda: legacy.build_context(prompt, files, **kwargs), args.runs)
+        warm_ms, context = timed(
+            lambda: builder.build_context(prompt, files, index_key="bench", **kwargs), args.runs)
+        tokens = sum(len(f.content) // 4 for f in context.selected_files)
+        legacy_all.append(legacy_ms)
+        warm_all.append(warm_ms)
+        print(f"  {prompt[:50]:<52}{legacy_ms:>8.1f}ms{warm_ms:>7.1f}ms{legacy_ms / max(warm_ms, 0.01):>8.1f}x"
+              f"{len(legacy_files):>4}/{len(context.selected_files):<3}{legacy_tokens:>7,}/{tokens:<6,}")
+
+    edited = list(files)
+    target = edited[len(edited) // 2]
+    edits = []
+    for i in range(args.runs):
+        edited[len(edited) // 2] = {**target, "content": target["content"] + f"\n// edit {i} checkout coupon\n"}
+        start = time.perf_counter()
+        builder.build_context(PROMPTS[0], edited, index_key="bench", **kwargs)
+        edits.append((time.perf_counter() - start) * 1000)
+
+    print(f"\n  Cold (index build): {cold_ms:.0f}ms")
+    print(f"  Warm median:        {statistics.median(warm_all):.1f}ms vs legacy {statistics.median(legacy_all):.1f}ms "
+          f"({statistics.median(legacy_all) / max(statistics.median(warm_all), 0.01):.1f}x)")
+    print(f"  One file edited:    {statistics.median(edits):.1f}ms")
+    print("  (files/tokens columns: legacy/indexed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Fixer Context Benchmark
+Generates a synthetic TypeScript project on disk and times what the auto-fix
+loop does per attempt: ContextEngine.scan_project_files() followed by
+build_context() for an error in one file.
+
+- legacy: the previous path (walk and read every file, re-parse every
+  import and stat each import candidate on every call)
+- cold: first call against the cached project snapshot
+- warm: later calls with no changes
+- edit: a call after the fixer rewrote one file (write notification)
+
+Usage:
+    python context_engine_benchmark.py
+    python context_engine_benchmark.py --files 5000 --runs 10 --dir /mnt/efs/bench
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+DOMAINS = ["user", "auth", "cart", "checkout", "order", "product", "invoice", "payment", "profile", "search"]
+
+
+def make_project(root: Path, n_files: int, lines: int, seed: int = 5):
+    rng = random.Random(seed)
+    (root / "package.json").write_text('{"dependencies": {"react": "18"}}')
+    paths = [f"src/{rng.choice(DOMAINS)}/Module{i}.tsx" for i in range(n_files)]
+    for i, path in enumerate(paths):
+        imports = [f"import {{ Module{j} }} from '../{Path(paths[j]).parent.name}/Module{j}'"
+                   for j in rng.sample(range(n_files), 6) if j != i]
+        imports.append("import React from 'react'")
+        body = [f"  const value{line} = Module{i}Helper({line})" for line in range(lines)]
+        full = root / path
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_text("\n".join(imports) + f"\nexport function Module{i}() {{\n" + "\n".join(body) + "\n}\n")
+    return paths
+
+
+def legacy_engine(project):
+    """ContextEngine with the previous uncached scan, graph and file lookups"""
+    from app.modules.automation.context_engine import ContextEngine
+    from app.modules.automation.context_snapshot import SCAN_EXTENSIONS
+
+    class LegacyContextEngine(ContextEngine):
+        def scan_project_files(self, extensions=None):
+            return super().scan_project_files(extensions=sorted(SCAN_EXTENSIONS))
+
+        def _build_import_graph(self, all_files):
+            self._import_graph.clear()
+            for file_info in all_files:
+                path = file_info.get("path", "")
+                content = file_info.get("content", "") or self._read_file(path)
+                if content:
+                    self._import_graph[path].update(self._extract_imports(path, content))
+
+        def _file_exists(self, path):
+            return (self.project_path / path).exists()
+
+    return LegacyContextEngine(str(project))
+
+
+def fix_attempt(engine, error_file):
+    files = engine.scan_project_files()
+    return engine.build_context(
+        user_message="Fix error",
+        errors=[{"message": f"TypeError at {error_file}:3", "file": error_file, "line": 3, "source": "build"}],
+        terminal_logs=[],
+        all_files=files,
+    )
+
+
+def timed(fn, runs):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixer context building with and without the project snapshot")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=80, help="Lines per generated file")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--dir", default=None, help="Where to generate the project (e.g. an EFS mount)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+    from app.modules.automation.context_engine import ContextEngine
+    from app.modules.automation.context_snapshot import context_snapshots, notify_file_written
+
+    project = Path(tempfile.mkdtemp(prefix="ctx-bench-", dir=args.dir))
+    try:
+        paths = make_project(project, args.files, args.lines)
+        error_file = paths[len(paths) // 2]
+        size_mb = sum(f.stat().st_size for f in project.rglob("*") if f.is_file()) / 1e6
+        print(f"Project: {args.files:,} files, {size_mb:.1f} MB at {project} (median of {args.runs} runs)\n")
+
+        legacy_ms, legacy_payload = timed(lambda: fix_attempt(legacy_engine(project), error_file), args.runs)
+
+        start = time.perf_counter()
+        fix_attempt(ContextEngine(str(project)), error_file)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        warm_ms, payload = timed(lambda: fix_attempt(ContextEngine(str(project)), error_file), args.runs)
+
+        edits = []
+        target = project / error_file
+        for i in range(args.runs):
+            target.write_text(target.read_text() + f"\n// fix attempt {i}\n")
+            notify_file_written(target)
+            start = time.perf_counter()
+            fix_attempt(ContextEngine(str(project)), error_file)
+            edits.append((time.perf_counter() - start) * 1000)
+        edit_ms = statistics.median(edits)
+
+        same = sorted(payload.relevant_files) == sorted(legacy_payload.relevant_files)
+        print(f"  {'path':<28}{'per fix attempt':>16}")
+        print(f"  {'legacy (walk + read all)':<28}{legacy_ms:>14.1f}ms")
+        print(f"  {'snapshot, cold':<28}{cold_ms:>14.1f}ms")
+        print(f"  {'snapshot, warm':<28}{warm_ms:>14.1f}ms   ({legacy_ms / max(warm_ms, 0.01):.1f}x)")
+        print(f"  {'snapshot, one file edited':<28}{edit_ms:>14.1f}ms   ({legacy_ms / max(edit_ms, 0.01):.1f}x)")
+        print(f"\n  Same relevant files as legacy: {same} ({len(payload.relevant_files)} files)")
+        print(f"  Snapshot cache: {context_snapshots.get_stats()}")
+    finally:
+        shutil.rmtree(project, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Document Section Generation Benchmark
+Times outline + section generation for one document against the mock
+Claude API with realistic latency, comparing the previous fixed batches of
+3 (with a 1s sleep between batches and the outline resent in every prompt)
+against the sliding-window pipeline with a prompt-cached shared context.
+
+By default a mock server is started on a free port; pass --base-url to use
+one that is already running.
+
+Usage:
+    python document_generation_benchmark.py
+    python document_generation_benchmark.py --latency 2.0 --max-concurrency 6
+    python document_generation_benchmark.py --base-url http://localhost:8001 --document srs
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+PROJECT_DATA = {
+    "project_name": "Smart Campus Attendance System",
+    "project_type": "Web Application",
+    "description": "Face-recognition based attendance tracking for colleges",
+    "technologies": {"frontend": ["React", "TypeScript"], "backend": ["FastAPI", "PostgreSQL"]},
+    "features": [f"Feature {i}: attendance workflow step {i}" for i in range(12)],
+    "api_endpoints": [{"method": "GET", "path": f"/api/v1/resource{i}"} for i in range(10)],
+    "database_tables": [f"table_{i}" for i in range(8)],
+}
+
+
+def start_mock(args) -> tuple:
+    """Launch mock-claude-api/server.py on a free port; return (process, base_url)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    proc = subprocess.Popen(
+        [
+            sys.executable, "server.py", "--host", "127.0.0.1", "--port", str(port),
+            "--latency", str(args.latency), "--per-token-latency", str(args.per_token_latency),
+            "--jitter", str(args.jitter), "--max-concurrency", str(args.max_concurrency),
+        ],
+        cwd=REPO_ROOT / "mock-claude-api",
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{base_url}/health", timeout=1)
+            return proc, base_url
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("mock server did not start")
+
+
+async def legacy_sections(agent, sections, outline, document_type, max_retries):
+    """The previous _generate_sections_parallel: batches of 3, 1s between batches"""
+    ai_sections = [s for s in sections if s.get("type", "generate") == "generate"]
+    for i in range(0, len(ai_sections), 3):
+        batch = ai_sections[i:i + 3]
+        await asyncio.gather(*(
+            agent._generate_single_section_with_retry(s, outline, PROJECT_DATA, document_type, None, max_retries)
+            for s in batch
+        ), return_exceptions=True)
+        if i + 3 < len(ai_sections):
+            await asyncio.sleep(1.0)
+    return len(ai_sections)
+
+
+async def run(args, base_url: str):
+    os.environ["ANTHROPIC_BASE_URL"] = base_url
+    from app.modules.agents.chunked_document_agent import ChunkedDocumentAgent, DocumentType, _get_srs_structure
+
+    document_type = DocumentType(args.document)
+    agent = ChunkedDocumentAgent()
+    if document_type == DocumentType.SRS:
+        structure = _get_srs_structure(PROJECT_DATA)
+    else:
+        structure = agent.DOCUMENT_STRUCTURES[document_type]
+    sections = structure["sections"]
+    ai_count = sum(1 for s in sections if s.get("type", "generate") == "generate")
+    print(f"Document: {document_type.value} ({len(sections)} sections, {ai_count} AI-generated)")
+    print(f"Mock:     {base_url}\n")
+
+    # Legacy: everything emitted at the end, after the last batch
+    agent.reset_token_tracking()
+    start = time.perf_counter()
+    outline = await agent._generate_document_outline(document_type, structure, PROJECT_DATA)
+    await legacy_sections(agent, sections, outline, document_type, args.max_retries)
+    legacy_total = time.perf_counter() - start
+    legacy_usage = agent.get_token_usage()
+    print(f"  {'fixed batches of 3 + sleep':<30} total {legacy_total:7.2f}s   first section {legacy_total:7.2f}s   "
+          f"input tokens {legacy_usage['input_tokens']:>8,}")
+
+    # Sliding window, ordered stream, cached shared context
+    agent.reset_token_tracking()
+    throttles = agent.claude.throttle_count
+    start = time.perf_counter()
+    first = None
+    outline = await agent._generate_document_outline(document_type, structure, PROJECT_DATA)
+    shared_context = agent._build_section_context(outline, PROJECT_DATA)
+    async for _ in agent._stream_sections(
+        sections, outline, PROJECT_DATA, document_type, None, args.max_retries, shared_context
+    ):
+        if first is None:
+            first = time.perf_counter() - start
+    window_total = time.perf_counter() - start
+    window_usage = agent.get_token_usage()
+    print(f"  {'sliding window + cache':<30} total {window_total:7.2f}s   first section {first:7.2f}s   "
+          f"input tokens {window_usage['input_tokens']:>8,} (+{window_usage['cache_read_tokens']:,} cached)")
+    print(f"\n  Throttled requests: {agent.claude.throttle_count - throttles}")
+    print(f"  Speedup: {legacy_total / max(window_total, 0.001):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document section generation")
+    parser.add_argument("--base-url", help="Use an already running mock server")
+    parser.add_argument("--document", default="project_report",
+                        choices=["project_report", "srs", "sds", "viva_qa", "ppt"])
+    parser.add_argument("--latency", type=float, default=1.5, help="Base response latency (seconds)")
+    parser.add_argument("--per-token-latency", type=float, default=0.002, help="Seconds per output token")
+    parser.add_argument("--jitter", type=float, default=0.3, help="+/- latency fraction")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Mock 429 threshold (0 = unlimited)")
+    parser.add_argument("--max-retries", type=int, default=3)
+    args = parser.parse_args()
+
+    proc = None
+    base_url = args.base_url
+    if not base_url:
+        proc, base_url = start_mock(args)
+    try:
+        asyncio.run(run(args, base_url))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
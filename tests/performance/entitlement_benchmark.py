@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Entitlement Snapshot Benchmark
+Counts database round trips for the auth and limit checks one generation
+request runs (get_current_user, check_all_limits, get_user_limits,
+check_feature_access("project_generation"), check_project_limit) for a free
+user, a subscribed user and a user who purchased tokens, and compares:
+
+- legacy: the previous checks (User row per request, purchase/balance/
+  subscription/plan queries per limit lookup, flag/purchase/plan queries
+  per feature check)
+- snapshot: the same checks reading the cached entitlement snapshot
+  (app.modules.auth.entitlements), cold and warm
+
+Runs against a temporary SQLite database, so the time column only shows
+Python overhead; multiply the saved round trips by the database RTT for
+the production saving.
+
+Usage:
+    python entitlement_benchmark.py
+    python entitlement_benchmark.py --requests 500 --rtt-ms 1.5
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+async def legacy_get_current_user(user_id, db):
+    from sqlalchemy import select
+    from app.models.user import User
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalar_one_or_none()
+
+
+async def legacy_get_user_limits(user, db):
+    """The previous get_user_limits: purchase, balance, subscription and plan queries"""
+    from sqlalchemy import and_, select
+    from app.models.billing import Plan, Subscription, SubscriptionStatus
+    from app.models.token_balance import TokenBalance, TokenPurchase
+    from app.modules.auth.usage_limits import FREE_LIMITS, TOKEN_PURCHASE_LIMITS, build_user_limits
+
+    purchase = (await db.execute(select(TokenPurchase).where(and_(
+        TokenPurchase.user_id == user.id,
+        TokenPurchase.payment_status == "success",
+        TokenPurchase.is_expired == False
+    )).limit(1))).scalar_one_or_none()
+    if not purchase:
+        purchase = (await db.execute(select(TokenBalance).where(and_(
+            TokenBalance.user_id == user.id, TokenBalance.premium_tokens > 0
+        )))).scalar_one_or_none()
+    if purchase:
+        return TOKEN_PURCHASE_LIMITS
+    subscription = (await db.execute(select(Subscription).join(Plan).where(and_(
+        Subscription.user_id == user.id, Subscription.status == SubscriptionStatus.ACTIVE
+    )))).scalar_one_or_none()
+    if not subscription:
+        return FREE_LIMITS
+    plan = (await db.execute(select(Plan).where(Plan.id == subscription.plan_id))).scalar_one_or_none()
+    return build_user_limits(False, plan)
+
+
+async def legacy_check_feature_access(db, user, feature_name):
+    """The previous check_feature_access: global flag, purchase and plan queries"""
+    from app.modules.auth.feature_flags import (
+        FREE_TIER_FEATURES, get_global_feature_flag, get_user_plan, has_token_purchase
+    )
+    if not await get_global_feature_flag(db, feature_name):
+        return False
+    if await has_token_purchase(db, str(user.id)):
+        return True
+    plan = await get_user_plan(db, str(user.id))
+    return (plan.feature_flags or {} if plan else FREE_TIER_FEATURES).get(feature_name, False)
+
+
+async def generation_request(db, user_id, credentials, legacy):
+    """The auth and limit checks in front of one project generation"""
+    from app.modules.auth import usage_limits
+    from app.modules.auth.dependencies import get_current_user
+    from app.modules.auth.feature_flags import check_feature_access
+
+    if legacy:
+        # check_all_limits and check_project_limit look up limits internally too
+        cached_get_user_limits = usage_limits.get_user_limits
+        usage_limits.get_user_limits = legacy_get_user_limits
+        try:
+            user = await legacy_get_current_user(user_id, db)
+            await usage_limits.check_all_limits(user, db)
+            await legacy_get_user_limits(user, db)
+            await legacy_check_feature_access(db, user, "project_generation")
+            await usage_limits.check_project_limit(user, db)
+        finally:
+            usage_limits.get_user_limits = cached_get_user_limits
+        return
+
+    user = await get_current_user(credentials, db)
+    await usage_limits.check_all_limits(user, db)
+    await usage_limits.get_user_limits(user, db)
+    await check_feature_access(db, user, "project_generation")
+    await usage_limits.check_project_limit(user, db)
+
+
+async def setup(engine):
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.core.database import Base
+    from app.models.billing import Plan, PlanType, Subscription, SubscriptionStatus
+    from app.models.token_balance import TokenPurchase
+    from app.models.user import User
+    import app.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        users = {name: User(email=f"{name}@bench.local", is_active=True) for name in ("free", "subscribed", "purchased")}
+        db.add_all(users.values())
+        plan = Plan(name="Student", slug="student", plan_type=PlanType.STUDENT, price=0,
+                    token_limit=500000, project_limit=3, feature_flags={"project_generation": True})
+        db.add(plan)
+        await db.flush()
+        now = datetime.utcnow()
+        db.add(Subscription(user_id=users["subscribed"].id, plan_id=plan.id, status=SubscriptionStatus.ACTIVE,
+                            current_period_start=now, current_period_end=now + timedelta(days=30)))
+        db.add(TokenPurchase(user_id=users["purchased"].id, package_name="premium", tokens_purchased=100000,
+                             amount_paid=100, payment_status="success", valid_from=now, is_expired=False))
+        await db.commit()
+        return {name: str(user.id) for name, user in users.items()}
+
+
+async def run(args):
+    import logging
+    from fastapi.security import HTTPAuthorizationCredentials
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from app.core.security import create_access_token
+    from app.modules.auth.entitlements import entitlement_cache
+
+    logging.disable(logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix="entitlement-bench-")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{workdir}/bench.db")
+    user_ids = await setup(engine)
+
+    queries = [0]
+
+    def count(*_):
+        queries[0] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+    async def measure(user_id, legacy, requests):
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer", credentials=create_access_token({"sub": user_id})
+        )
+        trips, times = [], []
+        for _ in range(requests):
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                queries[0] = 0
+                start = time.perf_counter()
+                await generation_request(db, user_id, credentials, legacy)
+                times.append((time.perf_counter() - start) * 1000)
+                trips.append(queries[0])
+        return statistics.mean(trips), statistics.median(times)
+
+    print(f"Generation request auth/limit checks, {args.requests} requests per row "
+          f"(time at {args.rtt_ms:.1f}ms DB RTT = sqlite time + round trips x RTT)\n")
+    print(f"  {'user':<12}{'path':<16}{'round trips':>13}{'sqlite ms':>11}{'est. ms':>10}")
+    for name, user_id in user_ids.items():
+        legacy = await measure(user_id, True, args.requests)
+        entitlement_cache.clear()
+        rows = [
+            ("legacy", legacy),
+            ("snapshot cold", await measure(user_id, False, 1)),
+            ("snapshot warm", await measure(user_id, False, args.requests)),
+        ]
+        for path, (trips, ms) in rows:
+            print(f"  {name:<12}{path:<16}{trips:>13.1f}{ms:>11.2f}{ms + trips * args.rtt_ms:>10.2f}")
+    print(f"\n  Cache: {entitlement_cache.get_stats()}")
+    await engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count DB round trips for generation request auth and limit checks")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Database round trip time to estimate with")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
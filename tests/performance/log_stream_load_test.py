@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Log Stream Load Test
+Simulates many projects streaming container/build log lines into one worker's
+log stream handler, with monitor clients (one of them a slow browser tab)
+and one preview client per project, and compares:
+
+- legacy: the previous LogStreamManager (await send_json per socket in turn,
+  is_build_error compiling its regexes per line, INFO log per line)
+- queued: per-connection send queues with writer tasks and batched
+  monitor frames (app.api.v1.endpoints.log_stream.LogStreamManager)
+
+Reports lines handled per second against the offered rate, how far the
+receive loop fell behind, and delivery latency to a healthy monitor.
+
+Every project streams into this one process; at the default 100k lines/s
+it is CPU-bound, so monitors shed lines (oldest first, per client) while
+the receive loop keeps up. In production the load is spread over workers;
+--projects 100 shows a healthy monitor losing nothing.
+
+Usage:
+    python log_stream_load_test.py
+    python log_stream_load_test.py --projects 500 --rate 200 --seconds 10 --slow-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+LINES = [
+    "  VITE v5.0.0  ready in 320 ms",
+    "[vite] hmr update /src/components/Header.tsx",
+    "GET /api/products?page=2 200 12.331 ms - 2044",
+    "webpack compiled successfully in 1834 ms",
+    "  ➜  Local:   http://localhost:5173/",
+    "npm WARN deprecated inflight@1.0.6: This module is not supported",
+    "INFO:     172.17.0.1:53214 - \"GET /health HTTP/1.1\" 200 OK",
+]
+
+
+class FakeWebSocket:
+    """Serializes frames like Starlette; a slow client sleeps per frame"""
+
+    def __init__(self, delay: float = 0.0, latencies=None):
+        self.delay = delay
+        self.latencies = latencies
+        self.frames = 0
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        json.dumps(message)
+        await asyncio.sleep(self.delay)
+        self.frames += 1
+        if self.latencies is not None:
+            now = time.perf_counter()
+            for m in message.get("messages", [message]):
+                self.latencies.append(now - m["timestamp"])
+
+
+def legacy_is_build_error(message: str) -> bool:
+    from app.api.v1.endpoints.log_stream import BUILD_ERROR_PATTERNS
+    message_lower = message.lower()
+    for pattern in BUILD_ERROR_PATTERNS:
+        if pattern.lower() in message_lower:
+            return True
+    file_extensions = r'\.(tsx?|jsx?|vue|svelte|py|go|rs|java|kt|c|cpp|h|hpp|rb|php|cs|swift|scala|ex|exs|erl|hs|ml|fs)'
+    if re.search(rf'[/\\][\w/\\]+{file_extensions}[:(\d]', message):
+        if 'error' in message_lower or 'failed' in message_lower or 'exception' in message_lower:
+            return True
+    return any(re.search(p, message) for p in [
+        r'File "[^"]+\.py", line \d+', r'\.go:\d+:\d+:', r'--> [^:]+\.rs:\d+:\d+', r'at [\w.$]+\([^:]+\.java:\d+\)'])
+
+
+class LegacyLogStreamManager:
+    """The previous broadcast: await each socket in turn"""
+
+    def __init__(self):
+        self.active_connections = {}
+        self.monitors = set()
+
+    async def connect(self, websocket, project_id):
+        self.active_connections.setdefault(project_id, set()).add(websocket)
+
+    async def connect_monitor(self, websocket):
+        self.monitors.add(websocket)
+
+    async def broadcast_to_monitors(self, message):
+        for monitor in self.monitors:
+            await monitor.send_json(message)
+
+    async def broadcast_to_project(self, project_id, message):
+        for ws in self.active_connections.get(project_id, ()):
+            await ws.send_json(message)
+
+    def get_stats(self):
+        return {}
+
+
+async def run(args, name):
+    import logging
+    from app.api.v1.endpoints.log_stream import LogStreamManager, is_build_error
+    from app.core.logging_config import logger
+
+    legacy = name == "legacy"
+    manager = LegacyLogStreamManager() if legacy else LogStreamManager()
+    classify = legacy_is_build_error if legacy else is_build_error
+    # Silence output but keep the formatting cost of the per-line log call
+    logging.disable(logging.CRITICAL)
+    latencies = []
+    monitors = [FakeWebSocket(latencies=latencies), FakeWebSocket(delay=args.slow_ms / 1000)]
+    for monitor in monitors:
+        await manager.connect_monitor(monitor)
+    for p in range(args.projects):
+        await manager.connect(FakeWebSocket(), f"project-{p}")
+
+    handled = 0
+    behind = []
+    tick = 0.05
+    per_tick = max(1, int(args.rate * tick))
+    deadline = time.perf_counter() + args.seconds
+
+    async def project(p: int):
+        nonlocal handled
+        rng = random.Random(p)
+        project_id = f"project-{p}"
+        await asyncio.sleep(rng.random() * tick)
+        next_tick = time.perf_counter()
+        while next_tick < deadline:
+            for _ in range(per_tick):
+                line = rng.choice(LINES)
+                if legacy:
+                    logger.info(f"[LogStream] 📥 RECEIVED from {project_id}: source=docker, type=stdout, message={line[:100]}")
+                else:
+                    logger.debug(f"[LogStream] Received from {project_id}: source=docker, type=stdout")
+                # The previous handler classified each line twice
+                for _ in range(2 if legacy else 1):
+                    classify(line)
+                await manager.broadcast_to_monitors({
+                    "project_id": project_id, "source": "docker", "type": "stdout",
+                    "data": {"message": line}, "timestamp": time.perf_counter()
+                })
+                handled += 1
+            next_tick += tick
+            behind.append(max(0.0, time.perf_counter() - next_tick))
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(project(p) for p in range(args.projects)))
+    elapsed = time.perf_counter() - start
+    logging.disable(logging.NOTSET)
+    dropped = [0, 0] if legacy else [manager.monitors[m].dropped for m in monitors]
+    return {
+        "lines_per_sec": handled / elapsed,
+        "behind_p99": sorted(behind)[int(len(behind) * 0.99)] if behind else 0.0,
+        "latency_p50": statistics.median(latencies) if latencies else float("nan"),
+        "latency_p99": sorted(latencies)[int(len(latencies) * 0.99)] if latencies else float("nan"),
+        "frames": monitors[0].frames,
+        "fast_dropped": dropped[0],
+        "slow_dropped": dropped[1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test LogStreamManager broadcast delivery")
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--rate", type=int, default=200, help="Log lines per second per project")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--slow-ms", type=float, default=50.0, help="Per-frame send time of the slow monitor")
+    args = parser.parse_args()
+
+    print(f"{args.projects} projects x {args.rate} lines/s = {args.projects * args.rate:,} lines/s offered, "
+          f"{args.seconds:.0f}s, 2 monitors (one {args.slow_ms:.0f}ms/frame)\n")
+    print(f"  {'manager':<9}{'lines/s':>11}{'loop behind p99':>17}{'fast monitor p50':>18}{'p99':>10}"
+          f"{'frames':>10}{'fast dropped':>14}{'slow dropped':>14}")
+    for name in ("legacy", "queued"):
+        r = asyncio.run(run(args, name))
+        print(f"  {name:<9}{r['lines_per_sec']:>11,.0f}{r['behind_p99'] * 1000:>15.0f}ms"
+              f"{r['latency_p50'] * 1000:>16.1f}ms{r['latency_p99'] * 1000:>8.0f}ms{r['frames']:>10,}{r['fast_dropped']:>14,}{r['slow_dropped']:>14,}")
+
+
+if __name__ == "__main__":
+    main()
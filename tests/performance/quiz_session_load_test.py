@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - Campus Drive Quiz Load Test
+Simulates a drive opening for many takers at once: every taker starts the
+quiz together, auto-saves progress a few times and submits. Compares:
+
+- legacy: the previous endpoints (drive and full question bank loaded per
+  start, every save deleting and reinserting the taker's responses,
+  grading by re-deriving shuffles)
+- sessions: the quiz session engine (app.services.quiz_session_service):
+  cached bank, session materialized at start, answers upserted into the
+  session store, responses written in one batch at submit
+
+Reports p50/p99 latency per request type and database write volume, and
+exits non-zero unless the session path keeps progress saves under
+--max-save-p99-ms, has a lower overall p99 than legacy, writes at most
+--max-writes-per-taker statements per taker and fewer rows than legacy.
+
+Runs against a temporary SQLite database, which serializes writers: start
+and submit latencies are dominated by waiting for the write lock here, so
+only progress saves get an absolute bound. The write counts are what carry
+over to Postgres. Sessions are kept in process unless --redis-url is given.
+
+Usage:
+    python quiz_session_load_test.py
+    python quiz_session_load_test.py --takers 500 --saves 3 --redis-url redis://localhost:6379/1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+# ==================== Legacy endpoints ====================
+
+async def legacy_registration(db, drive_id, email):
+    from sqlalchemy import select
+    from app.models.campus_drive import CampusDriveRegistration
+    result = await db.execute(select(CampusDriveRegistration).where(
+        CampusDriveRegistration.campus_drive_id == drive_id, CampusDriveRegistration.email == email
+    ))
+    return result.scalar_one()
+
+
+async def legacy_drive(db, drive_id):
+    from sqlalchemy import select
+    from app.models.campus_drive import CampusDrive
+    return (await db.execute(select(CampusDrive).where(CampusDrive.id == drive_id))).scalar_one()
+
+
+def legacy_order(registration_id, question):
+    # hash() as before; stable within this one process
+    indices = list(range(len(question.options)))
+    random.Random(hash(str(registration_id) + str(question.id))).shuffle(indices)
+    return indices
+
+
+async def legacy_start(db, drive_id, email):
+    """The previous start_quiz: drive and every question per request"""
+    from sqlalchemy import select
+    from app.models.campus_drive import CampusDriveQuestion, RegistrationStatus
+
+    registration = await legacy_registration(db, drive_id, email)
+    drive = await legacy_drive(db, drive_id)
+    result = await db.execute(select(CampusDriveQuestion).where(
+        (CampusDriveQuestion.campus_drive_id == drive_id) | (CampusDriveQuestion.is_global == True)
+    ))
+    by_category = {}
+    for q in result.scalars().all():
+        by_category.setdefault(q.category.value, []).append(q)
+    questions = []
+    for category, count in (("logical", drive.logical_questions), ("technical", drive.technical_questions),
+                            ("ai_ml", drive.ai_ml_questions), ("english", drive.english_questions),
+                            ("coding", drive.coding_questions)):
+        pool = by_category.get(category, [])
+        questions.extend(random.sample(pool, count) if len(pool) >= count else pool)
+    random.Random(hash(str(registration.id) + str(drive_id))).shuffle(questions)
+    registration.status = RegistrationStatus.QUIZ_IN_PROGRESS
+    registration.quiz_start_time = datetime.utcnow()
+    await db.commit()
+    return [(q, legacy_order(registration.id, q)) for q in questions]
+
+
+async def legacy_save(db, drive_id, email, answers):
+    """The previous save_quiz_progress: delete and reinsert every saved answer"""
+    from app.models.campus_drive import CampusDriveResponse
+
+    registration = await legacy_registration(db, drive_id, email)
+    await legacy_drive(db, drive_id)
+    await db.execute(CampusDriveResponse.__table__.delete().where(
+        CampusDriveResponse.registration_id == registration.id
+    ))
+    for question_id, option in answers.items():
+        db.add(CampusDriveResponse(registration_id=registration.id, question_id=question_id,
+                                   selected_option=option, is_correct=False, marks_obtained=0))
+    await db.commit()
+
+
+async def legacy_submit(db, drive_id, email, answers):
+    """The previous submit_quiz: batch question fetch, responses added, registration updated"""
+    from sqlalchemy import select
+    from app.models.campus_drive import CampusDriveQuestion, CampusDriveResponse, RegistrationStatus
+
+    registration = await legacy_registration(db, drive_id, email)
+    drive = await legacy_drive(db, drive_id)
+    result = await db.execute(select(CampusDriveQuestion).where(CampusDriveQuestion.id.in_(list(answers))))
+    questions = {str(q.id): q for q in result.scalars().all()}
+    obtained = total = 0
+    for question_id, option in answers.items():
+        q = questions[question_id]
+        correct = legacy_order(registration.id, q)[option] == q.correct_option
+        total += q.marks
+        obtained += q.marks if correct else 0
+        db.add(CampusDriveResponse(registration_id=registration.id, question_id=question_id,
+                                   selected_option=option, is_correct=correct,
+                                   marks_obtained=q.marks if correct else 0))
+    registration.percentage = obtained / total * 100 if total else 0
+    registration.is_qualified = registration.percentage >= drive.passing_percentage
+    registration.status = RegistrationStatus.QUALIFIED if registration.is_qualified else RegistrationStatus.NOT_QUALIFIED
+    await db.commit()
+
+
+# ==================== Session endpoints ====================
+
+async def session_start(db, drive_id, email):
+    from app.api.v1.endpoints.campus_drive import start_quiz
+    started = await start_quiz(drive_id, email, db)
+    return [(str(q.id), len(q.options)) for q in started.questions]
+
+
+async def session_save(db, drive_id, email, answers):
+    from app.api.v1.endpoints.campus_drive import save_quiz_progress
+    from app.schemas.campus_drive import QuizProgressSave
+    await save_quiz_progress(drive_id, email, QuizProgressSave(answers=[
+        {"question_id": qid, "selected_option": option} for qid, option in answers.items()
+    ]), db)
+
+
+async def session_submit(db, drive_id, email, answers):
+    from app.api.v1.endpoints.campus_drive import submit_quiz
+    from app.schemas.campus_drive import QuizSubmission
+    await submit_quiz(drive_id, email, QuizSubmission(answers=[
+        {"question_id": qid, "selected_option": option} for qid, option in answers.items()
+    ]), db)
+
+
+# ==================== Harness ====================
+
+async def setup(engine, takers):
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.api.v1.endpoints.campus_drive import seed_campus_drive_data
+    from app.core.database import Base
+    from app.models.campus_drive import CampusDriveRegistration
+    import app.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        await seed_campus_drive_data("bharatbuild2026", db)
+        from sqlalchemy import select
+        from app.models.campus_drive import CampusDrive
+        drive_id = str((await db.execute(select(CampusDrive.id))).scalar_one())
+        db.add_all(
+            CampusDriveRegistration(
+                campus_drive_id=drive_id, full_name=f"Student {n}", email=f"student{n}@college.edu",
+                phone="9999999999", college_name="College", department="CSE", year_of_study="4",
+            )
+            for n in range(takers)
+        )
+        await db.commit()
+    return drive_id
+
+
+async def run(engine, args, legacy):
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.services.quiz_session_service import quiz_sessions
+
+    drive_id = await setup(engine, args.takers)
+    quiz_sessions.clear()
+    latencies = {"start": [], "save": [], "submit": []}
+    writes = {"statements": 0, "rows": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(" ", 1)[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+            writes["statements"] += 1
+            writes["rows"] += max(cursor.rowcount, 0)
+
+    start_fn, save_fn, submit_fn = (
+        (legacy_start, legacy_save, legacy_submit) if legacy else (session_start, session_save, session_submit)
+    )
+
+    async def request(kind, fn, *fn_args):
+        began = time.perf_counter()
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            result = await fn(db, *fn_args)
+        latencies[kind].append((time.perf_counter() - began) * 1000)
+        return result
+
+    async def taker(n):
+        rng = random.Random(n)
+        email = f"student{n}@college.edu"
+        await asyncio.sleep(rng.random() * args.ramp)
+        served = await request("start", start_fn, drive_id, email)
+        if legacy:
+            served = [(str(q.id), len(q.options)) for q, _ in served]
+        answers = {}
+        per_round = max(1, len(served) // (args.saves + 1))
+        for round_no in range(args.saves):
+            await asyncio.sleep(rng.random() * args.think)
+            for question_id, options in served[round_no * per_round:(round_no + 1) * per_round]:
+                answers[question_id] = rng.randrange(options)
+            await request("save", save_fn, drive_id, email, dict(answers))
+        for question_id, options in served:
+            answers.setdefault(question_id, rng.randrange(options))
+        await asyncio.sleep(rng.random() * args.think)
+        await request("submit", submit_fn, drive_id, email, answers)
+
+    event.listen(engine.sync_engine, "after_cursor_execute", count)
+    began = time.perf_counter()
+    await asyncio.gather(*(taker(n) for n in range(args.takers)))
+    elapsed = time.perf_counter() - began
+    event.remove(engine.sync_engine, "after_cursor_execute", count)
+    return latencies, writes, elapsed
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def main_async(args):
+    import logging
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    from app.services.quiz_session_service import quiz_sessions
+
+    logging.disable(logging.WARNING)
+    if args.redis_url:
+        import redis.asyncio as aioredis
+        quiz_sessions._redis = aioredis.from_url(args.redis_url, decode_responses=True)
+
+    workdir = tempfile.mkdtemp(prefix="quiz-load-")
+    # A bounded pool, as in production (SQLite would otherwise open a connection per request)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{workdir}/quiz.db", poolclass=AsyncAdaptedQueuePool,
+        pool_size=args.pool_size, max_overflow=0, pool_timeout=600, connect_args={"timeout": 600},
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def wal(dbapi_connection, _):
+        # Readers do not wait for the writer, closer to Postgres MVCC
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    print(f"{args.takers} takers start within {args.ramp:.1f}s, {args.saves} progress saves each "
+          f"(think time up to {args.think:.1f}s), then submit; {args.pool_size} DB connections\n")
+    print(f"  {'path':<10}{'request':<9}{'count':>7}{'p50 ms':>9}{'p99 ms':>9}")
+    results = {}
+    for name in ("legacy", "sessions"):
+        latencies, writes, elapsed = await run(engine, args, legacy=name == "legacy")
+        results[name] = (latencies, writes)
+        for kind, samples in latencies.items():
+            if not samples:
+                continue
+            print(f"  {name:<10}{kind:<9}{len(samples):>7}{statistics.median(samples):>9.1f}"
+                  f"{percentile(samples, 0.99):>9.1f}")
+        print(f"  {name:<10}DB writes: {writes['statements']} statements, {writes['rows']} rows "
+              f"({writes['statements'] / args.takers:.1f} statements/taker), {elapsed:.1f}s wall\n")
+
+    if quiz_sessions._redis is not None:
+        await quiz_sessions._redis.close()
+    await engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies, writes = results["sessions"]
+    legacy_latencies, legacy_writes = results["legacy"]
+    save_p99 = percentile(latencies["save"], 0.99)
+    p99 = percentile([ms for samples in latencies.values() for ms in samples], 0.99)
+    legacy_p99 = percentile([ms for samples in legacy_latencies.values() for ms in samples], 0.99)
+    per_taker = writes["statements"] / args.takers
+    failures = []
+    if save_p99 > args.max_save_p99_ms:
+        failures.append(f"save p99 {save_p99:.1f}ms > {args.max_save_p99_ms:.1f}ms")
+    if p99 >= legacy_p99:
+        failures.append(f"p99 {p99:.1f}ms not below legacy {legacy_p99:.1f}ms")
+    if per_taker > args.max_writes_per_taker:
+        failures.append(f"{per_taker:.1f} write statements per taker > {args.max_writes_per_taker}")
+    if writes["rows"] >= legacy_writes["rows"]:
+        failures.append("no fewer rows written than legacy")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"PASS: save p99 {save_p99:.1f}ms, p99 {p99:.1f}ms (legacy {legacy_p99:.1f}ms), "
+          f"{per_taker:.1f} write statements per taker")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test campus drive quiz start/save/submit")
+    parser.add_argument("--takers", type=int, default=500)
+    parser.add_argument("--ramp", type=float, default=2.0, help="Seconds over which takers press start")
+    parser.add_argument("--saves", type=int, default=3, choices=range(1, 35), metavar="1-34",
+                        help="Progress saves per taker")
+    parser.add_argument("--think", type=float, default=1.0, help="Max seconds between a taker's requests")
+    parser.add_argument("--pool-size", type=int, default=20, help="Database connections (DB_POOL_SIZE)")
+    parser.add_argument("--redis-url", default="", help="Keep sessions in this Redis instead of in process")
+    parser.add_argument("--max-save-p99-ms", type=float, default=250.0, help="Session path progress save p99")
+    parser.add_argument("--max-writes-per-taker", type=float, default=4.0,
+                        help="Start (1 update) + submit (update, delete, batch insert)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
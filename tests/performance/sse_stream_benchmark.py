@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - SSE Stream Benchmark
+Simulates many concurrent orchestrator generations, each streaming token-
+sized file_chunk deltas with periodic status/progress events and quiet
+"waiting for Claude" gaps, and compares two transports:
+
+- legacy: the previous path (a frame per event, an asyncio.sleep(0.01)
+  after each one, plus a keepalive ticker task per stream every 0.5s)
+- writer: app.utils.sse.SSEWriter (flush window, delta merging, superseded
+  status coalescing, idle-only keepalives), optionally gzipped
+
+Writes go to an in-memory sink that counts bytes and write calls, so the
+numbers measure transport overhead, not the network.
+
+Usage:
+    python sse_stream_benchmark.py
+    python sse_stream_benchmark.py --streams 500 --tokens 2000 --flush-ms 30 --gzip
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+async def generation(args, seed: int):
+    """One generation's events: token deltas in bursts, status updates, idle gaps"""
+    rng = random.Random(seed)
+    files = [f"src/components/File{i}.tsx" for i in range(args.files)]
+    per_file = args.tokens // args.files
+    await asyncio.sleep(args.idle)  # planner waiting on Claude
+    for index, path in enumerate(files):
+        yield {"type": "status", "data": {"message": f"Generating {path}"}, "step": 2, "agent": "writer",
+               "timestamp": None}
+        for token in range(per_file):
+            yield {"type": "file_chunk", "data": {"path": path, "chunk": rng.choice(["const ", "x", " = ", "1;\n"])},
+                   "step": 2, "agent": "writer", "timestamp": None}
+            if token % 25 == 0:
+                yield {"type": "document_progress", "data": {"progress": token * 100 // per_file},
+                       "step": 2, "agent": "writer", "timestamp": None}
+            if token % args.burst == 0:
+                # Claude streams tokens in bursts a few ms apart
+                await asyncio.sleep(args.token_gap)
+        yield {"type": "file_complete", "data": {"path": path}, "step": 2, "agent": "writer", "timestamp": None}
+
+
+async def legacy_stream(events):
+    """Previous orchestrator path: with_keepalive ticker + a frame and a 10ms sleep per event"""
+    queue: asyncio.Queue = asyncio.Queue()
+    done = asyncio.Event()
+
+    async def pump():
+        async for event in events:
+            await queue.put(event)
+        await queue.put(StopAsyncIteration)
+        done.set()
+
+    async def ticker():
+        while not done.is_set():
+            try:
+                await asyncio.wait_for(done.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                await queue.put(None)
+
+    tasks = [asyncio.create_task(pump()), asyncio.create_task(ticker())]
+    try:
+        while True:
+            event = await queue.get()
+            if event is StopAsyncIteration:
+                break
+            if event is None:
+                yield b": keepalive\n\n"
+                continue
+            yield f"data: {json.dumps(event)}\n\n".encode("utf-8")
+            await asyncio.sleep(0.01)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def drain(stream, totals):
+    """Consume a stream like Starlette's send loop, counting writes and bytes"""
+    async for chunk in stream:
+        totals["writes"] += 1
+        totals["bytes"] += len(chunk)
+        totals["keepalives"] += chunk.count(b": keepalive")
+
+
+async def run_transport(args, name):
+    from app.utils.sse import SSEWriter, sse_metrics
+
+    sse_metrics.reset()
+    totals = {"writes": 0, "bytes": 0, "keepalives": 0}
+    lag = {"worst": 0.0}
+
+    async def monitor():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag["worst"] = max(lag["worst"], time.perf_counter() - start - 0.01)
+
+    def stream(i):
+        events = generation(args, i)
+        if name == "legacy":
+            return legacy_stream(events)
+        writer = SSEWriter(flush_window=args.flush_ms / 1000, compress=name == "writer+gzip")
+        return writer.stream(events)
+
+    monitor_task = asyncio.create_task(monitor())
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    await asyncio.gather(*(drain(stream(i), totals) for i in range(args.streams)))
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    monitor_task.cancel()
+    return elapsed, cpu, totals, lag["worst"]
+
+
+async def run(args):
+    transports = ["legacy", "writer"] + (["writer+gzip"] if args.gzip else [])
+    events = args.tokens + args.tokens // 25 + 2 * args.files
+    print(f"{args.streams} concurrent streams x ~{events:,} events "
+          f"(flush window {args.flush_ms}ms, {args.idle}s idle before first token)\n")
+    print(f"  {'transport':<14}{'wall':>9}{'cpu':>9}{'writes':>11}{'writes/s':>11}{'MB sent':>10}"
+          f"{'keepalives':>12}{'worst lag':>11}")
+    results = {}
+    for name in transports:
+        elapsed, cpu, totals, worst = await run_transport(args, name)
+        results[name] = (elapsed, cpu, totals)
+        print(f"  {name:<14}{elapsed:>8.2f}s{cpu:>8.2f}s{totals['writes']:>11,}{totals['writes'] / elapsed:>11,.0f}"
+              f"{totals['bytes'] / 1e6:>10.2f}{totals['keepalives']:>12,}{worst * 1000:>9.1f}ms")
+
+    legacy, writer = results["legacy"], results["writer"]
+    print(f"\n  Writes: {legacy[2]['writes'] / max(writer[2]['writes'], 1):.1f}x fewer, "
+          f"CPU: {legacy[1] / max(writer[1], 0.001):.1f}x less, "
+          f"bytes: {legacy[2]['bytes'] / max(writer[2]['bytes'], 1):.1f}x fewer")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-event SSE frames vs the coalescing SSE writer")
+    parser.add_argument("--streams", type=int, default=200, help="Concurrent generations")
+    parser.add_argument("--tokens", type=int, default=1000, help="file_chunk deltas per generation")
+    parser.add_argument("--files", type=int, default=5, help="Files per generation")
+    parser.add_argument("--burst", type=int, default=5, help="Tokens per Claude burst")
+    parser.add_argument("--token-gap", type=float, default=0.005, help="Seconds between bursts")
+    parser.add_argument("--idle", type=float, default=2.0, help="Quiet seconds before the first token")
+    parser.add_argument("--flush-ms", type=int, default=30)
+    parser.add_argument("--gzip", action="store_true", help="Also run the writer with gzip")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
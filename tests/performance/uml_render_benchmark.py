@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+BharatBuild AI - UML Diagram Rendering Benchmark
+Compares the serial, on-the-event-loop UMLGenerator.generate_all_diagrams
+against the process-pool renderer (cold) and a re-run with an unchanged
+project (model-hash cache), and prints per-diagram render times.
+
+Usage:
+    python uml_render_benchmark.py
+    python uml_render_benchmark.py --workers 7 --runs 3
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+OUTPUT_DIR = tempfile.mkdtemp(prefix="bb-uml-bench-")
+
+# Settings validation needs these before app.core.config is imported
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "SECRET_KEY": "bench-secret",
+    "JWT_SECRET_KEY": "bench-jwt-secret",
+    "ANTHROPIC_API_KEY": "bench-key",
+    "CELERY_BROKER_URL": "redis://localhost:6379/0",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/1",
+    "USER_PROJECTS_PATH": "/tmp/projects",
+    "DIAGRAMS_PATH": OUTPUT_DIR,
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.core.config import settings  # noqa: E402
+from app.modules.automation import uml_generator as uml_module  # noqa: E402
+
+PROJECT_DATA = {
+    "project_name": "Hospital Management System",
+    "project_type": "Web Application",
+    "features": [
+        "Patient registration and login", "Doctor appointment booking", "Admin dashboard",
+        "Billing and payments", "Lab report upload", "Prescription management",
+        "Email notifications", "Search doctors by speciality",
+    ],
+    "technologies": {"frontend": ["React", "Tailwind"], "backend": ["FastAPI", "Celery"],
+                     "database": ["PostgreSQL", "Redis"]},
+    "api_endpoints": [{"method": m, "path": f"/api/v1/{r}"}
+                      for r in ("patients", "doctors", "appointments", "bills", "reports")
+                      for m in ("GET", "POST")],
+    "database_tables": ["users", "patients", "doctors", "appointments", "bills", "lab_reports", "prescriptions"],
+}
+
+
+async def pooled(generator, run: int):
+    start = time.perf_counter()
+    results = await generator.render_all_diagrams(PROJECT_DATA, f"bench-{run}", "bench-user")
+    return (time.perf_counter() - start) * 1000, results
+
+
+async def run(runs: int):
+    generator = uml_module.uml_generator
+
+    serial = []
+    for i in range(runs):
+        start = time.perf_counter()
+        generator.generate_all_diagrams(PROJECT_DATA, f"serial-{i}", "bench-user")
+        serial.append((time.perf_counter() - start) * 1000)
+
+    # Warm the pool (worker spawn/import) outside the measurement
+    await generator.render_all_diagrams(PROJECT_DATA, "warmup", "bench-user")
+
+    cold, warm, last = [], [], {}
+    for i in range(runs):
+        ms, last = await pooled(generator, i)
+        cold.append(ms)
+        ms, _ = await pooled(generator, i)
+        warm.append(ms)
+
+    print(f"  {'serial (event loop)':<28} {statistics.median(serial):8.1f} ms")
+    print(f"  {'process pool, cold':<28} {statistics.median(cold):8.1f} ms")
+    print(f"  {'process pool, cached rerun':<28} {statistics.median(warm):8.1f} ms")
+    print("\n  Per-diagram render time (last cold run):")
+    for diagram_type, result in last.items():
+        print(f"    {diagram_type:<14} {result.get('render_ms', 0):8.1f} ms")
+    print(f"\n  Speedup (cold):   {statistics.median(serial) / max(statistics.median(cold), 0.001):.1f}x")
+    print(f"  Speedup (cached): {statistics.median(serial) / max(statistics.median(warm), 0.001):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UML diagram rendering")
+    parser.add_argument("--workers", type=int, default=settings.DIAGRAM_RENDER_WORKERS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    settings.DIAGRAM_RENDER_WORKERS = args.workers
+    print(f"Render workers: {args.workers}, output: {OUTPUT_DIR}\n")
+    try:
+        asyncio.run(run(args.runs))
+    finally:
+        uml_module._reset_render_pool()
+        shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()